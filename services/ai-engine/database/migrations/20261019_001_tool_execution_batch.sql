@@ -0,0 +1,35 @@
+-- Batched tool execution logging for ToolTelemetrySink
+-- One round trip per batch instead of one log_tool_execution RPC per tool call.
+-- Each element of p_records carries the same p_* keys as log_tool_execution,
+-- plus p_execution_id (client-assigned) and p_recorded_at.
+
+CREATE OR REPLACE FUNCTION log_tool_executions_batch(p_records JSONB)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    rec JSONB;
+    inserted INTEGER := 0;
+BEGIN
+    FOR rec IN SELECT * FROM jsonb_array_elements(p_records)
+    LOOP
+        PERFORM log_tool_execution(
+            p_tool_code => rec->>'p_tool_code',
+            p_agent_id => (rec->>'p_agent_id')::UUID,
+            p_tenant_id => (rec->>'p_tenant_id')::UUID,
+            p_input_params => rec->'p_input_params',
+            p_output_result => rec->'p_output_result',
+            p_error_message => rec->>'p_error_message',
+            p_status => rec->>'p_status',
+            p_execution_time_ms => (rec->>'p_execution_time_ms')::INTEGER,
+            p_session_id => (rec->>'p_session_id')::UUID,
+            p_workflow_run_id => rec->>'p_workflow_run_id'
+        );
+        inserted := inserted + 1;
+    END LOOP;
+
+    RETURN inserted;
+END;
+$$;
+
+COMMENT ON FUNCTION log_tool_executions_batch(JSONB) IS 'Batched variant of log_tool_execution used by the AI engine telemetry sink';
@@ -0,0 +1,38 @@
+-- Change notifications for the shared agent catalog (AgentCatalogService)
+-- Every insert/update/delete on agents sends a NOTIFY on agent_catalog_changed
+-- so the catalog refreshes immediately instead of waiting for its next
+-- updated_at poll. DELETE payloads trigger a full reload (polling by
+-- watermark cannot observe removed rows).
+
+CREATE OR REPLACE FUNCTION notify_agent_catalog_changed()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    row_data RECORD;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        row_data := OLD;
+    ELSE
+        row_data := NEW;
+    END IF;
+
+    PERFORM pg_notify(
+        'agent_catalog_changed',
+        json_build_object(
+            'op', TG_OP,
+            'id', row_data.id,
+            'tenant_id', row_data.tenant_id
+        )::text
+    );
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS agents_catalog_notify ON agents;
+CREATE TRIGGER agents_catalog_notify
+    AFTER INSERT OR UPDATE OR DELETE ON agents
+    FOR EACH ROW EXECUTE FUNCTION notify_agent_catalog_changed();
+
+-- Watermark polls filter on updated_at
+CREATE INDEX IF NOT EXISTS idx_agents_updated_at ON agents (updated_at);
@@ -0,0 +1,25 @@
+-- Durable HITL suspension (services/workflows/hitl_suspension.py)
+-- Approvals no longer park a coroutine: the mission's LangGraph thread is
+-- interrupted and resumed from the checkpointer once a decision is recorded.
+-- These columns record where to resume and which replica holds the resume
+-- lease; expires_at is enforced by the sweeper on every replica.
+
+ALTER TABLE hitl_approvals
+    ADD COLUMN IF NOT EXISTS resume_graph TEXT,
+    ADD COLUMN IF NOT EXISTS resume_config JSONB NOT NULL DEFAULT '{}',
+    ADD COLUMN IF NOT EXISTS resume_claimed_by TEXT,
+    ADD COLUMN IF NOT EXISTS resume_claimed_at TIMESTAMPTZ,
+    ADD COLUMN IF NOT EXISTS resumed_at TIMESTAMPTZ;
+
+-- Idempotent suspend: a re-run node finds its approval by thread + checkpoint
+CREATE INDEX IF NOT EXISTS idx_hitl_approvals_thread_checkpoint
+ON hitl_approvals(thread_id, checkpoint_id);
+
+-- Timeout sweep
+CREATE INDEX IF NOT EXISTS idx_hitl_approvals_expiry
+ON hitl_approvals(expires_at) WHERE status = 'pending';
+
+-- Recovery sweep: decided but not yet resumed
+CREATE INDEX IF NOT EXISTS idx_hitl_approvals_awaiting_resume
+ON hitl_approvals(responded_at)
+WHERE status <> 'pending' AND resumed_at IS NULL AND resume_graph IS NOT NULL;
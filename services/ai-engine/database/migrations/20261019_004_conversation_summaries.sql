@@ -0,0 +1,28 @@
+-- Versioned rolling conversation summaries
+-- (services/shared/conversation_context_store.py, persisted by
+-- EnhancedConversationManager). One row per summary version; a replica that
+-- does not hold a session in memory hydrates it from the latest version plus
+-- the conversation turns created after covered_until.
+
+CREATE TABLE IF NOT EXISTS conversation_summaries (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    tenant_id UUID NOT NULL,
+    session_id TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    summarized_turns INTEGER NOT NULL DEFAULT 0,
+    covered_until TIMESTAMPTZ,
+    levels JSONB NOT NULL DEFAULT '[]',
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+    CONSTRAINT conversation_summaries_version_unique UNIQUE (tenant_id, session_id, version)
+);
+
+-- The latest version of a session is served by the unique index; hydration
+-- then reads the turns after covered_until, newest first
+CREATE INDEX IF NOT EXISTS idx_conversations_tenant_session_created
+ON conversations(tenant_id, session_id, created_at DESC);
+
+ALTER TABLE conversation_summaries ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY conversation_summaries_tenant_isolation ON conversation_summaries
+    USING (tenant_id = current_setting('app.tenant_id', true)::UUID);
@@ -0,0 +1,49 @@
+-- Batched memory access tracking for MemoryAccessTracker
+-- (services/shared/memory_access_tracker.py). Replaces one
+-- update_memory_access RPC per recalled memory with one call per flush
+-- interval. p_updates is a JSON array of {id, hits, last_accessed_at}, with
+-- hits already aggregated per memory.
+--
+-- Salience decays with a half-life from the previous access (or creation)
+-- to the latest access in the batch, then gains p_access_boost per hit.
+-- Accesses within one batch are treated as simultaneous.
+
+ALTER TABLE session_memories
+    ADD COLUMN IF NOT EXISTS salience REAL;
+
+CREATE OR REPLACE FUNCTION apply_memory_access_batch(
+    p_updates JSONB,
+    p_half_life_days DOUBLE PRECISION DEFAULT 30,
+    p_access_boost DOUBLE PRECISION DEFAULT 0.05
+)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    updated INTEGER;
+BEGIN
+    UPDATE session_memories m
+    SET
+        accessed_count = COALESCE(m.accessed_count, 0) + u.hits,
+        last_accessed_at = GREATEST(COALESCE(m.last_accessed_at, u.last_accessed_at), u.last_accessed_at),
+        salience = LEAST(
+            1.0,
+            COALESCE(m.salience, m.importance)
+                * power(
+                    0.5,
+                    GREATEST(
+                        0,
+                        EXTRACT(EPOCH FROM u.last_accessed_at - COALESCE(m.last_accessed_at, m.created_at))
+                    ) / 86400.0 / p_half_life_days
+                )
+                + p_access_boost * u.hits
+        )
+    FROM jsonb_to_recordset(p_updates) AS u(id UUID, hits INTEGER, last_accessed_at TIMESTAMPTZ)
+    WHERE m.id = u.id;
+
+    GET DIAGNOSTICS updated = ROW_COUNT;
+    RETURN updated;
+END;
+$$;
+
+COMMENT ON FUNCTION apply_memory_access_batch(JSONB, DOUBLE PRECISION, DOUBLE PRECISION) IS 'Batched access tracking with salience decay used by the AI engine memory access tracker';
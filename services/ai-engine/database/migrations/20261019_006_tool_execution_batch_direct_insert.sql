@@ -0,0 +1,68 @@
+-- log_tool_executions_batch: insert directly instead of looping over
+-- log_tool_execution, which assigned its own id and timestamp and had no
+-- node_name. Rows now keep the client-assigned p_execution_id, p_recorded_at
+-- and p_node_name, and a batch re-sent after an unknown outcome (cancelled
+-- or timed-out flush) is idempotent: ids already written are skipped.
+-- Records whose p_tool_code has no dh_tool row are skipped with a WARNING
+-- (log_tool_execution rejected them too) rather than stored with a NULL
+-- tool_id.
+
+ALTER TABLE tool_executions ADD COLUMN IF NOT EXISTS workflow_run_id TEXT;
+ALTER TABLE tool_executions ADD COLUMN IF NOT EXISTS node_name TEXT;
+
+CREATE OR REPLACE FUNCTION log_tool_executions_batch(p_records JSONB)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    inserted INTEGER;
+    unknown_codes TEXT[];
+BEGIN
+    SELECT array_agg(DISTINCT rec->>'p_tool_code')
+    INTO unknown_codes
+    FROM jsonb_array_elements(p_records) AS rec
+    WHERE NOT EXISTS (SELECT 1 FROM dh_tool t WHERE t.code = rec->>'p_tool_code');
+
+    IF unknown_codes IS NOT NULL THEN
+        RAISE WARNING 'log_tool_executions_batch: skipping records for unknown tool codes %', unknown_codes;
+    END IF;
+
+    INSERT INTO tool_executions (
+        id,
+        tool_id,
+        agent_id,
+        tenant_id,
+        input_params,
+        output_result,
+        error_message,
+        status,
+        execution_time_ms,
+        session_id,
+        workflow_run_id,
+        node_name,
+        created_at
+    )
+    SELECT
+        (rec->>'p_execution_id')::UUID,
+        t.id,
+        (rec->>'p_agent_id')::UUID,
+        (rec->>'p_tenant_id')::UUID,
+        rec->'p_input_params',
+        rec->'p_output_result',
+        rec->>'p_error_message',
+        rec->>'p_status',
+        (rec->>'p_execution_time_ms')::INTEGER,
+        (rec->>'p_session_id')::UUID,
+        rec->>'p_workflow_run_id',
+        rec->>'p_node_name',
+        COALESCE((rec->>'p_recorded_at')::TIMESTAMPTZ, NOW())
+    FROM jsonb_array_elements(p_records) AS rec
+    JOIN dh_tool t ON t.code = rec->>'p_tool_code'
+    ON CONFLICT (id) DO NOTHING;
+
+    GET DIAGNOSTICS inserted = ROW_COUNT;
+    RETURN inserted;
+END;
+$$;
+
+COMMENT ON FUNCTION log_tool_executions_batch(JSONB) IS 'Batched, idempotent tool execution logging used by the AI engine telemetry sink';
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark: CapabilityCatalog query latency vs linear substring scan
+
+Builds a synthetic catalog of skills/tools/templates (default 10k entries) and
+compares BM25 + facet-bitset search against the previous per-entry
+``query in name/description`` scan.
+
+Usage:
+    python scripts/benchmarks/bench_capability_catalog.py [--entries 10000] [--queries 500]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from services.shared.capability_catalog import CapabilityCatalog, CatalogEntry
+
+VOCAB = [
+    "clinical", "trial", "regulatory", "submission", "safety", "signal", "payer",
+    "dossier", "evidence", "literature", "search", "pubmed", "analysis", "market",
+    "access", "pricing", "label", "adverse", "event", "pharmacovigilance", "hta",
+    "protocol", "endpoint", "biomarker", "oncology", "cardiology", "rare", "disease",
+    "guideline", "summary", "report", "extraction", "validation", "statistics",
+]
+KINDS = ["skill", "tool", "template"]
+CATEGORIES = ["analysis", "search", "generation", "validation", "planning", "data_retrieval"]
+COMPLEXITIES = ["basic", "intermediate", "advanced", "expert"]
+REGIONS = ["fda_us", "ema_eu", "pmda_japan", "global"]
+
+
+def build_vocab(rng: random.Random, size: int = 3000):
+    # Domain words plus synthetic long-tail terms (Zipf-like usage below)
+    tail = ["".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=7)) for _ in range(size)]
+    return VOCAB + tail
+
+
+def build_entries(n: int, rng: random.Random):
+    vocab = build_vocab(rng)
+    weights = [1.0 / (rank + 1) for rank in range(len(vocab))]
+    entries = []
+    for i in range(n):
+        name = " ".join(rng.choices(vocab, weights=weights, k=3))
+        description = " ".join(rng.choices(vocab, weights=weights, k=25))
+        entries.append(CatalogEntry(
+            kind=rng.choice(KINDS),
+            id=f"cap_{i}",
+            name=name,
+            description=description,
+            facets={
+                "category": rng.choice(CATEGORIES),
+                "complexity": rng.choice(COMPLEXITIES),
+                "level": rng.sample([1, 2, 3, 4, 5], 2),
+                "region": rng.choice(REGIONS),
+            },
+        ))
+    return entries
+
+
+def linear_scan(entries, query, category):
+    q = query.lower()
+    return [
+        e for e in entries
+        if (q in e.name.lower() or q in e.description.lower())
+        and e.facets["category"] == category
+    ]
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def report(label, samples):
+    ms = [s * 1000 for s in samples]
+    print(
+        f"{label:<28} p50={statistics.median(ms):7.3f}ms  "
+        f"p95={percentile(ms, 0.95):7.3f}ms  max={max(ms):7.3f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=10_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    entries = build_entries(args.entries, rng)
+
+    catalog = CapabilityCatalog()
+    start = time.perf_counter()
+    catalog.upsert_many(entries)
+    build_s = time.perf_counter() - start
+
+    # Re-sync with 1% changed entries to measure incremental rebuild cost
+    changed = [
+        CatalogEntry(kind=e.kind, id=e.id, name=e.name + " updated",
+                     description=e.description, facets=e.facets)
+        for e in rng.sample(entries, max(1, args.entries // 100))
+    ]
+    start = time.perf_counter()
+    catalog.upsert_many(entries[: args.entries // 2])  # unchanged: hash hits
+    catalog.upsert_many(changed)
+    resync_s = time.perf_counter() - start
+
+    queries = [
+        (" ".join(rng.sample(VOCAB, rng.randint(1, 3))), rng.choice(CATEGORIES))
+        for _ in range(args.queries)
+    ]
+
+    catalog_times, scan_times = [], []
+    for text, category in queries:
+        t0 = time.perf_counter()
+        catalog.search(text, filters={"category": category, "level": 3}, limit=20)
+        catalog_times.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        linear_scan(entries, text, category)
+        scan_times.append(time.perf_counter() - t0)
+
+    print(f"entries={args.entries} queries={args.queries}")
+    print(f"full build:      {build_s * 1000:8.1f}ms")
+    print(f"incremental (1%): {resync_s * 1000:8.1f}ms")
+    report("catalog BM25 + facets", catalog_times)
+    report("linear substring scan", scan_times)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-turn context load latency and prompt size over long sessions
+
+Drives EnhancedConversationManager through sessions of --turns turns against
+an in-memory ``conversations`` table that charges a round trip plus a
+per-row transfer cost. Compares, at every turn:
+
+- reload: load_conversation (full history, and with limit=50) followed by
+  format_for_llm, as chat handlers did before
+- incremental: load_context (prebuilt summary + recent window, after the
+  per-turn check for turns written by other replicas)
+
+Reports p50/p99 load latency over the session, prompt tokens and the share
+of earlier turns represented in the prompt (verbatim or summarized) at a few
+checkpoints, and whether the previous turn is in the prompt verbatim.
+
+Usage:
+    python scripts/benchmarks/bench_conversation_context.py [--turns 500] [--rtt-ms 2] [--row-us 20]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import structlog
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from infrastructure.llm.tokenizer import count_messages_tokens
+from services.shared.conversation_context_store import ConversationContextStore
+from services.shared.enhanced_conversation_manager import EnhancedConversationManager, SemanticMemory
+
+structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+TENANT = "550e8400-e29b-41d4-a716-446655440000"
+SYSTEM_PROMPT = "You are a regulatory affairs expert."
+
+
+class Query:
+    def __init__(self, table, rtt_s, row_s):
+        self.table = table
+        self.rtt_s = rtt_s
+        self.row_s = row_s
+        self.payload = None
+        self.desc = False
+        self.limit_n = None
+        self.after = None
+
+    def select(self, *args):
+        return self
+
+    def eq(self, *args):
+        return self
+
+    def gt(self, key, value):
+        self.after = value
+        return self
+
+    def insert(self, payload):
+        self.payload = payload
+        return self
+
+    def order(self, key, desc=False):
+        self.desc = desc
+        return self
+
+    def limit(self, n):
+        self.limit_n = n
+        return self
+
+    def execute(self):
+        # Blocking, like supabase-py; the manager runs it in a worker thread
+        if self.payload is not None:
+            self.table.append(dict(self.payload))
+            rows = [self.payload]
+        else:
+            rows = [r for r in self.table if self.after is None or r["created_at"] > self.after]
+            rows = rows[::-1] if self.desc else rows
+            rows = rows[: self.limit_n] if self.limit_n else rows
+        time.sleep(self.rtt_s + self.row_s * len(rows))
+        return SimpleNamespace(data=rows)
+
+
+class Supabase:
+    def __init__(self, rtt_s, row_s):
+        self.tables = {}
+        self.client = SimpleNamespace(
+            table=lambda name: Query(self.tables.setdefault(name, []), rtt_s, row_s)
+        )
+
+    async def set_tenant_context(self, tenant_id):
+        pass
+
+
+def user_message(i):
+    return f"Turn {i}: what does the FDA expect for the stability data of batch B-{i}? " + "Context detail. " * 12
+
+
+def assistant_message(i):
+    return f"For batch B-{i}, the FDA expects 12 months of real-time data. " + "Supporting rationale. " * 40
+
+
+async def run(args, mode, limit=None):
+    supabase = Supabase(args.rtt_ms / 1000, args.row_us / 1e6)
+    manager = EnhancedConversationManager(supabase, openai_client=SimpleNamespace())
+    # Extractive summaries: the benchmark measures the context path, not an LLM
+    manager.context_store = ConversationContextStore(on_summary=manager._persist_summary)
+
+    async def no_memory(user, assistant):
+        return SemanticMemory(summary="", key_entities={}, extracted_facts=[], user_preferences={}, topics_discussed=[])
+
+    manager._extract_semantic_memory = no_memory
+
+    latencies, checkpoints = [], {}
+    for turn in range(args.turns):
+        started = time.perf_counter()
+        if mode == "reload":
+            turns, _ = await manager.load_conversation(
+                TENANT, "bench", limit=limit or args.turns, include_memory=False
+            )
+            messages = manager.format_for_llm(turns, system_prompt=SYSTEM_PROMPT)
+            covered = len({m["content"].split(":")[0] for m in messages if m["role"] == "user"})
+        else:
+            context = await manager.load_context(TENANT, "bench")
+            messages = context.to_messages(system_prompt=SYSTEM_PROMPT)
+            covered = context.summarized_turns + sum(m["role"] == "user" for m in context.messages)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+        if turn in (100, 250, args.turns - 1):
+            has_previous = any(m["content"].startswith(f"Turn {turn - 1}:") for m in messages)
+            checkpoints[turn] = (count_messages_tokens(messages), covered / turn, has_previous)
+
+        await manager.save_turn(TENANT, "bench", user_message(turn), assistant_message(turn), agent_id="agent_reg")
+        # Let background summary passes run between turns, as they would
+        # while the user reads the answer
+        await asyncio.sleep(0)
+
+    await manager.context_store.flush()
+    return np.array(latencies), checkpoints
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=500)
+    parser.add_argument("--rtt-ms", type=float, default=2.0)
+    parser.add_argument("--row-us", type=float, default=20.0)
+    args = parser.parse_args()
+
+    for label, mode, limit in (
+        ("reload (full)", "reload", None),
+        ("reload (limit=50)", "reload", 50),
+        ("incremental", "incremental", None),
+    ):
+        latencies, checkpoints = await run(args, mode, limit)
+        p50, p99 = np.percentile(latencies, [50, 99])
+        last = np.mean(latencies[-50:])
+        print(f"{label:<18} load p50={p50:7.2f}ms  p99={p99:7.2f}ms  last-50 mean={last:7.2f}ms")
+        for turn, (tokens, coverage, has_previous) in sorted(checkpoints.items()):
+            print(
+                f"{'':<18}   after {turn:>3} turns: prompt={tokens:6d} tokens  "
+                f"earlier turns represented={coverage:6.1%}  previous turn verbatim={has_previous}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark: local faithfulness verification on a large retrieval context
+
+Verifies claims against a synthetic ~50k-token context (many chunks of
+domain-like sentences). Half the claims are lifted from the context with
+light edits; half are recombinations that should not match as phrases.
+Compares the indexed verifier (ContextIndex, built once per response)
+with the previous per-claim approach: regex tokenization of the whole
+context and n-gram substring scans per claim.
+
+Usage:
+    python scripts/benchmarks/bench_faithfulness_local.py [--tokens 50000] [--claims 100] [--repeat 3]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from services.shared.faithfulness_scorer import (
+    STOPWORDS,
+    Claim,
+    ContextIndex,
+    FaithfulnessScorer,
+)
+
+VOCABULARY = (
+    "metformin insulin glucose liver kidney patients dose trial endpoint efficacy safety adverse "
+    "events placebo cohort randomized outcome baseline reduction mortality therapy biomarker "
+    "response elderly renal hepatic exposure label payer access formulary evidence guideline"
+).split()
+GLUE = "the a of in for with and was were is by to from after during than among".split()
+
+
+def synthetic_context(tokens: int, rng: random.Random):
+    chunks, count = [], 0
+    while count < tokens:
+        sentences = []
+        for _ in range(rng.randint(4, 8)):
+            words = [rng.choice(VOCABULARY if i % 2 == 0 else GLUE) for i in range(rng.randint(10, 22))]
+            sentences.append(" ".join(words).capitalize() + ".")
+            count += len(words)
+        chunks.append(" ".join(sentences))
+    return chunks
+
+
+def synthetic_claims(chunks, n: int, rng: random.Random):
+    claims = []
+    for i in range(n):
+        if i % 2 == 0:
+            sentence = rng.choice(rng.choice(chunks).split(". ")).split()
+            claims.append(" ".join(sentence[:6] + ["notably"] + sentence[6:]).rstrip(".") + ".")
+        else:
+            claims.append(" ".join(rng.choice(VOCABULARY) for _ in range(12)).capitalize() + ".")
+    return claims
+
+
+def legacy_verify(claims, context: str):
+    """Previous approach: per-claim tokenization and substring n-gram scans"""
+    context_lower = context.lower()
+    context_words = set(re.findall(r'\b\w+\b', context_lower))
+    matched = 0
+    for claim in claims:
+        claim_lower = claim.lower()
+        claim_words = set(re.findall(r'\b\w+\b', claim_lower))
+        _ = (claim_words - set(STOPWORDS)) & (context_words - set(STOPWORDS))
+        words = claim_lower.split()
+        found = False
+        for n in range(3, min(8, len(claim_words))):
+            for i in range(len(words) - n + 1):
+                if ' '.join(words[i:i + n]) in context_lower:
+                    found = True
+                    break
+            if found:
+                break
+        matched += found
+    return matched
+
+
+def best_of(repeat, fn):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tokens", type=int, default=50_000)
+    parser.add_argument("--claims", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    chunks = synthetic_context(args.tokens, rng)
+    claims = synthetic_claims(chunks, args.claims, rng)
+    scorer = FaithfulnessScorer()
+
+    def indexed():
+        return scorer._verify_claims_local([Claim(text=c) for c in claims], ContextIndex(chunks))
+
+    index_seconds, _ = best_of(args.repeat, lambda: ContextIndex(chunks))
+    indexed_seconds, verified = best_of(args.repeat, indexed)
+    legacy_seconds, legacy_matched = best_of(args.repeat, lambda: legacy_verify(claims, "\n\n".join(chunks)))
+
+    with_spans = sum(1 for c in verified if c.supporting_spans)
+    print(f"context: {len(ContextIndex(chunks).tokens):,} tokens in {len(chunks)} chunks, {len(claims)} claims")
+    print(f"legacy   total={legacy_seconds * 1000:8.1f}ms  phrase matches={legacy_matched}")
+    print(f"indexed  total={indexed_seconds * 1000:8.1f}ms  (index build {index_seconds * 1000:.1f}ms)  "
+          f"claims with spans={with_spans}  speedup={legacy_seconds / indexed_seconds:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Benchmark: full-catalog agent graph relationship rebuild
+
+Builds domain, capability, escalation and collaboration edges for a
+synthetic agent catalog, comparing:
+- legacy: per-keyword substring checks, all-pairs loops, one INSERT ... ON
+  CONFLICT round trip per edge
+- bulk: one regex pass per agent, bitset pair comparison, diff against the
+  current rows, COPY into a staging table + one merge per relationship table
+
+Database time is modelled as round trips x --rtt-ms (plus COPY rows at
+--copy-us-per-row); edge computation is measured for real. The legacy pair
+loops only count edges, so its compute time is a lower bound.
+
+Usage:
+    python scripts/benchmarks/bench_graph_relationship_builder.py [--agents 2000] [--rtt-ms 1.0] [--changed 0.02]
+"""
+
+import argparse
+import random
+import sys
+import time
+from itertools import combinations
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from services.shared.graph_relationship_builder import (
+    CAPABILITY_KEYWORDS,
+    DOMAIN_KEYWORDS,
+    GraphRelationshipBuilder,
+    KeywordMatcher,
+    diff_edges,
+)
+
+
+def make_builder() -> GraphRelationshipBuilder:
+    # Skip __init__: it constructs an OpenAI embeddings client
+    builder = GraphRelationshipBuilder.__new__(GraphRelationshipBuilder)
+    builder.domain_keywords = DOMAIN_KEYWORDS
+    builder.capability_keywords = CAPABILITY_KEYWORDS
+    builder.domain_matcher = KeywordMatcher(DOMAIN_KEYWORDS, bonus_per_match=0.1, max_bonus=0.3)
+    builder.capability_matcher = KeywordMatcher(CAPABILITY_KEYWORDS, bonus_per_match=0.15, max_bonus=0.35)
+    return builder
+
+
+def synthetic_catalog(n: int, rng: random.Random):
+    words = (
+        "clinical patient diagnosis cardiac heart oncology tumor regulatory fda submission trial design "
+        "protocol endpoint randomization drug manufacturing statistics analysis risk safety evidence "
+        "synthesis systematic review strategy market access payer launch"
+    ).split()
+    agents = []
+    for i in range(n):
+        # Each agent draws most of its vocabulary from a narrow specialty
+        focus = rng.sample(words, 6)
+        agents.append({
+            "id": f"agent-{i}",
+            "description": " ".join(rng.choices(focus, k=rng.randint(20, 60)) + rng.choices(words, k=3)),
+            "expertise": rng.choices(focus, k=4),
+            "specialties": rng.choices(focus, k=3),
+            "capabilities": rng.choices(focus, k=5),
+            "agent_level": rng.choice([1, 2, 2, 3, 3, 3]),
+        })
+    return agents
+
+
+def legacy_text_edges(agents, groups, threshold, bonus, max_bonus):
+    edges = {}
+    for agent in agents:
+        text = " ".join([agent["description"], " ".join(agent["expertise"]), " ".join(agent["specialties"]),
+                         " ".join(agent["capabilities"])]).lower()
+        for name, keywords in groups.items():
+            count = sum(1 for kw in keywords if kw in text)
+            score = min(count / len(keywords) + min(count * bonus, max_bonus), 1.0) if count else 0
+            if score >= threshold:
+                edges[(agent["id"], name)] = (score,)
+    return edges
+
+
+def legacy_pair_edges(agents):
+    escalations, collaborations = 0, 0
+    for src in agents:
+        for dst in agents:
+            if dst["agent_level"] < src["agent_level"] and set(src["domains"]) & set(dst["domains"]):
+                escalations += 1
+    for a, b in combinations(agents, 2):
+        shared = set(a["domain_ids"]) & set(b["domain_ids"])
+        complementary = set(a["capability_ids"]) ^ set(b["capability_ids"])
+        if shared and complementary:
+            collaborations += 1
+    return escalations, collaborations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--agents", type=int, default=2000)
+    parser.add_argument("--rtt-ms", type=float, default=1.0)
+    parser.add_argument("--copy-us-per-row", type=float, default=2.0)
+    parser.add_argument("--changed", type=float, default=0.02, help="fraction of agents edited before the rebuild")
+    args = parser.parse_args()
+
+    rng = random.Random(9)
+    builder = make_builder()
+    agents = synthetic_catalog(args.agents, rng)
+    domain_map = {name: name for name in builder.domain_keywords}
+    capability_map = {name: name for name in builder.capability_keywords}
+
+    # Legacy
+    start = time.perf_counter()
+    legacy_domains = legacy_text_edges(agents, builder.domain_keywords, 0.30, 0.1, 0.3)
+    legacy_caps = legacy_text_edges(agents, builder.capability_keywords, 0.40, 0.15, 0.35)
+    by_agent = {}
+    for (agent_id, domain) in legacy_domains:
+        by_agent.setdefault(agent_id, []).append(domain)
+    for agent in agents:
+        agent["domains"] = by_agent.get(agent["id"], [])
+        agent["domain_ids"] = agent["domains"]
+        agent["capability_ids"] = [c for c in capability_map if (agent["id"], c) in legacy_caps]
+    legacy_escalations, legacy_collaborations = legacy_pair_edges(agents)
+    legacy_compute = time.perf_counter() - start
+    legacy_writes = len(legacy_domains) + len(legacy_caps) + legacy_escalations + legacy_collaborations
+    legacy_db = legacy_writes * args.rtt_ms / 1000
+
+    # Bulk, cold (empty tables) and warm (small edit) rebuilds
+    def bulk(current):
+        start = time.perf_counter()
+        tables = {
+            "domains": builder.compute_domain_edges(agents, domain_map),
+            "capabilities": builder.compute_capability_edges(agents, capability_map),
+            "escalations": builder.compute_escalation_edges(agents),
+            "collaborations": builder.compute_collaboration_edges(agents),
+        }
+        rows, round_trips = 0, 0
+        for name, edges in tables.items():
+            upserts, deletes = diff_edges(current.get(name, {}), edges)
+            round_trips += 1  # read current rows
+            if upserts or deletes:
+                rows += len(upserts) + len(deletes)
+                round_trips += 4  # begin, create stage, copy, merge+commit
+        compute = time.perf_counter() - start
+        db = round_trips * args.rtt_ms / 1000 + rows * args.copy_us_per_row / 1e6
+        return tables, compute, db, rows
+
+    cold_tables, cold_compute, cold_db, cold_rows = bulk({})
+    for agent in rng.sample(agents, int(len(agents) * args.changed)):
+        agent["description"] += " oncology tumor cancer chemotherapy"
+    _, warm_compute, warm_db, warm_rows = bulk(cold_tables)
+
+    edges = sum(len(t) for t in cold_tables.values())
+    print(f"catalog: {args.agents:,} agents, {edges:,} edges, rtt={args.rtt_ms}ms")
+    print(f"legacy        compute={legacy_compute:7.2f}s  writes={legacy_writes:8,} round trips  "
+          f"db~{legacy_db:7.2f}s  total~{legacy_compute + legacy_db:7.2f}s")
+    print(f"bulk (cold)   compute={cold_compute:7.2f}s  copied={cold_rows:8,} rows            "
+          f"db~{cold_db:7.2f}s  total~{cold_compute + cold_db:7.2f}s")
+    print(f"bulk (+{args.changed:.0%} edit) compute={warm_compute:5.2f}s  copied={warm_rows:8,} rows            "
+          f"db~{warm_db:7.2f}s  total~{warm_compute + warm_db:7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
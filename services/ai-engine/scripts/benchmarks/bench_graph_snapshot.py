@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Benchmark: knowledge graph traversal from the in-memory CSR snapshot vs APOC
+
+Builds a synthetic ontology/agent graph (--edges edges, power-law degrees,
+typed and weighted) into a graphrag.graph_snapshot.GraphSnapshot and
+measures:
+- build time and memory of the snapshot
+- 1-hop and 2-hop paths() (the traverse_graph replacement), BFS and
+  weighted k-hop latency from random seeds
+- a dict-of-lists BFS over the same edges, for the pure-Python baseline
+
+With --neo4j the snapshot is instead built from the configured Neo4j
+(NEO4J_URI/USERNAME/PASSWORD) and the same seeds are traversed through
+Neo4jClient.traverse_graph (apoc.path.expandConfig) for comparison.
+
+Usage:
+    python scripts/benchmarks/bench_graph_snapshot.py [--edges 1000000] [--queries 200] [--neo4j]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from graphrag.graph_snapshot import GraphSnapshot, GraphSnapshotManager
+
+LABELS = ["Function", "Department", "Role", "JTBD", "Agent", "Persona", "Workflow"]
+EDGE_TYPES = ["HAS_DEPARTMENT", "HAS_ROLE", "PERFORMS", "COLLABORATES_WITH", "ESCALATES_TO", "TRIGGERS"]
+
+
+def synthetic_graph(nodes: int, edges: int, rng: random.Random):
+    node_records = [
+        {"nid": i, "labels": [LABELS[i % len(LABELS)]], "props": {"id": f"n{i}", "name": f"Node {i}"}}
+        for i in range(nodes)
+    ]
+    # Preferential attachment-ish: endpoints skewed towards low ids (hubs)
+    edge_records = []
+    for _ in range(edges):
+        src = int(nodes * rng.random() ** 2)
+        dst = rng.randrange(nodes)
+        edge_records.append({
+            "src": src,
+            "dst": dst,
+            "type": EDGE_TYPES[rng.randrange(len(EDGE_TYPES))],
+            "props": {"weight": round(rng.uniform(0.1, 1.0), 2)},
+        })
+    return node_records, edge_records
+
+
+def python_bfs(adjacency, seed: int, max_hops: int, limit: int):
+    seen = {seed}
+    queue = deque([(seed, 0)])
+    reached = []
+    while queue and len(reached) < limit:
+        node, hops = queue.popleft()
+        if hops == max_hops:
+            continue
+        for neighbor in adjacency[node]:
+            if neighbor not in seen:
+                seen.add(neighbor)
+                reached.append(neighbor)
+                queue.append((neighbor, hops + 1))
+    return reached
+
+
+def timed(fn, seeds):
+    latencies = []
+    for seed in seeds:
+        started = time.perf_counter()
+        fn(seed)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def report(label, latencies):
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+    print(f"  {label:<34} p50={statistics.median(ordered):8.3f}ms  p95={p95:8.3f}ms")
+
+
+async def run_neo4j(args, rng):
+    from graphrag.clients.neo4j_client import get_neo4j_client
+
+    manager = GraphSnapshotManager(enabled=True)
+    snapshot = await manager.refresh()
+    if snapshot is None:
+        sys.exit("Could not export the graph from Neo4j")
+    print(f"snapshot of live graph: {len(snapshot):,} nodes, {len(snapshot.edge_src):,} edges, "
+          f"built in {snapshot.build_ms:,.0f} ms, {snapshot.memory_bytes() / 1e6:,.1f} MB")
+    seeds = [str(int(snapshot.neo4j_ids[rng.randrange(len(snapshot))])) for _ in range(args.queries)]
+
+    client = await get_neo4j_client()
+    for hops in (1, 2):
+        apoc = []
+        for seed in seeds:
+            started = time.perf_counter()
+            # Bypass the snapshot so the APOC path is measured
+            await client.run_query(
+                "MATCH (seed) WHERE id(seed) IN $seed_ids "
+                "CALL apoc.path.expandConfig(seed, {maxLevel: $max_hops, limit: $limit}) YIELD path "
+                "RETURN nodes(path) AS nodes, relationships(path) AS edges, length(path) AS path_length "
+                "ORDER BY path_length ASC LIMIT $limit",
+                {"seed_ids": [int(seed)], "max_hops": hops, "limit": args.limit},
+            )
+            apoc.append((time.perf_counter() - started) * 1000)
+        report(f"{hops}-hop APOC expandConfig", apoc)
+        report(f"{hops}-hop snapshot paths()", timed(
+            lambda seed: snapshot.paths([seed], max_hops=hops, limit=args.limit), seeds))
+    await client.disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--edges", type=int, default=1_000_000)
+    parser.add_argument("--nodes", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=50, help="paths per traversal (traverse_graph default)")
+    parser.add_argument("--neo4j", action="store_true", help="compare against the configured Neo4j with APOC")
+    args = parser.parse_args()
+    rng = random.Random(11)
+
+    if args.neo4j:
+        asyncio.run(run_neo4j(args, rng))
+        return
+
+    node_records, edge_records = synthetic_graph(args.nodes, args.edges, rng)
+    snapshot = GraphSnapshot.build(node_records, edge_records, version=1)
+    stats = snapshot.stats()
+    print(f"snapshot: {stats['total_nodes']:,} nodes, {stats['total_edges']:,} edges, "
+          f"built in {snapshot.build_ms:,.0f} ms, {snapshot.memory_bytes() / 1e6:,.1f} MB, "
+          f"max degree {stats['degree']['max']:,}")
+
+    started = time.perf_counter()
+    for _ in range(1000):
+        snapshot.stats()
+    print(f"  stats(): {(time.perf_counter() - started) * 1000:.3f} us per call (precomputed)")
+
+    seeds = [rng.randrange(args.nodes) for _ in range(args.queries)]
+    keys = [snapshot.node_keys[seed] for seed in seeds]
+    adjacency = defaultdict(list)
+    for record in edge_records:
+        adjacency[record["src"]].append(record["dst"])
+        adjacency[record["dst"]].append(record["src"])
+
+    for hops in (1, 2):
+        print(f"{hops}-hop traversal, limit {args.limit}:")
+        report("snapshot paths() (traverse_graph)", timed(
+            lambda key: snapshot.paths([key], max_hops=hops, limit=args.limit), keys))
+        report("snapshot bfs() unlimited", timed(lambda seed: snapshot.bfs([seed], max_hops=hops), seeds))
+        report("snapshot weighted_k_hop()", timed(
+            lambda seed: snapshot.weighted_k_hop([seed], max_hops=hops, top_k=args.limit), seeds))
+        report("python dict bfs (no filters)", timed(
+            lambda seed: python_bfs(adjacency, seed, hops, args.limit), seeds))
+
+    page_latencies, cursor = [], None
+    for _ in range(args.queries):
+        started = time.perf_counter()
+        _, cursor = snapshot.page_nodes(labels=["Agent", "Role"], after=cursor, limit=200)
+        page_latencies.append((time.perf_counter() - started) * 1000)
+    report("keyset page (200 nodes, 2 labels)", page_latencies)
+    print("(APOC comparison: rerun with --neo4j against a populated database)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Benchmark: mixed interactive/background LLM load, ungoverned clients vs LLMGateway
+
+Simulates a mission burst (background calls) arriving together with a steady
+stream of interactive chat calls against a fake provider that enforces a
+request rate and a concurrency cap by answering 429 with Retry-After.
+
+Ungoverned callers use SDK-style exponential backoff with jitter (what every
+module gets today from ChatOpenAI's own retries); governed callers go through
+one LLMGateway configured with the provider's budget.
+
+Usage:
+    python scripts/benchmarks/bench_llm_gateway.py [--background 400] [--interactive 80] [--rps 60] [--budget-factor 0.95]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from core.llm_gateway import LaneBudget, LLMGateway, Priority
+
+
+class ProviderRateLimited(Exception):
+    status_code = 429
+
+    def __init__(self, retry_after: float):
+        super().__init__("429 Too Many Requests")
+        self.retry_after = retry_after
+
+
+class FakeProvider:
+    """Token-bucket rate limit plus a concurrency cap, like a real LLM API"""
+
+    def __init__(self, rps: float, max_concurrency: int, latency: float):
+        self.rps = rps
+        self.max_concurrency = max_concurrency
+        self.latency = latency
+        self.level = rps  # one second of burst
+        self.updated = time.monotonic()
+        self.in_flight = 0
+        self.ok = 0
+        self.throttled = 0
+
+    async def complete(self):
+        now = time.monotonic()
+        self.level = min(self.rps, self.level + (now - self.updated) * self.rps)
+        self.updated = now
+        if self.level < 1 or self.in_flight >= self.max_concurrency:
+            self.throttled += 1
+            raise ProviderRateLimited(retry_after=max(0.05, (1 - self.level) / self.rps))
+        self.level -= 1
+        self.in_flight += 1
+        try:
+            await asyncio.sleep(self.latency * random.uniform(0.7, 1.3))
+            self.ok += 1
+            return "ok"
+        finally:
+            self.in_flight -= 1
+
+
+async def ungoverned_call(provider: FakeProvider, max_retries: int = 6):
+    delay = 0.05
+    for attempt in range(max_retries + 1):
+        try:
+            return await provider.complete()
+        except ProviderRateLimited:
+            if attempt == max_retries:
+                raise
+            await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+            delay = min(delay * 2, 2.0)
+
+
+def governed_call(gateway: LLMGateway, provider: FakeProvider, priority: Priority):
+    async def call():
+        return await gateway.call("fake", "model", provider.complete, tokens=500, priority=priority)
+    return call
+
+
+async def run(make_call, args):
+    random.seed(7)
+    interactive_latency, failures = [], {"interactive": 0, "background": 0}
+
+    async def timed(kind, fn):
+        start = time.perf_counter()
+        try:
+            await fn()
+        except Exception:
+            failures[kind] += 1
+            return
+        if kind == "interactive":
+            interactive_latency.append(time.perf_counter() - start)
+
+    async def interactive_stream():
+        tasks = []
+        for _ in range(args.interactive):
+            tasks.append(asyncio.create_task(timed("interactive", make_call(Priority.INTERACTIVE))))
+            await asyncio.sleep(args.interactive_gap_ms / 1000)
+        await asyncio.gather(*tasks)
+
+    start = time.perf_counter()
+    background = [
+        asyncio.create_task(timed("background", make_call(Priority.BACKGROUND)))
+        for _ in range(args.background)
+    ]
+    await interactive_stream()
+    await asyncio.gather(*background)
+    elapsed = time.perf_counter() - start
+
+    lat = sorted(interactive_latency)
+    p95 = lat[int(len(lat) * 0.95) - 1] if lat else float("nan")
+    return elapsed, lat, p95, failures
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--background", type=int, default=400)
+    parser.add_argument("--interactive", type=int, default=80)
+    parser.add_argument("--interactive-gap-ms", type=float, default=50.0)
+    parser.add_argument("--rps", type=float, default=60.0)
+    parser.add_argument("--provider-concurrency", type=int, default=24)
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    parser.add_argument("--budget-factor", type=float, default=0.95,
+                        help="gateway RPM budget as a fraction of the provider limit (>1 exercises AIMD)")
+    args = parser.parse_args()
+
+    print(f"workload: {args.background} background burst + {args.interactive} interactive "
+          f"(every {args.interactive_gap_ms:.0f}ms); provider {args.rps:.0f} rps, "
+          f"{args.provider_concurrency} concurrent, {args.latency_ms:.0f}ms latency")
+
+    for label in ("ungoverned", "gateway"):
+        provider = FakeProvider(args.rps, args.provider_concurrency, args.latency_ms / 1000)
+        if label == "ungoverned":
+            def make_call(priority, provider=provider):
+                return lambda: ungoverned_call(provider)
+        else:
+            gateway = LLMGateway(
+                default_budget=LaneBudget(
+                    rpm=args.rps * 60 * args.budget_factor,
+                    tpm=0,
+                    max_concurrency=args.provider_concurrency,
+                    burst_seconds=1.0,
+                ),
+            )
+
+            def make_call(priority, gateway=gateway, provider=provider):
+                return governed_call(gateway, provider, priority)
+
+        elapsed, lat, p95, failures = await run(make_call, args)
+        attempts = provider.ok + provider.throttled
+        print(
+            f"{label:<11} makespan={elapsed:6.2f}s  goodput={provider.ok / elapsed:6.1f} req/s  "
+            f"429s={provider.throttled:5d} ({provider.throttled / max(attempts, 1):5.1%} of attempts)  "
+            f"failed={failures['interactive'] + failures['background']:3d}  "
+            f"interactive p50={statistics.median(lat) * 1000 if lat else float('nan'):7.1f}ms "
+            f"p95={p95 * 1000:7.1f}ms"
+        )
+        if label == "gateway":
+            print(f"gateway stats: {gateway.get_statistics()['lanes']['fake:model']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
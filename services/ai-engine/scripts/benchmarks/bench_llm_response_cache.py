@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark: repeated and concurrent identical LLM requests, with and without the response cache
+
+Replays a planning workload where a fraction of requests repeat an earlier
+prompt (retries, re-scoring, identical missions) and bursts of identical
+requests arrive concurrently (panel members, fan-out). Upstream is a fake
+chat model with fixed latency and token usage priced as gpt-4o-mini.
+
+Usage:
+    python scripts/benchmarks/bench_llm_response_cache.py [--requests 400] [--unique 120] [--burst 8] [--latency-ms 400]
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from core.cost_tracking import CostTracker, get_model_pricing
+from core.llm_gateway import LaneBudget, LLMGateway
+from core.llm_response_cache import LLMResponseCache
+
+
+class FakeChatModel:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    @property
+    def _identifying_params(self):
+        return {"model_name": "gpt-4o-mini", "temperature": 0.0}
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return AIMessage(
+            content="plan",
+            usage_metadata={"input_tokens": 1800, "output_tokens": 600, "total_tokens": 2400},
+        )
+
+
+async def run(args, cached: bool):
+    random.seed(11)
+    tracker = CostTracker()
+    cache = LLMResponseCache(cost_tracker=tracker, enabled=True)
+    gateway = LLMGateway(
+        default_budget=LaneBudget(rpm=0, tpm=0, max_concurrency=args.concurrency),
+        response_cache=cache,
+    )
+    model = FakeChatModel(args.latency_ms / 1000)
+    llm = gateway.govern(model, "openai", "gpt-4o-mini")
+    if cached:
+        llm = llm.with_cache("bench.plan")
+
+    # Bursts of identical prompts drawn from a skewed prompt population
+    prompts = [f"mission {int(random.paretovariate(1.2)) % args.unique}" for _ in range(args.requests // args.burst)]
+    start = time.perf_counter()
+    for prompt in prompts:
+        await asyncio.gather(*(llm.ainvoke([HumanMessage(content=prompt)]) for _ in range(args.burst)))
+    elapsed = time.perf_counter() - start
+
+    metrics = tracker.get_metrics()
+    return elapsed, model.calls, metrics, cache.get_statistics()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--unique", type=int, default=120)
+    parser.add_argument("--burst", type=int, default=8, help="identical requests issued concurrently")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=400.0)
+    args = parser.parse_args()
+
+    print(f"workload: {args.requests} requests in bursts of {args.burst}, "
+          f"<= {args.unique} distinct prompts, {args.latency_ms:.0f}ms upstream latency")
+    call_cost = get_model_pricing("gpt-4o-mini").calculate_cost(1800, 600)
+    for label, cached in (("uncached", False), ("cached", True)):
+        elapsed, upstream, metrics, stats = await run(args, cached)
+        print(
+            f"{label:<9} wall={elapsed:6.2f}s  upstream_calls={upstream:4d}  "
+            f"hit_rate={stats['hit_rate'] if cached else 0.0:5.1%}  coalesced={stats['coalesced']:4d}  "
+            f"upstream_cost=${upstream * call_cost:.4f}  saved=${metrics['saved_cost']:.4f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Benchmark: local embedding consensus vs the LLM-only consensus analysis
+
+For each panel round, runs AdvancedConsensusAnalyzer in "local" mode
+(embeddings + one optional narrative call) and in "llm" mode (the previous
+analysis: one LLM call per metric plus themes and recommendation) and
+reports:
+- LLM calls and prompt/completion-budget tokens per round for each mode
+- local analysis latency
+- consensus quality: level accuracy against labelled panels, score ordering
+  (pairwise concordance with the labels), and, with --llm, agreement between
+  the two modes' scores and levels
+
+Panels come from --recorded FILE.jsonl (one {"question", "responses",
+"label"?} per line, responses as passed to analyze_consensus) or from the
+small labelled set built in here. Without --llm the LLM-only mode runs
+against a recording stub, so only its cost is measured; with --llm both
+modes use the configured LLMService and embedding service.
+
+Usage:
+    python scripts/benchmarks/bench_panel_consensus.py [--recorded panels.jsonl] [--llm]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from infrastructure.llm.tokenizer import count_tokens
+from services.panel.consensus_analyzer import AdvancedConsensusAnalyzer
+from services.panel.local_consensus import LocalConsensusEngine
+
+LEVELS = {"low": 0, "medium": 1, "high": 2}
+
+BUILTIN_PANELS = [
+    {
+        "label": "high",
+        "question": "Should we request a pre-IND meeting for the hepatic indication?",
+        "responses": [
+            {"agent_name": "Regulatory", "content": "The phase 2 data support an accelerated approval pathway. Hepatic safety signals are manageable with monitoring. We recommend you proceed with the FDA pre-IND meeting next quarter (NCT01234567)."},
+            {"agent_name": "Clinical", "content": "Phase 2 data support an accelerated approval pathway for this indication. Hepatic safety signals are manageable with routine monitoring. I recommend we proceed with a pre-IND meeting with FDA, citing NCT01234567."},
+            {"agent_name": "Biostatistics", "content": "The phase 2 efficacy data support an accelerated approval pathway. The hepatic safety signals are manageable with monitoring. We should proceed with the pre-IND meeting and cite NCT01234567."},
+        ],
+    },
+    {
+        "label": "medium",
+        "question": "Should the launch include the EU markets in year one?",
+        "responses": [
+            {"agent_name": "Commercial", "content": "EU payer access will take twelve to eighteen months in most markets. Germany offers early access through AMNOG pricing. We recommend you proceed with a Germany-first launch in year one."},
+            {"agent_name": "Market Access", "content": "Germany offers early access through AMNOG pricing, while France and Italy take longer. EU payer access will take over a year elsewhere. Proceed with Germany in year one and monitor HTA outcomes carefully."},
+            {"agent_name": "Medical Affairs", "content": "Medical education in the EU needs at least nine months of preparation. Key opinion leaders are not yet engaged in France. Consider a phased launch and gather more data on KOL readiness first."},
+        ],
+    },
+    {
+        "label": "low",
+        "question": "Should we stop the oncology program after the interim analysis?",
+        "responses": [
+            {"agent_name": "Clinical", "content": "The interim analysis shows a clear survival benefit in the biomarker-positive cohort. The safety profile is acceptable. We recommend you proceed to the confirmatory trial."},
+            {"agent_name": "Finance", "content": "The program has consumed most of its budget and the net present value is negative. The commercial forecast does not justify the confirmatory trial. You should not proceed and should discontinue the program."},
+            {"agent_name": "Biostatistics", "content": "The interim analysis does not show a survival benefit after multiplicity adjustment. The biomarker subgroup was not prespecified. Investigate the subgroup further before any decision."},
+        ],
+    },
+    {
+        "label": "high",
+        "question": "Is the current REMS program adequate?",
+        "responses": [
+            {"agent_name": "Safety", "content": "The current REMS program is adequate for the observed risk profile. Pharmacy certification rates are above ninety percent. Proceed with the current REMS and report annually."},
+            {"agent_name": "Regulatory", "content": "The REMS program is adequate for the observed risk profile. Certification rates in pharmacies exceed ninety percent. We recommend you proceed with the current REMS and annual reporting."},
+        ],
+    },
+    {
+        "label": "low",
+        "question": "Which pricing strategy should we adopt?",
+        "responses": [
+            {"agent_name": "Pricing", "content": "A premium price is justified by the superior efficacy data. Payers will accept a premium with outcomes-based contracts. Proceed with premium pricing at launch."},
+            {"agent_name": "Market Access", "content": "Payers will not accept a premium without head-to-head data. Formulary exclusions are likely at a premium price. You should not proceed with premium pricing; launch at parity instead."},
+        ],
+    },
+]
+
+
+class RecordingLLM:
+    """LLMService stand-in that records what the analysis would send"""
+
+    def __init__(self, delegate=None):
+        self.delegate = delegate
+        self.calls = []
+
+    async def generate(self, prompt, model="gpt-4o-mini", temperature=0.7, max_tokens=2000):
+        self.calls.append((count_tokens(prompt), max_tokens))
+        if self.delegate is not None:
+            return await self.delegate.generate(prompt=prompt, model=model, temperature=temperature, max_tokens=max_tokens)
+        return "0.5"
+
+
+def concordance(scores, labels):
+    """Share of differently-labelled panel pairs whose scores are ordered like the labels"""
+    pairs = agree = 0
+    for i in range(len(scores)):
+        for j in range(i + 1, len(scores)):
+            if labels[i] == labels[j]:
+                continue
+            pairs += 1
+            agree += (scores[i] - scores[j]) * (labels[i] - labels[j]) > 0
+    return agree / pairs if pairs else float("nan")
+
+
+async def run(args):
+    panels = BUILTIN_PANELS
+    if args.recorded:
+        panels = [json.loads(line) for line in Path(args.recorded).read_text().splitlines() if line.strip()]
+
+    delegate = None
+    if args.llm:
+        from services.llm_service import get_llm_service
+
+        delegate = get_llm_service()
+    # Offline runs use the TF-IDF fallback rather than the embedding service
+    local_engine = LocalConsensusEngine() if args.llm else LocalConsensusEngine(embed=None)
+
+    local_llm, llm_only = RecordingLLM(delegate), RecordingLLM(delegate)
+    local = AdvancedConsensusAnalyzer(local_llm, mode="local", local_engine=local_engine)
+    legacy = AdvancedConsensusAnalyzer(llm_only, mode="llm")
+
+    rows = []
+    for panel in panels:
+        for detailed in (False, True):
+            before_local, before_llm = len(local_llm.calls), len(llm_only.calls)
+            started = time.perf_counter()
+            local_result = await local.analyze_consensus(panel["question"], panel["responses"], detailed)
+            local_ms = (time.perf_counter() - started) * 1000
+            started = time.perf_counter()
+            llm_result = await legacy.analyze_consensus(panel["question"], panel["responses"], detailed)
+            llm_ms = (time.perf_counter() - started) * 1000
+            rows.append({
+                "label": panel.get("label"),
+                "detailed": detailed,
+                "local": local_result,
+                "llm": llm_result,
+                "local_ms": local_ms,
+                "llm_ms": llm_ms,
+                "local_calls": local_llm.calls[before_local:],
+                "llm_calls": llm_only.calls[before_llm:],
+            })
+
+    embedding = rows[0]["local"].analysis_metadata.get("embedding")
+    print(f"{len(panels)} panels ({'recorded' if args.recorded else 'built-in'}), local embeddings: {embedding}\n")
+    for detailed in (False, True):
+        subset = [r for r in rows if r["detailed"] == detailed]
+        kind = "final analysis (narrative)" if detailed else "per-round check"
+        print(f"{kind}:")
+        for mode in ("local", "llm"):
+            calls = [len(r[f"{mode}_calls"]) for r in subset]
+            prompt = [sum(p for p, _ in r[f"{mode}_calls"]) for r in subset]
+            budget = [sum(m for _, m in r[f"{mode}_calls"]) for r in subset]
+            print(f"  {mode:<5} LLM calls/round={statistics.mean(calls):4.1f}  prompt tokens/round={statistics.mean(prompt):7.0f}"
+                  f"  completion budget/round={statistics.mean(budget):6.0f}")
+        local_ms = sorted(r["local_ms"] for r in subset)
+        print(f"  local analysis latency p50={statistics.median(local_ms):.1f}ms max={local_ms[-1]:.1f}ms"
+              f"{'' if args.llm else ' (LLM-only latency not measured against the stub)'}")
+
+    finals = [r for r in rows if r["detailed"]]
+    labelled = [r for r in finals if r["label"] in LEVELS]
+    if labelled:
+        labels = [LEVELS[r["label"]] for r in labelled]
+        print("\nquality against labels:")
+        for mode in ("local", "llm") if args.llm else ("local",):
+            results = [r[mode] for r in labelled]
+            accuracy = statistics.mean(res.consensus_level == r["label"] for res, r in zip(results, labelled))
+            order = concordance([res.consensus_score for res in results], labels)
+            print(f"  {mode:<5} level accuracy={accuracy:.0%}  score ordering concordance={order:.0%}")
+        for r in labelled:
+            print(f"    [{r['label']:>6}] local={r['local'].consensus_score:.2f} ({r['local'].consensus_level})"
+                  + (f"  llm={r['llm'].consensus_score:.2f} ({r['llm'].consensus_level})" if args.llm else ""))
+    if args.llm:
+        agreement = statistics.mean(r["local"].consensus_level == r["llm"].consensus_level for r in finals)
+        gap = statistics.mean(abs(r["local"].consensus_score - r["llm"].consensus_score) for r in finals)
+        print(f"\nlocal vs llm: level agreement={agreement:.0%}, mean score gap={gap:.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--recorded", help="JSONL of recorded panel rounds")
+    parser.add_argument("--llm", action="store_true", help="call the configured LLM and embedding services")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: mission tail latency, sequential vs concurrent post-synthesis gates
+
+Fake gates model the real ones: citation verification and the quality gate
+are network-bound (jittered lognormal latency), reflection is a short
+CPU-bound heuristic. Reports p50/p95/p99 of the post-synthesis stage.
+
+Usage:
+    python scripts/benchmarks/bench_post_synthesis_gates.py [--missions 300] [--scale 0.1]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from langgraph_workflows.modes34.post_synthesis import GATE_ORDER, run_post_synthesis_gates
+
+
+def make_gates(rng: random.Random, scale: float):
+    # (median seconds, sigma) per gate before scaling
+    citation_s = rng.lognormvariate(0, 0.6) * 1.2 * scale
+    quality_s = rng.lognormvariate(0, 0.6) * 2.0 * scale
+    reflection_s = 0.02 * scale
+
+    async def verify_citations(state):
+        await asyncio.sleep(citation_s)
+        return {"citation_verification_rate": 0.95}
+
+    async def quality_gate(state):
+        await asyncio.sleep(quality_s)
+        return {"overall_quality": 0.85, "quality_passed": True}
+
+    def _reflect():
+        deadline = time.perf_counter() + reflection_s
+        while time.perf_counter() < deadline:
+            pass
+
+    async def reflection_gate(state):
+        await asyncio.to_thread(_reflect)
+        return {"reflection_score": 0.8}
+
+    return {
+        "verify_citations": verify_citations,
+        "quality_gate": quality_gate,
+        "reflection_gate": reflection_gate,
+    }
+
+
+async def sequential(state, gates):
+    merged = {}
+    for name in GATE_ORDER:
+        merged.update(await gates[name](state))
+    return merged
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def summarize(label, latencies):
+    ms = [l * 1000 for l in latencies]
+    print(
+        f"{label:<11} p50={percentile(ms, 50):8.1f}ms  p95={percentile(ms, 95):8.1f}ms  "
+        f"p99={percentile(ms, 99):8.1f}ms  mean={statistics.mean(ms):8.1f}ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--missions", type=int, default=300)
+    parser.add_argument("--scale", type=float, default=0.1, help="Latency scale (1.0 = production-like)")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    state = {"final_output": {"content": "draft", "citations": [{"id": 1}]}}
+
+    for label, runner in (("sequential", sequential), ("concurrent", run_post_synthesis_gates)):
+        rng = random.Random(args.seed)  # identical latency draws for both modes
+        semaphore = asyncio.Semaphore(args.concurrency)
+        latencies = []
+
+        async def mission():
+            gates = make_gates(rng, args.scale)
+            async with semaphore:
+                start = time.perf_counter()
+                await runner(state, gates)
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(mission() for _ in range(args.missions)))
+        summarize(label, latencies)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
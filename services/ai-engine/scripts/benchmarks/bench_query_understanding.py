@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark: query understanding per request across the three query routers
+
+Replays a synthetic query stream (Zipf-repeated queries, as in production
+where popular questions recur) through the three routers that analyze the
+query text: RAG strategy classification, tool intent keywords and evidence
+domain keywords. Compares:
+- legacy: every router re-analyzes the query; the classifier searches every
+  intent/complexity regex per request
+- unified: QueryUnderstandingService, one literal-indexed pass per distinct
+  normalized query, shared by all routers
+
+Usage:
+    python scripts/benchmarks/bench_query_understanding.py [--requests 20000] [--distinct 2000]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from langgraph_workflows.ask_expert.shared.nodes.parallel_tools_executor import INTENT_KEYWORDS
+from services.consultation.query_classifier import QueryClassifier
+from services.consultation.query_understanding import QueryUnderstandingService
+
+EVIDENCE_KEYWORDS = {
+    "medical": ["patient", "clinical", "disease", "treatment", "drug", "diagnosis", "therapy"],
+    "regulatory": ["fda", "ema", "approval", "clearance", "regulatory", "submission", "guidance"],
+    "compliance": ["hipaa", "gdpr", "compliance", "privacy", "security", "audit", "iso"],
+}
+
+TEMPLATES = [
+    "What is the FDA approval pathway for {drug} in {area}?",
+    "Compare the efficacy and safety of {drug} versus placebo in {area} patients",
+    "What are the side effects and dosage of {drug}?",
+    "Explore recent publications and meta-analysis on {drug} for {area}",
+    "How does the manufacturing process and stability testing work for {drug}?",
+    "What is the market access and pricing strategy for {drug} in {area}?",
+]
+DRUGS = ["Pembrolizumab", "metformin", "Imatinib", "semaglutide", "Adalimumab", "aspirin", "Lisinopril"]
+AREAS = ["oncology", "type 2 diabetes", "heart failure", "rheumatoid arthritis", "obesity"]
+
+
+def legacy_request(classifier: QueryClassifier, all_patterns, query: str):
+    """Previous shape: per-pattern searches, keyword tables re-scanned per router"""
+    counts = [sum(1 for p in patterns if p.search(query)) for patterns in all_patterns]
+    words = re.findall(r'\b\w+\b', query.lower())
+    entities = [m for p in classifier.ENTITY_PATTERNS for m in re.findall(p, query)]
+    query_lower = query.lower()
+    tools = {intent: sum(1 for kw in kws if kw in query_lower) for intent, kws in INTENT_KEYWORDS.items()}
+    text_lower = query.lower()
+    domains = [d for d, kws in EVIDENCE_KEYWORDS.items() if any(kw in text_lower for kw in kws)]
+    return counts, words, entities, tools, domains
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--distinct", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    distinct = [
+        rng.choice(TEMPLATES).format(drug=rng.choice(DRUGS), area=rng.choice(AREAS)) + f" ({i})"
+        for i in range(args.distinct)
+    ]
+    weights = [1 / (rank + 1) for rank in range(len(distinct))]
+    stream = rng.choices(distinct, weights=weights, k=args.requests)
+
+    classifier = QueryClassifier()
+    all_patterns = [
+        [re.compile(p, re.IGNORECASE) for p in patterns]
+        for patterns in (
+            classifier.REGULATORY_PATTERNS, classifier.CLINICAL_PATTERNS, classifier.RESEARCH_PATTERNS,
+            classifier.OPERATIONAL_PATTERNS, classifier.COMMERCIAL_PATTERNS, classifier.TECHNICAL_PATTERNS,
+            classifier.SIMPLE_INDICATORS, classifier.COMPLEX_INDICATORS, classifier.EXPLORATORY_INDICATORS,
+        )
+    ]
+
+    start = time.perf_counter()
+    for query in stream:
+        legacy_request(classifier, all_patterns, query)
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for query in distinct:
+        classifier.classify(query)
+    single_pass_seconds = time.perf_counter() - start
+
+    service = QueryUnderstandingService()
+    start = time.perf_counter()
+    for query in stream:
+        understanding = service.understand(query)
+        understanding.classification
+        understanding.keyword_counts("tool_intent", INTENT_KEYWORDS)
+        understanding.keyword_counts("evidence_domain", EVIDENCE_KEYWORDS)
+    unified_seconds = time.perf_counter() - start
+
+    per_request = lambda seconds: seconds / args.requests * 1e6
+    print(f"stream: {args.requests:,} requests over {args.distinct:,} distinct queries")
+    print(f"legacy         {per_request(legacy_seconds):8.1f} us/request")
+    print(f"single pass    {single_pass_seconds / args.distinct * 1e6:8.1f} us/classification (uncached)")
+    print(f"unified        {per_request(unified_seconds):8.1f} us/request  "
+          f"speedup={legacy_seconds / unified_seconds:5.1f}x  stats={service.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark: import time and time-to-first-request, lazy vs eager route groups
+
+Two measurements:
+- process: fresh interpreter per run, times `import main` and the first
+  GET /health plus the first request into a lazily mounted group, with
+  ROUTES_LAZY=true and ROUTES_LAZY=false
+- graph: the lifespan startup graph with synthetic per-component latencies,
+  initialized one after another vs by StartupOrchestrator
+
+Usage:
+    python scripts/benchmarks/bench_startup.py [--runs 3] [--component-ms 200] [--skip-process]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SRC = Path(__file__).parent.parent.parent / "src"
+
+# Add src to path
+sys.path.insert(0, str(SRC))
+
+PROBE = """
+import json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+client = TestClient(main.app)
+client.get("/health")
+first = time.perf_counter()
+client.get("/api/v1/panels/templates")
+lazy_hit = time.perf_counter()
+print(json.dumps({
+    "import_s": imported - started,
+    "first_request_s": first - started,
+    "first_heavy_request_s": lazy_hit - started,
+}))
+"""
+
+
+def measure_process(lazy: bool, runs: int):
+    env = dict(os.environ, ROUTES_LAZY="true" if lazy else "false", PYTHONPATH=str(SRC))
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE], cwd=SRC, env=env, capture_output=True, text=True, timeout=600,
+        )
+        if out.returncode != 0:
+            print(out.stderr[-2000:])
+            raise SystemExit(f"probe failed (ROUTES_LAZY={lazy})")
+        samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return {key: statistics.median(s[key] for s in samples) for key in samples[0]}
+
+
+async def measure_graph(component_seconds: float):
+    from api import lifespan
+    from core.startup import Component, StartupOrchestrator
+
+    def synthetic(component):
+        async def init():
+            await asyncio.sleep(component_seconds)
+        return Component(component.name, init, depends_on=component.depends_on, after=component.after)
+
+    components = [synthetic(c) for c in lifespan._startup_components()]
+
+    started = time.perf_counter()
+    for name in StartupOrchestrator(components).order():
+        await next(c for c in components if c.name == name).init()
+    sequential = time.perf_counter() - started
+
+    orchestrator = StartupOrchestrator(components)
+    await orchestrator.run()
+    return len(components), sequential, orchestrator.elapsed_ms / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--component-ms", type=float, default=200.0)
+    parser.add_argument("--skip-process", action="store_true")
+    args = parser.parse_args()
+
+    if not args.skip_process:
+        for lazy in (False, True):
+            result = measure_process(lazy, args.runs)
+            print(
+                f"{'lazy' if lazy else 'eager':<6} import={result['import_s']:6.2f}s  "
+                f"first request={result['first_request_s']:6.2f}s  "
+                f"first heavy request={result['first_heavy_request_s']:6.2f}s"
+            )
+
+    count, sequential, orchestrated = asyncio.run(measure_graph(args.component_ms / 1000))
+    print(
+        f"graph  {count} components @ {args.component_ms:.0f}ms: "
+        f"sequential={sequential:6.2f}s  orchestrated={orchestrated:6.2f}s  "
+        f"speedup={sequential / orchestrated:4.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
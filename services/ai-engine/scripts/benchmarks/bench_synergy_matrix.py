@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Benchmark: all-pairs agent synergy, per-pair loop vs blocked matrix job
+
+Scales from 100 to 5,000 agents against an in-memory store that counts
+write round trips. The per-pair baseline (one score + one upsert per pair)
+is only run up to --legacy-max agents; beyond that it is extrapolated from
+the measured per-pair cost.
+
+Usage:
+    python scripts/benchmarks/bench_synergy_matrix.py [--sizes 100,500,1000,2500,5000] [--legacy-max 1000]
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+import structlog
+
+from workers.tasks.synergy_tasks import SynergyCalculationService
+
+structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class InMemoryStore:
+    def __init__(self, agents, co_rows):
+        self.agents = agents
+        self.co_rows = co_rows
+        self.synergies = {}
+        self.round_trips = 0
+        self._snapshot = None
+
+    def rpc(self, name, params):
+        return _Query(lambda: _Result(self.co_rows))
+
+    def table(self, name):
+        return _Table(self, name)
+
+
+class _Query:
+    def __init__(self, fn):
+        self.fn = fn
+
+    def execute(self):
+        return self.fn()
+
+
+class _Table:
+    def __init__(self, store, name):
+        self.store = store
+        self.name = name
+
+    def select(self, *args):
+        return self
+
+    def eq(self, *args):
+        return self
+
+    def range(self, start, end):
+        if self.store._snapshot is None:
+            self.store._snapshot = list(self.store.synergies.items())
+        rows = [
+            {"agent_a_id": a, "agent_b_id": b, "synergy_score": score, "is_recommended": rec}
+            for (a, b), (score, rec) in self.store._snapshot[start:end + 1]
+        ]
+        return _Query(lambda: _Result(rows))
+
+    def upsert(self, data, on_conflict=None):
+        rows = data if isinstance(data, list) else [data]
+
+        def _write():
+            self.store.round_trips += 1
+            self.store._snapshot = None
+            for row in rows:
+                # Keep only the diffed columns so 12.5M pairs fit in memory
+                self.store.synergies[(row['agent_a_id'], row['agent_b_id'])] = (
+                    row['synergy_score'], row.get('is_recommended', False))
+            return _Result(rows)
+        return _Query(_write)
+
+    def execute(self):
+        return _Result(self.store.agents)
+
+
+def make_dataset(n, seed=3):
+    rng = random.Random(seed)
+    domains = [f"domain_{i}" for i in range(60)] + ["regulatory", "experimental", "conservative", "aggressive"]
+    capabilities = [f"cap_{i}" for i in range(300)]
+    agents = [
+        {
+            "id": f"agent-{i:05d}",
+            "domains": rng.sample(domains, rng.randint(1, 4)),
+            "capabilities": rng.sample(capabilities, rng.randint(1, 8)),
+        }
+        for i in range(n)
+    ]
+    co_rows = []
+    for _ in range(n * 10):
+        a, b = rng.sample(agents, 2)
+        co_rows.append({
+            "agent_a_id": a["id"], "agent_b_id": b["id"],
+            "occurrence_count": rng.randint(1, 50),
+            "avg_satisfaction": rng.random(), "avg_response_quality": rng.random(),
+        })
+    return agents, co_rows
+
+
+async def legacy(service, store):
+    """The previous nested loop: score and upsert one pair at a time."""
+    agents = store.agents
+    co = await service._get_co_occurrences(None, datetime.utcnow())
+    for i, a in enumerate(agents):
+        for b in agents[i + 1:]:
+            synergy = await service._calculate_pair_synergy(a, b, co)
+            row = {"agent_a_id": synergy.agent_a_id, "agent_b_id": synergy.agent_b_id,
+                   "synergy_score": synergy.synergy_score}
+            store.table("agent_synergies").upsert(row).execute()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="100,500,1000,2500,5000")
+    parser.add_argument("--legacy-max", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'agents':>7} {'pairs':>11} {'legacy_s':>10} {'matrix_s':>9} "
+          f"{'writes':>8} {'rerun_s':>8} {'rerun_writes':>12}")
+    per_pair = None
+    for n in (int(x) for x in args.sizes.split(",")):
+        agents, co_rows = make_dataset(n)
+        pairs = n * (n - 1) // 2
+
+        if n <= args.legacy_max:
+            store = InMemoryStore(agents, co_rows)
+            start = time.perf_counter()
+            await legacy(SynergyCalculationService(store), store)
+            legacy_s = time.perf_counter() - start
+            per_pair = legacy_s / pairs
+            legacy_label = f"{legacy_s:10.2f}"
+        else:
+            legacy_label = f"~{per_pair * pairs:9.0f}" if per_pair else f"{'-':>10}"
+
+        store = InMemoryStore(agents, co_rows)
+        service = SynergyCalculationService(store)
+        start = time.perf_counter()
+        await service.calculate_all_synergies()
+        matrix_s = time.perf_counter() - start
+        writes = store.round_trips
+
+        # Re-run with a few changed co-occurrences: only those pairs are rewritten
+        store.round_trips = 0
+        store.co_rows = co_rows + [dict(co_rows[k], occurrence_count=999) for k in range(5)]
+        start = time.perf_counter()
+        stats = await service.calculate_all_synergies()
+        rerun_s = time.perf_counter() - start
+
+        print(f"{n:>7} {pairs:>11,} {legacy_label} {matrix_s:9.2f} {writes:>8} "
+              f"{rerun_s:8.2f} {stats['synergies_updated']:>12}", flush=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
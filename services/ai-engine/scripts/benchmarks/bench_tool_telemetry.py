@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-tool-call telemetry overhead, direct RPC vs ToolTelemetrySink
+
+Simulates ParallelToolExecutor-style fan-outs where every tool call is logged
+through ToolRegistryService.log_tool_execution, against a fake Supabase client
+with a fixed RPC round-trip latency.
+
+Usage:
+    python scripts/benchmarks/bench_tool_telemetry.py [--fanouts 200] [--tools 5] [--rtt-ms 8]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from services.shared.tool_registry_service import ToolRegistryService
+from services.shared.tool_telemetry_sink import ToolTelemetrySink
+
+
+class FakeSupabase:
+    def __init__(self, rtt_seconds: float):
+        self.rtt_seconds = rtt_seconds
+        self.round_trips = 0
+
+    def rpc(self, name, params):
+        outer = self
+
+        class _Query:
+            async def execute(self):
+                outer.round_trips += 1
+                await asyncio.sleep(outer.rtt_seconds)
+
+                class _Response:
+                    data = "00000000-0000-0000-0000-000000000000"
+
+                return _Response()
+
+        return _Query()
+
+
+async def tool_call(registry: ToolRegistryService, i: int, tool_seconds: float):
+    await asyncio.sleep(tool_seconds)
+    await registry.log_tool_execution(
+        tool_code=f"TOOL-{i}",
+        agent_id="00000000-0000-0000-0000-000000000001",
+        tenant_id="00000000-0000-0000-0000-000000000002",
+        input_params={"query": "pembrolizumab trials"},
+        output_result={"results": ["doc"] * 50},
+        execution_time_ms=int(tool_seconds * 1000),
+    )
+
+
+async def run(registry, fanouts: int, tools: int, tool_seconds: float):
+    latencies = []
+    for _ in range(fanouts):
+        start = time.perf_counter()
+        await asyncio.gather(*(tool_call(registry, i, tool_seconds) for i in range(tools)))
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def summarize(label, latencies, tool_seconds, tools, round_trips):
+    overhead_ms = [(l - tool_seconds) * 1000 / tools for l in latencies]
+    print(
+        f"{label:<10} fan-out p50={statistics.median(latencies) * 1000:7.2f}ms  "
+        f"overhead/call={statistics.mean(overhead_ms):6.3f}ms  round_trips={round_trips}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--fanouts", type=int, default=200)
+    parser.add_argument("--tools", type=int, default=5)
+    parser.add_argument("--rtt-ms", type=float, default=8.0)
+    parser.add_argument("--tool-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    tool_seconds = args.tool_ms / 1000
+
+    direct_db = FakeSupabase(args.rtt_ms / 1000)
+    direct = ToolRegistryService(direct_db)
+    summarize("direct", await run(direct, args.fanouts, args.tools, tool_seconds),
+              tool_seconds, args.tools, direct_db.round_trips)
+
+    sink_db = FakeSupabase(args.rtt_ms / 1000)
+    sink = ToolTelemetrySink(sink_db, batch_size=200, flush_interval_seconds=0.25)
+    await sink.start()
+    batched = ToolRegistryService(sink_db, telemetry_sink=sink)
+    latencies = await run(batched, args.fanouts, args.tools, tool_seconds)
+    await sink.shutdown()
+    summarize("sink", latencies, tool_seconds, args.tools, sink_db.round_trips)
+    print(f"sink stats: {sink.get_statistics()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Query Intent Model Training Script
+Trains the hashed n-gram intent model used as the QueryUnderstandingService
+fast path from logged classifications.
+
+Input is JSON lines of QueryClassification.to_dict() records (at least
+"query" and "primary_intent"). Low-confidence rule classifications are
+dropped so the model learns from clear-cut labels only.
+
+Usage:
+    python scripts/train_query_intent_model.py classifications.jsonl query_intent.npz [--min-confidence 0.6]
+    export QUERY_INTENT_MODEL_PATH=query_intent.npz
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from services.consultation.query_classifier import WORD_PATTERN
+from services.consultation.query_understanding import HashedIntentModel
+
+
+def load_examples(path: str, min_confidence: float):
+    examples = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if record.get("confidence", 1.0) < min_confidence:
+                continue
+            examples.append((record["query"], record["primary_intent"]))
+    return examples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("input", help="JSON lines of logged classifications")
+    parser.add_argument("output", help="model artifact (.npz)")
+    parser.add_argument("--min-confidence", type=float, default=0.6)
+    parser.add_argument("--buckets", type=int, default=1 << 16)
+    parser.add_argument("--epochs", type=int, default=50)
+    parser.add_argument("--holdout", type=float, default=0.1, help="fraction held out for accuracy")
+    args = parser.parse_args()
+
+    examples = load_examples(args.input, args.min_confidence)
+    if not examples:
+        print("No examples above the confidence threshold")
+        return 1
+
+    split = int(len(examples) * (1 - args.holdout))
+    model = HashedIntentModel.fit(examples[:split], buckets=args.buckets, epochs=args.epochs)
+    model.save(args.output)
+
+    print(f"Trained on {split:,} examples: {dict(Counter(label for _, label in examples[:split]))}")
+    holdout = examples[split:]
+    if holdout:
+        correct = 0
+        for query, label in holdout:
+            probabilities = model.predict(WORD_PATTERN.findall(query.lower()))
+            correct += max(probabilities, key=probabilities.get) == label
+        print(f"Holdout accuracy: {correct / len(holdout):.3f} on {len(holdout):,} examples")
+    print(f"Saved {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
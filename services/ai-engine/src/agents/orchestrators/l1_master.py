@@ -42,9 +42,14 @@ from infrastructure.database.agent_loader import (
     AgentConfig as DBAgentConfig,
     get_orchestrator,
 )
+from core.llm_response_cache import cached_llm
 
 logger = structlog.get_logger()
 
+# Response cache TTLs for the deterministic planning prompts
+TEAM_SELECTION_CACHE_TTL_SECONDS = 900
+MISSION_DECOMPOSITION_CACHE_TTL_SECONDS = 3600
+
 
 class TeamSelectionEvidence(BaseModel):
     """Evidence supporting team selection by L1 Master."""
@@ -146,9 +151,11 @@ class L1MasterOrchestrator(BaseAgent):
             self.llm = llm
         else:
             try:
-                from langchain_openai import ChatOpenAI
-                self.llm = ChatOpenAI(
-                    model=model,
+                from core.llm_gateway import Priority, get_llm_gateway
+                # Mission planning sits on the user's critical path
+                self.llm = get_llm_gateway().chat_model(
+                    model,
+                    priority=Priority.INTERACTIVE,
                     temperature=temperature,  # From DB, not hardcoded!
                     max_tokens=max_tokens,    # From DB, not hardcoded!
                 )
@@ -433,7 +440,11 @@ CRITICAL: For strategic questions like "develop a strategy" or "advise on", sele
 
                     try:
                         logger.info("l1_llm_invoking", prompt_length=len(selection_prompt))
-                        response = await self.llm.ainvoke([
+                        selector = cached_llm(
+                            self.llm, "l1.select_team",
+                            ttl_seconds=TEAM_SELECTION_CACHE_TTL_SECONDS, scope=tenant_id,
+                        )
+                        response = await selector.ainvoke([
                             SystemMessage(content="You are an expert team selector. Match queries to the most relevant experts based on their descriptions and domains. Respond ONLY with valid JSON."),
                             HumanMessage(content=selection_prompt),
                         ])
@@ -549,7 +560,11 @@ Evidence Context:
 Provide a 2-3 sentence reasoning explaining why these experts are optimal for this query.
 Do NOT output JSON, just the reasoning text."""
 
-                        response = await self.llm.ainvoke([
+                        explainer = cached_llm(
+                            self.llm, "l1.select_team.reasoning",
+                            ttl_seconds=TEAM_SELECTION_CACHE_TTL_SECONDS, scope=tenant_id,
+                        )
+                        response = await explainer.ainvoke([
                             SystemMessage(content="You are an expert at explaining AI agent selection decisions."),
                             HumanMessage(content=reasoning_prompt),
                         ])
@@ -607,7 +622,14 @@ Do NOT output JSON, just the reasoning text."""
 
         Strategy: Get ALL active agents (no level filter) and let LLM select the best match.
         This ensures Market Access, HEOR, and other specialized agents are included.
+
+        Reads the shared agent catalog snapshot when it is loaded (no I/O);
+        falls back to querying Supabase otherwise.
         """
+        candidates = self._get_catalog_candidates(tenant_id, limit)
+        if candidates is not None:
+            return candidates
+
         try:
             from services.supabase_client import SupabaseClient
 
@@ -691,11 +713,56 @@ Do NOT output JSON, just the reasoning text."""
             )
             return []
     
+    def _get_catalog_candidates(self, tenant_id: str, limit: int = 20) -> Optional[List[Dict[str, Any]]]:
+        """
+        Same three-step candidate selection as _get_db_candidates, over the
+        shared agent catalog. Returns None if the catalog is not loaded.
+        """
+        from services.shared.agent_catalog import get_agent_catalog
+
+        catalog = get_agent_catalog()
+        if catalog is None or not catalog.ready:
+            return None
+
+        fields = ("id", "name", "description", "agent_level_id", "function_name", "department_name")
+        effective_limit = min(limit * 3, 50)
+        candidates: List[Dict[str, Any]] = []
+        seen_ids = set()
+
+        def _add(rows, cap):
+            for row in rows:
+                if len(candidates) >= cap:
+                    break
+                if row["id"] not in seen_ids:
+                    candidates.append({f: row.get(f) for f in fields})
+                    seen_ids.add(row["id"])
+
+        tenant_active = catalog.snapshot(tenant_id).select(status="active") if tenant_id else []
+        global_active = catalog.snapshot(None).select(status="active")
+
+        # Step 1: tenant agents with descriptions, Step 2: global agents with descriptions
+        _add((r for r in tenant_active if r.get("description") is not None), effective_limit)
+        _add((r for r in global_active if r.get("description") is not None), effective_limit)
+
+        # Step 3: active agents without descriptions if still not enough.
+        # Unlike the DB fallback this stays within the tenant + global scopes.
+        if len(candidates) < 10:
+            _add(tenant_active + global_active, effective_limit)
+
+        logger.info(
+            "l1_catalog_candidates_result",
+            tenant_id=tenant_id,
+            total_candidates=len(candidates),
+            catalog_stale_seconds=round(catalog.stale_seconds(), 1),
+        )
+        return candidates
+
     async def decompose_mission(
         self,
         query: str,
         context: Dict[str, Any],
         selected_experts: List[str],
+        tenant_id: Optional[str] = None,
     ) -> List[MissionTask]:
         """
         Decompose a complex mission into executable tasks.
@@ -704,6 +771,7 @@ Do NOT output JSON, just the reasoning text."""
             query: User's mission/goal
             context: Additional context
             selected_experts: Already selected expert IDs
+            tenant_id: Tenant UUID (defaults to context["tenant_id"]); scopes cached decompositions
             
         Returns:
             List of decomposed tasks
@@ -729,7 +797,12 @@ Decompose this mission into executable tasks.
 Respond with valid JSON following the format in your instructions.
 """
                 
-                response = await self.llm.ainvoke([
+                decomposer = cached_llm(
+                    self.llm, "l1.decompose_mission",
+                    ttl_seconds=MISSION_DECOMPOSITION_CACHE_TTL_SECONDS,
+                    scope=tenant_id or context.get("tenant_id"),
+                )
+                response = await decomposer.ainvoke([
                     SystemMessage(content=L1_MISSION_DECOMPOSITION_PROMPT),
                     HumanMessage(content=decomposition_prompt),
                 ])
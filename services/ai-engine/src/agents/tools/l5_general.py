@@ -258,11 +258,16 @@ class GeneralL5Tool(L5BaseTool[GeneralResult]):
             return await self.embedding_service.embed(query)
         
         try:
-            from openai import AsyncOpenAI
-            client = AsyncOpenAI()
-            response = await client.embeddings.create(
-                model="text-embedding-3-large",
-                input=query,
+            from core.llm_gateway import get_llm_gateway
+            gateway = get_llm_gateway()
+            response = await gateway.call(
+                "openai",
+                "text-embedding-3-large",
+                lambda: gateway.openai_client().embeddings.create(
+                    model="text-embedding-3-large",
+                    input=query,
+                ),
+                tokens=len(query) // 4 + 1,
             )
             return response.data[0].embedding
         except Exception as e:
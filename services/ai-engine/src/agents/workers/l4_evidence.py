@@ -311,9 +311,11 @@ class L4EvidenceSynthesizer(L4BaseWorker):
     def _init_llm(self):
         """Initialize LLM for synthesis using config from env/database."""
         try:
-            from langchain_openai import ChatOpenAI
-            self._llm = ChatOpenAI(
-                model=self.config.model,
+            from core.llm_gateway import Priority, get_llm_gateway
+            # Synthesis runs inside long missions; yield to interactive traffic
+            self._llm = get_llm_gateway().chat_model(
+                self.config.model,
+                priority=Priority.BACKGROUND,
                 temperature=self.config.temperature,
                 max_tokens=self.config.max_tokens,
             )
@@ -4,7 +4,9 @@ VITAL Path AI Services - Lifespan Management
 Handles FastAPI application startup and shutdown events including:
 - Service initialization (Supabase, RAG, Cache, etc.)
 - Resource cleanup on shutdown
-- Background initialization for fast startup
+- Background initialization for fast startup: services start concurrently
+  in dependency order (core.startup), lazy route groups are prewarmed once
+  they settled
 
 Phase 1 Refactoring: Extracted from monolithic main.py
 """
@@ -12,12 +14,13 @@ Phase 1 Refactoring: Extracted from monolithic main.py
 import os
 import asyncio
 from contextlib import asynccontextmanager
-from typing import Optional, Any
+from typing import Optional, Any, Dict, List
 
 from fastapi import FastAPI
 import structlog
 
 from core.config import get_settings
+from core.startup import Component, ComponentDisabled, StartupOrchestrator
 
 logger = structlog.get_logger()
 settings = get_settings()
@@ -34,12 +37,19 @@ _services: dict = {
     "checkpoint_manager": None,
     "observability": None,
     "tool_registry": None,
+    "tool_telemetry_sink": None,
+    "agent_catalog": None,
+    "llm_gateway": None,
     "sub_agent_spawner": None,
     "confidence_calculator": None,
     "compliance_service": None,
     "human_in_loop_validator": None,
+    "hitl_service": None,
 }
 
+# Startup graph of the current process (see _startup_components)
+_startup: Optional[StartupOrchestrator] = None
+
 
 def get_service(name: str) -> Optional[Any]:
     """Get a service instance by name."""
@@ -75,7 +85,7 @@ async def lifespan(app: FastAPI):
     
     # Start services initialization in background task
     logger.info("🔄 Starting background service initialization...")
-    init_task = asyncio.create_task(_initialize_services_background())
+    init_task = asyncio.create_task(_initialize_services_background(app))
     
     # Don't wait for initialization - let it run in background
     logger.info("✅ FastAPI app ready - services initializing in background")
@@ -99,232 +109,342 @@ async def lifespan(app: FastAPI):
     await _cleanup_services()
 
 
-async def _initialize_services_background():
+async def _initialize_services_background(app: Optional[FastAPI] = None):
     """
     Initialize services in background - non-blocking.
     
-    Services are initialized with timeouts to prevent hanging.
-    Failed initializations are logged but don't block startup.
+    Components start concurrently in dependency order, each with its own
+    timeout. Failed initializations are recorded per component (see
+    get_startup_report) but don't block startup. Once everything settled,
+    lazily mounted route groups are prewarmed.
     """
+    global _startup
     logger.info("🚀 Starting background service initialization")
     
-    # 1. Initialize cache manager first (optional, can fail gracefully)
-    await _init_cache_manager()
-    
-    # 2. Initialize LangGraph checkpoint manager
-    await _init_checkpoint_manager()
-    
-    # 3. Initialize LangGraph observability
-    await _init_observability()
-    
-    # 4. Initialize Supabase client (core dependency)
-    await _init_supabase_client()
+    _startup = StartupOrchestrator(_startup_components(), on_ready=_register_service)
+    await _startup.run()
     
-    # 5. Initialize dependent services (require Supabase)
-    if _services["supabase_client"]:
-        await _init_dependent_services()
+    logger.info("✅ AI Services background initialization complete", **_startup.report())
     
-    # 6. Setup monitoring
-    await _init_monitoring()
+    if app is not None and os.getenv("ROUTES_PREWARM", "true").lower() != "false":
+        from api.routes.lazy import prewarm_lazy_routes
+        await prewarm_lazy_routes(app)
+
+
+def _startup_components() -> List[Component]:
+    """Startup graph: what each service needs before it can initialize."""
+    supabase = ("supabase_client",)
+    return [
+        # LLM gateway (no external dependencies; every LLM client goes through it)
+        Component("llm_gateway", _init_llm_gateway, timeout=5.0, in_thread=False),
+        Component(
+            "cache_manager", _init_cache_manager,
+            after=("llm_gateway",), timeout=10.0, probe=_probe_cache_manager,
+        ),
+        Component("checkpoint_manager", _init_checkpoint_manager, timeout=15.0),
+        Component("observability", _init_observability, timeout=15.0),
+        # Supabase is the core dependency
+        Component(
+            "supabase_client", _init_supabase_client,
+            timeout=10.0, required=True, probe=_probe_supabase_client,
+        ),
+        Component("panel_template_service", _init_panel_template_service, depends_on=supabase, timeout=5.0),
+        Component("graphrag_selector", _init_graphrag_selector, depends_on=supabase, timeout=15.0),
+        Component("neo4j_client", _init_neo4j_client, timeout=15.0, probe=_probe_neo4j_client),
+        Component("tool_telemetry_sink", _init_tool_telemetry_sink, depends_on=supabase, timeout=10.0),
+        Component("agent_catalog", _init_agent_catalog, depends_on=supabase, timeout=15.0),
+        Component(
+            "tool_registry", _init_tool_registry,
+            depends_on=supabase, after=("tool_telemetry_sink",), timeout=15.0,
+        ),
+        Component("sub_agent_spawner", _init_sub_agent_spawner, timeout=15.0),
+        Component("confidence_calculator", _init_confidence_calculator, timeout=15.0),
+        Component("compliance_service", _init_compliance_service, depends_on=supabase, timeout=15.0),
+        Component("human_in_loop_validator", _init_human_in_loop_validator, timeout=15.0),
+        Component("hitl_service", _init_hitl_service, depends_on=supabase, timeout=15.0),
+        Component("rag_pipeline", _init_rag_pipeline, depends_on=supabase, timeout=20.0),
+        Component(
+            "unified_rag_service", _init_unified_rag_service,
+            depends_on=supabase, after=("cache_manager",), timeout=20.0,
+        ),
+        Component("metadata_processing_service", _init_metadata_processing_service, timeout=15.0),
+        Component(
+            "agent_orchestrator", _init_agent_orchestrator,
+            depends_on=supabase, after=("unified_rag_service",), timeout=20.0, required=True,
+        ),
+        Component("websocket_manager", _init_websocket_manager, timeout=5.0),
+        Component("monitoring", _init_monitoring, timeout=10.0),
+    ]
+
+
+def get_startup_report() -> Dict[str, Any]:
+    """Per-component startup readiness (empty until startup began)."""
+    if _startup is None:
+        return {"ready": False, "complete": False, "components": {}}
+    return _startup.report()
+
+
+def _register_service(name: str, instance: Any) -> None:
+    """
+    Publish a READY component (StartupOrchestrator on_ready hook).
     
-    logger.info("✅ AI Services background initialization complete")
+    Init functions return their instance instead of writing _services: a
+    threaded init that timed out keeps running and must not register late.
+    """
+    if name in _services:
+        _services[name] = instance
+
+
+def _init_llm_gateway():
+    """Initialize the process-wide LLM gateway (budgets from LLM_GATEWAY_* env)."""
+    from core.llm_gateway import initialize_llm_gateway
+    return initialize_llm_gateway()
 
 
 async def _init_cache_manager():
     """Initialize cache manager."""
-    try:
-        redis_url = getattr(settings, 'redis_url', None)
-        if redis_url:
-            from services.cache_manager import initialize_cache_manager
-            _services["cache_manager"] = await initialize_cache_manager(redis_url)
-            logger.info("✅ Cache manager initialized")
-        else:
-            logger.info("ℹ️ Redis URL not configured - caching disabled")
-    except Exception as e:
-        logger.warning("cache_manager_init_failed", error=str(e))
+    redis_url = getattr(settings, 'redis_url', None)
+    if not redis_url:
+        raise ComponentDisabled("Redis URL not configured - caching disabled")
+    
+    from services.cache_manager import initialize_cache_manager
+    cache_manager = await initialize_cache_manager(redis_url)
+    
+    # Share LLM responses across workers through the same Redis
+    if cache_manager.enabled and _services["llm_gateway"]:
+        _services["llm_gateway"].response_cache.attach_redis(cache_manager)
+    return cache_manager
+
+
+async def _probe_cache_manager(cache_manager) -> bool:
+    """Redis answers PING (initialize only logs a failed connection)."""
+    return bool(cache_manager.enabled and await cache_manager.redis.ping())
 
 
 async def _init_checkpoint_manager():
     """Initialize LangGraph checkpoint manager."""
-    try:
-        from langgraph_workflows import initialize_checkpoint_manager
-        _services["checkpoint_manager"] = await initialize_checkpoint_manager(
-            backend="sqlite",
-            db_path=os.getenv("CHECKPOINT_DB_PATH")
-        )
-        logger.info("✅ LangGraph checkpoint manager initialized")
-    except Exception as e:
-        logger.warning("checkpoint_manager_init_failed", error=str(e))
+    from langgraph_workflows import initialize_checkpoint_manager
+    return await initialize_checkpoint_manager(
+        backend="sqlite",
+        db_path=os.getenv("CHECKPOINT_DB_PATH")
+    )
 
 
 async def _init_observability():
     """Initialize LangGraph observability."""
-    try:
-        from langgraph_workflows import initialize_observability
-        _services["observability"] = await initialize_observability()
-        logger.info("✅ LangGraph observability initialized")
-    except Exception as e:
-        logger.warning("observability_init_failed", error=str(e))
+    from langgraph_workflows import initialize_observability
+    return await initialize_observability()
 
 
 async def _init_supabase_client():
     """Initialize Supabase client."""
-    try:
-        from services.supabase_client import SupabaseClient
-        from api.dependencies import set_supabase_client
-        
-        client = SupabaseClient()
-        await asyncio.wait_for(client.initialize(), timeout=10.0)
-        _services["supabase_client"] = client
-        
-        set_supabase_client(client)
-        
-        logger.info("✅ Supabase client initialized")
-        
-        # Initialize Panel Template Service (with timeout)
-        try:
-            from services.panel_template_service import initialize_panel_template_service
-            await asyncio.wait_for(initialize_panel_template_service(client), timeout=5.0)
-            logger.info("✅ Panel template service initialized")
-        except asyncio.TimeoutError:
-            logger.warning("⚠️ Panel template service initialization timed out - skipping")
-        except Exception as e:
-            logger.warning("⚠️ Panel template service initialization failed", error=str(e))
-        
-        # Initialize GraphRAG selector
-        from services.graphrag_selector import initialize_graphrag_selector
-        initialize_graphrag_selector(supabase_client=client)
-        logger.info("✅ GraphRAG selector initialized")
-        
-        # Initialize Neo4j client
-        await _init_neo4j_client()
-        
-    except asyncio.TimeoutError:
-        logger.error("supabase_init_timeout")
-    except Exception as e:
-        logger.error("supabase_init_failed", error=str(e))
+    from services.supabase_client import SupabaseClient
+    from api.dependencies import set_supabase_client
+    
+    client = SupabaseClient()
+    await client.initialize()
+    set_supabase_client(client)
+    return client
+
+
+async def _probe_supabase_client(client) -> bool:
+    """The REST API answers a one-row read (initialize skips when unconfigured)."""
+    if client.client is None:
+        return False
+    from services.shared.supabase_utils import execute_query
+    await execute_query(client.table("agents").select("id").limit(1))
+    return True
+
 
+async def _init_panel_template_service():
+    """Initialize Panel Template Service."""
+    from services.panel_template_service import initialize_panel_template_service
+    return await initialize_panel_template_service(_services["supabase_client"])
 
-async def _init_neo4j_client():
+
+def _init_graphrag_selector():
+    """Initialize GraphRAG selector."""
+    from services.graphrag_selector import initialize_graphrag_selector
+    return initialize_graphrag_selector(supabase_client=_services["supabase_client"])
+
+
+def _init_neo4j_client():
     """Initialize Neo4j client for graph-based agent selection."""
     neo4j_uri = os.getenv("NEO4J_URI")
     neo4j_user = os.getenv("NEO4J_USER", "neo4j")
     neo4j_password = os.getenv("NEO4J_PASSWORD")
     
-    if neo4j_uri and neo4j_password:
-        try:
-            from services.neo4j_client import initialize_neo4j_client
-            initialize_neo4j_client(neo4j_uri, neo4j_user, neo4j_password)
-            logger.info("✅ Neo4j client initialized")
-        except Exception as e:
-            logger.error("neo4j_init_failed", error=str(e))
-    else:
-        logger.warning("neo4j_credentials_missing")
+    if not (neo4j_uri and neo4j_password):
+        raise ComponentDisabled("neo4j credentials missing")
+    
+    from services.neo4j_client import initialize_neo4j_client
+    return initialize_neo4j_client(neo4j_uri, neo4j_user, neo4j_password)
 
 
-async def _init_dependent_services():
-    """Initialize services that depend on Supabase."""
-    client = _services["supabase_client"]
-    cache = _services["cache_manager"]
-    
-    # Tool Registry
-    try:
-        from services.tool_registry_service import initialize_tool_registry
-        _services["tool_registry"] = await initialize_tool_registry(client)
-        logger.info("✅ Tool registry initialized")
-    except Exception as e:
-        logger.error("tool_registry_init_failed", error=str(e))
-    
-    # Sub-agent spawner
-    try:
-        from services.sub_agent_spawner import SubAgentSpawner
-        _services["sub_agent_spawner"] = SubAgentSpawner()
-        logger.info("✅ Sub-agent spawner initialized")
-    except Exception as e:
-        logger.error("sub_agent_spawner_init_failed", error=str(e))
-    
-    # Confidence calculator
-    try:
-        from services.confidence_calculator import ConfidenceCalculator
-        _services["confidence_calculator"] = ConfidenceCalculator()
-        logger.info("✅ Confidence calculator initialized")
-    except Exception as e:
-        logger.error("confidence_calculator_init_failed", error=str(e))
-    
-    # Compliance service
-    try:
-        from services.compliance_service import ComplianceService, HumanInLoopValidator
-        _services["compliance_service"] = ComplianceService(client)
-        _services["human_in_loop_validator"] = HumanInLoopValidator()
-        logger.info("✅ Compliance service initialized")
-    except Exception as e:
-        logger.error("compliance_service_init_failed", error=str(e))
-    
-    # RAG Pipeline
-    try:
-        from services.medical_rag import MedicalRAGPipeline
-        pipeline = MedicalRAGPipeline(client)
-        await asyncio.wait_for(pipeline.initialize(), timeout=5.0)
-        _services["rag_pipeline"] = pipeline
-        logger.info("✅ RAG pipeline initialized")
-    except Exception as e:
-        logger.error("rag_pipeline_init_failed", error=str(e))
-    
-    # Unified RAG Service
-    try:
-        from services.unified_rag_service import UnifiedRAGService
-        service = UnifiedRAGService(client, cache_manager=cache)
-        await asyncio.wait_for(service.initialize(), timeout=5.0)
-        _services["unified_rag_service"] = service
-        logger.info("✅ Unified RAG service initialized")
-    except Exception as e:
-        logger.error("unified_rag_service_init_failed", error=str(e))
-    
-    # Metadata Processing Service
-    try:
-        from services.metadata_processing_service import create_metadata_processing_service
-        _services["metadata_processing_service"] = create_metadata_processing_service(
-            use_ai=False,
-            openai_api_key=settings.openai_api_key
-        )
-        logger.info("✅ Metadata processing service initialized")
-    except Exception as e:
-        logger.error("metadata_processing_init_failed", error=str(e))
-    
-    # Agent Orchestrator
-    try:
-        from services.agent_orchestrator import AgentOrchestrator
-        orchestrator = AgentOrchestrator(client, _services["unified_rag_service"])
-        # Initialize (no-op but keeps health happy) and store service
-        await asyncio.wait_for(orchestrator.initialize(), timeout=5.0)
-        _services["agent_orchestrator"] = orchestrator
-        logger.info("✅ Agent orchestrator initialized")
-    except Exception as e:
-        logger.error("agent_orchestrator_init_failed", error=str(e))
-    
-    # WebSocket Manager
-    try:
-        from core.websocket_manager import WebSocketManager
-        _services["websocket_manager"] = WebSocketManager()
-        logger.info("✅ WebSocket manager initialized")
-    except Exception as e:
-        logger.error("websocket_manager_init_failed", error=str(e))
+async def _probe_neo4j_client(client) -> bool:
+    """The driver connects and runs a trivial query (the constructor is lazy)."""
+    return await client.verify_connection()
 
 
-async def _init_monitoring():
-    """Setup monitoring (non-blocking)."""
-    try:
-        from core.monitoring import setup_monitoring
-        setup_monitoring()
-        logger.info("✅ Monitoring setup complete")
-    except Exception as e:
-        logger.warning("monitoring_setup_failed", error=str(e))
+async def _init_tool_telemetry_sink():
+    """Tool telemetry sink (batched execution logging)."""
+    from services.shared.tool_telemetry_sink import initialize_tool_telemetry_sink
+    return await initialize_tool_telemetry_sink(_services["supabase_client"])
+
+
+async def _init_agent_catalog():
+    """Shared agent catalog (tenant-scoped agent snapshots)."""
+    from services.shared.agent_catalog import initialize_agent_catalog
+    catalog = await initialize_agent_catalog(
+        _services["supabase_client"],
+        poll_interval_seconds=float(os.getenv("AGENT_CATALOG_POLL_SECONDS", "30")),
+        listen_dsn=os.getenv("AGENT_CATALOG_LISTEN_DSN") or None,
+    )
+    logger.info("✅ Agent catalog initialized", **catalog.get_statistics())
+    return catalog
+
+
+async def _init_tool_registry():
+    """Tool Registry."""
+    from services.tool_registry_service import initialize_tool_registry
+    return await initialize_tool_registry(
+        _services["supabase_client"],
+        telemetry_sink=_services["tool_telemetry_sink"],
+    )
+
+
+def _init_sub_agent_spawner():
+    """Sub-agent spawner."""
+    from services.sub_agent_spawner import SubAgentSpawner
+    return SubAgentSpawner()
+
+
+def _init_confidence_calculator():
+    """Confidence calculator."""
+    from services.confidence_calculator import ConfidenceCalculator
+    return ConfidenceCalculator()
+
+
+def _init_compliance_service():
+    """Compliance service."""
+    from services.compliance_service import ComplianceService
+    return ComplianceService(_services["supabase_client"])
+
+
+def _init_human_in_loop_validator():
+    """HITL validator."""
+    from services.compliance_service import HumanInLoopValidator
+    return HumanInLoopValidator()
+
+
+async def _init_hitl_service():
+    """
+    Enhanced HITL service, with the mission graphs it can resume.
+
+    Started here rather than on first approval so the expiry sweeper and the
+    recovery of approvals decided while no replica was up run on every replica.
+    """
+    from langgraph_workflows.modes34.unified_autonomous_workflow import MASTER_GRAPH_NAME, build_master_graph
+    from services.workflows.hitl_websocket_service import get_enhanced_hitl_service
+
+    master_graph = build_master_graph()
+    service = await get_enhanced_hitl_service()
+    service.register_graph(MASTER_GRAPH_NAME, master_graph)
+    logger.info("✅ HITL service initialized", graphs=[MASTER_GRAPH_NAME])
+    return service
+
+
+async def _init_rag_pipeline():
+    """RAG Pipeline."""
+    from services.medical_rag import MedicalRAGPipeline
+    pipeline = MedicalRAGPipeline(_services["supabase_client"])
+    await pipeline.initialize()
+    return pipeline
+
+
+async def _init_unified_rag_service():
+    """Unified RAG Service."""
+    from services.unified_rag_service import UnifiedRAGService
+    service = UnifiedRAGService(_services["supabase_client"], cache_manager=_services["cache_manager"])
+    await service.initialize()
+    return service
+
+
+def _init_metadata_processing_service():
+    """Metadata Processing Service."""
+    from services.metadata_processing_service import create_metadata_processing_service
+    return create_metadata_processing_service(
+        use_ai=False,
+        openai_api_key=settings.openai_api_key
+    )
+
+
+async def _init_agent_orchestrator():
+    """Agent Orchestrator."""
+    from services.agent_orchestrator import AgentOrchestrator
+    orchestrator = AgentOrchestrator(_services["supabase_client"], _services["unified_rag_service"])
+    # Initialize (no-op but keeps health happy) and store service
+    await orchestrator.initialize()
+    return orchestrator
+
+
+def _init_websocket_manager():
+    """WebSocket Manager."""
+    from core.websocket_manager import WebSocketManager
+    return WebSocketManager()
+
+
+def _init_monitoring():
+    """Setup monitoring."""
+    from core.monitoring import setup_monitoring
+    setup_monitoring()
+    return True
 
 
 async def _cleanup_services():
     """Cleanup all services on shutdown."""
     logger.info("🔄 Shutting down AI Services")
     
+    # Flush queued tool telemetry before the Supabase client goes away
+    sink = _services.get("tool_telemetry_sink")
+    if sink:
+        try:
+            await sink.shutdown()
+            logger.info("✅ tool_telemetry_sink flushed")
+        except Exception as e:
+            logger.error("tool_telemetry_sink_cleanup_failed", error=str(e))
+    
+    # Same for aggregated memory access counters
+    from services.shared.memory_access_tracker import get_memory_access_tracker
+    tracker = get_memory_access_tracker()
+    if tracker:
+        try:
+            await tracker.shutdown()
+            logger.info("✅ memory_access_tracker flushed")
+        except Exception as e:
+            logger.error("memory_access_tracker_cleanup_failed", error=str(e))
+    
+    catalog = _services.get("agent_catalog")
+    if catalog:
+        try:
+            await catalog.shutdown()
+        except Exception as e:
+            logger.error("agent_catalog_cleanup_failed", error=str(e))
+    
+    # Stop HITL sweeps; pending approvals stay persisted for the next replica
+    try:
+        from services.workflows.hitl_websocket_service import close_hitl_service
+        await close_hitl_service()
+    except Exception as e:
+        logger.error("hitl_service_cleanup_failed", error=str(e))
+
+    gateway = _services.get("llm_gateway")
+    if gateway:
+        try:
+            await gateway.shutdown()
+        except Exception as e:
+            logger.error("llm_gateway_cleanup_failed", error=str(e))
+    
     cleanup_tasks = [
         ("agent_orchestrator", "cleanup"),
         ("rag_pipeline", "cleanup"),
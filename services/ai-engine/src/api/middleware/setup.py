@@ -4,7 +4,7 @@ VITAL Path AI Services - Middleware Setup
 Configures all middleware for the FastAPI application including:
 - CORS middleware
 - GZip compression
-- Request logging and timing
+- Request logging and timing (opens the request-scoped memo)
 - Tenant isolation (production)
 - Rate limiting (production)
 
@@ -12,6 +12,7 @@ Phase 1 Refactoring: Extracted from monolithic main.py
 """
 
 import os
+import re
 import time
 import uuid
 from typing import List, Optional
@@ -22,10 +23,17 @@ from fastapi.middleware.gzip import GZipMiddleware
 import structlog
 
 from core.config import get_settings
+from core.request_memo import request_memo_scope
 
 logger = structlog.get_logger()
 settings = get_settings()
 
+# Path segments that are identifiers, collapsed so memo stats group by endpoint
+_ID_SEGMENT = re.compile(
+    r"/(?:[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|\d+)(?=/|$)",
+    re.IGNORECASE,
+)
+
 
 def setup_middleware(app: FastAPI) -> None:
     """
@@ -121,8 +129,10 @@ def _add_request_logging_middleware(app: FastAPI) -> None:
             client_ip=request.client.host if request.client else "unknown",
         )
         
-        # Process request
-        response = await call_next(request)
+        # Process request; services share derived artifacts through the memo
+        request_type = f"{request.method} {_ID_SEGMENT.sub('/{id}', request.url.path)}"
+        with request_memo_scope(request_type) as memo:
+            response = await call_next(request)
         
         # Calculate duration
         duration_ms = (time.time() - start_time) * 1000
@@ -139,6 +149,7 @@ def _add_request_logging_middleware(app: FastAPI) -> None:
             request_id=request_id,
             status_code=response.status_code,
             duration_ms=round(duration_ms, 2),
+            memo_hits=sum(memo.hits.values()),
         )
         
         return response
@@ -19,21 +19,27 @@ NOTE: Mode-specific routers are imported lazily via register.py to avoid
 import errors blocking server startup. Individual routes may fail gracefully.
 """
 
-# Core routes that should always work
-try:
-    from .streaming import streaming_router
-except ImportError:
-    streaming_router = None
-
-try:
-    from .jobs import router as jobs_router
-except ImportError:
-    jobs_router = None
-
-try:
-    from .health import router as health_router
-except ImportError:
-    health_router = None
+# Core routers are resolved on first attribute access: importing them pulls in
+# services.shared (embedding models, provider SDKs), which every route module
+# would otherwise pay for at startup.
+_CORE_ROUTERS = {
+    "streaming_router": ("streaming", "streaming_router"),
+    "jobs_router": ("jobs", "router"),
+    "health_router": ("health", "router"),
+}
+
+
+def __getattr__(name):
+    if name not in _CORE_ROUTERS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _CORE_ROUTERS[name]
+    try:
+        from importlib import import_module
+        router = getattr(import_module(f"{__name__}.{module_name}"), attribute)
+    except ImportError:
+        router = None
+    globals()[name] = router
+    return router
 
 # Mode-specific routers imported lazily (may have missing dependencies)
 # These are registered via register.py with proper error handling
@@ -68,6 +68,7 @@ from api.sse import (
     is_stream_ready,
 )
 from core.resilience import create_safe_task
+from services.agents.execution_supervisor import ExecutionBudget, get_execution_supervisor
 from core.config import get_settings
 
 logger = structlog.get_logger()
@@ -507,7 +508,7 @@ async def create_mission(
         # This ensures errors are logged and failure events are emitted
         # NOTE: Pass validated_request instead of raw request
         create_safe_task(
-            _execute_mission_async(mission_id, template, validated_request, x_tenant_id),
+            _execute_supervised_mission(mission_id, template, validated_request, x_tenant_id),
             task_name=f"mission_execution_{mission_id[:8]}",
             on_error=on_mission_error,
         )
@@ -540,6 +541,36 @@ async def create_mission(
         raise HTTPException(status_code=500, detail=sanitized_error)
 
 
+async def _mission_still_running(mission_id: str) -> bool:
+    """Liveness check for the execution supervisor: False once the mission is terminal in the DB"""
+    supabase = get_supabase_client()
+    result = await asyncio.to_thread(
+        lambda: supabase.table("missions").select("status").eq("id", mission_id).single().execute()
+    )
+    return not result.data or result.data.get("status") not in ("completed", "failed", "cancelled")
+
+
+async def _execute_supervised_mission(
+    mission_id: str,
+    template: Dict[str, Any],
+    request: ValidatedMissionRequest,
+    tenant_id: Optional[str],
+):
+    """
+    Run the mission inside an execution supervisor scope.
+
+    Every L3/L4/sub-agent delegation made by the graph is bounded by the
+    mission's budget and is cancelled with it - from cancel_mission on this
+    instance, or by the supervisor's reaper once another instance marked the
+    mission terminal.
+    """
+    budget = ExecutionBudget(max_cost_usd=request.budget_limit or 10.0)
+    async with get_execution_supervisor().mission(
+        mission_id, budget, liveness=lambda: _mission_still_running(mission_id)
+    ):
+        await _execute_mission_async(mission_id, template, request, tenant_id)
+
+
 async def _execute_mission_async(
     mission_id: str,
     template: Dict[str, Any],
@@ -770,6 +801,36 @@ async def _execute_mission_async(
                         "continuing": should_continue,
                     })
 
+                elif node_name == "post_synthesis_gates":
+                    # Concurrent citation/quality/reflection gates (merged update)
+                    stage = node_output.get("post_synthesis", {})
+                    gates = stage.get("gates", {})
+                    if gates.get("verify_citations", {}).get("state") != "cancelled":
+                        await emit_mission_event(mission_id, "citations_verified", {
+                            "mission_id": mission_id,
+                            "citation_count": len(node_output.get("verified_citations", [])),
+                            "verified": gates["verify_citations"].get("state") == "passed",
+                        })
+                    if gates.get("quality_gate", {}).get("state") != "cancelled":
+                        quality_score = node_output.get("overall_quality", 0.0)
+                        await emit_mission_event(mission_id, "quality_check", {
+                            "mission_id": mission_id,
+                            "quality_score": quality_score,
+                            "passed": node_output.get("quality_passed", False),
+                        })
+                    if gates.get("reflection_gate", {}).get("state") != "cancelled":
+                        await emit_mission_event(mission_id, "reflection_complete", {
+                            "mission_id": mission_id,
+                            "iteration": node_output.get("iteration", 0),
+                            "continuing": False,
+                        })
+                    await emit_mission_event(mission_id, "post_synthesis_complete", {
+                        "mission_id": mission_id,
+                        "verdict": stage.get("verdict"),
+                        "hard_fail_gate": stage.get("hard_fail_gate"),
+                        "cancelled_gates": stage.get("cancelled_gates", []),
+                    })
+
                 # Track costs
                 if "current_cost" in node_output:
                     total_cost = node_output.get("current_cost", 0.0)
@@ -1245,6 +1306,9 @@ async def cancel_mission(
             "updated_at": now,
         }).eq("id", mission_id).execute()
 
+        # Stop the running delegation tree (L3/L4 agents, tools, sub-agents)
+        get_execution_supervisor().cancel(mission_id, reason="user_cancelled")
+
         await emit_mission_event(mission_id, "mission_cancelled", {
             "mission_id": mission_id,
             "reason": "User cancelled",
@@ -14,12 +14,14 @@ import time
 from datetime import datetime
 from typing import Dict, Any
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from fastapi.responses import Response
 from prometheus_client import generate_latest
 import structlog
 
-from api.lifespan import get_service
+from api.lifespan import get_service, get_startup_report
+from api.routes.lazy import lazy_route_status
+from core.request_memo import get_request_memo_stats
 
 logger = structlog.get_logger()
 
@@ -39,14 +41,15 @@ async def root():
 
 
 @router.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """
     Health check endpoint - always returns healthy to allow app to start.
     
     This endpoint responds immediately, even before services initialize.
     This is critical for Railway deployment health checks.
     
-    Includes RLS (Row-Level Security) status for compliance monitoring.
+    Includes RLS (Row-Level Security) status for compliance monitoring,
+    per-component startup readiness and which lazy route groups are mounted.
     """
     supabase_client = get_service("supabase_client")
     agent_orchestrator = get_service("agent_orchestrator")
@@ -78,6 +81,8 @@ async def health_check():
                 "rule_2_multi_tenant_security": rls_status["status"]
             }
         },
+        "startup": get_startup_report(),
+        "routes": lazy_route_status(request.app),
         "ready": True  # Explicitly mark as ready for Railway
     }
 
@@ -121,6 +126,7 @@ async def get_cache_stats():
     Returns cache hit/miss rates for:
     - Global cache manager
     - RAG service cache
+    - Request memo (duplicate work avoided per request type)
     """
     cache_manager = get_service("cache_manager")
     unified_rag_service = get_service("unified_rag_service")
@@ -129,6 +135,7 @@ async def get_cache_stats():
         "timestamp": datetime.now().isoformat(),
         "global_cache": None,
         "rag_cache": None,
+        "request_memo": get_request_memo_stats(),
     }
     
     # Global cache manager stats
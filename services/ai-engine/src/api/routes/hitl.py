@@ -25,7 +25,7 @@ from datetime import datetime
 import structlog
 
 from api.auth import get_current_user, get_optional_user
-from services.hitl_websocket_service import (
+from services.workflows.hitl_websocket_service import (
     get_enhanced_hitl_service,
     EnhancedHITLService,
 )
@@ -95,11 +95,12 @@ async def get_pending_approvals(
     Returns list of approvals awaiting user decision.
     """
     try:
-        checkpointer = await get_postgres_checkpointer()
-        pending = await checkpointer.get_pending_approvals(
+        hitl_service = await get_enhanced_hitl_service()
+        approvals = await hitl_service.suspensions.store.list_pending(
             tenant_id=str(tenant_id),
             limit=limit
         )
+        pending = [approval.to_public() for approval in approvals]
 
         logger.info(
             "hitl_pending_fetched",
@@ -143,13 +144,18 @@ async def respond_to_approval(
     try:
         hitl_service = await get_enhanced_hitl_service()
 
-        await hitl_service.connection_manager.handle_approval_response(
+        decided = await hitl_service.connection_manager.handle_approval_response(
             approval_id=approval_id,
             status=response.status,
             user_feedback=response.user_feedback,
             modifications=response.modifications,
             user_id=current_user.get("id")
         )
+        if not decided:
+            raise HTTPException(
+                status_code=409,
+                detail="Approval not found or already decided"
+            )
 
         logger.info(
             "hitl_approval_responded",
@@ -164,6 +170,8 @@ async def respond_to_approval(
             "status": response.status
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("hitl_respond_failed", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
@@ -176,13 +184,19 @@ async def get_approval_status(
 ):
     """Get status of specific HITL approval"""
     try:
-        checkpointer = await get_postgres_checkpointer()
-        status = await checkpointer.get_approval_status(approval_id)
+        hitl_service = await get_enhanced_hitl_service()
+        approval = await hitl_service.suspensions.store.get(approval_id)
 
-        if not status:
+        if not approval:
             raise HTTPException(status_code=404, detail="Approval not found")
 
-        return status
+        return {
+            **approval.to_public(),
+            "status": approval.status,
+            "response_data": approval.response_data,
+            "responded_at": approval.responded_at.isoformat() if approval.responded_at else None,
+            "resumed": approval.resumed_at is not None,
+        }
 
     except HTTPException:
         raise
@@ -234,12 +248,12 @@ async def get_hitl_stats(
     """
     try:
         hitl_service = await get_enhanced_hitl_service()
-        conn_stats = hitl_service.connection_manager.get_connection_stats()
+        total_pending = await hitl_service.suspensions.store.count_pending(str(tenant_id))
 
         # For now, return basic stats
         # In production, query database for historical stats
         return HITLStats(
-            total_pending=conn_stats["pending_approvals"],
+            total_pending=total_pending,
             total_approved=0,
             total_rejected=0,
             total_modified=0,
@@ -302,7 +316,7 @@ async def hitl_websocket(
                     await websocket.send_json({"type": "heartbeat_ack"})
 
                 elif message_type == "respond":
-                    await hitl_service.connection_manager.handle_approval_response(
+                    decided = await hitl_service.connection_manager.handle_approval_response(
                         approval_id=data["approval_id"],
                         status=data["status"],
                         user_feedback=data.get("user_feedback"),
@@ -311,7 +325,8 @@ async def hitl_websocket(
                     )
                     await websocket.send_json({
                         "type": "response_ack",
-                        "approval_id": data["approval_id"]
+                        "approval_id": data["approval_id"],
+                        "accepted": decided
                     })
 
                 elif message_type == "subscribe":
@@ -22,6 +22,8 @@ from enum import Enum
 import structlog
 import os
 
+from graphrag.graph_snapshot import GraphSnapshot, get_graph_snapshot_manager
+
 # Try to import Neo4j - graceful fallback if not available
 try:
     from neo4j import AsyncGraphDatabase, AsyncDriver
@@ -194,6 +196,14 @@ def style_node(node_type: str, node_id: str, label: str, properties: dict) -> KG
     )
 
 
+def snapshot_node(snapshot: GraphSnapshot, index: int) -> KGNode:
+    """Style a node from the in-memory graph snapshot."""
+    props = snapshot.node_properties(index)
+    node_id = snapshot.node_keys[index]
+    label = props.get("name", props.get("code", node_id))
+    return style_node(snapshot.label(index), node_id, label, props)
+
+
 # ============================================================================
 # Core Graph Endpoints
 # ============================================================================
@@ -235,6 +245,18 @@ async def graph_health():
 @router.get("/graph/stats", response_model=KGStatsResponse)
 async def get_graph_stats():
     """Get graph statistics (node counts, edge counts by type)."""
+    snapshot = get_graph_snapshot_manager().current()
+    if snapshot is not None:
+        # Precomputed when the snapshot was built: no full-graph count queries
+        stats = snapshot.stats()
+        return KGStatsResponse(
+            total_nodes=stats["total_nodes"],
+            total_edges=stats["total_edges"],
+            node_types=stats["node_types"],
+            edge_types=stats["edge_types"],
+            mode="snapshot"
+        )
+
     driver = await get_neo4j_driver()
 
     if driver is None:
@@ -291,13 +313,53 @@ async def get_graph_stats():
         raise HTTPException(status_code=500, detail=f"Failed to get graph stats: {str(e)}")
 
 
+@router.get("/graph/snapshot")
+async def get_graph_snapshot_status():
+    """Status of the in-memory graph snapshot (version, age, size, degree stats)."""
+    return get_graph_snapshot_manager().stats()
+
+
+@router.post("/graph/snapshot/refresh")
+async def refresh_graph_snapshot():
+    """Rebuild the in-memory graph snapshot from Neo4j now."""
+    snapshot = await get_graph_snapshot_manager().refresh()
+    if snapshot is None:
+        raise HTTPException(status_code=503, detail="Graph snapshot refresh failed")
+    return snapshot.stats()
+
+
 @router.get("/graph/nodes", response_model=KGResponse)
 async def get_all_nodes(
     node_types: Optional[str] = Query(None, description="Comma-separated node types to include"),
     limit: int = Query(200, ge=1, le=1000),
-    offset: int = Query(0, ge=0)
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Node id to continue after (next_cursor of the previous page)")
 ):
-    """Get all nodes with optional type filtering."""
+    """
+    Get all nodes with optional type filtering, ordered by node id.
+
+    Prefer ``cursor`` over ``offset`` for deep pages: keyset pages cost the
+    same at any depth, SKIP does not.
+    """
+    types = [t.strip() for t in node_types.split(",")] if node_types else None
+
+    snapshot = get_graph_snapshot_manager().current()
+    if snapshot is not None:
+        page, next_cursor = snapshot.page_nodes(labels=types, after=cursor, limit=limit, offset=offset)
+        nodes = [snapshot_node(snapshot, index) for index in page]
+        return KGResponse(
+            nodes=nodes,
+            edges=[],
+            metadata={
+                "mode": "snapshot",
+                "count": len(nodes),
+                "offset": offset,
+                "limit": limit,
+                "next_cursor": next_cursor,
+                "snapshot_version": snapshot.version,
+            }
+        )
+
     driver = await get_neo4j_driver()
 
     if driver is None:
@@ -305,37 +367,51 @@ async def get_all_nodes(
 
     try:
         async with driver.session(database="neo4j") as session:
-            # Build type filter
-            type_filter = ""
-            if node_types:
-                types = [t.strip() for t in node_types.split(",")]
-                type_labels = " OR ".join([f"n:{t}" for t in types])
-                type_filter = f"WHERE {type_labels}"
+            # Build type and keyset filters
+            conditions = []
+            if types:
+                conditions.append("(" + " OR ".join([f"n:{t}" for t in types]) + ")")
+            if cursor is not None:
+                conditions.append("coalesce(n.id, elementId(n)) > $cursor")
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
 
             query = f"""
                 MATCH (n)
-                {type_filter}
-                RETURN n, labels(n)[0] as type
+                {where}
+                RETURN n, labels(n)[0] as type, coalesce(n.id, elementId(n)) as sort_key
+                ORDER BY sort_key
                 SKIP $offset
                 LIMIT $limit
             """
 
-            result = await session.run(query, offset=offset, limit=limit)
+            result = await session.run(query, offset=offset, limit=limit + 1, cursor=cursor)
             nodes = []
+            last_key = None
             async for record in result:
+                if len(nodes) == limit:
+                    break
                 node = record["n"]
                 node_type = record["type"]
                 node_props = dict(node)
                 node_id = node_props.get("id", str(node.element_id))
                 label = node_props.get("name", node_props.get("code", node_id))
+                last_key = record["sort_key"]
 
                 styled_node = style_node(node_type, str(node_id), label, node_props)
                 nodes.append(styled_node)
 
+            # Only advertise a cursor when a further row exists (fetched limit + 1)
+            next_cursor = str(last_key) if len(nodes) == limit and last_key is not None else None
             return KGResponse(
                 nodes=nodes,
                 edges=[],
-                metadata={"mode": "live", "count": len(nodes), "offset": offset, "limit": limit}
+                metadata={
+                    "mode": "live",
+                    "count": len(nodes),
+                    "offset": offset,
+                    "limit": limit,
+                    "next_cursor": next_cursor,
+                }
             )
     except Exception as e:
         logger.error("Failed to get nodes", error=str(e))
@@ -349,6 +425,34 @@ async def get_node_with_neighbors(
     limit: int = Query(50, ge=1, le=200)
 ):
     """Get a specific node with its neighbors up to max_hops away."""
+    snapshot = get_graph_snapshot_manager().current()
+    center_index = snapshot.resolve(node_id) if snapshot is not None else None
+    if center_index is not None:
+        reached, tree = snapshot.bfs([center_index], max_hops=max_hops, limit=limit)
+        nodes = [snapshot_node(snapshot, index) for index in [center_index, *reached]]
+        edges = []
+        for index in reached:
+            edge = snapshot.edge(int(snapshot.adj_edge[tree[index][2]]))
+            edges.append(KGEdge(
+                id=f"edge_{len(edges)}",
+                source=edge.pop("source"),
+                target=edge.pop("target"),
+                type=edge.pop("type"),
+                properties=edge
+            ))
+        return KGResponse(
+            nodes=nodes,
+            edges=edges,
+            metadata={
+                "mode": "snapshot",
+                "center_node": node_id,
+                "max_hops": max_hops,
+                "node_count": len(nodes),
+                "edge_count": len(edges),
+                "snapshot_version": snapshot.version,
+            }
+        )
+
     driver = await get_neo4j_driver()
 
     if driver is None:
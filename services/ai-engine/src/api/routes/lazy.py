@@ -0,0 +1,116 @@
+"""
+VITAL Path AI Services - Lazy Route Groups
+
+Heavy route groups (panels, experts, GraphRAG, frameworks, ...) import most
+of LangGraph, the agent stack and the provider SDKs. Registering them eagerly
+puts all of that between process start and the first request.
+
+A lazy group declares the URL prefixes it serves, the modules it imports and
+the register function that mounts it. LazyRouteMiddleware mounts a group the
+first time a request hits one of its prefixes (imports run in a worker
+thread, the request waits only for its own group); prewarm_lazy_routes
+mounts the rest in the background once startup has settled, so steady-state
+traffic never pays the import.
+"""
+
+import asyncio
+import importlib
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import FastAPI
+import structlog
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class LazyRouteGroup:
+    """A route group mounted on first hit (or by the prewarm)."""
+    name: str
+    prefixes: Tuple[str, ...]
+    modules: Tuple[str, ...]
+    register: Callable[[FastAPI], None]
+    loaded: bool = False
+    load_ms: Optional[float] = None
+    trigger: Optional[str] = None
+    error: Optional[str] = None
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+    def matches(self, path: str) -> bool:
+        return any(path == prefix or path.startswith(prefix + "/") for prefix in self.prefixes)
+
+    async def ensure_loaded(self, app: FastAPI, trigger: str) -> None:
+        if self.loaded:
+            return
+        async with self._lock:
+            if self.loaded:
+                return
+            started = time.perf_counter()
+            for module in self.modules:
+                try:
+                    await asyncio.to_thread(importlib.import_module, module)
+                except Exception as e:
+                    # The register function logs import failures as before
+                    self.error = f"{module}: {e}"
+            try:
+                self.register(app)
+            except Exception as e:
+                self.error = str(e)
+                logger.error("lazy_routes_register_failed", group=self.name, error=str(e))
+            # Routes changed: rebuild the OpenAPI schema on next /docs
+            app.openapi_schema = None
+            self.loaded = True
+            self.trigger = trigger
+            self.load_ms = (time.perf_counter() - started) * 1000
+            logger.info("lazy_routes_mounted", group=self.name, trigger=trigger, load_ms=round(self.load_ms, 1))
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"loaded": self.loaded, "prefixes": list(self.prefixes)}
+        if self.loaded:
+            data["trigger"] = self.trigger
+            data["load_ms"] = round(self.load_ms or 0.0, 1)
+        if self.error:
+            data["error"] = self.error
+        return data
+
+
+class LazyRouteMiddleware:
+    """ASGI middleware that mounts a lazy group before its first request is routed."""
+
+    def __init__(self, app, groups: Sequence[LazyRouteGroup]):
+        self.app = app
+        self.groups = list(groups)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket") and self.groups:
+            path = scope.get("path", "")
+            for group in self.groups:
+                if not group.loaded and group.matches(path):
+                    await group.ensure_loaded(scope["app"], trigger=path)
+            if all(group.loaded for group in self.groups):
+                self.groups = []
+        await self.app(scope, receive, send)
+
+
+def add_lazy_route_groups(app: FastAPI, groups: Sequence[LazyRouteGroup]) -> None:
+    """Install the middleware and remember the groups for prewarm and /health."""
+    app.state.lazy_route_groups = list(groups)
+    app.add_middleware(LazyRouteMiddleware, groups=app.state.lazy_route_groups)
+    logger.info("lazy_routes_deferred", groups=[group.name for group in groups])
+
+
+async def prewarm_lazy_routes(app: FastAPI) -> None:
+    """Mount every lazy group not hit yet, one at a time."""
+    for group in get_lazy_route_groups(app):
+        await group.ensure_loaded(app, trigger="prewarm")
+
+
+def get_lazy_route_groups(app: FastAPI) -> List[LazyRouteGroup]:
+    return list(getattr(app.state, "lazy_route_groups", []))
+
+
+def lazy_route_status(app: FastAPI) -> Dict[str, Any]:
+    """Per-group mount status, for health endpoints"""
+    return {group.name: group.to_dict() for group in get_lazy_route_groups(app)}
@@ -11,13 +11,41 @@ Routes are organized by domain and registered with appropriate prefixes and tags
 Phase 1 Refactoring: Extracted from monolithic main.py
 """
 
+import os
+from typing import Callable, Optional
+
 from fastapi import FastAPI
 import structlog
 
+from api.routes.lazy import LazyRouteGroup, add_lazy_route_groups
+
 logger = structlog.get_logger()
 
 
-def register_routes(app: FastAPI) -> None:
+# Heavy route groups: name -> (URL prefixes served, modules imported).
+# With lazy routes on they mount on first hit or by the post-startup prewarm.
+_HEAVY_ROUTE_GROUPS = {
+    "panels": (
+        ("/api/v1/panels", "/api/ask-panel-enhanced", "/api/v1/unified-panel", "/ask-panel"),
+        ("api.routes.panels", "api.routes.ask_panel_streaming", "api.routes.unified_panel",
+         "api.routes.panel_autonomous", "api.routes.panel_wizard"),
+    ),
+    "expert": (
+        ("/api/expert", "/ask-expert"),
+        ("api.routes.expert", "api.routes.ask_expert_interactive", "api.routes.ask_expert_autonomous"),
+    ),
+    "graphrag": (("/v1/graphrag",), ("graphrag.api.graphrag",)),
+    "frameworks": (("/frameworks",), ("api.frameworks",)),
+    "missions": (
+        ("/api/missions", "/api/v1/templates"),
+        ("api.routes.missions", "api.routes.missions_status", "api.routes.templates"),
+    ),
+    "mode3_preparation": (("/api/mode3",), ("api.routes.mode3_preparation",)),
+    "runners": (("/api/runners",), ("api.routes.runners",)),
+}
+
+
+def register_routes(app: FastAPI, lazy: Optional[bool] = None) -> None:
     """
     Register all API routes for the application.
     
@@ -33,26 +61,42 @@ def register_routes(app: FastAPI) -> None:
     8. Value Framework routes
     9. Investigator routes
     
+    Heavy groups (see _HEAVY_ROUTE_GROUPS) are mounted lazily unless
+    ROUTES_LAZY=false: on the first request to one of their prefixes, or by
+    the prewarm that runs once startup has settled.
+    
     Args:
         app: FastAPI application instance
+        lazy: Defer heavy groups (default: ROUTES_LAZY env, on)
     """
+    if lazy is None:
+        lazy = os.getenv("ROUTES_LAZY", "true").lower() != "false"
+    deferred = []
+    
+    def register_group(name: str, register: Callable[[FastAPI], None]) -> None:
+        if lazy and name in _HEAVY_ROUTE_GROUPS:
+            prefixes, modules = _HEAVY_ROUTE_GROUPS[name]
+            deferred.append(LazyRouteGroup(name, prefixes, modules, register))
+        else:
+            register(app)
+    
     # 0. Register Core routes (health, metrics, etc.)
     _register_core_routes(app)
     
     # 1. Register Ask Panel routes
-    _register_panel_routes(app)
+    register_group("panels", _register_panel_routes)
     
     # 2. Register Ask Expert routes (Phase 4 - 4-Mode System)
-    _register_expert_routes(app)
+    register_group("expert", _register_expert_routes)
     
     # 3. Register GraphRAG routes (Phase 1 - Hybrid Search)
-    _register_graphrag_routes(app)
+    register_group("graphrag", _register_graphrag_routes)
     
     # 4. Register Knowledge Graph routes
     _register_knowledge_graph_routes(app)
     
     # 5. Register Framework routes (LangGraph, AutoGen, CrewAI)
-    _register_framework_routes(app)
+    register_group("frameworks", _register_framework_routes)
     
     # 6. Register Enhanced Features routes
     _register_enhanced_features_routes(app)
@@ -74,10 +118,10 @@ def register_routes(app: FastAPI) -> None:
     
     # 12. Register Missions/Templates routes (Autonomous Modes 3/4)
     # Note: Mode 3 HITL checkpoints are handled by ask_expert_autonomous.py
-    _register_mission_routes(app)
+    register_group("missions", _register_mission_routes)
 
     # 12.5. Register Mode 3 Preparation routes (LLM-powered HITL checkpoint prep)
-    _register_mode3_preparation_routes(app)
+    register_group("mode3_preparation", _register_mode3_preparation_routes)
 
     # 13. Register Agent Context routes (Phase 2 - Agent OS)
     _register_agent_context_routes(app)
@@ -89,9 +133,12 @@ def register_routes(app: FastAPI) -> None:
     _register_agent_sessions_routes(app)
 
     # 15. Register Runners routes (Task Runners, Family Runners, JTBD mapping)
-    _register_runners_routes(app)
+    register_group("runners", _register_runners_routes)
 
-    logger.info("✅ All routes registered successfully")
+    if deferred:
+        add_lazy_route_groups(app, deferred)
+    
+    logger.info("✅ All routes registered successfully", deferred=[g.name for g in deferred])
 
 
 def _register_core_routes(app: FastAPI) -> None:
@@ -254,6 +254,37 @@ from .model_factory import (
     get_models_by_provider,
 )
 
+from .llm_gateway import (
+    # LLM Gateway (admission control for all provider calls)
+    Priority,
+    LaneBudget,
+    LLMGateway,
+    GatewayChatModel,
+    priority_scope,
+    get_llm_gateway,
+    initialize_llm_gateway,
+    reset_llm_gateway,
+)
+
+from .hedging import (
+    # Latency-aware hedged requests
+    HedgeBudget,
+    HedgedChatModel,
+    LatencyRouter,
+    LatencyTracker,
+    get_latency_router,
+    reset_latency_router,
+)
+
+from .llm_response_cache import (
+    # LLM Response Cache (opt-in, single-flight)
+    CachePolicy,
+    CachedResponse,
+    LLMResponseCache,
+    cached_llm,
+    request_digest,
+)
+
 __all__ = [
     # Context management
     "RequestContext",
@@ -436,6 +467,28 @@ __all__ = [
     "get_available_models",
     "get_models_by_tier",
     "get_models_by_provider",
+    # LLM Gateway
+    "Priority",
+    "LaneBudget",
+    "LLMGateway",
+    "GatewayChatModel",
+    "priority_scope",
+    "get_llm_gateway",
+    "initialize_llm_gateway",
+    "reset_llm_gateway",
+    # Hedged requests
+    "HedgeBudget",
+    "HedgedChatModel",
+    "LatencyRouter",
+    "LatencyTracker",
+    "get_latency_router",
+    "reset_latency_router",
+    # LLM Response Cache
+    "CachePolicy",
+    "CachedResponse",
+    "LLMResponseCache",
+    "cached_llm",
+    "request_digest",
 ]
 
 
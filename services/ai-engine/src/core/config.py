@@ -410,6 +410,10 @@ class Settings:
     elasticsearch_api_key: str = ""
     elasticsearch_index: str = "vital-medical-docs"
 
+    # Vector store (GraphRAG): "pinecone", "pgvector" or "local" (embedded)
+    vector_store_provider: str = "pinecone"
+    local_vector_store_path: str = ""
+
     # Security Settings
     cors_origins: str = "http://localhost:3000,http://localhost:8000"
     
@@ -457,6 +461,10 @@ class Settings:
             elasticsearch_api_key=os.getenv("ELASTICSEARCH_API_KEY", ""),
             elasticsearch_index=os.getenv("ELASTICSEARCH_INDEX", "vital-medical-docs"),
 
+            # Vector store
+            vector_store_provider=os.getenv("VECTOR_STORE_PROVIDER", "pinecone").lower(),
+            local_vector_store_path=os.getenv("LOCAL_VECTOR_STORE_PATH", ""),
+
             # Security
             cors_origins=os.getenv("CORS_ORIGINS", os.getenv("ALLOWED_ORIGINS", "http://localhost:3000,http://localhost:8000")),
             
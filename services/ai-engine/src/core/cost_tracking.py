@@ -118,6 +118,7 @@ class CostRecord:
     # Additional metadata
     latency_ms: Optional[int] = None
     cached: bool = False
+    saved_cost: float = 0.0  # What a cache hit would have cost upstream
     metadata: Dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> Dict[str, Any]:
@@ -140,6 +141,7 @@ class CostRecord:
             "operation": self.operation,
             "latency_ms": self.latency_ms,
             "cached": self.cached,
+            "saved_cost": self.saved_cost,
             "metadata": self.metadata,
         }
 
@@ -152,6 +154,8 @@ class CostSummary:
     total_output_tokens: int = 0
     total_requests: int = 0
     cached_requests: int = 0
+    saved_tokens: int = 0
+    saved_cost: float = 0.0
     cost_by_model: Dict[str, float] = field(default_factory=dict)
     cost_by_operation: Dict[str, float] = field(default_factory=dict)
     first_timestamp: Optional[datetime] = None
@@ -166,6 +170,8 @@ class CostSummary:
             "total_requests": self.total_requests,
             "cached_requests": self.cached_requests,
             "cache_hit_rate": round(self.cached_requests / self.total_requests, 3) if self.total_requests > 0 else 0,
+            "saved_tokens": self.saved_tokens,
+            "saved_cost": round(self.saved_cost, 6),
             "average_cost_per_request": round(self.total_cost / self.total_requests, 6) if self.total_requests > 0 else 0,
             "cost_by_model": {k: round(v, 6) for k, v in self.cost_by_model.items()},
             "cost_by_operation": {k: round(v, 6) for k, v in self.cost_by_operation.items()},
@@ -274,6 +280,9 @@ class CostTracker:
         self._total_cost = 0.0
         self._total_tokens = 0
         self._request_count = 0
+        self._cached_count = 0
+        self._saved_tokens = 0
+        self._saved_cost = 0.0
 
     def get_pricing(self, model_id: str) -> ModelPricing:
         """Get pricing for a model."""
@@ -322,7 +331,8 @@ class CostTracker:
             request_id: Unique request identifier
             operation: Type of operation (e.g., "mode1_chat")
             latency_ms: Request latency in milliseconds
-            cached: Whether this was a cache hit (costs $0)
+            cached: Whether this was a cache hit (costs $0; the avoided
+                cost is recorded as saved_cost)
             metadata: Additional metadata
 
         Returns:
@@ -331,8 +341,10 @@ class CostTracker:
         pricing = self.get_pricing(model_id)
 
         # Cached requests have no cost
+        saved_cost = 0.0
         if cached:
             input_cost = output_cost = total_cost = 0.0
+            saved_cost = pricing.calculate_cost(input_tokens, output_tokens)
         else:
             input_cost = (input_tokens / 1000) * pricing.input_cost_per_1k
             output_cost = (output_tokens / 1000) * pricing.output_cost_per_1k
@@ -356,6 +368,7 @@ class CostTracker:
             operation=operation,
             latency_ms=latency_ms,
             cached=cached,
+            saved_cost=saved_cost,
             metadata=metadata or {},
         )
 
@@ -365,6 +378,10 @@ class CostTracker:
             self._total_cost += record.total_cost
             self._total_tokens += record.total_tokens
             self._request_count += 1
+            if cached:
+                self._cached_count += 1
+                self._saved_tokens += record.total_tokens
+                self._saved_cost += saved_cost
 
             # Update budgets
             budget_keys = []
@@ -489,6 +506,8 @@ class CostTracker:
 
             if record.cached:
                 summary.cached_requests += 1
+                summary.saved_tokens += record.total_tokens
+                summary.saved_cost += record.saved_cost
 
             # By model
             if record.model_id not in summary.cost_by_model:
@@ -516,6 +535,9 @@ class CostTracker:
             "total_tokens": self._total_tokens,
             "total_requests": self._request_count,
             "average_cost_per_request": round(self._total_cost / self._request_count, 6) if self._request_count > 0 else 0,
+            "cache_hit_rate": round(self._cached_count / self._request_count, 3) if self._request_count > 0 else 0,
+            "saved_tokens": self._saved_tokens,
+            "saved_cost": round(self._saved_cost, 6),
             "records_in_memory": len(self._records),
             "active_budgets": len(self._budgets),
         }
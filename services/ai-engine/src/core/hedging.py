@@ -0,0 +1,494 @@
+"""
+Latency-Aware Hedged Requests.
+
+The health registry and circuit breakers react to errors only: a provider
+that is slow but healthy keeps serving every call and drags p99 with it.
+This module tracks latency per provider:model and hedges slow calls:
+
+- LatencyTracker: EWMA plus quantiles (sliding window) of total latency and
+  time-to-first-token (TTFT) for one provider:model
+- HedgeBudget: caps hedging overhead to a fraction of primary requests
+  (token bucket refilled by each request, like a retry budget)
+- HedgedChatModel: runs the primary; if it has produced no first token by
+  its p95, starts the secondary (another provider) and keeps whichever
+  answers first, cancelling the loser
+
+Every outcome (including the censored latency of a cancelled loser) feeds
+the tracker and ProviderHealthRegistry, so TTFT also drives the health
+score used to order fallback chains.
+
+Usage:
+    router = get_latency_router()
+    model = HedgedChatModel(primary, secondary, router, health=get_health_registry())
+    answer = await model.ainvoke(messages)
+    router.get_statistics()  # hedge rate, wins, extra-cost ratio
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Optional
+import asyncio
+import os
+import time
+
+import numpy as np
+import structlog
+
+from .llm_gateway import _RunnableBase
+
+logger = structlog.get_logger()
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+HEDGE_BUDGET_RATIO = float(os.getenv("LLM_HEDGE_BUDGET_RATIO", "0.05"))
+HEDGE_BUDGET_BURST = float(os.getenv("LLM_HEDGE_BUDGET_BURST", "10"))
+HEDGE_QUANTILE = float(os.getenv("LLM_HEDGE_QUANTILE", "0.95"))
+HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+HEDGE_MIN_DELAY_MS = float(os.getenv("LLM_HEDGE_MIN_DELAY_MS", "50"))
+LATENCY_WINDOW = 256
+EWMA_ALPHA = 0.1
+
+
+# ============================================================================
+# Latency Tracking
+# ============================================================================
+
+class _Distribution:
+    """EWMA plus a sliding window for quantiles."""
+
+    def __init__(self, window: int):
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.ewma: float = 0.0
+        self.count: int = 0
+        self._sorted: Optional[np.ndarray] = None
+
+    def record(self, value_ms: float):
+        self.samples.append(value_ms)
+        self.ewma = self.ewma * (1 - EWMA_ALPHA) + value_ms * EWMA_ALPHA if self.count else value_ms
+        self.count += 1
+        self._sorted = None
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        if self._sorted is None:
+            self._sorted = np.sort(np.fromiter(self.samples, dtype=np.float64, count=len(self.samples)))
+        return float(np.quantile(self._sorted, q))
+
+    def to_dict(self) -> Dict[str, Any]:
+        if not self.samples:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "ewma_ms": round(self.ewma, 1),
+            "p50_ms": round(self.quantile(0.5), 1),
+            "p95_ms": round(self.quantile(0.95), 1),
+            "p99_ms": round(self.quantile(0.99), 1),
+        }
+
+
+class LatencyTracker:
+    """Latency and TTFT distributions for one provider:model."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.latency = _Distribution(window)
+        self.ttft = _Distribution(window)
+
+    def record(self, latency_ms: Optional[float] = None, ttft_ms: Optional[float] = None):
+        if latency_ms is not None:
+            self.latency.record(latency_ms)
+        if ttft_ms is not None:
+            self.ttft.record(ttft_ms)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"latency": self.latency.to_dict(), "ttft": self.ttft.to_dict()}
+
+
+class HedgeBudget:
+    """
+    Caps hedges to ``ratio`` of primary requests.
+
+    Each request deposits ``ratio`` tokens (up to ``burst``); a hedge spends one.
+    """
+
+    def __init__(self, ratio: float = HEDGE_BUDGET_RATIO, burst: float = HEDGE_BUDGET_BURST):
+        self.ratio = ratio
+        self.burst = burst
+        self.tokens = burst if ratio > 0 else 0.0
+
+    def on_request(self):
+        self.tokens = min(self.burst, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+@dataclass
+class HedgeStats:
+    requests: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    budget_denied: int = 0
+    cancelled: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "budget_denied": self.budget_denied,
+            "cancelled": self.cancelled,
+            # Upstream calls beyond one per request
+            "extra_cost_ratio": round(self.hedges / self.requests, 4) if self.requests else 0.0,
+        }
+
+
+class LatencyRouter:
+    """
+    Per provider:model latency trackers plus the shared hedge budget.
+
+    Args:
+        budget: Hedge budget (defaults to LLM_HEDGE_BUDGET_RATIO / _BURST)
+        quantile: Primary latency quantile after which a hedge is sent
+        min_samples: Samples required before a model is hedged
+        min_delay_ms: Lower bound for the hedge delay
+    """
+
+    def __init__(
+        self,
+        budget: Optional[HedgeBudget] = None,
+        quantile: float = HEDGE_QUANTILE,
+        min_samples: int = HEDGE_MIN_SAMPLES,
+        min_delay_ms: float = HEDGE_MIN_DELAY_MS,
+    ):
+        self.budget = budget or HedgeBudget()
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.min_delay_ms = min_delay_ms
+        self.stats = HedgeStats()
+        self._trackers: Dict[str, LatencyTracker] = {}
+
+    def tracker(self, provider: str, model: str) -> LatencyTracker:
+        key = f"{provider}:{model}"
+        if key not in self._trackers:
+            self._trackers[key] = LatencyTracker()
+        return self._trackers[key]
+
+    def hedge_delay(self, provider: str, model: str, streaming: bool) -> Optional[float]:
+        """Seconds to wait for a first token before hedging; None = do not hedge yet"""
+        tracker = self.tracker(provider, model)
+        distribution = tracker.ttft if streaming else tracker.latency
+        if distribution.count < self.min_samples:
+            return None
+        return max(distribution.quantile(self.quantile), self.min_delay_ms) / 1000
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            **self.stats.to_dict(),
+            "budget_tokens": round(self.budget.tokens, 2),
+            "models": {key: tracker.to_dict() for key, tracker in self._trackers.items()},
+        }
+
+
+# Global router
+_latency_router: Optional[LatencyRouter] = None
+
+
+def get_latency_router() -> LatencyRouter:
+    """Get global latency router."""
+    global _latency_router
+    if _latency_router is None:
+        _latency_router = LatencyRouter()
+    return _latency_router
+
+
+def reset_latency_router():
+    """Reset latency router (for testing)."""
+    global _latency_router
+    _latency_router = None
+
+
+# ============================================================================
+# Hedged Chat Model
+# ============================================================================
+
+@dataclass
+class _Attempt:
+    model: Any
+    started: float = field(default_factory=time.perf_counter)
+    first_token: Optional[float] = None
+
+    def elapsed_ms(self, until: Optional[float] = None) -> float:
+        return ((until or time.perf_counter()) - self.started) * 1000
+
+
+async def _cancel(task: "asyncio.Future") -> None:
+    if not task.done():
+        task.cancel()
+    try:
+        await task
+    except BaseException:
+        pass
+
+
+class HedgedChatModel(_RunnableBase):
+    """
+    Chat model proxy that hedges slow primary calls with a secondary model.
+
+    Without a secondary (or before the primary has enough samples) it only
+    records latency. Attribute access falls through to the primary;
+    ``bind_tools`` / ``with_structured_output`` / ``with_cache`` apply to
+    both legs. Synchronous ``invoke``/``stream`` go to the primary only.
+    """
+
+    def __init__(
+        self,
+        primary: Any,
+        secondary: Optional[Any],
+        router: LatencyRouter,
+        health: Optional[Any] = None,
+    ):
+        self._primary = primary
+        self._secondary = secondary
+        self._router = router
+        self._health = health
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__") or name == "_primary":
+            raise AttributeError(name)
+        return getattr(self._primary, name)
+
+    def _map(self, method: str, *args, **kwargs) -> "HedgedChatModel":
+        primary = getattr(self._primary, method)(*args, **kwargs)
+        secondary = None
+        if self._secondary is not None:
+            try:
+                secondary = getattr(self._secondary, method)(*args, **kwargs)
+            except Exception as e:
+                logger.debug("llm_hedge_secondary_unsupported", method=method, error=str(e))
+        return HedgedChatModel(primary, secondary, self._router, self._health)
+
+    def bind_tools(self, *args, **kwargs) -> "HedgedChatModel":
+        return self._map("bind_tools", *args, **kwargs)
+
+    def with_structured_output(self, *args, **kwargs) -> "HedgedChatModel":
+        return self._map("with_structured_output", *args, **kwargs)
+
+    def with_cache(self, *args, **kwargs) -> "HedgedChatModel":
+        return self._map("with_cache", *args, **kwargs)
+
+    def invoke(self, input: Any, config: Any = None, **kwargs) -> Any:
+        return self._primary.invoke(input, config, **kwargs)
+
+    def stream(self, input: Any, config: Any = None, **kwargs):
+        return self._primary.stream(input, config, **kwargs)
+
+    # ------------------------------------------------------------------------
+    # Bookkeeping
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def _key(model: Any):
+        return (
+            str(getattr(model, "provider", "unknown")),
+            str(getattr(model, "gateway_model", None) or getattr(model, "model_name", "unknown")),
+        )
+
+    async def _observe(
+        self,
+        attempt: _Attempt,
+        ttft_ms: Optional[float] = None,
+        latency_ms: Optional[float] = None,
+        error: Optional[BaseException] = None,
+    ):
+        provider, model = self._key(attempt.model)
+        self._router.tracker(provider, model).record(latency_ms=latency_ms, ttft_ms=ttft_ms)
+        if self._health is None:
+            return
+        try:
+            from .model_factory import ModelProvider
+            provider_enum = ModelProvider(provider)
+        except ValueError:
+            return
+        if error is not None:
+            await self._health.record_failure(provider_enum, str(error) or type(error).__name__)
+        elif latency_ms is not None:
+            await self._health.record_success(provider_enum, latency_ms, ttft_ms=ttft_ms)
+
+    def _should_hedge(self, streaming: bool) -> Optional[float]:
+        self._router.stats.requests += 1
+        self._router.budget.on_request()
+        if self._secondary is None:
+            return None
+        return self._router.hedge_delay(*self._key(self._primary), streaming=streaming)
+
+    def _spend(self) -> bool:
+        if self._router.budget.try_spend():
+            self._router.stats.hedges += 1
+            return True
+        self._router.stats.budget_denied += 1
+        return False
+
+    # ------------------------------------------------------------------------
+    # Async calls
+    # ------------------------------------------------------------------------
+
+    async def ainvoke(self, input: Any, config: Any = None, **kwargs) -> Any:
+        delay = self._should_hedge(streaming=False)
+        primary = _Attempt(self._primary)
+        attempts = {asyncio.ensure_future(self._primary.ainvoke(input, config, **kwargs)): primary}
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(attempts, timeout=delay)
+                if not done and self._spend():
+                    secondary = _Attempt(self._secondary)
+                    attempts[asyncio.ensure_future(self._secondary.ainvoke(input, config, **kwargs))] = secondary
+                    logger.debug(
+                        "llm_hedge_sent",
+                        primary=self._key(self._primary), secondary=self._key(self._secondary),
+                        delay_ms=round(delay * 1000, 1),
+                    )
+
+            pending = set(attempts)
+            first_error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    attempt = attempts[task]
+                    error = task.exception()
+                    latency = attempt.elapsed_ms()
+                    if error is not None:
+                        await self._observe(attempt, error=error)
+                        first_error = first_error or error
+                        continue
+                    await self._observe(attempt, ttft_ms=latency, latency_ms=latency)
+                    if attempt is not primary:
+                        self._router.stats.hedge_wins += 1
+                    for loser in pending:
+                        await self._abandon(loser, attempts[loser], streaming=False)
+                    return task.result()
+            raise first_error
+        finally:
+            for task in attempts:
+                if not task.done():
+                    task.cancel()
+
+    async def _abandon(self, task: "asyncio.Future", attempt: _Attempt, streaming: bool):
+        """Cancel a losing leg; its elapsed time is a lower bound on its latency"""
+        elapsed = attempt.elapsed_ms()
+        await _cancel(task)
+        self._router.stats.cancelled += 1
+        provider, model = self._key(attempt.model)
+        tracker = self._router.tracker(provider, model)
+        if streaming:
+            tracker.record(ttft_ms=elapsed)
+        else:
+            tracker.record(latency_ms=elapsed, ttft_ms=elapsed)
+
+    async def astream(self, input: Any, config: Any = None, **kwargs) -> AsyncIterator[Any]:
+        delay = self._should_hedge(streaming=True)
+        legs: Dict["asyncio.Future", Any] = {}
+
+        def start(model: Any) -> None:
+            attempt = _Attempt(model)
+            iterator = model.astream(input, config, **kwargs).__aiter__()
+            legs[asyncio.ensure_future(iterator.__anext__())] = (attempt, iterator)
+
+        start(self._primary)
+        winner = None
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(legs, timeout=delay)
+                if not done and self._spend():
+                    start(self._secondary)
+                    logger.debug(
+                        "llm_hedge_sent",
+                        primary=self._key(self._primary), secondary=self._key(self._secondary),
+                        delay_ms=round(delay * 1000, 1), streaming=True,
+                    )
+
+            # Race for the first chunk; the first leg to produce one wins
+            pending = set(legs)
+            first_chunk = None
+            first_error: Optional[BaseException] = None
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    attempt, iterator = legs[task]
+                    error = task.exception()
+                    if isinstance(error, StopAsyncIteration):
+                        error = None
+                        first_chunk = _EMPTY
+                    elif error is not None:
+                        await self._observe(attempt, error=error)
+                        first_error = first_error or error
+                        continue
+                    else:
+                        first_chunk = task.result()
+                    attempt.first_token = time.perf_counter()
+                    winner = (attempt, iterator)
+                    break
+
+            for task, (attempt, iterator) in legs.items():
+                if winner is not None and iterator is winner[1]:
+                    continue
+                if not task.done():
+                    await self._abandon(task, attempt, streaming=True)
+                await _aclose(iterator)
+
+            if winner is None:
+                raise first_error
+
+            attempt, iterator = winner
+            if attempt.model is not self._primary:
+                self._router.stats.hedge_wins += 1
+            if first_chunk is not _EMPTY:
+                yield first_chunk
+                async for chunk in iterator:
+                    yield chunk
+            await self._observe(
+                attempt,
+                ttft_ms=attempt.elapsed_ms(attempt.first_token),
+                latency_ms=attempt.elapsed_ms(),
+            )
+        except BaseException as error:
+            if winner is not None and not isinstance(error, (asyncio.CancelledError, GeneratorExit)):
+                await self._observe(winner[0], error=error)
+            raise
+        finally:
+            for task, (_, iterator) in legs.items():
+                if not task.done():
+                    await _cancel(task)
+                await _aclose(iterator)
+
+    def __repr__(self) -> str:
+        return f"HedgedChatModel({self._primary!r}, hedge={self._secondary!r})"
+
+
+_EMPTY = object()
+
+
+async def _aclose(iterator: Any) -> None:
+    aclose: Optional[Callable[[], Awaitable[None]]] = getattr(iterator, "aclose", None)
+    if aclose is not None:
+        try:
+            await aclose()
+        except Exception:
+            pass
+
+
+__all__ = [
+    "LatencyTracker",
+    "HedgeBudget",
+    "HedgeStats",
+    "LatencyRouter",
+    "get_latency_router",
+    "reset_latency_router",
+    "HedgedChatModel",
+]
@@ -0,0 +1,1129 @@
+"""
+LLM Gateway - Process-Wide Admission Control for Provider Calls
+
+Call sites obtain LLM clients here instead of constructing ChatOpenAI /
+ChatAnthropic / AsyncOpenAI themselves, so provider rate limits are enforced
+once per process rather than rediscovered through 429s by every module.
+
+Key Features:
+- Shared HTTP connection pools (one httpx client per provider)
+- Opt-in response caching with single-flight (see core/llm_response_cache.py);
+  hits are served before admission and consume no budget
+- Token-bucket admission per (provider, model) against RPM and TPM budgets;
+  TPM reservations are reconciled against reported usage after each call
+- Priority classes: INTERACTIVE waiters are always admitted ahead of
+  BACKGROUND ones, and background work may only use a share of a lane's
+  concurrency
+- Queueing with deadlines: a request that cannot be admitted before its
+  deadline fails fast with LLMTimeoutException
+- 429-aware AIMD concurrency: a lane's limit grows by one per window of
+  successful calls and is cut multiplicatively on a provider 429; throttled
+  calls pause the lane for Retry-After and are retried inside the deadline
+- Transient provider failures (5xx, timeouts, dropped connections) are
+  retried with exponential backoff inside the same deadline. Provider SDK
+  retries are disabled so no error is retried twice.
+
+Budgets come from the environment:
+    LLM_GATEWAY_DEFAULT_RPM, LLM_GATEWAY_DEFAULT_TPM, LLM_GATEWAY_MAX_CONCURRENCY
+    LLM_GATEWAY_BUDGETS='{"openai:gpt-4o": {"rpm": 500, "tpm": 300000}}'
+
+Usage:
+    from core.llm_gateway import get_llm_gateway, Priority
+
+    llm = get_llm_gateway().chat_model("gpt-4o", temperature=0.2)
+    response = await llm.ainvoke(messages)
+
+    gateway = get_llm_gateway()
+    await gateway.call(
+        "openai", "text-embedding-3-large",
+        lambda: gateway.openai_client().embeddings.create(...), tokens=200,
+    )
+
+    # Deterministic call site: reuse identical responses for an hour
+    response = await llm.with_cache("l1.decompose_mission", ttl_seconds=3600).ainvoke(messages)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import heapq
+import itertools
+import json
+import operator
+import os
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+import structlog
+
+from domain.exceptions import LLMTimeoutException
+
+from .llm_response_cache import CachedResponse, CachePolicy, LLMResponseCache, request_digest
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+class Priority(IntEnum):
+    """Admission class; lower values are admitted first."""
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+DEFAULT_RPM = float(os.getenv("LLM_GATEWAY_DEFAULT_RPM", "500"))
+DEFAULT_TPM = float(os.getenv("LLM_GATEWAY_DEFAULT_TPM", "200000"))
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("LLM_GATEWAY_MAX_CONCURRENCY", "32"))
+DEFAULT_BURST_SECONDS = float(os.getenv("LLM_GATEWAY_BURST_SECONDS", "10"))
+BACKGROUND_SHARE = float(os.getenv("LLM_GATEWAY_BACKGROUND_SHARE", "0.75"))
+MAX_THROTTLE_RETRIES = int(os.getenv("LLM_GATEWAY_MAX_THROTTLE_RETRIES", "4"))
+THROTTLE_PAUSE_SECONDS = float(os.getenv("LLM_GATEWAY_THROTTLE_PAUSE_SECONDS", "1.0"))
+# Matches the OpenAI/Anthropic SDK defaults the gateway replaces
+MAX_TRANSIENT_RETRIES = int(os.getenv("LLM_GATEWAY_MAX_TRANSIENT_RETRIES", "2"))
+TRANSIENT_BACKOFF_SECONDS = float(os.getenv("LLM_GATEWAY_TRANSIENT_BACKOFF_SECONDS", "0.5"))
+
+DEFAULT_TIMEOUTS: Dict[Priority, float] = {
+    Priority.INTERACTIVE: float(os.getenv("LLM_GATEWAY_INTERACTIVE_TIMEOUT", "60")),
+    Priority.BACKGROUND: float(os.getenv("LLM_GATEWAY_BACKGROUND_TIMEOUT", "600")),
+}
+
+# Completion tokens reserved against TPM when the caller sets no max_tokens
+DEFAULT_COMPLETION_RESERVATION = 1024
+
+_current_priority: contextvars.ContextVar[Priority] = contextvars.ContextVar(
+    "llm_gateway_priority", default=Priority.INTERACTIVE
+)
+
+
+@contextmanager
+def priority_scope(priority: Priority):
+    """Run a block (e.g. a background mission) under a default priority."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> Priority:
+    """Priority applied to calls that do not set one explicitly."""
+    return _current_priority.get()
+
+
+@dataclass(frozen=True)
+class LaneBudget:
+    """Provider limits for one (provider, model) lane. 0 disables a limit."""
+    rpm: float = DEFAULT_RPM
+    tpm: float = DEFAULT_TPM
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    min_concurrency: int = 1
+    burst_seconds: float = DEFAULT_BURST_SECONDS
+
+
+def load_budgets_from_env() -> Dict[str, LaneBudget]:
+    """Parse LLM_GATEWAY_BUDGETS ("provider:model" -> limits)."""
+    raw = os.getenv("LLM_GATEWAY_BUDGETS")
+    if not raw:
+        return {}
+    try:
+        return {key: LaneBudget(**limits) for key, limits in json.loads(raw).items()}
+    except (ValueError, TypeError) as e:
+        logger.warning("llm_gateway_budgets_invalid", error=str(e))
+        return {}
+
+
+# ============================================================================
+# Admission Primitives
+# ============================================================================
+
+class TokenBucket:
+    """
+    Continuous-refill token bucket.
+
+    Takes may drive the level negative (a request larger than the burst is
+    admitted once the bucket is full); later takes wait out the debt.
+    """
+
+    def __init__(self, per_minute: float, burst_seconds: float, now: float):
+        self.rate = per_minute / 60.0
+        self.capacity = max(self.rate * burst_seconds, 1.0) if per_minute > 0 else 0.0
+        self.level = self.capacity
+        self._updated = now
+
+    @property
+    def unlimited(self) -> bool:
+        return self.rate <= 0
+
+    def _refill(self, now: float):
+        if now > self._updated:
+            self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` can be taken (0 if available now)."""
+        if self.unlimited:
+            return 0.0
+        self._refill(now)
+        need = min(amount, self.capacity)
+        return 0.0 if self.level >= need else (need - self.level) / self.rate
+
+    def take(self, amount: float, now: float):
+        if not self.unlimited:
+            self._refill(now)
+            self.level -= amount
+
+    def credit(self, amount: float, now: float):
+        """Return (or, if negative, charge) tokens after reconciliation."""
+        if not self.unlimited:
+            self._refill(now)
+            self.level = min(self.capacity, self.level + amount)
+
+
+class AIMDLimiter:
+    """
+    Additive-increase / multiplicative-decrease concurrency limit.
+
+    Each success adds ``1 / limit`` (about +1 per window of ``limit`` calls);
+    a throttle multiplies the limit by ``decrease_factor``, at most once per
+    ``cooldown_seconds`` so one burst of 429s counts as one congestion signal.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int = 1,
+        maximum: Optional[int] = None,
+        decrease_factor: float = 0.5,
+        cooldown_seconds: float = 1.0,
+    ):
+        self.minimum = max(1, minimum)
+        self.maximum = maximum or initial
+        self.decrease_factor = decrease_factor
+        self.cooldown_seconds = cooldown_seconds
+        self._limit = float(max(self.minimum, min(initial, self.maximum)))
+        self._last_decrease = float("-inf")
+
+    @property
+    def limit(self) -> int:
+        return max(self.minimum, int(self._limit))
+
+    def on_success(self):
+        self._limit = min(float(self.maximum), self._limit + 1.0 / self._limit)
+
+    def on_throttle(self, now: float) -> bool:
+        """Returns True if the limit was decreased."""
+        if now - self._last_decrease < self.cooldown_seconds:
+            return False
+        self._limit = max(float(self.minimum), self._limit * self.decrease_factor)
+        self._last_decrease = now
+        return True
+
+
+@dataclass
+class Lease:
+    """An admitted request; must be released exactly once."""
+    lane: "_Lane"
+    tokens: int
+    priority: Priority
+    queued_ms: float
+    released: bool = False
+
+
+@dataclass
+class _Waiter:
+    priority: Priority
+    tokens: int
+    deadline: float
+    enqueued_at: float
+    future: asyncio.Future
+
+
+class _Lane:
+    """Admission state for one (provider, model) pair."""
+
+    def __init__(self, key: str, budget: LaneBudget, clock: Callable[[], float]):
+        now = clock()
+        self.key = key
+        self.budget = budget
+        self.clock = clock
+        self.requests = TokenBucket(budget.rpm, budget.burst_seconds, now)
+        self.tokens = TokenBucket(budget.tpm, budget.burst_seconds, now)
+        self.limiter = AIMDLimiter(
+            initial=budget.max_concurrency,
+            minimum=budget.min_concurrency,
+            maximum=budget.max_concurrency,
+        )
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._waiters: List[Tuple[int, int, _Waiter]] = []
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_at = float("inf")
+        self.metrics = {
+            "admitted": 0,
+            "throttled": 0,
+            "limit_decreases": 0,
+            "deadline_exceeded": 0,
+            "transient_retries": 0,
+            "queued_ms_total": 0.0,
+        }
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for _, _, w in self._waiters if not w.future.done())
+
+    def concurrency_for(self, priority: Priority) -> int:
+        limit = self.limiter.limit
+        if priority == Priority.BACKGROUND:
+            return max(1, int(limit * BACKGROUND_SHARE))
+        return limit
+
+    def enqueue(self, waiter: _Waiter):
+        heapq.heappush(self._waiters, (int(waiter.priority), next(self._seq), waiter))
+        self.pump()
+
+    def _delay(self, tokens: int, priority: Priority, now: float) -> Optional[float]:
+        """0 if admissible now, seconds until it may be, None if concurrency-bound."""
+        if self.in_flight >= self.concurrency_for(priority):
+            return None
+        return max(
+            self.paused_until - now,
+            self.requests.wait_time(1, now),
+            self.tokens.wait_time(tokens, now),
+            0.0,
+        )
+
+    def pump(self):
+        """Admit waiters in priority order while budgets allow."""
+        now = self.clock()
+        while self._waiters:
+            waiter = self._waiters[0][2]
+            if waiter.future.done():
+                heapq.heappop(self._waiters)
+                continue
+
+            delay = self._delay(waiter.tokens, waiter.priority, now)
+            if delay is None:
+                return  # woken by release()
+            if delay > 0:
+                if now + delay > waiter.deadline:
+                    # Cannot be admitted in time; shed it now rather than at the deadline
+                    heapq.heappop(self._waiters)
+                    self.metrics["deadline_exceeded"] += 1
+                    waiter.future.set_exception(self._deadline_error(waiter, now))
+                    continue
+                self._schedule(now, delay)
+                return
+
+            heapq.heappop(self._waiters)
+            waiter.future.set_result(self._admit(waiter.tokens, waiter.priority, waiter.enqueued_at, now))
+
+    def try_admit(self, tokens: int, priority: Priority) -> Optional[Lease]:
+        """Fast path: admit immediately if nobody is queued ahead."""
+        now = self.clock()
+        if self.queue_depth or self._delay(tokens, priority, now) != 0:
+            return None
+        return self._admit(tokens, priority, now, now)
+
+    def _admit(self, tokens: int, priority: Priority, enqueued_at: float, now: float) -> Lease:
+        self.requests.take(1, now)
+        self.tokens.take(tokens, now)
+        self.in_flight += 1
+        queued_ms = (now - enqueued_at) * 1000
+        self.metrics["admitted"] += 1
+        self.metrics["queued_ms_total"] += queued_ms
+        return Lease(lane=self, tokens=tokens, priority=priority, queued_ms=queued_ms)
+
+    def release(
+        self,
+        lease: Lease,
+        actual_tokens: Optional[int] = None,
+        throttled: bool = False,
+        retry_after: Optional[float] = None,
+    ):
+        if lease.released:
+            return
+        lease.released = True
+        now = self.clock()
+        self.in_flight -= 1
+
+        if throttled:
+            self.metrics["throttled"] += 1
+            if self.limiter.on_throttle(now):
+                self.metrics["limit_decreases"] += 1
+                logger.warning(
+                    "llm_gateway_throttled",
+                    lane=self.key,
+                    concurrency_limit=self.limiter.limit,
+                    retry_after=retry_after,
+                )
+            pause = retry_after if retry_after is not None else THROTTLE_PAUSE_SECONDS
+            self.paused_until = max(self.paused_until, now + pause)
+        else:
+            self.limiter.on_success()
+            if actual_tokens is not None:
+                self.tokens.credit(lease.tokens - actual_tokens, now)
+
+        self.pump()
+
+    def _schedule(self, now: float, delay: float):
+        at = now + delay
+        if self._timer is not None and self._timer_at <= at:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer_at = at
+        self._timer = asyncio.get_running_loop().call_later(delay, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        self._timer_at = float("inf")
+        self.pump()
+
+    def _deadline_error(self, waiter: _Waiter, now: float) -> LLMTimeoutException:
+        return LLMTimeoutException(
+            f"LLM gateway could not admit request on {self.key} before its deadline",
+            timeout_seconds=int(max(0.0, waiter.deadline - waiter.enqueued_at)),
+        )
+
+    def get_statistics(self) -> Dict[str, Any]:
+        admitted = self.metrics["admitted"]
+        return {
+            **{k: v for k, v in self.metrics.items() if k != "queued_ms_total"},
+            "avg_queued_ms": round(self.metrics["queued_ms_total"] / admitted, 2) if admitted else 0.0,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "concurrency_limit": self.limiter.limit,
+            "rpm": self.budget.rpm,
+            "tpm": self.budget.tpm,
+        }
+
+
+# ============================================================================
+# Error Classification
+# ============================================================================
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """True for provider 429s (and Anthropic 529 overloaded)."""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    if status in (429, 529):
+        return True
+    name = type(exc).__name__
+    return "RateLimit" in name or name == "OverloadedError"
+
+
+_TRANSIENT_STATUSES = frozenset({408, 409, 500, 502, 503, 504})
+_TRANSIENT_ERROR_NAMES = frozenset({
+    "APIConnectionError", "APITimeoutError", "InternalServerError",
+    "ServiceUnavailableError", "ConnectError", "ReadTimeout", "ConnectTimeout",
+    "RemoteProtocolError",
+})
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """True for failures the provider SDKs would retry: 5xx, 408/409, timeouts, dropped connections."""
+    if is_rate_limit_error(exc):
+        return False
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    if status is not None:
+        return status in _TRANSIENT_STATUSES
+    return type(exc).__name__ in _TRANSIENT_ERROR_NAMES or isinstance(exc, ConnectionError)
+
+
+def transient_backoff(attempt: int) -> float:
+    """Delay before transient retry number ``attempt`` (0-based)."""
+    return TRANSIENT_BACKOFF_SECONDS * (2 ** attempt)
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """Retry-After hint from a provider error, if any."""
+    explicit = getattr(exc, "retry_after", None)
+    if explicit is not None:
+        return float(explicit)
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    for header in ("retry-after-ms", "retry-after"):
+        value = headers.get(header)
+        if value is None:
+            continue
+        try:
+            seconds = float(value)
+        except (TypeError, ValueError):
+            continue
+        return seconds / 1000 if header == "retry-after-ms" else seconds
+    return None
+
+
+def _usage_tokens(result: Any) -> Optional[int]:
+    """Total tokens reported on a LangChain message/chunk, if any."""
+    usage = getattr(result, "usage_metadata", None)
+    if usage:
+        return usage.get("total_tokens")
+    return None
+
+
+def _estimate_prompt_tokens(value: Any) -> int:
+    """Cheap ~4 chars/token estimate used only for TPM reservation."""
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value) // 4 + 1
+    if isinstance(value, dict):
+        return sum(_estimate_prompt_tokens(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_estimate_prompt_tokens(v) + 4 for v in value)
+    content = getattr(value, "content", None)
+    if content is not None:
+        return _estimate_prompt_tokens(content)
+    to_messages = getattr(value, "to_messages", None)
+    if callable(to_messages):
+        return _estimate_prompt_tokens(to_messages())
+    return len(str(value)) // 4 + 1
+
+
+# ============================================================================
+# Gateway
+# ============================================================================
+
+class LLMGateway:
+    """
+    Process-wide admission control and client factory for LLM providers.
+
+    Lanes, timers and HTTP pools are bound to the event loop that first uses
+    them; a new loop (e.g. one ``asyncio.run`` per Celery task) gets fresh ones.
+    """
+
+    def __init__(
+        self,
+        budgets: Optional[Dict[str, LaneBudget]] = None,
+        default_budget: Optional[LaneBudget] = None,
+        max_throttle_retries: int = MAX_THROTTLE_RETRIES,
+        max_transient_retries: int = MAX_TRANSIENT_RETRIES,
+        response_cache: Optional[LLMResponseCache] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize gateway.
+
+        Args:
+            budgets: "provider:model" (or "provider") -> LaneBudget overrides
+            default_budget: Budget for lanes without an override
+            max_throttle_retries: Retries of a throttled call within its deadline
+            max_transient_retries: Retries of a 5xx/timeout/connection failure
+            response_cache: Cache used by ``with_cache`` call sites
+            clock: Monotonic clock (injectable for tests)
+        """
+        self.budgets = dict(budgets or {})
+        self.default_budget = default_budget or LaneBudget()
+        self.max_throttle_retries = max_throttle_retries
+        self.max_transient_retries = max_transient_retries
+        self.response_cache = response_cache or LLMResponseCache()
+        self.clock = clock
+
+        self._lanes: Dict[str, _Lane] = {}
+        self._http_clients: Dict[str, Any] = {}
+        self._openai_clients: Dict[Optional[str], Any] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # ========================================================================
+    # Admission
+    # ========================================================================
+
+    def _bind_loop(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._loop is not None:
+                # Futures, timers and pooled connections cannot cross event loops
+                self._lanes = {}
+                self._http_clients = {}
+                self._openai_clients = {}
+            self._loop = loop
+
+    def lane(self, provider: str, model: str) -> _Lane:
+        key = f"{provider}:{model}"
+        lane = self._lanes.get(key)
+        if lane is None:
+            budget = self.budgets.get(key) or self.budgets.get(provider) or self.default_budget
+            lane = self._lanes[key] = _Lane(key, budget, self.clock)
+        return lane
+
+    async def acquire(
+        self,
+        provider: str,
+        model: str,
+        tokens: int = 0,
+        priority: Optional[Priority] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
+    ) -> Lease:
+        """
+        Wait for admission on a lane.
+
+        Args:
+            provider: Provider name (openai, anthropic, ...)
+            model: Provider model id
+            tokens: Tokens to reserve against the TPM budget
+            priority: Admission class (defaults to the current priority scope)
+            timeout: Seconds to wait (defaults per priority); ignored if deadline is set
+            deadline: Absolute gateway-clock deadline
+
+        Raises:
+            LLMTimeoutException: Not admitted before the deadline
+        """
+        self._bind_loop()
+        priority = current_priority() if priority is None else priority
+        lane = self.lane(provider, model)
+
+        lease = lane.try_admit(tokens, priority)
+        if lease is not None:
+            return lease
+
+        now = self.clock()
+        if deadline is None:
+            deadline = now + (timeout if timeout is not None else DEFAULT_TIMEOUTS[priority])
+        future = asyncio.get_running_loop().create_future()
+        waiter = _Waiter(priority, tokens, deadline, now, future)
+        lane.enqueue(waiter)
+
+        try:
+            return await asyncio.wait_for(future, timeout=max(0.0, deadline - now))
+        except asyncio.TimeoutError:
+            lane.metrics["deadline_exceeded"] += 1
+            raise lane._deadline_error(waiter, self.clock()) from None
+        except BaseException:
+            # Admitted in the same tick we were cancelled: give the slot back
+            if future.done() and not future.cancelled() and future.exception() is None:
+                lane.release(future.result())
+            raise
+        finally:
+            lane.pump()
+
+    def release(
+        self,
+        lease: Lease,
+        actual_tokens: Optional[int] = None,
+        throttled: bool = False,
+        retry_after: Optional[float] = None,
+    ):
+        """Return a lease, feeding the outcome back into AIMD and TPM."""
+        lease.lane.release(lease, actual_tokens, throttled, retry_after)
+
+    @asynccontextmanager
+    async def admit(
+        self,
+        provider: str,
+        model: str,
+        tokens: int = 0,
+        priority: Optional[Priority] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[Lease]:
+        """Hold a lease for the duration of a block; 429s in the block are fed back but not retried."""
+        lease = await self.acquire(provider, model, tokens, priority, timeout)
+        try:
+            yield lease
+        except BaseException as exc:
+            throttled = is_rate_limit_error(exc)
+            self.release(lease, throttled=throttled, retry_after=retry_after_seconds(exc) if throttled else None)
+            raise
+        else:
+            self.release(lease)
+
+    def _retry_delay(self, exc: BaseException, throttles: int, transients: int, deadline: float) -> Optional[float]:
+        """Seconds to wait before retrying a failed attempt, or None to re-raise."""
+        if is_rate_limit_error(exc):
+            # The lane itself is paused for Retry-After; requeueing is enough
+            return 0.0 if throttles < self.max_throttle_retries else None
+        if not is_transient_error(exc) or transients >= self.max_transient_retries:
+            return None
+        delay = transient_backoff(transients)
+        return delay if self.clock() + delay < deadline else None
+
+    async def call(
+        self,
+        provider: str,
+        model: str,
+        fn: Callable[[], Awaitable[T]],
+        tokens: int = 0,
+        priority: Optional[Priority] = None,
+        timeout: Optional[float] = None,
+        usage_of: Callable[[T], Optional[int]] = _usage_tokens,
+    ) -> T:
+        """
+        Run ``fn`` under admission control, retrying provider failures.
+
+        Throttled attempts pause the lane for Retry-After and requeue inside
+        the original deadline; transient failures back off exponentially
+        within the same deadline; other errors propagate unchanged.
+        """
+        priority = current_priority() if priority is None else priority
+        deadline = self.clock() + (timeout if timeout is not None else DEFAULT_TIMEOUTS[priority])
+        throttles = transients = 0
+
+        while True:
+            lease = await self.acquire(provider, model, tokens, priority, deadline=deadline)
+            try:
+                result = await fn()
+            except BaseException as exc:
+                throttled = is_rate_limit_error(exc)
+                self.release(lease, throttled=throttled, retry_after=retry_after_seconds(exc) if throttled else None)
+                delay = self._retry_delay(exc, throttles, transients, deadline)
+                if delay is None:
+                    raise
+                if throttled:
+                    throttles += 1
+                else:
+                    transients += 1
+                    lease.lane.metrics["transient_retries"] += 1
+                    await asyncio.sleep(delay)
+                continue
+            self.release(lease, actual_tokens=usage_of(result))
+            return result
+
+    async def stream(
+        self,
+        provider: str,
+        model: str,
+        open_stream: Callable[[], AsyncIterator[T]],
+        tokens: int = 0,
+        priority: Optional[Priority] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[T]:
+        """
+        Stream under admission control; the lease is held until the stream ends.
+
+        Throttles and transient failures are retried only before the first
+        chunk has been yielded.
+        """
+        priority = current_priority() if priority is None else priority
+        deadline = self.clock() + (timeout if timeout is not None else DEFAULT_TIMEOUTS[priority])
+        throttles = transients = 0
+
+        while True:
+            lease = await self.acquire(provider, model, tokens, priority, deadline=deadline)
+            yielded = False
+            used: Optional[int] = None
+            try:
+                async for chunk in open_stream():
+                    yielded = True
+                    used = _usage_tokens(chunk) or used
+                    yield chunk
+            except BaseException as exc:
+                throttled = is_rate_limit_error(exc)
+                self.release(lease, throttled=throttled, retry_after=retry_after_seconds(exc) if throttled else None)
+                delay = None if yielded else self._retry_delay(exc, throttles, transients, deadline)
+                if delay is None:
+                    raise
+                if throttled:
+                    throttles += 1
+                else:
+                    transients += 1
+                    lease.lane.metrics["transient_retries"] += 1
+                    await asyncio.sleep(delay)
+                continue
+            self.release(lease, actual_tokens=used)
+            return
+
+    # ========================================================================
+    # Clients
+    # ========================================================================
+
+    def http_client(self, provider: str = "openai"):
+        """Shared async HTTP pool for a provider."""
+        self._bind_loop()
+        client = self._http_clients.get(provider)
+        if client is None:
+            import httpx
+            limit = max(self.default_budget.max_concurrency, 1)
+            client = self._http_clients[provider] = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=limit * 2, max_keepalive_connections=limit),
+                timeout=httpx.Timeout(120.0, connect=10.0),
+            )
+        return client
+
+    def openai_client(self, api_key: Optional[str] = None):
+        """Shared AsyncOpenAI client (SDK retries disabled; call() retries instead of the SDK)."""
+        http_client = self.http_client("openai")
+        client = self._openai_clients.get(api_key)
+        if client is None:
+            from openai import AsyncOpenAI
+            client = self._openai_clients[api_key] = AsyncOpenAI(
+                api_key=api_key, http_client=http_client, max_retries=0,
+            )
+        return client
+
+    def chat_model(
+        self,
+        model: str,
+        provider: Optional[str] = None,
+        priority: Optional[Priority] = None,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> "GatewayChatModel":
+        """
+        Build a governed LangChain chat model.
+
+        Args:
+            model: Provider model id
+            provider: openai | anthropic (inferred from the model name if omitted)
+            priority: Fixed admission class (defaults to the caller's priority scope)
+            timeout: Admission deadline in seconds
+            **kwargs: Passed to the LangChain constructor
+        """
+        provider = provider or infer_provider(model)
+        kwargs.setdefault("max_retries", 0)
+
+        if provider == "anthropic":
+            from langchain_anthropic import ChatAnthropic
+            llm = ChatAnthropic(model=model, **kwargs)
+        else:
+            from langchain_openai import ChatOpenAI
+            try:
+                kwargs.setdefault("http_async_client", self.http_client("openai"))
+            except RuntimeError:
+                pass  # built outside an event loop; ChatOpenAI uses its own pool
+            llm = ChatOpenAI(model=model, **kwargs)
+
+        return self.govern(llm, provider, model, priority, timeout, kwargs.get("max_tokens"))
+
+    def govern(
+        self,
+        llm: Any,
+        provider: str,
+        model: str,
+        priority: Optional[Priority] = None,
+        timeout: Optional[float] = None,
+        completion_tokens: Optional[int] = None,
+    ) -> "GatewayChatModel":
+        """Wrap an existing LangChain chat model (or runnable) in admission control."""
+        return GatewayChatModel(
+            llm, self, provider, model, priority, timeout,
+            completion_tokens or DEFAULT_COMPLETION_RESERVATION,
+        )
+
+    # ========================================================================
+    # Lifecycle / Introspection
+    # ========================================================================
+
+    async def shutdown(self):
+        """Close pooled HTTP connections"""
+        for client in self._http_clients.values():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning("llm_gateway_http_close_failed", error=str(e))
+        self._http_clients = {}
+        self._openai_clients = {}
+        logger.info("llm_gateway_stopped", **self.get_statistics())
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Per-lane admission and response cache statistics"""
+        return {
+            "lanes": {key: lane.get_statistics() for key, lane in self._lanes.items()},
+            "response_cache": self.response_cache.get_statistics(),
+        }
+
+
+def _request_params(runnable: Any) -> Optional[Tuple[Dict[str, Any], Optional[List[Any]]]]:
+    """
+    Generation params and bound tool schemas of a chat model or a binding of
+    one; None for runnables whose output is not a chat message.
+    """
+    bound_kwargs: Dict[str, Any] = {}
+    while hasattr(runnable, "bound") and isinstance(getattr(runnable, "kwargs", None), dict):
+        bound_kwargs = {**runnable.kwargs, **bound_kwargs}
+        runnable = runnable.bound
+    params = getattr(runnable, "_identifying_params", None)
+    if not isinstance(params, dict):
+        return None
+    tools = bound_kwargs.pop("tools", None)
+    return {**params, **bound_kwargs}, tools
+
+
+def _merge_chunks(chunks: List[Any]) -> Tuple[Any, List[str]]:
+    """Merged message plus the text segmentation of a finished stream."""
+    pieces = [c.content if isinstance(getattr(c, "content", None), str) else "" for c in chunks]
+    try:
+        merged = functools.reduce(operator.add, chunks)
+    except TypeError:
+        merged = "".join(pieces)
+    return merged, pieces
+
+
+def _replay_chunks(response: CachedResponse) -> List[Any]:
+    from langchain_core.messages import AIMessageChunk
+
+    metadata = {"cache_hit": True}
+    chunks = [AIMessageChunk(content=piece, response_metadata=metadata) for piece in response.replay_chunks()]
+    if response.tool_calls:
+        chunks.append(AIMessageChunk(
+            content="",
+            response_metadata=metadata,
+            tool_call_chunks=[
+                {"name": call.get("name"), "args": json.dumps(call.get("args", {})), "id": call.get("id"), "index": i}
+                for i, call in enumerate(response.tool_calls)
+            ],
+        ))
+    return chunks
+
+
+def infer_provider(model: str) -> str:
+    """Best-effort provider for a bare model name."""
+    name = model.lower()
+    if name.startswith("claude") or "anthropic" in name:
+        return "anthropic"
+    return "openai"
+
+
+# ============================================================================
+# Governed Chat Model
+# ============================================================================
+
+try:
+    from langchain_core.runnables import Runnable as _RunnableBase
+except ImportError:  # pragma: no cover - langchain is a hard dependency in production
+    _RunnableBase = object  # type: ignore[assignment,misc]
+
+
+class GatewayChatModel(_RunnableBase):
+    """
+    Runnable proxy that routes async invocations of a LangChain chat model
+    through the gateway. Attribute access falls through to the wrapped model;
+    ``bind_tools`` / ``with_structured_output`` results stay governed.
+
+    ``with_cache`` opts a call site into the gateway's response cache; cached
+    and coalesced calls skip admission entirely.
+
+    Synchronous ``invoke``/``stream`` bypass admission: they block the
+    caller's thread and cannot wait on the gateway's event-loop queues. They
+    still retry throttles and transient failures in place of the disabled
+    SDK retries.
+    """
+
+    def __init__(
+        self,
+        runnable: Any,
+        gateway: LLMGateway,
+        provider: str,
+        model: str,
+        priority: Optional[Priority],
+        timeout: Optional[float],
+        completion_tokens: int,
+        cache_policy: Optional[CachePolicy] = None,
+    ):
+        self._runnable = runnable
+        self._gateway = gateway
+        self.provider = provider
+        self.gateway_model = model
+        self.priority = priority
+        self.timeout = timeout
+        self.completion_tokens = completion_tokens
+        self.cache_policy = cache_policy
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__") or name == "_runnable":
+            raise AttributeError(name)
+        return getattr(self._runnable, name)
+
+    def _wrap(self, runnable: Any, cache_policy: Optional[CachePolicy] = None) -> "GatewayChatModel":
+        return GatewayChatModel(
+            runnable, self._gateway, self.provider, self.gateway_model,
+            self.priority, self.timeout, self.completion_tokens, cache_policy,
+        )
+
+    def _reservation(self, input: Any) -> int:
+        return _estimate_prompt_tokens(input) + self.completion_tokens
+
+    def with_cache(
+        self,
+        call_site: str,
+        ttl_seconds: int = 3600,
+        scope: Optional[str] = None,
+    ) -> "GatewayChatModel":
+        """
+        Serve identical requests from the response cache.
+
+        Args:
+            call_site: Stable name used for cost reporting
+            ttl_seconds: Entry lifetime
+            scope: Extra key component (e.g. tenant id) to keep entries apart
+        """
+        if _request_params(self._runnable) is None:
+            logger.debug("llm_response_cache_unsupported_runnable", call_site=call_site)
+            return self
+        return self._wrap(self._runnable, CachePolicy(call_site, ttl_seconds, scope))
+
+    def _cache_key(self, input: Any, kwargs: Dict[str, Any]) -> str:
+        params, tools = _request_params(self._runnable)
+        return request_digest(
+            self.provider,
+            self.gateway_model,
+            input,
+            params={**params, **kwargs},
+            tools=tools,
+            scope=self.cache_policy.scope,
+        )
+
+    def _sync_retry_delay(self, exc: BaseException, attempt: int) -> Optional[float]:
+        if is_rate_limit_error(exc):
+            if attempt >= self._gateway.max_throttle_retries:
+                return None
+            return retry_after_seconds(exc) or THROTTLE_PAUSE_SECONDS
+        if is_transient_error(exc) and attempt < self._gateway.max_transient_retries:
+            return transient_backoff(attempt)
+        return None
+
+    def invoke(self, input: Any, config: Any = None, **kwargs) -> Any:
+        for attempt in itertools.count():
+            try:
+                return self._runnable.invoke(input, config, **kwargs)
+            except Exception as exc:
+                delay = self._sync_retry_delay(exc, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+
+    def stream(self, input: Any, config: Any = None, **kwargs):
+        for attempt in itertools.count():
+            yielded = False
+            try:
+                for chunk in self._runnable.stream(input, config, **kwargs):
+                    yielded = True
+                    yield chunk
+                return
+            except Exception as exc:
+                delay = None if yielded else self._sync_retry_delay(exc, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+
+    async def _ainvoke_upstream(self, input: Any, config: Any, kwargs: Dict[str, Any]) -> Any:
+        return await self._gateway.call(
+            self.provider,
+            self.gateway_model,
+            lambda: self._runnable.ainvoke(input, config, **kwargs),
+            tokens=self._reservation(input),
+            priority=self.priority,
+            timeout=self.timeout,
+        )
+
+    def _astream_upstream(self, input: Any, config: Any, kwargs: Dict[str, Any]) -> AsyncIterator[Any]:
+        return self._gateway.stream(
+            self.provider,
+            self.gateway_model,
+            lambda: self._runnable.astream(input, config, **kwargs),
+            tokens=self._reservation(input),
+            priority=self.priority,
+            timeout=self.timeout,
+        )
+
+    async def ainvoke(self, input: Any, config: Any = None, **kwargs) -> Any:
+        if self.cache_policy is None:
+            return await self._ainvoke_upstream(input, config, kwargs)
+
+        upstream: Dict[str, Any] = {}
+
+        async def compute() -> CachedResponse:
+            upstream["message"] = await self._ainvoke_upstream(input, config, kwargs)
+            return CachedResponse.from_message(upstream["message"], model=self.gateway_model)
+
+        response, _ = await self._gateway.response_cache.get_or_compute(
+            self._cache_key(input, kwargs), self.cache_policy, compute,
+        )
+        return upstream["message"] if "message" in upstream else response.to_message()
+
+    async def astream(self, input: Any, config: Any = None, **kwargs) -> AsyncIterator[Any]:
+        if self.cache_policy is None:
+            async for chunk in self._astream_upstream(input, config, kwargs):
+                yield chunk
+            return
+
+        # The single-flight leader streams live while it fills the cache;
+        # hits and coalesced followers replay the cached response
+        live: asyncio.Queue = asyncio.Queue()
+
+        async def compute() -> CachedResponse:
+            chunks = []
+            async for chunk in self._astream_upstream(input, config, kwargs):
+                live.put_nowait(chunk)
+                chunks.append(chunk)
+            merged, pieces = _merge_chunks(chunks)
+            return CachedResponse.from_message(merged, model=self.gateway_model, chunks=pieces)
+
+        lookup = asyncio.create_task(self._gateway.response_cache.get_or_compute(
+            self._cache_key(input, kwargs), self.cache_policy, compute,
+        ))
+        try:
+            while not lookup.done():
+                getter = asyncio.ensure_future(live.get())
+                await asyncio.wait({getter, lookup}, return_when=asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    yield getter.result()
+                else:
+                    getter.cancel()
+            while not live.empty():
+                yield live.get_nowait()
+
+            response, hit = lookup.result()
+            if hit:
+                for chunk in _replay_chunks(response):
+                    yield chunk
+        finally:
+            if not lookup.done():
+                lookup.cancel()
+
+    def bind_tools(self, *args, **kwargs) -> "GatewayChatModel":
+        return self._wrap(self._runnable.bind_tools(*args, **kwargs), self.cache_policy)
+
+    def with_structured_output(self, *args, **kwargs) -> "GatewayChatModel":
+        # Parsed outputs are not chat messages, so they are never cached
+        return self._wrap(self._runnable.with_structured_output(*args, **kwargs))
+
+    def __repr__(self) -> str:
+        return f"GatewayChatModel({self.provider}:{self.gateway_model}, {self._runnable!r})"
+
+
+# ============================================================================
+# Global Instance
+# ============================================================================
+
+_gateway: Optional[LLMGateway] = None
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Get the process-wide gateway, creating it from the environment if needed."""
+    global _gateway
+    if _gateway is None:
+        _gateway = LLMGateway(budgets=load_budgets_from_env())
+    return _gateway
+
+
+def initialize_llm_gateway(**kwargs) -> LLMGateway:
+    """
+    Initialize the global gateway (see api/lifespan.py).
+
+    Args:
+        **kwargs: LLMGateway options; budgets default to LLM_GATEWAY_BUDGETS
+    """
+    global _gateway
+    kwargs.setdefault("budgets", load_budgets_from_env())
+    _gateway = LLMGateway(**kwargs)
+    logger.info("llm_gateway_initialized", budget_overrides=sorted(_gateway.budgets))
+    return _gateway
+
+
+def reset_llm_gateway():
+    """Reset the global gateway (for testing)."""
+    global _gateway
+    _gateway = None
@@ -0,0 +1,422 @@
+"""
+LLM Response Cache - Prompt-Keyed, Two-Tier, Single-Flight
+
+Caches complete LLM responses for call sites that opt in, keyed by a
+canonical digest of provider, model, generation parameters, messages and tool
+schemas. Used by the LLM gateway (see core/llm_gateway.py) ahead of admission,
+so hits consume no rate-limit budget.
+
+Key Features:
+- Canonical request digest (stable across processes; volatile client
+  settings such as timeouts, retries and callbacks are excluded)
+- Two tiers: in-process LRU with per-entry TTL, then Redis via CacheManager
+- Per-call-site opt-in through CachePolicy (call site name, TTL, scope)
+- Single-flight: concurrent identical requests share one upstream call
+- Stream replay: cached responses are re-emitted as a token stream
+- Hits, misses and saved tokens/cost are reported to CostTracker
+
+Usage:
+    llm = get_llm_gateway().chat_model("gpt-4o-mini", temperature=0)
+    extractor = llm.with_cache("faithfulness.extract_claims", ttl_seconds=86400)
+    response = await extractor.ainvoke(messages)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+RESPONSE_CACHE_ENABLED = os.getenv("LLM_RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+DEFAULT_MAX_ENTRIES = int(os.getenv("LLM_RESPONSE_CACHE_MAX_ENTRIES", "2048"))
+REDIS_KEY_PREFIX = "vital:llm_response"
+
+# Bump when CachedResponse or the digest format changes
+CACHE_FORMAT_VERSION = 1
+
+# Model settings that do not change what the provider returns
+_VOLATILE_PARAMS = frozenset({
+    "stream", "streaming", "stream_usage", "callbacks", "callback_manager",
+    "verbose", "tags", "metadata", "max_retries", "request_timeout",
+    "default_request_timeout", "timeout",
+    "default_headers", "default_query", "http_client", "http_async_client",
+    "api_key", "openai_api_key", "anthropic_api_key", "base_url",
+    "openai_api_base", "anthropic_api_url", "organization", "openai_organization",
+})
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    Opt-in caching for one call site.
+
+    Attributes:
+        call_site: Stable name reported as the CostTracker operation
+        ttl_seconds: Lifetime in both tiers
+        scope: Extra key component (e.g. tenant id) when responses must not
+            be shared across that boundary
+    """
+    call_site: str
+    ttl_seconds: int = 3600
+    scope: Optional[str] = None
+
+
+@dataclass
+class CachedResponse:
+    """A complete LLM response, serializable to JSON for Redis."""
+    content: Any
+    model: str = ""
+    input_tokens: int = 0
+    output_tokens: int = 0
+    tool_calls: List[Dict[str, Any]] = field(default_factory=list)
+    additional_kwargs: Dict[str, Any] = field(default_factory=dict)
+    response_metadata: Dict[str, Any] = field(default_factory=dict)
+    chunks: Optional[List[str]] = None  # Original stream segmentation, if streamed
+
+    @classmethod
+    def from_message(cls, message: Any, model: str = "", chunks: Optional[List[str]] = None) -> "CachedResponse":
+        """Capture an AIMessage-like object (or a plain string)."""
+        if isinstance(message, str):
+            return cls(content=message, model=model, chunks=chunks)
+        usage = getattr(message, "usage_metadata", None) or {}
+        return cls(
+            content=getattr(message, "content", ""),
+            model=model,
+            input_tokens=int(usage.get("input_tokens") or 0),
+            output_tokens=int(usage.get("output_tokens") or 0),
+            tool_calls=list(getattr(message, "tool_calls", None) or []),
+            additional_kwargs=dict(getattr(message, "additional_kwargs", None) or {}),
+            response_metadata=dict(getattr(message, "response_metadata", None) or {}),
+            chunks=chunks,
+        )
+
+    def to_message(self) -> Any:
+        """Rebuild an AIMessage flagged as served from cache."""
+        from langchain_core.messages import AIMessage
+
+        usage = None
+        if self.input_tokens or self.output_tokens:
+            usage = {
+                "input_tokens": self.input_tokens,
+                "output_tokens": self.output_tokens,
+                "total_tokens": self.input_tokens + self.output_tokens,
+            }
+        return AIMessage(
+            content=self.content,
+            tool_calls=self.tool_calls,
+            additional_kwargs=self.additional_kwargs,
+            response_metadata={**self.response_metadata, "cache_hit": True},
+            usage_metadata=usage,
+        )
+
+    def replay_chunks(self) -> List[str]:
+        """Stream segmentation to replay (the original one when available)."""
+        if self.chunks:
+            return self.chunks
+        if isinstance(self.content, str):
+            return re.findall(r"\S+\s*|\s+", self.content) or [""]
+        return [json.dumps(self.content, default=str)]
+
+    def to_json(self) -> Dict[str, Any]:
+        return {"v": CACHE_FORMAT_VERSION, **asdict(self)}
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> Optional["CachedResponse"]:
+        if not isinstance(data, dict) or data.get("v") != CACHE_FORMAT_VERSION:
+            return None
+        data = {k: v for k, v in data.items() if k not in ("v", "expires_at")}
+        try:
+            return cls(**data)
+        except TypeError:
+            return None
+
+
+# ============================================================================
+# Canonical Digest
+# ============================================================================
+
+def _canonical_message(message: Any) -> Any:
+    if isinstance(message, str):
+        return {"type": "human", "content": message}
+    if isinstance(message, dict):
+        return message
+    if isinstance(message, (list, tuple)) and len(message) == 2 and isinstance(message[0], str):
+        return {"type": message[0], "content": message[1]}
+    fields = {"type": getattr(message, "type", type(message).__name__), "content": getattr(message, "content", str(message))}
+    for attr in ("name", "tool_calls", "tool_call_id"):
+        value = getattr(message, attr, None)
+        if value:
+            fields[attr] = value
+    return fields
+
+
+def canonical_messages(input: Any) -> List[Any]:
+    """Normalize str / message list / PromptValue input to plain dicts."""
+    to_messages = getattr(input, "to_messages", None)
+    if callable(to_messages):
+        input = to_messages()
+    if not isinstance(input, (list, tuple)):
+        input = [input]
+    return [_canonical_message(m) for m in input]
+
+
+def canonical_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop volatile settings and non-JSON values (clients, callables)."""
+    clean: Dict[str, Any] = {}
+    for key, value in params.items():
+        if key in _VOLATILE_PARAMS or value is None:
+            continue
+        try:
+            json.dumps(value, sort_keys=True)
+        except (TypeError, ValueError):
+            continue
+        clean[key] = value
+    return clean
+
+
+def request_digest(
+    provider: str,
+    model: str,
+    messages: Any,
+    params: Optional[Dict[str, Any]] = None,
+    tools: Optional[List[Any]] = None,
+    scope: Optional[str] = None,
+) -> str:
+    """SHA-256 over the canonical JSON of everything that determines the output."""
+    payload = {
+        "v": CACHE_FORMAT_VERSION,
+        "provider": provider,
+        "model": model,
+        "params": canonical_params(params or {}),
+        "messages": canonical_messages(messages),
+        "tools": tools or [],
+        "scope": scope,
+    }
+    blob = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+# ============================================================================
+# Cache
+# ============================================================================
+
+class LLMResponseCache:
+    """
+    Two-tier response cache with single-flight deduplication.
+
+    The Redis tier is optional and attached after startup (see
+    api/lifespan.py); Redis failures degrade to the in-process tier.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        redis_cache: Optional[Any] = None,
+        cost_tracker: Optional[Any] = None,
+        enabled: bool = RESPONSE_CACHE_ENABLED,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            max_entries: In-process LRU capacity
+            redis_cache: CacheManager-like object (``get(key)`` / ``set(key, value, ttl)``)
+            cost_tracker: CostTracker for hit/miss and saved-cost reporting
+                (defaults to the global tracker)
+            enabled: Global kill switch (LLM_RESPONSE_CACHE_ENABLED)
+            clock: Monotonic clock (injectable for tests)
+        """
+        self.max_entries = max_entries
+        self.redis_cache = redis_cache
+        self._cost_tracker = cost_tracker
+        self.enabled = enabled
+        self.clock = clock
+
+        self._entries: "OrderedDict[str, Tuple[float, CachedResponse]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        self.metrics = {
+            "hits_memory": 0,
+            "hits_redis": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "saved_tokens": 0,
+        }
+
+    def attach_redis(self, redis_cache: Optional[Any]):
+        """Enable the shared tier once the CacheManager is up."""
+        self.redis_cache = redis_cache if redis_cache is not None and getattr(redis_cache, "enabled", True) else None
+
+    # ========================================================================
+    # Tiers
+    # ========================================================================
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        """Look up both tiers; Redis hits are promoted to memory."""
+        now = self.clock()
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, response = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                self.metrics["hits_memory"] += 1
+                return response
+            del self._entries[key]
+
+        if self.redis_cache is not None:
+            try:
+                data = await self.redis_cache.get(f"{REDIS_KEY_PREFIX}:{key}")
+            except Exception as e:
+                logger.warning("llm_response_cache_redis_get_failed", error=str(e))
+                data = None
+            response = CachedResponse.from_json(data) if data else None
+            remaining = data.get("expires_at", 0) - time.time() if response is not None else 0
+            if remaining > 0:
+                self._remember(key, response, remaining)
+                self.metrics["hits_redis"] += 1
+                return response
+        return None
+
+    async def set(self, key: str, response: CachedResponse, ttl_seconds: int):
+        self._remember(key, response, ttl_seconds)
+        if self.redis_cache is not None:
+            try:
+                payload = {**response.to_json(), "expires_at": time.time() + ttl_seconds}
+                await self.redis_cache.set(f"{REDIS_KEY_PREFIX}:{key}", payload, ttl=ttl_seconds)
+            except Exception as e:
+                logger.warning("llm_response_cache_redis_set_failed", error=str(e))
+
+    def _remember(self, key: str, response: CachedResponse, ttl_seconds: float):
+        self._entries[key] = (self.clock() + ttl_seconds, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    # ========================================================================
+    # Single-Flight
+    # ========================================================================
+
+    async def get_or_compute(
+        self,
+        key: str,
+        policy: CachePolicy,
+        compute: Callable[[], Awaitable[CachedResponse]],
+    ) -> Tuple[CachedResponse, bool]:
+        """
+        Return a cached response or compute it once for all concurrent callers.
+
+        Returns:
+            (response, hit) where ``hit`` is False only for the caller that
+            went upstream; followers of an in-flight call count as hits
+        """
+        if not self.enabled:
+            return await compute(), False
+
+        while True:
+            cached = await self.get(key)
+            if cached is not None:
+                await self._report(policy, cached, hit=True)
+                return cached, True
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            try:
+                # A leader failure propagates to its followers, like the call itself would have
+                response = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if inflight.cancelled() and not asyncio.current_task().cancelling():
+                    continue  # The leader was cancelled, not us: take over
+                raise
+            self.metrics["coalesced"] += 1
+            await self._report(policy, response, hit=True)
+            return response, True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            response = await compute()
+        except BaseException as exc:
+            if isinstance(exc, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(exc)
+                future.exception()  # Mark retrieved when nobody was waiting
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        future.set_result(response)
+        self.metrics["misses"] += 1
+        await self.set(key, response, policy.ttl_seconds)
+        await self._report(policy, response, hit=False)
+        return response, False
+
+    # ========================================================================
+    # Reporting
+    # ========================================================================
+
+    @property
+    def cost_tracker(self):
+        if self._cost_tracker is None:
+            from .cost_tracking import get_cost_tracker
+            self._cost_tracker = get_cost_tracker()
+        return self._cost_tracker
+
+    async def _report(self, policy: CachePolicy, response: CachedResponse, hit: bool):
+        if hit:
+            self.metrics["saved_tokens"] += response.input_tokens + response.output_tokens
+        try:
+            await self.cost_tracker.record_cost(
+                model_id=response.model or "unknown",
+                input_tokens=response.input_tokens,
+                output_tokens=response.output_tokens,
+                operation=policy.call_site,
+                cached=hit,
+                metadata={"llm_response_cache": True},
+            )
+        except Exception as e:
+            logger.warning("llm_response_cache_cost_report_failed", error=str(e))
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Hit rate and tier sizes"""
+        hits = self.metrics["hits_memory"] + self.metrics["hits_redis"] + self.metrics["coalesced"]
+        lookups = hits + self.metrics["misses"]
+        return {
+            **self.metrics,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "redis_enabled": self.redis_cache is not None,
+        }
+
+    def clear(self):
+        """Drop the in-process tier (Redis entries expire by TTL)."""
+        self._entries.clear()
+
+
+def cached_llm(llm: Any, call_site: str, ttl_seconds: int = 3600, scope: Optional[str] = None) -> Any:
+    """
+    Opt a call site into response caching when ``llm`` is gateway-governed;
+    any other client (e.g. one injected in tests) is returned unchanged.
+    """
+    with_cache = getattr(type(llm), "with_cache", None)
+    if with_cache is None:
+        return llm
+    return llm.with_cache(call_site, ttl_seconds=ttl_seconds, scope=scope)
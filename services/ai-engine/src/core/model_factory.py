@@ -7,6 +7,8 @@ Unified LLM model factory that provides:
 - Tier-based model selection (Tier 1/2/3)
 - Dynamic model routing based on task complexity
 - Health checks and circuit breaker integration
+- Latency-aware hedging: slow primaries are raced against another provider
+  (see core/hedging.py); time-to-first-token feeds provider health scores
 
 This is the single entry point for all LLM instantiation in VITAL.
 
@@ -31,6 +33,7 @@ from datetime import datetime, timedelta
 from enum import Enum
 import asyncio
 import os
+import statistics
 import structlog
 
 logger = structlog.get_logger()
@@ -227,6 +230,10 @@ TIER_FALLBACK_CHAINS: Dict[ModelTier, List[str]] = {
 }
 
 
+# Hedge slow calls against another provider (see core/hedging.py)
+HEDGING_ENABLED = os.getenv("LLM_HEDGING", "true").lower() == "true"
+
+
 # ============================================================================
 # Provider Health Status
 # ============================================================================
@@ -241,9 +248,11 @@ class ProviderHealth:
     error_count: int = 0
     success_count: int = 0
     avg_latency_ms: float = 0.0
+    avg_ttft_ms: float = 0.0
+    error_rate: float = 0.0  # rolling share of failed calls
 
-    def record_success(self, latency_ms: float):
-        """Record successful call."""
+    def record_success(self, latency_ms: float, ttft_ms: Optional[float] = None):
+        """Record successful call (``ttft_ms`` defaults to the full latency)."""
         self.is_healthy = True
         self.success_count += 1
         self.error_count = 0
@@ -253,16 +262,48 @@ class ProviderHealth:
             self.avg_latency_ms * 0.9 + latency_ms * 0.1
             if self.avg_latency_ms > 0 else latency_ms
         )
+        ttft_ms = latency_ms if ttft_ms is None else ttft_ms
+        self.avg_ttft_ms = (
+            self.avg_ttft_ms * 0.9 + ttft_ms * 0.1
+            if self.avg_ttft_ms > 0 else ttft_ms
+        )
+        self.error_rate *= 0.9
 
     def record_failure(self, error: str):
         """Record failed call."""
         self.error_count += 1
         self.last_error = error
         self.last_check = datetime.utcnow()
+        self.error_rate = self.error_rate * 0.9 + 0.1
         # Mark unhealthy after 3 consecutive failures
         if self.error_count >= 3:
             self.is_healthy = False
 
+    @property
+    def sampled(self) -> bool:
+        """Whether any call outcome has been recorded."""
+        return self.success_count > 0 or self.error_rate > 0
+
+    @property
+    def health_score(self) -> float:
+        """
+        0..1, higher is better: success rate discounted by time-to-first-token
+        (a provider answering in HEALTH_TTFT_REFERENCE_MS scores 0.5).
+        Only meaningful for sampled providers; see
+        ProviderHealthRegistry.get_health_score.
+        """
+        return self.score_with_ttft(self.avg_ttft_ms)
+
+    def score_with_ttft(self, ttft_ms: float) -> float:
+        """Health score assuming the given time-to-first-token."""
+        if not self.is_healthy:
+            return 0.0
+        speed = HEALTH_TTFT_REFERENCE_MS / (HEALTH_TTFT_REFERENCE_MS + ttft_ms)
+        return (1.0 - self.error_rate) * speed
+
+
+HEALTH_TTFT_REFERENCE_MS = 1000.0
+
 
 class ProviderHealthRegistry:
     """Registry tracking health of all providers."""
@@ -274,10 +315,15 @@ class ProviderHealthRegistry:
         }
         self._lock = asyncio.Lock()
 
-    async def record_success(self, provider: ModelProvider, latency_ms: float):
+    async def record_success(
+        self,
+        provider: ModelProvider,
+        latency_ms: float,
+        ttft_ms: Optional[float] = None,
+    ):
         """Record successful provider call."""
         async with self._lock:
-            self._health[provider].record_success(latency_ms)
+            self._health[provider].record_success(latency_ms, ttft_ms=ttft_ms)
 
     async def record_failure(self, provider: ModelProvider, error: str):
         """Record failed provider call."""
@@ -288,6 +334,30 @@ class ProviderHealthRegistry:
         """Check if provider is healthy."""
         return self._health[provider].is_healthy
 
+    def get_health_score(self, provider: ModelProvider) -> float:
+        """
+        Health score (error rate and time-to-first-token) of a provider.
+
+        Providers without a latency sample are scored against the median of
+        the providers that have one, so they neither jump ahead of nor fall
+        behind the configured fallback order before they are measured.
+        """
+        health = self._health[provider]
+        if health.success_count > 0 or not health.is_healthy:
+            return health.health_score
+
+        measured = [
+            h for p, h in self._health.items()
+            if p != provider and h.success_count > 0 and h.is_healthy
+        ]
+        if not measured:
+            # Nothing measured yet: only errors separate providers
+            return health.score_with_ttft(0.0)
+        if not health.sampled:
+            return statistics.median(h.health_score for h in measured)
+        # Failures only: their error rate, at the typical TTFT
+        return health.score_with_ttft(statistics.median(h.avg_ttft_ms for h in measured))
+
     def get_healthy_providers(self) -> List[ModelProvider]:
         """Get list of healthy providers."""
         return [p for p, h in self._health.items() if h.is_healthy]
@@ -300,6 +370,9 @@ class ProviderHealthRegistry:
                 "error_count": h.error_count,
                 "success_count": h.success_count,
                 "avg_latency_ms": round(h.avg_latency_ms, 2),
+                "avg_ttft_ms": round(h.avg_ttft_ms, 2),
+                "error_rate": round(h.error_rate, 4),
+                "health_score": round(self.get_health_score(p), 4),
                 "last_error": h.last_error,
             }
             for p, h in self._health.items()
@@ -335,7 +408,8 @@ class ModelFactory:
     Features:
     - Database-driven configuration for agents
     - Multi-provider fallback chains
-    - Health-aware routing
+    - Health-aware routing (fallbacks ordered by health score)
+    - Hedged requests against a second provider for slow primaries
     - Caching of model instances
     """
 
@@ -360,6 +434,10 @@ class ModelFactory:
         1. Custom chain if provided
         2. Model's configured fallback
         3. Tier-based fallback
+
+        Fallbacks after the requested model are ordered by provider health
+        score (stable, so the configured order holds until latency or
+        errors separate providers).
         """
         if custom_chain:
             return custom_chain
@@ -379,7 +457,11 @@ class ModelFactory:
             if fallback not in chain:
                 chain.append(fallback)
 
-        return chain
+        return chain[:1] + sorted(chain[1:], key=lambda candidate: -self._score(candidate))
+
+    def _score(self, model_id: str) -> float:
+        config = self.get_config(model_id)
+        return self._health.get_health_score(config.provider) if config else 0.0
 
     async def create_chat_model(
         self,
@@ -390,10 +472,19 @@ class ModelFactory:
         **kwargs,
     ) -> Tuple[Any, ModelConfig]:
         """
-        Create a LangChain ChatModel instance.
+        Create a LangChain ChatModel instance governed by the LLM gateway.
+
+        Pass ``priority=Priority.BACKGROUND`` for non-interactive work.
 
         Returns (model, config) tuple.
         """
+        from .llm_gateway import get_llm_gateway
+
+        gateway = get_llm_gateway()
+        priority = kwargs.pop("priority", None)
+        # Throttles and transient errors are retried by the gateway, not the provider SDK
+        kwargs.setdefault("max_retries", 0)
+
         config = self.get_config(model_id)
         if not config:
             raise ValueError(f"Unknown model: {model_id}")
@@ -416,6 +507,7 @@ class ModelFactory:
                 max_tokens=tokens,
                 streaming=streaming,
                 api_key=api_key,
+                http_async_client=gateway.http_client(config.provider.value),
                 **kwargs,
             )
 
@@ -456,20 +548,69 @@ class ModelFactory:
         else:
             raise ValueError(f"Unsupported provider: {config.provider}")
 
+        model = gateway.govern(
+            model,
+            provider=config.provider.value,
+            model=config.model_id,
+            priority=priority,
+            completion_tokens=tokens,
+        )
         return (model, config)
 
     async def create_chat_model_with_fallback(
         self,
         model_id: str,
         fallback_chain: Optional[List[str]] = None,
+        hedge: Optional[bool] = None,
         **kwargs,
     ) -> Tuple[Any, ModelConfig, str]:
         """
         Create a ChatModel with automatic fallback.
 
+        With ``hedge`` (default LLM_HEDGING, on) the model is wrapped in a
+        HedgedChatModel: calls are timed per provider:model and, once the
+        model's p95 is known, a call without a first token by then is raced
+        against the next chain candidate from another provider.
+
         Returns (model, config, actual_model_id) tuple.
         """
         chain = self.get_fallback_chain(model_id, fallback_chain)
+        model, config, actual_id = await self._create_first_available(model_id, chain, **kwargs)
+
+        if hedge is None:
+            hedge = HEDGING_ENABLED
+        if not hedge:
+            return (model, config, actual_id)
+
+        from .hedging import HedgedChatModel, get_latency_router
+
+        secondary = await self._create_hedge(chain[chain.index(actual_id) + 1:], config.provider, **kwargs)
+        return (HedgedChatModel(model, secondary, get_latency_router(), self._health), config, actual_id)
+
+    async def _create_hedge(
+        self,
+        candidates: List[str],
+        primary_provider: ModelProvider,
+        **kwargs,
+    ) -> Optional[Any]:
+        """First healthy candidate from another provider, or None"""
+        for candidate in candidates:
+            config = self.get_config(candidate)
+            if not config or config.provider == primary_provider or not self._health.is_healthy(config.provider):
+                continue
+            try:
+                model, _ = await self.create_chat_model(candidate, **kwargs)
+                return model
+            except Exception as e:
+                logger.debug("hedge_model_unavailable", model=candidate, error=str(e))
+        return None
+
+    async def _create_first_available(
+        self,
+        model_id: str,
+        chain: List[str],
+        **kwargs,
+    ) -> Tuple[Any, ModelConfig, str]:
         last_error = None
 
         for candidate in chain:
@@ -696,6 +837,7 @@ __all__ = [
     # Health
     "ProviderHealth",
     "ProviderHealthRegistry",
+    "HEALTH_TTFT_REFERENCE_MS",
     "get_health_registry",
     "reset_health_registry",
 
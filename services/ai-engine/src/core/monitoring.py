@@ -67,6 +67,11 @@ VECTOR_SEARCH_DURATION = Histogram(
     'Vector search duration in seconds'
 )
 
+AGENT_CATALOG_STALE_SECONDS = Gauge(
+    'vital_agent_catalog_stale_seconds',
+    'Seconds since the shared agent catalog was last confirmed current'
+)
+
 def setup_monitoring():
     """Setup monitoring and metrics collection"""
     try:
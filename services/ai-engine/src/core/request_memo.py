@@ -0,0 +1,208 @@
+"""
+VITAL Path - Request-Scoped Computation Memo
+
+Shares artifacts derived during one request (query embeddings, extracted
+entities, query classification, agent rows) across every service and
+LangGraph node that needs them, so each is computed once per request.
+
+Key Features:
+- Propagated with contextvars: asyncio tasks (and so LangGraph nodes) spawned
+  inside the scope see the same memo
+- Lazily computed values keyed by (kind, key); async lookups are
+  single-flight, so concurrent nodes wait for one computation
+- None results and failures are not memoized
+- Hit/miss counts per kind, per request and aggregated per request type,
+  to show how much duplicate work each request type was doing
+
+Usage:
+    # At the request boundary (HTTP middleware, worker task, graph entry)
+    with request_memo_scope("POST /ask-expert"):
+        ...
+
+    # In any service
+    embedding = await amemoized("embedding", (model_name, query), lambda: embed(query))
+    agent = memoized("agent", agent_id, lambda: load_agent(agent_id))
+"""
+
+import asyncio
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterator, Optional, Tuple, TypeVar
+
+import structlog
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+# Handed to waiters when the task computing a value is cancelled
+_ABANDONED = object()
+
+_current_memo: ContextVar[Optional["RequestMemo"]] = ContextVar("request_memo", default=None)
+
+
+class RequestMemoStats:
+    """Process-wide hit/miss counts per request type and artifact kind"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests: Counter = Counter()
+        self._hits: Dict[str, Counter] = {}
+        self._misses: Dict[str, Counter] = {}
+
+    def record_request(self, request_type: str) -> None:
+        with self._lock:
+            self._requests[request_type] += 1
+
+    def record(self, request_type: str, kind: str, hit: bool) -> None:
+        with self._lock:
+            counts = self._hits if hit else self._misses
+            counts.setdefault(request_type, Counter())[kind] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                request_type: {
+                    "requests": count,
+                    "hits": dict(self._hits.get(request_type, {})),
+                    "misses": dict(self._misses.get(request_type, {})),
+                }
+                for request_type, count in self._requests.items()
+            }
+
+
+_stats = RequestMemoStats()
+
+
+class RequestMemo:
+    """Values computed during one request, keyed by (kind, key)"""
+
+    def __init__(self, request_type: str = "unknown"):
+        self.request_type = request_type
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+        self._values: Dict[Tuple[str, Hashable], Any] = {}
+        self._pending: Dict[Tuple[str, Hashable], asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+    def _record(self, kind: str, hit: bool) -> None:
+        (self.hits if hit else self.misses)[kind] += 1
+        _stats.record(self.request_type, kind, hit)
+
+    def get_or_compute(self, kind: str, key: Hashable, compute: Callable[[], T]) -> T:
+        """Memoized value for (kind, key), computing it synchronously on first use"""
+        slot = (kind, key)
+        with self._lock:
+            if slot in self._values:
+                self._record(kind, hit=True)
+                return self._values[slot]
+
+        self._record(kind, hit=False)
+        value = compute()
+        if value is not None:
+            with self._lock:
+                self._values[slot] = value
+        return value
+
+    async def aget_or_compute(self, kind: str, key: Hashable, compute: Callable[[], Awaitable[T]]) -> T:
+        """Memoized value for (kind, key); concurrent callers share one computation"""
+        slot = (kind, key)
+        if slot in self._values:
+            self._record(kind, hit=True)
+            return self._values[slot]
+
+        pending = self._pending.get(slot)
+        if pending is not None:
+            value = await asyncio.shield(pending)
+            if value is _ABANDONED:
+                # The computing task was cancelled; compute for ourselves
+                return await self.aget_or_compute(kind, key, compute)
+            self._record(kind, hit=True)
+            return value
+
+        self._record(kind, hit=False)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[slot] = future
+        try:
+            value = await compute()
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters re-raise it; mark retrieved so an unawaited future does not warn
+            future.exception()
+            raise
+        except BaseException:
+            future.set_result(_ABANDONED)
+            raise
+        else:
+            if value is not None:
+                self._values[slot] = value
+            future.set_result(value)
+            return value
+        finally:
+            self._pending.pop(slot, None)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "request_type": self.request_type,
+            "hits": dict(self.hits),
+            "misses": dict(self.misses),
+            "saved": sum(self.hits.values()),
+        }
+
+
+def current_request_memo() -> Optional[RequestMemo]:
+    """The memo of the current request, or None outside a request scope"""
+    return _current_memo.get()
+
+
+@contextmanager
+def request_memo_scope(request_type: str) -> Iterator[RequestMemo]:
+    """
+    Open a memo for the enclosed request.
+
+    Nested scopes reuse the outer memo, so a graph entry point can open a
+    scope without splitting an HTTP request that already has one.
+    """
+    existing = _current_memo.get()
+    if existing is not None:
+        yield existing
+        return
+
+    memo = RequestMemo(request_type)
+    _stats.record_request(request_type)
+    token = _current_memo.set(memo)
+    try:
+        yield memo
+    finally:
+        _current_memo.reset(token)
+        if memo.hits:
+            logger.debug("request_memo_summary", **memo.summary())
+
+
+def memoized(kind: str, key: Hashable, compute: Callable[[], T]) -> T:
+    """Compute through the current request memo (or directly outside a request)"""
+    memo = _current_memo.get()
+    if memo is None:
+        return compute()
+    return memo.get_or_compute(kind, key, compute)
+
+
+async def amemoized(kind: str, key: Hashable, compute: Callable[[], Awaitable[T]]) -> T:
+    """Async variant of memoized()"""
+    memo = _current_memo.get()
+    if memo is None:
+        return await compute()
+    return await memo.aget_or_compute(kind, key, compute)
+
+
+def get_request_memo_stats() -> Dict[str, Any]:
+    """Hits and misses per request type and artifact kind since startup"""
+    return _stats.snapshot()
+
+
+def reset_request_memo_stats() -> None:
+    """Reset aggregated stats (for tests)"""
+    global _stats
+    _stats = RequestMemoStats()
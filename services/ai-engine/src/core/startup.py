@@ -0,0 +1,274 @@
+"""
+Dependency-ordered parallel startup.
+
+Components declare what they depend on and how to check they are ready;
+the orchestrator starts every component as soon as its dependencies have
+settled, so independent components initialize concurrently instead of one
+after another:
+
+- depends_on: hard dependencies, must be READY or the component is skipped
+- after: ordering only, waits for the other component to settle whatever
+  its outcome (e.g. use the cache if it came up)
+- timeout: per-component budget for init + readiness probe
+- probe: readiness check on the init result (sync or async, falsy = not ready)
+
+Synchronous init callables (mostly heavy imports + constructors) run in a
+worker thread so they do not block the event loop or the health endpoint.
+A thread cannot be cancelled, so an init that times out may still finish
+later: publish results through ``on_ready`` (called on the event loop only
+for components that became READY), never from inside the init itself.
+An init that raises ComponentDisabled is recorded as disabled (e.g. optional
+service not configured) rather than failed.
+
+Usage:
+    orchestrator = StartupOrchestrator([
+        Component("supabase", init_supabase, timeout=10.0),
+        Component("rag", init_rag, depends_on=("supabase",), after=("cache",)),
+        Component("cache", init_cache, probe=lambda cache: cache.ping()),
+    ])
+    await orchestrator.run()
+    orchestrator.report()  # per-component readiness for /health
+"""
+
+import asyncio
+import inspect
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class ComponentState(str, Enum):
+    PENDING = "pending"
+    STARTING = "starting"
+    READY = "ready"
+    DISABLED = "disabled"
+    FAILED = "failed"
+    TIMED_OUT = "timed_out"
+    SKIPPED = "skipped"
+
+
+SETTLED = {
+    ComponentState.READY,
+    ComponentState.DISABLED,
+    ComponentState.FAILED,
+    ComponentState.TIMED_OUT,
+    ComponentState.SKIPPED,
+}
+
+
+class ComponentDisabled(Exception):
+    """Raised by an init function when the component is intentionally off."""
+
+
+@dataclass
+class Component:
+    """A startup unit: how to initialize it, what it needs, how to check it."""
+    name: str
+    init: Callable[[], Any]
+    depends_on: Tuple[str, ...] = ()
+    after: Tuple[str, ...] = ()
+    timeout: float = 30.0
+    probe: Optional[Callable[[Any], Any]] = None
+    required: bool = False
+    in_thread: bool = True  # run a synchronous init in a worker thread
+
+
+@dataclass
+class ComponentStatus:
+    name: str
+    state: ComponentState = ComponentState.PENDING
+    required: bool = False
+    started_ms: Optional[float] = None  # offset from the start of the run
+    duration_ms: Optional[float] = None
+    waited_ms: Optional[float] = None  # time spent waiting on dependencies
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"state": self.state.value, "required": self.required}
+        for key in ("started_ms", "duration_ms", "waited_ms"):
+            value = getattr(self, key)
+            if value is not None:
+                data[key] = round(value, 1)
+        if self.error:
+            data["error"] = self.error
+        return data
+
+
+class StartupOrchestrator:
+    """
+    Runs components concurrently in dependency order.
+
+    Args:
+        components: Components to start; names must be unique
+        on_ready: Called with ``(name, result)`` when a component becomes
+            READY, before its dependents start
+    """
+
+    def __init__(
+        self,
+        components: Sequence[Component] = (),
+        on_ready: Optional[Callable[[str, Any], None]] = None,
+    ):
+        self.on_ready = on_ready
+        self.components: Dict[str, Component] = {}
+        self.status: Dict[str, ComponentStatus] = {}
+        self.results: Dict[str, Any] = {}
+        self._settled: Dict[str, asyncio.Event] = {}
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        for component in components:
+            self.add(component)
+
+    def add(self, component: Component) -> None:
+        if component.name in self.components:
+            raise ValueError(f"duplicate startup component '{component.name}'")
+        self.components[component.name] = component
+        self.status[component.name] = ComponentStatus(component.name, required=component.required)
+
+    def order(self) -> List[str]:
+        """Topological order; raises ValueError on unknown dependencies or cycles"""
+        ordered: List[str] = []
+        visiting: Dict[str, bool] = {}
+
+        def visit(name: str, path: Tuple[str, ...]) -> None:
+            if visiting.get(name) is False:
+                return
+            if visiting.get(name) is True:
+                raise ValueError(f"startup dependency cycle: {' -> '.join(path + (name,))}")
+            visiting[name] = True
+            component = self.components[name]
+            for dependency in component.depends_on + component.after:
+                if dependency not in self.components:
+                    raise ValueError(f"startup component '{name}' depends on unknown '{dependency}'")
+                visit(dependency, path + (name,))
+            visiting[name] = False
+            ordered.append(name)
+
+        for name in self.components:
+            visit(name, ())
+        return ordered
+
+    async def run(self) -> Dict[str, ComponentStatus]:
+        """Start everything; returns once every component has settled"""
+        self.order()
+        self._started_at = time.perf_counter()
+        self._settled = {name: asyncio.Event() for name in self.components}
+        tasks = [asyncio.create_task(self._start(component)) for component in self.components.values()]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._finished_at = time.perf_counter()
+
+        logger.info(
+            "startup_complete",
+            elapsed_ms=round(self.elapsed_ms, 1),
+            ready=self.ready,
+            states={name: status.state.value for name, status in self.status.items()},
+        )
+        return self.status
+
+    async def _start(self, component: Component) -> None:
+        status = self.status[component.name]
+        try:
+            waits = [self._settled[name].wait() for name in component.depends_on + component.after]
+            if waits:
+                waited = time.perf_counter()
+                await asyncio.gather(*waits)
+                status.waited_ms = (time.perf_counter() - waited) * 1000
+
+            missing = [name for name in component.depends_on if self.status[name].state != ComponentState.READY]
+            if missing:
+                status.state = ComponentState.SKIPPED
+                status.error = f"dependency not ready: {', '.join(missing)}"
+                logger.warning("startup_component_skipped", component=component.name, missing=missing)
+                return
+
+            started = time.perf_counter()
+            status.state = ComponentState.STARTING
+            status.started_ms = (started - self._started_at) * 1000
+            try:
+                result = await asyncio.wait_for(self._init_and_probe(component), timeout=component.timeout)
+                if self.on_ready is not None:
+                    self.on_ready(component.name, result)
+                self.results[component.name] = result
+                status.state = ComponentState.READY
+            except ComponentDisabled as e:
+                status.state = ComponentState.DISABLED
+                status.error = str(e) or None
+            except asyncio.TimeoutError:
+                status.state = ComponentState.TIMED_OUT
+                status.error = f"timed out after {component.timeout}s"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                status.state = ComponentState.FAILED
+                status.error = str(e) or type(e).__name__
+            status.duration_ms = (time.perf_counter() - started) * 1000
+
+            log = logger.info if status.state in (ComponentState.READY, ComponentState.DISABLED) else logger.warning
+            log(
+                f"startup_component_{status.state.value}",
+                component=component.name,
+                duration_ms=round(status.duration_ms, 1),
+                error=status.error,
+            )
+        finally:
+            if status.state not in SETTLED:
+                status.state = ComponentState.FAILED
+                status.error = status.error or "cancelled"
+            self._settled[component.name].set()
+
+    async def _init_and_probe(self, component: Component) -> Any:
+        result = await _call(component.init, component.in_thread)
+        if component.probe is not None and not await _call(lambda: component.probe(result), in_thread=False):
+            raise RuntimeError("readiness probe failed")
+        return result
+
+    @property
+    def complete(self) -> bool:
+        return bool(self.status) and all(status.state in SETTLED for status in self.status.values())
+
+    @property
+    def ready(self) -> bool:
+        """All required components are ready"""
+        return all(
+            status.state == ComponentState.READY
+            for status in self.status.values()
+            if status.required
+        )
+
+    @property
+    def elapsed_ms(self) -> float:
+        if self._started_at is None:
+            return 0.0
+        end = self._finished_at or time.perf_counter()
+        return (end - self._started_at) * 1000
+
+    def report(self) -> Dict[str, Any]:
+        """Per-component readiness, for health endpoints"""
+        return {
+            "ready": self.ready,
+            "complete": self.complete,
+            "elapsed_ms": round(self.elapsed_ms, 1),
+            "components": {name: status.to_dict() for name, status in self.status.items()},
+        }
+
+
+async def _call(func: Callable[[], Any], in_thread: bool) -> Any:
+    """Await an async callable, run a sync one (optionally in a thread)"""
+    if inspect.iscoroutinefunction(func):
+        return await func()
+    if in_thread:
+        result = await asyncio.to_thread(func)
+    else:
+        result = func()
+    if inspect.isawaitable(result):
+        result = await result
+    return result
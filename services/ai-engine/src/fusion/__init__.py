@@ -9,6 +9,8 @@ Fusion Intelligence combines three retrieval sources using RRF:
 Components:
 - FusionEngine: Main orchestrator for triple retrieval
 - RRF: Reciprocal Rank Fusion algorithm
+- Rank fusion: shared NumPy RRF / CombSUM / CombMNZ with deadline-bounded
+  partial results, used by every fusion call site
 - Retrievers: Vector, Graph, Relational
 
 Used by all VITAL services for evidence-backed decision making.
@@ -26,6 +28,15 @@ from .fusion_rrf import (
     normalize_scores,
     normalize_to_percentage,
 )
+from .rank_fusion import (
+    Leg,
+    FusedItem,
+    PartialFusion,
+    fuse,
+    fuse_as_completed,
+    fuse_before_deadline,
+    gather_before_deadline,
+)
 from .retrievers import (
     VectorRetriever,
     GraphRetriever,
@@ -43,6 +54,14 @@ __all__ = [
     "weighted_rrf",
     "normalize_scores",
     "normalize_to_percentage",
+    # Rank fusion
+    "Leg",
+    "FusedItem",
+    "PartialFusion",
+    "fuse",
+    "fuse_as_completed",
+    "fuse_before_deadline",
+    "gather_before_deadline",
     # Retrievers
     "VectorRetriever",
     "GraphRetriever",
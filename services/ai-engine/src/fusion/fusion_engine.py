@@ -19,7 +19,6 @@ Phase 2: Agent Hierarchy & Fusion Intelligence
 from typing import Dict, Any, List, Tuple, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
-import asyncio
 import time
 import structlog
 
@@ -28,6 +27,7 @@ from .fusion_rrf import (
     vital_weighted_rrf,
     explain_rrf_score,
 )
+from .rank_fusion import gather_before_deadline
 from .retrievers import (
     VectorRetriever,
     GraphRetriever,
@@ -89,7 +89,8 @@ class FusionEngine:
             graph_retriever: Graph retrieval component
             relational_retriever: Relational retrieval component
             weights: Custom weights for RRF fusion
-            timeout_seconds: Timeout for parallel retrieval
+            timeout_seconds: Deadline for parallel retrieval; sources that
+                miss it are dropped, the others are still fused
         """
         self.vector = vector_retriever
         self.graph = graph_retriever
@@ -141,59 +142,56 @@ class FusionEngine:
         result = FusionResult()
         
         try:
-            # Create retrieval tasks
-            tasks = []
-            task_names = []
+            # Create one retrieval per available source
+            sources = {}
             
             if self.vector:
-                tasks.append(self._safe_retrieve(
+                sources['vector'] = self._safe_retrieve(
                     self.vector.retrieve, query, tenant_id, top_k * 2
-                ))
-                task_names.append('vector')
+                )
             
             if self.graph:
-                tasks.append(self._safe_retrieve(
+                sources['graph'] = self._safe_retrieve(
                     self.graph.retrieve, query, tenant_id, top_k * 2
-                ))
-                task_names.append('graph')
+                )
             
             if self.relational:
-                tasks.append(self._safe_retrieve(
+                sources['relational'] = self._safe_retrieve(
                     self.relational.retrieve, query, tenant_id, top_k * 2
-                ))
-                task_names.append('relational')
+                )
             
-            if not tasks:
+            if not sources:
                 logger.warning("vital_fusion_engine_no_retrievers")
                 result.errors.append("No retrievers available")
                 return result
             
-            # Execute retrievals in parallel with timeout
-            try:
-                results = await asyncio.wait_for(
-                    asyncio.gather(*tasks, return_exceptions=True),
-                    timeout=self.timeout,
-                )
-            except asyncio.TimeoutError:
+            # Execute retrievals in parallel; the timeout only drops the
+            # sources still running, not the ones that already answered
+            outcome = await gather_before_deadline(sources, timeout=self.timeout)
+            
+            if outcome.timed_out:
                 logger.warning(
                     "vital_fusion_engine_timeout",
                     timeout=self.timeout,
+                    timed_out=outcome.timed_out,
+                )
+                result.errors.append(
+                    f"Retrieval timeout ({self.timeout}s): {', '.join(outcome.timed_out)}"
                 )
-                results = [[] for _ in tasks]
-                result.errors.append(f"Retrieval timeout ({self.timeout}s)")
             
             # Process results
             ranked_lists = []
             
-            for name, res in zip(task_names, results):
-                if isinstance(res, Exception):
+            for name in sources:
+                if name in outcome.failed:
                     logger.error(
                         f"vital_fusion_engine_{name}_failed",
-                        error=str(res),
+                        error=outcome.failed[name],
                     )
-                    result.errors.append(f"{name}: {str(res)}")
+                    result.errors.append(f"{name}: {outcome.failed[name]}")
                     continue
                 
+                res = outcome.results.get(name)
                 if res:
                     ranked_lists.append(res)
                     result.sources_used.append(name)
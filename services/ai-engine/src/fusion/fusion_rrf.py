@@ -7,6 +7,9 @@ individual Rank Learning Methods" (Cormack et al., 2009)
 
 Formula: RRF(d) = Σ 1/(k + rank(d)) for each list containing document d
 
+Scoring and ordering are done by the shared rank_fusion module; this module
+adapts RankedItem lists and builds the per-source metadata.
+
 Naming Convention:
 - Class: RankedItem
 - Functions: vital_{rrf_function}
@@ -17,6 +20,8 @@ from typing import List, Dict, Any, Tuple
 from dataclasses import dataclass, field
 import structlog
 
+from .rank_fusion import Leg, fuse
+
 logger = structlog.get_logger()
 
 
@@ -83,6 +88,49 @@ def vital_normalize_scores(
     return normalized
 
 
+def _source_legs(
+    ranked_lists: List[List[RankedItem]],
+    weight_for=None,
+) -> List[Leg]:
+    """
+    Turn ranked lists into fusion legs, one per run of same-source items.
+
+    Items keep their own ranks; runs preserve list order so contributions
+    accumulate exactly as they are listed.
+    """
+    legs = []
+    for ranked_list in ranked_lists:
+        run: List[RankedItem] = []
+        for item in list(ranked_list or []) + [None]:
+            if run and (item is None or item.source != run[0].source):
+                source = run[0].source
+                legs.append(Leg(
+                    name=source,
+                    ids=[r.id for r in run],
+                    scores=[r.score for r in run],
+                    ranks=[r.rank for r in run],
+                    weight=weight_for(source) if weight_for else 1.0,
+                ))
+                run = []
+            if item is not None:
+                run.append(item)
+    return legs
+
+
+def _merge_metadata(
+    ranked_lists: List[List[RankedItem]],
+) -> Dict[str, Dict[str, Any]]:
+    """Merge item metadata across sources (later sources override)."""
+    combined_metadata: Dict[str, Dict[str, Any]] = {}
+    for ranked_list in ranked_lists:
+        for item in ranked_list or []:
+            metadata = combined_metadata.setdefault(item.id, {})
+            metadata.update(item.metadata)
+            metadata[f'{item.source}_score'] = item.score
+            metadata[f'{item.source}_rank'] = item.rank
+    return combined_metadata
+
+
 def vital_reciprocal_rank_fusion(
     ranked_lists: List[List[RankedItem]],
     k: int = 60,
@@ -110,50 +158,14 @@ def vital_reciprocal_rank_fusion(
     if not ranked_lists:
         return []
     
-    # Accumulate RRF scores
-    rrf_scores: Dict[str, float] = {}
-    combined_metadata: Dict[str, Dict[str, Any]] = {}
-    source_contributions: Dict[str, Dict[str, float]] = {}
-    
-    for ranked_list in ranked_lists:
-        if not ranked_list:
-            continue
-            
-        for item in ranked_list:
-            item_id = item.id
-            rrf_contribution = 1.0 / (k + item.rank)
-            
-            # Accumulate score
-            if item_id not in rrf_scores:
-                rrf_scores[item_id] = 0.0
-                combined_metadata[item_id] = {}
-                source_contributions[item_id] = {}
-            
-            rrf_scores[item_id] += rrf_contribution
-            
-            # Track source contribution
-            source_contributions[item_id][item.source] = rrf_contribution
-            
-            # Merge metadata (later sources override)
-            combined_metadata[item_id].update(item.metadata)
-            combined_metadata[item_id][f'{item.source}_score'] = item.score
-            combined_metadata[item_id][f'{item.source}_rank'] = item.rank
-    
-    # Add source contributions to metadata
-    for item_id, contributions in source_contributions.items():
-        combined_metadata[item_id]['source_contributions'] = contributions
-    
-    # Sort by RRF score descending
-    sorted_results = sorted(
-        rrf_scores.items(),
-        key=lambda x: x[1],
-        reverse=True,
-    )
+    fused = fuse(_source_legs(ranked_lists), method="rrf", k=k)
+    combined_metadata = _merge_metadata(ranked_lists)
     
-    results = [
-        (item_id, score, combined_metadata[item_id])
-        for item_id, score in sorted_results
-    ]
+    results = []
+    for item in fused:
+        metadata = combined_metadata[item.id]
+        metadata['source_contributions'] = item.contributions
+        results.append((item.id, item.score, metadata))
     
     logger.debug(
         "vital_rrf_fusion_completed",
@@ -201,63 +213,29 @@ def vital_weighted_rrf(
         source: w / total_weight
         for source, w in weights.items()
     }
-    
-    # Accumulate weighted RRF scores
-    rrf_scores: Dict[str, float] = {}
-    combined_metadata: Dict[str, Dict[str, Any]] = {}
-    source_contributions: Dict[str, Dict[str, float]] = {}
-    
-    for ranked_list in ranked_lists:
-        if not ranked_list:
-            continue
-            
-        for item in ranked_list:
-            item_id = item.id
-            
-            # Get weight for this source
-            weight = normalized_weights.get(item.source, 1.0 / len(weights) if weights else 1.0)
-            
-            # Calculate weighted RRF contribution
-            rrf_contribution = weight * (1.0 / (k + item.rank))
-            
-            # Accumulate score
-            if item_id not in rrf_scores:
-                rrf_scores[item_id] = 0.0
-                combined_metadata[item_id] = {}
-                source_contributions[item_id] = {}
-            
-            rrf_scores[item_id] += rrf_contribution
-            
-            # Track source contribution
-            source_contributions[item_id][item.source] = {
-                'contribution': rrf_contribution,
-                'weight': weight,
-                'rank': item.rank,
-                'original_score': item.score,
+    default_weight = 1.0 / len(weights) if weights else 1.0
+    
+    def weight_for(source: str) -> float:
+        return normalized_weights.get(source, default_weight)
+    
+    fused = fuse(_source_legs(ranked_lists, weight_for), method="rrf", k=k)
+    combined_metadata = _merge_metadata(ranked_lists)
+    
+    results = []
+    for item in fused:
+        metadata = combined_metadata[item.id]
+        metadata['source_contributions'] = {
+            source: {
+                'contribution': contribution,
+                'weight': weight_for(source),
+                'rank': metadata[f'{source}_rank'],
+                'original_score': metadata[f'{source}_score'],
             }
-            
-            # Merge metadata
-            combined_metadata[item_id].update(item.metadata)
-            combined_metadata[item_id][f'{item.source}_score'] = item.score
-            combined_metadata[item_id][f'{item.source}_rank'] = item.rank
-    
-    # Add source contributions to metadata
-    for item_id, contributions in source_contributions.items():
-        combined_metadata[item_id]['source_contributions'] = contributions
-        combined_metadata[item_id]['sources_found'] = list(contributions.keys())
-        combined_metadata[item_id]['source_count'] = len(contributions)
-    
-    # Sort by weighted RRF score descending
-    sorted_results = sorted(
-        rrf_scores.items(),
-        key=lambda x: x[1],
-        reverse=True,
-    )
-    
-    results = [
-        (item_id, score, combined_metadata[item_id])
-        for item_id, score in sorted_results
-    ]
+            for source, contribution in item.contributions.items()
+        }
+        metadata['sources_found'] = item.legs
+        metadata['source_count'] = len(item.contributions)
+        results.append((item.id, item.score, metadata))
     
     logger.debug(
         "vital_weighted_rrf_completed",
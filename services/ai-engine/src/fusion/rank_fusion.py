@@ -0,0 +1,373 @@
+"""
+VITAL Path AI Services - Shared Rank Fusion
+
+One vectorized implementation of the rank-fusion methods used across the
+engine (Fusion Intelligence, GraphRAG hybrid search, agent selection and the
+parallel L5 tool executor):
+
+- RRF / weighted RRF: score(d) = Σ weight_leg / (k + rank_leg(d))
+- CombSUM: score(d) = Σ weight_leg * normalized_score_leg(d)
+- CombMNZ: CombSUM * number of legs that returned d
+
+Every retrieval source is a Leg (ids in rank order plus optional scores,
+explicit ranks and a weight). Per-leg contributions are computed with NumPy
+and accumulated leg by leg in input order, so scores match the previous
+dict-based loops. Ties are broken deterministically by first appearance
+(leg order, then position), which is what the stable sorts of those loops
+did implicitly.
+
+Partial results: gather_before_deadline / fuse_before_deadline fuse whatever
+legs finished before the deadline instead of discarding everything when one
+source is slow; fuse_as_completed yields an updated fusion as each leg lands.
+
+Naming Convention:
+- Classes: Leg, FusedItem, LegOutcome, PartialFusion
+- Functions: fuse, normalize, gather_before_deadline, fuse_before_deadline
+- Logs: vital_rank_fusion_{action}
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+)
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger()
+
+METHODS = ("rrf", "combsum", "combmnz")
+NORMALIZATIONS = (None, "minmax", "max", "sum", "zscore")
+
+
+@dataclass
+class Leg:
+    """
+    One ranked result list from a single retrieval source.
+
+    Args:
+        name: Source name, used in explain output
+        ids: Item ids in rank order (duplicates accumulate)
+        scores: Source scores, required for CombSUM/CombMNZ
+        ranks: Explicit ranks; defaults to 1..n by position
+        weight: Source weight applied to every contribution
+    """
+    name: str
+    ids: Sequence[Hashable]
+    scores: Optional[Sequence[float]] = None
+    ranks: Optional[Sequence[float]] = None
+    weight: float = 1.0
+
+    def __post_init__(self):
+        n = len(self.ids)
+        if self.scores is not None and len(self.scores) != n:
+            raise ValueError(f"leg '{self.name}': {len(self.scores)} scores for {n} ids")
+        if self.ranks is not None and len(self.ranks) != n:
+            raise ValueError(f"leg '{self.name}': {len(self.ranks)} ranks for {n} ids")
+
+    @classmethod
+    def from_pairs(cls, name: str, pairs: Sequence[Any], weight: float = 1.0) -> "Leg":
+        """Build a leg from ids or (id, score) pairs in rank order"""
+        if pairs and isinstance(pairs[0], tuple):
+            return cls(name, [p[0] for p in pairs], scores=[p[1] for p in pairs], weight=weight)
+        return cls(name, list(pairs), weight=weight)
+
+
+@dataclass
+class FusedItem:
+    """A fused result with per-leg evidence."""
+    id: Hashable
+    score: float
+    rank: int
+    contributions: Dict[str, float] = field(default_factory=dict)
+    leg_ranks: Dict[str, float] = field(default_factory=dict)
+    leg_scores: Dict[str, Optional[float]] = field(default_factory=dict)
+
+    @property
+    def legs(self) -> List[str]:
+        return list(self.contributions)
+
+    def explain(self) -> Dict[str, Any]:
+        """Where the fused score came from, largest contribution first"""
+        total = self.score or 1.0
+        legs = sorted(self.contributions.items(), key=lambda kv: kv[1], reverse=True)
+        return {
+            "id": self.id,
+            "rank": self.rank,
+            "score": self.score,
+            "legs": [
+                {
+                    "leg": name,
+                    "rank": self.leg_ranks.get(name),
+                    "score": self.leg_scores.get(name),
+                    "contribution": contribution,
+                    "share": contribution / total,
+                }
+                for name, contribution in legs
+            ],
+        }
+
+
+def normalize(values: Sequence[float], method: Optional[str] = "minmax") -> np.ndarray:
+    """
+    Normalize one leg's scores.
+
+    minmax: (x - min) / (max - min), constant lists become all 1.0
+    max: x / max; sum: x / Σx; zscore: (x - mean) / std
+    """
+    scores = np.asarray(values, dtype=np.float64)
+    if method is None or scores.size == 0:
+        return scores
+    if method == "minmax":
+        low, high = scores.min(), scores.max()
+        if high == low:
+            return np.ones_like(scores)
+        return (scores - low) / (high - low)
+    if method == "max":
+        high = np.abs(scores).max()
+        return scores / high if high else scores
+    if method == "sum":
+        total = scores.sum()
+        return scores / total if total else scores
+    if method == "zscore":
+        std = scores.std()
+        return (scores - scores.mean()) / std if std else np.zeros_like(scores)
+    raise ValueError(f"unknown normalization '{method}', expected one of {NORMALIZATIONS}")
+
+
+def _contributions(leg: Leg, method: str, k: float, normalization: Optional[str]) -> np.ndarray:
+    if method == "rrf":
+        ranks = (
+            np.asarray(leg.ranks, dtype=np.float64)
+            if leg.ranks is not None
+            else np.arange(1, len(leg.ids) + 1, dtype=np.float64)
+        )
+        return leg.weight * (1.0 / (k + ranks))
+    if leg.scores is None:
+        raise ValueError(f"{method} needs scores, leg '{leg.name}' has none")
+    return leg.weight * normalize(leg.scores, normalization)
+
+
+def fuse(
+    legs: Sequence[Leg],
+    method: str = "rrf",
+    k: float = 60,
+    normalization: Optional[str] = None,
+    top_k: Optional[int] = None,
+) -> List[FusedItem]:
+    """
+    Fuse ranked legs into one ranking.
+
+    Args:
+        legs: Ranked lists, in the order their contributions are accumulated
+        method: "rrf" (weighted when legs carry weights), "combsum" or "combmnz"
+        k: RRF smoothing constant
+        normalization: Per-leg score normalization for CombSUM/CombMNZ
+        top_k: Only build the first top_k items
+
+    Returns:
+        FusedItems sorted by score desc, ties by first appearance
+    """
+    if method not in METHODS:
+        raise ValueError(f"unknown fusion method '{method}', expected one of {METHODS}")
+
+    index: Dict[Hashable, int] = {}
+    positions: List[np.ndarray] = []
+    for leg in legs:
+        positions.append(np.fromiter(
+            (index.setdefault(item_id, len(index)) for item_id in leg.ids),
+            dtype=np.intp,
+            count=len(leg.ids),
+        ))
+    if not index:
+        return []
+
+    n = len(index)
+    per_leg = np.zeros((len(legs), n), dtype=np.float64)
+    present = np.zeros((len(legs), n), dtype=bool)
+    for row, (leg, idx) in enumerate(zip(legs, positions)):
+        if idx.size:
+            np.add.at(per_leg[row], idx, _contributions(leg, method, k, normalization))
+            present[row, idx] = True
+
+    # Row-wise reduction adds legs in order, like the sequential loops did
+    scores = per_leg.sum(axis=0)
+    if method == "combmnz":
+        scores = scores * present.sum(axis=0)
+
+    # Stable sort on -score keeps first-appearance order for ties
+    order = np.argsort(-scores, kind="stable")
+    if top_k is not None:
+        order = order[:top_k]
+
+    ids = list(index)
+    first = [_first_occurrence(idx) for idx in positions]
+    fused = []
+    for rank, column in enumerate(order.tolist(), start=1):
+        item = FusedItem(id=ids[column], score=float(scores[column]), rank=rank)
+        for row, leg in enumerate(legs):
+            if not present[row, column]:
+                continue
+            at = first[row][column]
+            item.contributions[leg.name] = item.contributions.get(leg.name, 0.0) + float(per_leg[row, column])
+            item.leg_ranks.setdefault(leg.name, float(leg.ranks[at]) if leg.ranks is not None else at + 1)
+            item.leg_scores.setdefault(leg.name, float(leg.scores[at]) if leg.scores is not None else None)
+        fused.append(item)
+    return fused
+
+
+def _first_occurrence(idx: np.ndarray) -> Dict[int, int]:
+    """Global item index -> position of its first occurrence in the leg"""
+    unique, at = np.unique(idx, return_index=True)
+    return dict(zip(unique.tolist(), at.tolist()))
+
+
+# =============================================================================
+# Partial results
+# =============================================================================
+
+@dataclass
+class LegOutcome:
+    """Which legs finished before the deadline, and what they returned."""
+    results: Dict[str, Any] = field(default_factory=dict)
+    timed_out: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    elapsed_ms: float = 0.0
+
+    @property
+    def complete(self) -> bool:
+        return not self.timed_out and not self.failed
+
+
+@dataclass
+class PartialFusion:
+    """Fusion of the legs that completed, with what was left out."""
+    items: List[FusedItem] = field(default_factory=list)
+    completed: List[str] = field(default_factory=list)
+    timed_out: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    elapsed_ms: float = 0.0
+
+    @property
+    def complete(self) -> bool:
+        return not self.timed_out and not self.failed
+
+
+async def _as_completed(
+    sources: Mapping[str, Awaitable[Any]],
+    timeout: Optional[float],
+    outcome: LegOutcome,
+) -> AsyncIterator[str]:
+    """Run all sources concurrently, yield each name as it finishes, cancel stragglers at the deadline"""
+    started = time.perf_counter()
+    tasks = {asyncio.ensure_future(awaitable): name for name, awaitable in sources.items()}
+    deadline = None if timeout is None else started + timeout
+    pending = set(tasks)
+    try:
+        while pending:
+            remaining = None if deadline is None else deadline - time.perf_counter()
+            if remaining is not None and remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            # Yield in input order when several land together
+            for task in sorted(done, key=list(tasks).index):
+                name = tasks[task]
+                try:
+                    outcome.results[name] = task.result()
+                except Exception as e:
+                    outcome.failed[name] = str(e) or type(e).__name__
+                    logger.warning("vital_rank_fusion_leg_failed", leg=name, error=outcome.failed[name])
+                    continue
+                outcome.elapsed_ms = (time.perf_counter() - started) * 1000
+                yield name
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            outcome.timed_out = [tasks[task] for task in tasks if task in pending]
+            logger.warning("vital_rank_fusion_deadline", timed_out=outcome.timed_out, timeout=timeout)
+        outcome.elapsed_ms = (time.perf_counter() - started) * 1000
+
+
+async def gather_before_deadline(
+    sources: Mapping[str, Awaitable[Any]],
+    timeout: Optional[float],
+) -> LegOutcome:
+    """
+    Await every source until the deadline; keep what finished.
+
+    Sources that raise are recorded in `failed`, sources still running at
+    the deadline are cancelled and recorded in `timed_out`.
+    """
+    outcome = LegOutcome()
+    async for _ in _as_completed(sources, timeout, outcome):
+        pass
+    return outcome
+
+
+async def fuse_as_completed(
+    sources: Mapping[str, Awaitable[Any]],
+    timeout: Optional[float],
+    to_leg: Callable[[str, Any], Leg] = Leg.from_pairs,
+    **options: Any,
+) -> AsyncIterator[PartialFusion]:
+    """
+    Yield an updated fusion each time a leg completes, until the deadline.
+
+    Args:
+        sources: Leg name -> awaitable returning that leg's results
+        timeout: Seconds until the remaining legs are cancelled
+        to_leg: Converts (name, result) into a Leg; results that already
+            are Legs are used as they are
+        **options: Passed to fuse()
+    """
+    outcome = LegOutcome()
+    legs: List[Leg] = []
+    async for name in _as_completed(sources, timeout, outcome):
+        result = outcome.results[name]
+        legs.append(result if isinstance(result, Leg) else to_leg(name, result))
+        yield PartialFusion(
+            items=fuse(legs, **options),
+            completed=[leg.name for leg in legs],
+            failed=dict(outcome.failed),
+            elapsed_ms=outcome.elapsed_ms,
+        )
+
+
+async def fuse_before_deadline(
+    sources: Mapping[str, Awaitable[Any]],
+    timeout: Optional[float],
+    to_leg: Callable[[str, Any], Leg] = Leg.from_pairs,
+    **options: Any,
+) -> PartialFusion:
+    """
+    Fuse whatever legs complete before the deadline.
+
+    Legs are fused in the order of `sources`, not completion order, so the
+    result (ties included) does not depend on timing.
+    """
+    outcome = await gather_before_deadline(sources, timeout)
+    legs = []
+    for name in sources:
+        if name in outcome.results:
+            result = outcome.results[name]
+            legs.append(result if isinstance(result, Leg) else to_leg(name, result))
+    return PartialFusion(
+        items=fuse(legs, **options),
+        completed=[leg.name for leg in legs],
+        timed_out=outcome.timed_out,
+        failed=outcome.failed,
+        elapsed_ms=outcome.elapsed_ms,
+    )
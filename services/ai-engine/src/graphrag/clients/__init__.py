@@ -5,12 +5,14 @@ Database clients for PostgreSQL, Vector DB, Neo4j, and Elasticsearch
 
 from .postgres_client import PostgresClient
 from .vector_db_client import VectorDBClient
+from .local_vector_store import LocalVectorStore
 from .neo4j_client import Neo4jClient
 from .elastic_client import ElasticClient
 
 __all__ = [
     'PostgresClient',
     'VectorDBClient',
+    'LocalVectorStore',
     'Neo4jClient',
     'ElasticClient'
 ]
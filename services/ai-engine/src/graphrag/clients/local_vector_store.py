@@ -0,0 +1,679 @@
+"""
+Embedded Local Vector Store for GraphRAG
+
+Pinecone-Index compatible vector store for single-node deployments, CI and
+offline evaluation. Implements the subset of the Pinecone Index API the
+services use (query / upsert / fetch / delete / describe_index_stats), so
+VectorDBClient(provider="local"), UnifiedRAGService and GraphRAGSelector use
+it in place of a Pinecone index.
+
+Layout per namespace:
+- vectors: one contiguous float32 or float16 segment, memory-mapped when
+  loaded from a snapshot (copied to RAM on the first write)
+- HNSW index (faiss) over the segment, built on the write path once the
+  namespace outgrows exact search and extended incrementally; small or
+  highly filtered candidate sets are searched exactly instead
+- metadata bitmaps: per (key, value) posting lists of row numbers, turned
+  into packed bitsets that faiss applies during the graph search
+- upserts append and tombstone the previous row; deletes tombstone;
+  compaction rewrites the segment once enough rows are dead
+
+Snapshots are written to a temporary directory and swapped in atomically.
+
+Usage:
+    store = LocalVectorStore.open("/var/lib/vital/vectors")
+    store.upsert([{"id": "c1", "values": emb, "metadata": {"domain_id": "d1"}}], namespace="kd-1")
+    response = store.query(vector=q, top_k=10, namespace="kd-1",
+                           filter={"domain_id": {"$in": ["d1", "d2"]}}, include_metadata=True)
+    store.snapshot()
+"""
+
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import json
+import os
+import shutil
+import threading
+
+import numpy as np
+import structlog
+
+from core.config import get_settings
+
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    faiss = None
+    FAISS_AVAILABLE = False
+
+logger = structlog.get_logger()
+
+SNAPSHOT_VERSION = 1
+METRICS = ("cosine", "dotproduct")
+DTYPES = {"float32": np.float32, "float16": np.float16}
+RANGE_OPS = {"$gt": np.greater, "$gte": np.greater_equal, "$lt": np.less, "$lte": np.less_equal}
+_PRESENT = object()  # posting list of rows that have a key at all
+_SCAN_BLOCK = 65536
+MAX_EF_SEARCH = 1024
+
+
+# ============================================================================
+# Pinecone-compatible responses
+# ============================================================================
+
+class _Record:
+    """Attribute and dict-style access, like Pinecone response objects"""
+
+    def __getitem__(self, key: str) -> Any:
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, None)
+        return default if value is None else value
+
+
+@dataclass
+class Match(_Record):
+    id: str
+    score: float
+    metadata: Optional[Dict[str, Any]] = None
+    values: Optional[List[float]] = None
+
+
+@dataclass
+class QueryResponse(_Record):
+    matches: List[Match] = field(default_factory=list)
+    namespace: str = ""
+
+
+# ============================================================================
+# Namespace segment
+# ============================================================================
+
+def _term(value: Any) -> Any:
+    """Posting-list key for a metadata value (keeps True apart from 1)"""
+    if isinstance(value, bool):
+        return ("bool", value)
+    if isinstance(value, (int, float)):
+        return float(value)
+    return value
+
+
+class _Namespace:
+    """One namespace: vector segment, row metadata, bitmaps and ANN index."""
+
+    def __init__(self, store: "LocalVectorStore", dimension: int):
+        self.store = store
+        self.dimension = dimension
+        self.vectors = np.empty((0, dimension), dtype=store.dtype)
+        self.alive = np.zeros(0, dtype=bool)
+        self.size = 0
+        self.ids: List[str] = []
+        self.metadata: List[Dict[str, Any]] = []
+        self.row_of: Dict[str, int] = {}
+        self.postings: Dict[str, Dict[Any, array]] = {}
+        self.index = None
+        self._columns: Dict[str, np.ndarray] = {}
+
+    # ------------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------------
+
+    @property
+    def live_count(self) -> int:
+        return len(self.row_of)
+
+    def _reserve(self, extra: int):
+        needed = self.size + extra
+        # Snapshot segments are read-only maps: copy on first write
+        if needed <= len(self.vectors) and not isinstance(self.vectors, np.memmap):
+            return
+        capacity = max(needed, 2 * len(self.vectors), 1024)
+        vectors = np.empty((capacity, self.dimension), dtype=self.store.dtype)
+        vectors[:self.size] = self.vectors[:self.size]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self.size] = self.alive[:self.size]
+        self.vectors, self.alive = vectors, alive
+
+    def upsert(self, ids: Sequence[str], values: np.ndarray, metadatas: Sequence[Dict[str, Any]]):
+        self._reserve(len(ids))
+        start = self.size
+        self.vectors[start:start + len(ids)] = values
+        self.alive[start:start + len(ids)] = True
+        for offset, (item_id, metadata) in enumerate(zip(ids, metadatas)):
+            row = start + offset
+            previous = self.row_of.get(item_id)
+            if previous is not None:
+                self.alive[previous] = False
+            self.row_of[item_id] = row
+            self.ids.append(item_id)
+            self.metadata.append(metadata)
+            self._index_metadata(row, metadata)
+        self.size += len(ids)
+        self._columns = {}
+        if self.index is not None:
+            self.index.add(np.ascontiguousarray(self.vectors[start:self.size], dtype=np.float32))
+        else:
+            self._maybe_index()
+
+    def _maybe_index(self):
+        if FAISS_AVAILABLE and self.index is None and self.size > self.store.exact_threshold:
+            self._ensure_index()
+
+    def _index_metadata(self, row: int, metadata: Dict[str, Any]):
+        for key, value in metadata.items():
+            postings = self.postings.setdefault(key, {})
+            postings.setdefault(_PRESENT, array("q")).append(row)
+            for item in value if isinstance(value, (list, tuple)) else (value,):
+                try:
+                    postings.setdefault(_term(item), array("q")).append(row)
+                except TypeError:
+                    pass  # unhashable values are stored but not filterable
+
+    def delete(self, ids: Iterable[str]) -> int:
+        deleted = 0
+        for item_id in ids:
+            row = self.row_of.pop(item_id, None)
+            if row is not None:
+                self.alive[row] = False
+                deleted += 1
+        return deleted
+
+    @property
+    def dead_count(self) -> int:
+        return self.size - self.live_count
+
+    def needs_compaction(self) -> bool:
+        dead = self.dead_count
+        return dead >= self.store.compact_min_dead and dead >= self.store.compact_ratio * max(self.size, 1)
+
+    def compact(self) -> int:
+        """Rewrite the segment without dead rows; returns rows removed"""
+        removed = self.dead_count
+        if removed == 0:
+            return 0
+        live = np.flatnonzero(self.alive[:self.size])
+        vectors = np.ascontiguousarray(self.vectors[live])
+        ids = [self.ids[row] for row in live]
+        metadata = [self.metadata[row] for row in live]
+
+        self.vectors = vectors
+        self.alive = np.ones(len(live), dtype=bool)
+        self.size = len(live)
+        self.ids, self.metadata = ids, metadata
+        self.row_of = {item_id: row for row, item_id in enumerate(ids)}
+        self.postings = {}
+        for row, item in enumerate(metadata):
+            self._index_metadata(row, item)
+        self._columns = {}
+        self.index = None
+        self._maybe_index()
+        return removed
+
+    # ------------------------------------------------------------------------
+    # Filters
+    # ------------------------------------------------------------------------
+
+    def _rows(self, key: str, values: Iterable[Any]) -> np.ndarray:
+        mask = np.zeros(self.size, dtype=bool)
+        postings = self.postings.get(key, {})
+        for value in values:
+            rows = postings.get(value if value is _PRESENT else _term(value))
+            if rows:
+                mask[np.frombuffer(rows, dtype=np.int64)] = True
+        return mask
+
+    def _column(self, key: str) -> np.ndarray:
+        """Numeric view of one metadata key (NaN where missing), for range filters"""
+        if key not in self._columns:
+            column = np.full(self.size, np.nan)
+            rows = self.postings.get(key, {}).get(_PRESENT)
+            if rows:
+                for row in np.frombuffer(rows, dtype=np.int64):
+                    value = self.metadata[row].get(key)
+                    if isinstance(value, (int, float)) and not isinstance(value, bool):
+                        column[row] = value
+            self._columns[key] = column
+        return self._columns[key]
+
+    def _field_mask(self, key: str, condition: Any) -> np.ndarray:
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        mask = np.ones(self.size, dtype=bool)
+        for op, value in condition.items():
+            if op == "$eq":
+                mask &= self._rows(key, [value])
+            elif op == "$ne":
+                mask &= ~self._rows(key, [value])
+            elif op == "$in":
+                mask &= self._rows(key, value)
+            elif op == "$nin":
+                mask &= ~self._rows(key, value)
+            elif op == "$exists":
+                present = self._rows(key, [_PRESENT])
+                mask &= present if value else ~present
+            elif op in RANGE_OPS:
+                with np.errstate(invalid="ignore"):
+                    mask &= RANGE_OPS[op](self._column(key), float(value))
+            else:
+                raise ValueError(f"Unsupported filter operator: {op}")
+        return mask
+
+    def filter_mask(self, filter_dict: Dict[str, Any]) -> np.ndarray:
+        mask = np.ones(self.size, dtype=bool)
+        for key, condition in filter_dict.items():
+            if key == "$and":
+                for sub in condition:
+                    mask &= self.filter_mask(sub)
+            elif key == "$or":
+                union = np.zeros(self.size, dtype=bool)
+                for sub in condition:
+                    union |= self.filter_mask(sub)
+                mask &= union
+            else:
+                mask &= self._field_mask(key, condition)
+        return mask
+
+    # ------------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------------
+
+    def search(self, query: np.ndarray, top_k: int, filter_dict: Optional[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows and scores of the top_k live rows matching the filter"""
+        if self.size == 0 or top_k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        mask = self.alive[:self.size].copy()
+        if filter_dict:
+            mask &= self.filter_mask(filter_dict)
+        candidates = int(mask.sum())
+        if candidates == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        exact = (
+            self.index is None
+            or candidates <= self.store.exact_threshold
+            # HNSW recall drops when the filter removes most of the graph
+            or candidates < self.store.filtered_exact_ratio * self.size
+        )
+        if exact:
+            return self._exact(query, mask, candidates, top_k)
+        return self._ann(query, mask, candidates, top_k)
+
+    def _scores(self, rows: Optional[np.ndarray], query: np.ndarray) -> np.ndarray:
+        if rows is None:
+            scores = np.empty(self.size, dtype=np.float32)
+            for start in range(0, self.size, _SCAN_BLOCK):
+                block = self.vectors[start:min(start + _SCAN_BLOCK, self.size)]
+                scores[start:start + len(block)] = block.astype(np.float32, copy=False) @ query
+            return scores
+        scores = np.empty(len(rows), dtype=np.float32)
+        for start in range(0, len(rows), _SCAN_BLOCK):
+            block = rows[start:start + _SCAN_BLOCK]
+            scores[start:start + len(block)] = self.vectors[block].astype(np.float32, copy=False) @ query
+        return scores
+
+    @staticmethod
+    def _top(rows: np.ndarray, scores: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        if len(rows) > top_k:
+            keep = np.argpartition(-scores, top_k - 1)[:top_k]
+            rows, scores = rows[keep], scores[keep]
+        order = np.lexsort((rows, -scores))  # ties: earlier row first
+        return rows[order], scores[order]
+
+    def _exact(self, query: np.ndarray, mask: np.ndarray, candidates: int, top_k: int):
+        if candidates == self.size:
+            return self._top(np.arange(self.size), self._scores(None, query), top_k)
+        rows = np.flatnonzero(mask)
+        return self._top(rows, self._scores(rows, query), top_k)
+
+    def _ensure_index(self):
+        if self.index is None:
+            store = self.store
+            if store.dtype == np.float16:
+                index = faiss.IndexHNSWSQ(
+                    self.dimension, faiss.ScalarQuantizer.QT_fp16, store.hnsw_m, faiss.METRIC_INNER_PRODUCT,
+                )
+            else:
+                index = faiss.IndexHNSWFlat(self.dimension, store.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = store.ef_construction
+            for start in range(0, self.size, _SCAN_BLOCK):
+                block = self.vectors[start:min(start + _SCAN_BLOCK, self.size)]
+                index.add(np.ascontiguousarray(block, dtype=np.float32))
+            self.index = index
+            logger.info("local_vector_index_built", vectors=self.size, dimension=self.dimension)
+        return self.index
+
+    def _ann(self, query: np.ndarray, mask: np.ndarray, candidates: int, top_k: int):
+        index = self.index
+        params = faiss.SearchParametersHNSW()
+        beam = max(self.store.ef_search, top_k)
+        packed = None
+        if candidates < self.size:
+            # Filtered-out nodes are still traversed: widen the beam to keep recall
+            beam = min(int(beam * self.size / candidates), MAX_EF_SEARCH)
+            packed = np.packbits(mask, bitorder="little")
+            params.sel = faiss.IDSelectorBitmap(len(packed), faiss.swig_ptr(packed))
+        params.efSearch = beam
+        _, found = index.search(query[None, :], min(top_k, candidates), params=params)
+        rows = found[0][found[0] >= 0].astype(np.int64)
+        # Rescore from the segment: exact scores, also for fp16 codes
+        return self._top(rows, self._scores(rows, query), top_k)
+
+
+# ============================================================================
+# Store
+# ============================================================================
+
+VectorInput = Union[Dict[str, Any], Tuple[Any, ...]]
+
+
+class LocalVectorStore:
+    """
+    Embedded Pinecone-Index compatible vector store.
+
+    Args:
+        path: Snapshot directory (snapshot() writes here; open() loads it)
+        dimension: Vector dimension (inferred from the first upsert if None)
+        metric: "cosine" (vectors normalized on write) or "dotproduct"
+        dtype: Segment storage, "float32" or "float16"
+        hnsw_m: HNSW graph degree
+        ef_construction: HNSW build beam width
+        ef_search: HNSW query beam width (raised to top_k when smaller)
+        exact_threshold: Candidate sets up to this size are searched exactly
+        filtered_exact_ratio: Exact search when the filter keeps fewer rows than this share
+        compact_ratio: Compact a namespace once this share of its rows is dead
+        compact_min_dead: ... and at least this many rows are dead
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        dimension: Optional[int] = None,
+        metric: str = "cosine",
+        dtype: str = "float32",
+        hnsw_m: int = 32,
+        ef_construction: int = 100,
+        ef_search: int = 64,
+        exact_threshold: int = 2048,
+        filtered_exact_ratio: float = 0.2,
+        compact_ratio: float = 0.25,
+        compact_min_dead: int = 1024,
+    ):
+        if metric not in METRICS:
+            raise ValueError(f"Unsupported metric: {metric} (expected one of {METRICS})")
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported dtype: {dtype} (expected one of {tuple(DTYPES)})")
+        self.path = Path(path) if path else None
+        self.dimension = dimension
+        self.metric = metric
+        self.dtype_name = dtype
+        self.dtype = DTYPES[dtype]
+        self.hnsw_m = hnsw_m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.exact_threshold = exact_threshold
+        self.filtered_exact_ratio = filtered_exact_ratio
+        self.compact_ratio = compact_ratio
+        self.compact_min_dead = compact_min_dead
+        self._namespaces: Dict[str, _Namespace] = {}
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------------
+    # Pinecone Index API
+    # ------------------------------------------------------------------------
+
+    def upsert(self, vectors: Sequence[VectorInput], namespace: Optional[str] = None, **kwargs) -> Dict[str, int]:
+        """Insert or replace vectors given as {"id", "values", "metadata"} dicts or tuples"""
+        if not vectors:
+            return {"upserted_count": 0}
+        ids, values, metadatas = [], [], []
+        for vector in vectors:
+            if isinstance(vector, dict):
+                ids.append(str(vector["id"]))
+                values.append(vector["values"])
+                metadatas.append(dict(vector.get("metadata") or {}))
+            else:
+                ids.append(str(vector[0]))
+                values.append(vector[1])
+                metadatas.append(dict(vector[2]) if len(vector) > 2 and vector[2] else {})
+        matrix = self._prepare(np.asarray(values, dtype=np.float32))
+
+        with self._lock:
+            ns = self._namespace(namespace, create=True)
+            ns.upsert(ids, matrix, metadatas)
+            self._maybe_compact(ns)
+        return {"upserted_count": len(ids)}
+
+    def query(
+        self,
+        vector: Optional[Sequence[float]] = None,
+        top_k: int = 10,
+        namespace: Optional[str] = None,
+        filter: Optional[Dict[str, Any]] = None,
+        include_metadata: bool = False,
+        include_values: bool = False,
+        id: Optional[str] = None,
+        **kwargs,
+    ) -> QueryResponse:
+        """Nearest neighbours of ``vector`` (or of the stored vector ``id``)"""
+        name = namespace or ""
+        with self._lock:
+            ns = self._namespaces.get(name)
+            if ns is None:
+                return QueryResponse(namespace=name)
+            if vector is None:
+                if id is None or id not in ns.row_of:
+                    return QueryResponse(namespace=name)
+                query = ns.vectors[ns.row_of[id]].astype(np.float32)
+            else:
+                query = self._prepare(np.asarray(vector, dtype=np.float32)[None, :])[0]
+            rows, scores = ns.search(query, top_k, filter)
+            matches = [
+                Match(
+                    id=ns.ids[row],
+                    score=float(score),
+                    metadata=dict(ns.metadata[row]) if include_metadata else None,
+                    values=ns.vectors[row].astype(np.float32).tolist() if include_values else None,
+                )
+                for row, score in zip(rows.tolist(), scores.tolist())
+            ]
+        return QueryResponse(matches=matches, namespace=name)
+
+    def fetch(self, ids: Sequence[str], namespace: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        name = namespace or ""
+        found: Dict[str, Any] = {}
+        with self._lock:
+            ns = self._namespaces.get(name)
+            for item_id in ids if ns else ():
+                row = ns.row_of.get(item_id)
+                if row is not None:
+                    found[item_id] = {
+                        "id": item_id,
+                        "values": ns.vectors[row].astype(np.float32).tolist(),
+                        "metadata": dict(ns.metadata[row]),
+                    }
+        return {"vectors": found, "namespace": name}
+
+    def delete(
+        self,
+        ids: Optional[Sequence[str]] = None,
+        delete_all: bool = False,
+        namespace: Optional[str] = None,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> Dict[str, int]:
+        name = namespace or ""
+        with self._lock:
+            ns = self._namespaces.get(name)
+            if ns is None:
+                return {"deleted_count": 0}
+            if delete_all:
+                deleted = ns.live_count
+                del self._namespaces[name]
+                return {"deleted_count": deleted}
+            targets = list(ids or [])
+            if filter:
+                mask = ns.alive[:ns.size] & ns.filter_mask(filter)
+                targets += [ns.ids[row] for row in np.flatnonzero(mask)]
+            deleted = ns.delete(targets)
+            self._maybe_compact(ns)
+        return {"deleted_count": deleted}
+
+    def describe_index_stats(self, **kwargs) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "dimension": self.dimension,
+                "index_fullness": 0.0,
+                "metric": self.metric,
+                "total_vector_count": sum(ns.live_count for ns in self._namespaces.values()),
+                "namespaces": {
+                    name: {"vector_count": ns.live_count, "dead_count": ns.dead_count, "indexed": ns.index is not None}
+                    for name, ns in self._namespaces.items()
+                },
+            }
+
+    # ------------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------------
+
+    def compact(self, namespace: Optional[str] = None) -> int:
+        """Drop dead rows (all namespaces if None); returns rows removed"""
+        with self._lock:
+            if namespace is None:
+                targets = list(self._namespaces.values())
+            else:
+                targets = [ns for ns in (self._namespaces.get(namespace),) if ns is not None]
+            return sum(ns.compact() for ns in targets)
+
+    def _maybe_compact(self, ns: _Namespace):
+        if ns.needs_compaction():
+            removed = ns.compact()
+            logger.info("local_vector_store_compacted", removed=removed, live=ns.live_count)
+
+    def _namespace(self, namespace: Optional[str], create: bool = False) -> Optional[_Namespace]:
+        name = namespace or ""
+        ns = self._namespaces.get(name)
+        if ns is None and create:
+            ns = self._namespaces[name] = _Namespace(self, self.dimension)
+        return ns
+
+    def _prepare(self, matrix: np.ndarray) -> np.ndarray:
+        if matrix.ndim != 2:
+            raise ValueError("vectors must all have the same dimension")
+        if self.dimension is None:
+            self.dimension = matrix.shape[1]
+        if matrix.shape[1] != self.dimension:
+            raise ValueError(f"Vector dimension {matrix.shape[1]} does not match index dimension {self.dimension}")
+        if self.metric == "cosine":
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix = matrix / np.where(norms > 0, norms, 1.0)
+        return matrix
+
+    # ------------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------------
+
+    def snapshot(self, path: Optional[Union[str, Path]] = None) -> Path:
+        """
+        Compact and write every namespace to ``path`` (default: the store path).
+
+        Written to a sibling temp directory and swapped in, so a crash never
+        leaves a half-written snapshot behind.
+        """
+        target = Path(path) if path else self.path
+        if target is None:
+            raise ValueError("No snapshot path configured")
+        tmp = target.with_name(f"{target.name}.tmp-{os.getpid()}")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+
+        with self._lock:
+            manifest = {
+                "version": SNAPSHOT_VERSION,
+                "dimension": self.dimension,
+                "metric": self.metric,
+                "dtype": self.dtype_name,
+                "namespaces": {},
+            }
+            for position, (name, ns) in enumerate(self._namespaces.items()):
+                ns.compact()
+                directory = f"ns-{position}"
+                (tmp / directory).mkdir()
+                np.save(tmp / directory / "vectors.npy", np.ascontiguousarray(ns.vectors[:ns.size]))
+                with open(tmp / directory / "rows.json", "w") as f:
+                    json.dump({"ids": ns.ids, "metadata": ns.metadata}, f)
+                if ns.index is not None and FAISS_AVAILABLE:
+                    faiss.write_index(ns.index, str(tmp / directory / "hnsw.faiss"))
+                manifest["namespaces"][name] = {"directory": directory, "count": ns.size}
+            with open(tmp / "manifest.json", "w") as f:
+                json.dump(manifest, f)
+
+        previous = target.with_name(f"{target.name}.old-{os.getpid()}")
+        if target.exists():
+            target.rename(previous)
+        tmp.rename(target)
+        shutil.rmtree(previous, ignore_errors=True)
+        logger.info("local_vector_store_snapshot", path=str(target), namespaces=len(manifest["namespaces"]))
+        return target
+
+    @classmethod
+    def open(cls, path: Union[str, Path], **kwargs) -> "LocalVectorStore":
+        """Load the snapshot at ``path`` (segments memory-mapped), or start empty"""
+        path = Path(path)
+        manifest_path = path / "manifest.json"
+        if not manifest_path.exists():
+            return cls(path=path, **kwargs)
+
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        if manifest.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {manifest.get('version')}")
+        kwargs.update(dimension=manifest["dimension"], metric=manifest["metric"], dtype=manifest["dtype"])
+        store = cls(path=path, **kwargs)
+
+        for name, entry in manifest["namespaces"].items():
+            directory = path / entry["directory"]
+            ns = _Namespace(store, store.dimension)
+            ns.vectors = np.load(directory / "vectors.npy", mmap_mode="r")
+            with open(directory / "rows.json") as f:
+                rows = json.load(f)
+            ns.ids, ns.metadata = rows["ids"], rows["metadata"]
+            ns.size = len(ns.ids)
+            ns.alive = np.ones(ns.size, dtype=bool)
+            ns.row_of = {item_id: row for row, item_id in enumerate(ns.ids)}
+            for row, metadata in enumerate(ns.metadata):
+                ns._index_metadata(row, metadata)
+            index_path = directory / "hnsw.faiss"
+            if index_path.exists() and FAISS_AVAILABLE:
+                ns.index = faiss.read_index(str(index_path))
+            store._namespaces[name] = ns
+
+        logger.info(
+            "local_vector_store_loaded",
+            path=str(path),
+            namespaces=len(store._namespaces),
+            vectors=sum(ns.size for ns in store._namespaces.values()),
+        )
+        return store
+
+
+# Singleton instance
+_local_store: Optional[LocalVectorStore] = None
+
+
+def get_local_vector_store(path: Optional[str] = None) -> LocalVectorStore:
+    """Get or open the process-wide local store (LOCAL_VECTOR_STORE_PATH)"""
+    global _local_store
+    if _local_store is None:
+        path = path or get_settings().local_vector_store_path or None
+        _local_store = LocalVectorStore.open(path) if path else LocalVectorStore()
+    return _local_store
+
+
+def reset_local_vector_store():
+    """Reset the local store singleton (for testing)"""
+    global _local_store
+    _local_store = None
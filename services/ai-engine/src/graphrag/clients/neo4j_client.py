@@ -8,6 +8,7 @@ from dataclasses import dataclass
 import structlog
 
 from core.config import get_settings
+from ..graph_snapshot import get_graph_snapshot_manager
 
 logger = structlog.get_logger()
 settings = get_settings()
@@ -256,6 +257,34 @@ class Neo4jClient:
         Returns:
             List of graph paths
         """
+        # Short expansions are served from the in-memory snapshot when every
+        # seed is in it; Neo4j (APOC) remains the fallback and source of truth
+        snapshot = get_graph_snapshot_manager().current()
+        if snapshot is not None:
+            local_paths = snapshot.paths(
+                seed_ids,
+                max_hops=max_hops,
+                edge_types=allowed_edges,
+                node_labels=allowed_nodes,
+                limit=limit
+            )
+            if local_paths is not None:
+                logger.info(
+                    "neo4j_traversal_served_from_snapshot",
+                    seed_count=len(seed_ids),
+                    paths_found=len(local_paths),
+                    snapshot_version=snapshot.version
+                )
+                return [
+                    GraphPath(
+                        nodes=path['nodes'],
+                        edges=path['edges'],
+                        path_score=1.0 / (1.0 + path['length']),
+                        path_id=path['path_id']
+                    )
+                    for path in local_paths
+                ]
+
         # Build filters
         node_filter = ""
         if allowed_nodes:
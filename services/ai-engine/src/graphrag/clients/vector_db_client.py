@@ -1,6 +1,6 @@
 """
 Vector Database Client for GraphRAG
-Supports both Pinecone and pgvector (via Supabase)
+Supports Pinecone, pgvector (via Supabase) and an embedded local store
 """
 
 from typing import List, Dict, Any, Optional, Literal
@@ -29,6 +29,7 @@ class VectorDBClient:
     Supports:
     - Pinecone (cloud vector DB)
     - pgvector (Postgres extension via Supabase)
+    - local (embedded, Pinecone-compatible; see local_vector_store.py)
     
     Features:
     - Automatic provider detection
@@ -39,7 +40,7 @@ class VectorDBClient:
     
     def __init__(
         self,
-        provider: Literal["pinecone", "pgvector"] = "pinecone",
+        provider: Literal["pinecone", "pgvector", "local"] = "pinecone",
         api_key: Optional[str] = None,
         environment: Optional[str] = None,
         index_name: Optional[str] = None
@@ -48,7 +49,7 @@ class VectorDBClient:
         Initialize vector database client
 
         Args:
-            provider: Vector DB provider ("pinecone" or "pgvector")
+            provider: Vector DB provider ("pinecone", "pgvector" or "local")
             api_key: API key for cloud provider
             environment: Environment for cloud provider
             index_name: Index/table name (defaults to PINECONE_INDEX_NAME from settings)
@@ -75,6 +76,8 @@ class VectorDBClient:
             await self._connect_pinecone()
         elif self.provider == "pgvector":
             await self._connect_pgvector()
+        elif self.provider == "local":
+            await self._connect_local()
         else:
             raise ValueError(f"Unsupported provider: {self.provider}")
     
@@ -141,8 +144,23 @@ class VectorDBClient:
             logger.error("pgvector_connection_failed", error=str(e))
             raise
     
+    async def _connect_local(self):
+        """Open the embedded store (LOCAL_VECTOR_STORE_PATH snapshot, if any)"""
+        from .local_vector_store import get_local_vector_store
+
+        self._index = get_local_vector_store()
+        stats = self._index.describe_index_stats()
+        logger.info(
+            "local_vector_store_connected",
+            path=str(self._index.path) if self._index.path else None,
+            dimension=stats.get('dimension'),
+            total_vector_count=stats.get('total_vector_count', 0)
+        )
+
     async def disconnect(self):
         """Disconnect from vector database"""
+        if self.provider == "local" and self._index is not None and self._index.path:
+            self._index.snapshot()
         self._client = None
         self._index = None
         logger.info("vector_db_disconnected", provider=self.provider)
@@ -155,7 +173,7 @@ class VectorDBClient:
             True if database is responsive
         """
         try:
-            if self.provider == "pinecone":
+            if self.provider in ("pinecone", "local"):
                 stats = self._index.describe_index_stats()
                 return stats is not None
             elif self.provider == "pgvector":
@@ -183,7 +201,7 @@ class VectorDBClient:
             embedding: Query embedding vector
             top_k: Number of results to return
             filter_dict: Metadata filters
-            namespace: Pinecone namespace (partition)
+            namespace: Pinecone / local namespace (partition)
             include_metadata: Include metadata in results
             min_score: Minimum similarity score threshold
             
@@ -191,7 +209,7 @@ class VectorDBClient:
             List of search results
         """
         try:
-            if self.provider == "pinecone":
+            if self.provider in ("pinecone", "local"):
                 return await self._search_pinecone(
                     embedding, top_k, filter_dict, namespace,
                     include_metadata, min_score
@@ -220,7 +238,7 @@ class VectorDBClient:
         include_metadata: bool,
         min_score: float
     ) -> List[VectorSearchResult]:
-        """Search in Pinecone"""
+        """Search in Pinecone (or the Pinecone-compatible local store)"""
         query_response = self._index.query(
             vector=embedding,
             top_k=top_k,
@@ -240,7 +258,7 @@ class VectorDBClient:
                 ))
         
         logger.info(
-            "pinecone_search_success",
+            f"{self.provider}_search_success",
             results_count=len(results),
             top_k=top_k
         )
@@ -316,9 +334,9 @@ class VectorDBClient:
             namespace: Pinecone namespace
         """
         try:
-            if self.provider == "pinecone":
+            if self.provider in ("pinecone", "local"):
                 self._index.upsert(vectors=vectors, namespace=namespace)
-                logger.info("pinecone_upsert_success", count=len(vectors))
+                logger.info(f"{self.provider}_upsert_success", count=len(vectors))
             elif self.provider == "pgvector":
                 # Implement pgvector upsert using asyncpg
                 if not self._pool:
@@ -352,20 +370,53 @@ class VectorDBClient:
             logger.error("vector_upsert_failed", error=str(e))
             raise
 
+    async def delete(
+        self,
+        ids: List[str],
+        namespace: Optional[str] = None
+    ) -> None:
+        """
+        Delete vectors by id
+
+        Args:
+            ids: Vector ids
+            namespace: Pinecone / local namespace
+        """
+        if self.provider not in ("pinecone", "local"):
+            raise NotImplementedError(f"delete is not supported for provider: {self.provider}")
+        try:
+            self._index.delete(ids=ids, namespace=namespace)
+            logger.info(f"{self.provider}_delete_success", count=len(ids))
+        except Exception as e:
+            logger.error("vector_delete_failed", error=str(e))
+            raise
+
 
 # Singleton instance
 _vector_client: Optional[VectorDBClient] = None
 
 
 async def get_vector_client(
-    provider: Literal["pinecone", "pgvector"] = "pinecone"
+    provider: Optional[Literal["pinecone", "pgvector", "local"]] = None
 ) -> VectorDBClient:
-    """Get or create vector database client singleton"""
+    """
+    Get or create vector database client singleton
+
+    Args:
+        provider: Vector DB provider (defaults to VECTOR_STORE_PROVIDER)
+    """
     global _vector_client
-    
+
+    provider = provider or get_settings().vector_store_provider
     if _vector_client is None:
         _vector_client = VectorDBClient(provider=provider)
         await _vector_client.connect()
-    
+    elif _vector_client.provider != provider:
+        logger.warning(
+            "vector_client_provider_mismatch",
+            requested=provider,
+            active=_vector_client.provider,
+        )
+
     return _vector_client
 
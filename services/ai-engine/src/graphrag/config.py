@@ -4,6 +4,7 @@ Uses pydantic-settings for environment variable loading
 """
 
 from typing import Optional, List
+from pydantic import AliasChoices, Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 import structlog
 
@@ -18,6 +19,7 @@ class GraphRAGConfig(BaseSettings):
     - DATABASE_URL
     - PINECONE_API_KEY
     - PINECONE_ENVIRONMENT
+    - VECTOR_STORE_PROVIDER (shared with core.config.Settings)
     - NEO4J_URI
     - NEO4J_USERNAME
     - NEO4J_PASSWORD
@@ -32,7 +34,11 @@ class GraphRAGConfig(BaseSettings):
     pinecone_api_key: Optional[str] = None
     pinecone_environment: Optional[str] = "us-west1-gcp"
     pinecone_index_name: str = "vital-medical"
-    vector_provider: str = "pinecone"  # or "pgvector"
+    # Same variable as Settings.vector_store_provider so both stacks agree
+    vector_provider: str = Field(
+        default="pinecone",  # or "pgvector" / "local"
+        validation_alias=AliasChoices("VECTOR_STORE_PROVIDER", "vector_provider"),
+    )
     
     # Neo4j
     neo4j_uri: str = "bolt://localhost:7687"
@@ -82,6 +88,11 @@ class GraphRAGConfig(BaseSettings):
         extra="ignore"
     )
     
+    @field_validator("vector_provider")
+    @classmethod
+    def _normalize_vector_provider(cls, value: str) -> str:
+        return value.lower()
+
     def validate_config(self) -> bool:
         """
         Validate configuration
@@ -0,0 +1,242 @@
+"""
+Context Packer
+Token-accurate, budgeted selection of retrieved chunks for the LLM context
+
+Replaces "estimate len/4 and cut in rank order", which overfills the
+window on token-dense text and leaves it underused after the first chunk
+that does not fit.
+
+Selection:
+- Exact token counts via the cached tokenizer (plus per-chunk overhead
+  such as the citation marker)
+- Near-duplicates of a higher-ranked chunk are dropped outright
+- Greedy knapsack on marginal gain per token, where the gain is the
+  chunk's relevance discounted by MMR-style similarity to what is already
+  selected; compared with the best single chunk that fits (the classic
+  1/2-approximation)
+- Leftover budget is filled with a token-exact truncation of the best
+  chunk that did not fit
+
+Output order is rank order, so citation numbers follow relevance and do not
+depend on the packing order. The report is deterministic for the same
+input (the digest covers everything except timing).
+"""
+
+import hashlib
+import json
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from infrastructure.llm.tokenizer import count_tokens, truncate_to_tokens
+
+_WORD = re.compile(r"[a-z0-9]+")
+_HASH_DIMS = 1 << 12
+
+
+@dataclass
+class PackingReport:
+    """What was packed, what was dropped and why"""
+
+    budget: int
+    used_tokens: int = 0
+    candidates: int = 0
+    strategy: str = "greedy_density"
+    selected: List[Dict[str, Any]] = field(default_factory=list)
+    dropped: List[Dict[str, Any]] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    @property
+    def utilization(self) -> float:
+        return round(self.used_tokens / self.budget, 4) if self.budget else 0.0
+
+    @property
+    def digest(self) -> str:
+        payload = json.dumps([self.budget, self.strategy, self.selected, self.dropped], sort_keys=True)
+        return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "budget": self.budget,
+            "used_tokens": self.used_tokens,
+            "utilization": self.utilization,
+            "candidates": self.candidates,
+            "strategy": self.strategy,
+            "selected": self.selected,
+            "dropped": self.dropped,
+            "digest": self.digest,
+            "elapsed_ms": round(self.elapsed_ms, 3),
+        }
+
+
+@dataclass
+class PackingResult:
+    """Selected candidate positions in rank order, with any truncated texts"""
+
+    selected: List[int]
+    texts: Dict[int, str]
+    report: PackingReport
+
+
+class ContextPacker:
+    """
+    Budgeted context selection over ranked candidates.
+
+    Args:
+        model: Model whose tokenizer is used for counting
+        diversity: Weight of the redundancy penalty (0 = relevance only)
+        duplicate_threshold: Similarity above which a lower-ranked chunk is
+            dropped as a duplicate
+        min_fill_tokens: Smallest leftover budget worth filling with a
+            truncated chunk
+        counter: Token counter override (defaults to the cached tokenizer)
+    """
+
+    def __init__(
+        self,
+        model: str = "gpt-4",
+        diversity: float = 0.5,
+        duplicate_threshold: float = 0.92,
+        min_fill_tokens: int = 48,
+        counter: Optional[Callable[[str], int]] = None,
+        truncator: Optional[Callable[[str, int], str]] = None,
+    ):
+        self.model = model
+        self.diversity = diversity
+        self.duplicate_threshold = duplicate_threshold
+        self.min_fill_tokens = min_fill_tokens
+        self.counter = counter or (lambda text: count_tokens(text, model))
+        self.truncator = truncator or (lambda text, limit: truncate_to_tokens(text, limit, model))
+
+    def pack(
+        self,
+        texts: Sequence[str],
+        scores: Sequence[float],
+        budget: int,
+        overhead_tokens: int = 0,
+        ids: Optional[Sequence[str]] = None,
+    ) -> PackingResult:
+        """
+        Choose which of the ranked ``texts`` to include within ``budget`` tokens.
+
+        ``overhead_tokens`` is added to every included chunk (citation
+        marker, separators); ``ids`` label the report entries.
+        """
+        started = time.perf_counter()
+        n = len(texts)
+        ids = list(ids) if ids is not None else [str(i) for i in range(n)]
+        report = PackingReport(budget=budget, candidates=n)
+        if n == 0 or budget <= 0:
+            report.dropped = [{"id": ids[i], "rank": i, "reason": "no_budget"} for i in range(n)]
+            return PackingResult([], {}, report)
+
+        tokens = np.asarray([self.counter(text) + overhead_tokens for text in texts], dtype=np.int64)
+        relevance = _relevance(scores)
+        similarity = _similarity(texts)
+
+        # Near-duplicates of a higher-ranked candidate never enter the pool
+        pool = np.ones(n, dtype=bool)
+        reasons: Dict[int, str] = {}
+        for i in range(1, n):
+            if similarity[i, :i][pool[:i]].max(initial=0.0) >= self.duplicate_threshold:
+                pool[i] = False
+                reasons[i] = "redundant"
+
+        chosen, total_gain = self._greedy(tokens, relevance, similarity, pool, budget)
+        fits = np.flatnonzero(pool & (tokens <= budget))
+        if len(fits):
+            best_single = int(fits[np.argmax(relevance[fits])])
+            if relevance[best_single] > total_gain:
+                chosen, report.strategy = [best_single], "best_single"
+
+        used = int(tokens[chosen].sum()) if chosen else 0
+        texts_out: Dict[int, str] = {}
+        truncated: Optional[int] = None
+        remaining = budget - used
+        if remaining >= self.min_fill_tokens + overhead_tokens:
+            leftovers = [i for i in np.flatnonzero(pool) if i not in chosen]
+            if leftovers:
+                max_sim = similarity[leftovers][:, chosen].max(axis=1) if chosen else np.zeros(len(leftovers))
+                gains = relevance[leftovers] * (1.0 - self.diversity * max_sim)
+                candidate = int(leftovers[int(np.argmax(gains))])
+                text = self.truncator(texts[candidate], remaining - overhead_tokens)
+                cost = self.counter(text) + overhead_tokens
+                if text and cost <= remaining:
+                    texts_out[candidate] = text
+                    chosen.append(candidate)
+                    truncated = candidate
+                    used += cost
+
+        chosen.sort()
+        chosen_set = set(chosen)
+        report.used_tokens = used
+        for i in chosen:
+            report.selected.append({
+                "id": ids[i],
+                "rank": i,
+                "tokens": int(self.counter(texts_out[i]) + overhead_tokens) if i == truncated else int(tokens[i]),
+                "relevance": round(float(relevance[i]), 4),
+                "truncated": i == truncated,
+            })
+        for i in range(n):
+            if i not in chosen_set:
+                report.dropped.append({
+                    "id": ids[i],
+                    "rank": i,
+                    "tokens": int(tokens[i]),
+                    "reason": reasons.get(i, "over_budget"),
+                })
+        report.elapsed_ms = (time.perf_counter() - started) * 1000
+        return PackingResult(chosen, texts_out, report)
+
+    def _greedy(self, tokens, relevance, similarity, pool, budget):
+        """Repeatedly take the best marginal gain per token that still fits"""
+        remaining = budget
+        chosen: List[int] = []
+        total_gain = 0.0
+        available = pool.copy()
+        max_sim = np.zeros(len(tokens))
+        while True:
+            candidates = np.flatnonzero(available & (tokens <= remaining))
+            if len(candidates) == 0:
+                return chosen, total_gain
+            gains = relevance[candidates] * (1.0 - self.diversity * max_sim[candidates])
+            density = gains / np.maximum(tokens[candidates], 1)
+            # argmax returns the first maximum: ties go to the higher rank
+            pick = int(np.argmax(density))
+            index = int(candidates[pick])
+            chosen.append(index)
+            total_gain += float(gains[pick])
+            remaining -= int(tokens[index])
+            available[index] = False
+            max_sim = np.maximum(max_sim, similarity[index])
+
+
+def _relevance(scores: Sequence[float]) -> np.ndarray:
+    """Scores scaled to [0, 1]; rank-based when no positive scores are given"""
+    values = np.clip(np.asarray(scores, dtype=np.float64), 0.0, None)
+    if len(values) and values.max() > 0:
+        return values / values.max()
+    return 1.0 / (1.0 + np.arange(len(values)))
+
+
+@lru_cache(maxsize=65536)
+def _bucket(word: str) -> int:
+    # Stable across processes (unlike hash()), so reports are reproducible
+    return int.from_bytes(hashlib.blake2b(word.encode(), digest_size=4).digest(), "little") % _HASH_DIMS
+
+
+def _similarity(texts: Sequence[str]) -> np.ndarray:
+    """Cosine similarity of hashed bag-of-words vectors"""
+    vectors = np.zeros((len(texts), _HASH_DIMS), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for word, count in Counter(_WORD.findall(text.lower())).items():
+            vectors[row, _bucket(word)] += count
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors /= np.where(norms > 0, norms, 1.0)
+    return vectors @ vectors.T
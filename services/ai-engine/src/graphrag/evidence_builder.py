@@ -3,9 +3,10 @@ Evidence Builder
 Constructs context with evidence chains and citations
 """
 
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 import structlog
 
+from .context_packer import ContextPacker, PackingReport
 from .models import (
     ContextChunk,
     GraphEvidence,
@@ -24,18 +25,20 @@ class EvidenceBuilder:
     Features:
     - Citation assignment [1], [2], etc.
     - Evidence chain construction
-    - Token counting
-    - Context truncation
+    - Token-accurate context packing (see ContextPacker)
     """
     
-    def __init__(self, max_tokens: int = 4000):
+    def __init__(self, max_tokens: int = 4000, packer: Optional[ContextPacker] = None):
         """
         Initialize evidence builder
         
         Args:
             max_tokens: Maximum context window tokens
+            packer: Context packer (defaults to one using the cached tokenizer)
         """
         self.max_tokens = max_tokens
+        self.packer = packer or ContextPacker()
+        self.last_packing_report: Optional[PackingReport] = None
     
     def build_context_with_evidence(
         self,
@@ -56,22 +59,27 @@ class EvidenceBuilder:
         """
         try:
             citation_map: Dict[str, SearchSource] = {}
-            citation_counter = 1
             annotated_chunks = []
-            total_tokens = 0
-            
-            for chunk in chunks:
-                # Estimate tokens (rough: ~4 chars per token)
-                chunk_tokens = len(chunk.text) // 4
-                
-                if total_tokens + chunk_tokens > self.max_tokens:
-                    logger.info(
-                        "context_truncated",
-                        max_tokens=self.max_tokens,
-                        chunks_included=len(annotated_chunks)
-                    )
-                    break
-                
+
+            # Budget covers the citation markers appended below
+            overhead = self.packer.counter(f" [{len(chunks)}]") if include_citations and chunks else 0
+            packing = self.packer.pack(
+                [chunk.text for chunk in chunks],
+                [chunk.score for chunk in chunks],
+                budget=self.max_tokens,
+                overhead_tokens=overhead,
+                ids=[chunk.chunk_id for chunk in chunks],
+            )
+            self.last_packing_report = packing.report
+            total_tokens = packing.report.used_tokens
+
+            # Selection is in rank order, so citation numbers follow relevance
+            for citation_counter, index in enumerate(packing.selected, start=1):
+                chunk = chunks[index]
+                if index in packing.texts:
+                    chunk.text = packing.texts[index]
+                    chunk.metadata['truncated'] = True
+
                 # Assign citation ID
                 if include_citations:
                     citation_id = f"[{citation_counter}]"
@@ -81,11 +89,19 @@ class EvidenceBuilder:
                     annotated_text = f"{chunk.text} {citation_id}"
                     chunk.text = annotated_text
                     chunk.metadata['citation_id'] = citation_id
-                    
-                    citation_counter += 1
                 
                 annotated_chunks.append(chunk)
-                total_tokens += chunk_tokens
+
+            if packing.report.dropped:
+                logger.info(
+                    "context_packed",
+                    max_tokens=self.max_tokens,
+                    chunks_included=len(annotated_chunks),
+                    utilization=packing.report.utilization,
+                    strategy=packing.report.strategy,
+                    dropped=packing.report.dropped,
+                    digest=packing.report.digest
+                )
             
             logger.info(
                 "evidence_built",
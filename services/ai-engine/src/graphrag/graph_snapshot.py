@@ -0,0 +1,568 @@
+"""
+Knowledge Graph Snapshot
+Immutable in-memory CSR copy of the Neo4j agent/ontology graph
+
+Neo4j stays the source of truth; the snapshot is rebuilt periodically and
+serves the read paths that do not need up-to-the-second data:
+- O(1) node/edge/label/degree statistics (precomputed at build)
+- Keyset pagination of nodes by id, optionally per label
+- Local BFS and weighted k-hop traversal, so 1-2 hop GraphRAG expansions
+  do not need an APOC round trip
+
+Layout:
+- Nodes are indexed 0..n-1; labels, Neo4j ids and degrees are NumPy
+  columns, properties are stored column-wise
+- Edges keep their direction in edge_src/edge_dst; traversal uses one
+  symmetric CSR (adj_indptr/adj_nbr) with the edge index and direction of
+  each entry, matching the undirected expansion of the Cypher paths
+
+Usage:
+    manager = get_graph_snapshot_manager()
+    snapshot = manager.current()      # None until loaded or when too stale
+    if snapshot is not None:
+        stats = snapshot.stats()
+        page, cursor = snapshot.page_nodes(labels=["Agent"], after=cursor, limit=100)
+        paths = snapshot.paths(["agent-1"], max_hops=2, edge_types=["ESCALATES_TO"])
+"""
+
+import asyncio
+import bisect
+import heapq
+import itertools
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger()
+
+# Edge properties read as traversal weight, in order of preference
+WEIGHT_PROPERTIES = ("weight", "confidence", "score", "strength")
+
+Fetch = Callable[[str, Dict[str, Any]], Awaitable[List[Dict[str, Any]]]]
+
+NODE_EXPORT_QUERY = """
+MATCH (n) WHERE id(n) > $after
+RETURN id(n) AS nid, labels(n) AS labels, properties(n) AS props
+ORDER BY nid LIMIT $batch
+"""
+
+EDGE_EXPORT_QUERY = """
+MATCH (a)-[r]->(b) WHERE id(r) > $after
+RETURN id(r) AS rid, id(a) AS src, id(b) AS dst, type(r) AS type, properties(r) AS props
+ORDER BY rid LIMIT $batch
+"""
+
+
+class GraphSnapshot:
+    """Read-only CSR graph; build with GraphSnapshot.build()"""
+
+    def __init__(self):
+        self.version = 0
+        self.built_at = 0.0
+        self.build_ms = 0.0
+        self.node_keys: List[str] = []
+        self.neo4j_ids = np.zeros(0, dtype=np.int64)
+        self.labels = np.zeros(0, dtype=np.int32)
+        self.label_names: List[str] = []
+        self.columns: Dict[str, np.ndarray] = {}
+        self.edge_src = np.zeros(0, dtype=np.int32)
+        self.edge_dst = np.zeros(0, dtype=np.int32)
+        self.edge_types = np.zeros(0, dtype=np.int32)
+        self.edge_weights = np.zeros(0, dtype=np.float32)
+        self.edge_type_names: List[str] = []
+        self.edge_properties: Dict[int, Dict[str, Any]] = {}
+        self.adj_indptr = np.zeros(1, dtype=np.int64)
+        self.adj_nbr = np.zeros(0, dtype=np.int32)
+        self.adj_edge = np.zeros(0, dtype=np.int32)
+        self.adj_out = np.zeros(0, dtype=bool)
+        self.out_degree = np.zeros(0, dtype=np.int32)
+        self.in_degree = np.zeros(0, dtype=np.int32)
+        self._key_index: Dict[str, int] = {}
+        self._neo4j_index: Dict[int, int] = {}
+        self._sorted_keys: List[str] = []
+        self._key_order = np.zeros(0, dtype=np.int32)
+        self._label_keys: Dict[int, List[str]] = {}
+        self._label_order: Dict[int, np.ndarray] = {}
+        self._stats: Dict[str, Any] = {}
+
+    # ------------------------------------------------------------------ build
+
+    @classmethod
+    def build(
+        cls,
+        nodes: Iterable[Dict[str, Any]],
+        edges: Iterable[Dict[str, Any]],
+        version: int = 0,
+    ) -> "GraphSnapshot":
+        """
+        Build from exported records.
+
+        Node records: {"nid", "labels", "props"}; edge records:
+        {"src", "dst", "type", "props"} with src/dst Neo4j node ids. Edges
+        whose endpoints are missing (written between the two export
+        passes) are skipped.
+        """
+        started = time.perf_counter()
+        snapshot = cls()
+        snapshot.version = version
+
+        label_codes: Dict[str, int] = {}
+        neo4j_ids, labels, props_list = [], [], []
+        for record in nodes:
+            nid = int(record["nid"])
+            if nid in snapshot._neo4j_index:
+                continue
+            props = record.get("props") or {}
+            node_labels = record.get("labels") or ["Unknown"]
+            key = str(props.get("id", nid))
+            if key in snapshot._key_index:
+                key = str(nid)
+            snapshot._neo4j_index[nid] = len(neo4j_ids)
+            snapshot._key_index[key] = len(neo4j_ids)
+            snapshot.node_keys.append(key)
+            neo4j_ids.append(nid)
+            labels.append(label_codes.setdefault(node_labels[0], len(label_codes)))
+            props_list.append(props)
+
+        n = len(neo4j_ids)
+        snapshot.neo4j_ids = np.asarray(neo4j_ids, dtype=np.int64)
+        snapshot.labels = np.asarray(labels, dtype=np.int32)
+        snapshot.label_names = list(label_codes)
+        property_names = sorted({name for props in props_list for name in props})
+        for name in property_names:
+            column = np.empty(n, dtype=object)
+            column[:] = [props.get(name) for props in props_list]
+            snapshot.columns[name] = column
+
+        type_codes: Dict[str, int] = {}
+        src, dst, types, weights = [], [], [], []
+        for record in edges:
+            a = snapshot._neo4j_index.get(int(record["src"]))
+            b = snapshot._neo4j_index.get(int(record["dst"]))
+            if a is None or b is None:
+                continue
+            props = record.get("props") or {}
+            weight = next((props[name] for name in WEIGHT_PROPERTIES if isinstance(props.get(name), (int, float))), 1.0)
+            extra = {name: value for name, value in props.items() if name not in WEIGHT_PROPERTIES}
+            if extra:
+                snapshot.edge_properties[len(src)] = extra
+            src.append(a)
+            dst.append(b)
+            types.append(type_codes.setdefault(record["type"], len(type_codes)))
+            weights.append(weight)
+
+        snapshot.edge_src = np.asarray(src, dtype=np.int32)
+        snapshot.edge_dst = np.asarray(dst, dtype=np.int32)
+        snapshot.edge_types = np.asarray(types, dtype=np.int32)
+        snapshot.edge_weights = np.asarray(weights, dtype=np.float32)
+        snapshot.edge_type_names = list(type_codes)
+        snapshot._build_indexes(n)
+        snapshot.built_at = time.time()
+        snapshot.build_ms = (time.perf_counter() - started) * 1000
+        snapshot._stats["build_ms"] = round(snapshot.build_ms, 1)
+        return snapshot
+
+    def _build_indexes(self, n: int) -> None:
+        m = len(self.edge_src)
+        both_src = np.concatenate([self.edge_src, self.edge_dst])
+        both_dst = np.concatenate([self.edge_dst, self.edge_src])
+        order = np.argsort(both_src, kind="stable")
+        self.adj_nbr = both_dst[order].astype(np.int32)
+        self.adj_edge = np.concatenate([np.arange(m), np.arange(m)])[order].astype(np.int32)
+        self.adj_out = np.concatenate([np.ones(m, dtype=bool), np.zeros(m, dtype=bool)])[order]
+        self.adj_indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(both_src, minlength=n), out=self.adj_indptr[1:])
+        self.out_degree = np.bincount(self.edge_src, minlength=n).astype(np.int32)
+        self.in_degree = np.bincount(self.edge_dst, minlength=n).astype(np.int32)
+
+        # Keyset pagination: node indices ordered by key, overall and per label
+        self._key_order = np.asarray(sorted(range(n), key=self.node_keys.__getitem__), dtype=np.int32)
+        self._sorted_keys = [self.node_keys[i] for i in self._key_order]
+        for code in range(len(self.label_names)):
+            order = self._key_order[self.labels[self._key_order] == code]
+            self._label_order[code] = order
+            self._label_keys[code] = [self.node_keys[i] for i in order]
+
+        degree = self.out_degree + self.in_degree
+        self._stats = {
+            "total_nodes": n,
+            "total_edges": m,
+            "node_types": {
+                name: int(count)
+                for name, count in zip(self.label_names, np.bincount(self.labels, minlength=len(self.label_names)))
+            },
+            "edge_types": {
+                name: int(count)
+                for name, count in zip(self.edge_type_names, np.bincount(self.edge_types, minlength=len(self.edge_type_names)))
+            },
+            "degree": {
+                "max": int(degree.max()) if n else 0,
+                "mean": round(float(degree.mean()), 3) if n else 0.0,
+                "p50": float(np.percentile(degree, 50)) if n else 0.0,
+                "p99": float(np.percentile(degree, 99)) if n else 0.0,
+            },
+        }
+
+    # ------------------------------------------------------------------ stats
+
+    def stats(self) -> Dict[str, Any]:
+        """Counts by label and edge type plus degree distribution (precomputed)"""
+        return {
+            **self._stats,
+            "version": self.version,
+            "built_at": self.built_at,
+            "age_seconds": round(time.time() - self.built_at, 1),
+            "memory_bytes": self.memory_bytes(),
+        }
+
+    def memory_bytes(self) -> int:
+        arrays = [
+            self.neo4j_ids, self.labels, self.edge_src, self.edge_dst, self.edge_types,
+            self.edge_weights, self.adj_indptr, self.adj_nbr, self.adj_edge, self.adj_out,
+            self.out_degree, self.in_degree, self._key_order,
+        ]
+        return int(sum(array.nbytes for array in arrays) + sum(column.nbytes for column in self.columns.values()))
+
+    # ------------------------------------------------------------------ nodes
+
+    def __len__(self) -> int:
+        return len(self.node_keys)
+
+    def resolve(self, node_id: Any) -> Optional[int]:
+        """Node index for an ``id`` property or a Neo4j internal id"""
+        index = self._key_index.get(str(node_id))
+        if index is None and str(node_id).lstrip("-").isdigit():
+            index = self._neo4j_index.get(int(node_id))
+        return index
+
+    def label(self, index: int) -> str:
+        return self.label_names[self.labels[index]]
+
+    def node_properties(self, index: int) -> Dict[str, Any]:
+        return {
+            name: column[index]
+            for name, column in self.columns.items()
+            if column[index] is not None
+        }
+
+    def node(self, index: int) -> Dict[str, Any]:
+        """Properties plus ``labels``, the shape GraphRAG paths expect"""
+        return {"id": self.node_keys[index], **self.node_properties(index), "labels": [self.label(index)]}
+
+    def edge(self, edge_index: int) -> Dict[str, Any]:
+        return {
+            "source": self.node_keys[self.edge_src[edge_index]],
+            "target": self.node_keys[self.edge_dst[edge_index]],
+            "type": self.edge_type_names[self.edge_types[edge_index]],
+            "weight": float(self.edge_weights[edge_index]),
+            **self.edge_properties.get(edge_index, {}),
+        }
+
+    def page_nodes(
+        self,
+        labels: Optional[Sequence[str]] = None,
+        after: Optional[str] = None,
+        limit: int = 200,
+        offset: int = 0,
+    ) -> Tuple[List[int], Optional[str]]:
+        """
+        Node indices ordered by key, starting after the ``after`` cursor.
+
+        Returns the page and the cursor for the next one (None on the last
+        page). Each page costs O(log n + limit) however deep it is.
+        """
+        if labels:
+            codes = [self.label_names.index(name) for name in labels if name in self.label_names]
+            merged = heapq.merge(*(self._label_stream(code, after) for code in codes))
+            page = [index for _, index in itertools.islice(merged, offset, offset + limit + 1)]
+        else:
+            start = bisect.bisect_right(self._sorted_keys, after) if after is not None else 0
+            start += offset
+            page = [int(i) for i in self._key_order[start:start + limit + 1]]
+
+        if len(page) > limit:
+            page = page[:limit]
+            return page, self.node_keys[page[-1]]
+        return page, None
+
+    def _label_stream(self, code: int, after: Optional[str]):
+        keys, order = self._label_keys[code], self._label_order[code]
+        start = bisect.bisect_right(keys, after) if after is not None else 0
+        for i in range(start, len(keys)):
+            yield keys[i], int(order[i])
+
+    # -------------------------------------------------------------- traversal
+
+    def _edge_filter(self, edge_types: Optional[Sequence[str]]) -> Optional[np.ndarray]:
+        if not edge_types:
+            return None
+        return np.asarray([self.edge_type_names.index(t) for t in edge_types if t in self.edge_type_names], dtype=np.int32)
+
+    def _label_filter(self, node_labels: Optional[Sequence[str]]) -> Optional[np.ndarray]:
+        if not node_labels:
+            return None
+        allowed = np.zeros(len(self.label_names), dtype=bool)
+        for name in node_labels:
+            if name in self.label_names:
+                allowed[self.label_names.index(name)] = True
+        return allowed
+
+    def _expand(self, frontier: np.ndarray, edge_codes, allowed_labels):
+        """All adjacency entries of ``frontier`` passing the filters: (source, position, neighbor)"""
+        starts = self.adj_indptr[frontier]
+        counts = self.adj_indptr[frontier + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, empty
+        # Concatenated ranges [start, start + count) for every frontier node
+        positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+        sources = np.repeat(frontier, counts)
+        neighbors = self.adj_nbr[positions]
+        mask = np.ones(total, dtype=bool)
+        if edge_codes is not None:
+            mask &= np.isin(self.edge_types[self.adj_edge[positions]], edge_codes)
+        if allowed_labels is not None:
+            mask &= allowed_labels[self.labels[neighbors]]
+        return sources[mask], positions[mask], neighbors[mask]
+
+    def bfs(
+        self,
+        seeds: Sequence[int],
+        max_hops: int = 2,
+        edge_types: Optional[Sequence[str]] = None,
+        node_labels: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[int], Dict[int, Tuple[int, int, int]]]:
+        """
+        Breadth-first expansion from ``seeds`` (indices), both directions.
+
+        Returns reached nodes in BFS order (seeds excluded, at most
+        ``limit``) and, per reached node, (hops, parent, adjacency position)
+        for rebuilding its shortest path. Label filters apply to reached
+        nodes, not to the seeds.
+        """
+        edge_codes = self._edge_filter(edge_types)
+        allowed = self._label_filter(node_labels)
+        if edge_types and edge_codes is not None and len(edge_codes) == 0:
+            return [], {}
+
+        frontier = np.unique(np.asarray(seeds, dtype=np.int64))
+        visited = set(frontier.tolist())
+        reached: List[int] = []
+        tree: Dict[int, Tuple[int, int, int]] = {}
+        for hop in range(1, max_hops + 1):
+            if len(frontier) == 0 or (limit is not None and len(reached) >= limit):
+                break
+            sources, positions, neighbors = self._expand(frontier, edge_codes, allowed)
+            # First occurrence of each unvisited neighbor wins (frontier order)
+            _, first = np.unique(neighbors, return_index=True)
+            next_frontier = []
+            for i in np.sort(first):
+                node = int(neighbors[i])
+                if node in visited:
+                    continue
+                visited.add(node)
+                tree[node] = (hop, int(sources[i]), int(positions[i]))
+                reached.append(node)
+                next_frontier.append(node)
+                if limit is not None and len(reached) >= limit:
+                    break
+            frontier = np.asarray(next_frontier, dtype=np.int64)
+        return reached, tree
+
+    def weighted_k_hop(
+        self,
+        seeds: Sequence[int],
+        max_hops: int = 2,
+        edge_types: Optional[Sequence[str]] = None,
+        node_labels: Optional[Sequence[str]] = None,
+        decay: float = 1.0,
+        top_k: int = 50,
+    ) -> List[Tuple[int, float]]:
+        """
+        Best path score to each node within ``max_hops``: the maximum over
+        paths of the product of edge weights, times ``decay`` per hop.
+
+        Returns the ``top_k`` (index, score) pairs, seeds excluded.
+        """
+        edge_codes = self._edge_filter(edge_types)
+        allowed = self._label_filter(node_labels)
+        seeds = np.unique(np.asarray(seeds, dtype=np.int64))
+        score = np.zeros(len(self), dtype=np.float64)
+        score[seeds] = 1.0
+        frontier = seeds
+        for _ in range(max_hops):
+            if len(frontier) == 0:
+                break
+            sources, positions, neighbors = self._expand(frontier, edge_codes, allowed)
+            if len(neighbors) == 0:
+                break
+            candidate = score[sources] * self.edge_weights[self.adj_edge[positions]] * decay
+            touched = np.unique(neighbors)
+            before = score[touched].copy()
+            np.maximum.at(score, neighbors, candidate)
+            frontier = touched[score[touched] > before]
+
+        score[seeds] = 0.0
+        reached = np.flatnonzero(score)
+        best = reached[np.argsort(-score[reached], kind="stable")][:top_k]
+        return [(int(i), float(score[i])) for i in best]
+
+    def paths(
+        self,
+        seed_ids: Sequence[Any],
+        max_hops: int = 2,
+        edge_types: Optional[Sequence[str]] = None,
+        node_labels: Optional[Sequence[str]] = None,
+        limit: int = 50,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Shortest path from the seeds to each reached node, shortest first.
+
+        Returns None if any seed is not in the snapshot (the caller should
+        ask Neo4j). Each path is {"nodes", "edges", "length", "path_id"}
+        with node and edge dicts shaped like the Cypher results.
+        """
+        seeds = [self.resolve(seed) for seed in seed_ids]
+        if not seeds or any(seed is None for seed in seeds):
+            return None
+        reached, tree = self.bfs(seeds, max_hops, edge_types, node_labels, limit)
+
+        paths = []
+        for node in reached:
+            chain, edges = [node], []
+            current = node
+            while current in tree:
+                _, parent, position = tree[current]
+                edges.append(self.edge(int(self.adj_edge[position])))
+                chain.append(parent)
+                current = parent
+            chain.reverse()
+            edges.reverse()
+            paths.append({
+                "nodes": [self.node(i) for i in chain],
+                "edges": edges,
+                "length": len(edges),
+                "path_id": f"snapshot:{self.version}:{self.node_keys[chain[0]]}:{self.node_keys[node]}",
+            })
+        return paths
+
+
+class GraphSnapshotManager:
+    """
+    Holds the current snapshot and rebuilds it in the background.
+
+    current() never blocks: it returns the last snapshot (scheduling a
+    refresh when it is older than ``refresh_seconds``) or None when there
+    is none or it is older than ``max_stale_seconds``, in which case callers
+    query Neo4j directly.
+    """
+
+    def __init__(
+        self,
+        fetch: Optional[Fetch] = None,
+        refresh_seconds: Optional[float] = None,
+        max_stale_seconds: Optional[float] = None,
+        batch_size: int = 10_000,
+        enabled: Optional[bool] = None,
+    ):
+        self.fetch = fetch or _fetch_from_neo4j
+        self.refresh_seconds = refresh_seconds or float(os.getenv("KG_SNAPSHOT_REFRESH_SECONDS", "300"))
+        self.max_stale_seconds = max_stale_seconds or 3 * self.refresh_seconds
+        self.batch_size = batch_size
+        self.enabled = enabled if enabled is not None else os.getenv("KG_SNAPSHOT_ENABLED", "true").lower() == "true"
+        self._snapshot: Optional[GraphSnapshot] = None
+        self._refreshing: Optional[asyncio.Task] = None
+        self._next_attempt_at = 0.0
+        self._version = 0
+        self._failures = 0
+
+    def current(self) -> Optional[GraphSnapshot]:
+        if not self.enabled:
+            return None
+        now = time.time()
+        snapshot = self._snapshot
+        due = snapshot is None or now - snapshot.built_at > self.refresh_seconds
+        if due and now >= self._next_attempt_at and (self._refreshing is None or self._refreshing.done()):
+            try:
+                self._refreshing = asyncio.get_running_loop().create_task(self.refresh())
+            except RuntimeError:
+                pass  # No running loop: callers outside asyncio use refresh() directly
+        if snapshot is None or now - snapshot.built_at > self.max_stale_seconds:
+            return None
+        return snapshot
+
+    async def refresh(self) -> Optional[GraphSnapshot]:
+        """Export the graph from Neo4j and swap in a new snapshot"""
+        self._next_attempt_at = time.time() + self.refresh_seconds
+        started = time.perf_counter()
+        try:
+            nodes = await self._export(NODE_EXPORT_QUERY, "nid")
+            edges = await self._export(EDGE_EXPORT_QUERY, "rid")
+            self._version += 1
+            snapshot = await asyncio.to_thread(GraphSnapshot.build, nodes, edges, self._version)
+        except Exception as e:
+            self._failures += 1
+            logger.warning("kg_snapshot_refresh_failed", error=str(e), failures=self._failures)
+            return None
+
+        self._snapshot = snapshot
+        logger.info(
+            "kg_snapshot_refreshed",
+            version=snapshot.version,
+            nodes=len(snapshot),
+            edges=len(snapshot.edge_src),
+            build_ms=round(snapshot.build_ms, 1),
+            total_ms=round((time.perf_counter() - started) * 1000, 1),
+            memory_mb=round(snapshot.memory_bytes() / 1e6, 1),
+        )
+        return snapshot
+
+    async def _export(self, query: str, id_field: str) -> List[Dict[str, Any]]:
+        """Page through an export query by Neo4j id (keyset, not SKIP)"""
+        records: List[Dict[str, Any]] = []
+        after = -1
+        while True:
+            batch = await self.fetch(query, {"after": after, "batch": self.batch_size})
+            records.extend(batch)
+            if len(batch) < self.batch_size:
+                return records
+            after = batch[-1][id_field]
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "enabled": self.enabled,
+            "loaded": snapshot is not None,
+            "refresh_seconds": self.refresh_seconds,
+            "failures": self._failures,
+            **({"snapshot": snapshot.stats()} if snapshot is not None else {}),
+        }
+
+
+async def _fetch_from_neo4j(query: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    from .clients.neo4j_client import get_neo4j_client
+
+    client = await get_neo4j_client()
+    return await client.run_query(query, params)
+
+
+_snapshot_manager: Optional[GraphSnapshotManager] = None
+
+
+def get_graph_snapshot_manager() -> GraphSnapshotManager:
+    """Get or create the knowledge graph snapshot manager singleton"""
+    global _snapshot_manager
+    if _snapshot_manager is None:
+        _snapshot_manager = GraphSnapshotManager()
+    return _snapshot_manager
+
+
+def reset_graph_snapshot_manager() -> None:
+    """Reset the manager (for tests)"""
+    global _snapshot_manager
+    _snapshot_manager = None
@@ -6,6 +6,7 @@ Extracts medical entities from text using spaCy or LLM
 from typing import List, Optional
 import structlog
 
+from core.request_memo import amemoized
 from .models import EntityExtractionResult, ExtractedEntity
 
 logger = structlog.get_logger()
@@ -92,6 +93,15 @@ class NERService:
         Returns:
             EntityExtractionResult with extracted entities
         """
+        # Graph search and skill nodes of one request share the extraction
+        key = (self.provider, text, tuple(entity_types) if entity_types else None)
+        return await amemoized("entities", key, lambda: self._extract(text, entity_types))
+
+    async def _extract(
+        self,
+        text: str,
+        entity_types: Optional[List[str]]
+    ) -> EntityExtractionResult:
         if self.provider == "spacy" and self._nlp:
             return await self._extract_with_spacy(text, entity_types)
         elif self.provider == "openai" and self._openai_client:
@@ -4,9 +4,10 @@ Combines vector, keyword, and graph search using Reciprocal Rank Fusion (RRF)
 """
 
 from typing import List, Dict
-from collections import defaultdict
 import structlog
 
+from fusion.rank_fusion import Leg, fuse
+
 from ..models import ContextChunk, FusionWeights
 
 logger = structlog.get_logger()
@@ -66,52 +67,27 @@ class HybridFusion:
             # Normalize weights
             normalized_weights = weights.normalize()
             
-            # Calculate RRF scores for each modality
-            rrf_scores: Dict[str, float] = defaultdict(float)
+            modalities = [
+                ("vector", vector_results, normalized_weights.vector),
+                ("keyword", keyword_results, normalized_weights.keyword),
+                ("graph", graph_results, normalized_weights.graph),
+            ]
             chunk_map: Dict[str, ContextChunk] = {}
+            legs = []
+            for name, results, weight in modalities:
+                if weight > 0:
+                    legs.append(self._leg(name, results, weight, chunk_map))
             
-            # Vector results
-            if normalized_weights.vector > 0:
-                self._add_rrf_scores(
-                    vector_results,
-                    rrf_scores,
-                    chunk_map,
-                    weight=normalized_weights.vector
-                )
-            
-            # Keyword results
-            if normalized_weights.keyword > 0:
-                self._add_rrf_scores(
-                    keyword_results,
-                    rrf_scores,
-                    chunk_map,
-                    weight=normalized_weights.keyword
-                )
-            
-            # Graph results
-            if normalized_weights.graph > 0:
-                self._add_rrf_scores(
-                    graph_results,
-                    rrf_scores,
-                    chunk_map,
-                    weight=normalized_weights.graph
-                )
-            
-            # Sort by RRF score
-            sorted_ids = sorted(
-                rrf_scores.keys(),
-                key=lambda x: rrf_scores[x],
-                reverse=True
-            )
+            fused = fuse(legs, method="rrf", k=self.k, top_k=top_k)
             
             # Build final results
             fused_results = []
-            for chunk_id in sorted_ids[:top_k]:
-                chunk = chunk_map[chunk_id]
+            for item in fused:
+                chunk = chunk_map[item.id]
                 
                 # Update score with RRF score
-                chunk.score = rrf_scores[chunk_id]
-                chunk.metadata['rrf_score'] = rrf_scores[chunk_id]
+                chunk.score = item.score
+                chunk.metadata['rrf_score'] = item.score
                 chunk.metadata['original_score'] = chunk.metadata.get('original_score', chunk.score)
                 
                 fused_results.append(chunk)
@@ -132,34 +108,35 @@ class HybridFusion:
             # Fallback: return vector results
             return vector_results[:top_k]
     
-    def _add_rrf_scores(
+    def _leg(
         self,
+        name: str,
         results: List[ContextChunk],
-        rrf_scores: Dict[str, float],
+        weight: float,
         chunk_map: Dict[str, ContextChunk],
-        weight: float
-    ):
+    ) -> Leg:
         """
-        Add RRF scores from one modality
+        Build the fusion leg for one modality
         
         Args:
+            name: Modality name
             results: Results from one modality
-            rrf_scores: Dict to accumulate scores
-            chunk_map: Dict to store chunks
             weight: Modality weight
+            chunk_map: Dict to store chunks
         """
-        for rank, chunk in enumerate(results, start=1):
-            # RRF formula: weight / (k + rank)
-            rrf_contribution = weight / (self.k + rank)
-            
-            # Accumulate score
-            rrf_scores[chunk.chunk_id] += rrf_contribution
-            
+        for chunk in results:
             # Store chunk (first occurrence wins for deduplication)
             if chunk.chunk_id not in chunk_map:
                 # Store original score before RRF
                 chunk.metadata['original_score'] = chunk.score
                 chunk_map[chunk.chunk_id] = chunk
+        
+        return Leg(
+            name=name,
+            ids=[chunk.chunk_id for chunk in results],
+            scores=[chunk.score for chunk in results],
+            weight=weight,
+        )
     
     def fuse_with_original_scores(
         self,
@@ -188,39 +165,31 @@ class HybridFusion:
         try:
             normalized_weights = weights.normalize()
             
-            # Accumulate weighted scores
-            weighted_scores: Dict[str, float] = defaultdict(float)
+            # CombSUM over the raw similarity scores
             chunk_map: Dict[str, ContextChunk] = {}
-            
-            # Add weighted scores from each modality
-            for chunk in vector_results:
-                weighted_scores[chunk.chunk_id] += chunk.score * normalized_weights.vector
-                if chunk.chunk_id not in chunk_map:
-                    chunk_map[chunk.chunk_id] = chunk
-            
-            for chunk in keyword_results:
-                weighted_scores[chunk.chunk_id] += chunk.score * normalized_weights.keyword
-                if chunk.chunk_id not in chunk_map:
-                    chunk_map[chunk.chunk_id] = chunk
-            
-            for chunk in graph_results:
-                weighted_scores[chunk.chunk_id] += chunk.score * normalized_weights.graph
-                if chunk.chunk_id not in chunk_map:
-                    chunk_map[chunk.chunk_id] = chunk
-            
-            # Sort by weighted score
-            sorted_ids = sorted(
-                weighted_scores.keys(),
-                key=lambda x: weighted_scores[x],
-                reverse=True
-            )
+            legs = []
+            for name, results, weight in (
+                ("vector", vector_results, normalized_weights.vector),
+                ("keyword", keyword_results, normalized_weights.keyword),
+                ("graph", graph_results, normalized_weights.graph),
+            ):
+                for chunk in results:
+                    chunk_map.setdefault(chunk.chunk_id, chunk)
+                legs.append(Leg(
+                    name=name,
+                    ids=[chunk.chunk_id for chunk in results],
+                    scores=[chunk.score for chunk in results],
+                    weight=weight,
+                ))
+            
+            fused = fuse(legs, method="combsum", top_k=top_k)
             
             # Build final results
             fused_results = []
-            for chunk_id in sorted_ids[:top_k]:
-                chunk = chunk_map[chunk_id]
-                chunk.score = weighted_scores[chunk_id]
-                chunk.metadata['weighted_score'] = weighted_scores[chunk_id]
+            for item in fused:
+                chunk = chunk_map[item.id]
+                chunk.score = item.score
+                chunk.metadata['weighted_score'] = item.score
                 fused_results.append(chunk)
             
             logger.info(
@@ -7,6 +7,7 @@ from typing import List, Optional
 import structlog
 from openai import AsyncOpenAI
 
+from core.request_memo import amemoized
 from ..models import ContextChunk, SearchSource
 from ..clients.vector_db_client import get_vector_client, VectorSearchResult
 from ..config import get_graphrag_config
@@ -96,6 +97,13 @@ class VectorSearch:
         Returns:
             Embedding vector
         """
+        return await amemoized(
+            "embedding",
+            (self.embedding_model, text),
+            lambda: self._create_embedding(text)
+        )
+
+    async def _create_embedding(self, text: str) -> List[float]:
         try:
             response = await self.openai_client.embeddings.create(
                 model=self.embedding_model,
@@ -35,16 +35,25 @@ Usage:
 
     # Get L5 tool for search/summarize tasks (L1, L2, L3 can all call)
     tool_agent = await loader.get_l5_tool("pubmed-searcher")
+
+Lookups read the shared agent catalog (services/shared/agent_catalog.py)
+when it is loaded, and only query PostgreSQL when it is not.
 """
 
 import os
-from typing import Any, Dict, List, Optional, Union
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass, field
 from enum import Enum
 import structlog
 
+from services.shared.agent_catalog import get_agent_catalog
+
 logger = structlog.get_logger()
 
+# Agents fetched directly from PostgreSQL (catalog not loaded) expire after this
+AGENT_CACHE_TTL_SECONDS = float(os.getenv("AGENT_LOADER_CACHE_TTL_SECONDS", "300"))
+
 
 def _normalize_to_list(value: Union[None, str, List[str]]) -> List[str]:
     """
@@ -167,12 +176,13 @@ class AgentLoader:
     """
 
     _instance: Optional["AgentLoader"] = None
-    _agents_cache: Dict[str, AgentConfig] = {}
-    _levels_cache: Dict[str, Dict[str, Any]] = {}
-    _initialized: bool = False
 
     def __init__(self):
         self._supabase = None
+        self._initialized = False
+        self._levels_cache: Dict[str, Dict[str, Any]] = {}
+        # agent_id -> (source row or None, config, loaded_at)
+        self._agents_cache: Dict[str, Tuple[Optional[Any], AgentConfig, float]] = {}
 
     @classmethod
     def get_instance(cls) -> "AgentLoader":
@@ -239,9 +249,24 @@ class AgentLoader:
         if not self._initialized:
             await self.initialize()
 
-        # Check cache first
-        if agent_id in self._agents_cache:
-            return self._agents_cache[agent_id]
+        cached = self._agents_cache.get(agent_id)
+        catalog = get_agent_catalog()
+
+        # Catalog path: zero I/O; rebuild only when the catalog row changed
+        if catalog is not None and catalog.ready:
+            row = catalog.get_agent(agent_id)
+            if row is not None:
+                if cached is not None and cached[0] is row:
+                    return cached[1]
+                config = self._build_config(row)
+                self._agents_cache[agent_id] = (row, config, time.monotonic())
+                return config
+
+        if cached is not None and time.monotonic() - cached[2] < AGENT_CACHE_TTL_SECONDS:
+            return cached[1]
+
+        if self._supabase is None:
+            return None
 
         try:
             response = self._supabase.table("agents").select(
@@ -260,69 +285,16 @@ class AgentLoader:
                 logger.warning("agent_loader_agent_not_found", agent_id=agent_id)
                 return None
 
-            agent_data = response.data
-
-            # Enrich with level information
-            level_number = 2  # Default to L2 Expert
-            level_name = "Expert"
-            agent_level_id = agent_data.get("agent_level_id")
-
-            if agent_level_id and agent_level_id in self._levels_cache:
-                level_info = self._levels_cache[agent_level_id]
-                level_number = level_info.get("level_number", 2)
-                level_name = level_info.get("level_name", "Expert")
-
-            config = AgentConfig(
-                id=agent_data.get("id"),
-                name=agent_data.get("name", ""),
-                slug=agent_data.get("slug", ""),
-                display_name=agent_data.get("display_name", agent_data.get("name", "")),
-                tagline=agent_data.get("tagline", ""),
-                description=agent_data.get("description", ""),
-                agent_level_id=agent_level_id,
-                level_number=level_number,
-                level_name=level_name,
-                tenant_id=agent_data.get("tenant_id"),
-                function_name=agent_data.get("function_name"),
-                department_name=agent_data.get("department_name"),
-                role_name=agent_data.get("role_name"),
-                base_model=agent_data.get("base_model") or "gpt-4o",
-                temperature=float(agent_data.get("temperature") or 0.5),
-                max_tokens=int(agent_data.get("max_tokens") or 4000),
-                context_window=int(agent_data.get("context_window") or 8000),
-                system_prompt=agent_data.get("system_prompt"),
-                system_prompt_template_id=agent_data.get("system_prompt_template_id"),
-                system_prompt_override=agent_data.get("system_prompt_override"),
-                prompt_variables=agent_data.get("prompt_variables") or {},
-                archetype_code=agent_data.get("archetype_code"),
-                expertise_level=agent_data.get("expertise_level") or "expert",
-                years_of_experience=int(agent_data.get("years_of_experience") or 10),
-                communication_style=agent_data.get("communication_style"),
-                rag_enabled=agent_data.get("rag_enabled", True),
-                websearch_enabled=agent_data.get("websearch_enabled", True),
-                tools_enabled=_normalize_to_list(agent_data.get("tools_enabled")),
-                knowledge_namespaces=agent_data.get("knowledge_namespaces") or [],
-                confidence_threshold=float(agent_data.get("confidence_threshold") or 0.85),
-                max_goal_iterations=int(agent_data.get("max_goal_iterations") or 5),
-                hitl_enabled=agent_data.get("hitl_enabled", True),
-                hitl_safety_level=agent_data.get("hitl_safety_level") or "balanced",
-                can_spawn_l2=agent_data.get("can_spawn_l2", False),
-                can_spawn_l3=agent_data.get("can_spawn_l3", False),
-                can_spawn_l4=agent_data.get("can_spawn_l4", False),
-                can_use_worker_pool=agent_data.get("can_use_worker_pool", True),
-                can_escalate_to=agent_data.get("can_escalate_to"),
-                metadata=agent_data.get("metadata") or {},
-                config=agent_data.get("config") or {},
-            )
+            config = self._build_config(response.data)
 
             # Cache the result
-            self._agents_cache[agent_id] = config
+            self._agents_cache[agent_id] = (None, config, time.monotonic())
 
             logger.info(
                 "agent_loader_agent_loaded",
                 agent_id=agent_id,
                 name=config.name,
-                level=level_number,
+                level=config.level_number,
                 model=config.base_model,
             )
 
@@ -336,6 +308,94 @@ class AgentLoader:
             )
             return None
 
+    def _build_config(self, agent_data: Dict[str, Any]) -> AgentConfig:
+        """Map an agents row to AgentConfig, enriched with level information."""
+        level_number = 2  # Default to L2 Expert
+        level_name = "Expert"
+        agent_level_id = agent_data.get("agent_level_id")
+
+        if agent_level_id and agent_level_id in self._levels_cache:
+            level_info = self._levels_cache[agent_level_id]
+            level_number = level_info.get("level_number", 2)
+            level_name = level_info.get("level_name", "Expert")
+
+        return AgentConfig(
+            id=agent_data.get("id"),
+            name=agent_data.get("name", ""),
+            slug=agent_data.get("slug", ""),
+            display_name=agent_data.get("display_name", agent_data.get("name", "")),
+            tagline=agent_data.get("tagline", ""),
+            description=agent_data.get("description", ""),
+            agent_level_id=agent_level_id,
+            level_number=level_number,
+            level_name=level_name,
+            tenant_id=agent_data.get("tenant_id"),
+            function_name=agent_data.get("function_name"),
+            department_name=agent_data.get("department_name"),
+            role_name=agent_data.get("role_name"),
+            base_model=agent_data.get("base_model") or "gpt-4o",
+            temperature=float(agent_data.get("temperature") or 0.5),
+            max_tokens=int(agent_data.get("max_tokens") or 4000),
+            context_window=int(agent_data.get("context_window") or 8000),
+            system_prompt=agent_data.get("system_prompt"),
+            system_prompt_template_id=agent_data.get("system_prompt_template_id"),
+            system_prompt_override=agent_data.get("system_prompt_override"),
+            prompt_variables=dict(agent_data.get("prompt_variables") or {}),
+            archetype_code=agent_data.get("archetype_code"),
+            expertise_level=agent_data.get("expertise_level") or "expert",
+            years_of_experience=int(agent_data.get("years_of_experience") or 10),
+            communication_style=agent_data.get("communication_style"),
+            rag_enabled=agent_data.get("rag_enabled", True),
+            websearch_enabled=agent_data.get("websearch_enabled", True),
+            tools_enabled=list(_normalize_to_list(agent_data.get("tools_enabled"))),
+            knowledge_namespaces=list(agent_data.get("knowledge_namespaces") or []),
+            confidence_threshold=float(agent_data.get("confidence_threshold") or 0.85),
+            max_goal_iterations=int(agent_data.get("max_goal_iterations") or 5),
+            hitl_enabled=agent_data.get("hitl_enabled", True),
+            hitl_safety_level=agent_data.get("hitl_safety_level") or "balanced",
+            can_spawn_l2=agent_data.get("can_spawn_l2", False),
+            can_spawn_l3=agent_data.get("can_spawn_l3", False),
+            can_spawn_l4=agent_data.get("can_spawn_l4", False),
+            can_use_worker_pool=agent_data.get("can_use_worker_pool", True),
+            can_escalate_to=agent_data.get("can_escalate_to"),
+            metadata=dict(agent_data.get("metadata") or {}),
+            config=dict(agent_data.get("config") or {}),
+        )
+
+    def _level_id(self, level_number: int) -> Optional[str]:
+        for level_id, level_info in self._levels_cache.items():
+            if level_info.get("level_number") == level_number:
+                return level_id
+        return None
+
+    def _catalog_rows(
+        self,
+        tenant_id: Optional[str],
+        agent_level_id: Optional[str] = None,
+        **equals: Any,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Active agents from the shared catalog matching the given columns.
+
+        Returns None when the catalog is not loaded (callers query the DB).
+        ``tenant_id=None`` searches every scope.
+        """
+        catalog = get_agent_catalog()
+        if catalog is None or not catalog.ready:
+            return None
+
+        if tenant_id is None:
+            rows = [r for scope in catalog.scopes() for r in catalog.snapshot(scope).select(status="active")]
+        else:
+            rows = catalog.snapshot(tenant_id).select(status="active")
+
+        if agent_level_id:
+            equals["agent_level_id"] = agent_level_id
+        return [
+            row for row in rows
+            if all(row.get(column) == value for column, value in equals.items() if value is not None)
+        ]
+
     async def get_orchestrator_for_context(
         self,
         tenant_id: str,
@@ -375,6 +435,18 @@ class AgentLoader:
                 logger.warning("agent_loader_no_l1_level_found")
                 # Fall back to any active orchestrator
 
+            rows = self._catalog_rows(
+                tenant_id, l1_level_id,
+                function_name=function_name, department_name=department_name,
+            )
+            if rows is not None:
+                if not rows:
+                    rows = [
+                        r for r in self._catalog_rows(tenant_id)
+                        if "ORCHESTRATOR" in (r.get("archetype_code") or "").upper()
+                    ]
+                return await self.get_agent(rows[0]["id"]) if rows else None
+
             # Build query
             query = self._supabase.table("agents").select(
                 "id,name,slug,display_name,function_name,department_name,"
@@ -447,6 +519,20 @@ class AgentLoader:
                     l2_level_id = level_id
                     break
 
+            rows = self._catalog_rows(
+                tenant_id, l2_level_id,
+                function_name=function_name, department_name=department_name,
+            )
+            if rows is not None:
+                if not rows:
+                    logger.warning(
+                        "agent_loader_no_expert_found",
+                        function=function_name,
+                        department=department_name,
+                    )
+                    return None
+                return await self.get_agent(rows[0]["id"])
+
             query = self._supabase.table("agents").select(
                 "id,name,slug,display_name,function_name,department_name"
             ).eq("status", "active").eq("tenant_id", tenant_id).eq(
@@ -512,14 +598,16 @@ class AgentLoader:
                 logger.warning("agent_loader_level_not_found", level=level.value)
                 return []
 
-            response = self._supabase.table("agents").select(
-                "id"
-            ).eq("status", "active").eq("tenant_id", tenant_id).eq(
-                "agent_level_id", target_level_id
-            ).limit(limit).execute()
+            rows = self._catalog_rows(tenant_id, target_level_id)
+            if rows is None:
+                rows = self._supabase.table("agents").select(
+                    "id"
+                ).eq("status", "active").eq("tenant_id", tenant_id).eq(
+                    "agent_level_id", target_level_id
+                ).limit(limit).execute().data
 
             agents = []
-            for row in response.data:
+            for row in rows[:limit]:
                 agent = await self.get_agent(row["id"])
                 if agent:
                     agents.append(agent)
@@ -590,6 +678,13 @@ class AgentLoader:
                     l5_level_id = level_id
                     break
 
+            rows = self._catalog_rows(tenant_id, l5_level_id, slug=tool_slug)
+            if rows is not None:
+                if not rows:
+                    logger.warning("agent_loader_l5_tool_not_found", slug=tool_slug)
+                    return None
+                return await self.get_agent(rows[0]["id"])
+
             query = self._supabase.table("agents").select(
                 "id,name,slug"
             ).eq("status", "active").eq("slug", tool_slug)
@@ -649,6 +744,21 @@ class AgentLoader:
             if not l5_level_id:
                 return []
 
+            rows = self._catalog_rows(tenant_id, l5_level_id)
+            if rows is not None:
+                needle = task_type.lower()
+                matches = [
+                    r for r in rows
+                    if needle in (r.get("slug") or "").lower()
+                    or needle in (r.get("archetype_code") or "").lower()
+                ]
+                tools = []
+                for row in matches[:10]:
+                    tool = await self.get_agent(row["id"])
+                    if tool:
+                        tools.append(tool)
+                return tools
+
             # Search by archetype or metadata containing task type
             query = self._supabase.table("agents").select(
                 "id"
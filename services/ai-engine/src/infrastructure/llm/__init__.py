@@ -38,6 +38,7 @@ from .tokenizer import (
     count_messages_tokens,
     get_context_window,
     truncate_to_tokens,
+    get_token_count_cache_stats,
 )
 from .client import (
     LLMConfig,
@@ -79,6 +80,7 @@ __all__ = [
     "count_messages_tokens",
     "get_context_window",
     "truncate_to_tokens",
+    "get_token_count_cache_stats",
     # Client
     "LLMConfig",
     "LLMResponse",
@@ -3,9 +3,19 @@ VITAL Path - Token Counting Utilities
 
 Provides accurate token counting for various models.
 Used for budget estimation and context window management.
+
+Encoders are loaded once per encoding (a failed load, e.g. offline, is
+remembered and falls back to estimation), and counts are memoized in an LRU
+keyed by a hash of the text, since the same retrieved chunks are counted
+again on every request that retrieves them.
 """
 
+import hashlib
 import logging
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
@@ -35,17 +45,70 @@ MODEL_ENCODINGS = {
 CHARS_PER_TOKEN = 4
 
 
+@lru_cache(maxsize=None)
+def _load_encoding(encoding_name: str):
+    try:
+        return tiktoken.get_encoding(encoding_name)
+    except Exception as e:
+        # Remembered by the cache: no download attempt per call when offline
+        logger.warning(f"tiktoken encoding {encoding_name} unavailable, using estimation: {e}")
+        return None
+
+
 def get_encoder(model: str = "gpt-4"):
     """
-    Get tiktoken encoder for a model.
+    Get tiktoken encoder for a model (loaded once per encoding).
     
-    Returns None if tiktoken is not available.
+    Returns None if tiktoken or the encoding is not available.
     """
     if not TIKTOKEN_AVAILABLE:
         return None
     
-    encoding_name = MODEL_ENCODINGS.get(model, "cl100k_base")
-    return tiktoken.get_encoding(encoding_name)
+    return _load_encoding(MODEL_ENCODINGS.get(model, "cl100k_base"))
+
+
+class TokenCountCache:
+    """LRU of token counts keyed by (encoding, text hash)"""
+
+    def __init__(self, max_entries: int = 50_000):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._counts: "OrderedDict[tuple, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(encoding: str, text: str) -> tuple:
+        return encoding, hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    def get(self, key: tuple) -> Optional[int]:
+        with self._lock:
+            count = self._counts.get(key)
+            if count is None:
+                self.misses += 1
+                return None
+            self._counts.move_to_end(key)
+            self.hits += 1
+            return count
+
+    def put(self, key: tuple, count: int) -> None:
+        with self._lock:
+            self._counts[key] = count
+            self._counts.move_to_end(key)
+            while len(self._counts) > self.max_entries:
+                self._counts.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._counts),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+_count_cache = TokenCountCache(int(os.getenv("TOKEN_COUNT_CACHE_SIZE", "50000")))
 
 
 def count_tokens(text: str, model: str = "gpt-4") -> int:
@@ -67,11 +130,21 @@ def count_tokens(text: str, model: str = "gpt-4") -> int:
     
     encoder = get_encoder(model)
     
-    if encoder:
-        return len(encoder.encode(text))
+    if encoder is None:
+        # Fallback: estimate based on character count
+        return len(text) // CHARS_PER_TOKEN
     
-    # Fallback: estimate based on character count
-    return len(text) // CHARS_PER_TOKEN
+    key = TokenCountCache.key(encoder.name, text)
+    count = _count_cache.get(key)
+    if count is None:
+        count = len(encoder.encode(text))
+        _count_cache.put(key, count)
+    return count
+
+
+def get_token_count_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counts of the token count LRU"""
+    return _count_cache.stats()
 
 
 def count_messages_tokens(
@@ -167,24 +240,25 @@ def truncate_to_tokens(
     if not text:
         return text
     
-    current_tokens = count_tokens(text, model)
-    
-    if current_tokens <= max_tokens:
-        return text
-    
     encoder = get_encoder(model)
     
     if encoder:
-        # Use tiktoken for precise truncation
+        # Use tiktoken for precise truncation (one encode of the text)
         tokens = encoder.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
         suffix_tokens = encoder.encode(suffix) if suffix else []
         
         # Leave room for suffix
-        truncated_tokens = tokens[:max_tokens - len(suffix_tokens)]
+        truncated_tokens = tokens[:max(0, max_tokens - len(suffix_tokens))]
         truncated = encoder.decode(truncated_tokens)
         
         return truncated + suffix
     
+    current_tokens = len(text) // CHARS_PER_TOKEN
+    if current_tokens <= max_tokens:
+        return text
+    
     # Fallback: estimate based on character count
     chars_per_token = len(text) / current_tokens
     target_chars = int((max_tokens - len(suffix) // CHARS_PER_TOKEN) * chars_per_token)
@@ -26,12 +26,14 @@ Naming Convention:
 """
 
 import asyncio
-from typing import Dict, Any, List, Optional, Set, Tuple
+from typing import Dict, Any, List, Optional, Set
 from enum import Enum
 from dataclasses import dataclass, field
 from datetime import datetime
 import structlog
 
+from fusion.rank_fusion import Leg, fuse
+
 # L5 Tool imports
 from agents.tools import (
     create_l5_tool,
@@ -119,15 +121,11 @@ def classify_query_intent(query: str, agent_config: Optional[Dict] = None) -> Qu
     Returns:
         QueryIntent enum value
     """
-    query_lower = query.lower()
+    from services.consultation.query_understanding import understand_query
 
-    # Score each intent based on keyword matches
+    # Score each intent based on keyword matches (shared with the other query routers)
     scores: Dict[QueryIntent, int] = {intent: 0 for intent in QueryIntent}
-
-    for intent, keywords in INTENT_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword in query_lower:
-                scores[intent] += 1
+    scores.update(understand_query(query).keyword_counts("tool_intent", INTENT_KEYWORDS))
 
     # Get max scoring intent
     max_score = max(scores.values())
@@ -604,46 +602,35 @@ class ParallelToolExecutor:
         This gives balanced weight to results from different sources while
         preferring items that appear in multiple result sets.
         """
-        # Collect all results with their ranks
-        doc_scores: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        docs: Dict[str, Dict[str, Any]] = {}
+        legs = []
 
         for tool_result in tool_results:
             if not tool_result.success:
                 continue
 
-            for rank, doc in enumerate(tool_result.results):
+            keys = []
+            for doc in tool_result.results:
                 # Create unique key (prefer URL, fallback to title hash)
-                doc_key = doc.get("url") or doc.get("id") or hash(doc.get("title", ""))
-                doc_key = str(doc_key)
-
-                # RRF score contribution
-                rrf_score = 1.0 / (self.rrf_k + rank + 1)
-
-                if doc_key in doc_scores:
-                    # Add to existing score (appears in multiple sources)
-                    existing_score, existing_doc = doc_scores[doc_key]
-                    # Merge sources
-                    existing_sources = existing_doc.get("_sources", [existing_doc.get("source")])
-                    new_source = doc.get("source")
-                    if new_source not in existing_sources:
-                        existing_sources.append(new_source)
-                    existing_doc["_sources"] = existing_sources
-                    doc_scores[doc_key] = (existing_score + rrf_score, existing_doc)
+                doc_key = str(doc.get("url") or doc.get("id") or hash(doc.get("title", "")))
+                keys.append(doc_key)
+
+                if doc_key in docs:
+                    # Merge sources (appears in multiple sources)
+                    existing_sources = docs[doc_key]["_sources"]
+                    if doc.get("source") not in existing_sources:
+                        existing_sources.append(doc.get("source"))
                 else:
                     doc["_sources"] = [doc.get("source")]
-                    doc_scores[doc_key] = (rrf_score, doc)
+                    docs[doc_key] = doc
 
-        # Sort by fused score
-        sorted_docs = sorted(
-            doc_scores.values(),
-            key=lambda x: x[0],
-            reverse=True
-        )
+            legs.append(Leg(name=tool_result.tool_key, ids=keys))
 
         # Return documents with their fused scores
         result = []
-        for score, doc in sorted_docs:
-            doc["_rrf_score"] = score
+        for item in fuse(legs, method="rrf", k=self.rrf_k):
+            doc = docs[item.id]
+            doc["_rrf_score"] = item.score
             doc["_multi_source"] = len(doc.get("_sources", [])) > 1
             result.append(doc)
 
@@ -0,0 +1,234 @@
+# PRODUCTION_TAG: PRODUCTION_READY
+# LAST_VERIFIED: 2026-10-19
+# MODES_SUPPORTED: [3, 4]
+# DEPENDENCIES: [state, research_quality]
+"""
+Concurrent post-synthesis stage for the Mode 3/4 master graph.
+
+The three post-synthesis gates (citation verification, quality gate,
+self-reflection) all read the same synthesized draft and write disjoint state
+keys, so they run as a fan-out/fan-in inside a single graph node instead of
+the strict chain synthesize -> verify_citations -> quality_gate -> reflection_gate.
+
+Merge policy (deterministic, independent of completion order):
+- Gate updates are applied in GATE_ORDER; per-gate "status" is discarded and
+  the stage sets the final mission status
+- A gate whose verdict crosses its hard-fail floor cancels the gates still
+  running; the verdict is "hard_fail"
+- Otherwise the verdict is "pass" if every gate passed, else "soft_fail"
+- A gate that raises cancels its siblings and the error propagates, matching
+  the sequential chain where a failing node aborted the mission
+
+Hard-fail floors are environment-configurable (see constants below).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import structlog
+
+from .research_quality import QUALITY_THRESHOLD, REFLECTION_THRESHOLD
+
+logger = structlog.get_logger(__name__)
+
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+GATE_ORDER: Tuple[str, ...] = ("verify_citations", "quality_gate", "reflection_gate")
+
+# Soft pass threshold for citation verification (ratio of verified citations)
+CITATION_VERIFICATION_THRESHOLD = float(os.getenv("POST_SYNTHESIS_CITATION_THRESHOLD", "0.8"))
+
+# Hard-fail floors: crossing one cancels the remaining gates
+CITATION_HARD_FAIL_RATE = float(os.getenv("POST_SYNTHESIS_CITATION_HARD_FAIL_RATE", "0.2"))
+QUALITY_HARD_FAIL_THRESHOLD = float(os.getenv("POST_SYNTHESIS_QUALITY_HARD_FAIL", "0.3"))
+
+GateFn = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+VerdictFn = Callable[[Dict[str, Any], Dict[str, Any]], Optional[str]]
+PassFn = Callable[[Dict[str, Any]], bool]
+
+
+def _citations_hard_fail(update: Dict[str, Any], state: Dict[str, Any]) -> Optional[str]:
+    citations = (state.get("final_output") or {}).get("citations") or []
+    rate = update.get("citation_verification_rate", 1.0)
+    if citations and rate < CITATION_HARD_FAIL_RATE:
+        return f"citation_verification_rate {rate:.2f} < {CITATION_HARD_FAIL_RATE:.2f}"
+    return None
+
+
+def _quality_hard_fail(update: Dict[str, Any], state: Dict[str, Any]) -> Optional[str]:
+    quality = update.get("overall_quality")
+    if quality is not None and quality < QUALITY_HARD_FAIL_THRESHOLD:
+        return f"overall_quality {quality:.2f} < {QUALITY_HARD_FAIL_THRESHOLD:.2f}"
+    return None
+
+
+HARD_FAIL_CHECKS: Dict[str, VerdictFn] = {
+    "verify_citations": _citations_hard_fail,
+    "quality_gate": _quality_hard_fail,
+    # Self-reflection is advisory and never aborts the stage
+}
+
+PASS_CHECKS: Dict[str, PassFn] = {
+    "verify_citations": lambda u: u.get("citation_verification_rate", 1.0) >= CITATION_VERIFICATION_THRESHOLD,
+    "quality_gate": lambda u: bool(u.get("quality_passed")),
+    "reflection_gate": lambda u: u.get("reflection_score", 0.0) >= REFLECTION_THRESHOLD,
+}
+
+
+# =============================================================================
+# Stage Execution
+# =============================================================================
+
+@dataclass
+class GateOutcome:
+    """Result of one gate within the concurrent stage."""
+    name: str
+    update: Dict[str, Any] = field(default_factory=dict)
+    state: str = "pending"  # passed | failed | hard_failed | cancelled
+    reason: Optional[str] = None
+    duration_ms: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"state": self.state, "reason": self.reason, "duration_ms": self.duration_ms}
+
+
+async def run_post_synthesis_gates(
+    state: Dict[str, Any],
+    gates: Dict[str, GateFn],
+    gate_order: Tuple[str, ...] = GATE_ORDER,
+    hard_fail_checks: Optional[Dict[str, VerdictFn]] = None,
+    pass_checks: Optional[Dict[str, PassFn]] = None,
+) -> Dict[str, Any]:
+    """
+    Run post-synthesis gates concurrently and merge their verdicts.
+
+    Args:
+        state: Mission state after synthesis (read-only for every gate)
+        gates: Gate name -> async node function
+        gate_order: Merge order (also the order of unknown gates' precedence)
+        hard_fail_checks: Gate name -> function returning a hard-fail reason
+        pass_checks: Gate name -> function deciding a soft pass
+
+    Returns:
+        Merged state update including a ``post_synthesis`` summary
+    """
+    hard_fail_checks = HARD_FAIL_CHECKS if hard_fail_checks is None else hard_fail_checks
+    pass_checks = PASS_CHECKS if pass_checks is None else pass_checks
+
+    stage_start = time.perf_counter()
+    outcomes = {name: GateOutcome(name=name) for name in gates}
+    started: Dict[str, float] = {}
+    task_names: Dict[asyncio.Task, str] = {}
+
+    for name, gate in gates.items():
+        started[name] = time.perf_counter()
+        task_names[asyncio.create_task(gate(state), name=f"post_synthesis:{name}")] = name
+
+    pending = set(task_names)
+    hard_fail_gate: Optional[str] = None
+
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+            # Evaluate finished gates in merge order so simultaneous
+            # completions resolve identically on every run
+            for task in sorted(done, key=lambda t: _order_index(task_names[t], gate_order)):
+                name = task_names[task]
+                outcome = outcomes[name]
+                outcome.duration_ms = int((time.perf_counter() - started[name]) * 1000)
+                outcome.update = task.result() or {}
+
+                check = hard_fail_checks.get(name)
+                reason = check(outcome.update, state) if check else None
+                if reason:
+                    outcome.state, outcome.reason = "hard_failed", reason
+                    hard_fail_gate = hard_fail_gate or name
+                else:
+                    passed = pass_checks.get(name, lambda _: True)(outcome.update)
+                    outcome.state = "passed" if passed else "failed"
+
+            if hard_fail_gate and pending:
+                await _cancel(pending, task_names, outcomes, started)
+                pending = set()
+    except BaseException:
+        # A gate raised (or we were cancelled): take the siblings down too
+        await _cancel(pending, task_names, outcomes, started)
+        raise
+
+    merged = merge_gate_outcomes(outcomes, gate_order)
+    merged["post_synthesis"]["wall_time_ms"] = int((time.perf_counter() - stage_start) * 1000)
+
+    logger.info(
+        "post_synthesis_gates_complete",
+        verdict=merged["post_synthesis"]["verdict"],
+        hard_fail_gate=hard_fail_gate,
+        wall_time_ms=merged["post_synthesis"]["wall_time_ms"],
+        gate_ms={name: o.duration_ms for name, o in outcomes.items()},
+    )
+    return merged
+
+
+def merge_gate_outcomes(
+    outcomes: Dict[str, GateOutcome],
+    gate_order: Tuple[str, ...] = GATE_ORDER,
+) -> Dict[str, Any]:
+    """
+    Combine gate outcomes into one state update (see module docstring).
+    """
+    merged: Dict[str, Any] = {}
+    ordered = sorted(outcomes.values(), key=lambda o: _order_index(o.name, gate_order))
+
+    for outcome in ordered:
+        for key, value in outcome.update.items():
+            if key != "status":
+                merged[key] = value
+
+    states = [o.state for o in ordered]
+    if "hard_failed" in states:
+        verdict = "hard_fail"
+    elif all(s == "passed" for s in states):
+        verdict = "pass"
+    else:
+        verdict = "soft_fail"
+
+    hard_fail_gate = next((o.name for o in ordered if o.state == "hard_failed"), None)
+    merged["post_synthesis"] = {
+        "verdict": verdict,
+        "hard_fail_gate": hard_fail_gate,
+        "cancelled_gates": [o.name for o in ordered if o.state == "cancelled"],
+        "gates": {o.name: o.to_dict() for o in ordered},
+    }
+    if hard_fail_gate:
+        merged["quality_passed"] = False
+    # Gates are advisory for mission completion; the verdict carries severity
+    merged["status"] = "completed"
+    return merged
+
+
+async def _cancel(
+    pending: set,
+    task_names: Dict[asyncio.Task, str],
+    outcomes: Dict[str, GateOutcome],
+    started: Dict[str, float],
+) -> None:
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    for task in pending:
+        name = task_names[task]
+        outcomes[name].state = "cancelled"
+        outcomes[name].duration_ms = int((time.perf_counter() - started[name]) * 1000)
+
+
+def _order_index(name: str, gate_order: Tuple[str, ...]) -> Tuple[int, str]:
+    return (gate_order.index(name) if name in gate_order else len(gate_order), name)
+
@@ -24,6 +24,7 @@ import functools
 import traceback
 from typing import Any, Callable, Dict, Optional, TypeVar, Union
 import structlog
+from langgraph.errors import GraphBubbleUp
 
 logger = structlog.get_logger()
 
@@ -161,6 +162,7 @@ def handle_node_errors(
     Behavior:
         - Logs all errors with structured context
         - NEVER catches asyncio.CancelledError (C5 fix)
+        - Lets LangGraph interrupts (HITL suspension) propagate unwrapped
         - Wraps errors in NodeExecutionError for consistency
         - Optionally adds error to state for recovery workflows
     """
@@ -197,6 +199,10 @@ def handle_node_errors(
                 # Already wrapped, just re-raise
                 raise
 
+            except GraphBubbleUp:
+                # interrupt() suspends the node for HITL; not an error
+                raise
+
             except Exception as exc:
                 # Log with rich context
                 state_snapshot = None
@@ -241,7 +247,7 @@ def handle_node_errors(
                 )
                 return result
 
-            except NodeExecutionError:
+            except (NodeExecutionError, GraphBubbleUp):
                 raise
 
             except Exception as exc:
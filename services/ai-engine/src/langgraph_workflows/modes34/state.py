@@ -94,3 +94,6 @@ class MissionState(TypedDict, total=False):
     overall_quality: float                       # Combined quality score
     quality_passed: bool                         # Whether quality gate passed
     quality_recommendations: List[str]           # Improvement suggestions
+
+    # === Concurrent post-synthesis stage (see post_synthesis.py) ===
+    post_synthesis: Dict[str, Any]               # Merged verdict + per-gate states
@@ -17,25 +17,29 @@ Phase 2 Enhancements:
 
 Production Hardening (Grade A):
 7. Streaming - astream_events pattern for real-time token streaming
-8. HITL - Interrupt() mechanism for human-in-the-loop checkpoints
+8. HITL - checkpoints suspend durably on the HITL service (interrupt_for_approval)
 9. Checkpointing - PostgresSaver enforcement with fallback warning
 
 Enhanced Flow:
 - initialize -> decompose_query -> plan -> select_team (mode 4) -> execute_step loop
 - After each evidence step: check confidence gate
 - If confidence < 0.8: refine_search node (up to 3 iterations)
-- After synthesis: verify_citations -> quality_gate -> reflection_gate
+- After synthesis: verify_citations, quality_gate and reflection_gate run
+  concurrently in post_synthesis_gates (sequential chain when
+  MISSION_PARALLEL_GATES=false); see post_synthesis.py for the merge policy
 - quality checkpoint every 3 steps; budget checkpoint at 80% spend (if limit set)
 - finalize with full research quality + reflection metadata
 
-Note: mission_stream currently drives orchestration; this graph is aligned for future
-LangGraph execution with pause/resume via checkpoint_pending/human_response flags.
+Note: mission_stream currently drives orchestration. In this graph, checkpoints
+suspend on the HITL service (interrupt_for_approval) and are resumed by whichever
+replica records the decision.
 """
 
 from __future__ import annotations
 
 from typing import Any, AsyncIterator, Dict, List, Optional
 
+import asyncio
 import os
 import structlog
 from langgraph.graph import StateGraph, END
@@ -56,6 +60,10 @@ except Exception:  # pragma: no cover
     Interrupt = None  # LangGraph < 0.2
     INTERRUPT_AVAILABLE = False
 
+from langchain_core.runnables import RunnableConfig
+
+from services.workflows.hitl_service import HITLCheckpoint
+
 from .state import MissionState, PlanStep
 from .wrappers.l2_wrapper import delegate_to_l2, delegate_to_l2_streaming
 from .wrappers.l3_wrapper import delegate_to_l3
@@ -101,6 +109,9 @@ from .research_quality import (
     MAX_REFLECTION_ITERATIONS,
 )
 
+# Concurrent post-synthesis stage (citations / quality / reflection fan-out)
+from .post_synthesis import run_post_synthesis_gates
+
 # Phase 1 CRITICAL Fix: Resilience Infrastructure (C1, C2, C4, C5)
 from .resilience import (
     handle_node_errors,
@@ -111,6 +122,9 @@ from .resilience import (
 
 logger = structlog.get_logger(__name__)
 
+# Run post-synthesis gates concurrently (set to "false" for the sequential chain)
+PARALLEL_POST_SYNTHESIS_GATES = os.getenv("MISSION_PARALLEL_GATES", "true").lower() == "true"
+
 
 class WorkflowCheckpointerFactory:
     """
@@ -241,7 +255,27 @@ def _get_checkpointer():
     return WorkflowCheckpointerFactory.create(mission_id="workflow_graph")
 
 
-def build_master_graph() -> CompiledStateGraph:
+# Name the master graph is registered under with the HITL service, so any
+# replica can resume a mission suspended at a checkpoint (api/lifespan.py)
+MASTER_GRAPH_NAME = "unified_autonomous_workflow"
+
+# Mission checkpoint type -> HITL checkpoint type (default PLAN_APPROVAL)
+_CHECKPOINT_TYPES = {
+    "budget": HITLCheckpoint.CRITICAL_DECISION,
+}
+
+
+def build_master_graph(parallel_gates: Optional[bool] = None) -> CompiledStateGraph:
+    """
+    Build and compile the Mode 3/4 master graph.
+
+    Args:
+        parallel_gates: Run post-synthesis gates concurrently in a single
+            post_synthesis_gates node. Defaults to MISSION_PARALLEL_GATES.
+    """
+    if parallel_gates is None:
+        parallel_gates = PARALLEL_POST_SYNTHESIS_GATES
+
     graph = StateGraph(MissionState)
 
     @handle_node_errors("initialize", recoverable=True)
@@ -634,10 +668,8 @@ def build_master_graph() -> CompiledStateGraph:
         }
 
     @handle_node_errors("checkpoint", recoverable=True)
-    async def _checkpoint(state: MissionState) -> Dict[str, Any]:
-        if state.get("checkpoint_pending") and not state.get("human_response"):
-            return {"status": "awaiting_checkpoint"}
-        return {"status": "running", "checkpoint_pending": None, "human_response": None}
+    async def _checkpoint(state: MissionState, config: RunnableConfig) -> Dict[str, Any]:
+        return await hitl_checkpoint(state, config)
 
     @handle_node_errors("synthesize", recoverable=False)
     async def _synthesize(state: MissionState) -> Dict[str, Any]:
@@ -1020,8 +1052,10 @@ def build_master_graph() -> CompiledStateGraph:
                     overall=state.get("overall_confidence", 0.0),
                 )
 
-        # Check reflection gate
-        reflection_result = check_reflection_gate(
+        # Check reflection gate (CPU-bound heuristics; off the event loop so
+        # concurrent gates keep awaiting their LLM/HTTP calls)
+        reflection_result = await asyncio.to_thread(
+            check_reflection_gate,
             content=content,
             query=goal,
             previous_reflections=previous_reflections,
@@ -1044,6 +1078,24 @@ def build_master_graph() -> CompiledStateGraph:
             "status": "completed",
         }
 
+    # =========================================================================
+    # Concurrent Post-Synthesis Stage (Enhancements 4, 5, 6)
+    # =========================================================================
+    @handle_node_errors("post_synthesis_gates", recoverable=True)
+    async def _post_synthesis_gates(state: MissionState) -> Dict[str, Any]:
+        """
+        Fan out citation verification, quality gate and self-reflection over
+        the same draft, then merge their verdicts deterministically.
+        """
+        return await run_post_synthesis_gates(
+            state,
+            {
+                "verify_citations": _verify_citations,
+                "quality_gate": _quality_gate,
+                "reflection_gate": _reflection_gate,
+            },
+        )
+
     # =========================================================================
     # Register All Nodes
     # =========================================================================
@@ -1055,9 +1107,12 @@ def build_master_graph() -> CompiledStateGraph:
     graph.add_node("confidence_gate", _confidence_gate)  # Enhancement 1 & 3
     graph.add_node("checkpoint", _checkpoint)
     graph.add_node("synthesize", _synthesize)
-    graph.add_node("verify_citations", _verify_citations)  # Enhancement 4
-    graph.add_node("quality_gate", _quality_gate)  # Enhancement 5
-    graph.add_node("reflection_gate", _reflection_gate)  # Enhancement 6 (Phase 2)
+    if parallel_gates:
+        graph.add_node("post_synthesis_gates", _post_synthesis_gates)  # Enhancements 4-6
+    else:
+        graph.add_node("verify_citations", _verify_citations)  # Enhancement 4
+        graph.add_node("quality_gate", _quality_gate)  # Enhancement 5
+        graph.add_node("reflection_gate", _reflection_gate)  # Enhancement 6 (Phase 2)
 
     # =========================================================================
     # Enhanced Routing Functions for Phase 1 Enhancements
@@ -1134,11 +1189,11 @@ def build_master_graph() -> CompiledStateGraph:
     # Conditional routing function for checkpoint
     def _route_after_checkpoint(state: MissionState) -> str:
         """Route based on checkpoint resolution."""
-        # If still awaiting, stay in checkpoint (will be handled by interrupt_before)
-        if state.get("status") == "awaiting_checkpoint":
-            return "checkpoint"
+        # Rejected or expired: stop the mission
+        if state.get("status") == "failed":
+            return "end"
 
-        # Checkpoint resolved, go to confidence gate
+        # Checkpoint approved, go to confidence gate
         return "confidence_gate"
 
     # Conditional routing for verification phase (after synthesis)
@@ -1180,33 +1235,37 @@ def build_master_graph() -> CompiledStateGraph:
         }
     )
 
-    # Checkpoint -> confidence gate OR execute
+    # Checkpoint -> confidence gate OR end (rejected)
     graph.add_conditional_edges(
         "checkpoint",
         _route_after_checkpoint,
         {
-            "checkpoint": "checkpoint",
+            "end": END,
             "confidence_gate": "confidence_gate",
         }
     )
 
-    # Synthesis -> Citation Verification (Enhancement 4) -> Quality Gate (Enhancement 5)
-    graph.add_edge("synthesize", "verify_citations")
-    graph.add_edge("verify_citations", "quality_gate")
-    graph.add_edge("quality_gate", "reflection_gate")  # Enhancement 6: Add reflection
-    graph.add_edge("reflection_gate", END)  # Final step after reflection
+    if parallel_gates:
+        # Synthesis -> concurrent Citation/Quality/Reflection gates -> END
+        graph.add_edge("synthesize", "post_synthesis_gates")
+        graph.add_edge("post_synthesis_gates", END)
+    else:
+        # Synthesis -> Citation Verification (Enhancement 4) -> Quality Gate (Enhancement 5)
+        graph.add_edge("synthesize", "verify_citations")
+        graph.add_edge("verify_citations", "quality_gate")
+        graph.add_edge("quality_gate", "reflection_gate")  # Enhancement 6: Add reflection
+        graph.add_edge("reflection_gate", END)  # Final step after reflection
 
     checkpointer = _get_checkpointer()
-    compiled = graph.compile(
-        checkpointer=checkpointer,
-        interrupt_before=["checkpoint"],  # allow HITL pause
-    )
+    # The checkpoint node suspends itself via interrupt_for_approval
+    compiled = graph.compile(checkpointer=checkpointer)
     logger.info(
         "master_graph_compiled",
         nodes=list(graph.nodes),
         checkpointer=type(checkpointer).__name__,
         hitl_enabled=True,
         interrupt_nodes=["checkpoint"],
+        parallel_gates=parallel_gates,
     )
     return compiled
 
@@ -1360,8 +1419,9 @@ async def resume_mission_with_input(
             # Use Command pattern for proper HITL resume
             try:
                 from langgraph.types import Command
+                # The checkpoint node receives the response as interrupt()'s value
                 async for event in compiled_graph.astream(
-                    Command(resume=update_state),
+                    Command(resume=human_response),
                     config=config,
                 ):
                     yield {"type": "state_update", "data": event}
@@ -1388,84 +1448,64 @@ async def resume_mission_with_input(
 
 
 # =============================================================================
-# Production Hardening: Checkpoint HITL Node with Interrupt()
+# Production Hardening: Checkpoint HITL Node (durable suspension)
 # =============================================================================
 
-def create_hitl_checkpoint_node():
+async def hitl_checkpoint(state: MissionState, config: RunnableConfig) -> Dict[str, Any]:
     """
-    Create a checkpoint node that uses Interrupt() for proper HITL.
+    Suspend the mission on the HITL service until the pending checkpoint is decided.
 
-    Production Hardening:
-    - Uses Interrupt() when available (LangGraph 0.2+)
-    - Falls back to checkpoint_pending flag for older versions
-    - Structured logging for debugging
+    interrupt_for_approval persists the approval and interrupts the thread;
+    whichever replica receives the decision resumes it through the graph
+    registered as MASTER_GRAPH_NAME, and the node re-runs to apply it.
 
     Returns:
-        Async node function for checkpoint handling
+        State update: running when approved, failed when rejected or expired
     """
-    async def _hitl_checkpoint(state: MissionState) -> Dict[str, Any]:
-        """
-        HITL checkpoint node with Interrupt() mechanism.
-
-        When checkpoint_pending is set:
-        1. If Interrupt available: raises Interrupt() to pause graph
-        2. If not: sets status to awaiting_checkpoint for manual handling
-
-        When human_response is provided:
-        1. Validates the response
-        2. Applies approval/rejection logic
-        3. Clears checkpoint_pending
-        """
-        checkpoint_reason = state.get("checkpoint_pending")
-        human_response = state.get("human_response")
-
-        # If we have a human response, process it
-        if human_response:
-            approved = human_response.get("approved", False)
-            feedback = human_response.get("feedback", "")
-
-            logger.info(
-                "hitl_checkpoint_response_received",
-                approved=approved,
-                has_feedback=bool(feedback),
-                checkpoint_reason=checkpoint_reason,
-            )
-
-            return {
-                "human_response": None,  # Clear response
-                "checkpoint_pending": None,  # Clear pending
-                "status": "executing" if approved else "paused",
-                "checkpoint_feedback": feedback,
-            }
+    pending = state.get("checkpoint_pending")
+    if not pending:
+        return {"status": "running", "checkpoint_pending": None, "human_response": None}
 
-        # No response yet - need to interrupt for human input
-        if checkpoint_reason:
-            logger.info(
-                "hitl_checkpoint_awaiting_input",
-                reason=checkpoint_reason,
-                interrupt_available=INTERRUPT_AVAILABLE,
-            )
+    from services.workflows.hitl_websocket_service import get_enhanced_hitl_service
+
+    hitl = await get_enhanced_hitl_service()
+    decision = await hitl.interrupt_for_approval(
+        checkpoint_type=_CHECKPOINT_TYPES.get(pending.get("type"), HITLCheckpoint.PLAN_APPROVAL),
+        request_data={
+            **pending,
+            "mission_id": state.get("mission_id"),
+            "current_step": state.get("current_step", 0),
+            "total_steps": state.get("total_steps") or len(state.get("plan") or []),
+            "current_cost": state.get("current_cost") or 0.0,
+        },
+        config=config,
+        tenant_id=state.get("tenant_id") or "default",
+        graph=MASTER_GRAPH_NAME,
+        checkpoint_id=pending.get("id") or f"cp_{state.get('current_step', 0)}",
+        user_id=state.get("user_id"),
+    )
 
-            if INTERRUPT_AVAILABLE and Interrupt is not None:
-                # Raise Interrupt to pause the graph properly
-                raise Interrupt({
-                    "reason": checkpoint_reason,
-                    "state_summary": {
-                        "current_step": state.get("current_step", 0),
-                        "total_steps": state.get("total_steps", 0),
-                        "overall_confidence": state.get("overall_confidence", 0.0),
-                        "current_cost": state.get("current_cost", 0.0),
-                    },
-                    "options": ["approve", "reject", "modify"],
-                })
+    logger.info(
+        "hitl_checkpoint_decided",
+        checkpoint_id=pending.get("id"),
+        approved=decision.get("approved"),
+        decision_status=decision.get("status"),
+    )
+    checkpoints = list(state.get("checkpoints") or [])
+    checkpoints.append({**pending, "decision": decision})
+    return {
+        "status": "running" if decision.get("approved") else "failed",
+        "checkpoint_pending": None,
+        "human_response": decision,
+        "checkpoints": checkpoints,
+    }
 
-            # Fallback for older LangGraph - set awaiting status
-            return {
-                "status": "awaiting_checkpoint",
-                "checkpoint_pending": checkpoint_reason,
-            }
 
-        # No checkpoint pending, continue
-        return {"status": "executing"}
+def create_hitl_checkpoint_node():
+    """
+    Create a checkpoint node for graphs registered with the HITL service.
 
-    return _hitl_checkpoint
+    Returns:
+        Async node function (state, config) for checkpoint handling
+    """
+    return hitl_checkpoint
@@ -8,6 +8,7 @@ from typing import Any, Dict
 from uuid import uuid4
 import structlog
 
+from services.agents.execution_supervisor import BudgetExceeded, ExecutionNode, get_execution_supervisor
 from services.workflows.deepagents_tools import VirtualFilesystem
 from .utils import make_config
 from services.workflows.runner_registry import runner_registry
@@ -27,6 +28,25 @@ async def delegate_to_l3(
     """
     Wrapper for L3 specialists.
     """
+    supervisor = get_execution_supervisor()
+    async with supervisor.delegation(f"L3:{specialist_code}") as node:
+        result = await _delegate_to_l3(node, specialist_code=specialist_code, task=task, context=context)
+        try:
+            node.charge(tokens=int(result.get("tokens") or 0), cost_usd=float(result.get("cost") or 0.0))
+        except BudgetExceeded as exc:
+            # The work is already paid for; the mission's remaining delegations are refused
+            logger.warning("l3_execution_budget_exhausted", specialist_code=specialist_code, limit=exc.limit, error=str(exc))
+            result["budget_exhausted"] = True
+        return result
+
+
+async def _delegate_to_l3(
+    node: ExecutionNode,
+    *,
+    specialist_code: str,
+    task: str,
+    context: Dict[str, Any] | None = None,
+) -> Dict[str, Any]:
     logger.info("modes34_delegate_to_l3", specialist_code=specialist_code, task=task)
 
     specialist_cls = get_l3_class(specialist_code)
@@ -75,7 +95,8 @@ async def delegate_to_l3(
             l5_summary.raw_results.extend(l5_plan_summary.raw_results)
 
     try:
-        result = await expert.execute(task=task, params={"query": task, "runner": runner}, context=exec_context)
+        async with node.slot():
+            result = await expert.execute(task=task, params={"query": task, "runner": runner}, context=exec_context)
     except Exception as exc:
         logger.error(
             "l3_specialist_execution_failed",
@@ -11,6 +11,7 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 from uuid import uuid4
 
+from services.agents.execution_supervisor import BudgetExceeded, ExecutionNode, get_execution_supervisor
 from services.workflows.deepagents_tools import VirtualFilesystem
 from services.workflows.runner_registry import runner_registry
 from .registry import get_l4_class
@@ -63,6 +64,25 @@ async def delegate_to_l4(
     """
     Wrapper for L4 workers with real L5 tool execution and cost rollup.
     """
+    supervisor = get_execution_supervisor()
+    async with supervisor.delegation(f"L4:{worker_code}") as node:
+        result = await _delegate_to_l4(node, worker_code=worker_code, task=task, context=context)
+        try:
+            node.charge(tokens=int(result.get("tokens") or 0), cost_usd=float(result.get("cost") or 0.0))
+        except BudgetExceeded as exc:
+            # The work is already paid for; the mission's remaining delegations are refused
+            logger.warning("l4_execution_budget_exhausted", worker=worker_code, limit=exc.limit, error=str(exc))
+            result["budget_exhausted"] = True
+        return result
+
+
+async def _delegate_to_l4(
+    node: ExecutionNode,
+    *,
+    worker_code: str,
+    task: str,
+    context: Dict[str, Any] | None = None,
+) -> Dict[str, Any]:
     logger.info("modes34_delegate_to_l4", worker=worker_code, task=task)
     context = context or {}
     runner = _pick_runner(worker_code, stage=context.get("stage"))
@@ -118,12 +138,13 @@ async def delegate_to_l4(
         )
 
     try:
-        worker_result = await invoke_llm_with_timeout(
-            llm_callable=_execute_worker,
-            timeout_seconds=L4_WORKER_TIMEOUT,  # Environment-configurable (default: 60s)
-            max_retries=L4_WORKER_MAX_RETRIES,  # Environment-configurable (default: 3)
-            operation_name=f"L4_{worker_code}",
-        )
+        async with node.slot():
+            worker_result = await invoke_llm_with_timeout(
+                llm_callable=_execute_worker,
+                timeout_seconds=L4_WORKER_TIMEOUT,  # Environment-configurable (default: 60s)
+                max_retries=L4_WORKER_MAX_RETRIES,  # Environment-configurable (default: 3)
+                operation_name=f"L4_{worker_code}",
+            )
     except asyncio.CancelledError:
         # CRITICAL C5: NEVER swallow CancelledError
         logger.warning(
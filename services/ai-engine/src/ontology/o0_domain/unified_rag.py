@@ -24,6 +24,7 @@ from langchain_core.documents import Document
 import numpy as np
 
 from services.supabase_client import SupabaseClient
+from services.shared.agent_catalog import get_agent_catalog
 try:
     from services.neo4j_client import Neo4jClient
     NEO4J_AVAILABLE = True
@@ -999,10 +1000,24 @@ class UnifiedRAGService:
             logger.error("❌ Re-ranking failed", error=str(e))
             return results[:max_results]
 
+    async def _get_agent_row(self, agent_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Agent row from the shared agent catalog, else Supabase.
+
+        The catalog is keyed by id; names (accepted by get_agent_by_id) and
+        rows it has not picked up yet fall through to the database.
+        """
+        catalog = get_agent_catalog()
+        if catalog is not None and catalog.ready:
+            row = catalog.get_agent(agent_id)
+            if row is not None:
+                return row
+        return await self.supabase.get_agent_by_id(agent_id)
+
     async def _get_agent_domains(self, agent_id: str) -> Optional[List[str]]:
         """Get preferred domains for an agent"""
         try:
-            agent = await self.supabase.get_agent_by_id(agent_id)
+            agent = await self._get_agent_row(agent_id)
             if agent:
                 # Extract domain preferences from agent metadata
                 domains = agent.get("domains") or agent.get("preferred_domains")
@@ -1026,7 +1041,7 @@ class UnifiedRAGService:
             List of KD-* namespace strings or None if not configured
         """
         try:
-            agent = await self.supabase.get_agent_by_id(agent_id)
+            agent = await self._get_agent_row(agent_id)
             if agent:
                 # Prefer normalized column, fallback to JSONB metadata for backward compatibility
                 namespaces = agent.get("knowledge_namespaces")
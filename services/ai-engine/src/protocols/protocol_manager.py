@@ -14,6 +14,7 @@ import json
 
 from .pharma_protocol import PHARMAProtocol, PHARMAValidationResult
 from .verify_protocol import VERIFYProtocol, VERIFYValidationResult
+from services.shared.capability_catalog import CapabilityCatalog, CatalogEntry, get_capability_catalog
 
 logger = structlog.get_logger()
 
@@ -112,10 +113,11 @@ class TemplateRegistry:
     Registry of pharmaceutical document templates linked to PHARMA framework
     """
     
-    def __init__(self):
+    def __init__(self, catalog: Optional[CapabilityCatalog] = None):
         """Initialize template registry"""
         self.logger = structlog.get_logger()
         self.templates: Dict[str, DocumentTemplate] = {}
+        self.catalog = catalog if catalog is not None else get_capability_catalog()
         self._initialize_templates()
     
     def _initialize_templates(self):
@@ -576,6 +578,18 @@ class TemplateRegistry:
     def register_template(self, template: DocumentTemplate):
         """Register a new template"""
         self.templates[template.id] = template
+        self.catalog.upsert(CatalogEntry(
+            kind="template",
+            id=template.id,
+            name=template.name,
+            description=f"{template.purpose} {' '.join(template.tags)}",
+            facets={
+                "document_type": template.document_type,
+                "region": template.regulatory_region.value if template.regulatory_region else "global",
+                "tags": template.tags,
+            },
+            payload=template,
+        ))
         self.logger.info(f"Registered template: {template.name} ({template.id})")
     
     def get_template(self, template_id: str) -> Optional[DocumentTemplate]:
@@ -586,21 +600,27 @@ class TemplateRegistry:
         self,
         document_type: Optional[DocumentType] = None,
         regulatory_region: Optional[RegulatoryRegion] = None,
-        tags: Optional[List[str]] = None
+        tags: Optional[List[str]] = None,
+        query: Optional[str] = None
     ) -> List[DocumentTemplate]:
-        """Search templates by criteria"""
-        results = list(self.templates.values())
-        
-        if document_type:
-            results = [t for t in results if t.document_type == document_type]
-        
-        if regulatory_region:
-            results = [t for t in results if t.regulatory_region == regulatory_region]
+        """Search templates by criteria, ranked by relevance when a query is given"""
+        hits = self.catalog.search(
+            query or "",
+            kind="template",
+            filters={
+                "document_type": document_type,
+                "region": regulatory_region,
+                "tags": tags,
+            },
+            limit=None,
+        )
         
-        if tags:
-            results = [t for t in results if any(tag in t.tags for tag in tags)]
+        if not query:
+            # Preserve registration order for pure facet filtering
+            matched = {hit.entry.id for hit in hits}
+            return [t for tid, t in self.templates.items() if tid in matched]
         
-        return results
+        return [self.templates[hit.entry.id] for hit in hits if hit.entry.id in self.templates]
     
     def list_all_templates(self) -> Dict[str, str]:
         """List all available templates"""
@@ -30,12 +30,27 @@ Usage:
 """
 
 # Re-export key services for convenience
-from .shared import LLMService, EmbeddingService, SessionMemoryService
-from .runner_execution_service import (
-    RunnerExecutionService,
-    get_runner_execution_service,
-    ExecutionResult,
-)
+from importlib import import_module
+
+# Resolved on first access so that importing any services.* module does not
+# load the whole shared layer (see services.shared)
+_EXPORTS = {
+    "LLMService": ".shared",
+    "EmbeddingService": ".shared",
+    "SessionMemoryService": ".shared",
+    "RunnerExecutionService": ".runner_execution_service",
+    "get_runner_execution_service": ".runner_execution_service",
+    "ExecutionResult": ".runner_execution_service",
+}
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "LLMService",
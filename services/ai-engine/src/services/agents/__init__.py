@@ -21,6 +21,7 @@ from .agent_db_skills_service import AgentDBSkillsService
 from .agent_enrichment_service import AgentEnrichmentService
 from .unified_agent_loader import UnifiedAgentLoader
 from .sub_agent_spawner import SubAgentSpawner
+from .execution_supervisor import ExecutionSupervisor
 from .hybrid_agent_search import HybridAgentSearch
 from .medical_affairs_agent_selector import MedicalAffairsAgentSelector
 from .recommendation_engine import RecommendationEngine
@@ -36,6 +37,7 @@ __all__ = [
     "AgentEnrichmentService",
     "UnifiedAgentLoader",
     "SubAgentSpawner",
+    "ExecutionSupervisor",
     "HybridAgentSearch",
     "MedicalAffairsAgentSelector",
     "RecommendationEngine",
@@ -51,6 +51,8 @@ import uuid
 import json
 import os
 
+from services.agents.execution_supervisor import BudgetExceeded, get_execution_supervisor
+
 logger = structlog.get_logger()
 
 # Supabase client for reading agent metadata
@@ -1216,6 +1218,19 @@ class AgentHierarchyService:
             )
             return []
 
+        # The mission's execution budget (depth, agents, tokens, cancellation)
+        # bounds delegation across all services, not just this hierarchy
+        try:
+            get_execution_supervisor().check_capacity()
+        except BudgetExceeded as e:
+            logger.warning(
+                "Delegation refused by execution budget",
+                agent_id=request.from_agent_id,
+                limit=e.limit,
+                error=str(e)
+            )
+            return []
+
         # Can't delegate below Tool level
         if request.target_level.value > AgentLevel.TOOL.value:
             logger.error("Cannot delegate below Tool level")
@@ -8,6 +8,8 @@ needed by the Mode 1/2 workflows.
 from typing import Any, Dict, List, Optional
 import structlog
 
+from core.request_memo import amemoized
+
 logger = structlog.get_logger()
 
 
@@ -59,6 +61,9 @@ class AgentOrchestrator:
         if agent_id in self._agent_cache:
             return self._agent_cache[agent_id]
 
+        return await amemoized("agent", agent_id, lambda: self._fetch_agent(agent_id))
+
+    async def _fetch_agent(self, agent_id: str) -> Optional[Dict[str, Any]]:
         try:
             result = self.supabase.table("agents").select("*").eq("id", agent_id).single().execute()
 
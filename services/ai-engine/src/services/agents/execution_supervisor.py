@@ -0,0 +1,515 @@
+"""
+VITAL Path - Hierarchical Sub-Agent Execution Supervisor
+
+Bounds and supervises the L1-L5 delegation tree. Without it every
+``delegate_to_l3`` / ``delegate_to_l4`` / ``execute_parallel`` call fans out
+independently: recursive delegation multiplies, nothing caps concurrent LLM
+calls across missions, and cancelling a mission (or an SSE client going away)
+leaves the children it spawned burning tokens.
+
+Key Features:
+- Structured concurrency: a mission is a root scope, each delegation a child
+  scope; tasks spawned in a scope are awaited (or cancelled on error) before
+  the scope exits, so no child outlives its parent
+- Depth, breadth (concurrent children per node) and agent-count budgets per
+  mission; token and cost budgets checked against every ancestor, so a
+  child can never spend more than its mission has left
+- Process-wide cap on concurrent leaf executions (LLM calls), held only
+  around leaf work so nested delegations cannot deadlock on it
+- Cascading cancellation: cancelling a mission cancels every task in its tree
+- Orphan reaping: missions whose lease expired, or whose liveness check says
+  they were cancelled elsewhere (another replica), are cancelled
+
+Usage:
+    supervisor = get_execution_supervisor()
+
+    async with supervisor.mission(mission_id, ExecutionBudget(max_cost_usd=5.0)):
+        ...
+
+    # Inside any delegation wrapper
+    async with supervisor.delegation(f"L4:{worker_id}") as node:
+        async with node.slot():
+            result = await worker.execute(task)
+        node.charge(tokens=result.tokens, cost_usd=result.cost)
+
+    # From the cancel endpoint
+    supervisor.cancel(mission_id, reason="user_cancelled")
+"""
+
+import asyncio
+import inspect
+import os
+import time
+import uuid
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Union
+
+import structlog
+
+logger = structlog.get_logger()
+
+_current_node: ContextVar[Optional["ExecutionNode"]] = ContextVar("execution_node", default=None)
+
+# Returns False once the mission should no longer run (e.g. cancelled in the DB)
+Liveness = Callable[[], Union[bool, Awaitable[bool]]]
+
+
+@dataclass
+class ExecutionBudget:
+    """Limits for one mission's delegation tree (None disables a limit)"""
+
+    max_depth: int = 4
+    max_breadth: int = 8
+    max_agents: int = 64
+    max_tokens: Optional[int] = None
+    max_cost_usd: Optional[float] = None
+
+
+class BudgetExceeded(Exception):
+    """A delegation would exceed its mission's depth, agent, token or cost budget"""
+
+    def __init__(self, limit: str, node_id: str, message: str):
+        self.limit = limit
+        self.node_id = node_id
+        super().__init__(message)
+
+
+class ExecutionNode:
+    """One scope in a mission's delegation tree"""
+
+    def __init__(
+        self,
+        supervisor: "ExecutionSupervisor",
+        label: str,
+        parent: Optional["ExecutionNode"] = None,
+        budget: Optional[ExecutionBudget] = None,
+        max_tokens: Optional[int] = None,
+        max_cost_usd: Optional[float] = None,
+    ):
+        self.supervisor = supervisor
+        self.node_id = f"{label}:{uuid.uuid4().hex[:8]}"
+        self.label = label
+        self.parent = parent
+        self.root: ExecutionNode = parent.root if parent else self
+        self.depth = parent.depth + 1 if parent else 0
+        self.budget = budget or (parent.budget if parent else ExecutionBudget())
+        self.max_tokens = max_tokens
+        self.max_cost_usd = max_cost_usd
+        self.owner = asyncio.current_task()
+        self.children: Set[ExecutionNode] = set()
+        self.tasks: Set[asyncio.Task] = set()
+        self.tokens_used = 0
+        self.cost_usd = 0.0
+        self.cancel_reason: Optional[str] = None
+        self.exhausted: Optional[BudgetExceeded] = None
+        self._breadth = asyncio.Semaphore(self.budget.max_breadth)
+        # Root-only bookkeeping
+        self.agents_spawned = 0
+        self.peak_depth = 0
+        self.lease_expires_at: Optional[float] = None
+        self.liveness: Optional[Liveness] = None
+
+    # ---------------------------------------------------------------- budgets
+
+    def remaining_tokens(self) -> Optional[int]:
+        """Tokens this node may still spend before it or an ancestor runs out"""
+        return _min_remaining((node._token_limit(), node.tokens_used) for node in self._lineage())
+
+    def remaining_cost_usd(self) -> Optional[float]:
+        """Cost this node may still incur before it or an ancestor runs out"""
+        return _min_remaining((node._cost_limit(), node.cost_usd) for node in self._lineage())
+
+    def charge(self, tokens: int = 0, cost_usd: float = 0.0) -> None:
+        """
+        Record usage against this node and every ancestor.
+
+        Raises BudgetExceeded when any of them goes over; that node's
+        subtree is then cancelled and refuses further delegations.
+        """
+        exceeded = None
+        for node in self._lineage():
+            node.tokens_used += tokens
+            node.cost_usd += cost_usd
+            token_limit, cost_limit = node._token_limit(), node._cost_limit()
+            if token_limit is not None and node.tokens_used > token_limit:
+                exceeded = (node, "tokens", f"{node.tokens_used} tokens > {token_limit}")
+            elif cost_limit is not None and node.cost_usd > cost_limit:
+                exceeded = (node, "cost", f"${node.cost_usd:.4f} > ${cost_limit:.4f}")
+
+        if exceeded is not None:
+            # The outermost node over budget decides how much of the tree stops
+            node, limit, detail = exceeded
+            error = BudgetExceeded(limit, node.node_id, f"{node.label} over {limit} budget: {detail}")
+            node._exhaust(error)
+            raise error
+
+    def check_open(self) -> None:
+        """Raise if this node or an ancestor was cancelled or ran out of budget"""
+        for node in self._lineage():
+            if node.exhausted is not None:
+                raise node.exhausted
+            if node.cancel_reason is not None:
+                raise asyncio.CancelledError(node.cancel_reason)
+
+    # ------------------------------------------------------------------ tasks
+
+    def spawn(self, coro: Awaitable[Any], name: Optional[str] = None) -> asyncio.Task:
+        """Run ``coro`` as a task owned by this scope"""
+        try:
+            self.check_open()
+        except BaseException:
+            if inspect.iscoroutine(coro):
+                coro.close()
+            raise
+        task = asyncio.ensure_future(coro)
+        if name:
+            task.set_name(name)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one of the process-wide leaf execution slots"""
+        self.check_open()
+        async with self.supervisor._slots:
+            self.supervisor._slots_in_use += 1
+            try:
+                yield
+            finally:
+                self.supervisor._slots_in_use -= 1
+
+    def cancel(self, reason: str) -> int:
+        """Cancel every task in this subtree; returns how many were cancelled"""
+        cancelled = 0
+        current = asyncio.current_task()
+        for node in self._subtree():
+            node.cancel_reason = node.cancel_reason or reason
+            owned = set(node.tasks)
+            if node.owner is not None:
+                owned.add(node.owner)
+            for task in owned:
+                if task is not current and not task.done():
+                    task.cancel(reason)
+                    cancelled += 1
+        return cancelled
+
+    async def close(self, error: Optional[BaseException] = None) -> None:
+        """Settle spawned tasks: wait for them, or cancel them if the scope failed"""
+        if not self.tasks:
+            return
+        if error is not None or self.cancel_reason is not None:
+            for task in self.tasks:
+                task.cancel()
+        await asyncio.gather(*list(self.tasks), return_exceptions=True)
+
+    # -------------------------------------------------------------- internals
+
+    def _token_limit(self) -> Optional[int]:
+        return self.max_tokens if self.parent else self.budget.max_tokens
+
+    def _cost_limit(self) -> Optional[float]:
+        return self.max_cost_usd if self.parent else self.budget.max_cost_usd
+
+    def _lineage(self):
+        node = self
+        while node is not None:
+            yield node
+            node = node.parent
+
+    def _subtree(self) -> List["ExecutionNode"]:
+        nodes, stack = [], [self]
+        while stack:
+            node = stack.pop()
+            nodes.append(node)
+            stack.extend(node.children)
+        return nodes
+
+    def _exhaust(self, error: BudgetExceeded) -> None:
+        self.exhausted = error
+        current = asyncio.current_task()
+        for node in self._subtree():
+            for task in list(node.tasks):
+                if task is not current and not task.done():
+                    task.cancel(str(error))
+        self.supervisor._budget_rejections += 1
+        logger.warning("execution_budget_exhausted", node=self.node_id, limit=error.limit, error=str(error))
+
+
+class ExecutionSupervisor:
+    """Supervises the delegation trees of all missions in this process"""
+
+    def __init__(
+        self,
+        max_concurrent: Optional[int] = None,
+        default_budget: Optional[ExecutionBudget] = None,
+        reap_interval: float = 30.0,
+    ):
+        self.max_concurrent = max_concurrent or int(os.getenv("SUBAGENT_MAX_CONCURRENT", "20"))
+        self.default_budget = default_budget or ExecutionBudget()
+        self.reap_interval = reap_interval
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self._slots_in_use = 0
+        self._missions: Dict[str, ExecutionNode] = {}
+        self._reaper: Optional[asyncio.Task] = None
+        self._cancelled = 0
+        self._reaped = 0
+        self._budget_rejections = 0
+
+    # ------------------------------------------------------------------ scopes
+
+    @asynccontextmanager
+    async def mission(
+        self,
+        mission_id: str,
+        budget: Optional[ExecutionBudget] = None,
+        lease_seconds: Optional[float] = None,
+        liveness: Optional[Liveness] = None,
+    ) -> AsyncIterator[ExecutionNode]:
+        """
+        Open the root scope for a mission.
+
+        ``lease_seconds`` makes the mission an orphan unless touch() renews
+        it in time (e.g. from an SSE stream); ``liveness`` is polled by the
+        reaper and cancels the mission once it returns False.
+        """
+        root = ExecutionNode(self, mission_id, budget=budget or self.default_budget)
+        root.liveness = liveness
+        if lease_seconds:
+            root.lease_expires_at = time.monotonic() + lease_seconds
+        self._missions[mission_id] = root
+        self._ensure_reaper()
+        token = _current_node.set(root)
+        error: Optional[BaseException] = None
+        try:
+            yield root
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            _current_node.reset(token)
+            if error is not None:
+                root.cancel(f"mission scope exited: {type(error).__name__}")
+            await root.close(error)
+            if self._missions.get(mission_id) is root:
+                del self._missions[mission_id]
+            logger.debug(
+                "execution_mission_closed",
+                mission_id=mission_id,
+                agents=root.agents_spawned,
+                peak_depth=root.peak_depth,
+                tokens=root.tokens_used,
+                cost_usd=round(root.cost_usd, 6),
+            )
+
+    @asynccontextmanager
+    async def delegation(
+        self,
+        label: str,
+        max_tokens: Optional[int] = None,
+        max_cost_usd: Optional[float] = None,
+    ) -> AsyncIterator[ExecutionNode]:
+        """
+        Open a child scope under the current node.
+
+        Outside any mission an ad-hoc mission with the default budget is
+        opened, so every delegation is capped and cancellable. Waits while
+        the parent already has ``max_breadth`` children running.
+        """
+        parent = _current_node.get()
+        if parent is None:
+            async with self.scope():
+                async with self.delegation(label, max_tokens, max_cost_usd) as node:
+                    yield node
+            return
+
+        parent.check_open()
+        root, budget = parent.root, parent.budget
+        if parent.depth + 1 > budget.max_depth:
+            self._budget_rejections += 1
+            raise BudgetExceeded(
+                "depth", parent.node_id,
+                f"{label}: delegation depth {parent.depth + 1} > {budget.max_depth}",
+            )
+        if root.agents_spawned + 1 > budget.max_agents:
+            self._budget_rejections += 1
+            raise BudgetExceeded(
+                "agents", root.node_id,
+                f"{label}: mission {root.label} already spawned {root.agents_spawned} agents",
+            )
+        root.agents_spawned += 1
+
+        await parent._breadth.acquire()
+        try:
+            parent.check_open()
+            child = ExecutionNode(
+                self, label, parent=parent,
+                max_tokens=_tighter(max_tokens, parent.remaining_tokens()),
+                max_cost_usd=_tighter(max_cost_usd, parent.remaining_cost_usd()),
+            )
+            root.peak_depth = max(root.peak_depth, child.depth)
+            parent.children.add(child)
+            token = _current_node.set(child)
+            error: Optional[BaseException] = None
+            try:
+                yield child
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                _current_node.reset(token)
+                await child.close(error)
+                parent.children.discard(child)
+        finally:
+            parent._breadth.release()
+
+    @asynccontextmanager
+    async def scope(self) -> AsyncIterator[ExecutionNode]:
+        """The current node, or an ad-hoc mission with the default budget outside one"""
+        node = _current_node.get()
+        if node is not None:
+            yield node
+            return
+        async with self.mission(f"adhoc:{uuid.uuid4().hex[:8]}") as root:
+            yield root
+
+    def check_capacity(self, agents: int = 1) -> None:
+        """
+        Raise BudgetExceeded (or CancelledError) if the current mission
+        could not take ``agents`` more delegations one level down.
+
+        For callers that plan delegations before executing them.
+        """
+        node = _current_node.get()
+        if node is None:
+            return
+        node.check_open()
+        budget = node.budget
+        if node.depth + 1 > budget.max_depth:
+            raise BudgetExceeded("depth", node.node_id, f"delegation depth {node.depth + 1} > {budget.max_depth}")
+        if node.root.agents_spawned + agents > budget.max_agents:
+            raise BudgetExceeded(
+                "agents", node.root.node_id,
+                f"mission {node.root.label} cannot spawn {agents} more agents "
+                f"({node.root.agents_spawned}/{budget.max_agents})",
+            )
+
+    # ------------------------------------------------------------ supervision
+
+    def cancel(self, mission_id: str, reason: str = "cancelled") -> bool:
+        """Cancel a mission and everything it spawned; False if not running here"""
+        root = self._missions.get(mission_id)
+        if root is None:
+            return False
+        cancelled = root.cancel(reason)
+        self._cancelled += 1
+        logger.info("execution_mission_cancelled", mission_id=mission_id, reason=reason, tasks=cancelled)
+        return True
+
+    def touch(self, mission_id: str, lease_seconds: float) -> None:
+        """Renew a mission's lease"""
+        root = self._missions.get(mission_id)
+        if root is not None:
+            root.lease_expires_at = time.monotonic() + lease_seconds
+
+    async def reap_orphans(self) -> List[str]:
+        """Cancel missions whose lease expired or whose liveness check failed"""
+        now = time.monotonic()
+        reaped = []
+        for mission_id, root in list(self._missions.items()):
+            reason = None
+            if root.cancel_reason is not None:
+                continue
+            if root.owner is not None and root.owner.done():
+                reason = "owner_finished"
+            elif root.lease_expires_at is not None and now > root.lease_expires_at:
+                reason = "lease_expired"
+            elif root.liveness is not None:
+                try:
+                    alive = root.liveness()
+                    if inspect.isawaitable(alive):
+                        alive = await alive
+                except Exception as e:
+                    logger.warning("execution_liveness_check_failed", mission_id=mission_id, error=str(e))
+                    alive = True
+                if not alive:
+                    reason = "not_alive"
+            if reason:
+                root.cancel(f"reaped: {reason}")
+                self._missions.pop(mission_id, None)
+                self._reaped += 1
+                reaped.append(mission_id)
+                logger.warning("execution_orphan_reaped", mission_id=mission_id, reason=reason)
+        return reaped
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active_missions": len(self._missions),
+            "active_nodes": sum(len(root._subtree()) for root in self._missions.values()),
+            "active_tasks": sum(
+                len(node.tasks) for root in self._missions.values() for node in root._subtree()
+            ),
+            "slots_in_use": self._slots_in_use,
+            "max_concurrent": self.max_concurrent,
+            "cancelled_missions": self._cancelled,
+            "reaped_orphans": self._reaped,
+            "budget_rejections": self._budget_rejections,
+        }
+
+    async def shutdown(self) -> None:
+        """Stop the reaper and cancel every running mission"""
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        for mission_id in list(self._missions):
+            self.cancel(mission_id, reason="shutdown")
+
+    def _ensure_reaper(self) -> None:
+        if self.reap_interval <= 0 or (self._reaper is not None and not self._reaper.done()):
+            return
+        self._reaper = asyncio.get_running_loop().create_task(self._reap_forever())
+
+    async def _reap_forever(self) -> None:
+        while self._missions:
+            await asyncio.sleep(self.reap_interval)
+            try:
+                await self.reap_orphans()
+            except Exception as e:
+                logger.error("execution_reaper_failed", error=str(e))
+
+
+def _min_remaining(limits) -> Optional[float]:
+    remaining = [limit - used for limit, used in limits if limit is not None]
+    return min(remaining) if remaining else None
+
+
+def _tighter(requested: Optional[float], remaining: Optional[float]) -> Optional[float]:
+    if requested is None:
+        return remaining
+    if remaining is None:
+        return requested
+    return min(requested, remaining)
+
+
+def current_execution_node() -> Optional[ExecutionNode]:
+    """The delegation scope of the running task, or None outside a mission"""
+    return _current_node.get()
+
+
+_execution_supervisor: Optional[ExecutionSupervisor] = None
+
+
+def get_execution_supervisor() -> ExecutionSupervisor:
+    """Get the process-wide execution supervisor"""
+    global _execution_supervisor
+    if _execution_supervisor is None:
+        _execution_supervisor = ExecutionSupervisor()
+    return _execution_supervisor
+
+
+def reset_execution_supervisor() -> None:
+    """Reset the supervisor (for tests)"""
+    global _execution_supervisor
+    _execution_supervisor = None
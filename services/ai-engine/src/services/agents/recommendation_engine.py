@@ -7,6 +7,10 @@ Generates personalized agent recommendations using:
 - Hybrid approach combining both methods
 - Real-time learning from user behavior
 
+Collaborative and trending recommendations are served from a precomputed
+item-item model (see recommendation_model.py) when RECOMMENDATION_MODEL_PATH
+points at a built artifact; otherwise they fall back to the SQL queries.
+
 Created: 2025-10-25
 Phase: 4 Week 1 - Session Persistence
 """
@@ -22,6 +26,11 @@ import asyncpg
 from asyncpg.pool import Pool
 
 from services.session_manager import SessionManager, RecommendationType
+from services.agents.recommendation_model import (
+    RecommendationModel,
+    RecommendationModelSource,
+    get_recommendation_model_source,
+)
 
 
 # ============================================================================
@@ -62,7 +71,8 @@ class RecommendationEngine:
         db_pool: Pool,
         session_manager: SessionManager,
         min_interactions: int = 3,
-        similarity_threshold: float = 0.5
+        similarity_threshold: float = 0.5,
+        model_source: Optional[RecommendationModelSource] = None
     ):
         """
         Initialize recommendation engine
@@ -72,11 +82,16 @@ class RecommendationEngine:
             session_manager: Session manager instance
             min_interactions: Minimum interactions for collaborative filtering
             similarity_threshold: Minimum similarity for recommendations
+            model_source: Precomputed item-item model (defaults to RECOMMENDATION_MODEL_PATH)
         """
         self.db_pool = db_pool
         self.session_manager = session_manager
         self.min_interactions = min_interactions
         self.similarity_threshold = similarity_threshold
+        self.model_source = model_source or get_recommendation_model_source()
+
+    def _model(self) -> Optional[RecommendationModel]:
+        return self.model_source.get() if self.model_source else None
 
     # ========================================================================
     # MAIN RECOMMENDATION METHODS
@@ -126,7 +141,7 @@ class RecommendationEngine:
         # 3. Trending agents
         if not include_types or RecommendationType.TRENDING in include_types:
             trending_recs = await self._generate_trending_recommendations(
-                user_id, preferences
+                user_id, preferences, top_agents=top_agents
             )
             all_recommendations.extend(trending_recs)
 
@@ -262,6 +277,10 @@ class RecommendationEngine:
         if not top_agents or len(top_agents) < self.min_interactions:
             return []
 
+        model = self._model()
+        if model is not None:
+            return self._collaborative_from_model(model, top_agents, max_recommendations)
+
         user_agent_ids = [agent['agent_id'] for agent in top_agents]
 
         async with self.db_pool.acquire() as conn:
@@ -360,6 +379,48 @@ class RecommendationEngine:
 
             return sorted(recommendations, key=lambda r: r.relevance_score, reverse=True)[:max_recommendations]
 
+    def _collaborative_from_model(
+        self,
+        model: RecommendationModel,
+        top_agents: List[Dict[str, Any]],
+        max_recommendations: int
+    ) -> List[AgentRecommendation]:
+        """
+        Item-item collaborative filtering over the precomputed neighbor lists
+
+        Seeds are the user's top agents weighted by log usage
+        """
+        seeds = {
+            str(agent['agent_id']): float(np.log1p(agent['interaction_count'] or 1))
+            for agent in top_agents
+        }
+        recommendations = []
+
+        for candidate in model.similar_to(seeds, limit=max_recommendations):
+            stats = model.agent(candidate.agent_id)
+            avg_rating = stats['avg_rating'] or 0
+            popularity = min(1.0, stats['users'] / 50)
+
+            relevance = candidate.score * 0.5 + candidate.best_similarity * 0.2 + popularity * 0.1 + (avg_rating / 5) * 0.2
+            relevance = min(1.0, relevance)
+
+            recommendations.append(AgentRecommendation(
+                agent_id=candidate.agent_id,
+                agent_name=stats.get('name', candidate.agent_id),
+                agent_display_name=stats.get('display_name'),
+                recommendation_type=RecommendationType.COLLABORATIVE,
+                relevance_score=float(relevance),
+                confidence_score=float(candidate.best_similarity),
+                reason=f"Used by similar users ({candidate.shared_users} shared users)",
+                factors={
+                    "item_similarity": float(candidate.score),
+                    "popularity": float(popularity),
+                    "avg_rating": float(avg_rating / 5)
+                }
+            ))
+
+        return sorted(recommendations, key=lambda r: r.relevance_score, reverse=True)
+
     # ========================================================================
     # TRENDING RECOMMENDATIONS
     # ========================================================================
@@ -369,13 +430,19 @@ class RecommendationEngine:
         user_id: str,
         preferences: Optional[Any],
         max_recommendations: int = 3,
-        lookback_days: int = 7
+        lookback_days: int = 7,
+        top_agents: Optional[List[Dict[str, Any]]] = None
     ) -> List[AgentRecommendation]:
         """
         Generate recommendations for trending agents
 
         Agents with increasing usage in the past week
         """
+        model = self._model()
+        if model is not None:
+            exclude = {str(agent['agent_id']) for agent in top_agents or []}
+            return self._trending_from_model(model, preferences, exclude, max_recommendations)
+
         async with self.db_pool.acquire() as conn:
             trending_agents = await conn.fetch("""
                 WITH recent_interactions AS (
@@ -469,6 +536,52 @@ class RecommendationEngine:
 
             return recommendations
 
+    def _trending_from_model(
+        self,
+        model: RecommendationModel,
+        preferences: Optional[Any],
+        exclude: set,
+        max_recommendations: int
+    ) -> List[AgentRecommendation]:
+        """
+        Trending agents from the model's decayed growth and recent users
+        """
+        recommendations = []
+
+        for agent_id in model.trending(exclude=exclude, limit=max_recommendations):
+            stats = model.agent(agent_id)
+            growth_rate = stats['trend_growth']
+            user_count = stats['recent_users']
+            avg_rating = stats['avg_rating'] or 0
+
+            trending_score = min(1.0, max(0.0, growth_rate) / 2)
+            popularity_score = min(1.0, user_count / 50)
+            quality_score = avg_rating / 5 if avg_rating else 0.5
+
+            relevance = trending_score * 0.4 + popularity_score * 0.3 + quality_score * 0.3
+
+            if preferences and preferences.preferred_domains:
+                agent_domains = stats.get('domains') or []
+                if any(domain in preferences.preferred_domains for domain in agent_domains):
+                    relevance = min(1.0, relevance * 1.3)
+
+            recommendations.append(AgentRecommendation(
+                agent_id=agent_id,
+                agent_name=stats.get('name', agent_id),
+                agent_display_name=stats.get('display_name'),
+                recommendation_type=RecommendationType.TRENDING,
+                relevance_score=float(relevance),
+                confidence_score=float(popularity_score),
+                reason=f"Trending ({int(growth_rate * 100)}% growth, {user_count} users)",
+                factors={
+                    "growth_rate": float(growth_rate),
+                    "popularity": float(popularity_score),
+                    "quality": float(quality_score)
+                }
+            ))
+
+        return recommendations
+
     # ========================================================================
     # NEW AGENT RECOMMENDATIONS
     # ========================================================================
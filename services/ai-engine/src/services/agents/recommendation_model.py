@@ -0,0 +1,791 @@
+"""
+Agent Recommendation Model - precomputed item-item similarity and trending scores
+
+Replaces the per-request scans over ``agent_interactions`` done by
+RecommendationEngine with a compact artifact that is built periodically and
+loaded in memory by every API replica.
+
+Key Features:
+- Sparse item-item co-occurrence counted once per distinct (user, agent) pair,
+  scored as cosine similarity and truncated to the top-K neighbors per agent (CSR)
+- Incremental builder: each refresh only reads interactions past the watermark
+  and only generates co-occurrence pairs that involve new (user, agent) pairs
+- Trending from forward-decayed interaction volume (fast vs slow half-life)
+  plus exact recent distinct users per agent
+- Lookups are O(k * neighbors) for k seed agents; trending is a walk over a
+  presorted order
+- Artifact and builder state are plain ``.npz`` files, replaced atomically
+
+Deployment:
+    RECOMMENDATION_MODEL_PATH (and RECOMMENDATION_MODEL_STATE_PATH) must live
+    on a volume shared by the Celery workers that build the model and the API
+    replicas that serve it; each process reads and writes local paths only.
+    Refreshes serialize on an ``flock`` next to the state file, so the volume
+    must support POSIX locks (local disk, NFSv4, EFS). A replica whose
+    artifact never appears logs ``recommendation_model_missing`` and keeps
+    serving the SQL fallback.
+
+Usage:
+    with refresh_lock(state_path) as acquired:
+        if acquired:
+            builder = RecommendationModelBuilder.load_state(state_path)
+            await builder.refresh(db_pool)
+            builder.build(agents_meta=...).save(model_path)
+            builder.save_state(state_path)
+
+    model = RecommendationModel.load(model_path)
+    model.similar_to({"agent-a": 1.0, "agent-b": 0.5}, exclude={"agent-a", "agent-b"})
+    model.trending(exclude={"agent-a"}, limit=3)
+"""
+
+import json
+import math
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import structlog
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Non-POSIX: refreshes are not serialized across processes
+
+logger = structlog.get_logger()
+
+DAY_SECONDS = 86400.0
+_LOW32 = np.int64(0xFFFFFFFF)
+_EMPTY_KEYS = np.zeros(0, dtype=np.int64)
+
+INTERACTIONS_PAGE_QUERY = """
+    SELECT
+        id::text AS id,
+        user_id::text AS user_id,
+        agent_id::text AS agent_id,
+        rating,
+        created_at
+    FROM agent_interactions
+    WHERE interaction_type IN ('select', 'chat')
+        AND (created_at > $1 OR (created_at = $1 AND id::text > $2))
+    ORDER BY created_at, id::text
+    LIMIT $3
+"""
+
+AGENTS_QUERY = """
+    SELECT
+        id::text AS id,
+        name,
+        display_name,
+        metadata->'domains' AS domains,
+        status = 'active' AS active
+    FROM agents
+"""
+
+
+def _epoch(value: Any) -> float:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return float(value)
+
+
+def _pack(high: np.ndarray, low: np.ndarray) -> np.ndarray:
+    return (high.astype(np.int64) << 32) | low.astype(np.int64)
+
+
+def _grow(array: np.ndarray, n: int) -> np.ndarray:
+    if len(array) >= n:
+        return array
+    return np.concatenate([array, np.zeros(n - len(array), dtype=array.dtype)])
+
+
+def _encode(values: Sequence[str], index: Dict[str, int], ids: List[str]) -> np.ndarray:
+    """Map string ids to dense int32 codes, registering unseen ids."""
+    uniques, inverse = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+    codes = np.empty(len(uniques), dtype=np.int64)
+    for position, value in enumerate(uniques.tolist()):
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(ids)
+            ids.append(value)
+        codes[position] = code
+    return codes[inverse]
+
+
+def _atomic_savez(path: str, **arrays: np.ndarray) -> None:
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            np.savez(handle, **arrays)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+@contextmanager
+def refresh_lock(state_path: str, blocking: bool = False):
+    """
+    Exclusive ``flock`` on ``<state_path>.lock`` held for a whole refresh
+
+    Two overlapping refreshes would both start from the same watermark and
+    the later ``save_state`` would drop the other's work (or double count
+    it). Yields False when another process holds the lock and ``blocking``
+    is off.
+    """
+    if fcntl is None:
+        yield True
+        return
+    lock_path = f"{state_path}.lock"
+    os.makedirs(os.path.dirname(os.path.abspath(lock_path)), exist_ok=True)
+    with open(lock_path, "a") as handle:
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+@dataclass
+class SimilarAgent:
+    """Candidate produced by an item-item lookup"""
+    agent_id: str
+    score: float  # weighted mean cosine over the seeds, 0.0-1.0
+    best_similarity: float
+    shared_users: int  # users shared with the closest seed
+
+
+# ============================================================================
+# MODEL (read side)
+# ============================================================================
+
+class RecommendationModel:
+    """
+    Immutable, in-memory recommendation artifact
+
+    Neighbors are stored symmetrically in CSR layout: the neighbors of agent
+    ``i`` are ``neighbors[indptr[i]:indptr[i + 1]]``, sorted by similarity.
+    """
+
+    def __init__(
+        self,
+        agent_ids: np.ndarray,
+        indptr: np.ndarray,
+        neighbors: np.ndarray,
+        similarity: np.ndarray,
+        co_counts: np.ndarray,
+        users: np.ndarray,
+        recent_users: np.ndarray,
+        interactions: np.ndarray,
+        avg_rating: np.ndarray,
+        trend_growth: np.ndarray,
+        trending_order: np.ndarray,
+        active: np.ndarray,
+        agents_meta: Optional[Dict[str, Dict[str, Any]]] = None,
+        built_at: float = 0.0,
+    ):
+        self.agent_ids = agent_ids
+        self.indptr = indptr
+        self.neighbors = neighbors
+        self.similarity = similarity
+        self.co_counts = co_counts
+        self.users = users
+        self.recent_users = recent_users
+        self.interactions = interactions
+        self.avg_rating = avg_rating
+        self.trend_growth = trend_growth
+        self.trending_order = trending_order
+        self.active = active
+        self.agents_meta = agents_meta or {}
+        self.built_at = built_at
+        self._index = {agent_id: i for i, agent_id in enumerate(agent_ids.tolist())}
+
+    @property
+    def n_agents(self) -> int:
+        return len(self.agent_ids)
+
+    @property
+    def nnz(self) -> int:
+        return len(self.neighbors)
+
+    def __contains__(self, agent_id: str) -> bool:
+        return agent_id in self._index
+
+    def agent(self, agent_id: str) -> Dict[str, Any]:
+        """Per-agent statistics and display metadata"""
+        i = self._index[agent_id]
+        rating = float(self.avg_rating[i])
+        return {
+            **self.agents_meta.get(agent_id, {}),
+            "users": int(self.users[i]),
+            "recent_users": int(self.recent_users[i]),
+            "interactions": int(self.interactions[i]),
+            "avg_rating": None if math.isnan(rating) else rating,
+            "trend_growth": float(self.trend_growth[i]),
+        }
+
+    def neighbors_of(self, agent_id: str) -> List[Tuple[str, float]]:
+        i = self._index.get(agent_id)
+        if i is None:
+            return []
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        return [
+            (str(self.agent_ids[j]), float(s))
+            for j, s in zip(self.neighbors[lo:hi].tolist(), self.similarity[lo:hi].tolist())
+        ]
+
+    def similar_to(
+        self,
+        seeds: Dict[str, float],
+        exclude: Optional[Iterable[str]] = None,
+        limit: int = 5,
+    ) -> List[SimilarAgent]:
+        """
+        Rank agents by weighted similarity to a set of seed agents
+
+        Only the neighbor lists of the seeds are touched, so the cost is
+        O(k * neighbors) regardless of interaction history size.
+
+        Args:
+            seeds: Seed agent ID -> weight (e.g. the user's usage)
+            exclude: Agent IDs never to return (defaults to the seeds)
+            limit: Maximum number of candidates
+        """
+        rows = [(self._index[a], w) for a, w in seeds.items() if a in self._index and w > 0]
+        if not rows:
+            return []
+
+        slices = [(self.indptr[i], self.indptr[i + 1], w) for i, w in rows]
+        candidates = np.concatenate([self.neighbors[lo:hi] for lo, hi, _ in slices])
+        if not len(candidates):
+            return []
+        sims = np.concatenate([self.similarity[lo:hi] for lo, hi, _ in slices])
+        counts = np.concatenate([self.co_counts[lo:hi] for lo, hi, _ in slices])
+        weights = np.concatenate([np.full(hi - lo, w) for lo, hi, w in slices])
+
+        uniques, inverse = np.unique(candidates, return_inverse=True)
+        score = np.bincount(inverse, weights=sims * weights) / sum(w for _, w in rows)
+        best = np.zeros(len(uniques), dtype=np.float32)
+        np.maximum.at(best, inverse, sims)
+        shared = np.zeros(len(uniques), dtype=np.int64)
+        np.maximum.at(shared, inverse, counts)
+
+        excluded = {self._index[a] for a in (seeds if exclude is None else exclude) if a in self._index}
+        results = []
+        for position in np.argsort(-score, kind="stable").tolist():
+            j = int(uniques[position])
+            if j in excluded:
+                continue
+            results.append(SimilarAgent(
+                agent_id=str(self.agent_ids[j]),
+                score=float(score[position]),
+                best_similarity=float(best[position]),
+                shared_users=int(shared[position]),
+            ))
+            if len(results) >= limit:
+                break
+        return results
+
+    def trending(self, exclude: Optional[Iterable[str]] = None, limit: int = 3) -> List[str]:
+        """Trending agent IDs (growth, then recent users), skipping ``exclude``"""
+        excluded = {self._index[a] for a in exclude or () if a in self._index}
+        results = []
+        for i in self.trending_order.tolist():
+            if i in excluded:
+                continue
+            results.append(str(self.agent_ids[i]))
+            if len(results) >= limit:
+                break
+        return results
+
+    # ------------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------------
+
+    def save(self, path: str) -> None:
+        _atomic_savez(
+            path,
+            agent_ids=self.agent_ids.astype(str),
+            indptr=self.indptr,
+            neighbors=self.neighbors,
+            similarity=self.similarity,
+            co_counts=self.co_counts,
+            users=self.users,
+            recent_users=self.recent_users,
+            interactions=self.interactions,
+            avg_rating=self.avg_rating,
+            trend_growth=self.trend_growth,
+            trending_order=self.trending_order,
+            active=self.active,
+            agents_meta=np.array(json.dumps(self.agents_meta)),
+            built_at=np.array(self.built_at),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "RecommendationModel":
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in data.files}
+        return cls(
+            agents_meta=json.loads(str(arrays.pop("agents_meta"))),
+            built_at=float(arrays.pop("built_at")),
+            **arrays,
+        )
+
+
+# ============================================================================
+# BUILDER (write side)
+# ============================================================================
+
+class RecommendationModelBuilder:
+    """
+    Incrementally maintained interaction statistics
+
+    State:
+    - ``ui_keys``: sorted distinct (user << 32 | agent) pairs, with last-seen times
+    - ``pair_keys`` / ``pair_counts``: sparse upper-triangular co-occurrence
+      (agent_i << 32 | agent_j, i < j) counted in distinct users
+    - per-agent interaction counts, rating sums and forward-decayed volume
+
+    A new (user, agent) pair contributes one co-occurrence to every other
+    agent of that user, so applying a batch only generates pairs for the
+    batch's new (user, agent) pairs.
+    """
+
+    def __init__(
+        self,
+        fast_half_life_days: float = 3.5,
+        slow_half_life_days: float = 14.0,
+    ):
+        self.fast_tau = fast_half_life_days * DAY_SECONDS / math.log(2)
+        self.slow_tau = slow_half_life_days * DAY_SECONDS / math.log(2)
+
+        self.user_ids: List[str] = []
+        self.agent_ids: List[str] = []
+        self._user_index: Dict[str, int] = {}
+        self._agent_index: Dict[str, int] = {}
+
+        self.ui_keys = _EMPTY_KEYS
+        self.ui_last = np.zeros(0, dtype=np.float64)
+        self.pair_keys = _EMPTY_KEYS
+        self.pair_counts = np.zeros(0, dtype=np.int64)
+
+        self.interactions = np.zeros(0, dtype=np.int64)
+        self.rating_sum = np.zeros(0, dtype=np.float64)
+        self.rating_count = np.zeros(0, dtype=np.int64)
+        self.fast_volume = np.zeros(0, dtype=np.float64)
+        self.slow_volume = np.zeros(0, dtype=np.float64)
+        self.landmark: Optional[float] = None
+
+        # Keyset watermark over (created_at, id) for refresh()
+        self.watermark_time: Optional[datetime] = None
+        self.watermark_id: str = ""
+
+    @property
+    def n_interactions(self) -> int:
+        return int(self.interactions.sum())
+
+    # ------------------------------------------------------------------------
+    # Incremental update
+    # ------------------------------------------------------------------------
+
+    def apply(
+        self,
+        user_ids: Sequence[str],
+        agent_ids: Sequence[str],
+        timestamps: Sequence[Any],
+        ratings: Optional[Sequence[Optional[float]]] = None,
+    ) -> int:
+        """
+        Fold a batch of interactions into the state
+
+        Args:
+            user_ids: User ID per interaction
+            agent_ids: Agent ID per interaction
+            timestamps: Epoch seconds or datetimes per interaction
+            ratings: Optional rating per interaction (None for unrated)
+
+        Returns:
+            Number of new (user, agent) pairs
+        """
+        if not len(user_ids):
+            return 0
+
+        users = _encode(user_ids, self._user_index, self.user_ids)
+        items = _encode(agent_ids, self._agent_index, self.agent_ids)
+        times = np.asarray(timestamps)
+        if times.dtype == object:
+            times = np.array([_epoch(t) for t in timestamps])
+        times = times.astype(np.float64)
+        n = len(self.agent_ids)
+        for name in ("interactions", "rating_sum", "rating_count", "fast_volume", "slow_volume"):
+            setattr(self, name, _grow(getattr(self, name), n))
+
+        self.interactions += np.bincount(items, minlength=n)
+        if ratings is not None:
+            values = np.asarray(ratings, dtype=np.float64)  # None -> nan
+            rated = ~np.isnan(values)
+            self.rating_sum += np.bincount(items[rated], weights=values[rated], minlength=n)
+            self.rating_count += np.bincount(items[rated], minlength=n)
+        self._decay_volume(items, times, n)
+
+        new_keys = self._merge_user_items(_pack(users, items), times)
+        self._count_pairs(new_keys)
+        return len(new_keys)
+
+    def _decay_volume(self, items: np.ndarray, times: np.ndarray, n: int) -> None:
+        """Forward decay: weights grow as exp((t - landmark) / tau)"""
+        if self.landmark is None:
+            self.landmark = float(times.min())
+        horizon = float(times.max()) - self.landmark
+        if horizon > 50 * self.fast_tau:
+            shift = horizon
+            self.fast_volume *= math.exp(-shift / self.fast_tau)
+            self.slow_volume *= math.exp(-shift / self.slow_tau)
+            self.landmark += shift
+        age = np.clip(times - self.landmark, None, 50 * self.fast_tau)
+        self.fast_volume += np.bincount(items, weights=np.exp(age / self.fast_tau), minlength=n)
+        self.slow_volume += np.bincount(items, weights=np.exp(age / self.slow_tau), minlength=n)
+
+    def _merge_user_items(self, keys: np.ndarray, times: np.ndarray) -> np.ndarray:
+        """Merge batch (user, agent) keys; returns the keys not seen before"""
+        keys = np.concatenate([self.ui_keys, keys])
+        times = np.concatenate([self.ui_last, times])
+        order = np.lexsort((times, keys))
+        keys, times = keys[order], times[order]
+        last = np.ones(len(keys), dtype=bool)
+        last[:-1] = keys[1:] != keys[:-1]
+        merged, merged_last = keys[last], times[last]
+
+        position = np.searchsorted(self.ui_keys, merged)
+        seen = position < len(self.ui_keys)
+        seen[seen] = self.ui_keys[position[seen]] == merged[seen]
+        self.ui_keys, self.ui_last = merged, merged_last
+        return merged[~seen]
+
+    def _count_pairs(self, new_keys: np.ndarray) -> None:
+        """Add one co-occurrence per (new pair, other agent of the same user)"""
+        if not len(new_keys):
+            return
+        users = self.ui_keys >> 32
+        items = self.ui_keys & _LOW32
+        is_new = np.zeros(len(self.ui_keys), dtype=bool)
+        src = np.searchsorted(self.ui_keys, new_keys)
+        is_new[src] = True
+
+        start = np.searchsorted(users, users[src], side="left")
+        lengths = np.searchsorted(users, users[src], side="right") - start
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        src = np.repeat(src, lengths)
+        dst = np.repeat(start, lengths) + offsets
+
+        # Two new pairs of the same user meet twice; count that pair once
+        keep = (src != dst) & (~is_new[dst] | (items[src] < items[dst]))
+        a, b = items[src[keep]], items[dst[keep]]
+        batch_keys, batch_counts = np.unique(_pack(np.minimum(a, b), np.maximum(a, b)), return_counts=True)
+
+        keys = np.concatenate([self.pair_keys, batch_keys])
+        counts = np.concatenate([self.pair_counts, batch_counts])
+        self.pair_keys, inverse = np.unique(keys, return_inverse=True)
+        self.pair_counts = np.bincount(inverse, weights=counts).astype(np.int64)
+
+    # ------------------------------------------------------------------------
+    # Build
+    # ------------------------------------------------------------------------
+
+    def build(
+        self,
+        agents_meta: Optional[Dict[str, Dict[str, Any]]] = None,
+        now: Optional[float] = None,
+        neighbors_k: int = 50,
+        min_co_occurrence: int = 2,
+        trending_window_days: float = 7.0,
+        trending_min_users: int = 5,
+    ) -> RecommendationModel:
+        """
+        Produce the read-side artifact
+
+        Args:
+            agents_meta: Agent ID -> {name, display_name, domains, active};
+                agents missing from it, or inactive, are never recommended
+            now: Reference time (epoch seconds) for trending
+            neighbors_k: Neighbors kept per agent
+            min_co_occurrence: Minimum shared users for a neighbor
+            trending_window_days: Window for recent distinct users
+            trending_min_users: Minimum recent users to be trending
+        """
+        now = time.time() if now is None else now
+        n = len(self.agent_ids)
+        agent_ids = np.array(self.agent_ids, dtype=str)
+        if agents_meta is None:
+            active = np.ones(n, dtype=bool)
+        else:
+            active = np.array([bool(agents_meta.get(a, {}).get("active")) for a in self.agent_ids], dtype=bool)
+
+        ui_items = self.ui_keys & _LOW32
+        users = np.bincount(ui_items, minlength=n).astype(np.int64)
+        recent = self.ui_last >= now - trending_window_days * DAY_SECONDS
+        recent_users = np.bincount(ui_items[recent], minlength=n).astype(np.int64)
+
+        indptr, neighbors, similarity, co_counts = self._neighbors(
+            n, users, active, neighbors_k, min_co_occurrence,
+        )
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            avg_rating = np.where(self.rating_count > 0, self.rating_sum / self.rating_count, np.nan)
+        trend_growth = self._trend_growth(now)
+        eligible = np.flatnonzero(active & (recent_users >= trending_min_users))
+        trending_order = eligible[np.lexsort((-recent_users[eligible], -trend_growth[eligible]))]
+
+        return RecommendationModel(
+            agent_ids=agent_ids,
+            indptr=indptr,
+            neighbors=neighbors,
+            similarity=similarity,
+            co_counts=co_counts,
+            users=users.astype(np.int32),
+            recent_users=recent_users.astype(np.int32),
+            interactions=self.interactions.copy(),
+            avg_rating=avg_rating.astype(np.float32),
+            trend_growth=trend_growth.astype(np.float32),
+            trending_order=trending_order.astype(np.int32),
+            active=active,
+            agents_meta={a: m for a, m in (agents_meta or {}).items() if a in self._agent_index},
+            built_at=now,
+        )
+
+    def _neighbors(
+        self,
+        n: int,
+        users: np.ndarray,
+        active: np.ndarray,
+        neighbors_k: int,
+        min_co_occurrence: int,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Symmetric top-K cosine neighbors in CSR layout"""
+        keep = self.pair_counts >= min_co_occurrence
+        a = (self.pair_keys[keep] >> 32).astype(np.int64)
+        b = (self.pair_keys[keep] & _LOW32).astype(np.int64)
+        counts = self.pair_counts[keep]
+        cosine = counts / np.sqrt(users[a] * users[b])
+
+        rows = np.concatenate([a, b])
+        cols = np.concatenate([b, a])
+        sims = np.concatenate([cosine, cosine])
+        shared = np.concatenate([counts, counts])
+        recommendable = active[cols]
+        rows, cols, sims, shared = rows[recommendable], cols[recommendable], sims[recommendable], shared[recommendable]
+
+        order = np.lexsort((cols, -sims, rows))
+        rows, cols, sims, shared = rows[order], cols[order], sims[order], shared[order]
+        row_start = np.searchsorted(rows, rows, side="left")
+        top = np.arange(len(rows)) - row_start < neighbors_k
+        rows, cols, sims, shared = rows[top], cols[top], sims[top], shared[top]
+
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+        return indptr, cols.astype(np.int32), sims.astype(np.float32), shared.astype(np.int32)
+
+    def _trend_growth(self, now: float) -> np.ndarray:
+        """Fast-decayed vs slow-decayed interaction rate, minus one"""
+        if self.landmark is None:
+            return np.zeros(len(self.agent_ids))
+        fast_rate = self.fast_volume * math.exp((self.landmark - now) / self.fast_tau) / self.fast_tau
+        slow_rate = self.slow_volume * math.exp((self.landmark - now) / self.slow_tau) / self.slow_tau
+        with np.errstate(invalid="ignore", divide="ignore"):
+            growth = np.where(slow_rate > 0, fast_rate / slow_rate - 1.0, 0.0)
+        return growth
+
+    # ------------------------------------------------------------------------
+    # Database refresh
+    # ------------------------------------------------------------------------
+
+    async def refresh(self, db_pool, page_size: int = 50000) -> int:
+        """
+        Apply interactions past the watermark, in keyset-paged batches
+
+        Returns:
+            Number of interactions applied
+        """
+        applied = 0
+        since = self.watermark_time or datetime(1970, 1, 1, tzinfo=timezone.utc)
+        async with db_pool.acquire() as conn:
+            while True:
+                rows = await conn.fetch(INTERACTIONS_PAGE_QUERY, since, self.watermark_id, page_size)
+                if not rows:
+                    break
+                self.apply(
+                    [r["user_id"] for r in rows],
+                    [r["agent_id"] for r in rows],
+                    [r["created_at"] for r in rows],
+                    [None if r["rating"] is None else float(r["rating"]) for r in rows],
+                )
+                since, self.watermark_id = rows[-1]["created_at"], rows[-1]["id"]
+                self.watermark_time = since
+                applied += len(rows)
+                if len(rows) < page_size:
+                    break
+
+        logger.info(
+            "recommendation_model_refreshed",
+            applied=applied,
+            agents=len(self.agent_ids),
+            user_agent_pairs=len(self.ui_keys),
+            co_occurrence_pairs=len(self.pair_keys),
+        )
+        return applied
+
+    @staticmethod
+    async def fetch_agents_meta(db_pool) -> Dict[str, Dict[str, Any]]:
+        async with db_pool.acquire() as conn:
+            rows = await conn.fetch(AGENTS_QUERY)
+        meta = {}
+        for row in rows:
+            domains = row["domains"]
+            if isinstance(domains, str):
+                domains = json.loads(domains)
+            meta[row["id"]] = {
+                "name": row["name"],
+                "display_name": row["display_name"],
+                "domains": domains if isinstance(domains, list) else [],
+                "active": bool(row["active"]),
+            }
+        return meta
+
+    # ------------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------------
+
+    def save_state(self, path: str) -> None:
+        _atomic_savez(
+            path,
+            user_ids=np.array(self.user_ids, dtype=str),
+            agent_ids=np.array(self.agent_ids, dtype=str),
+            ui_keys=self.ui_keys,
+            ui_last=self.ui_last,
+            pair_keys=self.pair_keys,
+            pair_counts=self.pair_counts,
+            interactions=self.interactions,
+            rating_sum=self.rating_sum,
+            rating_count=self.rating_count,
+            fast_volume=self.fast_volume,
+            slow_volume=self.slow_volume,
+            taus=np.array([self.fast_tau, self.slow_tau]),
+            landmark=np.array(np.nan if self.landmark is None else self.landmark),
+            watermark=np.array([
+                "" if self.watermark_time is None else self.watermark_time.isoformat(),
+                self.watermark_id,
+            ]),
+        )
+
+    @classmethod
+    def load_state(cls, path: str) -> "RecommendationModelBuilder":
+        """Restore saved state, or start empty when ``path`` does not exist"""
+        builder = cls()
+        if not os.path.exists(path):
+            return builder
+        with np.load(path, allow_pickle=False) as data:
+            builder.user_ids = data["user_ids"].tolist()
+            builder.agent_ids = data["agent_ids"].tolist()
+            for name in (
+                "ui_keys", "ui_last", "pair_keys", "pair_counts", "interactions",
+                "rating_sum", "rating_count", "fast_volume", "slow_volume",
+            ):
+                setattr(builder, name, data[name])
+            builder.fast_tau, builder.slow_tau = data["taus"].tolist()
+            landmark = float(data["landmark"])
+            builder.landmark = None if math.isnan(landmark) else landmark
+            watermark_time, builder.watermark_id = data["watermark"].tolist()
+        builder.watermark_time = datetime.fromisoformat(watermark_time) if watermark_time else None
+        builder._user_index = {u: i for i, u in enumerate(builder.user_ids)}
+        builder._agent_index = {a: i for i, a in enumerate(builder.agent_ids)}
+        return builder
+
+
+# ============================================================================
+# SOURCE (hot reload for API replicas)
+# ============================================================================
+
+class RecommendationModelSource:
+    """
+    Lazily loads the artifact and reloads it when the file is replaced
+
+    The file's mtime is checked at most once per ``check_interval`` seconds.
+    A missing or unreadable artifact yields ``None`` so callers can fall back;
+    an artifact still missing ``missing_warning_after`` seconds after the
+    first check is logged once (usually a volume not shared with the workers).
+    """
+
+    def __init__(self, path: str, check_interval: float = 60.0, missing_warning_after: float = 3600.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.missing_warning_after = missing_warning_after
+        self._model: Optional[RecommendationModel] = None
+        self._mtime: Optional[float] = None
+        self._checked_at = float("-inf")
+        self._first_checked_at: Optional[float] = None
+        self._warned_missing = False
+
+    def get(self) -> Optional[RecommendationModel]:
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self._model
+        self._checked_at = now
+        if self._first_checked_at is None:
+            self._first_checked_at = now
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            self._warn_if_never_loaded(now)
+            return self._model
+        if mtime != self._mtime:
+            try:
+                self._model = RecommendationModel.load(self.path)
+                self._mtime = mtime
+                logger.info("recommendation_model_loaded", path=self.path, agents=self._model.n_agents)
+            except Exception as e:
+                logger.warning("recommendation_model_load_failed", path=self.path, error=str(e))
+        return self._model
+
+    def _warn_if_never_loaded(self, now: float) -> None:
+        if self._model is not None or self._warned_missing:
+            return
+        if now - self._first_checked_at >= self.missing_warning_after:
+            self._warned_missing = True
+            logger.warning(
+                "recommendation_model_missing",
+                path=self.path,
+                waited_seconds=int(now - self._first_checked_at),
+                hint="RECOMMENDATION_MODEL_PATH must be on a volume shared with the refresh workers",
+            )
+
+
+_model_source: Optional[RecommendationModelSource] = None
+
+
+def get_recommendation_model_source() -> Optional[RecommendationModelSource]:
+    """Source for RECOMMENDATION_MODEL_PATH, or None when it is not configured"""
+    global _model_source
+    path = os.getenv("RECOMMENDATION_MODEL_PATH")
+    if not path:
+        return None
+    if _model_source is None or _model_source.path != path:
+        _model_source = RecommendationModelSource(path)
+    return _model_source
+
+
+def reset_recommendation_model_source() -> None:
+    global _model_source
+    _model_source = None
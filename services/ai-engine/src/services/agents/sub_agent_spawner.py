@@ -30,6 +30,8 @@ import time
 import json
 import uuid
 
+from services.agents.execution_supervisor import BudgetExceeded, get_execution_supervisor
+
 logger = structlog.get_logger()
 
 
@@ -60,6 +62,7 @@ class SubAgentResult(BaseModel):
     tokens_used: int
     success: bool
     error: Optional[str] = None
+    budget_exhausted: bool = False
 
 
 class SubAgentSpawner:
@@ -436,15 +439,33 @@ class SubAgentSpawner:
                 {"role": "user", "content": config.task}
             ]
 
-            response = await llm.ainvoke(messages)
+            # Breadth/depth/agent budgets apply per delegation; the LLM call
+            # holds a process-wide slot and is charged to the mission
+            async with get_execution_supervisor().delegation(
+                f"L{config.agent_level}:{config.specialty}"
+            ) as node:
+                async with node.slot():
+                    response = await llm.ainvoke(messages)
+
+                # Calculate cost (simplified)
+                tokens_used = response.response_metadata.get("token_usage", {}).get("total_tokens", 0)
+                cost = self._calculate_cost(config.model, tokens_used)
+                budget_exhausted = False
+                try:
+                    node.charge(tokens=tokens_used, cost_usd=cost)
+                except BudgetExceeded as exc:
+                    # The call is already paid for; keep its result, later delegations are refused
+                    logger.warning(
+                        "sub_agent_execution_budget_exhausted",
+                        sub_agent_id=sub_agent_id,
+                        limit=exc.limit,
+                        error=str(exc)
+                    )
+                    budget_exhausted = True
 
             execution_time_ms = int((time.time() - start_time) * 1000)
             self.execution_count += 1
 
-            # Calculate cost (simplified)
-            tokens_used = response.response_metadata.get("token_usage", {}).get("total_tokens", 0)
-            cost = self._calculate_cost(config.model, tokens_used)
-
             result = SubAgentResult(
                 sub_agent_id=sub_agent_id,
                 task=config.task,
@@ -453,7 +474,8 @@ class SubAgentSpawner:
                 execution_time_ms=execution_time_ms,
                 cost=cost,
                 tokens_used=tokens_used,
-                success=True
+                success=True,
+                budget_exhausted=budget_exhausted
             )
 
             logger.info(
@@ -508,14 +530,16 @@ class SubAgentSpawner:
             count=len(sub_agent_ids)
         )
 
-        # Execute all sub-agents concurrently
-        tasks = [self.execute_sub_agent(sid) for sid in sub_agent_ids]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Execute all sub-agents concurrently, as tasks owned by the caller's
+        # delegation scope so mission cancellation reaches them
+        async with get_execution_supervisor().scope() as scope:
+            tasks = [scope.spawn(self.execute_sub_agent(sid)) for sid in sub_agent_ids]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
 
-        # Convert exceptions to failed results
+        # Convert exceptions (including budget cancellations) to failed results
         processed_results = []
         for i, result in enumerate(results):
-            if isinstance(result, Exception):
+            if isinstance(result, BaseException):
                 logger.error(
                     "Parallel execution task failed",
                     sub_agent_id=sub_agent_ids[i],
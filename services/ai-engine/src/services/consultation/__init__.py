@@ -15,13 +15,38 @@ Components:
 Note: RAG services (GraphRAG, search) are in services.rag/
 """
 
-from .query_classifier import QueryClassifier
-from .response_quality import ResponseQualityService, ResponseQualityResult, get_response_quality_service
-from .citation_prompt_enhancer import CitationPromptEnhancer
-from .mode1_evidence_gatherer import Mode1EvidenceGatherer
+from importlib import import_module
+
+# Exports resolve on first access (PEP 562): Mode1EvidenceGatherer and the
+# citation enhancer pull in the agent hierarchy and LLM stacks, while hot-path
+# importers such as query_understanding only need the classifier.
+_EXPORTS = {
+    "QueryClassifier": "query_classifier",
+    "ResponseQualityService": "response_quality",
+    "ResponseQualityResult": "response_quality",
+    "get_response_quality_service": "response_quality",
+    "CitationPromptEnhancer": "citation_prompt_enhancer",
+    "Mode1EvidenceGatherer": "mode1_evidence_gatherer",
+}
 
 # Alias for backwards compatibility
-ResponseQualityChecker = ResponseQualityService
+_ALIASES = {
+    "ResponseQualityChecker": "ResponseQualityService",
+}
+
+
+def __getattr__(name):
+    target = _ALIASES.get(name, name)
+    if target not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{_EXPORTS[target]}", __name__), target)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS) | set(_ALIASES))
+
 
 __all__ = [
     "QueryClassifier",
@@ -14,7 +14,7 @@ Strategy Mappings:
 - keyword_dominant: Exact term lookup, acronyms, codes
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 import re
@@ -22,6 +22,77 @@ import structlog
 
 logger = structlog.get_logger()
 
+WORD_PATTERN = re.compile(r'\w+')
+
+# A pattern anchored at a word start (or the query start) with a literal word prefix
+_LITERAL_PREFIX = re.compile(r'^(?:\\b|\^)(\w+)')
+
+
+class PatternSet:
+    """
+    Named groups of regexes checked against one tokenization of a query.
+
+    Most patterns start with a word boundary and a literal (``\\bFDA\\b``,
+    ``\\bpharmaco``), so they can only match if some query word starts with
+    that literal. Patterns are indexed by literal and only candidates are
+    searched; patterns without a literal prefix are always searched.
+    """
+
+    def __init__(self, groups: Dict[str, List[str]], flags: int = 0):
+        self._always: List[Tuple[str, re.Pattern]] = []
+        self._by_prefix: Dict[str, List[Tuple[str, re.Pattern]]] = {}
+        self.groups = list(groups)
+
+        for name, patterns in groups.items():
+            for pattern in patterns:
+                compiled = re.compile(pattern, flags)
+                prefix = self._literal_prefix(pattern)
+                if prefix:
+                    self._by_prefix.setdefault(prefix, []).append((name, compiled))
+                else:
+                    self._always.append((name, compiled))
+
+        self._prefix_lengths = sorted({len(prefix) for prefix in self._by_prefix})
+
+    @staticmethod
+    def _literal_prefix(pattern: str) -> Optional[str]:
+        if '|' in pattern:
+            return None
+        match = _LITERAL_PREFIX.match(pattern)
+        if not match:
+            return None
+        literal = match.group(1)
+        # A quantifier after the literal makes its last character optional
+        if pattern[match.end():match.end() + 1] in ('?', '*', '{'):
+            literal = literal[:-1]
+        return literal.lower() or None
+
+    def candidates(self, words: Iterable[str]) -> List[Tuple[str, re.Pattern]]:
+        """Patterns that can match a query made of ``words`` (lowercased)"""
+        found: Dict[int, Tuple[str, re.Pattern]] = {}
+        for word in set(words):
+            for length in self._prefix_lengths:
+                if length > len(word):
+                    break
+                for entry in self._by_prefix.get(word[:length], ()):
+                    found[id(entry)] = entry
+        return self._always + list(found.values())
+
+    def counts(self, query: str, words: Iterable[str]) -> Dict[str, int]:
+        """Group -> number of its patterns found in the query"""
+        counts = {name: 0 for name in self.groups}
+        for name, pattern in self.candidates(words):
+            if pattern.search(query):
+                counts[name] += 1
+        return counts
+
+    def findall(self, query: str, words: Iterable[str]) -> List[str]:
+        """All matches of the candidate patterns"""
+        matches = []
+        for _, pattern in self.candidates(words):
+            matches.extend(pattern.findall(query))
+        return matches
+
 
 class QueryIntent(str, Enum):
     """Primary query intent categories"""
@@ -173,26 +244,69 @@ class QueryClassifier:
         r'\bopportunit', r'\bpossibil', r'\balternativ'
     ]
 
+    # Intent -> weight per matched pattern
+    INTENT_WEIGHTS = {
+        QueryIntent.REGULATORY: 0.15,
+        QueryIntent.CLINICAL: 0.12,
+        QueryIntent.RESEARCH: 0.10,
+        QueryIntent.OPERATIONAL: 0.12,
+        QueryIntent.COMMERCIAL: 0.12,
+        QueryIntent.TECHNICAL: 0.10,
+        QueryIntent.ENTITY_LOOKUP: 0.20,
+    }
+
+    # Capitalized multi-word entities
+    CAPITALIZED_ENTITY_PATTERN = re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+\b')
+
+    STOP_WORDS = frozenset({
+        'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been',
+        'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
+        'would', 'could', 'should', 'may', 'might', 'must', 'shall',
+        'can', 'need', 'to', 'of', 'in', 'for', 'on', 'with', 'at',
+        'by', 'from', 'up', 'about', 'into', 'through', 'during',
+        'before', 'after', 'above', 'below', 'between', 'under',
+        'again', 'further', 'then', 'once', 'here', 'there', 'when',
+        'where', 'why', 'how', 'all', 'each', 'few', 'more', 'most',
+        'other', 'some', 'such', 'no', 'nor', 'not', 'only', 'own',
+        'same', 'so', 'than', 'too', 'very', 'just', 'and', 'but',
+        'if', 'or', 'because', 'as', 'until', 'while', 'this', 'that',
+        'these', 'those', 'what', 'which', 'who', 'whom', 'whose'
+    })
+
     def __init__(self):
         """Initialize query classifier with compiled patterns"""
-        # Pre-compile all patterns for performance
-        self._regulatory_patterns = [re.compile(p, re.IGNORECASE) for p in self.REGULATORY_PATTERNS]
-        self._clinical_patterns = [re.compile(p, re.IGNORECASE) for p in self.CLINICAL_PATTERNS]
-        self._research_patterns = [re.compile(p, re.IGNORECASE) for p in self.RESEARCH_PATTERNS]
-        self._operational_patterns = [re.compile(p, re.IGNORECASE) for p in self.OPERATIONAL_PATTERNS]
-        self._commercial_patterns = [re.compile(p, re.IGNORECASE) for p in self.COMMERCIAL_PATTERNS]
-        self._technical_patterns = [re.compile(p, re.IGNORECASE) for p in self.TECHNICAL_PATTERNS]
-        self._entity_patterns = [re.compile(p) for p in self.ENTITY_PATTERNS]
-        self._simple_patterns = [re.compile(p, re.IGNORECASE) for p in self.SIMPLE_INDICATORS]
-        self._complex_patterns = [re.compile(p, re.IGNORECASE) for p in self.COMPLEX_INDICATORS]
-        self._exploratory_patterns = [re.compile(p, re.IGNORECASE) for p in self.EXPLORATORY_INDICATORS]
-
-    def classify(self, query: str) -> QueryClassification:
+        # Pre-compile all patterns for performance, indexed by literal prefix
+        self._patterns = PatternSet({
+            QueryIntent.REGULATORY.value: self.REGULATORY_PATTERNS,
+            QueryIntent.CLINICAL.value: self.CLINICAL_PATTERNS,
+            QueryIntent.RESEARCH.value: self.RESEARCH_PATTERNS,
+            QueryIntent.OPERATIONAL.value: self.OPERATIONAL_PATTERNS,
+            QueryIntent.COMMERCIAL.value: self.COMMERCIAL_PATTERNS,
+            QueryIntent.TECHNICAL.value: self.TECHNICAL_PATTERNS,
+            QueryComplexity.SIMPLE.value: self.SIMPLE_INDICATORS,
+            QueryComplexity.COMPLEX.value: self.COMPLEX_INDICATORS,
+            QueryComplexity.EXPLORATORY.value: self.EXPLORATORY_INDICATORS,
+        }, re.IGNORECASE)
+        self._entity_patterns = PatternSet({QueryIntent.ENTITY_LOOKUP.value: self.ENTITY_PATTERNS})
+
+    def classify(
+        self,
+        query: str,
+        words: Optional[List[str]] = None,
+        intents: Optional[Tuple[QueryIntent, List[QueryIntent], float]] = None,
+    ) -> QueryClassification:
         """
         Classify a query and recommend optimal RAG strategy
 
+        Intents, complexity, entities and keywords all come from one
+        tokenization of the query. Use ``QueryUnderstandingService`` for
+        memoized, request-shared classification.
+
         Args:
             query: User query string
+            words: Lowercased word tokens of the query, if already computed
+            intents: (primary, secondaries, confidence) from a learned model;
+                skips rule-based intent scoring when given
 
         Returns:
             QueryClassification with recommended strategy
@@ -200,18 +314,25 @@ class QueryClassifier:
         if not query or len(query.strip()) < 3:
             return self._default_classification(query)
 
+        if words is None:
+            words = WORD_PATTERN.findall(query.lower())
+        counts = self._patterns.counts(query, words)
+
         # Detect intents and score them
-        intent_scores = self._score_intents(query)
-        primary_intent, secondary_intents, confidence = self._rank_intents(intent_scores)
+        if intents is None:
+            entity_count = self._entity_patterns.counts(query, words)[QueryIntent.ENTITY_LOOKUP.value]
+            intent_scores = self._score_intents(counts, entity_count)
+            intents = self._rank_intents(intent_scores)
+        primary_intent, secondary_intents, confidence = intents
 
         # Detect complexity
-        complexity = self._assess_complexity(query)
+        complexity = self._assess_complexity(query, counts)
 
         # Detect entities
-        entities = self._detect_entities(query)
+        entities = self._detect_entities(query, words)
 
         # Extract keywords
-        keywords = self._extract_keywords(query)
+        keywords = self._extract_keywords(words)
 
         # Override strategy for entity-heavy queries
         if entities and primary_intent == QueryIntent.GENERAL:
@@ -249,18 +370,14 @@ class QueryClassifier:
 
         return result
 
-    def _score_intents(self, query: str) -> Dict[QueryIntent, float]:
+    def _score_intents(self, counts: Dict[str, int], entity_count: int) -> Dict[QueryIntent, float]:
         """Score each intent based on pattern matches"""
         scores = {intent: 0.0 for intent in QueryIntent}
 
         # Count matches for each intent
-        scores[QueryIntent.REGULATORY] = self._count_matches(query, self._regulatory_patterns) * 0.15
-        scores[QueryIntent.CLINICAL] = self._count_matches(query, self._clinical_patterns) * 0.12
-        scores[QueryIntent.RESEARCH] = self._count_matches(query, self._research_patterns) * 0.10
-        scores[QueryIntent.OPERATIONAL] = self._count_matches(query, self._operational_patterns) * 0.12
-        scores[QueryIntent.COMMERCIAL] = self._count_matches(query, self._commercial_patterns) * 0.12
-        scores[QueryIntent.TECHNICAL] = self._count_matches(query, self._technical_patterns) * 0.10
-        scores[QueryIntent.ENTITY_LOOKUP] = self._count_matches(query, self._entity_patterns) * 0.20
+        for intent, weight in self.INTENT_WEIGHTS.items():
+            count = entity_count if intent == QueryIntent.ENTITY_LOOKUP else counts[intent.value]
+            scores[intent] = count * weight
 
         # Normalize scores
         max_score = max(scores.values()) if scores.values() else 0
@@ -273,14 +390,6 @@ class QueryClassifier:
 
         return scores
 
-    def _count_matches(self, query: str, patterns: List[re.Pattern]) -> int:
-        """Count pattern matches in query"""
-        count = 0
-        for pattern in patterns:
-            if pattern.search(query):
-                count += 1
-        return count
-
     def _rank_intents(
         self,
         scores: Dict[QueryIntent, float]
@@ -299,19 +408,18 @@ class QueryClassifier:
 
         return primary, secondaries, confidence
 
-    def _assess_complexity(self, query: str) -> QueryComplexity:
+    def _assess_complexity(self, query: str, counts: Dict[str, int]) -> QueryComplexity:
         """Assess query complexity"""
         # Check exploratory first (highest priority)
-        if any(p.search(query) for p in self._exploratory_patterns):
+        if counts[QueryComplexity.EXPLORATORY.value]:
             return QueryComplexity.EXPLORATORY
 
         # Check complex
-        complex_count = sum(1 for p in self._complex_patterns if p.search(query))
-        if complex_count >= 2:
+        if counts[QueryComplexity.COMPLEX.value] >= 2:
             return QueryComplexity.COMPLEX
 
         # Check simple
-        if any(p.search(query) for p in self._simple_patterns):
+        if counts[QueryComplexity.SIMPLE.value]:
             return QueryComplexity.SIMPLE
 
         # Default to moderate
@@ -323,42 +431,20 @@ class QueryClassifier:
         else:
             return QueryComplexity.COMPLEX
 
-    def _detect_entities(self, query: str) -> List[str]:
+    def _detect_entities(self, query: str, words: List[str]) -> List[str]:
         """Detect named entities in query"""
-        entities = []
-
-        for pattern in self._entity_patterns:
-            matches = pattern.findall(query)
-            entities.extend(matches)
+        entities = self._entity_patterns.findall(query, words)
 
         # Also detect capitalized multi-word entities
-        cap_pattern = r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+\b'
-        cap_matches = re.findall(cap_pattern, query)
-        entities.extend(cap_matches)
+        entities.extend(self.CAPITALIZED_ENTITY_PATTERN.findall(query))
 
         # Deduplicate
         return list(set(entities))[:10]
 
-    def _extract_keywords(self, query: str) -> List[str]:
+    def _extract_keywords(self, words: List[str]) -> List[str]:
         """Extract important keywords"""
         # Remove stop words
-        stop_words = {
-            'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been',
-            'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
-            'would', 'could', 'should', 'may', 'might', 'must', 'shall',
-            'can', 'need', 'to', 'of', 'in', 'for', 'on', 'with', 'at',
-            'by', 'from', 'up', 'about', 'into', 'through', 'during',
-            'before', 'after', 'above', 'below', 'between', 'under',
-            'again', 'further', 'then', 'once', 'here', 'there', 'when',
-            'where', 'why', 'how', 'all', 'each', 'few', 'more', 'most',
-            'other', 'some', 'such', 'no', 'nor', 'not', 'only', 'own',
-            'same', 'so', 'than', 'too', 'very', 'just', 'and', 'but',
-            'if', 'or', 'because', 'as', 'until', 'while', 'this', 'that',
-            'these', 'those', 'what', 'which', 'who', 'whom', 'whose'
-        }
-
-        words = re.findall(r'\b\w+\b', query.lower())
-        keywords = [w for w in words if w not in stop_words and len(w) > 2]
+        keywords = [w for w in words if w not in self.STOP_WORDS and len(w) > 2]
 
         return keywords[:15]
 
@@ -457,9 +543,10 @@ def get_query_classifier() -> QueryClassifier:
 
 # Convenience function
 def classify_query(query: str) -> QueryClassification:
-    """Classify a query and get recommended strategy"""
-    classifier = get_query_classifier()
-    return classifier.classify(query)
+    """Classify a query and get recommended strategy (memoized, request-shared)"""
+    from .query_understanding import understand_query
+
+    return understand_query(query).classification
 
 
 # Test function
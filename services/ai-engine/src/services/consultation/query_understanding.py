@@ -0,0 +1,310 @@
+"""
+Query Understanding Service - Memoized, Request-Shared Query Analysis
+
+Single entry point for everything derived from the text of a user query:
+RAG intent and strategy (QueryClassifier), complexity, entities, keywords,
+and keyword-table hits for other routers (tool selection in
+parallel_tools_executor, evidence domains in evidence_detector).
+
+Key Features:
+- One tokenization pass per query; regex groups only search the patterns
+  whose literal prefix appears among the query words
+- Memoized by normalized query (whitespace collapsed) in a bounded LRU
+- Shared through the request memo (core.request_memo), so every call site
+  of one request sees the same QueryUnderstanding
+- Optional learned fast path: a tiny hashed n-gram logistic model trained
+  from logged classifications gives calibrated intent confidences and
+  skips rule-based intent scoring when it is confident
+
+Usage:
+    understanding = understand_query(query)
+    understanding.classification.recommended_strategy
+    understanding.keyword_counts("tool_intent", INTENT_KEYWORDS)
+
+    # Learned fast path (see scripts/train_query_intent_model.py)
+    export QUERY_INTENT_MODEL_PATH=/models/query_intent.npz
+"""
+
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+import structlog
+
+from core.request_memo import memoized
+from .query_classifier import (
+    WORD_PATTERN,
+    QueryClassification,
+    QueryClassifier,
+    QueryIntent,
+)
+
+logger = structlog.get_logger()
+
+DEFAULT_CACHE_SIZE = int(os.getenv("QUERY_UNDERSTANDING_CACHE_SIZE", "4096"))
+
+# Longer texts are analyzed but not memoized (documents, not queries)
+MAX_MEMO_CHARS = 2048
+
+def normalize_query(query: str) -> str:
+    """Memo key: the query with whitespace runs collapsed"""
+    return " ".join((query or "").split())
+
+
+# ============================================================================
+# Learned Intent Model
+# ============================================================================
+
+class HashedIntentModel:
+    """
+    Multinomial logistic regression over hashed word unigrams and bigrams.
+
+    Small enough to evaluate in microseconds (one gather + sum per query)
+    and trained offline from logged (query, primary_intent) classifications.
+    """
+
+    def __init__(self, weights: np.ndarray, labels: List[str]):
+        self.weights = weights
+        self.labels = list(labels)
+
+    @property
+    def buckets(self) -> int:
+        return self.weights.shape[0]
+
+    @staticmethod
+    def features(words: List[str], buckets: int) -> np.ndarray:
+        """Hashed feature ids; bucket 0 is a bias feature present in every query"""
+        grams = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        return np.array(
+            [0] + [zlib.crc32(gram.encode("utf-8")) % (buckets - 1) + 1 for gram in grams],
+            dtype=np.int64,
+        )
+
+    def predict(self, words: List[str]) -> Dict[str, float]:
+        """Label -> probability"""
+        logits = self.weights[self.features(words, self.buckets)].sum(axis=0)
+        probabilities = np.exp(logits - logits.max())
+        probabilities /= probabilities.sum()
+        return dict(zip(self.labels, probabilities.tolist()))
+
+    @classmethod
+    def fit(
+        cls,
+        examples: Iterable[Tuple[str, str]],
+        buckets: int = 1 << 16,
+        epochs: int = 50,
+        learning_rate: float = 0.5,
+        l2: float = 1e-4,
+    ) -> "HashedIntentModel":
+        """
+        Train on (query, label) pairs with full-batch AdaGrad.
+
+        The L2 penalty keeps probabilities from saturating on features seen
+        only a few times, which is what makes them usable as confidences.
+        """
+        queries, targets = [], []
+        for query, label in examples:
+            queries.append(WORD_PATTERN.findall(normalize_query(query).lower()))
+            targets.append(label)
+        if not queries:
+            raise ValueError("No training examples")
+
+        labels = sorted(set(targets))
+        label_index = {label: i for i, label in enumerate(labels)}
+        y = np.array([label_index[t] for t in targets], dtype=np.int64)
+
+        rows = [cls.features(words, buckets) for words in queries]
+        flat = np.concatenate(rows)
+        starts = np.cumsum([0] + [len(r) for r in rows[:-1]])
+        row_of_feature = np.repeat(np.arange(len(rows)), [len(r) for r in rows])
+
+        weights = np.zeros((buckets, len(labels)), dtype=np.float64)
+        squared = np.zeros_like(weights)
+        for _ in range(epochs):
+            logits = np.add.reduceat(weights[flat], starts, axis=0)
+            probabilities = np.exp(logits - logits.max(axis=1, keepdims=True))
+            probabilities /= probabilities.sum(axis=1, keepdims=True)
+            probabilities[np.arange(len(y)), y] -= 1.0
+
+            gradient = l2 * weights
+            np.add.at(gradient, flat, probabilities[row_of_feature] / len(y))
+            squared += gradient ** 2
+            weights -= learning_rate * gradient / (np.sqrt(squared) + 1e-8)
+
+        return cls(weights.astype(np.float32), labels)
+
+    def save(self, path: str) -> None:
+        np.savez_compressed(path, weights=self.weights, labels=np.array(self.labels))
+
+    @classmethod
+    def load(cls, path: str) -> "HashedIntentModel":
+        with np.load(path) as data:
+            return cls(data["weights"], data["labels"].tolist())
+
+
+# ============================================================================
+# Query Understanding
+# ============================================================================
+
+class QueryUnderstanding:
+    """
+    Everything derived from one normalized query.
+
+    Parts are computed on first use and kept: routers that only need
+    keyword hits never pay for the full classification.
+    """
+
+    def __init__(self, query: str, service: "QueryUnderstandingService"):
+        self.query = query
+        self.lowered = query.lower()
+        self._service = service
+        self._words: Optional[List[str]] = None
+        self._classification: Optional[QueryClassification] = None
+        # Intent probabilities from the learned model, when one is loaded
+        self.intent_probabilities: Optional[Dict[str, float]] = None
+        self._keyword_counts: Dict[str, Dict[Hashable, int]] = {}
+
+    @property
+    def words(self) -> List[str]:
+        """Lowercased word tokens"""
+        if self._words is None:
+            self._words = WORD_PATTERN.findall(self.lowered)
+        return self._words
+
+    @property
+    def classification(self) -> QueryClassification:
+        if self._classification is None:
+            self._classification = self._service._classify(self)
+        return self._classification
+
+    def keyword_counts(self, table: str, groups: Mapping[Hashable, Iterable[str]]) -> Dict[Hashable, int]:
+        """
+        Group -> number of its keywords contained in the lowercased query.
+
+        Substring semantics (``keyword in query.lower()``), computed once per
+        table name for this query.
+        """
+        counts = self._keyword_counts.get(table)
+        if counts is None:
+            counts = {
+                group: sum(1 for keyword in keywords if keyword in self.lowered)
+                for group, keywords in groups.items()
+            }
+            self._keyword_counts[table] = counts
+        return counts
+
+
+class QueryUnderstandingService:
+    """
+    Memoized query analysis shared by every query router.
+
+    Lookup order: the current request's memo, then the LRU, then a fresh
+    analysis.
+    """
+
+    def __init__(
+        self,
+        classifier: Optional[QueryClassifier] = None,
+        intent_model: Optional[HashedIntentModel] = None,
+        fast_path_threshold: float = 0.85,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ):
+        self.classifier = classifier or QueryClassifier()
+        self.intent_model = intent_model
+        self.fast_path_threshold = fast_path_threshold
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, QueryUnderstanding]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"cache_hits": 0, "misses": 0, "fast_path": 0}
+
+    def understand(self, query: str) -> QueryUnderstanding:
+        normalized = normalize_query(query)
+        if len(normalized) > MAX_MEMO_CHARS:
+            self.stats["misses"] += 1
+            return QueryUnderstanding(normalized, self)
+        # Request memo hits are counted by the memo itself
+        return memoized("query_understanding", normalized, lambda: self._lookup(normalized))
+
+    def _lookup(self, normalized: str) -> QueryUnderstanding:
+        with self._lock:
+            understanding = self._cache.get(normalized)
+            if understanding is not None:
+                self._cache.move_to_end(normalized)
+                self.stats["cache_hits"] += 1
+                return understanding
+
+        self.stats["misses"] += 1
+        understanding = QueryUnderstanding(normalized, self)
+        with self._lock:
+            self._cache[normalized] = understanding
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return understanding
+
+    def _classify(self, understanding: QueryUnderstanding) -> QueryClassification:
+        words = understanding.words
+        intents = None
+        if self.intent_model is not None and words:
+            understanding.intent_probabilities = self.intent_model.predict(words)
+            intents = self._confident_intents(understanding.intent_probabilities)
+            if intents is not None:
+                self.stats["fast_path"] += 1
+
+        return self.classifier.classify(understanding.query, words=words, intents=intents)
+
+    def _confident_intents(
+        self,
+        probabilities: Dict[str, float],
+    ) -> Optional[Tuple[QueryIntent, List[QueryIntent], float]]:
+        """(primary, secondaries, confidence) when the model clears the fast-path threshold"""
+        ranked = sorted(probabilities.items(), key=lambda item: item[1], reverse=True)
+        label, confidence = ranked[0]
+        if confidence < self.fast_path_threshold:
+            return None
+        try:
+            primary = QueryIntent(label)
+            secondaries = [QueryIntent(other) for other, p in ranked[1:4] if p > 0.1]
+        except ValueError:
+            # Model trained on intents this classifier no longer has
+            return None
+        return primary, secondaries, confidence
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+# Singleton instance
+_query_understanding_service: Optional[QueryUnderstandingService] = None
+
+
+def get_query_understanding_service() -> QueryUnderstandingService:
+    """Get or create the query understanding singleton (loads QUERY_INTENT_MODEL_PATH if set)"""
+    global _query_understanding_service
+
+    if _query_understanding_service is None:
+        intent_model = None
+        model_path = os.getenv("QUERY_INTENT_MODEL_PATH")
+        if model_path:
+            try:
+                intent_model = HashedIntentModel.load(model_path)
+                logger.info("query_intent_model_loaded", path=model_path, labels=intent_model.labels)
+            except Exception as e:
+                logger.warning("query_intent_model_load_failed", path=model_path, error=str(e))
+        _query_understanding_service = QueryUnderstandingService(intent_model=intent_model)
+
+    return _query_understanding_service
+
+
+def reset_query_understanding_service() -> None:
+    """Reset the singleton (for tests)"""
+    global _query_understanding_service
+    _query_understanding_service = None
+
+
+def understand_query(query: str) -> QueryUnderstanding:
+    """Memoized, request-shared analysis of a query"""
+    return get_query_understanding_service().understand(query)
@@ -5,8 +5,9 @@ Panel orchestration for consulting multiple AI experts simultaneously.
 
 Components:
 - Panel orchestration (coordinate multiple expert responses)
+- Round pipelining (overlapped and speculative rounds)
 - Unified panel service (single entry point for panel queries)
-- Consensus analysis (simple and advanced algorithms)
+- Consensus analysis (simple, embedding-based and LLM algorithms)
 - Confidence calculation (aggregate confidence scores)
 - Comparison matrix building (compare expert responses)
 - Template management (panel configuration templates)
@@ -14,10 +15,12 @@ Components:
 """
 
 from .panel_orchestrator import PanelOrchestrator
+from .panel_pipeline import PanelPipeline
 from .panel_template_service import PanelTemplateService
 from .panel_type_handlers import BasePanelHandler
 from .unified_panel_service import UnifiedPanelService
 from .consensus_analyzer import AdvancedConsensusAnalyzer
+from .local_consensus import LocalConsensusEngine
 from .consensus_calculator import SimpleConsensusCalculator
 from .confidence_calculator import ConfidenceCalculator
 from .comparison_matrix_builder import ComparisonMatrixBuilder
@@ -25,10 +28,12 @@ from .panel_config import PanelConfig, get_panel_config
 
 __all__ = [
     "PanelOrchestrator",
+    "PanelPipeline",
     "PanelTemplateService",
     "BasePanelHandler",
     "UnifiedPanelService",
     "AdvancedConsensusAnalyzer",
+    "LocalConsensusEngine",
     "SimpleConsensusCalculator",
     "ConfidenceCalculator",
     "ComparisonMatrixBuilder",
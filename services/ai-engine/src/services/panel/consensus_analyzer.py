@@ -8,10 +8,16 @@ Implements sophisticated consensus detection using:
 4. Evidence overlap calculation
 5. Weighted consensus scoring
 
+The default "local" mode computes the four metrics, agreement/divergent
+points and themes from one batch of embeddings (see local_consensus) and
+keeps a single optional LLM call for the narrative recommendation. The
+original LLM-only analysis is kept as ASK_PANEL_CONSENSUS_MODE=llm.
+
 Based on ASK_PANEL_COMPLETE_GUIDE.md specifications.
 """
 
 import asyncio
+import os
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
@@ -20,6 +26,7 @@ import re
 
 from services.llm_service import LLMService
 from infrastructure.llm.config_service import get_llm_config_for_level
+from services.panel.local_consensus import LocalConsensusEngine
 
 logger = structlog.get_logger()
 
@@ -83,9 +90,16 @@ class AdvancedConsensusAnalyzer:
     HIGH_CONSENSUS_THRESHOLD = 0.80
     MEDIUM_CONSENSUS_THRESHOLD = 0.50
 
-    def __init__(self, llm_service: LLMService):
+    def __init__(
+        self,
+        llm_service: LLMService,
+        mode: Optional[str] = None,
+        local_engine: Optional[LocalConsensusEngine] = None
+    ):
         self.llm_service = llm_service
         self._llm_config = get_llm_config_for_level("L3")
+        self.mode = (mode or os.getenv("ASK_PANEL_CONSENSUS_MODE", "local")).lower()
+        self.local_engine = local_engine or LocalConsensusEngine()
 
     async def analyze_consensus(
         self,
@@ -100,6 +114,8 @@ class AdvancedConsensusAnalyzer:
             question: Original question posed to panel
             responses: List of expert response dictionaries
             include_detailed_analysis: Whether to include detailed breakdowns
+                (in local mode: whether to spend the LLM call on a narrative
+                recommendation; per-round checks can skip it)
 
         Returns:
             ConsensusResult with all metrics and analysis
@@ -113,9 +129,13 @@ class AdvancedConsensusAnalyzer:
         logger.info(
             "Starting consensus analysis",
             response_count=len(responses),
-            question_preview=question[:100]
+            question_preview=question[:100],
+            mode=self.mode
         )
 
+        if self.mode == "local":
+            return await self._analyze_locally(question, responses, include_detailed_analysis)
+
         try:
             # Run all analyses in parallel for efficiency
             results = await asyncio.gather(
@@ -205,6 +225,91 @@ class AdvancedConsensusAnalyzer:
             logger.error("Consensus analysis failed", error=str(e))
             return self._fallback_consensus(responses)
 
+    async def _analyze_locally(
+        self,
+        question: str,
+        responses: List[Dict[str, Any]],
+        include_detailed_analysis: bool
+    ) -> ConsensusResult:
+        """Embedding-based analysis; at most one LLM call, for the narrative."""
+        try:
+            local = await self.local_engine.analyze(responses)
+
+            consensus_score = (
+                self.WEIGHT_SEMANTIC * local.semantic_similarity +
+                self.WEIGHT_CLAIMS * local.claim_overlap +
+                self.WEIGHT_RECOMMENDATIONS * local.recommendation_alignment +
+                self.WEIGHT_EVIDENCE * local.evidence_overlap
+            )
+            if consensus_score >= self.HIGH_CONSENSUS_THRESHOLD:
+                consensus_level = "high"
+            elif consensus_score >= self.MEDIUM_CONSENSUS_THRESHOLD:
+                consensus_level = "medium"
+            else:
+                consensus_level = "low"
+
+            llm_calls = 0
+            if include_detailed_analysis:
+                final_recommendation = await self._build_final_recommendation(
+                    question, responses, consensus_level, local.summary
+                )
+                llm_calls = 1
+            else:
+                final_recommendation = (
+                    f"Based on {len(responses)} expert responses with {consensus_level} consensus. "
+                    f"{local.summary}."
+                ) if local.summary else (
+                    f"Based on {len(responses)} expert responses with {consensus_level} consensus."
+                )
+
+            dissenting_opinions = self._extract_dissenting_opinions(responses, consensus_score)
+            for index in local.outliers:
+                agent_name = responses[index].get("agent_name", f"Expert {index + 1}")
+                if agent_name not in dissenting_opinions:
+                    content = responses[index].get("content", responses[index].get("response", ""))[:300]
+                    dissenting_opinions[agent_name] = f"Diverges from the panel: {content}..."
+
+            logger.info(
+                "Consensus analysis complete",
+                consensus_score=consensus_score,
+                consensus_level=consensus_level,
+                llm_calls=llm_calls,
+                **local.metadata
+            )
+
+            return ConsensusResult(
+                consensus_score=round(consensus_score, 3),
+                consensus_level=consensus_level,
+                semantic_similarity=round(local.semantic_similarity, 3),
+                claim_overlap=round(local.claim_overlap, 3),
+                recommendation_alignment=round(local.recommendation_alignment, 3),
+                evidence_overlap=round(local.evidence_overlap, 3),
+                agreement_points=local.agreement_points,
+                divergent_points=local.divergent_points,
+                key_themes=local.key_themes,
+                recommendation=final_recommendation,
+                dissenting_opinions=dissenting_opinions,
+                confidence=self._calculate_confidence(responses, consensus_score),
+                analysis_metadata={
+                    "response_count": len(responses),
+                    "analyzed_at": datetime.now(timezone.utc).isoformat(),
+                    "method": "local",
+                    "llm_calls": llm_calls,
+                    "action_types": local.action_types,
+                    **local.metadata,
+                    "weights": {
+                        "semantic": self.WEIGHT_SEMANTIC,
+                        "claims": self.WEIGHT_CLAIMS,
+                        "recommendations": self.WEIGHT_RECOMMENDATIONS,
+                        "evidence": self.WEIGHT_EVIDENCE
+                    }
+                }
+            )
+
+        except Exception as e:
+            logger.error("Consensus analysis failed", error=str(e))
+            return self._fallback_consensus(responses)
+
     async def _calculate_semantic_similarity(
         self,
         responses: List[Dict[str, Any]]
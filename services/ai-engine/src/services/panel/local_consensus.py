@@ -0,0 +1,437 @@
+"""
+Local Consensus Engine for Ask Panel
+
+Computes the consensus metrics of AdvancedConsensusAnalyzer from a single
+batch of embeddings instead of one LLM call per metric:
+
+1. Semantic similarity: mean pairwise cosine of the expert responses
+2. Claim overlap: claim sentences clustered across experts (leader
+   clustering in response order, so the result is deterministic); a claim
+   counts as agreed when another expert makes it too without contradicting it
+3. Recommendation alignment: majority share of the action type
+   (proceed/caution/stop/investigate) blended with the similarity of the
+   experts' recommendation sentences
+4. Evidence overlap: Jaccard of cited sources, or of evidence markers found
+   in the text (trial ids, PMIDs, "et al." references, URLs)
+
+Agreement and divergent points, key themes and semantic outliers come out of
+the same similarity matrices. When the embedding service is unavailable the
+engine falls back to TF-IDF vectors, with thresholds for lexical similarity.
+"""
+
+import math
+import os
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger()
+
+EmbedFn = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+MAX_CLAIMS_PER_RESPONSE = 15
+MAX_RESPONSE_CHARS = 4000
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+(?=[\"'(\[]?[A-Z0-9])|\n+")
+_LEADING_MARKUP = re.compile(r"^[\s>*#\-•\d.)]+")
+_LABEL_PREFIX = re.compile(r"^[A-Z][\w /&\-]{0,40}:\s+")
+_WORD = re.compile(r"[a-z][a-z0-9\-]+")
+_NEGATION = re.compile(
+    r"\b(not|no|never|none|cannot|can't|won't|shouldn't|don't|doesn't|isn't|aren't|"
+    r"avoid|against|insufficient|lacks?|lacking|unlikely|without)\b",
+    re.IGNORECASE,
+)
+_RECOMMENDATION_CUE = re.compile(
+    r"\b(recommend\w*|should|suggest\w*|advis\w*|propos\w*|must|next steps?|we need to|consider)\b",
+    re.IGNORECASE,
+)
+# Checked in order: "should not proceed" is a stop, not a proceed
+_ACTION_CUES: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("stop", ("not proceed", "halt", "discontinue", "abandon", "terminate", "reject", "stop")),
+    ("investigate", ("investigate", "further study", "more data", "additional data", "further research",
+                     "gather", "explore", "evaluate further", "pilot")),
+    ("caution", ("caution", "carefully", "monitor", "conditional", "limited", "risk mitigation", "phased")),
+    ("proceed", ("proceed", "approve", "go ahead", "move forward", "adopt", "launch", "pursue", "implement")),
+)
+_EVIDENCE_MARKER = re.compile(
+    r"NCT\d{8}|PMID:?\s*\d+|doi:\s*\S+|https?://[^\s)\]]+|"
+    r"\b[A-Z][a-z]+ et al\.?,? \(?\d{4}\)?|\b[A-Z]{3,}-\d+\b",
+)
+_STOPWORDS = frozenset(
+    "the a an and or but in on at to for of with by from as is was are were been be have has had do does "
+    "did will would should could may might must can this that these those it its they their there which "
+    "who what when where how also more most such than then very into about over under based given while "
+    "however therefore including include includes well within across between both each other any all".split()
+)
+
+
+@dataclass
+class Claim:
+    """A claim sentence attributed to one response"""
+    text: str
+    response: int
+    negated: bool
+    recommendation: bool
+
+
+@dataclass
+class ClaimCluster:
+    """Claims that state the same thing, possibly with opposite polarity"""
+    claims: List[int]
+    responses: List[int]
+    representative: int
+    conflicting: bool
+
+
+@dataclass
+class LocalConsensus:
+    """Metrics and extracted points for one set of responses"""
+    semantic_similarity: float
+    claim_overlap: float
+    recommendation_alignment: float
+    evidence_overlap: float
+    agreement_points: List[str]
+    divergent_points: List[str]
+    key_themes: List[str]
+    action_types: Dict[str, int]
+    outliers: List[int]
+    summary: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+async def _embedding_service_embed(texts: List[str]) -> List[List[float]]:
+    from services.shared.embedding_service import get_embedding_service
+
+    results = await get_embedding_service().embed_texts(texts, cache_key_prefix="panel_consensus")
+    return [result.embedding for result in results]
+
+
+class LocalConsensusEngine:
+    """
+    Embedding-based consensus metrics with no LLM calls.
+
+    Args:
+        embed: Async batch embedder (defaults to the shared embedding service)
+        claim_threshold: Cosine above which two claims are the same claim
+        similarity_floor: Cosine treated as "unrelated" when scaling to 0-1
+        retry_embeddings_after: Seconds to stay on TF-IDF after the embedder fails
+    """
+
+    # Thresholds for the TF-IDF fallback, whose cosines run much lower
+    LEXICAL_CLAIM_THRESHOLD = 0.45
+    LEXICAL_SIMILARITY_FLOOR = 0.0
+
+    def __init__(
+        self,
+        embed: Optional[EmbedFn] = _embedding_service_embed,
+        claim_threshold: Optional[float] = None,
+        similarity_floor: float = 0.4,
+        retry_embeddings_after: float = 300.0,
+    ):
+        self.embed = embed
+        self.claim_threshold = claim_threshold or float(os.getenv("ASK_PANEL_CLAIM_SIMILARITY", "0.75"))
+        self.similarity_floor = similarity_floor
+        self.retry_embeddings_after = retry_embeddings_after
+        self._embed_failed_at: Optional[float] = None
+
+    async def analyze(self, responses: Sequence[Dict[str, Any]]) -> LocalConsensus:
+        started = time.perf_counter()
+        names = [r.get("agent_name", f"Expert {i + 1}") for i, r in enumerate(responses)]
+        contents = [_content(r) for r in responses]
+        claims = [claim for i, text in enumerate(contents) for claim in split_claims(text, i)]
+
+        vectors, kind = await self._vectors([text[:MAX_RESPONSE_CHARS] for text in contents] + [c.text for c in claims])
+        lexical = kind == "lexical"
+        threshold = self.LEXICAL_CLAIM_THRESHOLD if lexical else self.claim_threshold
+        floor = self.LEXICAL_SIMILARITY_FLOOR if lexical else self.similarity_floor
+
+        n = len(responses)
+        response_sim = _scaled(vectors[:n] @ vectors[:n].T, floor)
+        claim_vectors = vectors[n:]
+        semantic = _mean_pairwise(response_sim)
+
+        clusters = cluster_claims(claims, claim_vectors, threshold)
+        claim_overlap = _claim_overlap(claims, clusters, n)
+        alignment, actions, action_conflict = _recommendation_alignment(claims, claim_vectors, contents, floor, semantic)
+        evidence, evidence_source = _evidence_overlap(responses, contents)
+        if evidence is None:
+            evidence = semantic
+
+        agreed = sorted(
+            (c for c in clusters if len(c.responses) > 1 and not c.conflicting),
+            key=lambda c: (-len(c.responses), -len(c.claims), c.claims[0]),
+        )
+        agreement_points = [claims[c.representative].text for c in agreed[:5]]
+
+        divergent_points = []
+        for cluster in (c for c in clusters if c.conflicting):
+            positive, negative = next(
+                (p, q) for p in cluster.claims for q in cluster.claims
+                if not claims[p].negated and claims[q].negated and claims[p].response != claims[q].response
+            )
+            divergent_points.append(
+                f"{names[claims[positive].response]}: {claims[positive].text} vs "
+                f"{names[claims[negative].response]}: {claims[negative].text}"
+            )
+        if action_conflict:
+            divergent_points.append(
+                "Recommended actions differ: " + ", ".join(f"{names[i]} → {action}" for i, action in action_conflict)
+            )
+
+        outliers = []
+        if n > 2:
+            for i in range(n):
+                others = np.delete(response_sim[i], i).mean()
+                if others < semantic - 0.25:
+                    outliers.append(i)
+                    first = next((c.text for c in claims if c.response == i), contents[i][:200])
+                    divergent_points.append(f"{names[i]} diverges from the panel: {first}")
+
+        themes = key_themes(contents)
+        summary = _summary(n, actions, agreement_points, divergent_points)
+        return LocalConsensus(
+            semantic_similarity=semantic,
+            claim_overlap=claim_overlap,
+            recommendation_alignment=alignment,
+            evidence_overlap=evidence,
+            agreement_points=agreement_points,
+            divergent_points=divergent_points[:5],
+            key_themes=themes,
+            action_types=dict(actions),
+            outliers=outliers,
+            summary=summary,
+            metadata={
+                "embedding": kind,
+                "texts_embedded": len(vectors),
+                "claims": len(claims),
+                "claim_clusters": len(clusters),
+                "agreed_clusters": len(agreed),
+                "conflicting_clusters": sum(c.conflicting for c in clusters),
+                "evidence_source": evidence_source,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+            },
+        )
+
+    async def _vectors(self, texts: List[str]) -> Tuple[np.ndarray, str]:
+        """Embed every text in one batch; TF-IDF when the embedder is down"""
+        cooling_down = (
+            self._embed_failed_at is not None
+            and time.monotonic() - self._embed_failed_at < self.retry_embeddings_after
+        )
+        if self.embed is not None and not cooling_down:
+            try:
+                matrix = np.asarray(await self.embed(texts), dtype=np.float32)
+                self._embed_failed_at = None
+                return _normalized(matrix), "embedding"
+            except Exception as e:
+                self._embed_failed_at = time.monotonic()
+                logger.warning("Consensus embeddings unavailable, using TF-IDF", error=str(e))
+        return tfidf_vectors(texts), "lexical"
+
+
+def _content(response: Dict[str, Any]) -> str:
+    return response.get("content", response.get("response", "")) or ""
+
+
+def split_claims(text: str, response: int) -> List[Claim]:
+    """Claim-sized sentences of a response, markdown and list markers removed"""
+    claims = []
+    for sentence in _SENTENCE_SPLIT.split(text):
+        sentence = _LEADING_MARKUP.sub("", sentence.replace("**", "").replace("__", "")).strip()
+        sentence = _LABEL_PREFIX.sub("", sentence)  # "Assessment: ..."
+        words = len(sentence.split())
+        if words < 5 or words > 60 or sentence.endswith(":"):
+            continue
+        claims.append(Claim(
+            text=sentence,
+            response=response,
+            negated=bool(_NEGATION.search(sentence)),
+            recommendation=bool(_RECOMMENDATION_CUE.search(sentence)),
+        ))
+        if len(claims) == MAX_CLAIMS_PER_RESPONSE:
+            break
+    return claims
+
+
+def cluster_claims(claims: Sequence[Claim], vectors: np.ndarray, threshold: float) -> List[ClaimCluster]:
+    """
+    Leader clustering against running centroids, in claim order.
+
+    A cluster is conflicting when different experts state it with opposite
+    polarity ("X is effective" / "X is not effective" embed close together).
+    """
+    members: List[List[int]] = []
+    centroids: List[np.ndarray] = []
+    for i in range(len(claims)):
+        if centroids:
+            sims = np.stack(centroids) @ vectors[i]
+            best = int(np.argmax(sims))
+            if sims[best] >= threshold:
+                members[best].append(i)
+                total = vectors[members[best]].sum(axis=0)
+                centroids[best] = total / (np.linalg.norm(total) or 1.0)
+                continue
+        members.append([i])
+        centroids.append(vectors[i])
+
+    clusters = []
+    for indices in members:
+        responses = list(dict.fromkeys(claims[i].response for i in indices))
+        within = vectors[indices] @ vectors[indices].T
+        # Medoid; argmax keeps the earliest claim on ties
+        representative = indices[int(np.argmax(within.sum(axis=1)))]
+        positive = {claims[i].response for i in indices if not claims[i].negated}
+        negative = {claims[i].response for i in indices if claims[i].negated}
+        conflicting = any(a != b for a in positive for b in negative)
+        clusters.append(ClaimCluster(indices, responses, representative, conflicting))
+    return clusters
+
+
+def classify_action(text: str) -> Optional[str]:
+    lowered = text.lower()
+    for action, cues in _ACTION_CUES:
+        if any(cue in lowered for cue in cues):
+            return action
+    return None
+
+
+def key_themes(contents: Sequence[str], limit: int = 5) -> List[str]:
+    """Content bigrams (then words) shared by the most responses"""
+    document_counts: Counter = Counter()
+    totals: Counter = Counter()
+    first_seen: Dict[str, int] = {}
+    for text in contents:
+        words = [w for w in _WORD.findall(text.lower()) if w not in _STOPWORDS and len(w) > 3]
+        terms = [f"{a} {b}" for a, b in zip(words, words[1:])] + words
+        for term in terms:
+            first_seen.setdefault(term, len(first_seen))
+        totals.update(terms)
+        document_counts.update(set(terms))
+
+    minimum = 2 if len(contents) > 1 else 1
+    ranked = sorted(
+        (t for t, df in document_counts.items() if df >= minimum),
+        key=lambda t: (-document_counts[t], -(" " in t), -totals[t], first_seen[t]),
+    )
+    themes: List[str] = []
+    for term in ranked:
+        # A word already covered by a chosen bigram adds nothing
+        if not any(term in chosen.split() or term == chosen for chosen in themes):
+            themes.append(term)
+        if len(themes) == limit:
+            break
+    return themes
+
+
+def tfidf_vectors(texts: Sequence[str]) -> np.ndarray:
+    """L2-normalized TF-IDF rows over content words (light plural stemming)"""
+    documents = [
+        [w[:-1] if w.endswith("s") and len(w) > 4 else w for w in _WORD.findall(text.lower()) if w not in _STOPWORDS]
+        for text in texts
+    ]
+    vocabulary: Dict[str, int] = {}
+    for words in documents:
+        for word in words:
+            vocabulary.setdefault(word, len(vocabulary))
+    matrix = np.zeros((len(documents), max(len(vocabulary), 1)), dtype=np.float32)
+    for row, words in enumerate(documents):
+        for word, count in Counter(words).items():
+            matrix[row, vocabulary[word]] = 1.0 + math.log(count)
+    document_frequency = (matrix > 0).sum(axis=0)
+    matrix *= np.log((1 + len(documents)) / (1 + document_frequency)) + 1.0
+    return _normalized(matrix)
+
+
+def _normalized(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms > 0, norms, 1.0)
+
+
+def _scaled(similarity: np.ndarray, floor: float) -> np.ndarray:
+    return np.clip((similarity - floor) / (1.0 - floor), 0.0, 1.0)
+
+
+def _mean_pairwise(similarity: np.ndarray) -> float:
+    n = len(similarity)
+    if n < 2:
+        return 1.0
+    upper = similarity[np.triu_indices(n, k=1)]
+    return float(upper.mean())
+
+
+def _claim_overlap(claims: Sequence[Claim], clusters: Sequence[ClaimCluster], n: int) -> float:
+    """Mean over experts of the share of their claims another expert agrees with"""
+    shared = [0] * n
+    made = [0] * n
+    for cluster in clusters:
+        agreed = len(cluster.responses) > 1 and not cluster.conflicting
+        for i in cluster.claims:
+            made[claims[i].response] += 1
+            shared[claims[i].response] += agreed
+    ratios = [s / m for s, m in zip(shared, made) if m]
+    return float(np.mean(ratios)) if ratios else 0.5
+
+
+def _recommendation_alignment(claims, claim_vectors, contents, floor, semantic):
+    """Majority action share blended with recommendation-sentence similarity"""
+    actions: Dict[int, str] = {}
+    centroids: Dict[int, np.ndarray] = {}
+    for response, text in enumerate(contents):
+        indices = [i for i, c in enumerate(claims) if c.response == response and c.recommendation]
+        sentences = " ".join(claims[i].text for i in indices) or text
+        action = classify_action(sentences)
+        if action:
+            actions[response] = action
+        if indices:
+            total = claim_vectors[indices].sum(axis=0)
+            centroids[response] = total / (np.linalg.norm(total) or 1.0)
+
+    counts = Counter(actions.values())
+    share = counts.most_common(1)[0][1] / len(actions) if len(actions) > 1 else None
+    if len(centroids) > 1:
+        stacked = np.stack(list(centroids.values()))
+        similarity = _mean_pairwise(_scaled(stacked @ stacked.T, floor))
+    else:
+        similarity = semantic
+    alignment = similarity if share is None else 0.5 * share + 0.5 * similarity
+
+    conflict = []
+    if {"proceed", "stop"} <= set(counts) or (len(counts) > 1 and share is not None and share <= 0.5):
+        conflict = sorted(actions.items())
+    return alignment, counts, conflict
+
+
+def _evidence_overlap(responses, contents) -> Tuple[Optional[float], str]:
+    cited = []
+    for response in responses:
+        citations = response.get("citations", response.get("sources_used", []))
+        cited.append({str(c) for c in citations} if isinstance(citations, list) else set())
+    source = "citations"
+    if not any(cited):
+        cited = [{m.lower().rstrip(".,;") for m in _EVIDENCE_MARKER.findall(text)} for text in contents]
+        source = "text_markers"
+    with_evidence = [s for s in cited if s]
+    if len(with_evidence) < 2:
+        return None, "semantic_proxy"
+    pairs = [
+        len(a & b) / len(a | b)
+        for i, a in enumerate(with_evidence)
+        for b in with_evidence[i + 1:]
+    ]
+    return float(np.mean(pairs)), source
+
+
+def _summary(n: int, actions: Counter, agreement_points: List[str], divergent_points: List[str]) -> str:
+    parts = []
+    if actions:
+        parts.append("Recommended actions: " + ", ".join(f"{a} ×{c}" for a, c in actions.most_common()))
+    if agreement_points:
+        parts.append(f"agreement across the {n} experts on {len(agreement_points)} point(s)")
+    if divergent_points:
+        parts.append(f"disagreement on {len(divergent_points)} point(s)")
+    return "; ".join(parts)
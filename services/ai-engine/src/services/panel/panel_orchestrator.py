@@ -15,9 +15,13 @@ from services.supabase_client import SupabaseClient
 from services.cache_manager import CacheManager
 from services.unified_rag_service import UnifiedRAGService
 from core.config import get_settings
+from services.panel.panel_pipeline import PanelPipeline, mean_confidence
 
 logger = structlog.get_logger()
 
+# Characters of each earlier response included in an expert's prompt
+DISCUSSION_CONTEXT_CHARS = 200
+
 
 class PanelOrchestrator:
     """
@@ -264,6 +268,7 @@ class PanelOrchestrator:
         panel_id = panel["id"]
         query = panel["agenda"][0]["topic"] if panel.get("agenda") else panel["name"]
         mode = panel.get("mode", "parallel")
+        panel_type = self._get_panel_type(panel)
         max_rounds = panel.get("agenda", [{}])[0].get("max_rounds", self.max_rounds)
         
         try:
@@ -272,44 +277,37 @@ class PanelOrchestrator:
             if panel.get("evidence_pack"):
                 rag_context = await self._get_rag_context(query, panel["evidence_pack"])
             
-            # Execute discussion rounds
-            all_responses = []
-            
-            for round_num in range(1, max_rounds + 1):
-                logger.info(f"🎭 Executing round {round_num}/{max_rounds}", panel_id=panel_id)
-                
-                # Execute round based on mode
-                if mode == "parallel":
-                    responses = await self._execute_parallel_round(
-                        panel, round_num, query, rag_context, all_responses
-                    )
-                elif mode == "sequential":
-                    responses = await self._execute_sequential_round(
-                        panel, round_num, query, rag_context, all_responses
-                    )
-                else:
-                    responses = await self._execute_parallel_round(
-                        panel, round_num, query, rag_context, all_responses
-                    )
-                
-                all_responses.extend(responses)
-                
-                # Store responses
-                await self._store_responses(panel_id, responses)
-                
-                # Check for consensus
-                consensus = await self.build_consensus(panel_id, all_responses, round_num)
-                
-                if consensus["consensus_level"] >= self.min_consensus:
-                    logger.info(
-                        f"✅ Consensus reached at {consensus['consensus_level']:.2%}",
-                        panel_id=panel_id,
-                        round=round_num
-                    )
-                    break
-            
-            # Generate final report
-            final_consensus = await self.build_consensus(panel_id, all_responses, round_num)
+            # Rounds are pipelined: consensus for a round overlaps the next
+            # round, which starts speculatively while the indicator is stable
+            pipeline = PanelPipeline(
+                respond=lambda agent, round_num, previous, on_partial: self._get_expert_response(
+                    agent=agent,
+                    query=query,
+                    round_num=round_num,
+                    rag_context=rag_context,
+                    previous_responses=previous,
+                    panel_type=panel_type
+                ),
+                analyze=lambda responses, round_num: self.build_consensus(panel_id, responses, round_num),
+                min_consensus=self.min_consensus,
+                estimate=mean_confidence,
+                context_chars=DISCUSSION_CONTEXT_CHARS,
+                on_round_committed=lambda round_num, responses: self._store_responses(panel_id, responses)
+            )
+            agents = [member.get("agents", member) for member in panel["members"]]
+            result = await pipeline.run(agents, max_rounds, sequential=(mode == "sequential"))
+            all_responses = result.responses
+            round_num = result.rounds
+
+            logger.info(
+                "🎭 Panel rounds complete",
+                panel_id=panel_id,
+                consensus_level=result.consensus.get("consensus_level"),
+                **result.stats.to_dict()
+            )
+
+            # The last round's verdict already covers every committed response
+            final_consensus = result.consensus
             report = await self._generate_report(panel, final_consensus, all_responses)
             
             # Update panel as completed
@@ -331,63 +329,6 @@ class PanelOrchestrator:
             logger.error("❌ Panel execution failed", panel_id=panel_id, error=str(e))
             raise
     
-    async def _execute_parallel_round(
-        self,
-        panel: Dict[str, Any],
-        round_num: int,
-        query: str,
-        rag_context: Optional[Dict[str, Any]],
-        previous_responses: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
-        """Execute a round where all experts respond in parallel"""
-        tasks = []
-        panel_type = self._get_panel_type(panel)
-
-        for member in panel["members"]:
-            agent = member.get("agents", member)
-            task = self._get_expert_response(
-                agent=agent,
-                query=query,
-                round_num=round_num,
-                rag_context=rag_context,
-                previous_responses=previous_responses,
-                panel_type=panel_type
-            )
-            tasks.append(task)
-
-        responses = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Filter out errors
-        valid_responses = [r for r in responses if not isinstance(r, Exception)]
-
-        return valid_responses
-
-    async def _execute_sequential_round(
-        self,
-        panel: Dict[str, Any],
-        round_num: int,
-        query: str,
-        rag_context: Optional[Dict[str, Any]],
-        previous_responses: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
-        """Execute a round where experts respond sequentially"""
-        responses = []
-        panel_type = self._get_panel_type(panel)
-
-        for member in panel["members"]:
-            agent = member.get("agents", member)
-            response = await self._get_expert_response(
-                agent=agent,
-                query=query,
-                round_num=round_num,
-                rag_context=rag_context,
-                previous_responses=previous_responses + responses,  # Include responses from this round
-                panel_type=panel_type
-            )
-            responses.append(response)
-
-        return responses
-    
     async def _get_expert_response(
         self,
         agent: Dict[str, Any],
@@ -494,7 +435,7 @@ class PanelOrchestrator:
         
         for resp in previous_responses[-5:]:  # Last 5 responses
             expert = resp.get("agent_name", "Expert")
-            answer = resp.get("answer", "")[:200]  # Truncate
+            answer = resp.get("answer", "")[:DISCUSSION_CONTEXT_CHARS]  # Truncate
             context_lines.append(f"\n{expert}: {answer}...")
         
         return "\n".join(context_lines)
@@ -1126,9 +1067,9 @@ Be professional and conclusive."""
             "\n## Summary\n",
             consensus.get("summary_md", ""),
             "\n## Consensus\n",
-            consensus.get("consensus", "No clear consensus reached"),
+            consensus.get("consensus") or "No clear consensus reached",
             "\n## Dissenting Views\n",
-            consensus.get("dissent", "No significant dissent"),
+            consensus.get("dissent") or "No significant dissent",
             "\n## Recommendations\n",
             "Based on panel discussion...\n"  # TODO: Generate recommendations
         ]
@@ -0,0 +1,242 @@
+"""
+Panel Pipeline - pipelined and speculative panel rounds
+
+Executes panel rounds so that independent work overlaps instead of adding up:
+
+- Sequential rounds are pipelined: an expert's prompt only uses the first
+  ``context_chars`` characters of each earlier response, so the next expert
+  starts as soon as its predecessors have produced that much (streamed
+  through ``on_partial``) rather than when they finish. Responders that do
+  not stream report their output on completion and run strictly in turn.
+- The consensus analysis of round N runs concurrently with round N+1.
+  Round N+1 is started speculatively when the cheap consensus indicator has
+  been stable below the threshold for the last few responses, i.e. the
+  verdict is very likely "continue".
+- If the verdict says consensus was reached after all, the speculative round
+  is cancelled (including experts still in flight) and its responses are
+  discarded; nothing from it is committed.
+
+Usage:
+    pipeline = PanelPipeline(respond=..., analyze=..., min_consensus=0.7)
+    result = await pipeline.run(agents, max_rounds=3, sequential=True)
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+import structlog
+
+logger = structlog.get_logger()
+
+# respond(agent, round_num, previous_responses, on_partial) -> response dict
+Responder = Callable[[Dict[str, Any], int, List[Dict[str, Any]], Callable[[str], None]], Awaitable[Dict[str, Any]]]
+# analyze(all_responses, round_num) -> consensus dict with "consensus_level"
+Analyzer = Callable[[List[Dict[str, Any]], int], Awaitable[Dict[str, Any]]]
+Estimator = Callable[[List[Dict[str, Any]]], float]
+RoundCallback = Callable[[int, List[Dict[str, Any]]], Awaitable[None]]
+
+
+def mean_confidence(responses: Sequence[Dict[str, Any]]) -> float:
+    """Default consensus indicator: mean expert confidence"""
+    if not responses:
+        return 0.0
+    return sum(r.get("confidence", 0.5) for r in responses) / len(responses)
+
+
+@dataclass
+class PipelineStats:
+    rounds: int = 0
+    expert_calls: int = 0
+    early_starts: int = 0  # experts started before their predecessor finished
+    speculative_started: int = 0
+    speculative_committed: int = 0
+    speculative_cancelled: int = 0
+    cancelled_expert_calls: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return dict(self.__dict__)
+
+
+@dataclass
+class PanelRunResult:
+    responses: List[Dict[str, Any]]
+    rounds: int
+    consensus: Dict[str, Any]
+    stats: PipelineStats = field(default_factory=PipelineStats)
+
+
+class _Slot:
+    """One expert's output within a round, as it streams in"""
+
+    def __init__(self, agent: Dict[str, Any], context_chars: int):
+        self.agent = agent
+        self.text = ""
+        self.done = False
+        self.context_chars = context_chars
+        self.context_ready = asyncio.Event()
+
+    def update(self, text: str) -> None:
+        self.text = text
+        if len(text) >= self.context_chars:
+            self.context_ready.set()
+
+    def finish(self, text: str) -> None:
+        self.text = text
+        self.done = True
+        self.context_ready.set()
+
+    def as_context(self) -> Dict[str, Any]:
+        return {
+            "agent_id": self.agent.get("id"),
+            "agent_name": self.agent.get("name", "Unknown Expert"),
+            "answer": self.text,
+        }
+
+
+class PanelPipeline:
+    """
+    Round engine for multi-expert panels.
+
+    Args:
+        respond: Produces one expert's response; may stream via on_partial
+        analyze: Full consensus analysis of all responses so far
+        min_consensus: Consensus level that ends the panel
+        estimate: Cheap indicator computed after every response
+        context_chars: Characters of a response the next prompt depends on
+        speculate: Start the next round before the verdict when stable
+        stability_window: Indicator readings that must agree
+        stability_margin: Distance below min_consensus they must keep
+        on_round_committed: Called once a round's verdict is in (e.g. persist)
+    """
+
+    def __init__(
+        self,
+        respond: Responder,
+        analyze: Analyzer,
+        min_consensus: float,
+        estimate: Estimator = mean_confidence,
+        context_chars: int = 200,
+        speculate: bool = True,
+        stability_window: int = 2,
+        stability_margin: float = 0.05,
+        on_round_committed: Optional[RoundCallback] = None,
+    ):
+        self.respond = respond
+        self.analyze = analyze
+        self.min_consensus = min_consensus
+        self.estimate = estimate
+        self.context_chars = context_chars
+        self.speculate = speculate
+        self.stability_window = stability_window
+        self.stability_margin = stability_margin
+        self.on_round_committed = on_round_committed
+
+    async def run(self, agents: Sequence[Dict[str, Any]], max_rounds: int, sequential: bool = False) -> PanelRunResult:
+        stats = PipelineStats()
+        committed: List[Dict[str, Any]] = []
+        consensus: Dict[str, Any] = {"consensus_level": 0.0}
+        speculative: Optional[asyncio.Task] = None
+        indicator: List[float] = []
+
+        try:
+            for round_num in range(1, max_rounds + 1):
+                if speculative is not None:
+                    round_responses = await speculative
+                    speculative = None
+                else:
+                    indicator = []
+                    round_responses = await self._run_round(agents, round_num, committed, sequential, stats, indicator)
+
+                candidate = committed + round_responses
+                verdict = asyncio.create_task(self.analyze(candidate, round_num))
+                if round_num < max_rounds and self._stable_continue(indicator):
+                    indicator = []
+                    speculative = asyncio.create_task(
+                        self._run_round(agents, round_num + 1, candidate, sequential, stats, indicator)
+                    )
+                    stats.speculative_started += 1
+                    logger.info("panel_round_speculative_start", round=round_num + 1)
+
+                consensus = await verdict
+                committed = candidate
+                stats.rounds = round_num
+                if self.on_round_committed is not None:
+                    await self.on_round_committed(round_num, round_responses)
+
+                if consensus.get("consensus_level", 0.0) >= self.min_consensus:
+                    if speculative is not None:
+                        await self._cancel(speculative)
+                        speculative = None
+                        stats.speculative_cancelled += 1
+                        logger.info("panel_round_speculation_cancelled", round=round_num + 1)
+                    break
+                if speculative is not None:
+                    stats.speculative_committed += 1
+        finally:
+            if speculative is not None:
+                await self._cancel(speculative)
+
+        return PanelRunResult(responses=committed, rounds=stats.rounds, consensus=consensus, stats=stats)
+
+    def _stable_continue(self, readings: List[float]) -> bool:
+        """True when the indicator has stayed clearly below the threshold"""
+        if not self.speculate or len(readings) < self.stability_window:
+            return False
+        recent = readings[-self.stability_window:]
+        return all(value <= self.min_consensus - self.stability_margin for value in recent)
+
+    async def _run_round(
+        self,
+        agents: Sequence[Dict[str, Any]],
+        round_num: int,
+        previous: List[Dict[str, Any]],
+        sequential: bool,
+        stats: PipelineStats,
+        indicator: List[float],
+    ) -> List[Dict[str, Any]]:
+        slots = [_Slot(agent, self.context_chars) for agent in agents]
+        finished: List[Optional[Dict[str, Any]]] = [None] * len(slots)
+
+        async def expert(index: int) -> None:
+            slot = slots[index]
+            try:
+                context = previous
+                if sequential:
+                    earlier = slots[:index]
+                    for other in earlier:
+                        await other.context_ready.wait()
+                    if earlier and not earlier[-1].done:
+                        stats.early_starts += 1
+                    context = previous + [other.as_context() for other in earlier if other.text]
+                stats.expert_calls += 1
+                response = await self.respond(slot.agent, round_num, context, slot.update)
+                finished[index] = response
+                slot.finish(response.get("answer", ""))
+                indicator.append(self.estimate(previous + [r for r in finished if r is not None]))
+            except asyncio.CancelledError:
+                stats.cancelled_expert_calls += 1
+                raise
+            except Exception as e:
+                logger.error("panel_expert_failed", agent_id=slot.agent.get("id"), round=round_num, error=str(e))
+                slot.finish("")
+
+        tasks = [asyncio.create_task(expert(i)) for i in range(len(slots))]
+        try:
+            await asyncio.gather(*tasks)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        # Sequential rounds keep the finished responses' full text, not the partial views
+        return [response for response in finished if response is not None]
+
+    @staticmethod
+    async def _cancel(task: asyncio.Task) -> None:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
@@ -977,8 +977,9 @@ You may maintain your position if you believe it's correct despite group feedbac
                 {"agent_name": f"Expert {i+1}", "content": r.content, "confidence": r.confidence}
                 for i, r in enumerate(round_responses)
             ]
+            # Only the score and agreement points are used per round
             round_consensus = await self.consensus_analyzer.analyze_consensus(
-                question, response_dicts
+                question, response_dicts, include_detailed_analysis=False
             )
 
             round_result = PanelRoundResult(
@@ -21,10 +21,13 @@ import asyncio
 import time
 import os
 from services.supabase_client import get_supabase_client
+from services.shared.agent_catalog import get_agent_catalog
 from services.neo4j_client import get_neo4j_client
 from services.embedding_service import EmbeddingService
 import structlog
 
+from fusion.rank_fusion import Leg, fuse
+
 logger = structlog.get_logger()
 
 # Module-level metrics counter for stub agent fallbacks
@@ -490,28 +493,35 @@ class GraphRAGSelector:
             List of agents with vector similarity scores
         """
         try:
-            from pinecone import Pinecone
-
-            api_key = os.getenv("PINECONE_API_KEY")
-            if not api_key:
-                logger.warning("Pinecone API key not configured, skipping vector search")
-                return []
-
-            pc = Pinecone(api_key=api_key)
-
             # Use dedicated agent index (from env or default)
             # Note: The "ont-agents" namespace contains all agent embeddings (2,547 vectors)
             # Check both env var names for compatibility
             index_name = os.getenv("PINECONE_AGENTS_INDEX_NAME") or os.getenv("PINECONE_AGENT_INDEX", "vital-knowledge")
             agent_namespace = os.getenv("PINECONE_AGENT_NAMESPACE", "ont-agents")
+            query_dim = len(query_embedding)
 
-            index = pc.Index(index_name)
+            if os.getenv("VECTOR_STORE_PROVIDER", "pinecone").lower() == "local":
+                # Embedded Pinecone-compatible store (single node, CI, offline eval)
+                from graphrag.clients.local_vector_store import get_local_vector_store
 
-            # Check embedding dimension compatibility
-            # The current embedding service uses all-mpnet-base-v2 (768-dim)
-            # but the Pinecone index was created with text-embedding-3-large (3072-dim)
-            query_dim = len(query_embedding)
-            expected_dim = int(os.getenv("PINECONE_INDEX_DIMENSION", "3072"))
+                index = get_local_vector_store()
+                index_name = "local"
+                expected_dim = index.dimension or query_dim
+            else:
+                from pinecone import Pinecone
+
+                api_key = os.getenv("PINECONE_API_KEY")
+                if not api_key:
+                    logger.warning("Pinecone API key not configured, skipping vector search")
+                    return []
+
+                pc = Pinecone(api_key=api_key)
+                index = pc.Index(index_name)
+
+                # Check embedding dimension compatibility
+                # The current embedding service uses all-mpnet-base-v2 (768-dim)
+                # but the Pinecone index was created with text-embedding-3-large (3072-dim)
+                expected_dim = int(os.getenv("PINECONE_INDEX_DIMENSION", "3072"))
 
             if query_dim != expected_dim:
                 logger.warning(
@@ -651,65 +661,34 @@ class GraphRAGSelector:
         Returns:
             List of agents sorted by fused score (descending)
         """
-        agent_scores = {}
-
-        # Process PostgreSQL results (30% weight)
-        for rank, result in enumerate(postgres):
-            agent_id = result["agent_id"]
-            if agent_id not in agent_scores:
-                agent_scores[agent_id] = {
-                    "agent_id": agent_id,
-                    "agent_name": result["agent_name"],
-                    "scores": {},
-                    "ranks": {},
-                    "fused_score": 0.0
-                }
-
-            rrf_score = 1.0 / (rank + self.RRF_K)
-            agent_scores[agent_id]["scores"]["postgres"] = result["postgres_score"]
-            agent_scores[agent_id]["ranks"]["postgres"] = rank
-            agent_scores[agent_id]["fused_score"] += self.WEIGHTS["postgres_fulltext"] * rrf_score
-
-        # Process Pinecone results (50% weight)
-        for rank, result in enumerate(pinecone):
-            agent_id = result["agent_id"]
-            if agent_id not in agent_scores:
-                agent_scores[agent_id] = {
-                    "agent_id": agent_id,
-                    "agent_name": result["agent_name"],
-                    "scores": {},
-                    "ranks": {},
-                    "fused_score": 0.0
-                }
-
-            rrf_score = 1.0 / (rank + self.RRF_K)
-            agent_scores[agent_id]["scores"]["pinecone"] = result["pinecone_score"]
-            agent_scores[agent_id]["ranks"]["pinecone"] = rank
-            agent_scores[agent_id]["fused_score"] += self.WEIGHTS["pinecone_vector"] * rrf_score
-
-        # Process Neo4j results (20% weight)
-        for rank, result in enumerate(neo4j):
-            agent_id = result["agent_id"]
-            if agent_id not in agent_scores:
-                agent_scores[agent_id] = {
-                    "agent_id": agent_id,
-                    "agent_name": result["agent_name"],
-                    "scores": {},
-                    "ranks": {},
-                    "fused_score": 0.0
-                }
-
-            rrf_score = 1.0 / (rank + self.RRF_K)
-            agent_scores[agent_id]["scores"]["neo4j"] = result["neo4j_score"]
-            agent_scores[agent_id]["ranks"]["neo4j"] = rank
-            agent_scores[agent_id]["fused_score"] += self.WEIGHTS["neo4j_graph"] * rrf_score
-
-        # Sort by fused score (descending)
-        sorted_agents = sorted(
-            agent_scores.values(),
-            key=lambda x: x["fused_score"],
-            reverse=True
-        )
+        methods = [
+            ("postgres", postgres, self.WEIGHTS["postgres_fulltext"]),
+            ("pinecone", pinecone, self.WEIGHTS["pinecone_vector"]),
+            ("neo4j", neo4j, self.WEIGHTS["neo4j_graph"]),
+        ]
+        names = {}
+        legs = []
+        for method, results, weight in methods:
+            for result in results:
+                names.setdefault(result["agent_id"], result["agent_name"])
+            legs.append(Leg(
+                name=method,
+                ids=[result["agent_id"] for result in results],
+                scores=[result[f"{method}_score"] for result in results],
+                ranks=range(len(results)),  # 0-indexed: 1 / (rank + k)
+                weight=weight,
+            ))
+
+        sorted_agents = [
+            {
+                "agent_id": item.id,
+                "agent_name": names[item.id],
+                "scores": item.leg_scores,
+                "ranks": {method: int(rank) for method, rank in item.leg_ranks.items()},
+                "fused_score": item.score,
+            }
+            for item in fuse(legs, method="rrf", k=self.RRF_K)
+        ]
 
         logger.debug(
             "Score fusion completed",
@@ -968,24 +947,36 @@ class GraphRAGSelector:
             return []
 
         try:
-            supabase = self._get_supabase()
-
             agent_ids = [agent["agent_id"] for agent in agents]
 
-            # Batch fetch agent details
-            # Note: supabase-py client is synchronous, so we run in thread pool
-            def _fetch_agents():
-                return supabase.table("agents").select("*").in_(
-                    "id", agent_ids
-                ).execute()
-
-            result = await asyncio.to_thread(_fetch_agents)
-
-            # Create lookup map
-            agent_details_map = {
-                agent["id"]: agent
-                for agent in (result.data or [])
-            }
+            # Shared agent catalog first (no I/O). A fresh catalog is
+            # authoritative; otherwise only the IDs it lacks hit the database.
+            agent_details_map = {}
+            missing_ids = agent_ids
+            catalog = get_agent_catalog()
+            if catalog is not None and catalog.ready:
+                agent_details_map = dict(catalog.get_agents(agent_ids))
+                missing_ids = [] if catalog.is_fresh() else [
+                    agent_id for agent_id in agent_ids if agent_id not in agent_details_map
+                ]
+
+            if missing_ids:
+                supabase = self._get_supabase()
+
+                # Batch fetch agent details
+                # Note: supabase-py client is synchronous, so we run in thread pool
+                def _fetch_agents():
+                    return supabase.table("agents").select("*").in_(
+                        "id", missing_ids
+                    ).execute()
+
+                result = await asyncio.to_thread(_fetch_agents)
+
+                # Create lookup map
+                agent_details_map.update({
+                    agent["id"]: agent
+                    for agent in (result.data or [])
+                })
 
             # Log any stale IDs (exist in Pinecone but not in PostgreSQL)
             found_ids = set(agent_details_map.keys())
@@ -24,6 +24,7 @@ from langchain_core.documents import Document
 import numpy as np
 
 from services.supabase_client import SupabaseClient
+from services.shared.agent_catalog import get_agent_catalog
 try:
     from services.neo4j_client import Neo4jClient
     NEO4J_AVAILABLE = True
@@ -50,13 +51,16 @@ except ImportError:
 # Query Classification for auto-strategy selection
 try:
     from services.query_classifier import get_query_classifier, QueryClassification
+    from services.consultation.query_understanding import understand_query
     QUERY_CLASSIFIER_AVAILABLE = True
 except ImportError:
     QUERY_CLASSIFIER_AVAILABLE = False
     get_query_classifier = None
     QueryClassification = None
+    understand_query = None
 
 from core.config import get_settings
+from core.request_memo import amemoized
 
 logger = structlog.get_logger()
 
@@ -119,7 +123,12 @@ class UnifiedRAGService:
             pinecone_api_key = os.getenv("PINECONE_API_KEY")
             pinecone_index_name = os.getenv("PINECONE_INDEX_NAME", "vital-knowledge")
             
-            if not PINECONE_AVAILABLE:
+            if getattr(self.settings, "vector_store_provider", "pinecone") == "local":
+                # Embedded Pinecone-compatible store (single node, CI, offline eval)
+                from graphrag.clients.local_vector_store import get_local_vector_store
+                self.pinecone_index = get_local_vector_store()
+                logger.info("✅ Local vector store connected", **self.pinecone_index.describe_index_stats())
+            elif not PINECONE_AVAILABLE:
                 logger.warning("⚠️ Pinecone module not installed, using Supabase only")
                 self.pinecone = None
                 self.pinecone_index = None
@@ -295,7 +304,7 @@ class UnifiedRAGService:
             # Auto-strategy selection using query classifier
             classification = None
             if strategy == "auto" and self.query_classifier:
-                classification = self.query_classifier.classify(query_text)
+                classification = understand_query(query_text).classification
                 recommended = classification.recommended_strategy
                 strategy = self._strategy_mapping.get(recommended, "hybrid")
                 logger.info(
@@ -832,7 +841,14 @@ class UnifiedRAGService:
             raise
 
     async def _generate_embedding(self, text: str) -> List[float]:
-        """Generate embedding for text"""
+        """Generate embedding for text (once per request and model)"""
+        if self.embedding_service:
+            model = self.embedding_service.get_model_name()
+        else:
+            model = self.settings.openai_embedding_model
+        return await amemoized("embedding", (model, text), lambda: self._create_embedding(text))
+
+    async def _create_embedding(self, text: str) -> List[float]:
         try:
             # Use embedding service factory if available (supports both OpenAI and HuggingFace)
             if self.embedding_service:
@@ -999,10 +1015,24 @@ class UnifiedRAGService:
             logger.error("❌ Re-ranking failed", error=str(e))
             return results[:max_results]
 
+    async def _get_agent_row(self, agent_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Agent row from the shared agent catalog, else Supabase.
+
+        The catalog is keyed by id; names (accepted by get_agent_by_id) and
+        rows it has not picked up yet fall through to the database.
+        """
+        catalog = get_agent_catalog()
+        if catalog is not None and catalog.ready:
+            row = catalog.get_agent(agent_id)
+            if row is not None:
+                return row
+        return await self.supabase.get_agent_by_id(agent_id)
+
     async def _get_agent_domains(self, agent_id: str) -> Optional[List[str]]:
         """Get preferred domains for an agent"""
         try:
-            agent = await self.supabase.get_agent_by_id(agent_id)
+            agent = await self._get_agent_row(agent_id)
             if agent:
                 # Extract domain preferences from agent metadata
                 domains = agent.get("domains") or agent.get("preferred_domains")
@@ -1026,7 +1056,7 @@ class UnifiedRAGService:
             List of KD-* namespace strings or None if not configured
         """
         try:
-            agent = await self.supabase.get_agent_by_id(agent_id)
+            agent = await self._get_agent_row(agent_id)
             if agent:
                 # Prefer normalized column, fallback to JSONB metadata for backward compatibility
                 namespaces = agent.get("knowledge_namespaces")
@@ -13,48 +13,67 @@ Categories:
 - Monitoring and analytics
 """
 
-# Database clients
-from .supabase_client import SupabaseClient
-from .tenant_aware_supabase import TenantAwareSupabase
-from .neo4j_client import Neo4jClient
-from .neo4j_sync_service import Neo4jSyncService
-from .pinecone_sync_service import PineconeSyncService
+from importlib import import_module
+
+# Exports resolve on first access (PEP 562): the submodules pull in provider
+# SDKs, sentence-transformers/torch and Neo4j drivers, and most importers of
+# services.shared only need one or two of them.
+_EXPORTS = {
+    # Database clients
+    "SupabaseClient": "supabase_client",
+    "TenantAwareSupabase": "tenant_aware_supabase",
+    "Neo4jClient": "neo4j_client",
+    "Neo4jSyncService": "neo4j_sync_service",
+    "PineconeSyncService": "pinecone_sync_service",
+    # Embedding (RAG services moved to services.rag/)
+    "EmbeddingService": "embedding_service",
+    "EmbeddingServiceFactory": "embedding_service_factory",
+    "HuggingFaceEmbeddingService": "huggingface_embedding_service",
+    # Session and conversation
+    "SessionManager": "session_manager",
+    "SessionMemoryService": "session_memory_service",
+    "SessionAnalyticsService": "session_analytics_service",
+    "ConversationManager": "conversation_manager",
+    "ConversationHistoryAnalyzer": "conversation_history_analyzer",
+    "EnhancedConversationManager": "enhanced_conversation_manager",
+    "ConversationContextStore": "conversation_context_store",
+    # Caching and streaming
+    "CacheManager": "cache_manager",
+    "StreamingManager": "streaming_manager",
+    "CheckpointStore": "checkpoint_store",
+    # Quality and Scoring
+    "EvidenceScoringService": "evidence_scoring_service",
+    "FaithfulnessScorer": "faithfulness_scorer",
+    # Utilities
+    "LLMService": "llm_service",
+    "DataSanitizer": "data_sanitizer",
+    "FeedbackManager": "feedback_manager",
+    "Publisher": "publisher",
+    "CircuitBreaker": "resilience",
+    "LangfuseMonitor": "langfuse_monitor",
+    "MetadataProcessingService": "metadata_processing_service",
+    "SmartMetadataExtractor": "smart_metadata_extractor",
+    "SkillsLoaderService": "skills_loader_service",
+    "CapabilityCatalog": "capability_catalog",
+    "AgentCatalogService": "agent_catalog",
+    "get_agent_catalog": "agent_catalog",
+    "ToolRegistryService": "tool_registry_service",
+    "GraphRelationshipBuilder": "graph_relationship_builder",
+    "RealWorkerPoolManager": "real_worker_pool_manager",
+}
 
-# Embedding (RAG services moved to services.rag/)
-from .embedding_service import EmbeddingService
-from .embedding_service_factory import EmbeddingServiceFactory
-from .huggingface_embedding_service import HuggingFaceEmbeddingService
 
-# Session and conversation
-from .session_manager import SessionManager
-from .session_memory_service import SessionMemoryService
-from .session_analytics_service import SessionAnalyticsService
-from .conversation_manager import ConversationManager
-from .conversation_history_analyzer import ConversationHistoryAnalyzer
-from .enhanced_conversation_manager import EnhancedConversationManager
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
 
-# Caching and streaming
-from .cache_manager import CacheManager
-from .streaming_manager import StreamingManager
-from .checkpoint_store import CheckpointStore
 
-# Quality and Scoring
-from .evidence_scoring_service import EvidenceScoringService
-from .faithfulness_scorer import FaithfulnessScorer
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
 
-# Utilities
-from .llm_service import LLMService
-from .data_sanitizer import DataSanitizer
-from .feedback_manager import FeedbackManager
-from .publisher import Publisher
-from .resilience import CircuitBreaker
-from .langfuse_monitor import LangfuseMonitor
-from .metadata_processing_service import MetadataProcessingService
-from .smart_metadata_extractor import SmartMetadataExtractor
-from .skills_loader_service import SkillsLoaderService
-from .tool_registry_service import ToolRegistryService
-from .graph_relationship_builder import GraphRelationshipBuilder
-from .real_worker_pool_manager import RealWorkerPoolManager
 
 __all__ = [
     # Database clients
@@ -74,6 +93,7 @@ __all__ = [
     "ConversationManager",
     "ConversationHistoryAnalyzer",
     "EnhancedConversationManager",
+    "ConversationContextStore",
     # Caching and streaming
     "CacheManager",
     "StreamingManager",
@@ -91,6 +111,9 @@ __all__ = [
     "MetadataProcessingService",
     "SmartMetadataExtractor",
     "SkillsLoaderService",
+    "CapabilityCatalog",
+    "AgentCatalogService",
+    "get_agent_catalog",
     "ToolRegistryService",
     "GraphRelationshipBuilder",
     "RealWorkerPoolManager",
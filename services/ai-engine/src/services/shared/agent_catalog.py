@@ -0,0 +1,543 @@
+"""
+Agent Catalog - Shared, Tenant-Scoped Agent Metadata Snapshots
+
+One in-memory copy of the ``agents`` table, partitioned by tenant, that the
+orchestrators, AgentLoader, UnifiedRAGService and GraphRAGSelector read
+instead of issuing their own ad hoc queries.
+
+Key Features:
+- Immutable, versioned snapshot per tenant scope (``None`` = global agents)
+  with secondary indexes by tier, domain and status
+- Readers get a consistent snapshot with zero I/O; refreshes build new
+  snapshots off to the side and swap them in atomically
+- Refresh by polling the ``updated_at`` watermark, with a periodic full
+  reload to pick up hard deletes
+- Optional Postgres LISTEN/NOTIFY (``agent_catalog_changed``, see
+  database/migrations/20261019_002_agent_catalog_notify.sql) wakes the
+  refresh loop as soon as an agent row changes
+- Stale-read age exposed as the ``vital_agent_catalog_stale_seconds`` gauge
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+try:
+    from core.monitoring import AGENT_CATALOG_STALE_SECONDS
+except Exception:  # pragma: no cover - metrics are optional outside the API
+    AGENT_CATALOG_STALE_SECONDS = None
+
+
+# Defaults (override via constructor)
+DEFAULT_POLL_INTERVAL_SECONDS = 30.0
+DEFAULT_FULL_RELOAD_EVERY = 20
+DEFAULT_PAGE_SIZE = 1000
+
+NOTIFY_CHANNEL = "agent_catalog_changed"
+GLOBAL_SCOPE: Optional[str] = None
+
+_MISSING = object()
+
+AgentRow = Mapping[str, Any]
+
+
+def _freeze(row: Dict[str, Any]) -> AgentRow:
+    return MappingProxyType(dict(row))
+
+
+def _as_list(value: Any) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return [v for v in value if isinstance(v, str)]
+
+
+@dataclass(frozen=True)
+class AgentCatalogSnapshot:
+    """
+    Immutable view of one tenant scope's agents.
+
+    Index values are tuples of agent IDs in catalog order (name, then ID).
+    """
+    scope: Optional[str]
+    version: int
+    watermark: Optional[str]
+    built_at: float
+    agents: Mapping[str, AgentRow]
+    by_tier: Mapping[int, Tuple[str, ...]] = field(default_factory=dict)
+    by_domain: Mapping[str, Tuple[str, ...]] = field(default_factory=dict)
+    by_status: Mapping[str, Tuple[str, ...]] = field(default_factory=dict)
+
+    @classmethod
+    def build(
+        cls,
+        scope: Optional[str],
+        version: int,
+        rows: Iterable[AgentRow],
+        levels: Mapping[str, int],
+    ) -> "AgentCatalogSnapshot":
+        """Build a snapshot (and its indexes) from frozen agent rows"""
+        ordered = sorted(rows, key=lambda r: (str(r.get("name") or ""), str(r["id"])))
+        by_tier: Dict[int, List[str]] = {}
+        by_domain: Dict[str, List[str]] = {}
+        by_status: Dict[str, List[str]] = {}
+
+        for row in ordered:
+            agent_id = row["id"]
+            by_tier.setdefault(agent_tier(row, levels), []).append(agent_id)
+            by_status.setdefault(agent_status(row), []).append(agent_id)
+            for domain in agent_domains(row):
+                by_domain.setdefault(domain.lower(), []).append(agent_id)
+
+        watermark = max((str(r["updated_at"]) for r in ordered if r.get("updated_at")), default=None)
+        return cls(
+            scope=scope,
+            version=version,
+            watermark=watermark,
+            built_at=time.time(),
+            agents=MappingProxyType({row["id"]: row for row in ordered}),
+            by_tier=MappingProxyType({k: tuple(v) for k, v in by_tier.items()}),
+            by_domain=MappingProxyType({k: tuple(v) for k, v in by_domain.items()}),
+            by_status=MappingProxyType({k: tuple(v) for k, v in by_status.items()}),
+        )
+
+    def __len__(self) -> int:
+        return len(self.agents)
+
+    def get(self, agent_id: str) -> Optional[AgentRow]:
+        return self.agents.get(agent_id)
+
+    def get_many(self, agent_ids: Iterable[str]) -> Dict[str, AgentRow]:
+        """Rows for the IDs present in this snapshot"""
+        return {aid: self.agents[aid] for aid in agent_ids if aid in self.agents}
+
+    def select(
+        self,
+        status: Optional[str] = None,
+        tier: Optional[int] = None,
+        domain: Optional[str] = None,
+    ) -> List[AgentRow]:
+        """Agents matching every given index filter, in catalog order"""
+        candidates: Optional[set] = None
+        for ids in (
+            self.by_status.get(status, ()) if status is not None else None,
+            self.by_tier.get(tier, ()) if tier is not None else None,
+            self.by_domain.get(domain.lower(), ()) if domain is not None else None,
+        ):
+            if ids is not None:
+                candidates = set(ids) if candidates is None else candidates & set(ids)
+
+        if candidates is None:
+            return list(self.agents.values())
+        return [row for aid, row in self.agents.items() if aid in candidates]
+
+
+def agent_tier(row: AgentRow, levels: Mapping[str, int]) -> int:
+    """L1-L5 tier from agent_levels, falling back to metadata.tier (default L2)"""
+    level = levels.get(row.get("agent_level_id") or "")
+    if level:
+        return int(level)
+    metadata = row.get("metadata") or {}
+    try:
+        return int(metadata.get("tier") or row.get("tier") or 2)
+    except (TypeError, ValueError):
+        return 2
+
+
+def agent_status(row: AgentRow) -> str:
+    status = row.get("status")
+    if status:
+        return str(status)
+    return "active" if row.get("is_active", True) else "inactive"
+
+
+def agent_domains(row: AgentRow) -> List[str]:
+    """Preferred domains as stored on the agent (domains / preferred_domains)"""
+    return _as_list(row.get("domains") or row.get("preferred_domains"))
+
+
+@dataclass(frozen=True)
+class _CatalogState:
+    """Everything readers see, swapped as one reference"""
+    snapshots: Mapping[Optional[str], AgentCatalogSnapshot]
+    locator: Mapping[str, Optional[str]]  # agent_id -> scope
+
+
+class AgentCatalogService:
+    """
+    Shared agent catalog with per-tenant immutable snapshots.
+
+    All read methods are synchronous and never touch the database.
+    """
+
+    def __init__(
+        self,
+        supabase_client,
+        poll_interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS,
+        full_reload_every: int = DEFAULT_FULL_RELOAD_EVERY,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        listen_dsn: Optional[str] = None,
+    ):
+        """
+        Initialize catalog.
+
+        Args:
+            supabase_client: Client exposing ``table(name)`` query builders
+            poll_interval_seconds: Delay between ``updated_at`` polls
+            full_reload_every: Polls between full reloads (catches hard deletes)
+            page_size: Rows per page when reading ``agents``
+            listen_dsn: Postgres DSN for LISTEN/NOTIFY (polling only if None)
+        """
+        self.supabase = supabase_client
+        self.poll_interval_seconds = poll_interval_seconds
+        self.full_reload_every = full_reload_every
+        self.page_size = page_size
+        self.listen_dsn = listen_dsn
+
+        self._state = _CatalogState(snapshots=MappingProxyType({}), locator=MappingProxyType({}))
+        self._levels: Mapping[str, int] = MappingProxyType({})
+        self._verified_at: Optional[float] = None
+        self._loaded = False
+        self._refresh_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._full_reload_requested = False
+        self._task: Optional[asyncio.Task] = None
+        self._listen_conn = None
+
+        self.metrics = {
+            "full_loads": 0,
+            "delta_refreshes": 0,
+            "rows_applied": 0,
+            "notifications": 0,
+            "refresh_failures": 0,
+        }
+
+    # ========================================================================
+    # Reads (zero I/O)
+    # ========================================================================
+
+    @property
+    def ready(self) -> bool:
+        """True once the first full load has completed"""
+        return self._loaded
+
+    def snapshot(self, tenant_id: Optional[str] = GLOBAL_SCOPE) -> AgentCatalogSnapshot:
+        """Current snapshot for a tenant scope (empty if the tenant has no agents)"""
+        snapshot = self._state.snapshots.get(tenant_id)
+        if snapshot is None:
+            return AgentCatalogSnapshot(
+                scope=tenant_id, version=0, watermark=None, built_at=0.0,
+                agents=MappingProxyType({}),
+            )
+        return snapshot
+
+    def scopes(self) -> Tuple[Optional[str], ...]:
+        """Tenant scopes that currently hold agents"""
+        return tuple(self._state.snapshots)
+
+    def get_agent(self, agent_id: str) -> Optional[AgentRow]:
+        """Look up an agent in whichever scope owns it"""
+        state = self._state
+        if agent_id not in state.locator:
+            return None
+        return state.snapshots[state.locator[agent_id]].get(agent_id)
+
+    def get_agents(self, agent_ids: Iterable[str]) -> Dict[str, AgentRow]:
+        """Batch lookup across scopes against one consistent state"""
+        state = self._state
+        found = {}
+        for agent_id in agent_ids:
+            scope = state.locator.get(agent_id, _MISSING)
+            if scope is not _MISSING:
+                found[agent_id] = state.snapshots[scope].agents[agent_id]
+        return found
+
+    def tier_of(self, row: AgentRow) -> int:
+        return agent_tier(row, self._levels)
+
+    def stale_seconds(self) -> float:
+        """
+        Age of the data readers see: seconds since the catalog was last
+        confirmed current against the database (inf before the first load).
+
+        Every refresh covers all tenant scopes, so the age is catalog-wide.
+        """
+        if self._verified_at is None:
+            return float("inf")
+        return max(0.0, time.time() - self._verified_at)
+
+    def is_fresh(self, max_age_seconds: Optional[float] = None) -> bool:
+        """Loaded and refreshed within ``max_age_seconds`` (default 2 poll intervals)"""
+        limit = max_age_seconds if max_age_seconds is not None else 2 * self.poll_interval_seconds
+        return self._loaded and self.stale_seconds() <= limit
+
+    # ========================================================================
+    # Refresh
+    # ========================================================================
+
+    async def load(self) -> int:
+        """Full load of agents and agent levels; returns the agent count"""
+        async with self._refresh_lock:
+            levels = await asyncio.to_thread(self._fetch_levels)
+            rows = await asyncio.to_thread(self._fetch_agents, None)
+            self._levels = MappingProxyType(levels)
+            self._apply(rows, replace=True)
+            self._loaded = True
+            self._full_reload_requested = False
+            self.metrics["full_loads"] += 1
+            logger.info(
+                "agent_catalog_loaded",
+                agents=len(self._state.locator),
+                scopes=len(self._state.snapshots),
+            )
+            return len(rows)
+
+    async def refresh(self) -> int:
+        """
+        Apply rows changed since the catalog watermark.
+
+        Returns:
+            Number of agent rows that changed
+        """
+        if not self._loaded or self._full_reload_requested:
+            await self.load()
+            return len(self._state.locator)
+
+        async with self._refresh_lock:
+            watermark = max(
+                (s.watermark for s in self._state.snapshots.values() if s.watermark),
+                default=None,
+            )
+            rows = await asyncio.to_thread(self._fetch_agents, watermark)
+            changed = self._apply(rows, replace=False)
+            self.metrics["delta_refreshes"] += 1
+            if changed:
+                logger.info("agent_catalog_refreshed", changed=changed, watermark=watermark)
+            return changed
+
+    def notify(self, payload: Optional[str] = None) -> None:
+        """
+        Signal that agents changed (LISTEN/NOTIFY callback or manual hook).
+
+        DELETE notifications schedule a full reload since a watermark poll
+        cannot observe removed rows.
+        """
+        self.metrics["notifications"] += 1
+        if payload:
+            try:
+                if json.loads(payload).get("op") == "DELETE":
+                    self._full_reload_requested = True
+            except (ValueError, AttributeError):
+                self._full_reload_requested = True
+        self._wakeup.set()
+
+    def _apply(self, rows: List[Dict[str, Any]], replace: bool) -> int:
+        """Build new snapshots for affected scopes and swap the state in"""
+        old = self._state
+
+        if replace:
+            grouped: Dict[Optional[str], Dict[str, AgentRow]] = {}
+            for row in rows:
+                grouped.setdefault(row.get("tenant_id"), {})[row["id"]] = _freeze(row)
+            scopes = set(grouped) | set(old.snapshots)
+        else:
+            grouped = {}
+            for row in rows:
+                previous = old.locator.get(row["id"], _MISSING)
+                frozen = _freeze(row)
+                if previous is not _MISSING and old.snapshots[previous].agents[row["id"]] == row:
+                    continue  # Re-read at the watermark boundary
+                if previous is not _MISSING and previous != row.get("tenant_id"):
+                    # Moved between tenants: drop from the old scope
+                    grouped.setdefault(previous, dict(old.snapshots[previous].agents)).pop(row["id"], None)
+                scope = row.get("tenant_id")
+                if scope not in grouped:
+                    grouped[scope] = dict(old.snapshots[scope].agents) if scope in old.snapshots else {}
+                grouped[scope][row["id"]] = frozen
+            scopes = set(grouped)
+
+        snapshots = dict(old.snapshots)
+        changed = 0
+        for scope in scopes:
+            agents = grouped.get(scope, {})
+            current = old.snapshots.get(scope)
+            if current is not None and self._same_rows(current.agents, agents):
+                continue
+            if current is not None:
+                changed += sum(
+                    1 for aid in set(current.agents) | set(agents)
+                    if current.agents.get(aid) != agents.get(aid)
+                )
+            else:
+                changed += len(agents)
+            version = (current.version if current else 0) + 1
+            if agents:
+                snapshots[scope] = AgentCatalogSnapshot.build(scope, version, agents.values(), self._levels)
+            else:
+                snapshots.pop(scope, None)
+
+        locator = {aid: scope for scope, snap in snapshots.items() for aid in snap.agents}
+        self._state = _CatalogState(
+            snapshots=MappingProxyType(snapshots),
+            locator=MappingProxyType(locator),
+        )
+        self._verified_at = time.time()
+        self.metrics["rows_applied"] += changed
+        return changed
+
+    @staticmethod
+    def _same_rows(current: Mapping[str, AgentRow], new: Mapping[str, AgentRow]) -> bool:
+        return current.keys() == new.keys() and all(current[k] == new[k] for k in new)
+
+    def _fetch_levels(self) -> Dict[str, int]:
+        try:
+            response = self.supabase.table("agent_levels").select("id, level_number").execute()
+            return {
+                row["id"]: int(row["level_number"])
+                for row in (response.data or [])
+                if row.get("id") and row.get("level_number") is not None
+            }
+        except Exception as e:
+            logger.warning("agent_catalog_levels_failed", error=str(e))
+            return dict(self._levels)
+
+    def _fetch_agents(self, watermark: Optional[str]) -> List[Dict[str, Any]]:
+        """Page through agents, optionally only those updated at/after ``watermark``"""
+        rows: List[Dict[str, Any]] = []
+        offset = 0
+        while True:
+            query = self.supabase.table("agents").select("*")
+            if watermark:
+                # gte, not gt: rows committed later with the same timestamp
+                # must not be skipped; unchanged re-reads are discarded
+                query = query.gte("updated_at", watermark)
+            page = query.order("id").range(offset, offset + self.page_size - 1).execute().data or []
+            rows.extend(page)
+            if len(page) < self.page_size:
+                return rows
+            offset += self.page_size
+
+    # ========================================================================
+    # Lifecycle
+    # ========================================================================
+
+    async def start(self):
+        """Load (if needed) and start the refresh loop and LISTEN connection"""
+        if not self._loaded:
+            await self.load()
+        if self.listen_dsn and self._listen_conn is None:
+            await self._start_listener()
+        self._export_staleness()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info(
+                "agent_catalog_started",
+                poll_interval_seconds=self.poll_interval_seconds,
+                listen=self._listen_conn is not None,
+            )
+
+    async def shutdown(self):
+        """Stop refreshing; existing snapshots stay readable"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._listen_conn is not None:
+            try:
+                await self._listen_conn.close()
+            except Exception as e:
+                logger.warning("agent_catalog_listener_close_failed", error=str(e))
+            self._listen_conn = None
+        logger.info("agent_catalog_stopped", **self.get_statistics())
+
+    async def _start_listener(self):
+        try:
+            import asyncpg
+
+            self._listen_conn = await asyncpg.connect(self.listen_dsn)
+            await self._listen_conn.add_listener(
+                NOTIFY_CHANNEL, lambda _conn, _pid, _channel, payload: self.notify(payload)
+            )
+            logger.info("agent_catalog_listening", channel=NOTIFY_CHANNEL)
+        except Exception as e:
+            # Polling still keeps the catalog current, just with more lag
+            logger.warning("agent_catalog_listen_failed", error=str(e))
+            self._listen_conn = None
+
+    async def _run(self):
+        polls = 0
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            polls += 1
+            if self.full_reload_every and polls % self.full_reload_every == 0:
+                self._full_reload_requested = True
+
+            try:
+                await self.refresh()
+            except Exception as e:
+                self.metrics["refresh_failures"] += 1
+                logger.warning("agent_catalog_refresh_failed", error=str(e))
+
+    def _export_staleness(self):
+        # Evaluated at scrape time, so a stuck refresh loop still shows its age
+        if AGENT_CATALOG_STALE_SECONDS is not None:
+            AGENT_CATALOG_STALE_SECONDS.set_function(self.stale_seconds)
+
+    # ========================================================================
+    # Introspection
+    # ========================================================================
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get catalog statistics"""
+        state = self._state
+        return {
+            **self.metrics,
+            "ready": self._loaded,
+            "agents": len(state.locator),
+            "scopes": len(state.snapshots),
+            "stale_seconds": round(self.stale_seconds(), 3) if self._loaded else None,
+        }
+
+
+# Global instance
+_agent_catalog: Optional[AgentCatalogService] = None
+
+
+def get_agent_catalog() -> Optional[AgentCatalogService]:
+    """Get global agent catalog (None until initialized)"""
+    return _agent_catalog
+
+
+async def initialize_agent_catalog(supabase_client, **kwargs) -> AgentCatalogService:
+    """
+    Initialize, load and start the global agent catalog.
+
+    Args:
+        supabase_client: Initialized Supabase client
+        **kwargs: AgentCatalogService options
+
+    Returns:
+        Running agent catalog
+    """
+    global _agent_catalog
+
+    _agent_catalog = AgentCatalogService(supabase_client, **kwargs)
+    await _agent_catalog.start()
+
+    return _agent_catalog
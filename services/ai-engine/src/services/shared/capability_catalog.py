@@ -0,0 +1,581 @@
+"""
+Capability Catalog - Indexed Search over Skills, Tools and Templates
+
+Shared in-memory catalog used by SkillsLoaderService, ToolRegistryService and
+the protocol TemplateRegistry instead of per-registry substring scans.
+
+Key Features:
+- Inverted index with BM25 ranking (name tokens weighted above description)
+- Prefix expansion, so partial words ("pharm") match longer index terms
+  ("pharmacovigilance") at a discount below exact matches
+- Optional embedding index (cosine similarity, blended with BM25)
+- Faceted filters (kind, category, level, complexity, region, ...) via bitsets
+- Incremental upsert/remove keyed by content hash, so reloads only touch
+  entries that actually changed
+- Deterministic ordering: ties are broken by entry key
+
+Bitsets are plain Python ints (bit ``i`` set => slot ``i`` matches), which keeps
+facet intersection a handful of big-int ANDs even at 10k+ entries.
+"""
+
+import bisect
+import hashlib
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger()
+
+
+# ============================================================================
+# Constants
+# ============================================================================
+
+# BM25 parameters (Robertson/Sparck Jones defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Name tokens are counted this many times so title matches outrank
+# description-only matches (a cheap BM25F approximation).
+NAME_FIELD_WEIGHT = 3
+
+# Query terms at least this long also match index terms they prefix, scored
+# at PREFIX_MATCH_WEIGHT of an exact match; expansions per term are capped.
+MIN_PREFIX_LENGTH = 3
+PREFIX_MATCH_WEIGHT = 0.5
+MAX_PREFIX_EXPANSIONS = 50
+
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in",
+    "into", "is", "it", "of", "on", "or", "that", "the", "this", "to", "with",
+})
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+EmbedFn = Callable[[List[str]], Sequence[Sequence[float]]]
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, split on non-alphanumerics and drop stopwords"""
+    return [t for t in _TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS]
+
+
+# ============================================================================
+# Data Models
+# ============================================================================
+
+@dataclass
+class CatalogEntry:
+    """A searchable capability (skill, tool or protocol template)"""
+    kind: str
+    id: str
+    name: str
+    description: str = ""
+    # Facet name -> value or list of values (e.g. {"level": [2, 3]})
+    facets: Dict[str, Any] = field(default_factory=dict)
+    # Original object returned to callers (SkillDefinition, tool dict, ...)
+    payload: Any = None
+    content_hash: str = ""
+
+    def __post_init__(self):
+        if not self.content_hash:
+            self.content_hash = self._calculate_hash()
+
+    @property
+    def key(self) -> str:
+        """Catalog-wide unique key"""
+        return f"{self.kind}:{self.id}"
+
+    def _calculate_hash(self) -> str:
+        facet_repr = sorted((k, repr(v)) for k, v in self.facets.items())
+        content = f"{self.kind}|{self.id}|{self.name}|{self.description}|{facet_repr}"
+        return hashlib.sha1(content.encode()).hexdigest()[:16]
+
+    def index_text(self) -> List[str]:
+        """Tokens fed to the inverted index"""
+        name_tokens = tokenize(f"{self.name} {self.id}")
+        return name_tokens * NAME_FIELD_WEIGHT + tokenize(self.description)
+
+
+@dataclass
+class CatalogHit:
+    """A ranked search result"""
+    entry: CatalogEntry
+    score: float
+    bm25: float = 0.0
+    semantic: float = 0.0
+
+
+# ============================================================================
+# Capability Catalog
+# ============================================================================
+
+class CapabilityCatalog:
+    """
+    In-memory inverted index + facet bitsets over capability entries.
+
+    Slots are recycled on removal so bitsets stay dense. All mutating methods
+    take a lock; searches read a consistent view under the same lock.
+    """
+
+    def __init__(
+        self,
+        embed_fn: Optional[EmbedFn] = None,
+        semantic_weight: float = 0.5,
+    ):
+        """
+        Initialize catalog.
+
+        Args:
+            embed_fn: Optional batch embedding function (texts -> vectors).
+                When set, an embedding index is maintained alongside BM25.
+            semantic_weight: Blend weight for cosine similarity (0..1)
+        """
+        self.embed_fn = embed_fn
+        self.semantic_weight = semantic_weight
+
+        self._lock = threading.RLock()
+
+        # Slot storage
+        self._entries: List[Optional[CatalogEntry]] = []
+        self._slot_by_key: Dict[str, int] = {}
+        self._free_slots: List[int] = []
+        self._live_mask = 0
+
+        # Inverted index: term -> {slot: term frequency}, plus term -> bitset
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._term_bits: Dict[str, int] = {}
+        # Sorted vocabulary: prefix expansion bisects to the matching range
+        self._sorted_terms: List[str] = []
+        self._doc_terms: Dict[int, Counter] = {}
+        self._doc_len: Dict[int, int] = {}
+        self._total_len = 0
+
+        # Facets: facet name -> value -> bitset
+        self._facets: Dict[str, Dict[str, int]] = {}
+
+        # Embedding index: slot -> unit vector
+        self._vectors: Dict[int, np.ndarray] = {}
+
+        self._version = 0
+
+    # ========================================================================
+    # Mutation
+    # ========================================================================
+
+    def upsert(self, entry: CatalogEntry) -> bool:
+        """
+        Insert or replace an entry.
+
+        Returns:
+            True if the index changed, False if the content hash was unchanged
+        """
+        return self.upsert_many([entry]) > 0
+
+    def upsert_many(self, entries: Iterable[CatalogEntry]) -> int:
+        """
+        Insert or replace entries, embedding changed ones in a single batch.
+
+        Returns:
+            Number of entries that were added or changed
+        """
+        changed: List[Tuple[int, CatalogEntry]] = []
+
+        with self._lock:
+            for entry in entries:
+                slot = self._slot_by_key.get(entry.key)
+                if slot is not None:
+                    current = self._entries[slot]
+                    if current is not None and current.content_hash == entry.content_hash:
+                        # Keep the freshest payload without reindexing
+                        current.payload = entry.payload
+                        continue
+                    self._unindex(slot)
+                else:
+                    slot = self._allocate_slot()
+                    self._slot_by_key[entry.key] = slot
+
+                self._index(slot, entry)
+                changed.append((slot, entry))
+
+            if changed:
+                self._version += 1
+
+        if changed and self.embed_fn is not None:
+            self._embed(changed)
+
+        return len(changed)
+
+    def remove(self, kind: str, entry_id: str) -> bool:
+        """Remove an entry; returns True if it existed"""
+        with self._lock:
+            slot = self._slot_by_key.pop(f"{kind}:{entry_id}", None)
+            if slot is None:
+                return False
+            self._unindex(slot)
+            self._entries[slot] = None
+            self._free_slots.append(slot)
+            self._version += 1
+            return True
+
+    def sync_kind(self, kind: str, entries: Iterable[CatalogEntry]) -> Dict[str, int]:
+        """
+        Make the catalog's view of ``kind`` match ``entries`` exactly.
+
+        Unchanged entries are skipped, so repeated syncs are cheap.
+
+        Returns:
+            Counts of upserted and removed entries
+        """
+        entries = list(entries)
+        wanted = {e.key for e in entries}
+        upserted = self.upsert_many(entries)
+
+        with self._lock:
+            stale = [
+                key for key in self._slot_by_key
+                if key.startswith(f"{kind}:") and key not in wanted
+            ]
+        removed = sum(1 for key in stale if self.remove(kind, key.split(":", 1)[1]))
+
+        return {"upserted": upserted, "removed": removed}
+
+    def clear(self, kind: Optional[str] = None):
+        """Remove all entries, or only those of one kind"""
+        with self._lock:
+            keys = [
+                key for key in self._slot_by_key
+                if kind is None or key.startswith(f"{kind}:")
+            ]
+        for key in keys:
+            k, entry_id = key.split(":", 1)
+            self.remove(k, entry_id)
+
+    def _allocate_slot(self) -> int:
+        if self._free_slots:
+            return self._free_slots.pop()
+        self._entries.append(None)
+        return len(self._entries) - 1
+
+    def _index(self, slot: int, entry: CatalogEntry):
+        self._entries[slot] = entry
+        bit = 1 << slot
+        self._live_mask |= bit
+
+        terms = Counter(entry.index_text())
+        self._doc_terms[slot] = terms
+        length = sum(terms.values())
+        self._doc_len[slot] = length
+        self._total_len += length
+        for term, tf in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                bisect.insort(self._sorted_terms, term)
+            postings[slot] = tf
+            self._term_bits[term] = self._term_bits.get(term, 0) | bit
+
+        facets = dict(entry.facets)
+        facets["kind"] = entry.kind
+        for facet, values in facets.items():
+            for value in _facet_values(values):
+                by_value = self._facets.setdefault(facet, {})
+                by_value[value] = by_value.get(value, 0) | bit
+
+    def _unindex(self, slot: int):
+        entry = self._entries[slot]
+        bit = 1 << slot
+        self._live_mask &= ~bit
+
+        for term in self._doc_terms.pop(slot, {}):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(slot, None)
+                self._term_bits[term] &= ~bit
+                if not postings:
+                    del self._postings[term]
+                    del self._term_bits[term]
+                    del self._sorted_terms[bisect.bisect_left(self._sorted_terms, term)]
+        self._total_len -= self._doc_len.pop(slot, 0)
+        self._vectors.pop(slot, None)
+
+        if entry is None:
+            return
+        facets = dict(entry.facets)
+        facets["kind"] = entry.kind
+        for facet, values in facets.items():
+            by_value = self._facets.get(facet, {})
+            for value in _facet_values(values):
+                if value in by_value:
+                    by_value[value] &= ~bit
+                    if not by_value[value]:
+                        del by_value[value]
+
+    def _embed(self, changed: List[Tuple[int, CatalogEntry]]):
+        texts = [f"{e.name}. {e.description}" for _, e in changed]
+        try:
+            vectors = self.embed_fn(texts)
+        except Exception as e:
+            logger.warning("Capability catalog embedding failed", error=str(e), entries=len(texts))
+            return
+
+        with self._lock:
+            for (slot, entry), vector in zip(changed, vectors):
+                # Slot may have been recycled while we were embedding
+                if self._entries[slot] is not entry:
+                    continue
+                vec = np.asarray(vector, dtype=np.float32)
+                norm = float(np.linalg.norm(vec))
+                if norm > 0:
+                    self._vectors[slot] = vec / norm
+
+    # ========================================================================
+    # Query
+    # ========================================================================
+
+    def search(
+        self,
+        query: str = "",
+        kind: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = 20,
+        semantic: bool = True,
+    ) -> List[CatalogHit]:
+        """
+        Ranked search with facet filters.
+
+        Args:
+            query: Free-text query; empty returns all filtered entries by name
+            kind: Restrict to one entry kind ("skill", "tool", "template")
+            filters: Facet filters; a list value matches any of its members
+            limit: Maximum hits (None for all)
+            semantic: Blend in embedding similarity when an embedder is set
+
+        Returns:
+            Hits ordered by descending score, then entry key
+        """
+        filters = dict(filters or {})
+        if kind:
+            filters["kind"] = kind
+
+        query_vec = None
+        use_semantic = semantic and self.embed_fn is not None and bool(query.strip())
+        if use_semantic:
+            try:
+                query_vec = np.asarray(self.embed_fn([query])[0], dtype=np.float32)
+                norm = float(np.linalg.norm(query_vec))
+                query_vec = query_vec / norm if norm > 0 else None
+            except Exception as e:
+                logger.warning("Capability catalog query embedding failed", error=str(e))
+                query_vec = None
+
+        with self._lock:
+            mask = self._filter_mask(filters)
+            if not mask:
+                return []
+
+            terms = tokenize(query)
+            if not terms:
+                hits = [
+                    CatalogHit(entry=self._entries[slot], score=0.0)
+                    for slot in _iter_bits(mask)
+                ]
+                hits.sort(key=lambda h: (h.entry.name.lower(), h.entry.key))
+                return hits[:limit] if limit is not None else hits
+
+            bm25 = self._bm25(terms, mask)
+
+            semantic_scores: Dict[int, float] = {}
+            if query_vec is not None and self._vectors:
+                slots = [s for s in _iter_bits(mask) if s in self._vectors]
+                if slots:
+                    matrix = np.stack([self._vectors[s] for s in slots])
+                    sims = matrix @ query_vec
+                    semantic_scores = {s: float(v) for s, v in zip(slots, sims) if v > 0}
+
+            hits = self._blend(bm25, semantic_scores)
+
+        ranked = heapq.nsmallest(
+            limit if limit is not None else len(hits),
+            hits,
+            key=lambda h: (-h.score, h.entry.key),
+        )
+        return ranked
+
+    def get(self, kind: str, entry_id: str) -> Optional[CatalogEntry]:
+        """O(1) lookup by kind and id"""
+        with self._lock:
+            slot = self._slot_by_key.get(f"{kind}:{entry_id}")
+            return self._entries[slot] if slot is not None else None
+
+    def facet_counts(self, facet: str, kind: Optional[str] = None) -> Dict[str, int]:
+        """Entry counts per value of a facet (optionally within one kind)"""
+        with self._lock:
+            scope = self._filter_mask({"kind": kind} if kind else {})
+            return {
+                value: bin(bits & scope).count("1")
+                for value, bits in self._facets.get(facet, {}).items()
+                if bits & scope
+            }
+
+    def _filter_mask(self, filters: Dict[str, Any]) -> int:
+        mask = self._live_mask
+        for facet, wanted in filters.items():
+            if wanted is None:
+                continue
+            by_value = self._facets.get(facet, {})
+            facet_mask = 0
+            for value in _facet_values(wanted):
+                facet_mask |= by_value.get(value, 0)
+            mask &= facet_mask
+            if not mask:
+                break
+        return mask
+
+    def _bm25(self, terms: List[str], mask: int) -> Dict[int, float]:
+        n_docs = bin(self._live_mask).count("1")
+        avg_len = (self._total_len / n_docs) if n_docs else 1.0
+
+        # Candidates = (union of query-term postings) AND facet mask
+        query_terms = []
+        candidates = 0
+        for term, weight in self._expand_terms(terms).items():
+            bits = self._term_bits[term]
+            df = len(self._postings[term])
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            query_terms.append((term, idf * weight))
+            candidates |= bits
+        candidates &= mask
+
+        scores: Dict[int, float] = {}
+        k1_plus_1 = BM25_K1 + 1
+        for slot in _iter_bits(candidates):
+            doc_terms = self._doc_terms[slot]
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self._doc_len[slot] / avg_len)
+            score = 0.0
+            for term, idf in query_terms:
+                tf = doc_terms.get(term)
+                if tf:
+                    score += idf * tf * k1_plus_1 / (tf + norm)
+            scores[slot] = score
+
+        return scores
+
+    def _expand_terms(self, terms: List[str]) -> Dict[str, float]:
+        """Index terms matched by the query terms -> match weight"""
+        expanded: Dict[str, float] = {}
+        prefixes = []
+        for term in set(terms):
+            if term in self._term_bits:
+                expanded[term] = 1.0
+            if len(term) >= MIN_PREFIX_LENGTH:
+                prefixes.append(term)
+
+        vocabulary = self._sorted_terms
+        for prefix in prefixes:
+            added = 0
+            for i in range(bisect.bisect_left(vocabulary, prefix), len(vocabulary)):
+                term = vocabulary[i]
+                if not term.startswith(prefix) or added >= MAX_PREFIX_EXPANSIONS:
+                    break
+                if term != prefix and term not in expanded:
+                    expanded[term] = PREFIX_MATCH_WEIGHT
+                    added += 1
+        return expanded
+
+    def _blend(self, bm25: Dict[int, float], semantic: Dict[int, float]) -> List[CatalogHit]:
+        if not semantic:
+            return [
+                CatalogHit(entry=self._entries[s], score=score, bm25=score)
+                for s, score in bm25.items()
+            ]
+
+        max_bm25 = max(bm25.values()) if bm25 else 0.0
+        weight = self.semantic_weight
+        hits = []
+        for slot in set(bm25) | set(semantic):
+            lexical = bm25.get(slot, 0.0)
+            lexical_norm = lexical / max_bm25 if max_bm25 > 0 else 0.0
+            sim = semantic.get(slot, 0.0)
+            hits.append(CatalogHit(
+                entry=self._entries[slot],
+                score=(1 - weight) * lexical_norm + weight * sim,
+                bm25=lexical,
+                semantic=sim,
+            ))
+        return hits
+
+    # ========================================================================
+    # Introspection
+    # ========================================================================
+
+    @property
+    def version(self) -> int:
+        """Monotonic counter bumped on every effective change"""
+        return self._version
+
+    def __len__(self) -> int:
+        return len(self._slot_by_key)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get catalog statistics"""
+        with self._lock:
+            by_kind = {
+                kind: bin(bits).count("1")
+                for kind, bits in self._facets.get("kind", {}).items()
+            }
+            return {
+                "total_entries": len(self._slot_by_key),
+                "by_kind": by_kind,
+                "terms": len(self._postings),
+                "facets": sorted(self._facets.keys()),
+                "embedded_entries": len(self._vectors),
+                "version": self._version,
+            }
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+def _facet_values(values: Any) -> List[str]:
+    """Normalize a facet value (scalar, enum or collection) to strings"""
+    if values is None:
+        return []
+    if isinstance(values, (list, tuple, set, frozenset)):
+        return [_facet_value(v) for v in values if v is not None]
+    return [_facet_value(values)]
+
+
+def _facet_value(value: Any) -> str:
+    return str(getattr(value, "value", value)).lower()
+
+
+def _iter_bits(mask: int) -> List[int]:
+    """Set bit positions in ascending order"""
+    if not mask:
+        return []
+    raw = np.frombuffer(mask.to_bytes((mask.bit_length() + 7) // 8, "little"), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(raw, bitorder="little")).tolist()
+
+
+# ============================================================================
+# Singleton Instance
+# ============================================================================
+
+_capability_catalog: Optional[CapabilityCatalog] = None
+
+
+def get_capability_catalog() -> CapabilityCatalog:
+    """Get the process-wide capability catalog"""
+    global _capability_catalog
+    if _capability_catalog is None:
+        _capability_catalog = CapabilityCatalog()
+    return _capability_catalog
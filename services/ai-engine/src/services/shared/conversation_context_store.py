@@ -0,0 +1,531 @@
+"""
+Conversation Context Store - Incremental, Token-Bounded Chat Context
+
+Replaces "reload the whole history and trim it" on every turn with per-
+conversation state that is updated as turns are appended.
+
+Key Features:
+- Append-only turns; a token-bounded window of the most recent exchanges
+- Exchanges leaving the window are folded into a hierarchical rolling
+  summary by a background task (never on the request path): level-0
+  segments summarize evicted exchanges, and every ``fanout`` segments of a
+  level are merged into one segment of the level above, so summary size
+  grows with log(turns) and the top level absorbs everything older
+- Turns stay in the window until their summary is committed, so context is
+  never silently dropped while a summary is in flight
+- Summaries are versioned per conversation; every commit bumps the version
+  and is handed to an ``on_summary`` hook (persisted by
+  EnhancedConversationManager) so a cold replica can hydrate from the latest
+  summary plus the turns after it
+- ``get_context`` returns a prebuilt, ready-to-send context: O(1), no I/O,
+  no tokenization. The store is per replica: callers that do not pin a
+  session to one replica revalidate it against storage (``last_turn_at``)
+
+Usage:
+    >>> store = ConversationContextStore(window_tokens=2000)
+    >>> store.append_turn(tenant_id, session_id, "What is an IND?", "An IND is ...")
+    >>> context = store.get_context(tenant_id, session_id)
+    >>> messages = context.to_messages(system_prompt="You are ...")
+"""
+
+import asyncio
+import inspect
+import os
+import re
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+import structlog
+
+from infrastructure.llm.tokenizer import CHARS_PER_TOKEN, count_tokens
+
+logger = structlog.get_logger()
+
+
+# Defaults (override via environment or constructor)
+WINDOW_TOKENS = int(os.getenv("CONVERSATION_WINDOW_TOKENS", "2000"))
+SUMMARY_TOKENS = int(os.getenv("CONVERSATION_SUMMARY_TOKENS", "800"))
+SUMMARY_FANOUT = int(os.getenv("CONVERSATION_SUMMARY_FANOUT", "4"))
+SUMMARY_LEVELS = int(os.getenv("CONVERSATION_SUMMARY_LEVELS", "3"))
+# After a summary pass the window is brought down to this fraction of
+# WINDOW_TOKENS, so the summarizer runs every few turns rather than every turn
+WINDOW_LOW_WATERMARK = float(os.getenv("CONVERSATION_WINDOW_LOW_WATERMARK", "0.75"))
+MAX_CONVERSATIONS = int(os.getenv("CONVERSATION_CONTEXT_MAX_SESSIONS", "10000"))
+
+# Per-message structure overhead, as in count_messages_tokens
+MESSAGE_OVERHEAD_TOKENS = 4
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+Summarizer = Callable[[List[str], int], Union[str, Awaitable[str]]]
+SummaryHook = Callable[[str, str, Dict[str, Any]], Awaitable[None]]
+
+
+# ============================================================================
+# MODELS
+# ============================================================================
+
+@dataclass
+class ContextMessage:
+    """One message of the recent window"""
+    role: str
+    content: str
+    turn_index: int
+    tokens: int
+    created_at: Optional[str] = None
+    agent_id: Optional[str] = None
+
+
+@dataclass
+class SummarySegment:
+    """Summary of the exchanges ``first_turn``..``last_turn`` (inclusive)"""
+    level: int
+    text: str
+    first_turn: int
+    last_turn: int
+    tokens: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "level": self.level,
+            "text": self.text,
+            "first_turn": self.first_turn,
+            "last_turn": self.last_turn,
+            "tokens": self.tokens,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SummarySegment":
+        return cls(
+            level=int(data["level"]),
+            text=data["text"],
+            first_turn=int(data["first_turn"]),
+            last_turn=int(data["last_turn"]),
+            tokens=int(data.get("tokens") or count_tokens(data["text"])),
+        )
+
+
+@dataclass(frozen=True)
+class ConversationContext:
+    """Ready-to-send conversation context (rebuilt on write, shared on read)"""
+    tenant_id: str
+    session_id: str
+    summary: str
+    summary_version: int
+    messages: Tuple[Dict[str, str], ...]
+    summary_tokens: int
+    recent_tokens: int
+    total_turns: int
+    summarized_turns: int
+
+    @property
+    def prompt_tokens(self) -> int:
+        return self.summary_tokens + self.recent_tokens
+
+    def to_messages(self, system_prompt: Optional[str] = None) -> List[Dict[str, str]]:
+        """System prompt, then the rolling summary, then the recent window"""
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        if self.summary:
+            messages.append({"role": "system", "content": SUMMARY_PREFIX + self.summary})
+        messages.extend(dict(message) for message in self.messages)
+        return messages
+
+
+@dataclass
+class _ConversationState:
+    tenant_id: str
+    session_id: str
+    window: Deque[ContextMessage] = field(default_factory=deque)
+    window_tokens: int = 0
+    levels: List[List[SummarySegment]] = field(default_factory=list)
+    version: int = 0
+    next_turn: int = 0
+    summarized_turns: int = 0
+    covered_until: Optional[str] = None
+    last_turn_at: Optional[str] = None
+    task: Optional[asyncio.Task] = None
+    context: Optional[ConversationContext] = None
+
+
+# ============================================================================
+# SUMMARIZATION
+# ============================================================================
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def extractive_summary(texts: List[str], max_tokens: int) -> str:
+    """
+    Cheap deterministic summarizer: the first sentence of each text, joined
+    and cut to ``max_tokens``. Used when no LLM summarizer is configured or
+    the configured one fails.
+    """
+    parts = []
+    for text in texts:
+        text = " ".join(text.split())
+        if text:
+            parts.append(_SENTENCE_END.split(text, maxsplit=1)[0])
+    summary = " | ".join(parts)
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(summary) > max_chars:
+        summary = summary[: max_chars - 3].rstrip() + "..."
+    return summary
+
+
+# ============================================================================
+# STORE
+# ============================================================================
+
+class ConversationContextStore:
+    """
+    Per-conversation incremental context with a background rolling summary.
+
+    All mutation of the recent window happens in ``append_turn`` (request
+    path, cheap) and in the conversation's single summarization task
+    (background); readers get the last prebuilt ``ConversationContext``.
+    """
+
+    def __init__(
+        self,
+        summarizer: Optional[Summarizer] = None,
+        on_summary: Optional[SummaryHook] = None,
+        window_tokens: int = WINDOW_TOKENS,
+        summary_tokens: int = SUMMARY_TOKENS,
+        fanout: int = SUMMARY_FANOUT,
+        max_levels: int = SUMMARY_LEVELS,
+        low_watermark: float = WINDOW_LOW_WATERMARK,
+        max_conversations: int = MAX_CONVERSATIONS,
+    ):
+        """
+        Initialize store.
+
+        Args:
+            summarizer: ``(texts, max_tokens) -> str`` (sync or async); defaults
+                to ``extractive_summary``
+            on_summary: Awaited with ``(tenant_id, session_id, payload)`` after
+                every summary commit, for persistence
+            window_tokens: Token budget of the recent window
+            summary_tokens: Token budget of the rendered rolling summary
+            fanout: Segments per level before they are merged one level up
+            max_levels: Summary levels; the top level absorbs older history
+            low_watermark: Window fraction kept after a summary pass
+            max_conversations: Conversations kept in memory (LRU)
+        """
+        self.summarizer = summarizer or extractive_summary
+        self.on_summary = on_summary
+        self.window_tokens = window_tokens
+        self.summary_tokens = summary_tokens
+        self.fanout = max(2, fanout)
+        self.max_levels = max(1, max_levels)
+        self.low_watermark = low_watermark
+        self.max_conversations = max_conversations
+        # Every level holds at most fanout segments, so this keeps the
+        # rendered summary within summary_tokens
+        self.segment_tokens = max(16, summary_tokens // (self.fanout * self.max_levels))
+
+        self._states: "OrderedDict[Tuple[str, str], _ConversationState]" = OrderedDict()
+        self._stats = {"appends": 0, "summary_passes": 0, "summarizer_errors": 0, "evictions": 0}
+
+    # ------------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------------
+
+    def is_loaded(self, tenant_id: str, session_id: str) -> bool:
+        return (tenant_id, session_id) in self._states
+
+    def last_turn_at(self, tenant_id: str, session_id: str) -> Optional[str]:
+        """``created_at`` of the newest turn held for a conversation"""
+        state = self._states.get((tenant_id, session_id))
+        return state.last_turn_at if state else None
+
+    def get_context(self, tenant_id: str, session_id: str) -> Optional[ConversationContext]:
+        """Prebuilt context, or None if the conversation is not loaded"""
+        state = self._states.get((tenant_id, session_id))
+        if state is None:
+            return None
+        self._states.move_to_end((tenant_id, session_id))
+        return state.context
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {**self._stats, "conversations": len(self._states)}
+
+    # ------------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------------
+
+    def append_turn(
+        self,
+        tenant_id: str,
+        session_id: str,
+        user_message: str,
+        assistant_message: str,
+        agent_id: Optional[str] = None,
+        created_at: Optional[str] = None,
+    ) -> ConversationContext:
+        """
+        Append one user/assistant exchange.
+
+        Tokenizes only the new messages; if the window is over budget a
+        background summary pass is scheduled.
+        """
+        state = self._state(tenant_id, session_id)
+        self._append(state, user_message, assistant_message, agent_id, created_at)
+        self._stats["appends"] += 1
+        self._rebuild(state)
+        self._schedule(state)
+        return state.context
+
+    def load(
+        self,
+        tenant_id: str,
+        session_id: str,
+        rows: List[Dict[str, Any]],
+        summary: Optional[Dict[str, Any]] = None,
+    ) -> ConversationContext:
+        """
+        Hydrate a conversation from storage.
+
+        Args:
+            rows: ``conversations`` rows not covered by ``summary``, oldest first
+            summary: Latest persisted summary payload (see ``_payload``)
+        """
+        state = _ConversationState(tenant_id=tenant_id, session_id=session_id)
+        if summary:
+            state.version = int(summary.get("version", 0))
+            state.summarized_turns = int(summary.get("summarized_turns", 0))
+            state.next_turn = state.summarized_turns
+            state.covered_until = summary.get("covered_until")
+            for data in summary.get("levels") or []:
+                segment = SummarySegment.from_dict(data)
+                while len(state.levels) <= segment.level:
+                    state.levels.append([])
+                state.levels[segment.level].append(segment)
+
+        for row in rows:
+            self._append(
+                state,
+                row.get("user_message") or "",
+                row.get("assistant_message") or "",
+                row.get("agent_id"),
+                row.get("created_at"),
+            )
+
+        self._states[(tenant_id, session_id)] = state
+        self._evict_lru()
+        self._rebuild(state)
+        self._schedule(state)
+        return state.context
+
+    def drop(self, tenant_id: str, session_id: str) -> None:
+        """Forget a conversation (e.g. after it is deleted)"""
+        state = self._states.pop((tenant_id, session_id), None)
+        # The summary task may drop its own conversation (from on_summary);
+        # it notices the drop and exits on its own
+        if state and state.task and not state.task.done() and state.task is not asyncio.current_task():
+            state.task.cancel()
+
+    async def flush(self, tenant_id: Optional[str] = None, session_id: Optional[str] = None) -> None:
+        """Wait for pending summary passes (one conversation or all)"""
+        if tenant_id is not None:
+            states = [self._states.get((tenant_id, session_id))]
+        else:
+            states = list(self._states.values())
+        tasks = [s.task for s in states if s and s.task and not s.task.done()]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    # ------------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------------
+
+    def _state(self, tenant_id: str, session_id: str) -> _ConversationState:
+        key = (tenant_id, session_id)
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = _ConversationState(tenant_id=tenant_id, session_id=session_id)
+            self._evict_lru()
+        else:
+            self._states.move_to_end(key)
+        return state
+
+    def _evict_lru(self) -> None:
+        while len(self._states) > self.max_conversations:
+            _, state = self._states.popitem(last=False)
+            self._stats["evictions"] += 1
+            if state.task and not state.task.done():
+                state.task.cancel()
+
+    def _append(self, state, user_message, assistant_message, agent_id, created_at) -> None:
+        created_at = created_at or datetime.now(timezone.utc).isoformat()
+        turn = state.next_turn
+        state.next_turn += 1
+        state.last_turn_at = max(created_at, state.last_turn_at or created_at)
+        for role, content in (("user", user_message), ("assistant", assistant_message)):
+            if not content:
+                continue
+            message = ContextMessage(
+                role=role,
+                content=content,
+                turn_index=turn,
+                tokens=count_tokens(content) + MESSAGE_OVERHEAD_TOKENS,
+                created_at=created_at,
+                agent_id=agent_id if role == "assistant" else None,
+            )
+            state.window.append(message)
+            state.window_tokens += message.tokens
+
+    def _rebuild(self, state: _ConversationState) -> None:
+        segments = [segment for level in reversed(state.levels) for segment in level]
+        summary = "\n".join(segment.text for segment in segments if segment.text)
+        state.context = ConversationContext(
+            tenant_id=state.tenant_id,
+            session_id=state.session_id,
+            summary=summary,
+            summary_version=state.version,
+            messages=tuple({"role": m.role, "content": m.content} for m in state.window),
+            summary_tokens=sum(segment.tokens for segment in segments) + (MESSAGE_OVERHEAD_TOKENS if summary else 0),
+            recent_tokens=state.window_tokens,
+            total_turns=state.next_turn,
+            summarized_turns=state.summarized_turns,
+        )
+
+    def _schedule(self, state: _ConversationState) -> None:
+        if state.window_tokens <= self.window_tokens:
+            return
+        if state.task is not None and not state.task.done():
+            return  # The running pass re-checks the budget before it exits
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop (sync caller): the next append in a loop catches up
+        state.task = loop.create_task(self._summarize(state))
+
+    def _take_oldest(self, state: _ConversationState) -> List[ContextMessage]:
+        """Oldest whole exchanges to bring the window under the low watermark"""
+        target = int(self.window_tokens * self.low_watermark)
+        remaining = state.window_tokens
+        newest_turn = state.window[-1].turn_index
+        batch: List[ContextMessage] = []
+        for message in state.window:
+            # Never split an exchange and always keep the latest one
+            if message.turn_index == newest_turn:
+                break
+            if remaining <= target and (not batch or message.turn_index != batch[-1].turn_index):
+                break
+            batch.append(message)
+            remaining -= message.tokens
+        return batch
+
+    async def _summarize(self, state: _ConversationState) -> None:
+        try:
+            while state.window_tokens > self.window_tokens:
+                batch = self._take_oldest(state)
+                if not batch:
+                    return
+                text = await self._run_summarizer(
+                    [f"{m.role}: {m.content}" for m in batch], self.segment_tokens
+                )
+                levels = [list(level) for level in state.levels]
+                if not levels:
+                    levels.append([])
+                levels[0].append(SummarySegment(
+                    level=0,
+                    text=text,
+                    first_turn=batch[0].turn_index,
+                    last_turn=batch[-1].turn_index,
+                    tokens=count_tokens(text),
+                ))
+                await self._roll_up(levels)
+
+                if self._states.get((state.tenant_id, state.session_id)) is not state:
+                    return  # Dropped while summarizing
+
+                # Commit: only this task removes from the left of the window
+                for _ in batch:
+                    state.window_tokens -= state.window.popleft().tokens
+                state.levels = levels
+                state.version += 1
+                state.summarized_turns = batch[-1].turn_index + 1
+                state.covered_until = batch[-1].created_at
+                self._stats["summary_passes"] += 1
+                self._rebuild(state)
+
+                logger.debug(
+                    "conversation_summary_committed",
+                    tenant_id=state.tenant_id[:8],
+                    session_id=state.session_id,
+                    version=state.version,
+                    summarized_turns=state.summarized_turns,
+                    summary_tokens=state.context.summary_tokens,
+                )
+                if self.on_summary is not None:
+                    try:
+                        await self.on_summary(state.tenant_id, state.session_id, self._payload(state))
+                    except Exception as e:
+                        logger.warning(
+                            "conversation_summary_persist_failed",
+                            session_id=state.session_id,
+                            version=state.version,
+                            error=str(e),
+                        )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(
+                "conversation_summary_failed",
+                session_id=state.session_id,
+                error=str(e),
+                error_type=type(e).__name__,
+            )
+
+    async def _roll_up(self, levels: List[List[SummarySegment]]) -> None:
+        """Merge full levels upward; the top level absorbs into one segment"""
+        level = 0
+        while level < len(levels):
+            if len(levels[level]) <= self.fanout:
+                level += 1
+                continue
+            top = level == self.max_levels - 1
+            group = levels[level] if top else levels[level][: self.fanout]
+            text = await self._run_summarizer([segment.text for segment in group], self.segment_tokens)
+            merged = SummarySegment(
+                level=level if top else level + 1,
+                text=text,
+                first_turn=group[0].first_turn,
+                last_turn=group[-1].last_turn,
+                tokens=count_tokens(text),
+            )
+            if top:
+                levels[level] = [merged]
+            else:
+                levels[level] = levels[level][self.fanout:]
+                if len(levels) == level + 1:
+                    levels.append([])
+                levels[level + 1].append(merged)
+
+    async def _run_summarizer(self, texts: List[str], max_tokens: int) -> str:
+        try:
+            result = self.summarizer(texts, max_tokens)
+            if inspect.isawaitable(result):
+                result = await result
+            if result:
+                return result.strip()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._stats["summarizer_errors"] += 1
+            logger.warning("conversation_summarizer_failed", error=str(e), error_type=type(e).__name__)
+        return extractive_summary(texts, max_tokens)
+
+    @staticmethod
+    def _payload(state: _ConversationState) -> Dict[str, Any]:
+        return {
+            "version": state.version,
+            "summarized_turns": state.summarized_turns,
+            "covered_until": state.covered_until,
+            "levels": [segment.to_dict() for level in state.levels for segment in level],
+        }
+
@@ -26,7 +26,8 @@ Usage:
 """
 
 import asyncio
-from typing import List, Optional, Union
+import importlib.util
+from typing import TYPE_CHECKING, List, Optional, Union
 from datetime import datetime, timezone
 import numpy as np
 import structlog
@@ -40,16 +41,15 @@ except ImportError:
     OPENAI_AVAILABLE = False
     AsyncOpenAI = None
 
-# Sentence transformers for embeddings (fallback)
-try:
+# Sentence transformers for embeddings (fallback). Only probed here: importing
+# it pulls in torch + transformers, so it is imported when a model is loaded.
+SENTENCE_TRANSFORMERS_AVAILABLE = importlib.util.find_spec("sentence_transformers") is not None
+if TYPE_CHECKING:
     from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
-    SentenceTransformer = None
 
 from services.cache_manager import CacheManager
 from core.config import get_settings
+from core.request_memo import amemoized
 
 logger = structlog.get_logger()
 settings = get_settings()
@@ -106,7 +106,7 @@ class EmbeddingService:
 
         # Provider-specific attributes
         self.openai_client: Optional[AsyncOpenAI] = None
-        self.st_model: Optional[SentenceTransformer] = None
+        self.st_model: Optional["SentenceTransformer"] = None
 
         # Set embedding dimension based on provider/model
         if self.provider == "openai":
@@ -171,12 +171,9 @@ class EmbeddingService:
 
                 logger.info("Loading sentence-transformers model", model=self.model_name)
 
-                # Load model in thread pool to avoid blocking
+                # Import and load model in thread pool to avoid blocking
                 loop = asyncio.get_event_loop()
-                self.st_model = await loop.run_in_executor(
-                    None,
-                    lambda: SentenceTransformer(self.model_name)
-                )
+                self.st_model = await loop.run_in_executor(None, self._load_sentence_transformer)
 
                 # Get actual embedding dimension
                 test_embedding = self.st_model.encode(["test"], convert_to_numpy=True)
@@ -194,6 +191,10 @@ class EmbeddingService:
             logger.error("Failed to initialize embedding service", error=str(e))
             raise
     
+    def _load_sentence_transformer(self) -> "SentenceTransformer":
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(self.model_name)
+    
     async def embed_text(
         self,
         text: str,
@@ -209,6 +210,27 @@ class EmbeddingService:
         Returns:
             EmbeddingResult with vector and metadata
         """
+        # Within a request the vector is shared with every other service
+        # embedding the same text with the same model
+        generated: List[EmbeddingResult] = []
+
+        async def generate() -> List[float]:
+            result = await self._generate_text_embedding(text, cache_key_prefix)
+            generated.append(result)
+            return result.embedding
+
+        embedding = await amemoized("embedding", (self.model_name, text), generate)
+        if generated:
+            return generated[0]
+        return EmbeddingResult(
+            embedding=embedding,
+            model=self.model_name,
+            dimension=len(embedding),
+            duration_ms=0.0
+        )
+
+    async def _generate_text_embedding(self, text: str, cache_key_prefix: str) -> EmbeddingResult:
+        """Embed one text through the shared cache, then the provider"""
         await self.initialize()
 
         # Check cache first
@@ -46,6 +46,10 @@ class OpenAIEmbeddingServiceAdapter:
         """Get embedding dimensions"""
         return self.dimensions
 
+    def get_model_name(self) -> str:
+        """Get model name"""
+        return self.embeddings.model
+
 class EmbeddingServiceFactory:
     """Factory for creating embedding services"""
     
@@ -13,6 +13,9 @@ Features:
 - Entity tracking (drugs, conditions, procedures)
 - User preference learning
 - Multi-turn conversation support
+- Incremental, token-bounded LLM context with a rolling summary
+  (see conversation_context_store.py): ``load_context`` is O(1) for an
+  active session instead of reloading the whole history every turn
 
 Usage:
     >>> manager = EnhancedConversationManager(supabase_client)
@@ -28,8 +31,12 @@ Usage:
     ...     session_id="session_123",
     ...     include_memory=True
     ... )
+    >>> context = await manager.load_context(tenant_id, "session_123")
+    >>> messages = context.to_messages(system_prompt="You are ...")
 """
 
+import asyncio
+import os
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import structlog
@@ -38,11 +45,22 @@ from openai import OpenAI
 
 from services.supabase_client import SupabaseClient
 from services.cache_manager import CacheManager
+from services.shared.conversation_context_store import ConversationContext, ConversationContextStore
+from services.shared.supabase_utils import execute_query
 from core.config import get_settings
 
 logger = structlog.get_logger()
 settings = get_settings()
 
+# Turns after the latest persisted summary read when hydrating a session
+# (cold replica); anything beyond the window is re-summarized in background
+CONTEXT_HYDRATE_TURNS = int(os.getenv("CONVERSATION_HYDRATE_TURNS", "200"))
+SUMMARY_MODEL = os.getenv("CONVERSATION_SUMMARY_MODEL", "gpt-4o-mini")
+# Check storage for turns written by other replicas before serving a session
+# held in memory (one indexed query, normally empty). Disable only when the
+# router pins every session to one replica.
+CONTEXT_REVALIDATE = os.getenv("CONVERSATION_CONTEXT_REVALIDATE", "true").lower() == "true"
+
 
 # ============================================================================
 # MODELS
@@ -111,7 +129,8 @@ class EnhancedConversationManager:
         self,
         supabase_client: SupabaseClient,
         cache_manager: Optional[CacheManager] = None,
-        openai_client: Optional[OpenAI] = None
+        openai_client: Optional[OpenAI] = None,
+        context_store: Optional[ConversationContextStore] = None
     ):
         """
         Initialize enhanced conversation manager.
@@ -120,11 +139,17 @@ class EnhancedConversationManager:
             supabase_client: Supabase client for database access
             cache_manager: Optional cache manager for performance
             openai_client: Optional OpenAI client for memory extraction
+            context_store: Optional incremental context store (default: one
+                summarizing with the LLM and persisting to conversation_summaries)
         """
         self.supabase = supabase_client
         self.cache = cache_manager
         self.openai = openai_client or OpenAI(api_key=settings.openai_api_key)
         self.max_context_tokens = 8000  # Default context window
+        self.context_store = context_store or ConversationContextStore(
+            summarizer=self._summarize_for_context,
+            on_summary=self._persist_summary
+        )
         
         logger.info("✅ EnhancedConversationManager initialized")
     
@@ -175,6 +200,9 @@ class EnhancedConversationManager:
             # Ensure tenant context
             await self.supabase.set_tenant_context(tenant_id)
             
+            # Hydrate before inserting so the new turn is appended exactly once
+            context_ready = await self._ensure_context(tenant_id, session_id)
+            
             # Extract semantic memory (Golden Rule #5)
             memory = await self._extract_semantic_memory(
                 user_message,
@@ -203,13 +231,25 @@ class EnhancedConversationManager:
             }
             
             # Insert conversation turn
-            result = await self.supabase.client.table('conversations') \
-                .insert(turn_data) \
-                .execute()
+            result = await execute_query(
+                self.supabase.client.table('conversations').insert(turn_data)
+            )
             
             if not result.data:
                 raise Exception("Failed to insert conversation turn")
             
+            # Incremental context: tokenizes only this turn; summarization
+            # of older turns runs in background
+            if context_ready:
+                self.context_store.append_turn(
+                    tenant_id,
+                    session_id,
+                    user_message,
+                    assistant_message,
+                    agent_id=agent_id,
+                    created_at=turn_data['created_at']
+                )
+            
             # Invalidate cache
             if self.cache:
                 await self.cache.delete(f"conversation:{tenant_id}:{session_id}")
@@ -247,10 +287,13 @@ class EnhancedConversationManager:
         
         Golden Rule #3: Tenant isolation enforced
         
+        Reads the latest ``limit`` turns of the session. To build LLM context
+        every turn, use ``load_context`` instead.
+        
         Args:
             tenant_id: Tenant UUID (REQUIRED)
             session_id: Session identifier
-            limit: Maximum number of turns to load
+            limit: Maximum number of (most recent) turns to load
             include_memory: Whether to aggregate semantic memory
             
         Returns:
@@ -278,14 +321,17 @@ class EnhancedConversationManager:
             # Ensure tenant context
             await self.supabase.set_tenant_context(tenant_id)
             
-            # Query conversations
-            result = await self.supabase.client.table('conversations') \
-                .select('*') \
-                .eq('tenant_id', tenant_id) \
-                .eq('session_id', session_id) \
-                .order('created_at', desc=False) \
-                .limit(limit) \
-                .execute()
+            # Query conversations: newest first so the limit keeps the latest
+            # turns, then back to chronological order
+            result = await execute_query(
+                self.supabase.client.table('conversations')
+                .select('*')
+                .eq('tenant_id', tenant_id)
+                .eq('session_id', session_id)
+                .order('created_at', desc=True)
+                .limit(limit)
+            )
+            result.data = list(reversed(result.data or []))
             
             if not result.data:
                 logger.info(
@@ -348,6 +394,180 @@ class EnhancedConversationManager:
             )
             return [], None
     
+    async def load_context(
+        self,
+        tenant_id: str,
+        session_id: str
+    ) -> ConversationContext:
+        """
+        Ready-to-send LLM context: rolling summary plus recent window.
+        
+        For a session active on this replica, one (normally empty) check
+        for turns written elsewhere, then the prebuilt context; otherwise
+        hydrated from the latest summary version and the turns after it.
+        
+        Args:
+            tenant_id: Tenant UUID (REQUIRED)
+            session_id: Session identifier
+            
+        Returns:
+            ConversationContext (empty if the session has no history)
+            
+        Raises:
+            ValueError: If tenant_id is missing
+        """
+        if not tenant_id:
+            raise ValueError("tenant_id is REQUIRED (Golden Rule #3)")
+        
+        if await self._ensure_context(tenant_id, session_id):
+            return self.context_store.get_context(tenant_id, session_id)
+        
+        # Hydration failed: degrade to no history without caching that
+        return ConversationContext(
+            tenant_id=tenant_id,
+            session_id=session_id,
+            summary="",
+            summary_version=0,
+            messages=(),
+            summary_tokens=0,
+            recent_tokens=0,
+            total_turns=0,
+            summarized_turns=0
+        )
+    
+    async def _ensure_context(self, tenant_id: str, session_id: str) -> bool:
+        """Hydrate the session into the context store if missing or stale"""
+        if self.context_store.is_loaded(tenant_id, session_id):
+            if not CONTEXT_REVALIDATE or not await self._has_unseen_turns(tenant_id, session_id):
+                return True
+            # Another replica served this session: its turns and summary
+            # versions are in storage, so rebuild from there
+            logger.info(
+                "conversation_context_stale",
+                tenant_id=tenant_id[:8],
+                session_id=session_id
+            )
+            self.context_store.drop(tenant_id, session_id)
+        
+        try:
+            await self.supabase.set_tenant_context(tenant_id)
+            
+            summary_result = await execute_query(
+                self.supabase.client.table('conversation_summaries')
+                .select('*')
+                .eq('tenant_id', tenant_id)
+                .eq('session_id', session_id)
+                .order('version', desc=True)
+                .limit(1)
+            )
+            summary = summary_result.data[0] if summary_result.data else None
+            
+            query = self.supabase.client.table('conversations') \
+                .select('user_message, assistant_message, agent_id, created_at') \
+                .eq('tenant_id', tenant_id) \
+                .eq('session_id', session_id)
+            if summary and summary.get('covered_until'):
+                query = query.gt('created_at', summary['covered_until'])
+            # Newest first so the limit keeps the latest turns
+            result = await execute_query(
+                query.order('created_at', desc=True).limit(CONTEXT_HYDRATE_TURNS)
+            )
+            
+            context = self.context_store.load(
+                tenant_id,
+                session_id,
+                list(reversed(result.data or [])),
+                summary=summary
+            )
+            
+            logger.info(
+                "conversation_context_hydrated",
+                tenant_id=tenant_id[:8],
+                session_id=session_id,
+                summary_version=context.summary_version,
+                turns=len(result.data or [])
+            )
+            return True
+        
+        except Exception as e:
+            logger.error(
+                "Failed to hydrate conversation context",
+                tenant_id=tenant_id[:8],
+                session_id=session_id,
+                error=str(e),
+                error_type=type(e).__name__
+            )
+            return False
+    
+    async def _has_unseen_turns(self, tenant_id: str, session_id: str) -> bool:
+        """Whether storage holds turns newer than the ones held in memory"""
+        query = self.supabase.client.table('conversations') \
+            .select('created_at') \
+            .eq('tenant_id', tenant_id) \
+            .eq('session_id', session_id)
+        last_turn_at = self.context_store.last_turn_at(tenant_id, session_id)
+        if last_turn_at:
+            query = query.gt('created_at', last_turn_at)
+        try:
+            result = await execute_query(query.limit(1))
+        except Exception as e:
+            # Serving what this replica holds beats serving no history
+            logger.warning(
+                "conversation_context_revalidate_failed",
+                session_id=session_id,
+                error=str(e)
+            )
+            return False
+        return bool(result.data)
+    
+    async def _summarize_for_context(self, texts: List[str], max_tokens: int) -> str:
+        """LLM summarizer for the rolling summary (runs in background)"""
+        response = await asyncio.to_thread(
+            self.openai.chat.completions.create,
+            model=SUMMARY_MODEL,
+            messages=[
+                {
+                    "role": "system",
+                    "content": "Summarize this part of a medical/healthcare conversation for later context. "
+                               "Keep entities, decisions, open questions and user preferences. Be terse."
+                },
+                {"role": "user", "content": "\n".join(texts)}
+            ],
+            temperature=0.0,
+            max_tokens=max_tokens,
+            timeout=30.0
+        )
+        return response.choices[0].message.content
+    
+    async def _persist_summary(
+        self,
+        tenant_id: str,
+        session_id: str,
+        payload: Dict[str, Any]
+    ) -> None:
+        """Store a summary version (one row per version)"""
+        try:
+            await execute_query(
+                self.supabase.client.table('conversation_summaries').insert({
+                    'tenant_id': tenant_id,
+                    'session_id': session_id,
+                    **payload,
+                    'created_at': datetime.utcnow().isoformat()
+                })
+            )
+        except Exception as e:
+            if not _is_unique_violation(e):
+                raise
+            # Another replica committed this version first: serve its
+            # summary from the next load rather than fork the history
+            logger.info(
+                "conversation_summary_version_taken",
+                tenant_id=tenant_id[:8],
+                session_id=session_id,
+                version=payload.get('version')
+            )
+            self.context_store.drop(tenant_id, session_id)
+    
     async def _extract_semantic_memory(
         self,
         user_message: str,
@@ -598,11 +818,12 @@ Return ONLY valid JSON."""
         try:
             await self.supabase.set_tenant_context(tenant_id)
             
-            result = await self.supabase.client.table('conversations') \
-                .select('*') \
-                .eq('tenant_id', tenant_id) \
-                .eq('session_id', session_id) \
-                .execute()
+            result = await execute_query(
+                self.supabase.client.table('conversations')
+                .select('*')
+                .eq('tenant_id', tenant_id)
+                .eq('session_id', session_id)
+            )
             
             if not result.data:
                 return None
@@ -671,11 +892,20 @@ Return ONLY valid JSON."""
         try:
             await self.supabase.set_tenant_context(tenant_id)
             
-            await self.supabase.client.table('conversations') \
-                .delete() \
-                .eq('tenant_id', tenant_id) \
-                .eq('session_id', session_id) \
-                .execute()
+            await execute_query(
+                self.supabase.client.table('conversations')
+                .delete()
+                .eq('tenant_id', tenant_id)
+                .eq('session_id', session_id)
+            )
+            
+            await execute_query(
+                self.supabase.client.table('conversation_summaries')
+                .delete()
+                .eq('tenant_id', tenant_id)
+                .eq('session_id', session_id)
+            )
+            self.context_store.drop(tenant_id, session_id)
             
             # Invalidate cache
             if self.cache:
@@ -699,6 +929,11 @@ Return ONLY valid JSON."""
             return False
 
 
+def _is_unique_violation(error: Exception) -> bool:
+    """PostgREST error for a unique constraint (Postgres SQLSTATE 23505)"""
+    return getattr(error, 'code', None) == '23505' or 'duplicate key' in str(error)
+
+
 # ============================================================================
 # SERVICE FACTORY
 # ============================================================================
@@ -8,17 +8,55 @@ Based on RAGAS (Retrieval Augmented Generation Assessment):
 https://arxiv.org/abs/2309.15217
 
 Faithfulness Score = (Number of Supported Claims) / (Total Claims)
+
+Local verification indexes the retrieved context once per response
+(ContextIndex): word tokens with character offsets, a content-word set and
+a hashed 3-gram shingle table, so each claim costs set and hash lookups
+instead of substring scans over the whole context.
 """
 
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union
 from dataclasses import dataclass, field
 from enum import Enum
 import asyncio
 import re
+from bisect import bisect_right
+
+import numpy as np
 import structlog
 
+from core.llm_gateway import get_llm_gateway
+from core.llm_response_cache import CachedResponse, CachePolicy, request_digest
+
 logger = structlog.get_logger()
 
+# Claim extraction is deterministic per response text, so identical
+# responses (retries, re-scoring, panel echoes) reuse the extraction
+CLAIM_EXTRACTION_CACHE = CachePolicy("faithfulness.extract_claims", ttl_seconds=86400)
+
+WORD_PATTERN = re.compile(r'\b\w+\b')
+
+STOPWORDS = frozenset({
+    'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been',
+    'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
+    'would', 'could', 'should', 'may', 'might', 'must', 'shall',
+    'can', 'need', 'to', 'of', 'in', 'for', 'on', 'with', 'at',
+    'by', 'from', 'as', 'into', 'through', 'during', 'before',
+    'after', 'above', 'below', 'between', 'under', 'again',
+    'this', 'that', 'these', 'those', 'it', 'its', 'and', 'or',
+    'but', 'if', 'while', 'when', 'where', 'how', 'which', 'who'
+})
+
+CONTRADICTION_SIGNALS = (
+    ('not', 'is'), ('never', 'always'), ('false', 'true'),
+    ('incorrect', 'correct'), ('wrong', 'right')
+)
+
+# Shortest phrase counted as an exact match, and the cap on context
+# occurrences tried when extending a matched shingle into a span
+MIN_PHRASE_TOKENS = 3
+MAX_SHINGLE_OCCURRENCES = 16
+
 
 class ClaimVerdict(str, Enum):
     """Verdict for a claim verification"""
@@ -28,6 +66,17 @@ class ClaimVerdict(str, Enum):
     CONTRADICTED = "contradicted"  # Context contradicts claim
 
 
+@dataclass
+class EvidenceSpan:
+    """A context passage matching part of a claim, for highlighting"""
+    chunk_index: int  # index into the context list passed to score()
+    start: int  # character offsets within that chunk
+    end: int
+    text: str
+    claim_start: int  # character offsets within the claim text
+    claim_end: int
+
+
 @dataclass
 class Claim:
     """A single atomic claim extracted from a response"""
@@ -35,9 +84,129 @@ class Claim:
     verdict: ClaimVerdict = ClaimVerdict.NOT_SUPPORTED
     confidence: float = 0.0
     supporting_evidence: List[str] = field(default_factory=list)
+    supporting_spans: List[EvidenceSpan] = field(default_factory=list)
     reasoning: str = ""
 
 
+class ContextIndex:
+    """
+    Token index over the retrieved context, built once per response
+
+    - ``content_words``: lowercased word set minus stopwords (overlap checks)
+    - hashed 3-token shingles: token ids packed into one int64 per position,
+      sorted once, so a phrase lookup is a binary search (phrase checks and spans)
+    - token character offsets, so matched phrases map back to chunk offsets
+    """
+
+    SEPARATOR = "\n\n"
+
+    def __init__(self, chunks: Union[str, List[str]]):
+        self.chunks = [chunks] if isinstance(chunks, str) else list(chunks)
+        self.text = self.SEPARATOR.join(self.chunks)
+        self.text_lower = self.text.lower()
+
+        self.chunk_starts: List[int] = []
+        offset = 0
+        for chunk in self.chunks:
+            self.chunk_starts.append(offset)
+            offset += len(chunk) + len(self.SEPARATOR)
+
+        self.tokens: List[str] = WORD_PATTERN.findall(self.text_lower)
+        self._token_spans: Optional[List[Tuple[int, int]]] = None
+
+        self.vocabulary: Dict[str, int] = {}
+        token_ids = np.fromiter(
+            (self.vocabulary.setdefault(t, len(self.vocabulary)) for t in self.tokens),
+            dtype=np.int64, count=len(self.tokens),
+        )
+        self.content_words = frozenset(self.vocabulary) - STOPWORDS
+
+        keys = self._shingle_keys(token_ids)
+        self._shingle_order = np.argsort(keys, kind="stable")
+        self._sorted_shingles = keys[self._shingle_order]
+
+        self.signal_present = {pos: pos in self.text_lower for _, pos in CONTRADICTION_SIGNALS}
+
+    @staticmethod
+    def _shingle_keys(token_ids: np.ndarray) -> np.ndarray:
+        """Pack each run of MIN_PHRASE_TOKENS ids into one int64 (exact below 2**21 distinct words)"""
+        count = len(token_ids) - MIN_PHRASE_TOKENS + 1
+        if count <= 0:
+            return np.zeros(0, dtype=np.int64)
+        keys = np.zeros(count, dtype=np.int64)
+        for k in range(MIN_PHRASE_TOKENS):
+            keys = (keys << 21) ^ token_ids[k:k + count]
+        return keys
+
+    def shingle_positions(self, shingle: List[str]) -> np.ndarray:
+        """Context token positions where ``shingle`` (MIN_PHRASE_TOKENS words) starts"""
+        ids = [self.vocabulary.get(token) for token in shingle]
+        if None in ids:
+            return self._sorted_shingles[:0]
+        key = self._shingle_keys(np.array(ids, dtype=np.int64))
+        lo = np.searchsorted(self._sorted_shingles, key[0], side="left")
+        hi = np.searchsorted(self._sorted_shingles, key[0], side="right")
+        return self._shingle_order[lo:hi]
+
+    @property
+    def token_spans(self) -> List[Tuple[int, int]]:
+        """Character offsets per token, computed on first use"""
+        if self._token_spans is None:
+            self._token_spans = [m.span() for m in WORD_PATTERN.finditer(self.text_lower)]
+        return self._token_spans
+
+    def find_spans(
+        self,
+        claim_tokens: List[str],
+        claim_token_spans: List[Tuple[int, int]],
+    ) -> List[EvidenceSpan]:
+        """
+        Maximal runs of claim tokens that appear contiguously in the context
+
+        Walks the claim left to right; at each position the shingle table
+        gives candidate context positions, and the longest extension wins.
+        """
+        spans = []
+        i = 0
+        while i <= len(claim_tokens) - MIN_PHRASE_TOKENS:
+            positions = self.shingle_positions(claim_tokens[i:i + MIN_PHRASE_TOKENS])
+            best_start, best_length = None, 0
+            for position in positions[:MAX_SHINGLE_OCCURRENCES].tolist():
+                # Keys are exact for realistic vocabularies; verify anyway
+                length = 0
+                while (
+                    i + length < len(claim_tokens)
+                    and position + length < len(self.tokens)
+                    and self.tokens[position + length] == claim_tokens[i + length]
+                ):
+                    length += 1
+                if length > best_length:
+                    best_start, best_length = position, length
+
+            if best_length < MIN_PHRASE_TOKENS:
+                i += 1
+                continue
+            spans.append(self._span(
+                best_start, best_start + best_length - 1,
+                claim_token_spans[i][0], claim_token_spans[i + best_length - 1][1],
+            ))
+            i += best_length
+        return spans
+
+    def _span(self, first: int, last: int, claim_start: int, claim_end: int) -> EvidenceSpan:
+        start, end = self.token_spans[first][0], self.token_spans[last][1]
+        chunk_index = bisect_right(self.chunk_starts, start) - 1
+        chunk_offset = self.chunk_starts[chunk_index]
+        return EvidenceSpan(
+            chunk_index=chunk_index,
+            start=start - chunk_offset,
+            end=end - chunk_offset,
+            text=self.text[start:end],
+            claim_start=claim_start,
+            claim_end=claim_end,
+        )
+
+
 @dataclass
 class FaithfulnessResult:
     """Result of faithfulness evaluation"""
@@ -114,8 +283,7 @@ class FaithfulnessScorer:
             return self._empty_result()
 
         # Verify each claim against context
-        combined_context = "\n\n".join(context)
-        verified_claims = await self._verify_claims(claims, combined_context)
+        verified_claims = await self._verify_claims(claims, ContextIndex(context))
 
         # Calculate scores
         total = len(verified_claims)
@@ -248,7 +416,7 @@ Response:
 
 Claims:"""
         try:
-            result = await self.llm_client.generate(prompt)
+            result = await self._generate_cached(prompt)
             lines = result.strip().split('\n')
             claims = []
             for line in lines:
@@ -262,12 +430,28 @@ Claims:"""
             logger.warning("llm_claim_extraction_failed", error=str(e))
             return self._extract_claims_local(response)
 
+    async def _generate_cached(self, prompt: str) -> str:
+        """llm_client.generate through the shared LLM response cache"""
+        client_model = getattr(self.llm_client, "model", None) or type(self.llm_client).__name__
+
+        async def compute() -> CachedResponse:
+            return CachedResponse.from_message(await self.llm_client.generate(prompt), model=str(client_model))
+
+        response, _ = await get_llm_gateway().response_cache.get_or_compute(
+            request_digest("client", str(client_model), prompt),
+            CLAIM_EXTRACTION_CACHE,
+            compute,
+        )
+        return response.content
+
     async def _verify_claims(
         self,
         claims: List[Claim],
-        context: str
+        context: Union[str, ContextIndex]
     ) -> List[Claim]:
         """Verify each claim against the context"""
+        if not isinstance(context, ContextIndex):
+            context = ContextIndex(context)
         if self.use_local_scoring or not self.llm_client:
             return self._verify_claims_local(claims, context)
         else:
@@ -276,37 +460,29 @@ Claims:"""
     def _verify_claims_local(
         self,
         claims: List[Claim],
-        context: str
+        context: Union[str, ContextIndex]
     ) -> List[Claim]:
         """
         Verify claims using local heuristics
 
         Strategy:
         1. Check for key term overlap
-        2. Check for semantic similarity (basic)
+        2. Check for exact phrase matches (3+ consecutive words)
         3. Look for contradiction indicators
         """
-        context_lower = context.lower()
-        context_words = set(re.findall(r'\b\w+\b', context_lower))
+        index = context if isinstance(context, ContextIndex) else ContextIndex(context)
 
         verified = []
         for claim in claims:
             claim_lower = claim.text.lower()
-            claim_words = set(re.findall(r'\b\w+\b', claim_lower))
-
-            # Remove common words
-            stopwords = {
-                'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been',
-                'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
-                'would', 'could', 'should', 'may', 'might', 'must', 'shall',
-                'can', 'need', 'to', 'of', 'in', 'for', 'on', 'with', 'at',
-                'by', 'from', 'as', 'into', 'through', 'during', 'before',
-                'after', 'above', 'below', 'between', 'under', 'again',
-                'this', 'that', 'these', 'those', 'it', 'its', 'and', 'or',
-                'but', 'if', 'while', 'when', 'where', 'how', 'which', 'who'
-            }
-            claim_content_words = claim_words - stopwords
-            context_content_words = context_words - stopwords
+            claim_tokens, claim_token_spans = [], []
+            for match in WORD_PATTERN.finditer(claim_lower):
+                claim_tokens.append(match.group())
+                claim_token_spans.append(match.span())
+            claim_content_words = set(claim_tokens) - STOPWORDS
+
+            # Exact phrase matches (stronger signal), with offsets for highlighting
+            claim.supporting_spans = index.find_spans(claim_tokens, claim_token_spans)
 
             if not claim_content_words:
                 claim.verdict = ClaimVerdict.NOT_SUPPORTED
@@ -316,31 +492,15 @@ Claims:"""
                 continue
 
             # Calculate word overlap
-            overlap = claim_content_words & context_content_words
+            overlap = claim_content_words & index.content_words
             overlap_ratio = len(overlap) / len(claim_content_words)
-
-            # Check for exact phrase matches (stronger signal)
-            phrase_match = False
-            for phrase_len in range(3, min(8, len(claim_words))):
-                phrases = self._get_ngrams(claim_lower, phrase_len)
-                for phrase in phrases:
-                    if phrase in context_lower:
-                        phrase_match = True
-                        break
-                if phrase_match:
-                    break
+            phrase_match = bool(claim.supporting_spans)
 
             # Check for contradiction signals
-            contradiction_signals = [
-                ('not', 'is'), ('never', 'always'), ('false', 'true'),
-                ('incorrect', 'correct'), ('wrong', 'right')
-            ]
-            has_contradiction = False
-            for neg, pos in contradiction_signals:
-                if neg in claim_lower and pos in context_lower:
-                    # Check if they're referring to the same thing
-                    has_contradiction = True
-                    break
+            has_contradiction = any(
+                neg in claim_lower and index.signal_present[pos]
+                for neg, pos in CONTRADICTION_SIGNALS
+            )
 
             # Determine verdict
             if has_contradiction and overlap_ratio > 0.3:
@@ -369,7 +529,7 @@ Claims:"""
     async def _verify_claims_llm(
         self,
         claims: List[Claim],
-        context: str
+        context: ContextIndex
     ) -> List[Claim]:
         """Verify claims using LLM (more accurate)"""
         verified = []
@@ -378,7 +538,7 @@ Claims:"""
             prompt = f"""Determine if the following claim is supported by the context.
 
 Context:
-{context[:3000]}
+{context.text[:3000]}
 
 Claim: {claim.text}
 
@@ -419,11 +579,6 @@ Answer with just the letter (A/B/C/D) and a brief explanation."""
 
         return verified
 
-    def _get_ngrams(self, text: str, n: int) -> List[str]:
-        """Get n-grams from text"""
-        words = text.split()
-        return [' '.join(words[i:i+n]) for i in range(len(words) - n + 1)]
-
     def _generate_summary(
         self,
         score: float,
@@ -8,10 +8,19 @@ Analyzes conversation history and agent metadata to build graph relationships:
 - Agent collaboration patterns
 
 Also generates embeddings for agents using OpenAI embeddings.
+
+Relationships are built set-wise: keywords are matched in one regex pass
+per agent, agent pairs are compared as packed domain/capability bitsets in
+row blocks, and edges are accumulated in memory. Each relationship table is
+then diffed against its current rows and only the changes are written, with
+COPY into a staging table followed by a single merge statement.
 """
 
 import asyncio
 import logging
+import re
+from dataclasses import dataclass, field
+from decimal import Decimal
 from typing import Dict, List, Any, Optional, Tuple, Set
 from datetime import datetime
 import os
@@ -24,6 +33,217 @@ import numpy as np
 
 logger = logging.getLogger(__name__)
 
+Edges = Dict[Tuple[Any, ...], Tuple[Any, ...]]
+
+# Domain keywords mapping
+DOMAIN_KEYWORDS = {
+    "medical": ["medical", "clinical", "patient", "diagnosis", "treatment", "therapeutic"],
+    "medical.cardiology": ["cardiac", "heart", "cardiovascular", "coronary", "arrhythmia"],
+    "medical.oncology": ["cancer", "oncology", "tumor", "chemotherapy", "radiation"],
+    "medical.neurology": ["brain", "neurological", "seizure", "stroke", "cognitive"],
+
+    "regulatory": ["regulatory", "compliance", "fda", "ema", "submission"],
+    "regulatory.fda": ["fda", "510k", "pma", "ide", "premarket"],
+    "regulatory.ema": ["ema", "european", "ce mark", "mdr"],
+
+    "clinical": ["trial", "clinical research", "study", "protocol", "endpoint"],
+    "clinical.trial_design": ["trial design", "randomization", "blinding", "control"],
+    "clinical.biostatistics": ["statistical", "biostatistics", "analysis", "power"],
+
+    "pharma": ["pharmaceutical", "drug", "manufacturing", "formulation"],
+    "pharma.drug_development": ["drug development", "preclinical", "discovery"],
+    "pharma.manufacturing": ["manufacturing", "gmp", "production", "quality control"]
+}
+
+# Capability keywords mapping
+CAPABILITY_KEYWORDS = {
+    "medical_diagnosis_support": ["diagnosis", "differential", "symptom", "assessment"],
+    "regulatory_submission": ["submission", "510k", "pma", "application", "filing"],
+    "clinical_trial_design": ["trial design", "protocol", "recruitment", "endpoints"],
+    "statistical_analysis": ["statistics", "analysis", "hypothesis", "regression"],
+    "literature_review": ["literature", "systematic review", "meta-analysis", "evidence"],
+    "risk_assessment": ["risk", "hazard", "safety", "mitigation"],
+    "quality_assurance": ["quality", "qa", "qc", "validation", "verification"],
+    "evidence_synthesis": ["evidence", "synthesis", "systematic", "grade"],
+    "guideline_interpretation": ["guideline", "recommendation", "standard", "protocol"],
+    "data_validation": ["validation", "verify", "data quality", "accuracy"]
+}
+
+
+class KeywordMatcher:
+    """
+    Scores text against named keyword groups in a single regex pass.
+
+    Keeps the substring semantics of ``kw in text``: a zero-width lookahead
+    tries every position, longest keyword first, and every keyword that is a
+    prefix of the longest match at a position also matches there.
+    """
+
+    def __init__(self, groups: Dict[str, List[str]], bonus_per_match: float, max_bonus: float):
+        self.groups = groups
+        self.bonus_per_match = bonus_per_match
+        self.max_bonus = max_bonus
+
+        keywords = sorted({kw for kws in groups.values() for kw in kws}, key=len, reverse=True)
+        self._pattern = re.compile("(?=(" + "|".join(re.escape(kw) for kw in keywords) + "))")
+        self._implied = {kw: [other for other in keywords if kw.startswith(other)] for kw in keywords}
+        self._owners: Dict[str, List[str]] = defaultdict(list)
+        for name, kws in groups.items():
+            for kw in set(kws):
+                self._owners[kw].append(name)
+
+    def matched_keywords(self, text: str) -> Set[str]:
+        matched: Set[str] = set()
+        for longest in set(self._pattern.findall(text)):
+            matched.update(self._implied[longest])
+        return matched
+
+    def scores(self, text: str) -> Dict[str, float]:
+        """Group -> score: matches / keywords, plus a bonus for multiple matches"""
+        counts: Counter = Counter()
+        for kw in self.matched_keywords(text):
+            counts.update(self._owners[kw])
+        return {
+            name: min(count / len(self.groups[name]) + min(count * self.bonus_per_match, self.max_bonus), 1.0)
+            for name, count in counts.items()
+        }
+
+
+@dataclass(frozen=True)
+class EdgeTable:
+    """How one relationship table is diffed and merged"""
+    table: str
+    key_columns: Tuple[str, ...]
+    value_columns: Tuple[str, ...]
+    conflict_target: str
+    agent_column: str
+    # Constant columns identifying rows this builder owns (scoped diff and deletes)
+    scope: Dict[str, Any] = field(default_factory=dict)
+    # Constant columns only written on insert
+    insert_only: Dict[str, Any] = field(default_factory=dict)
+    delete_stale: bool = True
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return self.key_columns + self.value_columns + tuple(self.scope) + tuple(self.insert_only)
+
+
+DOMAIN_EDGES = EdgeTable(
+    table="agent_domains",
+    key_columns=("agent_id", "domain_id"),
+    value_columns=("proficiency_score", "confidence"),
+    conflict_target="(agent_id, domain_id)",
+    agent_column="agent_id",
+    scope={"relationship_source": "inferred_from_specialties"},
+)
+
+CAPABILITY_EDGES = EdgeTable(
+    table="agent_capabilities",
+    key_columns=("agent_id", "capability_id"),
+    value_columns=("proficiency_score", "confidence"),
+    conflict_target="(agent_id, capability_id)",
+    agent_column="agent_id",
+    scope={"relationship_source": "inferred_from_capabilities"},
+)
+
+ESCALATION_EDGES = EdgeTable(
+    table="agent_escalations",
+    key_columns=("from_agent_id", "to_agent_id"),
+    value_columns=("priority",),
+    conflict_target="(from_agent_id, to_agent_id, escalation_reason)",
+    agent_column="from_agent_id",
+    scope={"escalation_reason": "complexity_threshold_exceeded"},
+    insert_only={"success_rate": 0.80},
+)
+
+COLLABORATION_EDGES = EdgeTable(
+    table="agent_collaborations",
+    key_columns=("agent1_id", "agent2_id"),
+    value_columns=("collaboration_type", "strength", "shared_domains"),
+    conflict_target="ON CONSTRAINT unique_collaboration",
+    agent_column="agent1_id",
+    insert_only={"success_rate": 0.75},
+    # Collaboration rows may come from observed usage too; never delete them
+    delete_stale=False,
+)
+
+
+# Score changes smaller than this are not written back
+SCORE_EPSILON = 0.005
+
+
+def _same_value(stored: Any, computed: Any) -> bool:
+    """Equality tolerant to numeric column precision and array order"""
+    if isinstance(computed, float) and isinstance(stored, (int, float, Decimal)):
+        return abs(float(stored) - computed) < SCORE_EPSILON
+    if isinstance(computed, (list, tuple)) and isinstance(stored, (list, tuple)):
+        return sorted(map(str, stored)) == sorted(map(str, computed))
+    return stored == computed
+
+
+def diff_edges(current: Edges, desired: Edges, delete_stale: bool = True) -> Tuple[Edges, List[Tuple[Any, ...]]]:
+    """Edges to upsert (new or changed) and keys to delete"""
+    upserts = {
+        key: values for key, values in desired.items()
+        if key not in current or not all(map(_same_value, current[key], values))
+    }
+    deletes = [key for key in current if key not in desired] if delete_stale else []
+    return upserts, deletes
+
+
+# Rows per block when comparing all agent pairs
+PAIR_BLOCK_ROWS = 256
+
+
+def _pack_bitsets(
+    members: List[Set[Any]],
+    vocabulary: Optional[Dict[Any, int]] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pack per-agent sets into an (n, words) uint64 bitset matrix, plus set sizes.
+
+    ``vocabulary`` (value -> bit) is filled in place when given, so callers
+    can decode bitsets back into values.
+    """
+    vocabulary = {} if vocabulary is None else vocabulary
+    rows: List[int] = []
+    bits: List[int] = []
+    for i, values in enumerate(members):
+        for value in values:
+            rows.append(i)
+            bits.append(vocabulary.setdefault(value, len(vocabulary)))
+
+    words = max(1, -(-len(vocabulary) // 64))
+    dense = np.zeros((len(members), words * 64), dtype=np.uint8)
+    dense[rows, bits] = 1
+    packed = np.packbits(dense, axis=1, bitorder="little").view(np.uint64)
+    return packed, np.array([len(values) for values in members], dtype=np.int64)
+
+
+def _intersection_counts(bitsets: np.ndarray, start: int, end: int) -> np.ndarray:
+    """|set_i & set_j| for rows [start, end) against all rows"""
+    return np.bitwise_count(bitsets[start:end, None, :] & bitsets[None, :, :]).sum(axis=2, dtype=np.int64)
+
+
+def _decode_bitsets(bitsets: np.ndarray, vocabulary: Dict[Any, int]) -> Tuple[List[List[Any]], np.ndarray]:
+    """
+    Decode rows of a bitset matrix into sorted value lists.
+
+    Returns one list per distinct row and, for every input row, the index of
+    its list - so repeated bitsets are only decoded once (and rows with equal
+    bitsets share the list object).
+    """
+    values = list(vocabulary)
+    if bitsets.shape[1] == 1:
+        # Single-word bitsets: a 1-D unique is far cheaper than a row-wise one
+        unique, inverse = np.unique(bitsets[:, 0], return_inverse=True)
+        unique = unique[:, None]
+    else:
+        unique, inverse = np.unique(bitsets, axis=0, return_inverse=True)
+    bits = np.unpackbits(unique.view(np.uint8), axis=1, bitorder="little")
+    decoded = [sorted((values[b] for b in np.flatnonzero(row)), key=str) for row in bits]
+    return decoded, inverse.reshape(-1)
+
 
 class GraphRelationshipBuilder:
     """
@@ -40,39 +260,10 @@ class GraphRelationshipBuilder:
             dimensions=1536
         )
 
-        # Domain keywords mapping
-        self.domain_keywords = {
-            "medical": ["medical", "clinical", "patient", "diagnosis", "treatment", "therapeutic"],
-            "medical.cardiology": ["cardiac", "heart", "cardiovascular", "coronary", "arrhythmia"],
-            "medical.oncology": ["cancer", "oncology", "tumor", "chemotherapy", "radiation"],
-            "medical.neurology": ["brain", "neurological", "seizure", "stroke", "cognitive"],
-
-            "regulatory": ["regulatory", "compliance", "fda", "ema", "submission"],
-            "regulatory.fda": ["fda", "510k", "pma", "ide", "premarket"],
-            "regulatory.ema": ["ema", "european", "ce mark", "mdr"],
-
-            "clinical": ["trial", "clinical research", "study", "protocol", "endpoint"],
-            "clinical.trial_design": ["trial design", "randomization", "blinding", "control"],
-            "clinical.biostatistics": ["statistical", "biostatistics", "analysis", "power"],
-
-            "pharma": ["pharmaceutical", "drug", "manufacturing", "formulation"],
-            "pharma.drug_development": ["drug development", "preclinical", "discovery"],
-            "pharma.manufacturing": ["manufacturing", "gmp", "production", "quality control"]
-        }
-
-        # Capability keywords mapping
-        self.capability_keywords = {
-            "medical_diagnosis_support": ["diagnosis", "differential", "symptom", "assessment"],
-            "regulatory_submission": ["submission", "510k", "pma", "application", "filing"],
-            "clinical_trial_design": ["trial design", "protocol", "recruitment", "endpoints"],
-            "statistical_analysis": ["statistics", "analysis", "hypothesis", "regression"],
-            "literature_review": ["literature", "systematic review", "meta-analysis", "evidence"],
-            "risk_assessment": ["risk", "hazard", "safety", "mitigation"],
-            "quality_assurance": ["quality", "qa", "qc", "validation", "verification"],
-            "evidence_synthesis": ["evidence", "synthesis", "systematic", "grade"],
-            "guideline_interpretation": ["guideline", "recommendation", "standard", "protocol"],
-            "data_validation": ["validation", "verify", "data quality", "accuracy"]
-        }
+        self.domain_keywords = DOMAIN_KEYWORDS
+        self.capability_keywords = CAPABILITY_KEYWORDS
+        self.domain_matcher = KeywordMatcher(self.domain_keywords, bonus_per_match=0.1, max_bonus=0.3)
+        self.capability_matcher = KeywordMatcher(self.capability_keywords, bonus_per_match=0.15, max_bonus=0.35)
 
     async def connect_db(self):
         """Connect to PostgreSQL database"""
@@ -230,7 +421,7 @@ class GraphRelationshipBuilder:
             agent_id: Specific agent ID (or None for all agents)
 
         Returns:
-            Number of relationships created
+            Number of agent-domain relationships for the processed agents
         """
         if not self.db_pool:
             await self.connect_db()
@@ -253,7 +444,15 @@ class GraphRelationshipBuilder:
         domains = await self.db_pool.fetch("SELECT id, name FROM domains")
         domain_map = {d['name']: d['id'] for d in domains}
 
-        total_created = 0
+        edges = self.compute_domain_edges(agents, domain_map)
+        await self._sync_edges(DOMAIN_EDGES, edges, agent_ids=[a['id'] for a in agents] if agent_id else None)
+
+        logger.info(f"Built {len(edges)} agent-domain relationships")
+        return len(edges)
+
+    def compute_domain_edges(self, agents: List[Any], domain_map: Dict[str, Any]) -> Edges:
+        """(agent_id, domain_id) -> (proficiency_score, confidence)"""
+        edges: Edges = {}
 
         for agent in agents:
             # Combine all agent text for analysis
@@ -264,41 +463,15 @@ class GraphRelationshipBuilder:
                 " ".join(agent['capabilities'] or [])
             ]).lower()
 
-            # Match domains based on keywords
-            domain_scores = self._calculate_domain_matches(agent_text)
-
-            # Create relationships for domains with sufficient match
-            for domain_name, score in domain_scores.items():
+            for domain_name, score in self.domain_matcher.scores(agent_text).items():
                 if domain_name in domain_map and score >= 0.30:  # 30% threshold
-                    await self.db_pool.execute("""
-                        INSERT INTO agent_domains (agent_id, domain_id, proficiency_score, relationship_source, confidence)
-                        VALUES ($1, $2, $3, $4, $5)
-                        ON CONFLICT (agent_id, domain_id)
-                        DO UPDATE SET
-                            proficiency_score = EXCLUDED.proficiency_score,
-                            confidence = EXCLUDED.confidence,
-                            updated_at = NOW()
-                    """, agent['id'], domain_map[domain_name], min(score, 1.0), 'inferred_from_specialties', min(score * 0.9, 0.95))
-                    total_created += 1
-
-        logger.info(f"Created {total_created} agent-domain relationships")
-        return total_created
+                    edges[(agent['id'], domain_map[domain_name])] = (min(score, 1.0), min(score * 0.9, 0.95))
+
+        return edges
 
     def _calculate_domain_matches(self, agent_text: str) -> Dict[str, float]:
         """Calculate domain match scores based on keyword presence"""
-        scores = {}
-
-        for domain_name, keywords in self.domain_keywords.items():
-            match_count = sum(1 for kw in keywords if kw in agent_text)
-            total_keywords = len(keywords)
-
-            if match_count > 0:
-                # Score = (matches / total) with bonus for multiple matches
-                base_score = match_count / total_keywords
-                bonus = min(match_count * 0.1, 0.3)  # Up to 30% bonus
-                scores[domain_name] = min(base_score + bonus, 1.0)
-
-        return scores
+        return self.domain_matcher.scores(agent_text)
 
     async def build_capability_relationships(self, agent_id: Optional[str] = None) -> int:
         """
@@ -308,7 +481,7 @@ class GraphRelationshipBuilder:
             agent_id: Specific agent ID (or None for all agents)
 
         Returns:
-            Number of relationships created
+            Number of agent-capability relationships for the processed agents
         """
         if not self.db_pool:
             await self.connect_db()
@@ -331,7 +504,15 @@ class GraphRelationshipBuilder:
         capabilities = await self.db_pool.fetch("SELECT id, name FROM capabilities")
         capability_map = {c['name']: c['id'] for c in capabilities}
 
-        total_created = 0
+        edges = self.compute_capability_edges(agents, capability_map)
+        await self._sync_edges(CAPABILITY_EDGES, edges, agent_ids=[a['id'] for a in agents] if agent_id else None)
+
+        logger.info(f"Built {len(edges)} agent-capability relationships")
+        return len(edges)
+
+    def compute_capability_edges(self, agents: List[Any], capability_map: Dict[str, Any]) -> Edges:
+        """(agent_id, capability_id) -> (proficiency_score, confidence)"""
+        edges: Edges = {}
 
         for agent in agents:
             # Combine agent text
@@ -340,40 +521,15 @@ class GraphRelationshipBuilder:
                 " ".join(agent['capabilities'] or [])
             ]).lower()
 
-            # Match capabilities based on keywords
-            capability_scores = self._calculate_capability_matches(agent_text)
-
-            # Create relationships
-            for capability_name, score in capability_scores.items():
+            for capability_name, score in self.capability_matcher.scores(agent_text).items():
                 if capability_name in capability_map and score >= 0.40:  # 40% threshold
-                    await self.db_pool.execute("""
-                        INSERT INTO agent_capabilities (agent_id, capability_id, proficiency_score, relationship_source, confidence)
-                        VALUES ($1, $2, $3, $4, $5)
-                        ON CONFLICT (agent_id, capability_id)
-                        DO UPDATE SET
-                            proficiency_score = EXCLUDED.proficiency_score,
-                            confidence = EXCLUDED.confidence,
-                            updated_at = NOW()
-                    """, agent['id'], capability_map[capability_name], min(score, 1.0), 'inferred_from_capabilities', min(score * 0.85, 0.90))
-                    total_created += 1
-
-        logger.info(f"Created {total_created} agent-capability relationships")
-        return total_created
+                    edges[(agent['id'], capability_map[capability_name])] = (min(score, 1.0), min(score * 0.85, 0.90))
+
+        return edges
 
     def _calculate_capability_matches(self, agent_text: str) -> Dict[str, float]:
         """Calculate capability match scores based on keyword presence"""
-        scores = {}
-
-        for capability_name, keywords in self.capability_keywords.items():
-            match_count = sum(1 for kw in keywords if kw in agent_text)
-            total_keywords = len(keywords)
-
-            if match_count > 0:
-                base_score = match_count / total_keywords
-                bonus = min(match_count * 0.15, 0.35)
-                scores[capability_name] = min(base_score + bonus, 1.0)
-
-        return scores
+        return self.capability_matcher.scores(agent_text)
 
     # ------------------------------------------------------------------
     # Lightweight helpers for compatibility with legacy callers/tests
@@ -415,7 +571,7 @@ class GraphRelationshipBuilder:
                 a.id,
                 a.name,
                 COALESCE((a.metadata->>'tier')::INTEGER, 2) AS agent_level,
-                array_agg(DISTINCT d.name) AS domains
+                array_agg(DISTINCT d.name) FILTER (WHERE d.name IS NOT NULL) AS domains
             FROM agents a
             LEFT JOIN agent_domains ad ON a.id = ad.agent_id
             LEFT JOIN domains d ON ad.domain_id = d.id
@@ -423,44 +579,42 @@ class GraphRelationshipBuilder:
             GROUP BY a.id, a.name, a.metadata
         """)
 
-        total_created = 0
+        edges = self.compute_escalation_edges(agents)
+        await self._sync_edges(ESCALATION_EDGES, edges)
 
-        # Build escalation paths
-        for from_agent in agents:
-            from_level = from_agent['agent_level']
-            from_domains = set(from_agent['domains'] or [])
-
-            # Find higher-level agents in same domains (lower number = higher level)
-            for to_agent in agents:
-                to_level = to_agent['agent_level']
-                to_domains = set(to_agent['domains'] or [])
-
-                # Skip if not higher level
-                if to_level >= from_level:
-                    continue
-
-                # Check domain overlap
-                shared_domains = from_domains & to_domains
-
-                if shared_domains:
-                    # Calculate priority based on level difference and domain overlap
-                    tier_diff = from_level - to_level
-                    domain_overlap = len(shared_domains) / max(len(from_domains), 1)
-                    priority = int((tier_diff * 3) + (domain_overlap * 5))
-
-                    # Create escalation path
-                    await self.db_pool.execute("""
-                        INSERT INTO agent_escalations (from_agent_id, to_agent_id, escalation_reason, priority, success_rate)
-                        VALUES ($1, $2, $3, $4, $5)
-                        ON CONFLICT (from_agent_id, to_agent_id, escalation_reason)
-                        DO UPDATE SET
-                            priority = EXCLUDED.priority,
-                            updated_at = NOW()
-                    """, from_agent['id'], to_agent['id'], 'complexity_threshold_exceeded', priority, 0.80)
-                    total_created += 1
-
-        logger.info(f"Created {total_created} escalation paths")
-        return total_created
+        logger.info(f"Built {len(edges)} escalation paths")
+        return len(edges)
+
+    def compute_escalation_edges(self, agents: List[Any]) -> Edges:
+        """
+        (from_agent_id, to_agent_id) -> (priority,)
+
+        Domain sets are packed into bitsets and compared a row block at a
+        time, so the all-pairs check is vectorized instead of n² set ops.
+        """
+        domain_bits, domain_counts = _pack_bitsets([set(a['domains'] or []) - {None} for a in agents])
+        levels = np.array([a['agent_level'] for a in agents], dtype=np.int64)
+        ids = [a['id'] for a in agents]
+        edges: Edges = {}
+
+        for start in range(0, len(agents), PAIR_BLOCK_ROWS):
+            end = min(start + PAIR_BLOCK_ROWS, len(agents))
+            shared = _intersection_counts(domain_bits, start, end)
+
+            # Only escalate to higher level (lower number = higher level) in a shared domain
+            tier_diff = levels[start:end, None] - levels[None, :]
+            rows, cols = np.nonzero((shared > 0) & (tier_diff > 0))
+
+            # Priority based on level difference and domain overlap
+            domain_overlap = shared[rows, cols] / np.maximum(domain_counts[start + rows], 1)
+            priority = ((tier_diff[rows, cols] * 3) + (domain_overlap * 5)).astype(np.int64)
+
+            edges.update(
+                ((ids[i], ids[j]), (value,))
+                for i, j, value in zip((start + rows).tolist(), cols.tolist(), priority.tolist())
+            )
+
+        return edges
 
     async def build_collaboration_patterns(self) -> int:
         """
@@ -490,42 +644,137 @@ class GraphRelationshipBuilder:
             GROUP BY a.id, a.name
         """)
 
-        total_created = 0
+        edges = self.compute_collaboration_edges(agents)
+        await self._sync_edges(COLLABORATION_EDGES, edges)
 
-        # Find collaboration pairs
-        for i, agent1 in enumerate(agents):
-            for agent2 in agents[i+1:]:  # Only create once (A-B, not A-B and B-A)
-                domains1 = set(agent1['domain_ids'] or [])
-                domains2 = set(agent2['domain_ids'] or [])
-                caps1 = set(agent1['capability_ids'] or [])
-                caps2 = set(agent2['capability_ids'] or [])
-
-                # Calculate collaboration strength
-                shared_domains = domains1 & domains2
-                complementary_caps = (caps1 - caps2) | (caps2 - caps1)
-
-                if shared_domains and complementary_caps:
-                    # Strength based on shared domains and complementary capabilities
-                    domain_factor = len(shared_domains) / max(len(domains1 | domains2), 1)
-                    capability_factor = len(complementary_caps) / max(len(caps1 | caps2), 1)
-                    strength = min((domain_factor * 0.4) + (capability_factor * 0.6), 1.0)
-
-                    if strength >= 0.40:  # 40% threshold
-                        collaboration_type = 'complementary_expertise' if capability_factor > 0.6 else 'multi_domain'
-
-                        await self.db_pool.execute("""
-                            INSERT INTO agent_collaborations (agent1_id, agent2_id, collaboration_type, strength, shared_domains, success_rate)
-                            VALUES ($1, $2, $3, $4, $5, $6)
-                            ON CONFLICT ON CONSTRAINT unique_collaboration
-                            DO UPDATE SET
-                                strength = EXCLUDED.strength,
-                                shared_domains = EXCLUDED.shared_domains,
-                                updated_at = NOW()
-                        """, agent1['id'], agent2['id'], collaboration_type, strength, list(shared_domains), 0.75)
-                        total_created += 1
-
-        logger.info(f"Created {total_created} collaboration patterns")
-        return total_created
+        logger.info(f"Built {len(edges)} collaboration patterns")
+        return len(edges)
+
+    def compute_collaboration_edges(self, agents: List[Any]) -> Edges:
+        """
+        (agent1_id, agent2_id) -> (collaboration_type, strength, shared_domains)
+
+        Each pair is considered once (agent1 before agent2 in catalog order),
+        with domain and capability overlaps computed on packed bitsets.
+        """
+        domain_vocabulary: Dict[Any, int] = {}
+        domain_bits, domain_counts = _pack_bitsets(
+            [set(a['domain_ids'] or []) for a in agents], domain_vocabulary,
+        )
+        capability_bits, _ = _pack_bitsets([set(a['capability_ids'] or []) for a in agents])
+        ids = [a['id'] for a in agents]
+        edges: Edges = {}
+
+        for start in range(0, len(agents), PAIR_BLOCK_ROWS):
+            end = min(start + PAIR_BLOCK_ROWS, len(agents))
+            shared = _intersection_counts(domain_bits, start, end)
+            upper = np.arange(len(agents))[None, :] > np.arange(start, end)[:, None]
+            rows, cols = np.nonzero((shared > 0) & upper)
+
+            # Complementary capabilities: in exactly one of the two agents
+            caps1, caps2 = capability_bits[start + rows], capability_bits[cols]
+            complementary = np.bitwise_count(caps1 ^ caps2).sum(axis=1, dtype=np.int64)
+            capability_union = np.bitwise_count(caps1 | caps2).sum(axis=1, dtype=np.int64)
+
+            # Strength based on shared domains and complementary capabilities
+            shared_pairs = shared[rows, cols]
+            domain_union = domain_counts[start + rows] + domain_counts[cols] - shared_pairs
+            domain_factor = shared_pairs / np.maximum(domain_union, 1)
+            capability_factor = complementary / np.maximum(capability_union, 1)
+            strength = np.minimum((domain_factor * 0.4) + (capability_factor * 0.6), 1.0)
+
+            keep = (complementary > 0) & (strength >= 0.40)  # 40% threshold
+            rows, cols = start + rows[keep], cols[keep]
+            shared_domains, shared_index = _decode_bitsets(domain_bits[rows] & domain_bits[cols], domain_vocabulary)
+            collaboration_types = np.where(
+                capability_factor[keep] > 0.6, 'complementary_expertise', 'multi_domain',
+            ).tolist()
+            edges.update(
+                ((ids[i], ids[j]), (kind, value, shared_domains[k]))
+                for i, j, kind, value, k in zip(
+                    rows.tolist(), cols.tolist(), collaboration_types,
+                    strength[keep].tolist(), shared_index.tolist(),
+                )
+            )
+
+        return edges
+
+    # ------------------------------------------------------------------
+    # Diffed bulk writes
+    # ------------------------------------------------------------------
+
+    async def _fetch_edges(self, spec: EdgeTable, agent_ids: Optional[List[Any]] = None) -> Edges:
+        """Current rows owned by this builder (optionally for some agents)"""
+        conditions, args = [], []
+        for column, value in spec.scope.items():
+            args.append(value)
+            conditions.append(f"{column} = ${len(args)}")
+        if agent_ids is not None:
+            args.append(list(agent_ids))
+            conditions.append(f"{spec.agent_column} = ANY(${len(args)})")
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        rows = await self.db_pool.fetch(
+            f"SELECT {', '.join(spec.key_columns + spec.value_columns)} FROM {spec.table} {where}",
+            *args,
+        )
+        width = len(spec.key_columns)
+        return {tuple(row.values())[:width]: tuple(row.values())[width:] for row in rows}
+
+    async def _sync_edges(
+        self,
+        spec: EdgeTable,
+        edges: Edges,
+        agent_ids: Optional[List[Any]] = None,
+    ) -> Dict[str, int]:
+        """
+        Write only the difference between ``edges`` and the table.
+
+        Changed/new edges and stale keys are COPYed into a temporary staging
+        table, then one statement deletes stale rows and upserts the rest.
+        """
+        current = await self._fetch_edges(spec, agent_ids)
+        upserts, deletes = diff_edges(current, edges, delete_stale=spec.delete_stale)
+        stats = {"upserted": len(upserts), "deleted": len(deletes), "unchanged": len(edges) - len(upserts)}
+        if not upserts and not deletes:
+            logger.info(f"{spec.table}: no changes ({len(edges)} edges)")
+            return stats
+
+        constants = tuple(spec.scope.values()) + tuple(spec.insert_only.values())
+        blank_values = (None,) * len(spec.value_columns)
+        records = [("upsert",) + key + values + constants for key, values in upserts.items()]
+        records += [("delete",) + key + blank_values + constants for key in deletes]
+
+        stage = f"_stage_{spec.table}"
+        columns = ", ".join(spec.columns)
+        key_match = " AND ".join(f"t.{c} = s.{c}" for c in spec.key_columns)
+        scope_match = "".join(f" AND t.{c} = s.{c}" for c in spec.scope)
+        updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in spec.value_columns)
+
+        async with self.db_pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(f"""
+                    CREATE TEMP TABLE {stage} ON COMMIT DROP AS
+                    SELECT ''::text AS op, {columns} FROM {spec.table} WITH NO DATA
+                """)
+                await conn.copy_records_to_table(stage, records=records, columns=["op", *spec.columns])
+                await conn.execute(f"""
+                    WITH deleted AS (
+                        DELETE FROM {spec.table} t
+                        USING {stage} s
+                        WHERE s.op = 'delete' AND {key_match}{scope_match}
+                    )
+                    INSERT INTO {spec.table} ({columns})
+                    SELECT {columns} FROM {stage} WHERE op = 'upsert'
+                    ON CONFLICT {spec.conflict_target}
+                    DO UPDATE SET {updates}, updated_at = NOW()
+                """)
+
+        logger.info(
+            f"{spec.table}: {stats['upserted']} upserted, {stats['deleted']} deleted, "
+            f"{stats['unchanged']} unchanged"
+        )
+        return stats
 
     async def build_all_relationships(self, agent_id: Optional[str] = None):
         """Build all graph relationships for agents"""
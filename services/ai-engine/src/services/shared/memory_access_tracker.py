@@ -0,0 +1,324 @@
+"""
+Memory Access Tracker - Aggregated, Batched Memory Access Statistics
+
+Replaces one ``update_memory_access`` RPC task per recalled memory with
+in-memory counters that a background task flushes as one batched update.
+
+Key Features:
+- ``record`` is synchronous and O(memories): repeated recalls of the same
+  memory within an interval collapse into one counter
+- One ``apply_memory_access_batch`` RPC per ``flush_interval_seconds`` (or
+  sooner once ``batch_size`` memories are pending); the RPC bumps
+  accessed_count / last_accessed_at and applies salience decay (half-life
+  since the previous access) plus an access boost in the same statement
+- Counters of a failed flush are merged back, never lost; a flush cancelled
+  mid-RPC leaves the shielded RPC running and the next flush settles its
+  outcome first, so a batch that did commit is never re-sent
+- Graceful shutdown drains everything still pending (see api/lifespan.py)
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import structlog
+
+from services.shared.supabase_utils import execute_query
+
+logger = structlog.get_logger()
+
+
+# Defaults (override via environment or constructor)
+FLUSH_INTERVAL_SECONDS = float(os.getenv("MEMORY_ACCESS_FLUSH_INTERVAL_SECONDS", "5.0"))
+BATCH_SIZE = int(os.getenv("MEMORY_ACCESS_BATCH_SIZE", "500"))
+SALIENCE_HALF_LIFE_DAYS = float(os.getenv("MEMORY_SALIENCE_HALF_LIFE_DAYS", "30"))
+SALIENCE_ACCESS_BOOST = float(os.getenv("MEMORY_SALIENCE_ACCESS_BOOST", "0.05"))
+
+BATCH_RPC_NAME = "apply_memory_access_batch"
+MAX_DRAIN_ATTEMPTS = 3
+
+
+@dataclass
+class AccessDelta:
+    """Accesses of one memory since the last flush"""
+    hits: int
+    last_accessed_at: datetime
+
+    def merge(self, other: "AccessDelta") -> None:
+        self.hits += other.hits
+        self.last_accessed_at = max(self.last_accessed_at, other.last_accessed_at)
+
+    def to_row(self, memory_id: str) -> Dict[str, Any]:
+        return {
+            "id": memory_id,
+            "hits": self.hits,
+            "last_accessed_at": self.last_accessed_at.isoformat(),
+        }
+
+
+class MemoryAccessTracker:
+    """
+    Aggregating, batching tracker for session memory access statistics.
+
+    The flush loop starts on the first ``record`` made inside a running
+    event loop.
+    """
+
+    def __init__(
+        self,
+        supabase_client,
+        flush_interval_seconds: float = FLUSH_INTERVAL_SECONDS,
+        batch_size: int = BATCH_SIZE,
+        half_life_days: float = SALIENCE_HALF_LIFE_DAYS,
+        access_boost: float = SALIENCE_ACCESS_BOOST,
+    ):
+        """
+        Initialize tracker.
+
+        Args:
+            supabase_client: Client exposing ``rpc(name, params).execute()``
+            flush_interval_seconds: Maximum time an access waits before flush
+            batch_size: Pending memories that trigger an early flush
+            half_life_days: Salience half-life between accesses
+            access_boost: Salience added per access
+        """
+        self.supabase = supabase_client
+        self.flush_interval_seconds = flush_interval_seconds
+        self.batch_size = batch_size
+        self.half_life_days = half_life_days
+        self.access_boost = access_boost
+
+        self._pending: Dict[str, AccessDelta] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        # (rpc, batch, started) of a flush whose caller was cancelled mid-RPC
+        self._in_flight: Optional[Tuple[asyncio.Future, Dict[str, AccessDelta], float]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+        self.metrics = {
+            "recorded": 0,
+            "flushed_hits": 0,
+            "batches": 0,
+            "flush_failures": 0,
+            "dropped": 0,
+        }
+
+    # ========================================================================
+    # Hot Path
+    # ========================================================================
+
+    def record(self, memory_ids: Iterable[Any], accessed_at: Optional[datetime] = None) -> None:
+        """Count one access of each memory; never awaits"""
+        memory_ids = [str(memory_id) for memory_id in memory_ids]
+        if self._closed:
+            self.metrics["dropped"] += len(memory_ids)
+            return
+
+        accessed_at = accessed_at or datetime.now(timezone.utc)
+        for memory_id in memory_ids:
+            delta = self._pending.get(memory_id)
+            if delta is None:
+                self._pending[memory_id] = AccessDelta(hits=1, last_accessed_at=accessed_at)
+            else:
+                delta.merge(AccessDelta(hits=1, last_accessed_at=accessed_at))
+        self.metrics["recorded"] += len(memory_ids)
+
+        self._ensure_started()
+        if self._wakeup is not None and len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    # ========================================================================
+    # Lifecycle
+    # ========================================================================
+
+    def _ensure_started(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Flushed by the next record inside a loop, or by shutdown
+        self._wakeup = asyncio.Event()
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        self._task = loop.create_task(self._run())
+
+    async def shutdown(self, timeout: float = 10.0) -> None:
+        """Stop accepting accesses and flush everything still pending"""
+        self._closed = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+        if self._task is not None:
+            try:
+                await asyncio.wait_for(self._task, timeout=timeout)
+            except asyncio.TimeoutError:
+                # wait_for cancelled the loop; an in-flight RPC is settled by the drain
+                pass
+            self._task = None
+
+        try:
+            await asyncio.wait_for(self._drain(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("memory_access_tracker_shutdown_timeout", pending=len(self._pending))
+
+        logger.info("memory_access_tracker_stopped", **self.get_statistics())
+
+    async def _run(self) -> None:
+        while not self._closed:
+            if len(self._pending) < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+            self._wakeup.clear()
+            if self._closed:
+                break
+
+            if not await self.flush() and self._pending:
+                # Flush failed; back off instead of spinning
+                await asyncio.sleep(self.flush_interval_seconds)
+
+    async def _drain(self) -> None:
+        # Bounded: if the RPC keeps failing the counters stay pending (and
+        # are reported in the stopped event) rather than retrying forever
+        for _ in range(MAX_DRAIN_ATTEMPTS):
+            if not self._pending and self._in_flight is None:
+                return
+            await self.flush()
+
+    # ========================================================================
+    # Flushing
+    # ========================================================================
+
+    async def flush(self) -> int:
+        """
+        Write all pending counters in one batched RPC.
+
+        Returns:
+            Number of memories updated, including a batch a cancelled flush left
+            in flight (0 if nothing was pending or it failed)
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        async with self._flush_lock:
+            settled = 0
+            if self._in_flight is not None:
+                # A failed earlier RPC merges its batch back into this one
+                settled = await self._settle_in_flight()
+            if not self._pending:
+                return settled
+            # Swap first: accesses recorded during the RPC go to a new batch
+            batch, self._pending = self._pending, {}
+
+            rpc = asyncio.ensure_future(execute_query(self.supabase.rpc(BATCH_RPC_NAME, {
+                "p_updates": [delta.to_row(memory_id) for memory_id, delta in batch.items()],
+                "p_half_life_days": self.half_life_days,
+                "p_access_boost": self.access_boost,
+            })))
+            self._in_flight = (rpc, batch, time.perf_counter())
+            return settled + await self._settle_in_flight()
+
+    async def _settle_in_flight(self) -> int:
+        """
+        Wait for the in-flight RPC and account for its outcome.
+
+        The RPC is shielded: cancelling the caller cannot stop a write that
+        may already have committed, so the batch stays in flight (neither
+        merged back nor counted) until a later flush sees how it ended.
+        """
+        rpc, batch, start = self._in_flight
+        try:
+            await asyncio.shield(rpc)
+        except asyncio.CancelledError:
+            if rpc.done():
+                self._finish_in_flight()
+            raise
+        except Exception:
+            pass  # Inspected below
+        return self._finish_in_flight()
+
+    def _finish_in_flight(self) -> int:
+        rpc, batch, start = self._in_flight
+        self._in_flight = None
+        error = "cancelled" if rpc.cancelled() else rpc.exception()
+        if error is not None:
+            self.metrics["flush_failures"] += 1
+            self._merge_back(batch)
+            logger.warning("memory_access_flush_failed", memories=len(batch), error=str(error))
+            return 0
+
+        self.metrics["batches"] += 1
+        self.metrics["flushed_hits"] += sum(delta.hits for delta in batch.values())
+        logger.debug(
+            "memory_access_flushed",
+            memories=len(batch),
+            duration_ms=int((time.perf_counter() - start) * 1000),
+        )
+        return len(batch)
+
+    def _merge_back(self, batch: Dict[str, AccessDelta]) -> None:
+        for memory_id, delta in batch.items():
+            pending = self._pending.get(memory_id)
+            if pending is None:
+                self._pending[memory_id] = delta
+            else:
+                pending.merge(delta)
+
+    # ========================================================================
+    # Introspection
+    # ========================================================================
+
+    @property
+    def pending(self) -> int:
+        """Memories with accesses not yet flushed"""
+        return len(self._pending)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get tracker statistics"""
+        in_flight = self._in_flight[1] if self._in_flight is not None else {}
+        return {
+            **self.metrics,
+            "pending_memories": len(self._pending),
+            "pending_hits": sum(delta.hits for delta in self._pending.values()),
+            "in_flight_hits": sum(delta.hits for delta in in_flight.values()),
+        }
+
+
+# Global instance
+_memory_access_tracker: Optional[MemoryAccessTracker] = None
+
+
+def get_memory_access_tracker() -> Optional[MemoryAccessTracker]:
+    """Get global memory access tracker instance (None if never created)"""
+    return _memory_access_tracker
+
+
+def ensure_memory_access_tracker(supabase_client, **kwargs) -> MemoryAccessTracker:
+    """
+    Get or create the global memory access tracker.
+
+    Args:
+        supabase_client: Supabase client (used on first creation)
+        **kwargs: MemoryAccessTracker options (first creation only)
+
+    Returns:
+        Global tracker (its flush loop starts on first use)
+    """
+    global _memory_access_tracker
+
+    if _memory_access_tracker is None:
+        _memory_access_tracker = MemoryAccessTracker(supabase_client, **kwargs)
+
+    return _memory_access_tracker
+
+
+def reset_memory_access_tracker() -> None:
+    """Reset the global tracker (tests)"""
+    global _memory_access_tracker
+    _memory_access_tracker = None
@@ -16,9 +16,14 @@ Features:
 - Recall: Semantic search for relevant memories
 - Importance scoring: Prioritize valuable memories
 - Memory extraction: Auto-extract from conversations
-- Access tracking: Update usage statistics
+- Access tracking: Usage statistics aggregated in memory and flushed in
+  batches with salience decay (see memory_access_tracker.py)
 - Cleanup: Remove low-value old memories
 
+Database calls run off the event loop (supabase-py's sync client blocks in
+``execute()``), and recall results are cached under a stable digest of the
+query and its filters.
+
 Usage:
     >>> service = SessionMemoryService(supabase, embedding_service)
     >>> await service.remember(
@@ -36,7 +41,8 @@ Usage:
     ... )
 """
 
-import asyncio
+import hashlib
+import json
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone
 from uuid import UUID, uuid4
@@ -45,6 +51,11 @@ from pydantic import BaseModel, Field, UUID4
 
 from services.embedding_service import EmbeddingService, get_embedding_service
 from services.cache_manager import CacheManager
+from services.shared.memory_access_tracker import (
+    MemoryAccessTracker,
+    ensure_memory_access_tracker,
+    execute_query,
+)
 
 logger = structlog.get_logger()
 
@@ -109,7 +120,8 @@ class SessionMemoryService:
         self,
         supabase_client,
         embedding_service: Optional[EmbeddingService] = None,
-        cache_manager: Optional[CacheManager] = None
+        cache_manager: Optional[CacheManager] = None,
+        access_tracker: Optional[MemoryAccessTracker] = None
     ):
         """
         Initialize memory service.
@@ -118,10 +130,13 @@ class SessionMemoryService:
             supabase_client: Supabase client for database operations
             embedding_service: Service for generating embeddings
             cache_manager: Cache manager for performance
+            access_tracker: Batched access tracking (default: the global
+                tracker, drained on application shutdown)
         """
         self.supabase = supabase_client
         self.embedding_service = embedding_service or get_embedding_service()
         self.cache_manager = cache_manager or CacheManager()
+        self.access_tracker = access_tracker or ensure_memory_access_tracker(supabase_client)
         
         logger.info("✅ SessionMemoryService initialized")
     
@@ -178,9 +193,9 @@ class SessionMemoryService:
             }
             
             # Insert into database
-            result = self.supabase.table('session_memories')\
-                .insert(memory_data)\
-                .execute()
+            result = await execute_query(
+                self.supabase.table('session_memories').insert(memory_data)
+            )
             
             if not result.data:
                 raise ValueError("Failed to insert memory")
@@ -233,11 +248,16 @@ class SessionMemoryService:
         """
         try:
             # Check cache
-            cache_key = f"recall:{tenant_id}:{user_id}:{hash(query)}"
+            cache_key = self._recall_cache_key(
+                query, tenant_id, user_id, memory_types, session_id,
+                min_importance, max_results, min_similarity
+            )
             cached = await self.cache_manager.get(cache_key)
             if cached:
                 logger.debug("Recall cache hit", query_preview=query[:50])
-                return [RecalledMemory(**m) for m in cached]
+                recalled_memories = [RecalledMemory(**m) for m in cached]
+                self.access_tracker.record(m.memory.id for m in recalled_memories)
+                return recalled_memories
             
             # Generate query embedding
             query_embedding = await self.embedding_service.embed_text(
@@ -252,7 +272,7 @@ class SessionMemoryService:
                 return []
 
             # Call database function for semantic search
-            result = self.supabase.rpc(
+            result = await execute_query(self.supabase.rpc(
                 'search_memories_by_embedding',
                 {
                     'query_embedding': query_embedding.embedding,
@@ -263,7 +283,7 @@ class SessionMemoryService:
                     'p_min_importance': min_importance,
                     'p_limit': max_results
                 }
-            ).execute()
+            ))
             
             if not result.data:
                 return []
@@ -302,11 +322,9 @@ class SessionMemoryService:
                 )
                 
                 recalled_memories.append(recalled_memory)
-                
-                # Update access tracking (fire and forget)
-                asyncio.create_task(
-                    self._update_access_tracking(UUID(row['id']))
-                )
+            
+            # Aggregated in memory, flushed in batches
+            self.access_tracker.record(m.memory.id for m in recalled_memories)
             
             # Sort by relevance
             recalled_memories.sort(key=lambda m: m.relevance_score, reverse=True)
@@ -359,7 +377,7 @@ class SessionMemoryService:
                 logger.debug("get_recent_memories skipped - no valid user_id", user_id=user_id)
                 return []
 
-            result = self.supabase.rpc(
+            result = await execute_query(self.supabase.rpc(
                 'get_recent_memories',
                 {
                     'p_tenant_id': str(tenant_id),
@@ -368,7 +386,7 @@ class SessionMemoryService:
                     'p_days': days,
                     'p_limit': max_results
                 }
-            ).execute()
+            ))
             
             if not result.data:
                 return []
@@ -529,13 +547,13 @@ Only extract truly valuable information. Return empty array [] if nothing import
             Number of memories cleaned up
         """
         try:
-            result = self.supabase.rpc(
+            result = await execute_query(self.supabase.rpc(
                 'cleanup_old_memories',
                 {
                     'p_tenant_id': str(tenant_id),
                     'p_days': days
                 }
-            ).execute()
+            ))
             
             count = result.data if result.data else 0
             
@@ -574,15 +592,36 @@ Only extract truly valuable information. Return empty array [] if nothing import
         
         return max(0.0, min(1.0, relevance))
     
-    async def _update_access_tracking(self, memory_id: UUID):
-        """Update memory access tracking (fire and forget)."""
-        try:
-            self.supabase.rpc(
-                'update_memory_access',
-                {'p_memory_id': str(memory_id)}
-            ).execute()
-        except Exception as e:
-            logger.debug("Failed to update access tracking", error=str(e))
+    @staticmethod
+    def _recall_cache_key(
+        query: str,
+        tenant_id: UUID4,
+        user_id: UUID4,
+        memory_types: Optional[List[str]],
+        session_id: Optional[str],
+        min_importance: float,
+        max_results: int,
+        min_similarity: float
+    ) -> str:
+        """
+        Stable cache key for a recall.
+        
+        A content digest (``hash()`` of a str is salted per process, so it
+        never hit across workers or restarts) that also covers the filters.
+        """
+        params = json.dumps(
+            {
+                'query': " ".join(query.split()),
+                'memory_types': sorted(memory_types) if memory_types else None,
+                'session_id': session_id,
+                'min_importance': min_importance,
+                'max_results': max_results,
+                'min_similarity': min_similarity
+            },
+            sort_keys=True
+        )
+        digest = hashlib.blake2b(params.encode("utf-8"), digest_size=16).hexdigest()
+        return f"recall:{tenant_id}:{user_id}:{digest}"
     
     async def _invalidate_recall_cache(self, tenant_id: UUID4, user_id: UUID4):
         """Invalidate recall cache for user."""
@@ -598,7 +637,7 @@ Only extract truly valuable information. Return empty array [] if nothing import
         """Check if the service is healthy."""
         try:
             # Check database connection
-            result = self.supabase.table('session_memories').select('id').limit(1).execute()
+            await execute_query(self.supabase.table('session_memories').select('id').limit(1))
             
             # Check embedding service
             embedding_healthy = await self.embedding_service.health_check()
@@ -617,7 +656,8 @@ _memory_service: Optional[SessionMemoryService] = None
 def get_session_memory_service(
     supabase_client,
     embedding_service: Optional[EmbeddingService] = None,
-    cache_manager: Optional[CacheManager] = None
+    cache_manager: Optional[CacheManager] = None,
+    access_tracker: Optional[MemoryAccessTracker] = None
 ) -> SessionMemoryService:
     """Get or create global memory service instance."""
     global _memory_service
@@ -626,7 +666,8 @@ def get_session_memory_service(
         _memory_service = SessionMemoryService(
             supabase_client,
             embedding_service,
-            cache_manager
+            cache_manager,
+            access_tracker
         )
     
     return _memory_service
@@ -9,6 +9,8 @@ Key Features:
 - Create LangGraph-compatible skill nodes
 - Map skills to agent hierarchy levels
 - Cache skills for performance
+- Ranked, faceted search via the shared CapabilityCatalog
+- Incremental reload: only MD files whose content hash changed are re-parsed
 
 Skill File Structure:
 ```markdown
@@ -48,6 +50,8 @@ import structlog
 import hashlib
 from datetime import datetime
 
+from .capability_catalog import CapabilityCatalog, CatalogEntry, get_capability_catalog
+
 logger = structlog.get_logger()
 
 
@@ -347,7 +351,8 @@ class SkillsLoaderService:
     def __init__(
         self,
         skills_docs_path: Optional[str] = None,
-        additional_skills_paths: Optional[List[str]] = None
+        additional_skills_paths: Optional[List[str]] = None,
+        catalog: Optional[CapabilityCatalog] = None
     ):
         """
         Initialize skills loader.
@@ -355,6 +360,7 @@ class SkillsLoaderService:
         Args:
             skills_docs_path: Path to skills docs directory
             additional_skills_paths: Additional paths to load skills from
+            catalog: Capability catalog to index into (defaults to shared catalog)
         """
         # Default to ai-engine/docs/skills/
         if skills_docs_path is None:
@@ -369,6 +375,11 @@ class SkillsLoaderService:
         self._skills_by_category: Dict[str, List[str]] = {}
         self._skills_by_level: Dict[int, List[str]] = {i: [] for i in range(1, 6)}
 
+        # Search index and per-file content hashes for incremental reloads
+        self.catalog = catalog if catalog is not None else get_capability_catalog()
+        self._file_hashes: Dict[str, str] = {}
+        self._skills_by_file: Dict[str, List[str]] = {}
+
         # Cache
         self._loaded = False
         self._loaded_at: Optional[datetime] = None
@@ -383,6 +394,9 @@ class SkillsLoaderService:
         """
         Load all skills from MD files.
 
+        Reloads are incremental: files whose content hash is unchanged keep
+        their parsed skills, and only changed skills are re-indexed.
+
         Args:
             force_reload: Force reload even if already loaded
 
@@ -392,17 +406,20 @@ class SkillsLoaderService:
         if self._loaded and not force_reload:
             return len(self._skills)
 
-        # Clear existing
-        self._skills.clear()
-        self._skills_by_category.clear()
-        self._skills_by_level = {i: [] for i in range(1, 6)}
+        seen_files: set = set()
+        changed_files = 0
 
-        # Load from primary path
-        await self._load_from_directory(self.skills_docs_path)
+        # Load from primary path, then additional paths
+        for path in [self.skills_docs_path] + self.additional_paths:
+            changed_files += await self._load_from_directory(path, seen_files)
 
-        # Load from additional paths
-        for path in self.additional_paths:
-            await self._load_from_directory(path)
+        # Drop skills from files that disappeared
+        for file_path in [f for f in self._file_hashes if f not in seen_files]:
+            self._replace_file_skills(file_path, [])
+            del self._file_hashes[file_path]
+            changed_files += 1
+
+        self._rebuild_indexes()
 
         self._loaded = True
         self._loaded_at = datetime.utcnow()
@@ -410,38 +427,67 @@ class SkillsLoaderService:
         logger.info(
             "Skills loaded",
             total_skills=len(self._skills),
+            changed_files=changed_files,
             categories=list(self._skills_by_category.keys()),
             by_level={k: len(v) for k, v in self._skills_by_level.items()}
         )
 
         return len(self._skills)
 
-    async def _load_from_directory(self, directory: str):
-        """Load skills from all MD files in a directory"""
+    async def _load_from_directory(self, directory: str, seen_files: set) -> int:
+        """Load skills from changed MD files in a directory; returns files re-parsed"""
         dir_path = Path(directory)
 
         if not dir_path.exists():
             logger.warning(f"Skills directory not found: {directory}")
-            return
+            return 0
 
-        # Find all MD files
-        md_files = list(dir_path.glob("*.md"))
+        changed = 0
 
-        for md_file in md_files:
+        # Find all MD files
+        for md_file in sorted(dir_path.glob("*.md")):
             # Skip README
             if md_file.name.lower() == "readme.md":
                 continue
 
-            skills = SkillMDParser.parse_file(str(md_file))
+            file_path = str(md_file)
+            seen_files.add(file_path)
+
+            digest = _file_digest(md_file)
+            if self._file_hashes.get(file_path) == digest:
+                continue
+
+            self._replace_file_skills(file_path, SkillMDParser.parse_file(file_path))
+            self._file_hashes[file_path] = digest
+            changed += 1
+
+        return changed
+
+    def _replace_file_skills(self, file_path: str, skills: List[SkillDefinition]):
+        """Swap the skills parsed from one file, keeping the catalog in sync"""
+        new_ids = {skill.id for skill in skills}
+
+        for skill_id in self._skills_by_file.pop(file_path, []):
+            existing = self._skills.get(skill_id)
+            if skill_id in new_ids or existing is None or existing.source_file != file_path:
+                continue
+            del self._skills[skill_id]
+            self.catalog.remove("skill", skill_id)
 
-            for skill in skills:
-                self._register_skill(skill)
+        for skill in skills:
+            self._skills[skill.id] = skill
+        self.catalog.upsert_many(_skill_entry(skill) for skill in skills)
+        self._skills_by_file[file_path] = [skill.id for skill in skills]
 
-    def _register_skill(self, skill: SkillDefinition):
-        """Register a skill in the registry"""
-        # Add to main registry
-        self._skills[skill.id] = skill
+    def _rebuild_indexes(self):
+        """Rebuild category and level lookups from the registry"""
+        self._skills_by_category.clear()
+        self._skills_by_level = {i: [] for i in range(1, 6)}
+        for skill in self._skills.values():
+            self._index_skill(skill)
 
+    def _index_skill(self, skill: SkillDefinition):
+        """Add a skill to the category and level lookups"""
         # Index by category
         cat_key = skill.category.value if isinstance(skill.category, SkillCategory) else skill.category
         if cat_key not in self._skills_by_category:
@@ -480,47 +526,32 @@ class SkillsLoaderService:
         query: str,
         category: Optional[str] = None,
         level: Optional[int] = None,
-        complexity: Optional[str] = None
+        complexity: Optional[str] = None,
+        limit: Optional[int] = None
     ) -> List[SkillDefinition]:
         """
         Search for skills matching criteria.
 
         Args:
-            query: Search query (matches name or description)
+            query: Search query (BM25-ranked over name and description)
             category: Filter by category
             level: Filter by applicable agent level
             complexity: Filter by complexity
+            limit: Maximum number of results (None for all matches)
 
         Returns:
-            List of matching skills
+            List of matching skills, best match first
         """
-        results = []
-        query_lower = query.lower()
-
-        for skill in self._skills.values():
-            # Text search
-            if query_lower not in skill.name.lower() and query_lower not in skill.description.lower():
-                continue
-
-            # Category filter
-            if category:
-                cat_value = skill.category.value if isinstance(skill.category, SkillCategory) else skill.category
-                if cat_value != category:
-                    continue
-
-            # Level filter
-            if level and level not in skill.applicable_levels:
-                continue
-
-            # Complexity filter
-            if complexity:
-                comp_value = skill.complexity.value if isinstance(skill.complexity, SkillComplexity) else skill.complexity
-                if comp_value != complexity:
-                    continue
-
-            results.append(skill)
-
-        return results
+        hits = self.catalog.search(
+            query,
+            kind="skill",
+            filters={"category": category, "level": level, "complexity": complexity},
+            limit=limit,
+        )
+        return [
+            self._skills[hit.entry.id] for hit in hits
+            if hit.entry.id in self._skills
+        ]
 
     # ========================================================================
     # LangGraph Integration
@@ -677,6 +708,32 @@ class SkillsLoaderService:
         }
 
 
+# ============================================================================
+# Catalog Helpers
+# ============================================================================
+
+def _skill_entry(skill: SkillDefinition) -> CatalogEntry:
+    """Build the capability catalog entry for a skill"""
+    return CatalogEntry(
+        kind="skill",
+        id=skill.id,
+        name=skill.name,
+        description=skill.description,
+        facets={
+            "category": skill.category,
+            "complexity": skill.complexity,
+            "level": skill.applicable_levels,
+            "skill_type": skill.skill_type,
+        },
+        payload=skill,
+    )
+
+
+def _file_digest(file_path: Path) -> str:
+    """Content hash of a skill MD file"""
+    return hashlib.sha256(file_path.read_bytes()).hexdigest()
+
+
 # ============================================================================
 # Skill Execution Helpers
 # ============================================================================
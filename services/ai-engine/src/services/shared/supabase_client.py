@@ -17,6 +17,7 @@ import structlog
 from datetime import datetime, timezone
 
 from core.config import get_settings
+from core.request_memo import amemoized
 
 logger = structlog.get_logger()
 
@@ -283,6 +284,10 @@ class SupabaseClient:
         Returns:
             Agent configuration dictionary or None if not found
         """
+        # Fetched once per request; later lookups see the same snapshot
+        return await amemoized("agent", agent_id, lambda: self._fetch_agent(agent_id))
+
+    async def _fetch_agent(self, agent_id: str) -> Optional[Dict[str, Any]]:
         try:
             # First, try to determine if this looks like a UUID
             import re
@@ -0,0 +1,26 @@
+"""
+Supabase Utilities - Dependency-Free Helpers for Supabase Query Builders
+
+Kept free of supabase-py and service imports so telemetry sinks, trackers and
+managers can share them without importing each other.
+"""
+
+import asyncio
+import inspect
+from typing import Any
+
+
+async def execute_query(builder) -> Any:
+    """
+    Run a Supabase query builder without blocking the event loop.
+
+    supabase-py's sync client does blocking HTTP in ``execute()``, so it runs
+    in a worker thread; an async client's awaitable is awaited directly.
+    """
+    execute = builder.execute
+    if inspect.iscoroutinefunction(execute):
+        return await execute()
+    result = await asyncio.to_thread(execute)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
@@ -10,6 +10,8 @@ import structlog
 from uuid import UUID
 
 from services.supabase_client import SupabaseClient
+from services.shared.capability_catalog import CapabilityCatalog, CatalogEntry, get_capability_catalog
+from services.shared.tool_telemetry_sink import ToolExecutionRecord, ToolTelemetrySink
 from core.config import get_settings
 
 logger = structlog.get_logger()
@@ -23,14 +25,22 @@ class ToolRegistryService:
     Features:
     - Get tools from database
     - Link tools to agents
-    - Log tool executions
+    - Log tool executions (batched via ToolTelemetrySink when attached)
     - Query tool analytics
+    - Ranked tool search via the shared CapabilityCatalog
     - LangGraph integration
     """
     
-    def __init__(self, supabase_client: SupabaseClient):
+    def __init__(
+        self,
+        supabase_client: SupabaseClient,
+        catalog: Optional[CapabilityCatalog] = None,
+        telemetry_sink: Optional[ToolTelemetrySink] = None
+    ):
         self.supabase = supabase_client
         self._tool_cache: Dict[str, Dict[str, Any]] = {}
+        self.catalog = catalog if catalog is not None else get_capability_catalog()
+        self.telemetry_sink = telemetry_sink
         
     async def get_tool_by_code(self, tool_code: str) -> Optional[Dict[str, Any]]:
         """
@@ -50,33 +60,9 @@ class ToolRegistryService:
             response = await self.supabase.table("dh_tool").select("*").eq("code", tool_code).eq("is_active", True).execute()
             
             if response.data and len(response.data) > 0:
-                tool = response.data[0]
-                # Map dh_tool columns to expected format
-                mapped_tool = {
-                    "tool_id": tool["id"],
-                    "tool_code": tool["code"],
-                    "unique_id": tool["unique_id"],
-                    "tool_name": tool["name"],
-                    "tool_description": tool.get("tool_description", ""),
-                    "category": tool.get("category"),
-                    "tool_type": tool.get("tool_type", "software_reference"),
-                    "implementation_type": tool.get("implementation_type"),
-                    "implementation_path": tool.get("implementation_path"),
-                    "function_name": tool.get("function_name"),
-                    "input_schema": tool.get("input_schema"),
-                    "output_schema": tool.get("output_schema"),
-                    "langgraph_compatible": tool.get("langgraph_compatible", False),
-                    "langgraph_node_name": tool.get("langgraph_node_name"),
-                    "is_async": tool.get("is_async", False),
-                    "max_execution_time_seconds": tool.get("max_execution_time_seconds", 30),
-                    "retry_config": tool.get("retry_config"),
-                    "rate_limit_per_minute": tool.get("rate_limit_per_minute"),
-                    "cost_per_execution": tool.get("cost_per_execution", 0),
-                    "required_env_vars": tool.get("required_env_vars", []),
-                    "is_active": tool.get("is_active", True),
-                    "status": "active" if tool.get("is_active") else "inactive",
-                }
+                mapped_tool = _map_tool_row(response.data[0])
                 self._tool_cache[tool_code] = mapped_tool
+                self.catalog.upsert(_tool_entry(mapped_tool))
                 return mapped_tool
             
             logger.warning("Tool not found", tool_code=tool_code)
@@ -86,6 +72,60 @@ class ToolRegistryService:
             logger.error("Failed to fetch tool", tool_code=tool_code, error=str(e))
             return None
     
+    async def load_tool_catalog(self) -> int:
+        """
+        Load all active tools in one query and index them for search.
+        
+        Also warms the code lookup cache used by get_tool_by_code.
+        
+        Returns:
+            Number of active tools indexed
+        """
+        try:
+            # supabase-py's execute() is blocking HTTP: keep it off the event loop
+            response = await asyncio.to_thread(
+                lambda: self.supabase.table("dh_tool").select("*").eq("is_active", True).execute()
+            )
+        except Exception as e:
+            logger.error("Failed to load tool catalog", error=str(e))
+            return 0
+        
+        tools = [_map_tool_row(row) for row in (response.data or [])]
+        for tool in tools:
+            self._tool_cache[tool["tool_code"]] = tool
+        
+        stats = self.catalog.sync_kind("tool", [_tool_entry(tool) for tool in tools])
+        logger.info("✅ Tool catalog loaded", tools_count=len(tools), **stats)
+        
+        return len(tools)
+    
+    def search_tools(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        tool_type: Optional[str] = None,
+        limit: Optional[int] = 20
+    ) -> List[Dict[str, Any]]:
+        """
+        Ranked search over indexed tools (see load_tool_catalog).
+        
+        Args:
+            query: Free-text query over tool name, code and description
+            category: Optional category filter
+            tool_type: Optional tool type filter
+            limit: Maximum number of results
+            
+        Returns:
+            Tool configurations, best match first
+        """
+        hits = self.catalog.search(
+            query,
+            kind="tool",
+            filters={"category": category, "tool_type": tool_type},
+            limit=limit,
+        )
+        return [hit.entry.payload for hit in hits]
+    
     async def get_agent_tools(
         self,
         agent_id: str,
@@ -200,6 +240,9 @@ class ToolRegistryService:
         """
         Log a tool execution to the database.
         
+        With a telemetry sink attached the record is queued (no round trip)
+        and flushed in a background batch; the returned ID is pre-assigned.
+        
         Args:
             tool_code: Tool identifier
             agent_id: Agent that used the tool
@@ -216,6 +259,23 @@ class ToolRegistryService:
         Returns:
             Execution ID or None if failed
         """
+        if self.telemetry_sink is not None:
+            record = ToolExecutionRecord(
+                tool_code=tool_code,
+                agent_id=agent_id,
+                tenant_id=tenant_id,
+                input_params=input_params,
+                output_result=output_result,
+                error_message=error_message,
+                status=status,
+                execution_time_ms=execution_time_ms,
+                session_id=session_id,
+                workflow_run_id=workflow_run_id,
+                node_name=node_name,
+            )
+            self.telemetry_sink.enqueue(record)
+            return record.execution_id
+        
         try:
             # Use the database function for atomic logging
             response = await self.supabase.rpc(
@@ -372,9 +432,54 @@ class ToolRegistryService:
     def clear_cache(self):
         """Clear the tool cache"""
         self._tool_cache.clear()
+        self.catalog.clear(kind="tool")
         logger.info("Tool cache cleared")
 
 
+def _map_tool_row(tool: Dict[str, Any]) -> Dict[str, Any]:
+    """Map dh_tool columns to the expected tool configuration format"""
+    return {
+        "tool_id": tool["id"],
+        "tool_code": tool["code"],
+        "unique_id": tool["unique_id"],
+        "tool_name": tool["name"],
+        "tool_description": tool.get("tool_description", ""),
+        "category": tool.get("category"),
+        "tool_type": tool.get("tool_type", "software_reference"),
+        "implementation_type": tool.get("implementation_type"),
+        "implementation_path": tool.get("implementation_path"),
+        "function_name": tool.get("function_name"),
+        "input_schema": tool.get("input_schema"),
+        "output_schema": tool.get("output_schema"),
+        "langgraph_compatible": tool.get("langgraph_compatible", False),
+        "langgraph_node_name": tool.get("langgraph_node_name"),
+        "is_async": tool.get("is_async", False),
+        "max_execution_time_seconds": tool.get("max_execution_time_seconds", 30),
+        "retry_config": tool.get("retry_config"),
+        "rate_limit_per_minute": tool.get("rate_limit_per_minute"),
+        "cost_per_execution": tool.get("cost_per_execution", 0),
+        "required_env_vars": tool.get("required_env_vars", []),
+        "is_active": tool.get("is_active", True),
+        "status": "active" if tool.get("is_active") else "inactive",
+    }
+
+
+def _tool_entry(tool: Dict[str, Any]) -> CatalogEntry:
+    """Build the capability catalog entry for a tool configuration"""
+    return CatalogEntry(
+        kind="tool",
+        id=tool["tool_code"],
+        name=tool.get("tool_name") or tool["tool_code"],
+        description=tool.get("tool_description") or "",
+        facets={
+            "category": tool.get("category"),
+            "tool_type": tool.get("tool_type"),
+            "status": tool.get("status"),
+        },
+        payload=tool,
+    )
+
+
 # Global instance
 _tool_registry: Optional[ToolRegistryService] = None
 
@@ -384,19 +489,26 @@ def get_tool_registry() -> Optional[ToolRegistryService]:
     return _tool_registry
 
 
-async def initialize_tool_registry(supabase_client: SupabaseClient) -> ToolRegistryService:
+async def initialize_tool_registry(
+    supabase_client: SupabaseClient,
+    telemetry_sink: Optional[ToolTelemetrySink] = None
+) -> ToolRegistryService:
     """
     Initialize global tool registry service.
     
     Args:
         supabase_client: Initialized Supabase client
+        telemetry_sink: Optional batching sink for execution logging
         
     Returns:
         Tool registry service
     """
     global _tool_registry
     
-    _tool_registry = ToolRegistryService(supabase_client)
+    _tool_registry = ToolRegistryService(supabase_client, telemetry_sink=telemetry_sink)
+    
+    # Index every active tool up front so search_tools sees the whole catalog
+    await _tool_registry.load_tool_catalog()
     
     logger.info("✅ Tool registry service initialized")
     
@@ -0,0 +1,335 @@
+"""
+Tool Telemetry Sink - Batched, Off-Hot-Path Tool Execution Logging
+
+Replaces one ``log_tool_execution`` RPC per tool call with an in-memory ring
+buffer that a background task drains in batched inserts.
+
+Key Features:
+- Bounded ring buffer: enqueue never awaits; under backpressure the oldest
+  record is overwritten and counted as dropped
+- Batched flush via the ``log_tool_executions_batch`` RPC (one round trip per
+  ``batch_size`` records or ``flush_interval_seconds``), run off the event
+  loop; rows carry client-assigned ids so a re-sent batch is idempotent
+- Oversized input/output payloads are replaced by a truncated preview plus a
+  SHA-256 content address
+- Graceful shutdown drains everything still queued (see api/lifespan.py)
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional
+from uuid import uuid4
+
+import structlog
+
+from services.shared.supabase_utils import execute_query
+
+logger = structlog.get_logger()
+
+
+# Defaults (override via constructor)
+DEFAULT_CAPACITY = 10_000
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_FLUSH_INTERVAL_SECONDS = 1.0
+DEFAULT_MAX_PAYLOAD_BYTES = 8_192
+PAYLOAD_PREVIEW_CHARS = 512
+MAX_FLUSH_ATTEMPTS = 3
+
+BATCH_RPC_NAME = "log_tool_executions_batch"
+
+
+@dataclass
+class ToolExecutionRecord:
+    """A single tool execution awaiting persistence"""
+    tool_code: str
+    agent_id: str
+    tenant_id: str
+    input_params: Any
+    output_result: Any = None
+    error_message: Optional[str] = None
+    status: str = "success"
+    execution_time_ms: Optional[int] = None
+    session_id: Optional[str] = None
+    workflow_run_id: Optional[str] = None
+    node_name: Optional[str] = None
+    execution_id: str = field(default_factory=lambda: str(uuid4()))
+    recorded_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    attempts: int = 0
+
+    def to_row(self, max_payload_bytes: int) -> Dict[str, Any]:
+        """Serialize for the batch RPC, compacting oversized payloads"""
+        return {
+            "p_execution_id": self.execution_id,
+            "p_tool_code": self.tool_code,
+            "p_agent_id": self.agent_id,
+            "p_tenant_id": self.tenant_id,
+            "p_input_params": compact_payload(self.input_params, max_payload_bytes),
+            "p_output_result": compact_payload(self.output_result, max_payload_bytes),
+            "p_error_message": self.error_message,
+            "p_status": self.status,
+            "p_execution_time_ms": self.execution_time_ms,
+            "p_session_id": self.session_id,
+            "p_workflow_run_id": self.workflow_run_id,
+            "p_node_name": self.node_name,
+            "p_recorded_at": self.recorded_at.isoformat(),
+        }
+
+
+def compact_payload(payload: Any, max_bytes: int) -> Any:
+    """
+    Return ``payload`` unchanged if it serializes within ``max_bytes``,
+    otherwise a truncated preview keyed by its SHA-256 digest.
+    """
+    if payload is None:
+        return None
+
+    serialized = json.dumps(payload, default=str, sort_keys=True)
+    size = len(serialized.encode("utf-8"))
+    if size <= max_bytes:
+        return payload
+
+    return {
+        "_truncated": True,
+        "_sha256": hashlib.sha256(serialized.encode("utf-8")).hexdigest(),
+        "_bytes": size,
+        "preview": serialized[:PAYLOAD_PREVIEW_CHARS],
+    }
+
+
+class ToolTelemetrySink:
+    """
+    Bounded, batching sink for tool execution telemetry.
+
+    ``enqueue`` is synchronous and O(1) so it can sit on the tool-call hot
+    path; persistence happens in a background flush loop.
+    """
+
+    def __init__(
+        self,
+        supabase_client,
+        capacity: int = DEFAULT_CAPACITY,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval_seconds: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+        max_payload_bytes: int = DEFAULT_MAX_PAYLOAD_BYTES,
+    ):
+        """
+        Initialize sink.
+
+        Args:
+            supabase_client: Client exposing ``rpc(name, params).execute()``
+            capacity: Ring buffer size; oldest records are dropped beyond this
+            batch_size: Maximum records per batched insert
+            flush_interval_seconds: Maximum time a record waits before flush
+            max_payload_bytes: Input/output payloads above this are compacted
+        """
+        self.supabase = supabase_client
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_payload_bytes = max_payload_bytes
+
+        self._buffer: Deque[ToolExecutionRecord] = deque(maxlen=capacity)
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+        self.metrics = {
+            "enqueued": 0,
+            "flushed": 0,
+            "dropped": 0,
+            "batches": 0,
+            "flush_failures": 0,
+        }
+
+    # ========================================================================
+    # Hot Path
+    # ========================================================================
+
+    def enqueue(self, record: ToolExecutionRecord) -> bool:
+        """
+        Queue a record without blocking.
+
+        Returns:
+            False if the sink is closed or the buffer overwrote an older record
+        """
+        if self._closed:
+            self.metrics["dropped"] += 1
+            return False
+
+        overflow = len(self._buffer) >= self.capacity
+        if overflow:
+            self.metrics["dropped"] += 1
+
+        self._buffer.append(record)
+        self.metrics["enqueued"] += 1
+
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+        return not overflow
+
+    # ========================================================================
+    # Lifecycle
+    # ========================================================================
+
+    async def start(self):
+        """Start the background flush loop"""
+        if self._task is None or self._task.done():
+            self._closed = False
+            self._task = asyncio.create_task(self._run())
+            logger.info(
+                "tool_telemetry_sink_started",
+                capacity=self.capacity,
+                batch_size=self.batch_size,
+                flush_interval_seconds=self.flush_interval_seconds,
+            )
+
+    async def shutdown(self, timeout: float = 10.0):
+        """Stop accepting records and flush everything still queued"""
+        self._closed = True
+        self._wakeup.set()
+
+        if self._task is not None:
+            try:
+                await asyncio.wait_for(self._task, timeout=timeout)
+            except asyncio.TimeoutError:
+                # wait_for cancelled the loop; an in-flight batch is requeued
+                pass
+            self._task = None
+
+        try:
+            await asyncio.wait_for(self._drain(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("tool_telemetry_sink_shutdown_timeout", pending=len(self._buffer))
+
+        logger.info("tool_telemetry_sink_stopped", **self.get_statistics())
+
+    async def _run(self):
+        while not self._closed:
+            if len(self._buffer) < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+            self._wakeup.clear()
+            if self._closed:
+                break
+
+            if await self.flush() == 0 and self._buffer:
+                # Flush failed; back off instead of spinning on a full buffer
+                await asyncio.sleep(self.flush_interval_seconds)
+
+    async def _drain(self):
+        # Terminates: failed records are dropped after MAX_FLUSH_ATTEMPTS
+        while self._buffer:
+            await self.flush()
+
+    # ========================================================================
+    # Flushing
+    # ========================================================================
+
+    async def flush(self) -> int:
+        """
+        Write up to one batch of queued records.
+
+        Returns:
+            Number of records persisted
+        """
+        async with self._flush_lock:
+            batch: List[ToolExecutionRecord] = []
+            while self._buffer and len(batch) < self.batch_size:
+                batch.append(self._buffer.popleft())
+            if not batch:
+                return 0
+
+            rows = [record.to_row(self.max_payload_bytes) for record in batch]
+            start = time.perf_counter()
+            try:
+                await execute_query(self.supabase.rpc(BATCH_RPC_NAME, {"p_records": rows}))
+            except asyncio.CancelledError:
+                # Outcome unknown; keep the records rather than lose them
+                # (the RPC skips execution ids it has already written)
+                self._restore(batch)
+                raise
+            except Exception as e:
+                self.metrics["flush_failures"] += 1
+                self._requeue(batch)
+                logger.warning(
+                    "tool_telemetry_flush_failed",
+                    batch_size=len(batch),
+                    error=str(e),
+                )
+                return 0
+
+            self.metrics["flushed"] += len(batch)
+            self.metrics["batches"] += 1
+            logger.debug(
+                "tool_telemetry_flushed",
+                batch_size=len(batch),
+                duration_ms=int((time.perf_counter() - start) * 1000),
+            )
+            return len(batch)
+
+    def _requeue(self, batch: List[ToolExecutionRecord]):
+        """Put a failed batch back at the head of the queue, oldest first"""
+        for record in reversed(batch):
+            record.attempts += 1
+            if record.attempts >= MAX_FLUSH_ATTEMPTS or len(self._buffer) >= self.capacity:
+                self.metrics["dropped"] += 1
+                continue
+            self._buffer.appendleft(record)
+
+    def _restore(self, batch: List[ToolExecutionRecord]):
+        """Put an interrupted batch back at the head, dropping its oldest on overflow"""
+        room = self.capacity - len(self._buffer)
+        overflow = max(0, len(batch) - room)
+        if overflow:
+            self.metrics["dropped"] += overflow
+        self._buffer.extendleft(reversed(batch[overflow:]))
+
+    # ========================================================================
+    # Introspection
+    # ========================================================================
+
+    @property
+    def pending(self) -> int:
+        """Records queued but not yet flushed"""
+        return len(self._buffer)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get sink statistics"""
+        return {**self.metrics, "pending": len(self._buffer), "capacity": self.capacity}
+
+
+# Global instance
+_tool_telemetry_sink: Optional[ToolTelemetrySink] = None
+
+
+def get_tool_telemetry_sink() -> Optional[ToolTelemetrySink]:
+    """Get global tool telemetry sink instance"""
+    return _tool_telemetry_sink
+
+
+async def initialize_tool_telemetry_sink(supabase_client, **kwargs) -> ToolTelemetrySink:
+    """
+    Initialize and start the global tool telemetry sink.
+
+    Args:
+        supabase_client: Initialized Supabase client
+        **kwargs: ToolTelemetrySink options
+
+    Returns:
+        Running telemetry sink
+    """
+    global _tool_telemetry_sink
+
+    _tool_telemetry_sink = ToolTelemetrySink(supabase_client, **kwargs)
+    await _tool_telemetry_sink.start()
+
+    return _tool_telemetry_sink
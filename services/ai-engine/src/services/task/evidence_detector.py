@@ -31,6 +31,7 @@ from utils.optional_imports import (
     get_device,
     TRANSFORMERS_AVAILABLE,
 )
+from core.request_memo import amemoized
 
 # ML/NLP imports (with graceful degradation)
 if TRANSFORMERS_AVAILABLE:
@@ -65,6 +66,27 @@ class EvidenceDomain(str, Enum):
     CLINICAL = "clinical"
 
 
+# Domain indicators for detect_domain (substring matches on lowercased text)
+DOMAIN_INDICATOR_KEYWORDS: Dict[EvidenceDomain, List[str]] = {
+    EvidenceDomain.MEDICAL: [
+        "patient", "clinical", "disease", "treatment", "drug",
+        "diagnosis", "therapy", "medical", "healthcare"
+    ],
+    EvidenceDomain.DIGITAL_HEALTH: [
+        "mhealth", "telehealth", "wearable", "app", "digital",
+        "remote monitoring", "telemedicine", "ai", "machine learning"
+    ],
+    EvidenceDomain.REGULATORY: [
+        "fda", "ema", "mhra", "tga", "approval", "clearance",
+        "regulatory", "submission", "guidance", "510(k)", "510k"
+    ],
+    EvidenceDomain.COMPLIANCE: [
+        "hipaa", "gdpr", "compliance", "privacy", "security",
+        "audit", "certification", "iso"
+    ],
+}
+
+
 # ============================================================================
 # EVIDENCE TYPES
 # ============================================================================
@@ -498,40 +520,11 @@ class EvidenceDetector:
         Returns:
             List of applicable domains
         """
-        domains = []
-        text_lower = text.lower()
-
-        # Medical domain indicators
-        medical_keywords = [
-            "patient", "clinical", "disease", "treatment", "drug",
-            "diagnosis", "therapy", "medical", "healthcare"
-        ]
-        if any(kw in text_lower for kw in medical_keywords):
-            domains.append(EvidenceDomain.MEDICAL)
+        from services.consultation.query_understanding import understand_query
 
-        # Digital Health indicators
-        digital_health_keywords = [
-            "mhealth", "telehealth", "wearable", "app", "digital",
-            "remote monitoring", "telemedicine", "ai", "machine learning"
-        ]
-        if any(kw in text_lower for kw in digital_health_keywords):
-            domains.append(EvidenceDomain.DIGITAL_HEALTH)
-
-        # Regulatory indicators
-        regulatory_keywords = [
-            "fda", "ema", "mhra", "tga", "approval", "clearance",
-            "regulatory", "submission", "guidance", "510(k)", "510k"
-        ]
-        if any(kw in text_lower for kw in regulatory_keywords):
-            domains.append(EvidenceDomain.REGULATORY)
-
-        # Compliance indicators
-        compliance_keywords = [
-            "hipaa", "gdpr", "compliance", "privacy", "security",
-            "audit", "certification", "iso"
-        ]
-        if any(kw in text_lower for kw in compliance_keywords):
-            domains.append(EvidenceDomain.COMPLIANCE)
+        # Keyword hits are shared with the other query routers for this text
+        hits = understand_query(text).keyword_counts("evidence_domain", DOMAIN_INDICATOR_KEYWORDS)
+        domains = [domain for domain, count in hits.items() if count]
 
         # Default to medical if no domain detected
         if not domains:
@@ -560,6 +553,21 @@ class EvidenceDetector:
         Returns:
             List of entities (MedicalEntity or Entity)
         """
+        # The model pass is shared by every detector call of the request
+        entities = list(await amemoized(
+            "entities",
+            ("evidence_ner", text, min_confidence),
+            lambda: self._extract_model_entities(text, min_confidence)
+        ))
+
+        # Domain-specific extraction
+        if domain:
+            entities.extend(await self._extract_domain_entities(text, domain))
+
+        return entities
+
+    async def _extract_model_entities(self, text: str, min_confidence: float) -> List[MedicalEntity]:
+        """Entities from the BioBERT and spaCy pipelines, whichever are loaded"""
         entities = []
 
         # Use BioBERT NER if available
@@ -599,10 +607,6 @@ class EvidenceDetector:
             except Exception as e:
                 logger.warning(f"spaCy NER failed: {e}")
 
-        # Domain-specific extraction
-        if domain:
-            entities.extend(await self._extract_domain_entities(text, domain))
-
         return entities
 
     async def _extract_domain_entities(self, text: str, domain: EvidenceDomain) -> List[Entity]:
@@ -53,6 +53,9 @@ def __getattr__(name: str):
     elif name == "EnhancedHITLService":
         from .hitl_websocket_service import EnhancedHITLService
         return EnhancedHITLService
+    elif name == "HITLSuspensionCoordinator":
+        from .hitl_suspension import HITLSuspensionCoordinator
+        return HITLSuspensionCoordinator
     elif name == "ArtifactGenerator":
         from .artifact_generator import ArtifactGenerator
         return ArtifactGenerator
@@ -81,6 +84,7 @@ __all__ = [
     "HITLService",
     "HITLConnectionManager",
     "EnhancedHITLService",
+    "HITLSuspensionCoordinator",
     "ArtifactGenerator",
     "RunnerRegistry",
     "DeepAgentsTools",
@@ -0,0 +1,730 @@
+"""
+Durable HITL Suspension - Restart-Safe Approvals
+
+Replaces "park a coroutine on a future for an hour" with suspension: the
+pending approval is persisted, the LangGraph node interrupts (its state is
+already in the checkpointer), and the worker is released. When a decision
+arrives on any replica, the thread is resumed from the checkpointer with
+``Command(resume=decision)``.
+
+Key Features:
+- ApprovalStore: hitl_approvals rows (Supabase) or process-local (dev/tests)
+- Idempotent suspend keyed by (thread_id, checkpoint_id), so the node can
+  call it again when LangGraph re-runs it on resume
+- Compare-and-set decisions: the first decision wins, across replicas
+- Resume claims with a lease: exactly one replica resumes a thread; a crashed
+  resume is retried after the lease expires
+- A resume only answers the interrupt raised for its own approval, and the
+  approval is marked resumed by approval id, not by lease owner, so a run
+  outliving its lease can neither be resumed twice nor leave the approval
+  open to answer a later checkpoint
+- Persistent timeouts: expires_at is stored with the approval and enforced by
+  a sweeper on every replica, so restarts do not drop timers
+- Startup recovery: decided-but-not-resumed approvals are picked up by the
+  first sweep
+
+Usage:
+    coordinator.register_graph("mode3", langgraph_resumer(compiled_graph))
+
+    # Inside a graph node
+    approval = await coordinator.suspend(..., graph="mode3", resume_config=config)
+    decision = interrupt(approval.interrupt_payload())
+"""
+
+import asyncio
+import os
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+import structlog
+
+from .hitl_service import ApprovalStatus, HITLApprovalResponse
+
+logger = structlog.get_logger()
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+APPROVALS_TABLE = "hitl_approvals"
+RESUME_LEASE_SECONDS = int(os.getenv("HITL_RESUME_LEASE_SECONDS", "300"))
+SWEEP_INTERVAL_SECONDS = float(os.getenv("HITL_SWEEP_INTERVAL_SECONDS", "30"))
+SWEEP_BATCH_SIZE = 100
+TIMEOUT_FEEDBACK = "Approval timed out"
+
+PENDING = "pending"
+EXPIRED = "expired"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _parse_ts(value: Any) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+
+
+def _format_ts(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+# ============================================================================
+# Model
+# ============================================================================
+
+@dataclass
+class SuspendedApproval:
+    """A persisted approval and where to resume once it is decided."""
+    approval_id: str
+    checkpoint_id: str
+    thread_id: str
+    tenant_id: str
+    checkpoint_type: str
+    request_data: Dict[str, Any]
+    graph: Optional[str] = None  # Registered resumer name; None = nothing to resume
+    resume_config: Dict[str, Any] = field(default_factory=dict)
+    user_id: Optional[str] = None
+    status: str = PENDING
+    response_data: Optional[Dict[str, Any]] = None
+    created_at: datetime = field(default_factory=_utcnow)
+    expires_at: Optional[datetime] = None
+    responded_at: Optional[datetime] = None
+    resume_claimed_by: Optional[str] = None
+    resume_claimed_at: Optional[datetime] = None
+    resumed_at: Optional[datetime] = None
+
+    @property
+    def decided(self) -> bool:
+        return self.status != PENDING
+
+    def decision(self) -> Dict[str, Any]:
+        """Resume value handed to the interrupted node."""
+        response = self.response_data or {}
+        return {
+            "approval_id": self.approval_id,
+            "status": self.status,
+            "approved": self.status in (ApprovalStatus.APPROVED.value, ApprovalStatus.MODIFIED.value),
+            "feedback": response.get("user_feedback"),
+            "modifications": response.get("modifications"),
+        }
+
+    def to_response(self) -> HITLApprovalResponse:
+        response = self.response_data or {}
+        if self.status == PENDING:
+            status = ApprovalStatus.PENDING
+        elif self.status == EXPIRED:
+            status = ApprovalStatus.REJECTED
+        else:
+            status = ApprovalStatus(self.status)
+        return HITLApprovalResponse(
+            checkpoint_id=self.approval_id,
+            status=status,
+            user_feedback=response.get("user_feedback"),
+            modifications=response.get("modifications"),
+            approved_at=self.responded_at or _utcnow(),
+        )
+
+    def interrupt_payload(self) -> Dict[str, Any]:
+        return {
+            "approval_id": self.approval_id,
+            "checkpoint_type": self.checkpoint_type,
+            "expires_at": _format_ts(self.expires_at),
+            "options": ["approved", "rejected", "modified"],
+        }
+
+    def to_public(self) -> Dict[str, Any]:
+        """Shape used by the pending-approvals API and WebSocket."""
+        return {
+            "id": self.approval_id,
+            "checkpoint_id": self.checkpoint_id,
+            "thread_id": self.thread_id,
+            "checkpoint_type": self.checkpoint_type,
+            "request_data": self.request_data,
+            "created_at": _format_ts(self.created_at),
+            "expires_at": _format_ts(self.expires_at),
+        }
+
+    def to_row(self) -> Dict[str, Any]:
+        return {
+            "id": self.approval_id,
+            "checkpoint_id": self.checkpoint_id,
+            "thread_id": self.thread_id,
+            "tenant_id": self.tenant_id,
+            "user_id": self.user_id,
+            "checkpoint_type": self.checkpoint_type,
+            "request_data": self.request_data,
+            "status": self.status,
+            "response_data": self.response_data,
+            "created_at": _format_ts(self.created_at),
+            "expires_at": _format_ts(self.expires_at),
+            "responded_at": _format_ts(self.responded_at),
+            "resume_graph": self.graph,
+            "resume_config": self.resume_config,
+            "resume_claimed_by": self.resume_claimed_by,
+            "resume_claimed_at": _format_ts(self.resume_claimed_at),
+            "resumed_at": _format_ts(self.resumed_at),
+        }
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "SuspendedApproval":
+        return cls(
+            approval_id=str(row["id"]),
+            checkpoint_id=row["checkpoint_id"],
+            thread_id=row["thread_id"],
+            tenant_id=str(row["tenant_id"]),
+            checkpoint_type=row["checkpoint_type"],
+            request_data=row.get("request_data") or {},
+            graph=row.get("resume_graph"),
+            resume_config=row.get("resume_config") or {},
+            user_id=row.get("user_id"),
+            status=row.get("status", PENDING),
+            response_data=row.get("response_data"),
+            created_at=_parse_ts(row.get("created_at")) or _utcnow(),
+            expires_at=_parse_ts(row.get("expires_at")),
+            responded_at=_parse_ts(row.get("responded_at")),
+            resume_claimed_by=row.get("resume_claimed_by"),
+            resume_claimed_at=_parse_ts(row.get("resume_claimed_at")),
+            resumed_at=_parse_ts(row.get("resumed_at")),
+        )
+
+
+# ============================================================================
+# Stores
+# ============================================================================
+
+class ApprovalStore(ABC):
+    """Persistence for suspended approvals. Every transition is compare-and-set."""
+
+    @abstractmethod
+    async def create(self, approval: SuspendedApproval) -> SuspendedApproval:
+        """Insert, or return the existing approval for (thread_id, checkpoint_id)."""
+
+    @abstractmethod
+    async def get(self, approval_id: str) -> Optional[SuspendedApproval]:
+        ...
+
+    @abstractmethod
+    async def list_pending(self, tenant_id: str, limit: int = 50) -> List[SuspendedApproval]:
+        ...
+
+    @abstractmethod
+    async def count_pending(self, tenant_id: str) -> int:
+        ...
+
+    @abstractmethod
+    async def decide(
+        self,
+        approval_id: str,
+        status: str,
+        response_data: Optional[Dict[str, Any]],
+        user_id: Optional[str],
+        now: datetime,
+    ) -> Optional[SuspendedApproval]:
+        """pending -> status; None when already decided or unknown."""
+
+    @abstractmethod
+    async def due_for_expiry(self, now: datetime, limit: int) -> List[SuspendedApproval]:
+        ...
+
+    @abstractmethod
+    async def awaiting_resume(self, limit: int) -> List[SuspendedApproval]:
+        """Decided approvals with a resume target that have not been resumed."""
+
+    @abstractmethod
+    async def claim_resume(
+        self, approval_id: str, owner: str, now: datetime, lease_seconds: float,
+    ) -> Optional[SuspendedApproval]:
+        """Take the resume lease unless resumed or leased by someone else."""
+
+    @abstractmethod
+    async def release_resume(self, approval_id: str, owner: str):
+        ...
+
+    @abstractmethod
+    async def complete_resume(self, approval_id: str, now: datetime):
+        """Mark resumed once, whoever holds the lease now."""
+
+
+class InMemoryApprovalStore(ApprovalStore):
+    """
+    Process-local store for development and tests.
+
+    Like MemorySaver, it does not survive a restart; production uses
+    SupabaseApprovalStore.
+    """
+
+    def __init__(self):
+        self._rows: Dict[str, SuspendedApproval] = {}
+
+    async def create(self, approval: SuspendedApproval) -> SuspendedApproval:
+        for existing in self._rows.values():
+            if existing.thread_id == approval.thread_id and existing.checkpoint_id == approval.checkpoint_id:
+                return existing
+        self._rows[approval.approval_id] = approval
+        return approval
+
+    async def get(self, approval_id: str) -> Optional[SuspendedApproval]:
+        return self._rows.get(approval_id)
+
+    async def list_pending(self, tenant_id: str, limit: int = 50) -> List[SuspendedApproval]:
+        pending = [a for a in self._rows.values() if a.tenant_id == tenant_id and a.status == PENDING]
+        return sorted(pending, key=lambda a: a.created_at)[:limit]
+
+    async def count_pending(self, tenant_id: str) -> int:
+        return sum(1 for a in self._rows.values() if a.tenant_id == tenant_id and a.status == PENDING)
+
+    async def decide(self, approval_id, status, response_data, user_id, now):
+        approval = self._rows.get(approval_id)
+        if approval is None or approval.status != PENDING:
+            return None
+        approval.status = status
+        approval.response_data = response_data
+        approval.responded_at = now
+        approval.user_id = user_id or approval.user_id
+        return approval
+
+    async def due_for_expiry(self, now, limit):
+        return [
+            a for a in self._rows.values()
+            if a.status == PENDING and a.expires_at is not None and a.expires_at <= now
+        ][:limit]
+
+    async def awaiting_resume(self, limit):
+        return [a for a in self._rows.values() if a.decided and a.graph and a.resumed_at is None][:limit]
+
+    async def claim_resume(self, approval_id, owner, now, lease_seconds):
+        approval = self._rows.get(approval_id)
+        if approval is None or not approval.decided or approval.resumed_at is not None:
+            return None
+        lease_expired = (
+            approval.resume_claimed_at is None
+            or approval.resume_claimed_at <= now - timedelta(seconds=lease_seconds)
+        )
+        if not lease_expired:
+            return None
+        approval.resume_claimed_by = owner
+        approval.resume_claimed_at = now
+        return approval
+
+    async def release_resume(self, approval_id, owner):
+        approval = self._rows.get(approval_id)
+        if approval is not None and approval.resume_claimed_by == owner:
+            approval.resume_claimed_by = None
+            approval.resume_claimed_at = None
+
+    async def complete_resume(self, approval_id, now):
+        approval = self._rows.get(approval_id)
+        if approval is not None and approval.resumed_at is None:
+            approval.resumed_at = now
+
+
+class SupabaseApprovalStore(ApprovalStore):
+    """
+    hitl_approvals table (see database/migrations/20261019_003_hitl_durable_suspension.sql).
+
+    The Supabase client is synchronous, so queries run in a worker thread.
+    Conditional updates carry their precondition as filters, which makes each
+    transition a single atomic UPDATE.
+    """
+
+    def __init__(self, supabase_client: Any, table: str = APPROVALS_TABLE):
+        """
+        Args:
+            supabase_client: Client exposing ``table(name)`` query builders
+            table: Approvals table name
+        """
+        self.supabase = supabase_client
+        self.table = table
+
+    async def _execute(self, build: Callable[[Any], Any]) -> List[Dict[str, Any]]:
+        response = await asyncio.to_thread(lambda: build(self.supabase.table(self.table)).execute())
+        return response.data or []
+
+    async def create(self, approval: SuspendedApproval) -> SuspendedApproval:
+        existing = await self._execute(
+            lambda t: t.select("*")
+            .eq("thread_id", approval.thread_id)
+            .eq("checkpoint_id", approval.checkpoint_id)
+            .order("created_at", desc=True)
+            .limit(1)
+        )
+        if existing:
+            return SuspendedApproval.from_row(existing[0])
+        rows = await self._execute(lambda t: t.insert(approval.to_row()))
+        return SuspendedApproval.from_row(rows[0]) if rows else approval
+
+    async def get(self, approval_id: str) -> Optional[SuspendedApproval]:
+        rows = await self._execute(lambda t: t.select("*").eq("id", approval_id).limit(1))
+        return SuspendedApproval.from_row(rows[0]) if rows else None
+
+    async def list_pending(self, tenant_id: str, limit: int = 50) -> List[SuspendedApproval]:
+        rows = await self._execute(
+            lambda t: t.select("*")
+            .eq("tenant_id", tenant_id)
+            .eq("status", PENDING)
+            .order("created_at")
+            .limit(limit)
+        )
+        return [SuspendedApproval.from_row(r) for r in rows]
+
+    async def count_pending(self, tenant_id: str) -> int:
+        response = await asyncio.to_thread(
+            lambda: self.supabase.table(self.table)
+            .select("id", count="exact")
+            .eq("tenant_id", tenant_id)
+            .eq("status", PENDING)
+            .execute()
+        )
+        return response.count or 0
+
+    async def decide(self, approval_id, status, response_data, user_id, now):
+        update = {"status": status, "response_data": response_data, "responded_at": _format_ts(now)}
+        if user_id:
+            update["user_id"] = user_id
+        rows = await self._execute(lambda t: t.update(update).eq("id", approval_id).eq("status", PENDING))
+        return SuspendedApproval.from_row(rows[0]) if rows else None
+
+    async def due_for_expiry(self, now, limit):
+        rows = await self._execute(
+            lambda t: t.select("*").eq("status", PENDING).lte("expires_at", _format_ts(now)).limit(limit)
+        )
+        return [SuspendedApproval.from_row(r) for r in rows]
+
+    async def awaiting_resume(self, limit):
+        rows = await self._execute(
+            lambda t: t.select("*")
+            .neq("status", PENDING)
+            .is_("resumed_at", "null")
+            .not_.is_("resume_graph", "null")
+            .order("responded_at")
+            .limit(limit)
+        )
+        return [SuspendedApproval.from_row(r) for r in rows]
+
+    async def claim_resume(self, approval_id, owner, now, lease_seconds):
+        stale = _format_ts(now - timedelta(seconds=lease_seconds))
+        rows = await self._execute(
+            lambda t: t.update({"resume_claimed_by": owner, "resume_claimed_at": _format_ts(now)})
+            .eq("id", approval_id)
+            .neq("status", PENDING)
+            .is_("resumed_at", "null")
+            .or_(f"resume_claimed_at.is.null,resume_claimed_at.lte.{stale}")
+        )
+        return SuspendedApproval.from_row(rows[0]) if rows else None
+
+    async def release_resume(self, approval_id, owner):
+        await self._execute(
+            lambda t: t.update({"resume_claimed_by": None, "resume_claimed_at": None})
+            .eq("id", approval_id)
+            .eq("resume_claimed_by", owner)
+        )
+
+    async def complete_resume(self, approval_id, now):
+        await self._execute(
+            lambda t: t.update({"resumed_at": _format_ts(now)})
+            .eq("id", approval_id)
+            .is_("resumed_at", "null")
+        )
+
+
+# ============================================================================
+# Resumers
+# ============================================================================
+
+Resumer = Callable[[SuspendedApproval], Awaitable[Any]]
+
+
+class ResumeNotReady(Exception):
+    """The thread's interrupt is not checkpointed yet; retry on a later sweep."""
+
+
+class ResumeSuperseded(Exception):
+    """The thread already moved past this approval's interrupt; nothing to resume."""
+
+
+def _interrupt_approval_ids(snapshot: Any) -> Set[str]:
+    ids = set()
+    for task in snapshot.tasks:
+        for pending in getattr(task, "interrupts", None) or ():
+            value = getattr(pending, "value", None)
+            if isinstance(value, dict) and value.get("approval_id"):
+                ids.add(str(value["approval_id"]))
+    return ids
+
+
+def langgraph_resumer(compiled_graph: Any) -> Resumer:
+    """Resume an interrupted LangGraph thread with the approval's decision."""
+    async def resume(approval: SuspendedApproval) -> Any:
+        from langgraph.types import Command
+
+        config = approval.resume_config or {"configurable": {"thread_id": approval.thread_id}}
+        snapshot = await compiled_graph.aget_state(config)
+        waiting_on = _interrupt_approval_ids(snapshot)
+        if approval.approval_id not in waiting_on:
+            # Suspended elsewhere (another checkpoint) or finished: this
+            # decision must never answer someone else's interrupt
+            if waiting_on or not snapshot.next:
+                raise ResumeSuperseded(approval.thread_id)
+            # A decision can race the checkpoint write of the interrupting node
+            raise ResumeNotReady(approval.thread_id)
+        return await compiled_graph.ainvoke(Command(resume=approval.decision()), config=config)
+
+    return resume
+
+
+# ============================================================================
+# Coordinator
+# ============================================================================
+
+class HITLSuspensionCoordinator:
+    """
+    Suspends approvals, records decisions and resumes threads.
+
+    Every replica runs one; they coordinate only through the store, so any
+    replica can decide, expire or resume any approval.
+    """
+
+    def __init__(
+        self,
+        store: ApprovalStore,
+        instance_id: Optional[str] = None,
+        resume_lease_seconds: float = RESUME_LEASE_SECONDS,
+        sweep_interval_seconds: float = SWEEP_INTERVAL_SECONDS,
+        clock: Callable[[], datetime] = _utcnow,
+    ):
+        """
+        Initialize coordinator.
+
+        Args:
+            store: Approval persistence
+            instance_id: Lease owner name (defaults to a random id per process)
+            resume_lease_seconds: How long a claimed resume blocks other replicas
+            sweep_interval_seconds: Expiry / recovery sweep period
+            clock: UTC clock (injectable for tests)
+        """
+        self.store = store
+        self.instance_id = instance_id or f"hitl-{uuid.uuid4().hex[:12]}"
+        self.resume_lease_seconds = resume_lease_seconds
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self.clock = clock
+
+        self._resumers: Dict[str, Resumer] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._sweeper: Optional[asyncio.Task] = None
+
+        self.metrics = {
+            "suspended": 0,
+            "decided": 0,
+            "expired": 0,
+            "resumed": 0,
+            "resume_failures": 0,
+            "resume_not_ready": 0,
+            "resume_superseded": 0,
+            "claims_lost": 0,
+        }
+
+    def register_graph(self, name: str, resumer: Resumer):
+        """Make this replica able to resume threads of graph ``name``."""
+        self._resumers[name] = resumer
+
+    # ========================================================================
+    # Suspend / Decide
+    # ========================================================================
+
+    async def suspend(
+        self,
+        checkpoint_type: str,
+        request_data: Dict[str, Any],
+        thread_id: str,
+        tenant_id: str,
+        checkpoint_id: str,
+        graph: Optional[str] = None,
+        resume_config: Optional[Dict[str, Any]] = None,
+        user_id: Optional[str] = None,
+        timeout_seconds: Optional[int] = None,
+    ) -> SuspendedApproval:
+        """
+        Persist a pending approval (idempotent per thread and checkpoint).
+
+        Returns:
+            The approval; already decided when the node is re-run on resume
+        """
+        now = self.clock()
+        approval = await self.store.create(SuspendedApproval(
+            approval_id=str(uuid.uuid4()),
+            checkpoint_id=checkpoint_id,
+            thread_id=thread_id,
+            tenant_id=tenant_id,
+            checkpoint_type=checkpoint_type,
+            request_data=request_data,
+            graph=graph,
+            resume_config=resume_config or {"configurable": {"thread_id": thread_id}},
+            user_id=user_id,
+            created_at=now,
+            expires_at=now + timedelta(seconds=timeout_seconds) if timeout_seconds else None,
+        ))
+        if not approval.decided:
+            self.metrics["suspended"] += 1
+            logger.info(
+                "hitl_approval_suspended",
+                approval_id=approval.approval_id,
+                thread_id=thread_id,
+                checkpoint_type=checkpoint_type,
+            )
+        return approval
+
+    async def decide(
+        self,
+        approval_id: str,
+        status: str,
+        user_feedback: Optional[str] = None,
+        modifications: Optional[Dict[str, Any]] = None,
+        user_id: Optional[str] = None,
+    ) -> Optional[SuspendedApproval]:
+        """
+        Record a decision and schedule the resume.
+
+        Returns:
+            The decided approval, or None if it was already decided / unknown
+        """
+        approval = await self.store.decide(
+            approval_id,
+            status,
+            {"user_feedback": user_feedback, "modifications": modifications},
+            user_id,
+            self.clock(),
+        )
+        if approval is None:
+            return None
+        self.metrics["expired" if status == EXPIRED else "decided"] += 1
+        self.schedule_resume(approval_id)
+        return approval
+
+    # ========================================================================
+    # Resume
+    # ========================================================================
+
+    def schedule_resume(self, approval_id: str):
+        """Resume in the background (decisions and pub/sub notifications)."""
+        task = asyncio.create_task(self.resume(approval_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def resume(self, approval_id: str) -> bool:
+        """
+        Resume the approval's thread if this replica can and wins the claim.
+
+        Returns:
+            True when the thread was resumed here
+        """
+        approval = await self.store.get(approval_id)
+        if approval is None or not approval.decided or approval.resumed_at is not None or not approval.graph:
+            return False
+        resumer = self._resumers.get(approval.graph)
+        if resumer is None:
+            return False  # Another replica serves this graph
+
+        claimed = await self.store.claim_resume(
+            approval_id, self.instance_id, self.clock(), self.resume_lease_seconds,
+        )
+        if claimed is None:
+            self.metrics["claims_lost"] += 1
+            return False
+
+        try:
+            await resumer(claimed)
+        except ResumeNotReady:
+            self.metrics["resume_not_ready"] += 1
+            await self.store.release_resume(approval_id, self.instance_id)
+            return False
+        except ResumeSuperseded:
+            # Resumed by a run that outlived its lease; close it out
+            self.metrics["resume_superseded"] += 1
+            await self.store.complete_resume(approval_id, self.clock())
+            logger.info("hitl_resume_superseded", approval_id=approval_id, thread_id=claimed.thread_id)
+            return False
+        except Exception as e:
+            self.metrics["resume_failures"] += 1
+            logger.error("hitl_resume_failed", approval_id=approval_id, error=str(e))
+            await self.store.release_resume(approval_id, self.instance_id)
+            return False
+
+        # Not filtered on the lease: the run may have outlived it
+        await self.store.complete_resume(approval_id, self.clock())
+        self.metrics["resumed"] += 1
+        logger.info(
+            "hitl_thread_resumed",
+            approval_id=approval_id,
+            thread_id=claimed.thread_id,
+            status=claimed.status,
+        )
+        return True
+
+    # ========================================================================
+    # Persistent Scheduler
+    # ========================================================================
+
+    async def sweep(self) -> Dict[str, int]:
+        """Expire overdue approvals and resume any decided-but-parked threads."""
+        expired = 0
+        for approval in await self.store.due_for_expiry(self.clock(), SWEEP_BATCH_SIZE):
+            decided = await self.store.decide(
+                approval.approval_id, EXPIRED, {"user_feedback": TIMEOUT_FEEDBACK}, None, self.clock(),
+            )
+            if decided is not None:
+                expired += 1
+                self.metrics["expired"] += 1
+                logger.warning("hitl_approval_timeout", approval_id=approval.approval_id)
+
+        resumed = 0
+        for approval in await self.store.awaiting_resume(SWEEP_BATCH_SIZE):
+            if await self.resume(approval.approval_id):
+                resumed += 1
+        return {"expired": expired, "resumed": resumed}
+
+    async def _sweep_loop(self):
+        while True:
+            try:
+                await self.sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("hitl_sweep_failed", error=str(e))
+            await asyncio.sleep(self.sweep_interval_seconds)
+
+    async def start(self):
+        """Start the sweeper; its first pass recovers work parked before a restart."""
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep_loop())
+
+    async def join(self):
+        """Wait for scheduled resumes to finish."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    async def stop(self, timeout: float = 10.0):
+        """Stop sweeping; unfinished resumes keep their lease and are retried elsewhere."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+        try:
+            await asyncio.wait_for(self.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            for task in list(self._tasks):
+                task.cancel()
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            **self.metrics,
+            "instance_id": self.instance_id,
+            "resumes_in_flight": len(self._tasks),
+            "graphs": sorted(self._resumers),
+        }
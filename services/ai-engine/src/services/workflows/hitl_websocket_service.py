@@ -6,14 +6,15 @@
 HITL WebSocket Service for Real-Time Approvals
 
 Provides real-time WebSocket communication for Human-in-the-Loop approvals.
-Integrates with the PostgreSQL checkpointer for persistence.
+Approvals are durable suspensions (see hitl_suspension.py): the mission is
+interrupted and checkpointed instead of holding a coroutine until a decision.
 
 Features:
 - WebSocket connection management per tenant/user
 - Real-time approval request broadcasting
-- Approval response handling
+- Approval response handling (first decision wins, on any replica)
 - Connection heartbeat and cleanup
-- Redis pub/sub for multi-instance support
+- Redis pub/sub for multi-instance support (requests and resume notifications)
 
 Phase 6 Implementation - Production Ready
 """
@@ -21,7 +22,7 @@ Phase 6 Implementation - Production Ready
 import os
 import json
 import asyncio
-from typing import Dict, Any, Optional, Set, Callable, Awaitable
+from typing import Dict, Any, Optional, Set
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
@@ -54,6 +55,12 @@ from .hitl_service import (
     CriticalDecisionApprovalRequest,
     ArtifactGenerationApprovalRequest,
 )
+from .hitl_suspension import (
+    ApprovalStore,
+    HITLSuspensionCoordinator,
+    InMemoryApprovalStore,
+    SupabaseApprovalStore,
+)
 
 logger = structlog.get_logger()
 
@@ -84,12 +91,12 @@ class HITLConnectionManager:
     - Automatic reconnection handling
     """
 
-    def __init__(self):
+    def __init__(self, suspensions: Optional[HITLSuspensionCoordinator] = None):
         # Connections indexed by tenant_id -> user_id -> connection
         self._connections: Dict[str, Dict[str, WebSocketConnection]] = {}
 
-        # Pending approvals waiting for response
-        self._pending_responses: Dict[str, asyncio.Future] = {}
+        # Durable approvals: decisions are recorded and resumed through it
+        self.suspensions = suspensions
 
         # Heartbeat interval (seconds)
         self.heartbeat_interval = 30
@@ -209,14 +216,16 @@ class HITLConnectionManager:
 
     async def _send_pending_approvals(self, connection: WebSocketConnection):
         """Send all pending approvals to newly connected user"""
+        if not self.suspensions:
+            return
+
         try:
-            checkpointer = await get_postgres_checkpointer()
-            pending = await checkpointer.get_pending_approvals(connection.tenant_id)
+            pending = await self.suspensions.store.list_pending(connection.tenant_id)
 
             if pending:
                 await connection.websocket.send_json({
                     "type": "pending_approvals",
-                    "approvals": pending
+                    "approvals": [approval.to_public() for approval in pending]
                 })
 
                 logger.debug(
@@ -300,44 +309,6 @@ class HITLConnectionManager:
         for user_id in disconnected:
             await self.disconnect(tenant_id, user_id)
 
-    async def wait_for_approval(
-        self,
-        approval_id: str,
-        timeout_seconds: int = 3600
-    ) -> Optional[HITLApprovalResponse]:
-        """
-        Wait for approval response.
-
-        Args:
-            approval_id: Approval request ID
-            timeout_seconds: Maximum wait time
-
-        Returns:
-            Approval response or None on timeout
-        """
-        # Create future for response
-        future: asyncio.Future = asyncio.Future()
-        self._pending_responses[approval_id] = future
-
-        try:
-            # Wait with timeout
-            response = await asyncio.wait_for(future, timeout=timeout_seconds)
-            return response
-
-        except asyncio.TimeoutError:
-            logger.warning("hitl_approval_timeout", approval_id=approval_id)
-            return HITLApprovalResponse(
-                checkpoint_id=approval_id,
-                status=ApprovalStatus.REJECTED,
-                user_feedback="Approval timed out",
-                approved_at=datetime.utcnow()
-            )
-
-        finally:
-            # Clean up
-            if approval_id in self._pending_responses:
-                del self._pending_responses[approval_id]
-
     async def handle_approval_response(
         self,
         approval_id: str,
@@ -345,54 +316,42 @@ class HITLConnectionManager:
         user_feedback: Optional[str] = None,
         modifications: Optional[Dict[str, Any]] = None,
         user_id: Optional[str] = None
-    ):
+    ) -> bool:
         """
         Handle approval response from user.
 
+        The decision is persisted first (first decision wins); the suspended
+        thread is then resumed by whichever replica serves its graph.
+
         Args:
             approval_id: Approval request ID
             status: approved/rejected/modified
             user_feedback: Optional feedback text
             modifications: Optional modifications (for modified status)
             user_id: User responding
+
+        Returns:
+            False if the approval was unknown or already decided
         """
-        # Map status string to enum
-        status_map = {
-            "approved": ApprovalStatus.APPROVED,
-            "rejected": ApprovalStatus.REJECTED,
-            "modified": ApprovalStatus.MODIFIED
-        }
-        approval_status = status_map.get(status, ApprovalStatus.REJECTED)
+        if status not in (ApprovalStatus.APPROVED.value, ApprovalStatus.REJECTED.value, ApprovalStatus.MODIFIED.value):
+            status = ApprovalStatus.REJECTED.value
 
-        # Create response
-        response = HITLApprovalResponse(
-            checkpoint_id=approval_id,
-            status=approval_status,
+        if not self.suspensions:
+            logger.error("hitl_no_suspension_coordinator", approval_id=approval_id)
+            return False
+
+        decided = await self.suspensions.decide(
+            approval_id,
+            status,
             user_feedback=user_feedback,
             modifications=modifications,
-            approved_at=datetime.utcnow()
+            user_id=user_id,
         )
+        if decided is None:
+            logger.info("hitl_approval_already_decided", approval_id=approval_id)
+            return False
 
-        # Store in database
-        try:
-            checkpointer = await get_postgres_checkpointer()
-            await checkpointer.respond_to_approval(
-                approval_id=approval_id,
-                status=status,
-                response_data={
-                    "user_feedback": user_feedback,
-                    "modifications": modifications
-                },
-                user_id=user_id
-            )
-        except Exception as e:
-            logger.error("hitl_db_response_failed", error=str(e))
-
-        # Resolve waiting future
-        if approval_id in self._pending_responses:
-            self._pending_responses[approval_id].set_result(response)
-
-        # Publish to Redis for other instances
+        # Publish to Redis so the replica serving the graph resumes it
         if self._redis:
             try:
                 await self._redis.publish("hitl_approvals", json.dumps({
@@ -412,6 +371,7 @@ class HITLConnectionManager:
             approval_id=approval_id,
             status=status
         )
+        return True
 
     async def _handle_approval_response(
         self,
@@ -419,23 +379,9 @@ class HITLConnectionManager:
         response: Dict[str, Any]
     ):
         """Handle approval response from Redis pub/sub"""
-        status_map = {
-            "approved": ApprovalStatus.APPROVED,
-            "rejected": ApprovalStatus.REJECTED,
-            "modified": ApprovalStatus.MODIFIED
-        }
-
-        approval_response = HITLApprovalResponse(
-            checkpoint_id=approval_id,
-            status=status_map.get(response["status"], ApprovalStatus.REJECTED),
-            user_feedback=response.get("user_feedback"),
-            modifications=response.get("modifications"),
-            approved_at=datetime.utcnow()
-        )
-
-        # Resolve waiting future
-        if approval_id in self._pending_responses:
-            self._pending_responses[approval_id].set_result(approval_response)
+        # The decision is already persisted; resume claims keep this idempotent
+        if self.suspensions:
+            self.suspensions.schedule_resume(approval_id)
 
     async def heartbeat(self, tenant_id: str, user_id: str):
         """Update heartbeat timestamp for connection"""
@@ -471,7 +417,9 @@ class HITLConnectionManager:
         return {
             "total_connections": total_connections,
             "tenants": len(self._connections),
-            "pending_approvals": len(self._pending_responses)
+            "resumes_in_flight": (
+                self.suspensions.get_statistics()["resumes_in_flight"] if self.suspensions else 0
+            )
         }
 
     async def cleanup(self):
@@ -490,7 +438,6 @@ class HITLConnectionManager:
 
         # Clear connections
         self._connections.clear()
-        self._pending_responses.clear()
 
         logger.info("hitl_connection_manager_cleaned_up")
 
@@ -505,22 +452,25 @@ class EnhancedHITLService:
 
     Extends the base HITLService with:
     - Real-time WebSocket approvals
-    - PostgreSQL persistence
+    - Durable suspension: approvals are persisted and the graph is resumed
+      from the checkpointer, so no coroutine waits for the human
     - Redis pub/sub for multi-instance
-    - Automatic timeout handling
+    - Persistent timeout handling (expires_at swept on every replica)
     """
 
     def __init__(
         self,
         enabled: bool = True,
         safety_level: HITLSafetyLevel = HITLSafetyLevel.BALANCED,
-        timeout_seconds: int = 3600
+        timeout_seconds: int = 3600,
+        store: Optional[ApprovalStore] = None
     ):
         self.enabled = enabled
         self.safety_level = safety_level
         self.timeout_seconds = timeout_seconds
 
-        self.connection_manager = HITLConnectionManager()
+        self.suspensions = HITLSuspensionCoordinator(store or _default_approval_store())
+        self.connection_manager = HITLConnectionManager(self.suspensions)
 
     async def initialize(self):
         """Initialize enhanced HITL service"""
@@ -529,12 +479,20 @@ class EnhancedHITLService:
         # Ensure checkpointer is ready
         await get_postgres_checkpointer()
 
+        # Expiry sweeps + recovery of approvals decided while no replica could resume
+        await self.suspensions.start()
+
         logger.info(
             "enhanced_hitl_service_initialized",
             enabled=self.enabled,
             safety_level=self.safety_level.value
         )
 
+    def register_graph(self, name: str, compiled_graph: Any):
+        """Allow this replica to resume suspended threads of a compiled graph."""
+        from .hitl_suspension import langgraph_resumer
+        self.suspensions.register_graph(name, langgraph_resumer(compiled_graph))
+
     async def request_approval(
         self,
         checkpoint_type: HITLCheckpoint,
@@ -546,6 +504,10 @@ class EnhancedHITLService:
         """
         Request HITL approval with WebSocket notification.
 
+        Does not wait for the decision. Graph nodes should use
+        interrupt_for_approval so the mission is resumed automatically; other
+        callers poll the approval status with the returned checkpoint_id.
+
         Args:
             checkpoint_type: Type of checkpoint
             request_data: Approval request details
@@ -554,7 +516,7 @@ class EnhancedHITLService:
             user_id: Optional user UUID
 
         Returns:
-            Approval response
+            Auto-approval, or a PENDING response whose checkpoint_id is the approval ID
         """
         if not self.enabled:
             return self._auto_approve(checkpoint_type.value)
@@ -563,34 +525,105 @@ class EnhancedHITLService:
         if self._should_auto_approve(checkpoint_type, request_data):
             return self._auto_approve(checkpoint_type.value)
 
-        # Create approval in database
-        checkpointer = await get_postgres_checkpointer()
-        approval_id = await checkpointer.create_hitl_approval(
-            checkpoint_id=f"{checkpoint_type.value}_{session_id}",
+        approval = await self._suspend(
+            checkpoint_type=checkpoint_type,
+            request_data=request_data,
             thread_id=session_id,
             tenant_id=tenant_id,
-            checkpoint_type=checkpoint_type.value,
-            request_data=request_data,
+            checkpoint_id=f"{checkpoint_type.value}_{session_id}",
             user_id=user_id,
-            expires_in_seconds=self.timeout_seconds
         )
+        return approval.to_response()
+
+    async def interrupt_for_approval(
+        self,
+        checkpoint_type: HITLCheckpoint,
+        request_data: Dict[str, Any],
+        config: Dict[str, Any],
+        tenant_id: str,
+        graph: str,
+        checkpoint_id: str,
+        user_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Suspend the calling LangGraph node until a human decides.
+
+        Persists the approval and calls ``interrupt()``, which checkpoints the
+        thread and releases the worker. When the decision arrives (on any
+        replica) the thread is resumed and LangGraph re-runs the node; this
+        call then returns the decision instead of suspending again.
+
+        Args:
+            checkpoint_type: Type of checkpoint
+            request_data: Approval request details
+            config: The node's RunnableConfig (provides the thread_id)
+            tenant_id: Tenant UUID
+            graph: Name the graph was registered under (register_graph)
+            checkpoint_id: Stable ID of this approval point within the thread
+            user_id: Optional user UUID
 
-        # Broadcast to WebSocket connections
-        await self.connection_manager.broadcast_approval_request(
+        Returns:
+            Decision dict: approval_id, status, approved, feedback, modifications
+        """
+        from langgraph.types import interrupt
+
+        if not self.enabled or self._should_auto_approve(checkpoint_type, request_data):
+            auto = self._auto_approve(checkpoint_type.value)
+            return {
+                "approval_id": auto.checkpoint_id,
+                "status": auto.status.value,
+                "approved": True,
+                "feedback": auto.user_feedback,
+                "modifications": None,
+            }
+
+        thread_id = config["configurable"]["thread_id"]
+        approval = await self._suspend(
+            checkpoint_type=checkpoint_type,
+            request_data=request_data,
+            thread_id=thread_id,
             tenant_id=tenant_id,
-            approval_id=approval_id,
+            checkpoint_id=checkpoint_id,
+            user_id=user_id,
+            graph=graph,
+            resume_config={"configurable": {"thread_id": thread_id}},
+        )
+        return interrupt(approval.interrupt_payload())
+
+    async def _suspend(
+        self,
+        checkpoint_type: HITLCheckpoint,
+        request_data: Dict[str, Any],
+        thread_id: str,
+        tenant_id: str,
+        checkpoint_id: str,
+        user_id: Optional[str] = None,
+        graph: Optional[str] = None,
+        resume_config: Optional[Dict[str, Any]] = None
+    ):
+        """Persist the approval and notify the tenant while it is pending"""
+        approval = await self.suspensions.suspend(
             checkpoint_type=checkpoint_type.value,
             request_data=request_data,
-            thread_id=session_id
+            thread_id=thread_id,
+            tenant_id=tenant_id,
+            checkpoint_id=checkpoint_id,
+            graph=graph,
+            resume_config=resume_config,
+            user_id=user_id,
+            timeout_seconds=self.timeout_seconds,
         )
 
-        # Wait for response
-        response = await self.connection_manager.wait_for_approval(
-            approval_id=approval_id,
-            timeout_seconds=self.timeout_seconds
-        )
+        if not approval.decided:
+            await self.connection_manager.broadcast_approval_request(
+                tenant_id=tenant_id,
+                approval_id=approval.approval_id,
+                checkpoint_type=checkpoint_type.value,
+                request_data=request_data,
+                thread_id=thread_id
+            )
 
-        return response or self._auto_approve(checkpoint_type.value)
+        return approval
 
     def _should_auto_approve(
         self,
@@ -632,6 +665,7 @@ class EnhancedHITLService:
 
     async def cleanup(self):
         """Cleanup HITL service resources"""
+        await self.suspensions.stop()
         await self.connection_manager.cleanup()
 
 
@@ -639,6 +673,25 @@ class EnhancedHITLService:
 # FACTORY
 # ============================================================================
 
+def _default_approval_store() -> ApprovalStore:
+    """hitl_approvals via Supabase, or process-local when not configured"""
+    try:
+        from services.shared.supabase_client import get_supabase_client
+        client = get_supabase_client().client
+    except Exception:
+        client = None
+
+    if client is None:
+        logger.warning(
+            "hitl_approval_store_using_memory",
+            impact="pending_approvals_not_persisted",
+            recovery="restart_will_lose_pending_approvals",
+            recommendation="Configure Supabase for durable HITL approvals",
+        )
+        return InMemoryApprovalStore()
+    return SupabaseApprovalStore(client)
+
+
 _hitl_service: Optional[EnhancedHITLService] = None
 
 
@@ -88,40 +88,30 @@ class TokenStreamer:
         self._llm = self._create_llm()
 
     def _create_llm(self) -> Any:
-        """Create the appropriate LLM based on provider."""
-        if self.provider == "openai":
-            from langchain_openai import ChatOpenAI
-            return ChatOpenAI(
-                model=self.model,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-                streaming=self.streaming,
-                callbacks=self.callbacks,
-            )
-        elif self.provider == "anthropic":
-            from langchain_anthropic import ChatAnthropic
+        """Create the appropriate LLM based on provider (via the LLM gateway)."""
+        from core.llm_gateway import Priority, get_llm_gateway
+
+        provider = self.provider
+        model_name = self.model
+        if provider == "anthropic":
             # Normalize model name for Anthropic
-            model_name = self.model
             if 'claude' not in model_name.lower():
                 model_name = "claude-sonnet-4-20250514"  # Default to latest Sonnet
-            return ChatAnthropic(
-                model=model_name,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-                streaming=self.streaming,
-                callbacks=self.callbacks,
-            )
-        else:
+        elif provider != "openai":
             # Default to OpenAI-compatible
             logger.warning("unknown_provider_using_openai", provider=self.provider)
-            from langchain_openai import ChatOpenAI
-            return ChatOpenAI(
-                model=self.model,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-                streaming=self.streaming,
-                callbacks=self.callbacks,
-            )
+            provider = "openai"
+
+        # Token streams are user-facing
+        return get_llm_gateway().chat_model(
+            model_name,
+            provider=provider,
+            priority=Priority.INTERACTIVE,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            streaming=self.streaming,
+            callbacks=self.callbacks,
+        )
 
     async def stream(
         self,
@@ -352,6 +352,149 @@ class TestSynergyCalculationIntegration:
         assert isinstance(partners, list)
 
 
+class FakeSynergyStore:
+    """In-memory stand-in for the agents / agent_synergies tables."""
+
+    def __init__(self, agents, co_rows):
+        self.agents = agents
+        self.co_rows = co_rows
+        self.synergies = {}
+        self.upsert_calls = []
+
+    def rpc(self, name, params):
+        return MagicMock(execute=lambda: MagicMock(data=self.co_rows))
+
+    def table(self, name):
+        store = self
+        query = MagicMock()
+        query.select.return_value = query
+        query.eq.return_value = query
+
+        def _range(start, end):
+            rows = list(store.synergies.values())[start:end + 1]
+            return MagicMock(execute=lambda: MagicMock(data=rows))
+
+        def _upsert(rows, on_conflict=None):
+            store.upsert_calls.append(len(rows))
+            for row in rows:
+                store.synergies[(row['agent_a_id'], row['agent_b_id'])] = row
+            return MagicMock(execute=lambda: MagicMock(data=rows))
+
+        query.range.side_effect = _range
+        query.upsert.side_effect = _upsert
+        query.execute.side_effect = lambda: MagicMock(data=store.agents)
+        return query
+
+
+def _random_agents(count, seed=11):
+    import random
+    rng = random.Random(seed)
+    domains = ["regulatory", "experimental", "Conservative", "aggressive", "oncology",
+               "safety-first", "speed-first", "clinical", "payer", "fda"]
+    capabilities = [f"cap_{i}" for i in range(70)]
+    agents = [
+        {
+            "id": f"agent-{i:03d}",
+            "domains": rng.sample(domains, rng.randint(0, 4)),
+            "capabilities": rng.sample(capabilities, rng.randint(0, 6)),
+        }
+        for i in range(count)
+    ]
+    co_rows = []
+    for _ in range(count * 3):
+        a, b = rng.sample(agents, 2)
+        co_rows.append({
+            "agent_a_id": a["id"],
+            "agent_b_id": b["id"],
+            "occurrence_count": rng.randint(1, 40),
+            "avg_satisfaction": rng.random(),
+            "avg_response_quality": rng.choice([None, 0, rng.random()]),
+        })
+    return agents, co_rows
+
+
+class TestBatchSynergyMatrix:
+    """Vectorized all-pairs computation, diffing and bulk upserts."""
+
+    @pytest.mark.asyncio
+    async def test_matrix_matches_pairwise_formula(self):
+        agents, co_rows = _random_agents(40)
+        store = FakeSynergyStore(agents, co_rows)
+        service = SynergyCalculationService(store)
+        service.BLOCK_WORKING_SET = 200  # force several row blocks
+
+        stats = await service.calculate_all_synergies("tenant-1")
+
+        assert stats["success"] is True
+        assert stats["pairs_analyzed"] == 40 * 39 // 2
+        assert stats["synergies_created"] == len(store.synergies) == 40 * 39 // 2
+
+        co_occurrences = await service._get_co_occurrences("tenant-1", datetime.utcnow())
+        by_id = {a["id"]: a for a in agents}
+        for (a_id, b_id), row in store.synergies.items():
+            assert a_id < b_id
+            expected = await service._calculate_pair_synergy(by_id[a_id], by_id[b_id], co_occurrences)
+            assert row["synergy_score"] == pytest.approx(expected.synergy_score, abs=1e-12)
+            assert row["complementary_score"] == pytest.approx(expected.complementary_score, abs=1e-12)
+            assert row["conflict_score"] == pytest.approx(expected.conflict_score)
+            assert row["co_occurrence_count"] == expected.co_occurrence_count
+            assert row["is_recommended"] == expected.is_recommended
+            assert row["tenant_id"] == "tenant-1"
+
+    @pytest.mark.asyncio
+    async def test_unchanged_scores_are_not_rewritten(self):
+        agents, co_rows = _random_agents(30)
+        store = FakeSynergyStore(agents, co_rows)
+        service = SynergyCalculationService(store)
+        service.FETCH_PAGE_SIZE = 50  # exercise pagination
+        await service.calculate_all_synergies()
+        store.upsert_calls.clear()
+
+        stats = await service.calculate_all_synergies()
+
+        assert store.upsert_calls == []
+        assert stats["synergies_unchanged"] == stats["pairs_analyzed"]
+
+    @pytest.mark.asyncio
+    async def test_only_changed_pairs_written_in_batches(self):
+        agents, co_rows = _random_agents(30)
+        store = FakeSynergyStore(agents, co_rows)
+        service = SynergyCalculationService(store)
+        service.UPSERT_BATCH_SIZE = 100
+        await service.calculate_all_synergies()
+        assert max(store.upsert_calls) == 100
+
+        store.upsert_calls.clear()
+        pair = tuple(sorted([co_rows[0]["agent_a_id"], co_rows[0]["agent_b_id"]]))
+        store.co_rows = [
+            r for r in co_rows if tuple(sorted([r["agent_a_id"], r["agent_b_id"]])) != pair
+        ] + [dict(co_rows[0], occurrence_count=500, avg_satisfaction=1.0)]
+        stats = await service.calculate_all_synergies()
+
+        assert stats["synergies_updated"] == 1
+        assert store.upsert_calls == [1]
+        assert store.synergies[pair]["co_occurrence_count"] == 500
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_reported(self):
+        agents, co_rows = _random_agents(10)
+        store = FakeSynergyStore(agents, co_rows)
+        service = SynergyCalculationService(store)
+
+        def _boom(rows, on_conflict=None):
+            raise RuntimeError("write timeout")
+
+        table = store.table
+        store.table = lambda name: MagicMock(
+            select=table(name).select,
+            upsert=MagicMock(side_effect=_boom),
+        )
+        stats = await service.calculate_all_synergies()
+
+        assert stats["success"] is False
+        assert "write timeout" in stats["errors"][0]
+
+
 class TestSynergyWeights:
     """Tests for synergy weight configuration."""
     
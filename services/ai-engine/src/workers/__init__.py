@@ -13,9 +13,9 @@ Architecture:
 - PostgreSQL for result storage (job tracking)
 
 Usage:
-    # Dispatch a task
-    from workers.tasks.execution_tasks import run_mode_3_workflow
-    run_mode_3_workflow.delay(job_id, tenant_id, user_id, request_data)
+    # Dispatch a task (tenant-fair scheduler when TASK_SCHEDULER_ENABLED=true)
+    from workers.scheduling import dispatch_task
+    dispatch_task("run_mode_3_workflow", tenant_id, args=[job_id, tenant_id, user_id, request_data])
     
     # Check job status
     from infrastructure.database.repositories.job_repo import JobRepository
@@ -0,0 +1,866 @@
+"""
+VITAL Path - Tenant-Fair Task Scheduling
+
+Scheduling layer in front of the Celery queues. Producers submit tasks into
+per-tenant sub-queues held by a broker (Redis); a single dispatcher process
+decides what runs next and hands only that many tasks to Celery as there
+are free worker slots, so one tenant's bulk work cannot starve everyone else.
+
+Key Features:
+- Priority lanes (interactive / standard / batch) sharing dispatch slots by
+  weight, each with a cap on the worker share it may hold
+- Per-tenant sub-queues within a lane, drained by deficit round robin
+  weighted by task cost (a 30s re-embedding chunk spends 30x the deficit of
+  a 1s personalization update)
+- Per-task-type concurrency caps and a per-tenant share of the workers
+  (relaxed when nothing else is runnable, so slots never sit idle)
+- Cost-weighted admission: a tenant's queued cost per lane is bounded and
+  submissions beyond it are rejected up front
+- Long batch jobs split into resumable chunk sub-tasks: resubmitting a job
+  only enqueues the chunks that have not completed
+- Running slots carry a deadline (the task's hard time limit plus a margin)
+  and are persisted in the broker: a worker killed before task_postrun
+  cannot leak its slot, and a restarted dispatcher does not overcommit
+
+Opt-in: the scheduler is used only with TASK_SCHEDULER_ENABLED=true and a
+running dispatcher. Producers go through ``dispatch_task``, which submits
+here when enabled and sends straight to Celery otherwise.
+
+Usage:
+    # Producer (API or another task)
+    from workers.scheduling import dispatch_task
+    dispatch_task("reindex_knowledge_base", tenant_id, kwargs={"job_id": job_id, "document_ids": ids})
+
+    # Dispatcher process (one per deployment)
+    python -m workers.scheduling
+"""
+
+import json
+import logging
+import math
+import os
+import time
+import uuid
+from collections import Counter, defaultdict, deque
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Protocol, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+TASK_SCHEDULER_ENABLED = os.getenv("TASK_SCHEDULER_ENABLED", "false").lower() == "true"
+
+# Celery's task_time_limit (workers/config.py) for tasks without their own
+DEFAULT_TIME_LIMIT_SECONDS = 600.0
+# Grace after a task's hard time limit before its slot is reclaimed
+REAP_MARGIN_SECONDS = float(os.getenv("SCHEDULER_REAP_MARGIN_SECONDS", "60"))
+
+
+class Lane(str, Enum):
+    """Priority lanes, highest first"""
+    INTERACTIVE = "interactive"
+    STANDARD = "standard"
+    BATCH = "batch"
+
+
+@dataclass(frozen=True)
+class LaneConfig:
+    weight: float                 # share of dispatch slots when lanes compete
+    max_worker_share: float       # fraction of worker slots the lane may hold
+    max_backlog_cost: float       # queued cost per tenant before admission rejects
+
+
+LANES: Dict[Lane, LaneConfig] = {
+    Lane.INTERACTIVE: LaneConfig(weight=6.0, max_worker_share=1.0, max_backlog_cost=200.0),
+    Lane.STANDARD: LaneConfig(weight=3.0, max_worker_share=0.75, max_backlog_cost=2_000.0),
+    Lane.BATCH: LaneConfig(weight=1.0, max_worker_share=0.5, max_backlog_cost=20_000.0),
+}
+
+
+@dataclass(frozen=True)
+class TaskClass:
+    """
+    Scheduling properties of a Celery task.
+
+    ``cost`` is the expected run time in seconds (per chunk for chunked
+    tasks). ``chunk_param`` names a list kwarg that is split into
+    ``chunk_size`` slices, one sub-task each. ``time_limit`` mirrors the
+    task's Celery hard time limit.
+    """
+    lane: Lane = Lane.STANDARD
+    cost: float = 10.0
+    max_concurrency: Optional[int] = None
+    chunk_param: Optional[str] = None
+    chunk_size: int = 0
+    time_limit: float = DEFAULT_TIME_LIMIT_SECONDS
+
+
+TASK_CLASSES: Dict[str, TaskClass] = {
+    # Interactive-adjacent: a user is waiting on the outcome
+    "update_personalization": TaskClass(Lane.INTERACTIVE, cost=1.0, time_limit=360),
+    "run_mode_3_workflow": TaskClass(Lane.INTERACTIVE, cost=120.0),
+    "run_mode_4_workflow": TaskClass(Lane.INTERACTIVE, cost=180.0),
+    "run_panel_simulation": TaskClass(Lane.INTERACTIVE, cost=180.0, time_limit=360),
+    "execute_workflow": TaskClass(Lane.INTERACTIVE, cost=60.0),
+    # Standard
+    "process_document": TaskClass(Lane.STANDARD, cost=5.0, time_limit=360),
+    "run_opportunity_scan": TaskClass(Lane.STANDARD, cost=60.0, max_concurrency=2, time_limit=3900),
+    # Batch
+    "reindex_knowledge_base": TaskClass(
+        Lane.BATCH, cost=30.0, max_concurrency=2, chunk_param="document_ids", chunk_size=50, time_limit=2000
+    ),
+    "calculate_synergies_task": TaskClass(Lane.BATCH, cost=120.0, max_concurrency=1),
+    "refresh_recommendation_model": TaskClass(Lane.BATCH, cost=300.0, max_concurrency=1, time_limit=1900),
+    "purge_old_jobs": TaskClass(Lane.BATCH, cost=10.0, max_concurrency=1),
+    "archive_conversations": TaskClass(Lane.BATCH, cost=30.0, max_concurrency=1),
+    "cleanup_orphan_vectors": TaskClass(Lane.BATCH, cost=30.0, max_concurrency=1),
+    "aggregate_token_usage": TaskClass(Lane.BATCH, cost=10.0, max_concurrency=1),
+}
+
+DEFAULT_TASK_CLASS = TaskClass()
+
+# Tenant used for platform maintenance tasks that belong to no tenant
+SYSTEM_TENANT = "system"
+
+
+def task_class(name: str) -> TaskClass:
+    return TASK_CLASSES.get(name, DEFAULT_TASK_CLASS)
+
+
+class AdmissionRejected(Exception):
+    """The tenant already has more queued work in this lane than it may hold"""
+
+    def __init__(self, tenant_id: str, lane: Lane, backlog_cost: float, limit: float):
+        self.tenant_id = tenant_id
+        self.lane = lane
+        self.backlog_cost = backlog_cost
+        self.limit = limit
+        super().__init__(
+            f"Tenant {tenant_id} has {backlog_cost:.0f}s of queued {lane.value} work (limit {limit:.0f}s)"
+        )
+
+
+@dataclass
+class ScheduledTask:
+    """A task waiting in (or dispatched from) a tenant sub-queue"""
+    name: str
+    tenant_id: str
+    lane: Lane
+    cost: float
+    args: List[Any] = field(default_factory=list)
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    task_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    enqueued_at: float = 0.0
+    job_id: Optional[str] = None
+    chunk_index: Optional[int] = None
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data["lane"] = self.lane.value
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, raw) -> "ScheduledTask":
+        data = json.loads(raw)
+        data["lane"] = Lane(data["lane"])
+        return cls(**data)
+
+
+# ============================================================================
+# Deficit Round Robin
+# ============================================================================
+
+class DeficitRoundRobin:
+    """
+    Deficit round robin over flows served one item at a time.
+
+    The flow at the head of the rotation receives ``quantum x weight`` when
+    its turn starts and is served while its deficit covers the cost of its
+    next item; then the turn passes on. Flows whose next item cannot run
+    right now (``cost_of`` returns None) are skipped and keep their deficit.
+    """
+
+    def __init__(self, quantum: float = 1.0):
+        self.quantum = quantum
+        self._order: Deque[Hashable] = deque()
+        self._deficit: Dict[Hashable, float] = {}
+        self._weight: Dict[Hashable, float] = {}
+        self._in_turn = False
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._deficit
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def keys(self) -> List[Hashable]:
+        return list(self._order)
+
+    def add(self, key: Hashable, weight: float = 1.0) -> None:
+        if key not in self._deficit:
+            self._order.append(key)
+            self._deficit[key] = 0.0
+        self._weight[key] = weight
+
+    def remove(self, key: Hashable) -> None:
+        """Drop an idle flow (its deficit does not carry over, as in classic DRR)"""
+        if key not in self._deficit:
+            return
+        if self._order[0] == key:
+            self._in_turn = False
+        self._order.remove(key)
+        del self._deficit[key]
+        del self._weight[key]
+
+    def pick(self, cost_of: Callable[[Hashable], Optional[float]]) -> Optional[Hashable]:
+        blocked = 0
+        while self._order and blocked < len(self._order):
+            key = self._order[0]
+            cost = cost_of(key)
+            if cost is None:
+                self._end_turn()
+                blocked += 1
+                continue
+            if not self._in_turn:
+                self._deficit[key] += self.quantum * self._weight[key]
+                self._in_turn = True
+            if self._deficit[key] >= cost:
+                self._deficit[key] -= cost
+                return key
+            self._end_turn()
+            blocked = 0
+        return None
+
+    def _end_turn(self) -> None:
+        self._order.rotate(-1)
+        self._in_turn = False
+
+
+# ============================================================================
+# Brokers
+# ============================================================================
+
+class SchedulerBroker(Protocol):
+    """Durable state of the scheduler: sub-queues, backlog, completions, chunk ledger"""
+
+    def admit(self, tenant_id: str, lane: Lane, cost: float, limit: float) -> Optional[float]: ...
+    def release(self, tenant_id: str, lane: Lane, cost: float) -> None: ...
+    def push(self, task: ScheduledTask) -> None: ...
+    def tenants(self, lane: Lane) -> List[str]: ...
+    def peek(self, lane: Lane, tenant_id: str) -> Optional[ScheduledTask]: ...
+    def pop(self, lane: Lane, tenant_id: str) -> Optional[ScheduledTask]: ...
+    def push_done(self, task_id: str, succeeded: bool) -> None: ...
+    def pop_done(self) -> List[Tuple[str, bool]]: ...
+    def save_chunk_plan(self, job_id: str, tasks: Sequence[ScheduledTask]) -> None: ...
+    def mark_chunk_done(self, job_id: str, index: int) -> None: ...
+    def finish_chunk(self, job_id: str, index: int, succeeded: bool) -> Tuple[int, int]: ...
+    def pending_chunks(self, job_id: str) -> Optional[List[ScheduledTask]]: ...
+    def save_running(self, task: ScheduledTask, deadline: float) -> None: ...
+    def drop_running(self, task_id: str) -> None: ...
+    def load_running(self) -> List[Tuple[ScheduledTask, float]]: ...
+
+
+class InMemoryBroker:
+    """Single-process broker for tests and the scheduling simulator"""
+
+    def __init__(self):
+        self._queues: Dict[Tuple[Lane, str], Deque[ScheduledTask]] = {}
+        self._backlog: Counter = Counter()
+        self._done: Deque[Tuple[str, bool]] = deque()
+        self._plans: Dict[str, List[ScheduledTask]] = {}
+        self._chunks_done: Dict[str, set] = defaultdict(set)
+        self._chunks_failed: Dict[str, set] = defaultdict(set)
+        self._running: Dict[str, Tuple[ScheduledTask, float]] = {}
+
+    def admit(self, tenant_id: str, lane: Lane, cost: float, limit: float) -> Optional[float]:
+        """Reserve ``cost`` of backlog; returns the current backlog when over the limit"""
+        backlog = self._backlog[(tenant_id, lane)]
+        if backlog + cost > limit and backlog > 0:
+            return backlog
+        self._backlog[(tenant_id, lane)] = backlog + cost
+        return None
+
+    def release(self, tenant_id: str, lane: Lane, cost: float) -> None:
+        self._backlog[(tenant_id, lane)] = max(0.0, self._backlog[(tenant_id, lane)] - cost)
+
+    def push(self, task: ScheduledTask) -> None:
+        self._queues.setdefault((task.lane, task.tenant_id), deque()).append(task)
+
+    def tenants(self, lane: Lane) -> List[str]:
+        return [tenant for (queue_lane, tenant), queue in self._queues.items() if queue_lane == lane and queue]
+
+    def peek(self, lane: Lane, tenant_id: str) -> Optional[ScheduledTask]:
+        queue = self._queues.get((lane, tenant_id))
+        return queue[0] if queue else None
+
+    def pop(self, lane: Lane, tenant_id: str) -> Optional[ScheduledTask]:
+        queue = self._queues.get((lane, tenant_id))
+        if not queue:
+            return None
+        task = queue.popleft()
+        if not queue:
+            del self._queues[(lane, tenant_id)]
+        return task
+
+    def push_done(self, task_id: str, succeeded: bool) -> None:
+        self._done.append((task_id, succeeded))
+
+    def pop_done(self) -> List[Tuple[str, bool]]:
+        done = list(self._done)
+        self._done.clear()
+        return done
+
+    def save_chunk_plan(self, job_id: str, tasks: Sequence[ScheduledTask]) -> None:
+        self._plans[job_id] = list(tasks)
+
+    def mark_chunk_done(self, job_id: str, index: int) -> None:
+        self._chunks_done[job_id].add(index)
+
+    def finish_chunk(self, job_id: str, index: int, succeeded: bool) -> Tuple[int, int]:
+        """Record a chunk outcome; returns (chunks done, chunks currently failed)"""
+        if succeeded:
+            self._chunks_done[job_id].add(index)
+            self._chunks_failed[job_id].discard(index)
+        else:
+            self._chunks_failed[job_id].add(index)
+        return len(self._chunks_done[job_id]), len(self._chunks_failed[job_id])
+
+    def pending_chunks(self, job_id: str) -> Optional[List[ScheduledTask]]:
+        plan = self._plans.get(job_id)
+        if plan is None:
+            return None
+        done = self._chunks_done.get(job_id, set())
+        return [task for task in plan if task.chunk_index not in done]
+
+    def save_running(self, task: ScheduledTask, deadline: float) -> None:
+        self._running[task.task_id] = (task, deadline)
+
+    def drop_running(self, task_id: str) -> None:
+        self._running.pop(task_id, None)
+
+    def load_running(self) -> List[Tuple[ScheduledTask, float]]:
+        return list(self._running.values())
+
+
+# Pops the head of a sub-queue and drops the tenant from the lane's set when
+# the queue empties, atomically (a concurrent push re-adds it)
+_POP_SCRIPT = """
+local item = redis.call('LPOP', KEYS[1])
+if redis.call('LLEN', KEYS[1]) == 0 then
+    redis.call('SREM', KEYS[2], ARGV[1])
+end
+return item
+"""
+
+
+class RedisBroker:
+    """Redis-backed broker shared by producers, the dispatcher and workers"""
+
+    CHUNK_PLAN_TTL = 7 * 86400
+
+    def __init__(self, redis_url: str, prefix: str = "vital:sched"):
+        import redis
+
+        self.redis = redis.from_url(redis_url, decode_responses=True)
+        self.prefix = prefix
+        self._pop_script = self.redis.register_script(_POP_SCRIPT)
+
+    def _queue_key(self, lane: Lane, tenant_id: str) -> str:
+        return f"{self.prefix}:q:{lane.value}:{tenant_id}"
+
+    def _tenants_key(self, lane: Lane) -> str:
+        return f"{self.prefix}:tenants:{lane.value}"
+
+    def _backlog_key(self, lane: Lane) -> str:
+        return f"{self.prefix}:backlog:{lane.value}"
+
+    def admit(self, tenant_id: str, lane: Lane, cost: float, limit: float) -> Optional[float]:
+        backlog = self.redis.hincrbyfloat(self._backlog_key(lane), tenant_id, cost)
+        previous = backlog - cost
+        if backlog > limit and previous > 0:
+            self.redis.hincrbyfloat(self._backlog_key(lane), tenant_id, -cost)
+            return previous
+        return None
+
+    def release(self, tenant_id: str, lane: Lane, cost: float) -> None:
+        if self.redis.hincrbyfloat(self._backlog_key(lane), tenant_id, -cost) < 0:
+            self.redis.hset(self._backlog_key(lane), tenant_id, 0)
+
+    def push(self, task: ScheduledTask) -> None:
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.rpush(self._queue_key(task.lane, task.tenant_id), task.to_json())
+        pipe.sadd(self._tenants_key(task.lane), task.tenant_id)
+        pipe.execute()
+
+    def tenants(self, lane: Lane) -> List[str]:
+        return sorted(self.redis.smembers(self._tenants_key(lane)))
+
+    def peek(self, lane: Lane, tenant_id: str) -> Optional[ScheduledTask]:
+        raw = self.redis.lindex(self._queue_key(lane, tenant_id), 0)
+        return ScheduledTask.from_json(raw) if raw else None
+
+    def pop(self, lane: Lane, tenant_id: str) -> Optional[ScheduledTask]:
+        raw = self._pop_script(
+            keys=[self._queue_key(lane, tenant_id), self._tenants_key(lane)],
+            args=[tenant_id],
+        )
+        return ScheduledTask.from_json(raw) if raw else None
+
+    def push_done(self, task_id: str, succeeded: bool) -> None:
+        self.redis.rpush(f"{self.prefix}:done", json.dumps([task_id, succeeded]))
+
+    def pop_done(self) -> List[Tuple[str, bool]]:
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.lrange(f"{self.prefix}:done", 0, -1)
+        pipe.delete(f"{self.prefix}:done")
+        raw, _ = pipe.execute()
+        return [tuple(json.loads(item)) for item in raw]
+
+    def save_chunk_plan(self, job_id: str, tasks: Sequence[ScheduledTask]) -> None:
+        key = f"{self.prefix}:chunks:{job_id}"
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.delete(key)
+        pipe.hset(key, mapping={str(task.chunk_index): task.to_json() for task in tasks})
+        pipe.expire(key, self.CHUNK_PLAN_TTL)
+        pipe.execute()
+
+    def mark_chunk_done(self, job_id: str, index: int) -> None:
+        key = f"{self.prefix}:chunks_done:{job_id}"
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.sadd(key, index)
+        pipe.expire(key, self.CHUNK_PLAN_TTL)
+        pipe.execute()
+
+    def finish_chunk(self, job_id: str, index: int, succeeded: bool) -> Tuple[int, int]:
+        done_key = f"{self.prefix}:chunks_done:{job_id}"
+        failed_key = f"{self.prefix}:chunks_failed:{job_id}"
+        # MULTI: concurrent chunks each see the counts including their own outcome
+        pipe = self.redis.pipeline(transaction=True)
+        if succeeded:
+            pipe.sadd(done_key, index)
+            pipe.srem(failed_key, index)
+        else:
+            pipe.sadd(failed_key, index)
+        pipe.scard(done_key)
+        pipe.scard(failed_key)
+        pipe.expire(done_key, self.CHUNK_PLAN_TTL)
+        pipe.expire(failed_key, self.CHUNK_PLAN_TTL)
+        results = pipe.execute()
+        return int(results[-4]), int(results[-3])
+
+    def pending_chunks(self, job_id: str) -> Optional[List[ScheduledTask]]:
+        plan = self.redis.hgetall(f"{self.prefix}:chunks:{job_id}")
+        if not plan:
+            return None
+        done = self.redis.smembers(f"{self.prefix}:chunks_done:{job_id}")
+        return [
+            ScheduledTask.from_json(raw)
+            for index, raw in sorted(plan.items(), key=lambda item: int(item[0]))
+            if index not in done
+        ]
+
+    def save_running(self, task: ScheduledTask, deadline: float) -> None:
+        self.redis.hset(
+            f"{self.prefix}:running", task.task_id,
+            json.dumps({"task": task.to_json(), "deadline": deadline}),
+        )
+
+    def drop_running(self, task_id: str) -> None:
+        self.redis.hdel(f"{self.prefix}:running", task_id)
+
+    def load_running(self) -> List[Tuple[ScheduledTask, float]]:
+        running = []
+        for raw in self.redis.hvals(f"{self.prefix}:running"):
+            entry = json.loads(raw)
+            running.append((ScheduledTask.from_json(entry["task"]), float(entry["deadline"])))
+        return running
+
+
+# ============================================================================
+# Producer API
+# ============================================================================
+
+def plan_tasks(
+    name: str,
+    tenant_id: str,
+    args: Optional[Sequence[Any]] = None,
+    kwargs: Optional[Dict[str, Any]] = None,
+    job_id: Optional[str] = None,
+    now: Optional[float] = None,
+) -> List[ScheduledTask]:
+    """
+    The sub-queue entries for one submission.
+
+    A chunked task whose list kwarg is longer than its chunk size becomes one
+    entry per slice; each receives ``chunk={"job_id", "index", "count"}``.
+    """
+    cls = task_class(name)
+    kwargs = dict(kwargs or {})
+    enqueued_at = time.time() if now is None else now
+    items = kwargs.get(cls.chunk_param) if cls.chunk_param else None
+
+    if not items or len(items) <= cls.chunk_size:
+        return [ScheduledTask(name, tenant_id, cls.lane, cls.cost, list(args or ()), kwargs,
+                              enqueued_at=enqueued_at, job_id=job_id)]
+
+    job_id = job_id or kwargs.get("job_id") or str(uuid.uuid4())
+    count = math.ceil(len(items) / cls.chunk_size)
+    chunks = []
+    for index in range(count):
+        chunk_kwargs = dict(kwargs)
+        chunk_kwargs[cls.chunk_param] = items[index * cls.chunk_size:(index + 1) * cls.chunk_size]
+        chunk_kwargs["chunk"] = {"job_id": job_id, "index": index, "count": count}
+        chunks.append(ScheduledTask(name, tenant_id, cls.lane, cls.cost, list(args or ()), chunk_kwargs,
+                                    enqueued_at=enqueued_at, job_id=job_id, chunk_index=index))
+    return chunks
+
+
+def submit_task(
+    name: str,
+    tenant_id: Optional[str],
+    args: Optional[Sequence[Any]] = None,
+    kwargs: Optional[Dict[str, Any]] = None,
+    job_id: Optional[str] = None,
+    broker: Optional[SchedulerBroker] = None,
+    now: Optional[float] = None,
+) -> List[str]:
+    """
+    Queue a task in its tenant's sub-queue.
+
+    Resubmitting a chunked job (same job id) after it stopped only enqueues
+    the chunks that have not completed. Raises AdmissionRejected when the tenant's queued cost in
+    the task's lane would exceed the lane limit.
+
+    Returns:
+        Task ids of the queued entries
+    """
+    broker = broker or get_scheduler_broker()
+    tenant_id = tenant_id or SYSTEM_TENANT
+    tasks = plan_tasks(name, tenant_id, args, kwargs, job_id, now)
+
+    if tasks[0].chunk_index is not None:
+        pending = broker.pending_chunks(tasks[0].job_id)
+        if pending is None:
+            broker.save_chunk_plan(tasks[0].job_id, tasks)
+        else:
+            stamp = tasks[0].enqueued_at
+            tasks = pending
+            for task in tasks:
+                task.enqueued_at = stamp
+        if not tasks:
+            return []
+
+    lane = tasks[0].lane
+    cost = sum(task.cost for task in tasks)
+    limit = LANES[lane].max_backlog_cost
+    backlog = broker.admit(tenant_id, lane, cost, limit)
+    if backlog is not None:
+        raise AdmissionRejected(tenant_id, lane, backlog, limit)
+
+    for task in tasks:
+        broker.push(task)
+    return [task.task_id for task in tasks]
+
+
+def dispatch_task(
+    name: str,
+    tenant_id: Optional[str],
+    args: Optional[Sequence[Any]] = None,
+    kwargs: Optional[Dict[str, Any]] = None,
+    job_id: Optional[str] = None,
+) -> List[str]:
+    """
+    Producer entry point: the fair scheduler when enabled, Celery otherwise.
+
+    With TASK_SCHEDULER_ENABLED=false the task is sent to its Celery queue
+    directly (what ``.delay()`` does). Raises AdmissionRejected only when
+    the scheduler is enabled.
+
+    Returns:
+        Task ids of the queued entries
+    """
+    if TASK_SCHEDULER_ENABLED:
+        return submit_task(name, tenant_id, args, kwargs, job_id)
+
+    from workers.config import celery_app
+
+    result = celery_app.send_task(name, args=list(args or ()), kwargs=dict(kwargs or {}))
+    return [result.id]
+
+
+
+# ============================================================================
+# Scheduler
+# ============================================================================
+
+class FairScheduler:
+    """
+    Picks the next task to hand to a worker.
+
+    Lanes compete by weighted round robin; within a lane, tenants compete by
+    cost-weighted deficit round robin. A task is runnable when its task type,
+    lane and tenant are all under their concurrency limits.
+    """
+
+    def __init__(
+        self,
+        broker: SchedulerBroker,
+        capacity: int = 4,
+        quantum: float = 10.0,
+        max_tenant_share: float = 0.5,
+        tenant_weights: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.broker = broker
+        self.capacity = capacity
+        self.max_tenant_share = max_tenant_share
+        self.tenant_weights = tenant_weights or {}
+        self.clock = clock
+
+        self._lanes = DeficitRoundRobin(quantum=1.0)
+        for lane, config in LANES.items():
+            self._lanes.add(lane, weight=config.weight)
+        self._tenants: Dict[Lane, DeficitRoundRobin] = {lane: DeficitRoundRobin(quantum) for lane in LANES}
+
+        self._running: Dict[str, ScheduledTask] = {}
+        self._deadlines: Dict[str, float] = {}
+        self._running_by_name: Counter = Counter()
+        self._running_by_lane: Counter = Counter()
+        self._running_by_tenant: Counter = Counter()
+        self._waits: Dict[Lane, Deque[float]] = {lane: deque(maxlen=2000) for lane in LANES}
+        self.dispatched: Counter = Counter()
+        self.reaped = 0
+
+        # Work dispatched before a restart still holds its slots
+        for task, deadline in broker.load_running():
+            self._track(task, deadline)
+
+    @property
+    def running(self) -> int:
+        return len(self._running)
+
+    def next_task(self) -> Optional[ScheduledTask]:
+        """Pop and return the next task to dispatch, or None if nothing can run now"""
+        if len(self._running) >= self.capacity:
+            return None
+
+        heads: Dict[Tuple[Lane, str], Optional[ScheduledTask]] = {}
+        for lane, tenants in self._tenants.items():
+            queued = self.broker.tenants(lane)
+            queued_set = set(queued)
+            for tenant_id in tenants.keys():
+                if tenant_id not in queued_set:
+                    tenants.remove(tenant_id)
+            for tenant_id in queued:
+                tenants.add(tenant_id, self.tenant_weights.get(tenant_id, 1.0))
+
+        # Tenant shares first; relaxed when they would leave a slot idle
+        for enforce_tenant_share in (True, False):
+            task = self._pick(heads, enforce_tenant_share)
+            if task is not None:
+                return self._dispatch(task)
+        return None
+
+    def _pick(self, heads, enforce_tenant_share: bool) -> Optional[ScheduledTask]:
+        def runnable(lane: Lane, tenant_id: str) -> Optional[ScheduledTask]:
+            if (lane, tenant_id) not in heads:
+                heads[(lane, tenant_id)] = self.broker.peek(lane, tenant_id)
+            task = heads[(lane, tenant_id)]
+            if task is None:
+                return None
+            limit = task_class(task.name).max_concurrency
+            if limit is not None and self._running_by_name[task.name] >= limit:
+                return None
+            if enforce_tenant_share and self._running_by_tenant[tenant_id] >= self._tenant_slots():
+                return None
+            return task
+
+        def lane_cost(lane: Lane) -> Optional[float]:
+            if self._running_by_lane[lane] >= self._lane_slots(lane):
+                return None
+            if any(runnable(lane, tenant_id) for tenant_id in self._tenants[lane].keys()):
+                return 1.0
+            return None
+
+        lane = self._lanes.pick(lane_cost)
+        if lane is None:
+            return None
+
+        def tenant_cost(tenant_id: str) -> Optional[float]:
+            task = runnable(lane, tenant_id)
+            return task.cost if task is not None else None
+
+        tenant_id = self._tenants[lane].pick(tenant_cost)
+        return heads[(lane, tenant_id)]
+
+    def _tenant_slots(self) -> int:
+        return max(1, int(self.capacity * self.max_tenant_share))
+
+    def _lane_slots(self, lane: Lane) -> int:
+        return max(1, int(self.capacity * LANES[lane].max_worker_share))
+
+    def _dispatch(self, task: ScheduledTask) -> ScheduledTask:
+        self.broker.pop(task.lane, task.tenant_id)
+        self.broker.release(task.tenant_id, task.lane, task.cost)
+        deadline = self.clock() + task_class(task.name).time_limit + REAP_MARGIN_SECONDS
+        self.broker.save_running(task, deadline)
+        self._track(task, deadline)
+        self._waits[task.lane].append(self.clock() - task.enqueued_at)
+        self.dispatched[task.lane] += 1
+        return task
+
+    def _track(self, task: ScheduledTask, deadline: float) -> None:
+        self._running[task.task_id] = task
+        self._deadlines[task.task_id] = deadline
+        self._running_by_name[task.name] += 1
+        self._running_by_lane[task.lane] += 1
+        self._running_by_tenant[task.tenant_id] += 1
+
+    def reap(self) -> List[ScheduledTask]:
+        """
+        Free slots of tasks past their deadline.
+
+        A worker killed by its hard time limit or the OOM killer never fires
+        task_postrun, so its completion would otherwise never arrive.
+        """
+        now = self.clock()
+        reaped = []
+        for task_id in [task_id for task_id, deadline in self._deadlines.items() if deadline <= now]:
+            task = self.complete(task_id, succeeded=False)
+            if task is not None:
+                logger.warning(f"Reclaimed slot of {task.name} ({task_id}): no completion before its deadline")
+                reaped.append(task)
+        self.reaped += len(reaped)
+        return reaped
+
+    def complete(self, task_id: str, succeeded: bool = True) -> Optional[ScheduledTask]:
+        """Free the task's slot; successful chunks are recorded in the job ledger"""
+        task = self._running.pop(task_id, None)
+        if task is None:
+            # Reaped already, or not scheduled by us
+            return None
+        del self._deadlines[task_id]
+        self.broker.drop_running(task_id)
+        self._running_by_name[task.name] -= 1
+        self._running_by_lane[task.lane] -= 1
+        self._running_by_tenant[task.tenant_id] -= 1
+        if succeeded and task.chunk_index is not None:
+            self.broker.mark_chunk_done(task.job_id, task.chunk_index)
+        return task
+
+    def stats(self) -> Dict[str, Any]:
+        def p95(waits: Deque[float]) -> Optional[float]:
+            if not waits:
+                return None
+            ordered = sorted(waits)
+            return round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 3)
+
+        return {
+            "running": len(self._running),
+            "capacity": self.capacity,
+            "reaped": self.reaped,
+            "lanes": {
+                lane.value: {
+                    "running": self._running_by_lane[lane],
+                    "dispatched": self.dispatched[lane],
+                    "queued_tenants": len(self._tenants[lane]),
+                    "p95_wait_s": p95(self._waits[lane]),
+                }
+                for lane in LANES
+            },
+        }
+
+
+# ============================================================================
+# Dispatcher
+# ============================================================================
+
+class SchedulerDispatcher:
+    """Feeds Celery from the scheduler as worker slots free up"""
+
+    def __init__(
+        self,
+        scheduler: FairScheduler,
+        send: Optional[Callable[[ScheduledTask], None]] = None,
+        poll_interval: float = 0.2,
+    ):
+        self.scheduler = scheduler
+        self.send = send or _send_to_celery
+        self.poll_interval = poll_interval
+
+    def run_once(self) -> int:
+        """Apply completions and reap lost tasks, then dispatch until no slot or runnable task is left"""
+        for task_id, succeeded in self.scheduler.broker.pop_done():
+            self.scheduler.complete(task_id, succeeded)
+        self.scheduler.reap()
+
+        dispatched = 0
+        while True:
+            task = self.scheduler.next_task()
+            if task is None:
+                return dispatched
+            try:
+                self.send(task)
+            except Exception as e:
+                logger.error(f"Dispatch of {task.name} ({task.task_id}) failed: {e}")
+                self.scheduler.complete(task.task_id, succeeded=False)
+                self.scheduler.broker.admit(task.tenant_id, task.lane, task.cost, math.inf)
+                self.scheduler.broker.push(task)
+                return dispatched
+            dispatched += 1
+
+    def run_forever(self) -> None:
+        logger.info(f"Task scheduler dispatching to {self.scheduler.capacity} worker slots")
+        last_report = time.time()
+        while True:
+            if not self.run_once():
+                time.sleep(self.poll_interval)
+            if time.time() - last_report > 60:
+                logger.info(f"Task scheduler stats: {self.scheduler.stats()}")
+                last_report = time.time()
+
+
+def _send_to_celery(task: ScheduledTask) -> None:
+    from workers.config import celery_app
+
+    celery_app.send_task(task.name, args=task.args, kwargs=task.kwargs, task_id=task.task_id)
+
+
+def install_completion_hooks(app, broker: Optional[SchedulerBroker] = None) -> None:
+    """Report finished tasks to the dispatcher (connects Celery's task_postrun)"""
+    from celery.signals import task_postrun
+
+    @task_postrun.connect(weak=False)
+    def _report_done(task_id=None, state=None, **_):
+        # A retried task runs again under the same id and keeps its slot
+        if state in ("SUCCESS", "FAILURE"):
+            try:
+                (broker or get_scheduler_broker()).push_done(task_id, state == "SUCCESS")
+            except Exception as e:
+                logger.warning(f"Could not report completion of {task_id} to the scheduler: {e}")
+
+
+# Singleton instance
+_scheduler_broker: Optional[SchedulerBroker] = None
+
+
+def get_scheduler_broker() -> SchedulerBroker:
+    """Get or create the Redis scheduler broker"""
+    global _scheduler_broker
+
+    if _scheduler_broker is None:
+        _scheduler_broker = RedisBroker(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    return _scheduler_broker
+
+
+def reset_scheduler_broker() -> None:
+    """Reset the singleton (for tests)"""
+    global _scheduler_broker
+    _scheduler_broker = None
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    SchedulerDispatcher(
+        FairScheduler(get_scheduler_broker(), capacity=int(os.getenv("SCHEDULER_WORKER_SLOTS", "4")))
+    ).run_forever()
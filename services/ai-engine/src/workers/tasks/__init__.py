@@ -6,6 +6,7 @@ Task modules for async processing:
 - ingestion_tasks: Document processing and embedding
 - discovery_tasks: Ontology discovery and personalization
 - cleanup_tasks: Maintenance and archival
+- scheduling_tasks: Hand-off to the tenant-fair scheduler (beat entries)
 """
 
 __all__ = [
@@ -13,6 +14,7 @@ __all__ = [
     "ingestion_tasks",
     "discovery_tasks",
     "cleanup_tasks",
+    "scheduling_tasks",
 ]
 
 
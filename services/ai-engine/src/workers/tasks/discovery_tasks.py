@@ -6,6 +6,7 @@ These are long-running analysis jobs.
 """
 
 import logging
+import os
 from typing import Dict, Any
 
 from celery import shared_task
@@ -118,20 +119,62 @@ def update_personalization(
         raise self.retry(exc=e)
 
 
+@shared_task(
+    bind=True,
+    name="refresh_recommendation_model",
+    max_retries=2,
+    soft_time_limit=1800,
+    time_limit=1900,
+)
+def refresh_recommendation_model(self, page_size: int = 50000) -> Dict[str, Any]:
+    """
+    Fold new agent interactions into the recommendation model and republish it.
 
+    Builder state is kept next to the artifact so each run only reads
+    interactions past the previous watermark. Scheduled by celery beat every
+    RECOMMENDATION_REFRESH_INTERVAL_SECONDS (see workers/config.py).
 
+    Both paths must be on a volume shared with the API replicas; a run that
+    finds another refresh holding the state lock is skipped.
+    """
+    import asyncio
+    import asyncpg
+    from services.agents.recommendation_model import RecommendationModelBuilder, refresh_lock
+
+    model_path = os.getenv("RECOMMENDATION_MODEL_PATH")
+    database_url = os.getenv("DATABASE_URL")
+    if not model_path or not database_url:
+        logger.warning("Recommendation model refresh skipped: RECOMMENDATION_MODEL_PATH or DATABASE_URL not set")
+        return {"status": "skipped"}
+    state_path = os.getenv("RECOMMENDATION_MODEL_STATE_PATH", f"{model_path}.state.npz")
+
+    async def _run() -> Dict[str, Any]:
+        pool = await asyncpg.create_pool(database_url, min_size=1, max_size=2, command_timeout=600)
+        try:
+            builder = RecommendationModelBuilder.load_state(state_path)
+            applied = await builder.refresh(pool, page_size=page_size)
+            agents_meta = await RecommendationModelBuilder.fetch_agents_meta(pool)
+        finally:
+            await pool.close()
+
+        model = builder.build(agents_meta=agents_meta)
+        model.save(model_path)
+        builder.save_state(state_path)
+        return {
+            "status": "completed",
+            "applied": applied,
+            "agents": model.n_agents,
+            "neighbors": model.nnz,
+        }
 
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+    try:
+        with refresh_lock(state_path) as acquired:
+            if not acquired:
+                logger.info("Recommendation model refresh skipped: another refresh holds the state lock")
+                return {"status": "skipped", "reason": "refresh_in_progress"}
+            result = asyncio.run(_run())
+        logger.info(f"Recommendation model refreshed: {result}")
+        return result
+    except Exception as e:
+        logger.exception(f"Recommendation model refresh failed: {str(e)}")
+        raise self.retry(exc=e)
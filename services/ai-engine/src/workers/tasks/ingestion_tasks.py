@@ -136,11 +136,18 @@ def reindex_knowledge_base(
     job_id: str,
     tenant_id: str,
     domain_id: str = None,
+    document_ids: List[str] = None,
+    chunk: Dict[str, Any] = None,
 ) -> Dict[str, Any]:
     """
     Reindex all documents in a knowledge domain.
     
     Used when embedding model changes or for maintenance.
+    
+    When submitted through workers.scheduling with document_ids, the job is
+    split into chunks; ``chunk`` ({"job_id", "index", "count"}) identifies
+    this slice. Each chunk records its outcome in the scheduler's chunk
+    ledger, and the job completes only once all chunks succeeded.
     """
     from core.context import set_tenant_context
     from infrastructure.database.repositories.job_repo import JobRepository
@@ -151,13 +158,20 @@ def reindex_knowledge_base(
     job_repo = JobRepository()
     
     try:
-        job_repo.update_status(job_id, "running", progress={
-            "currentStep": 0,
-            "currentStepDescription": "Starting reindex...",
-        })
+        if chunk:
+            job_repo.update_status(job_id, "running", progress={
+                "currentStep": chunk["index"] + 1,
+                "totalSteps": chunk["count"],
+                "currentStepDescription": f"Reindexing chunk {chunk['index'] + 1}/{chunk['count']}...",
+            })
+        else:
+            job_repo.update_status(job_id, "running", progress={
+                "currentStep": 0,
+                "currentStepDescription": "Starting reindex...",
+            })
         
         # TODO: Implement reindexing
-        # 1. Get all documents for domain
+        # 1. Get all documents for domain (or just document_ids)
         # 2. For each document, regenerate embeddings
         # 3. Update vectors in database
         
@@ -167,15 +181,30 @@ def reindex_knowledge_base(
             "vectors_updated": 0,
         }
         
-        job_repo.complete(job_id, result)
+        if not chunk:
+            job_repo.complete(job_id, result)
+        else:
+            # Chunks run concurrently: whichever finishes the set completes the job
+            done, failed = _finish_chunk(chunk, succeeded=True)
+            if done >= chunk["count"] and not failed:
+                job_repo.complete(job_id, result)
         return result
         
     except Exception as e:
         logger.exception(f"Reindexing failed for job {job_id}: {str(e)}")
-        job_repo.fail(job_id, str(e), is_retryable=False)
+        if chunk:
+            _finish_chunk(chunk, succeeded=False)
+        job_repo.fail(job_id, str(e), is_retryable=bool(chunk))
         raise
 
 
+def _finish_chunk(chunk: Dict[str, Any], succeeded: bool):
+    """Record a chunk outcome in the job's ledger; returns (done, failed) counts"""
+    from workers.scheduling import get_scheduler_broker
+    
+    return get_scheduler_broker().finish_chunk(chunk["job_id"], chunk["index"], succeeded)
+
+
 
 
 
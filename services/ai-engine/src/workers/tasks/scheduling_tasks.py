@@ -0,0 +1,36 @@
+"""
+VITAL Path - Scheduling Tasks
+
+Entry points that hand work to the tenant-fair scheduler
+(workers/scheduling.py) instead of a Celery queue.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="submit_scheduled_task")
+def submit_scheduled_task(
+    name: str,
+    tenant_id: Optional[str] = None,
+    kwargs: Optional[Dict[str, Any]] = None,
+) -> List[str]:
+    """
+    Queue a periodic task through the fair scheduler.
+
+    Celery beat targets this task when TASK_SCHEDULER_ENABLED=true, so
+    periodic work takes its lane and concurrency cap like any other
+    producer's.
+    """
+    from workers.scheduling import AdmissionRejected, submit_task
+
+    try:
+        return submit_task(name, tenant_id, kwargs=kwargs)
+    except AdmissionRejected as e:
+        # Earlier runs are still queued; this one is superseded
+        logger.info(f"Periodic {name} not queued: {e}")
+        return []
@@ -7,16 +7,23 @@ Background tasks for calculating agent synergy scores based on:
 - Complementary capabilities
 - Conflict detection
 
+All pairs are scored as a blocked matrix job: co-occurrence is held as a
+sparse upper-triangular matrix, domain/capability overlap is computed with
+popcounts over packed bitsets, and only pairs whose score moved by more than
+SCORE_EPSILON are written back, in bulk upsert batches.
+
 Stage 4: Integration & Sync
 Reference: AGENT_IMPLEMENTATION_PLAN.md (Task 4.3)
 """
 
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 import structlog
 import math
 
+import numpy as np
+
 logger = structlog.get_logger()
 
 
@@ -34,6 +41,66 @@ class SynergyCalculation:
     calculation_details: Dict[str, Any]
 
 
+class PairMatrix:
+    """
+    Sparse upper-triangular pair matrix in CSR layout (i < j).
+
+    Holds one or more per-pair value arrays that share the same sparsity
+    pattern, and densifies row blocks on demand.
+    """
+
+    def __init__(self, n: int, rows: np.ndarray, cols: np.ndarray, **values: np.ndarray):
+        order = np.lexsort((cols, rows))
+        self.n = n
+        self.cols = cols[order]
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=self.indptr[1:])
+        self.values = {name: array[order] for name, array in values.items()}
+
+    @classmethod
+    def empty(cls, n: int, *names: str) -> "PairMatrix":
+        blank = np.zeros(0, dtype=np.int64)
+        return cls(n, blank, blank, **{name: np.zeros(0) for name in names})
+
+    @property
+    def nnz(self) -> int:
+        return len(self.cols)
+
+    def dense_block(self, start: int, end: int, name: str, fill: float = 0.0) -> np.ndarray:
+        """Dense (end - start) x n view of ``name`` for rows [start, end)."""
+        block = np.full((end - start, self.n), fill, dtype=np.float64)
+        lo, hi = self.indptr[start], self.indptr[end]
+        if hi > lo:
+            local_rows = np.repeat(np.arange(end - start), np.diff(self.indptr[start:end + 1]))
+            block[local_rows, self.cols[lo:hi]] = self.values[name][lo:hi]
+        return block
+
+
+def _pack_bitsets(members: List[Iterable[str]]) -> Tuple[np.ndarray, Dict[str, int]]:
+    """Pack per-agent string sets into an (n, words) uint64 bitset matrix."""
+    vocabulary: Dict[str, int] = {}
+    rows: List[int] = []
+    bits: List[int] = []
+    for i, values in enumerate(members):
+        for value in set(values):
+            rows.append(i)
+            bits.append(vocabulary.setdefault(value, len(vocabulary)))
+
+    words = max(1, -(-len(vocabulary) // 64))
+    dense = np.zeros((len(members), words * 64), dtype=np.uint8)
+    dense[rows, bits] = 1
+    packed = np.packbits(dense, axis=1, bitorder="little")
+    return packed.view(np.uint64), vocabulary
+
+
+def _jaccard_block(bitsets: np.ndarray, counts: np.ndarray, start: int, end: int) -> np.ndarray:
+    """Jaccard overlap of rows [start, end) against all rows; 0.5 where both sets are empty."""
+    inter = np.bitwise_count(bitsets[start:end, None, :] & bitsets[None, :, :]).sum(axis=2, dtype=np.int64)
+    union = counts[start:end, None] + counts[None, :] - inter
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(union > 0, inter / np.maximum(union, 1), 0.5)
+
+
 class SynergyCalculationService:
     """
     Service for calculating and updating agent synergy scores.
@@ -55,6 +122,23 @@ class SynergyCalculationService:
     
     # Minimum sessions to calculate reliable synergy
     MIN_CO_OCCURRENCES = 3
+
+    # Conflicting domain pairs (lowercased)
+    CONFLICTING_DOMAIN_PAIRS = (
+        ('conservative', 'aggressive'),
+        ('regulatory', 'experimental'),
+        ('safety-first', 'speed-first'),
+    )
+
+    # Only rewrite pairs whose score moved by more than this
+    SCORE_EPSILON = 0.005
+
+    # Rows per bulk upsert / per existing-synergy page
+    UPSERT_BATCH_SIZE = 500
+    FETCH_PAGE_SIZE = 1000
+
+    # Upper bound on the (rows x agents x bitset words) working set per block
+    BLOCK_WORKING_SET = 4_000_000
     
     def __init__(self, supabase_client):
         """
@@ -70,6 +154,7 @@ class SynergyCalculationService:
         self,
         tenant_id: Optional[str] = None,
         lookback_days: int = 90,
+        epsilon: Optional[float] = None,
     ) -> Dict[str, Any]:
         """
         Calculate synergy scores for all agent pairs.
@@ -77,10 +162,14 @@ class SynergyCalculationService:
         Args:
             tenant_id: Optional tenant filter
             lookback_days: Days to look back for session data
+            epsilon: Minimum score change that triggers a write
+                (defaults to SCORE_EPSILON)
             
         Returns:
             Calculation statistics
         """
+        epsilon = self.SCORE_EPSILON if epsilon is None else epsilon
+
         logger.info(
             "synergy_calculate_all_started",
             tenant_id=tenant_id,
@@ -91,52 +180,54 @@ class SynergyCalculationService:
             'pairs_analyzed': 0,
             'synergies_created': 0,
             'synergies_updated': 0,
+            'synergies_unchanged': 0,
+            'upsert_batches': 0,
             'errors': [],
             'started_at': datetime.utcnow().isoformat(),
         }
         
         try:
-            # Step 1: Get all active agents
+            # Step 1: Get all active agents (sorted so i < j means id_i < id_j)
             agents = await self._get_active_agents(tenant_id)
+            agents = sorted(agents, key=lambda a: str(a['id']))
             
             if len(agents) < 2:
                 stats['message'] = 'Not enough agents for synergy calculation'
                 return stats
             
-            # Step 2: Get session co-occurrence data
+            index = {str(agent['id']): i for i, agent in enumerate(agents)}
+
+            # Step 2: Get session co-occurrence data and the stored scores
             cutoff_date = datetime.utcnow() - timedelta(days=lookback_days)
             co_occurrences = await self._get_co_occurrences(tenant_id, cutoff_date)
+            co_matrix = self._build_co_occurrence_matrix(co_occurrences, index)
+            existing = await self._get_existing_synergies(tenant_id, index)
             
-            # Step 3: Calculate synergy for each pair
-            for i, agent_a in enumerate(agents):
-                for agent_b in agents[i+1:]:
-                    stats['pairs_analyzed'] += 1
-                    
-                    try:
-                        synergy = await self._calculate_pair_synergy(
-                            agent_a, agent_b, co_occurrences
-                        )
-                        
-                        if synergy:
-                            result = await self._upsert_synergy(synergy, tenant_id)
-                            if result.get('created'):
-                                stats['synergies_created'] += 1
-                            else:
-                                stats['synergies_updated'] += 1
-                                
-                    except Exception as e:
-                        logger.warning(
-                            "synergy_pair_calculation_failed",
-                            agent_a=agent_a['id'],
-                            agent_b=agent_b['id'],
-                            error=str(e),
-                        )
-                        stats['errors'].append(f"{agent_a['id']}-{agent_b['id']}: {str(e)}")
+            # Step 3: Score all pairs block by block, keep only changed pairs
+            pending: List[Dict[str, Any]] = []
+            for rows, created in self._iter_changed_rows(agents, co_matrix, existing, epsilon, stats):
+                if tenant_id:
+                    for row in rows:
+                        row['tenant_id'] = tenant_id
+                pending.extend(rows)
+                stats['synergies_created'] += created
+                stats['synergies_updated'] += len(rows) - created
+
+                while len(pending) >= self.UPSERT_BATCH_SIZE:
+                    await self._upsert_synergy_batch(pending[:self.UPSERT_BATCH_SIZE], stats)
+                    del pending[:self.UPSERT_BATCH_SIZE]
+
+            if pending:
+                await self._upsert_synergy_batch(pending, stats)
             
             stats['completed_at'] = datetime.utcnow().isoformat()
-            stats['success'] = True
+            stats['success'] = not stats['errors']
             
-            logger.info("synergy_calculate_all_completed", **stats)
+            logger.info(
+                "synergy_calculate_all_completed",
+                **{k: v for k, v in stats.items() if k != 'errors'},
+                error_count=len(stats['errors']),
+            )
             
         except Exception as e:
             logger.error("synergy_calculate_all_failed", error=str(e))
@@ -144,7 +235,146 @@ class SynergyCalculationService:
             stats['success'] = False
         
         return stats
-    
+
+    def _build_co_occurrence_matrix(
+        self,
+        co_occurrences: Dict[Tuple[str, str], Dict[str, Any]],
+        index: Dict[str, int],
+    ) -> PairMatrix:
+        """
+        Sparse co-occurrence matrix (count, success rate) over agent indexes.
+
+        Pairs involving inactive agents are ignored.
+        """
+        rows, cols, counts, success = [], [], [], []
+        for (agent_a, agent_b), data in co_occurrences.items():
+            i, j = index.get(str(agent_a)), index.get(str(agent_b))
+            if i is None or j is None or i == j:
+                continue
+            satisfaction = data.get('avg_satisfaction')
+            rate = 0.5 if satisfaction is None else satisfaction
+            if data.get('avg_response_quality'):
+                rate = (rate + data['avg_response_quality']) / 2
+            rows.append(min(i, j))
+            cols.append(max(i, j))
+            counts.append(data.get('count', 0) or 0)
+            success.append(rate)
+
+        if not rows:
+            return PairMatrix.empty(len(index), 'count', 'success_rate')
+        return PairMatrix(
+            len(index),
+            np.asarray(rows, dtype=np.int64),
+            np.asarray(cols, dtype=np.int64),
+            count=np.asarray(counts, dtype=np.float64),
+            success_rate=np.asarray(success, dtype=np.float64),
+        )
+
+    def _iter_changed_rows(
+        self,
+        agents: List[Dict[str, Any]],
+        co_matrix: PairMatrix,
+        existing: PairMatrix,
+        epsilon: float,
+        stats: Dict[str, Any],
+    ):
+        """
+        Yield (rows, created_count) of upsert payloads per row block.
+
+        Every block scores rows [start, end) against all agents with j > i,
+        using the same formula as _calculate_pair_synergy.
+        """
+        n = len(agents)
+        domains = [list(a.get('domains', []) or []) for a in agents]
+        capabilities = [list(a.get('capabilities', []) or []) for a in agents]
+
+        domain_bits, _ = _pack_bitsets(domains)
+        cap_bits, _ = _pack_bitsets(capabilities)
+        domain_counts = np.array([len(set(d)) for d in domains], dtype=np.int64)
+        cap_counts = np.array([len(set(c)) for c in capabilities], dtype=np.int64)
+
+        # Conflict membership vectors per conflicting pair (lowercased domains)
+        lowered = [set(d.lower() for d in values) for values in domains]
+        conflict_vectors = [
+            (np.array([a in ds for ds in lowered]), np.array([b in ds for ds in lowered]))
+            for a, b in self.CONFLICTING_DOMAIN_PAIRS
+        ]
+
+        words = max(domain_bits.shape[1], cap_bits.shape[1])
+        block = max(1, min(n, self.BLOCK_WORKING_SET // (n * words)))
+        co_norm = math.log(1 + self.MIN_CO_OCCURRENCES * 10)
+        columns = np.arange(n)
+        ids_array = np.array([str(a['id']) for a in agents], dtype=object)
+        now = datetime.utcnow().isoformat()
+        w = self.WEIGHTS
+
+        for start in range(0, n - 1, block):
+            end = min(n, start + block)
+            upper = columns[None, :] > np.arange(start, end)[:, None]
+            stats['pairs_analyzed'] += int(upper.sum())
+
+            # Co-occurrence and success rate
+            count = co_matrix.dense_block(start, end, 'count')
+            success_rate = co_matrix.dense_block(start, end, 'success_rate', fill=0.5)
+            co_score = np.where(count > 0, np.minimum(1.0, np.log1p(count) / co_norm), 0.0)
+
+            # Complementary capabilities (peaks at ~30% overlap)
+            domain_overlap = _jaccard_block(domain_bits, domain_counts, start, end)
+            cap_overlap = _jaccard_block(cap_bits, cap_counts, start, end)
+            complementary = np.clip(
+                ((1.0 - np.abs(domain_overlap - 0.3) * 1.5) + (1.0 - np.abs(cap_overlap - 0.3) * 1.5)) / 2,
+                0.0, 1.0,
+            )
+
+            # Conflicts
+            conflicts = np.zeros((end - start, n), dtype=np.int64)
+            for has_a, has_b in conflict_vectors:
+                conflicts += (has_a[start:end, None] & has_b[None, :]) | (has_b[start:end, None] & has_a[None, :])
+            conflict_score = np.minimum(1.0, conflicts * 0.4)
+
+            synergy = np.clip(
+                w['co_occurrence'] * co_score
+                + w['success_rate'] * success_rate
+                + w['complementary'] * complementary
+                - w['conflict_penalty'] * conflict_score,
+                0.0, 1.0,
+            )
+            recommended = (
+                (synergy >= 0.6)
+                & (count >= self.MIN_CO_OCCURRENCES)
+                & (conflict_score < 0.3)
+            )
+
+            # Diff against stored scores
+            stored = existing.dense_block(start, end, 'present') > 0
+            changed = upper & (
+                ~stored
+                | (np.abs(synergy - existing.dense_block(start, end, 'synergy_score')) > epsilon)
+                | (recommended != (existing.dense_block(start, end, 'is_recommended') > 0))
+            )
+            stats['synergies_unchanged'] += int((upper & ~changed).sum())
+
+            local_rows, cols = np.nonzero(changed)
+            if not len(cols):
+                continue
+            keys = (
+                'agent_a_id', 'agent_b_id', 'synergy_score', 'co_occurrence_count', 'success_rate',
+                'complementary_score', 'conflict_score', 'is_recommended', 'last_calculated_at',
+            )
+            columns_out = (
+                ids_array[start + local_rows].tolist(),
+                ids_array[cols].tolist(),
+                synergy[local_rows, cols].tolist(),
+                count[local_rows, cols].astype(np.int64).tolist(),
+                success_rate[local_rows, cols].tolist(),
+                complementary[local_rows, cols].tolist(),
+                conflict_score[local_rows, cols].tolist(),
+                recommended[local_rows, cols].tolist(),
+                [now] * len(cols),
+            )
+            rows = [dict(zip(keys, values)) for values in zip(*columns_out)]
+            yield rows, int((~stored[local_rows, cols]).sum())
+
     async def _get_active_agents(
         self, 
         tenant_id: Optional[str]
@@ -199,6 +429,61 @@ class SynergyCalculationService:
             # Return empty if RPC doesn't exist yet
             return {}
     
+    async def _get_existing_synergies(
+        self,
+        tenant_id: Optional[str],
+        index: Dict[str, int],
+    ) -> PairMatrix:
+        """
+        Load stored scores as a sparse matrix for diffing.
+
+        Returns an empty matrix if the table cannot be read, in which case
+        every pair is treated as new.
+        """
+        rows, cols, scores, recommended = [], [], [], []
+        offset = 0
+        try:
+            while True:
+                query = self.supabase.table('agent_synergies').select(
+                    'agent_a_id, agent_b_id, synergy_score, is_recommended'
+                )
+                if tenant_id:
+                    query = query.eq('tenant_id', tenant_id)
+                page = query.range(offset, offset + self.FETCH_PAGE_SIZE - 1).execute().data or []
+
+                # Map each page to compact arrays; stored pairs can number millions
+                a = np.array([index.get(str(row['agent_a_id']), -1) for row in page], dtype=np.int64)
+                b = np.array([index.get(str(row['agent_b_id']), -1) for row in page], dtype=np.int64)
+                keep = (a >= 0) & (b >= 0) & (a != b)
+                if keep.any():
+                    rows.append(np.minimum(a, b)[keep])
+                    cols.append(np.maximum(a, b)[keep])
+                    scores.append(np.array(
+                        [row.get('synergy_score') or 0.0 for row in page], dtype=np.float64
+                    )[keep])
+                    recommended.append(np.array(
+                        [1.0 if row.get('is_recommended') else 0.0 for row in page]
+                    )[keep])
+
+                if len(page) < self.FETCH_PAGE_SIZE:
+                    break
+                offset += self.FETCH_PAGE_SIZE
+        except Exception as e:
+            logger.warning("get_existing_synergies_failed", error=str(e))
+            return PairMatrix.empty(len(index), 'present', 'synergy_score', 'is_recommended')
+
+        if not rows:
+            return PairMatrix.empty(len(index), 'present', 'synergy_score', 'is_recommended')
+        rows_array = np.concatenate(rows)
+        return PairMatrix(
+            len(index),
+            rows_array,
+            np.concatenate(cols),
+            present=np.ones(len(rows_array)),
+            synergy_score=np.concatenate(scores),
+            is_recommended=np.concatenate(recommended),
+        )
+    
     async def _calculate_pair_synergy(
         self,
         agent_a: Dict[str, Any],
@@ -325,18 +610,11 @@ class SynergyCalculationService:
         Currently based on domain incompatibilities.
         Could be extended with personality conflicts, etc.
         """
-        # Define conflicting domain pairs
-        conflicting_pairs = {
-            ('conservative', 'aggressive'),
-            ('regulatory', 'experimental'),
-            ('safety-first', 'speed-first'),
-        }
-        
         domains_a = set(d.lower() for d in (agent_a.get('domains', []) or []))
         domains_b = set(d.lower() for d in (agent_b.get('domains', []) or []))
         
         conflict_count = 0
-        for conflict_a, conflict_b in conflicting_pairs:
+        for conflict_a, conflict_b in self.CONFLICTING_DOMAIN_PAIRS:
             if (conflict_a in domains_a and conflict_b in domains_b) or \
                (conflict_b in domains_a and conflict_a in domains_b):
                 conflict_count += 1
@@ -344,43 +622,21 @@ class SynergyCalculationService:
         # Normalize conflict score
         return min(1.0, conflict_count * 0.4)
     
-    async def _upsert_synergy(
+    async def _upsert_synergy_batch(
         self,
-        synergy: SynergyCalculation,
-        tenant_id: Optional[str],
-    ) -> Dict[str, Any]:
-        """Upsert synergy record to database."""
-        
-        # Ensure consistent ordering (alphabetical by ID)
-        agent_ids = sorted([synergy.agent_a_id, synergy.agent_b_id])
-        
-        data = {
-            'agent_a_id': agent_ids[0],
-            'agent_b_id': agent_ids[1],
-            'synergy_score': synergy.synergy_score,
-            'co_occurrence_count': synergy.co_occurrence_count,
-            'success_rate': synergy.success_rate,
-            'complementary_score': synergy.complementary_score,
-            'conflict_score': synergy.conflict_score,
-            'is_recommended': synergy.is_recommended,
-            'last_calculated_at': datetime.utcnow().isoformat(),
-        }
-        
-        if tenant_id:
-            data['tenant_id'] = tenant_id
-        
+        rows: List[Dict[str, Any]],
+        stats: Dict[str, Any],
+    ) -> None:
+        """Bulk upsert one batch of synergy rows; failures are recorded, not raised."""
         try:
-            # Try upsert
-            result = self.supabase.table('agent_synergies').upsert(
-                data,
+            self.supabase.table('agent_synergies').upsert(
+                rows,
                 on_conflict='agent_a_id,agent_b_id'
             ).execute()
-            
-            return {'created': True, 'data': result.data}
-            
+            stats['upsert_batches'] += 1
         except Exception as e:
-            logger.error("upsert_synergy_failed", error=str(e))
-            raise
+            logger.error("upsert_synergy_batch_failed", batch_size=len(rows), error=str(e))
+            stats['errors'].append(f"upsert batch of {len(rows)} failed: {str(e)}")
     
     async def get_synergies_for_agent(
         self,
@@ -448,7 +704,7 @@ def calculate_synergies_task(tenant_id: Optional[str] = None, lookback_days: int
     Celery task wrapper for synergy calculation.
     
     Usage:
-        calculate_synergies_task.delay(tenant_id='xxx')
+        dispatch_task("calculate_synergies_task", "xxx", kwargs={"tenant_id": "xxx"})  # workers.scheduling
     """
     import asyncio
     from services.supabase_client import get_supabase_client
@@ -0,0 +1,213 @@
+"""
+Unit Tests for AgentCatalogService
+
+Tests cover:
+- Per-tenant snapshots with tier/domain/status indexes
+- Immutability and consistent reads across refreshes
+- Watermark delta refresh (updates, new agents, tenant moves, no-op re-reads)
+- DELETE notifications forcing a full reload
+- Stale-read age
+- AgentLoader reading through the catalog with zero I/O
+
+Run with: pytest tests/unit/test_agent_catalog.py -v
+"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from services.shared import agent_catalog as catalog_module
+from services.shared.agent_catalog import AgentCatalogService
+
+
+LEVELS = [{"id": "lvl-1", "level_number": 1}, {"id": "lvl-2", "level_number": 2}]
+
+
+class FakeSupabase:
+    """agents / agent_levels tables with gte + range support; counts queries"""
+
+    def __init__(self, agents):
+        self.agents = {a["id"]: dict(a) for a in agents}
+        self.queries = 0
+
+    def table(self, name):
+        return _Query(self, name)
+
+
+class _Query:
+    def __init__(self, db, name):
+        self.db, self.name = db, name
+        self.min_updated = None
+        self.window = None
+
+    def select(self, *_):
+        return self
+
+    def gte(self, column, value):
+        self.min_updated = value
+        return self
+
+    def order(self, *_):
+        return self
+
+    def range(self, start, end):
+        self.window = (start, end)
+        return self
+
+    def execute(self):
+        self.db.queries += 1
+        if self.name == "agent_levels":
+            return MagicMock(data=LEVELS)
+        rows = sorted(self.db.agents.values(), key=lambda r: r["id"])
+        if self.min_updated:
+            rows = [r for r in rows if r["updated_at"] >= self.min_updated]
+        if self.window:
+            rows = rows[self.window[0]:self.window[1] + 1]
+        return MagicMock(data=[dict(r) for r in rows])
+
+
+def _agent(agent_id, tenant="t1", updated="2026-01-01T00:00:00", **kwargs):
+    row = {
+        "id": agent_id, "name": agent_id.title(), "tenant_id": tenant, "status": "active",
+        "agent_level_id": "lvl-2", "domains": ["Oncology"], "updated_at": updated,
+        "description": f"{agent_id} agent",
+    }
+    row.update(kwargs)
+    return row
+
+
+@pytest.fixture
+def db():
+    return FakeSupabase([
+        _agent("a1", domains=["Oncology", "HEOR"]),
+        _agent("a2", agent_level_id="lvl-1", status="inactive"),
+        _agent("a3", tenant="t2"),
+        _agent("g1", tenant=None, agent_level_id=None, metadata={"tier": 3}),
+    ])
+
+
+@pytest.fixture
+async def catalog(db):
+    catalog = AgentCatalogService(db, page_size=2)
+    await catalog.load()
+    return catalog
+
+
+class TestSnapshots:
+    async def test_scopes_and_indexes(self, catalog):
+        t1 = catalog.snapshot("t1")
+        assert set(t1.agents) == {"a1", "a2"}
+        assert t1.by_tier[1] == ("a2",)
+        assert t1.by_status["inactive"] == ("a2",)
+        assert t1.by_domain["heor"] == ("a1",)
+        assert [r["id"] for r in t1.select(status="active", domain="oncology")] == ["a1"]
+        assert catalog.snapshot(None).by_tier[3] == ("g1",)
+        assert len(catalog.snapshot("unknown")) == 0
+
+    async def test_rows_are_read_only(self, catalog):
+        with pytest.raises(TypeError):
+            catalog.get_agent("a1")["name"] = "changed"
+
+    async def test_lookup_across_scopes(self, catalog):
+        assert catalog.get_agent("a3")["tenant_id"] == "t2"
+        assert set(catalog.get_agents(["a1", "g1", "missing"])) == {"a1", "g1"}
+
+
+class TestRefresh:
+    async def test_delta_refresh_swaps_new_snapshot(self, catalog, db):
+        before = catalog.snapshot("t1")
+        db.agents["a1"].update(name="Renamed", updated_at="2026-02-01T00:00:00")
+        db.agents["a4"] = _agent("a4", updated="2026-02-01T00:00:00")
+
+        assert await catalog.refresh() == 2
+
+        after = catalog.snapshot("t1")
+        assert after.version == before.version + 1
+        assert after.get("a1")["name"] == "Renamed"
+        assert "a4" in after.agents
+        # Readers holding the old snapshot still see a consistent view
+        assert before.get("a1")["name"] == "A1" and "a4" not in before.agents
+        # Untouched tenants keep their snapshot object
+        assert catalog.snapshot("t2") is catalog.snapshot("t2")
+
+    async def test_boundary_reread_is_not_a_change(self, catalog):
+        version = catalog.snapshot("t1").version
+        assert await catalog.refresh() == 0
+        assert catalog.snapshot("t1").version == version
+
+    async def test_tenant_move(self, catalog, db):
+        db.agents["a1"].update(tenant_id="t2", updated_at="2026-03-01T00:00:00")
+        await catalog.refresh()
+        assert "a1" not in catalog.snapshot("t1").agents
+        assert "a1" in catalog.snapshot("t2").agents
+
+    async def test_delete_notification_forces_full_reload(self, catalog, db):
+        del db.agents["a3"]
+        catalog.notify('{"op": "DELETE", "id": "a3", "tenant_id": "t2"}')
+        await catalog.refresh()
+        assert catalog.get_agent("a3") is None
+        assert "t2" not in catalog.scopes()
+
+    async def test_loop_wakes_on_notify(self, db):
+        catalog = AgentCatalogService(db, poll_interval_seconds=60)
+        await catalog.start()
+        db.agents["a5"] = _agent("a5", updated="2026-04-01T00:00:00")
+        catalog.notify('{"op": "INSERT", "id": "a5"}')
+        await asyncio.sleep(0.05)
+        assert catalog.get_agent("a5") is not None
+        await catalog.shutdown()
+
+    async def test_stale_seconds(self, db):
+        catalog = AgentCatalogService(db, poll_interval_seconds=0.01)
+        assert catalog.stale_seconds() == float("inf")
+        assert not catalog.is_fresh()
+        await catalog.load()
+        assert catalog.stale_seconds() < 1 and catalog.is_fresh()
+        await asyncio.sleep(0.05)
+        assert not catalog.is_fresh()
+
+    async def test_staleness_gauge_is_computed_at_scrape_time(self, db, monkeypatch):
+        gauge = MagicMock()
+        monkeypatch.setattr(catalog_module, "AGENT_CATALOG_STALE_SECONDS", gauge)
+        catalog = AgentCatalogService(db, poll_interval_seconds=60)
+        await catalog.start()
+        (read,), _ = gauge.set_function.call_args
+        first = read()
+        await asyncio.sleep(0.05)
+        assert read() > first  # Ages between polls without a refresh
+        await catalog.shutdown()
+
+
+class TestAgentLoaderIntegration:
+    async def test_get_agent_reads_catalog_without_io(self, catalog, db, monkeypatch):
+        from infrastructure.database.agent_loader import AgentLoader
+
+        monkeypatch.setattr(catalog_module, "_agent_catalog", catalog)
+        loader = AgentLoader()
+        loader._initialized = True
+        loader._levels_cache = {"lvl-2": {"level_number": 2, "level_name": "Expert"}}
+        queries = db.queries
+
+        first = await loader.get_agent("a1")
+        assert first.name == "A1" and first.tenant_id == "t1"
+        assert await loader.get_agent("a1") is first
+        assert db.queries == queries
+
+        db.agents["a1"].update(name="Renamed", updated_at="2026-05-01T00:00:00")
+        await catalog.refresh()
+        assert (await loader.get_agent("a1")).name == "Renamed"
+
+    async def test_expert_lookup_uses_catalog(self, catalog, monkeypatch):
+        from infrastructure.database.agent_loader import AgentLoader
+
+        monkeypatch.setattr(catalog_module, "_agent_catalog", catalog)
+        loader = AgentLoader()
+        loader._initialized = True
+        loader._levels_cache = {
+            "lvl-1": {"level_number": 1}, "lvl-2": {"level_number": 2},
+        }
+
+        expert = await loader.get_expert_for_domain("t1", function_name=None)
+        assert expert.id == "a1"
+        assert await loader.get_orchestrator_for_context("t1") is None  # a2 is inactive
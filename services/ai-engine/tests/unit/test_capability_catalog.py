@@ -0,0 +1,258 @@
+"""
+Unit Tests for CapabilityCatalog
+
+Tests cover:
+- BM25 ranking (name matches outrank description-only matches)
+- Prefix expansion for partial query words, ranked below exact matches
+- Faceted filtering via bitsets (scalar and multi-valued facets)
+- Incremental upsert/remove with content-hash change detection
+- Optional embedding index blending
+- SkillsLoaderService incremental reload of changed MD files
+- ToolRegistryService catalog load at initialization (sync client off-loop)
+
+Run with: pytest tests/unit/test_capability_catalog.py -v
+"""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from services.shared.capability_catalog import CapabilityCatalog, CatalogEntry, tokenize
+from services.shared.skills_loader_service import SkillsLoaderService
+
+
+def _entry(entry_id, name, description="", kind="skill", **facets):
+    return CatalogEntry(kind=kind, id=entry_id, name=name, description=description, facets=facets)
+
+
+@pytest.fixture
+def catalog():
+    catalog = CapabilityCatalog()
+    catalog.upsert_many([
+        _entry("lit_search", "Literature Search", "Search PubMed for clinical evidence",
+               category="search", level=[3, 4], complexity="intermediate"),
+        _entry("safety_review", "Safety Signal Review", "Review adverse events and literature",
+               category="analysis", level=[2, 3], complexity="advanced"),
+        _entry("draft_report", "Draft Report", "Generate a regulatory report",
+               category="generation", level=[2], complexity="advanced"),
+        _entry("web_search", "Web Search", "General web search", kind="tool", category="search"),
+    ])
+    return catalog
+
+
+class TestTokenize:
+    def test_lowercases_and_drops_stopwords(self):
+        assert tokenize("The Search of PubMed_Data") == ["search", "pubmed", "data"]
+
+
+class TestSearch:
+    def test_name_match_ranks_first(self, catalog):
+        hits = catalog.search("literature", kind="skill")
+        assert [h.entry.id for h in hits] == ["lit_search", "safety_review"]
+        assert hits[0].score > hits[1].score
+
+    def test_kind_filter(self, catalog):
+        hits = catalog.search("search", kind="tool")
+        assert [h.entry.id for h in hits] == ["web_search"]
+
+    def test_multi_valued_facet(self, catalog):
+        hits = catalog.search("", kind="skill", filters={"level": 2})
+        assert {h.entry.id for h in hits} == {"safety_review", "draft_report"}
+
+    def test_facet_list_matches_any(self, catalog):
+        hits = catalog.search("", filters={"category": ["search", "generation"]})
+        assert {h.entry.id for h in hits} == {"lit_search", "draft_report", "web_search"}
+
+    def test_combined_facets_intersect(self, catalog):
+        hits = catalog.search("review", filters={"complexity": "advanced", "level": 3})
+        assert [h.entry.id for h in hits] == ["safety_review"]
+
+    def test_no_match_returns_empty(self, catalog):
+        assert catalog.search("oncology") == []
+        assert catalog.search("search", filters={"category": "planning"}) == []
+
+    def test_partial_word_matches_by_prefix(self, catalog):
+        catalog.upsert(_entry("pv_intake", "Pharmacovigilance Case Intake", "Triage ICSR reports"))
+        assert [h.entry.id for h in catalog.search("pharm")] == ["pv_intake"]
+        # Too short to expand
+        assert catalog.search("ph") == []
+
+    def test_exact_match_outranks_prefix_match(self, catalog):
+        catalog.upsert(_entry("searcher", "Searcher", "Generic searcher"))
+        hits = catalog.search("search", kind="skill")
+        assert hits[-1].entry.id == "searcher"
+        assert hits[0].score > hits[-1].score > 0
+
+    def test_limit(self, catalog):
+        assert len(catalog.search("search", limit=1)) == 1
+
+    def test_facet_counts(self, catalog):
+        assert catalog.facet_counts("category", kind="skill") == {
+            "search": 1, "analysis": 1, "generation": 1,
+        }
+
+
+class TestIncrementalUpdates:
+    def test_unchanged_entry_is_not_reindexed(self, catalog):
+        version = catalog.version
+        changed = catalog.upsert(_entry("lit_search", "Literature Search",
+                                        "Search PubMed for clinical evidence",
+                                        category="search", level=[3, 4],
+                                        complexity="intermediate"))
+        assert changed is False
+        assert catalog.version == version
+
+    def test_changed_entry_replaces_postings(self, catalog):
+        assert catalog.upsert(_entry("draft_report", "Draft Dossier", "Generate a payer dossier",
+                                     category="generation"))
+        assert catalog.search("regulatory") == []
+        assert [h.entry.id for h in catalog.search("dossier")] == ["draft_report"]
+
+    def test_remove_clears_terms_and_facets(self, catalog):
+        assert catalog.remove("skill", "safety_review")
+        assert catalog.search("adverse") == []
+        assert "analysis" not in catalog.facet_counts("category")
+        assert not catalog.remove("skill", "safety_review")
+
+    def test_removed_terms_leave_prefix_vocabulary(self, catalog):
+        catalog.upsert(_entry("pv_intake", "Pharmacovigilance Case Intake"))
+        assert [h.entry.id for h in catalog.search("pharm")] == ["pv_intake"]
+        catalog.remove("skill", "pv_intake")
+        assert catalog.search("pharm") == []
+        assert catalog._sorted_terms == sorted(catalog._postings)
+
+    def test_slots_are_recycled(self, catalog):
+        catalog.remove("skill", "draft_report")
+        catalog.upsert(_entry("new_skill", "Protocol Design", category="planning"))
+        assert len(catalog) == 4
+        assert [h.entry.id for h in catalog.search("protocol")] == ["new_skill"]
+
+    def test_sync_kind_removes_missing(self, catalog):
+        stats = catalog.sync_kind("tool", [_entry("pubmed", "PubMed", kind="tool")])
+        assert stats == {"upserted": 1, "removed": 1}
+        assert catalog.get("tool", "web_search") is None
+        assert catalog.get("skill", "lit_search") is not None
+
+
+class TestEmbeddingIndex:
+    def test_semantic_similarity_surfaces_non_lexical_match(self):
+        vectors = {
+            "Cardiac Risk. ": [1.0, 0.0],
+            "Heart Safety. ": [0.9, 0.1],
+            "Budget Model. ": [0.0, 1.0],
+            "cardiac": [1.0, 0.0],
+        }
+        catalog = CapabilityCatalog(embed_fn=lambda texts: [vectors[t] for t in texts])
+        catalog.upsert_many([
+            _entry("a", "Cardiac Risk"), _entry("b", "Heart Safety"), _entry("c", "Budget Model"),
+        ])
+
+        hits = catalog.search("cardiac")
+        assert [h.entry.id for h in hits] == ["a", "b"]
+        assert hits[1].bm25 == 0.0 and hits[1].semantic > 0.9
+
+
+class TestSkillsLoaderIntegration:
+    SKILL_MD = """# Search Skills
+
+### {name}
+**ID**: `{skill_id}`
+**Category**: `search`
+**Complexity**: `basic`
+
+**Description**: {description}
+"""
+
+    async def test_force_reload_only_reparses_changed_files(self, tmp_path, monkeypatch):
+        (tmp_path / "a.md").write_text(self.SKILL_MD.format(
+            name="PubMed Search", skill_id="pubmed_search", description="Search PubMed"))
+        (tmp_path / "b.md").write_text(self.SKILL_MD.format(
+            name="Trial Search", skill_id="trial_search", description="Search trial registries"))
+
+        loader = SkillsLoaderService(str(tmp_path), catalog=CapabilityCatalog())
+        assert await loader.load_skills() == 2
+
+        from services.shared import skills_loader_service as module
+        parsed = []
+        original = module.SkillMDParser.parse_file
+        monkeypatch.setattr(
+            module.SkillMDParser, "parse_file",
+            classmethod(lambda cls, path: parsed.append(path) or original(path)),
+        )
+
+        (tmp_path / "b.md").write_text(self.SKILL_MD.format(
+            name="Registry Search", skill_id="registry_search", description="Search CT.gov"))
+        assert await loader.load_skills(force_reload=True) == 2
+
+        assert parsed == [str(tmp_path / "b.md")]
+        assert loader.get_skill("trial_search") is None
+        assert [s.id for s in loader.search_skills("registry")] == ["registry_search"]
+        assert [s.id for s in loader.search_skills("search", level=5, limit=1)] == ["pubmed_search"]
+
+    async def test_deleted_file_drops_its_skills(self, tmp_path):
+        (tmp_path / "a.md").write_text(self.SKILL_MD.format(
+            name="PubMed Search", skill_id="pubmed_search", description="Search PubMed"))
+        loader = SkillsLoaderService(str(tmp_path), catalog=CapabilityCatalog())
+        await loader.load_skills()
+
+        (tmp_path / "a.md").unlink()
+        assert await loader.load_skills(force_reload=True) == 0
+        assert loader.search_skills("pubmed") == []
+        assert loader.get_skills_by_category("search") == []
+
+    async def test_search_skills_matches_partial_words(self, tmp_path):
+        (tmp_path / "a.md").write_text(self.SKILL_MD.format(
+            name="Pharmacovigilance Signal Detection", skill_id="pv_signal",
+            description="Detect safety signals"))
+        loader = SkillsLoaderService(str(tmp_path), catalog=CapabilityCatalog())
+        await loader.load_skills()
+
+        assert [s.id for s in loader.search_skills("pharm")] == ["pv_signal"]
+        assert [s.id for s in loader.search_skills("pharmacovig sig")] == ["pv_signal"]
+
+
+class FakeToolTable:
+    """Sync supabase-py style query: ``execute()`` blocks"""
+
+    def __init__(self, rows, threads):
+        self.rows = rows
+        self.threads = threads
+
+    def select(self, *args):
+        return self
+
+    def eq(self, key, value):
+        self.rows = [row for row in self.rows if row.get(key) == value]
+        return self
+
+    def execute(self):
+        self.threads.add(threading.get_ident())
+        return SimpleNamespace(data=self.rows)
+
+
+class TestToolRegistryIntegration:
+    ROWS = [
+        {"id": "t1", "code": "TOOL-PUBMED", "unique_id": "u1", "name": "PubMed Search",
+         "tool_description": "Search biomedical literature", "category": "search", "is_active": True},
+        {"id": "t2", "code": "TOOL-FAERS", "unique_id": "u2", "name": "FAERS Lookup",
+         "tool_description": "Pharmacovigilance adverse event reports", "category": "safety",
+         "is_active": True},
+        {"id": "t3", "code": "TOOL-OLD", "unique_id": "u3", "name": "Legacy Search",
+         "is_active": False},
+    ]
+
+    async def test_initialize_indexes_all_active_tools(self, monkeypatch):
+        from services.shared import tool_registry_service as module
+
+        threads = set()
+        supabase = SimpleNamespace(table=lambda name: FakeToolTable(list(self.ROWS), threads))
+        monkeypatch.setattr(module, "get_capability_catalog", lambda: CapabilityCatalog())
+
+        registry = await module.initialize_tool_registry(supabase)
+
+        assert threading.get_ident() not in threads
+        assert [t["tool_code"] for t in registry.search_tools("search")] == ["TOOL-PUBMED"]
+        assert [t["tool_code"] for t in registry.search_tools("pharm")] == ["TOOL-FAERS"]
+        # Code lookups are served from the warmed cache
+        assert (await registry.get_tool_by_code("TOOL-FAERS"))["tool_name"] == "FAERS Lookup"
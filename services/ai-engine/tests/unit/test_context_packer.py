@@ -0,0 +1,129 @@
+"""
+Unit Tests for token-accurate context packing
+
+Tests cover:
+- Packed context never exceeds the token budget, markers included
+- Near-duplicates are dropped; MMR prefers diverse chunks
+- Knapsack selection beats stopping at the first chunk that does not fit
+- Leftover budget filled with a truncated chunk
+- Deterministic report and rank-ordered citation numbering
+- Token count cache hits and LRU eviction
+
+Run with: pytest tests/unit/test_context_packer.py -v
+"""
+
+import pytest
+
+from graphrag.context_packer import ContextPacker
+from graphrag.evidence_builder import EvidenceBuilder
+from graphrag.models import ContextChunk, SearchSource
+from infrastructure.llm.tokenizer import TokenCountCache
+
+
+def word_count(text: str) -> int:
+    return len(text.split())
+
+
+def truncate_words(text: str, limit: int) -> str:
+    return " ".join(text.split()[:limit])
+
+
+@pytest.fixture
+def packer():
+    return ContextPacker(counter=word_count, truncator=truncate_words, min_fill_tokens=5)
+
+
+def doc(topic: str, words: int) -> str:
+    return " ".join(f"{topic}{i}" for i in range(words))
+
+
+def chunk(i: int, text: str, score: float) -> ContextChunk:
+    return ContextChunk(
+        chunk_id=f"c{i}",
+        text=text,
+        score=score,
+        source=SearchSource(document_id=f"d{i}"),
+        search_modality="vector",
+    )
+
+
+class TestContextPacker:
+    def test_never_exceeds_budget(self, packer):
+        texts = [doc(f"t{i}", 10 + 7 * i) for i in range(12)]
+        for budget in (0, 15, 40, 100, 333):
+            result = packer.pack(texts, [1.0 - i * 0.05 for i in range(12)], budget, overhead_tokens=2)
+            assert result.report.used_tokens <= budget
+            assert sum(entry["tokens"] for entry in result.report.selected) == result.report.used_tokens
+            assert result.selected == sorted(result.selected)
+
+    def test_near_duplicates_dropped(self, packer):
+        texts = [doc("alpha", 20), doc("alpha", 20) + " extra", doc("beta", 20)]
+        result = packer.pack(texts, [0.9, 0.8, 0.7], budget=1000)
+        assert result.selected == [0, 2]
+        assert result.report.dropped == [{"id": "1", "rank": 1, "tokens": 21, "reason": "redundant"}]
+
+    def test_mmr_prefers_diverse_chunk(self):
+        packer = ContextPacker(counter=word_count, truncator=truncate_words, duplicate_threshold=1.1, min_fill_tokens=1000)
+        overlap = doc("alpha", 15) + " " + doc("gamma", 5)
+        texts = [doc("alpha", 20), overlap, doc("beta", 20)]
+        result = packer.pack(texts, [1.0, 0.9, 0.8], budget=40)
+        assert result.selected == [0, 2]
+
+    def test_skips_oversized_chunk_instead_of_stopping(self, packer):
+        texts = [doc("a", 30), doc("b", 80), doc("c", 30), doc("d", 30)]
+        result = packer.pack(texts, [1.0, 0.95, 0.9, 0.85], budget=100)
+        # The old builder stopped at the 80-word chunk and used 30/100
+        assert [entry["rank"] for entry in result.report.selected if not entry["truncated"]] == [0, 2, 3]
+        assert result.texts == {1: doc("b", 10)}
+        assert result.report.utilization == 1.0
+
+    def test_best_single_chunk_beats_many_tiny_ones(self, packer):
+        texts = [doc("big", 100)] + [doc(f"s{i}", 1) for i in range(3)]
+        result = packer.pack(texts, [1.0, 0.05, 0.05, 0.05], budget=100)
+        assert result.selected == [0]
+        assert result.report.strategy == "best_single"
+
+    def test_fills_leftover_with_truncation(self, packer):
+        texts = [doc("a", 60), doc("b", 60)]
+        result = packer.pack(texts, [1.0, 0.9], budget=100, overhead_tokens=1)
+        assert result.selected == [0, 1]
+        assert result.texts[1] == doc("b", 38)
+        assert result.report.used_tokens == 100
+        assert result.report.selected[1]["truncated"] is True
+
+    def test_report_is_deterministic(self, packer):
+        texts = [doc(f"t{i}", 5 + 3 * i) for i in range(8)]
+        scores = [0.5] * 8
+        first = packer.pack(texts, scores, 60).report.to_dict()
+        second = packer.pack(texts, scores, 60).report.to_dict()
+        first.pop("elapsed_ms")
+        second.pop("elapsed_ms")
+        assert first == second
+
+
+class TestEvidenceBuilderPacking:
+    def test_citations_follow_rank_order(self, packer):
+        chunks = [chunk(0, doc("a", 30), 0.9), chunk(1, doc("b", 90), 0.8), chunk(2, doc("c", 30), 0.7)]
+        builder = EvidenceBuilder(max_tokens=70, packer=ContextPacker(counter=word_count, truncator=truncate_words, min_fill_tokens=1000))
+        annotated, citation_map, _ = builder.build_context_with_evidence(chunks, [])
+
+        assert [c.chunk_id for c in annotated] == ["c0", "c2"]
+        assert [c.metadata["citation_id"] for c in annotated] == ["[1]", "[2]"]
+        assert annotated[1].text.endswith(" [2]")
+        assert citation_map["[2]"].document_id == "d2"
+        assert builder.last_packing_report.dropped[0]["id"] == "c1"
+        assert sum(word_count(c.text) for c in annotated) <= 70
+
+
+class TestTokenCountCache:
+    def test_hits_and_eviction(self):
+        cache = TokenCountCache(max_entries=2)
+        one, two, three = (TokenCountCache.key("cl100k_base", text) for text in ("one", "two", "three"))
+        cache.put(one, 1)
+        cache.put(two, 2)
+        assert cache.get(one) == 1
+        cache.put(three, 3)  # evicts "two", least recently used
+        assert cache.get(two) is None
+        assert cache.get(TokenCountCache.key("o200k_base", "one")) is None
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 2)
@@ -0,0 +1,346 @@
+"""
+Unit Tests for the incremental conversation context store
+
+Tests cover:
+- Token-bounded recent window; O(1) prebuilt context reads
+- Background rolling summary: whole exchanges only, nothing dropped while
+  a summary is in flight, versions bumped per commit
+- Hierarchical roll-up keeps the summary bounded over long sessions
+- Summarizer failures fall back to the extractive summary
+- Hydration from a persisted summary version
+- EnhancedConversationManager.save_turn / load_context / delete_conversation
+  over a blocking (sync) client, including sessions served by several replicas
+
+Run with: pytest tests/unit/test_conversation_context_store.py -v
+"""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from services.shared.conversation_context_store import ConversationContextStore, extractive_summary
+
+TENANT = "550e8400-e29b-41d4-a716-446655440000"
+
+
+def turn_text(i, words=40):
+    return f"Question {i} about regulatory pathway. " + " ".join(f"w{i}" for _ in range(words))
+
+
+def add_turns(store, n, start=0, session="s1"):
+    for i in range(start, start + n):
+        store.append_turn(TENANT, session, turn_text(i), f"Answer {i}. " + "detail " * 30)
+
+
+class TestWindow:
+    async def test_window_bounded_and_summary_versioned(self):
+        persisted = []
+
+        async def on_summary(tenant_id, session_id, payload):
+            persisted.append(payload)
+
+        store = ConversationContextStore(window_tokens=400, summary_tokens=240, on_summary=on_summary)
+        add_turns(store, 20)
+        await store.flush()
+
+        context = store.get_context(TENANT, "s1")
+        assert context.recent_tokens <= 400
+        assert context.total_turns == 20
+        assert context.summary_version == len(persisted) > 0
+        assert persisted[-1]["version"] == context.summary_version
+        # Window holds whole exchanges and starts right after the summarized turns
+        assert context.messages[0]["role"] == "user"
+        assert context.messages[0]["content"].startswith(f"Question {context.summarized_turns} ")
+        assert context.messages[-1]["content"].startswith("Answer 19.")
+        assert "Question 0 about regulatory pathway." in context.summary
+
+        messages = context.to_messages(system_prompt="sys")
+        assert [m["role"] for m in messages[:2]] == ["system", "system"]
+        assert messages[1]["content"].startswith("Summary of the earlier conversation")
+        # Reads are the prebuilt object, not a rebuild
+        assert store.get_context(TENANT, "s1") is context
+
+    async def test_turns_kept_until_summary_commits(self):
+        release = asyncio.Event()
+
+        async def slow_summarizer(texts, max_tokens):
+            await release.wait()
+            return "summarized"
+
+        store = ConversationContextStore(window_tokens=200, summarizer=slow_summarizer)
+        add_turns(store, 6)
+        await asyncio.sleep(0)
+        in_flight = store.get_context(TENANT, "s1")
+        assert in_flight.summary == "" and len(in_flight.messages) == 12
+
+        release.set()
+        await store.flush(TENANT, "s1")
+        context = store.get_context(TENANT, "s1")
+        assert "summarized" in context.summary
+        assert context.summarized_turns + len(context.messages) // 2 == 6
+
+    def test_sync_append_without_loop_defers_summary(self):
+        store = ConversationContextStore(window_tokens=200)
+        add_turns(store, 6)
+        context = store.get_context(TENANT, "s1")
+        assert context.summary_version == 0 and len(context.messages) == 12
+
+
+class TestRollingSummary:
+    async def test_hierarchical_summary_stays_bounded(self):
+        calls = []
+
+        def summarizer(texts, max_tokens):
+            calls.append(len(texts))
+            return extractive_summary(texts, max_tokens)
+
+        store = ConversationContextStore(
+            window_tokens=300, summary_tokens=240, fanout=2, max_levels=3, summarizer=summarizer
+        )
+        for start in range(0, 300, 10):
+            add_turns(store, 10, start=start)
+            await store.flush()
+
+        context = store.get_context(TENANT, "s1")
+        state = store._states[(TENANT, "s1")]
+        assert len(state.levels) == 3
+        assert all(len(level) <= 2 for level in state.levels)
+        assert context.summary_tokens <= 240 + 4
+        assert context.prompt_tokens <= 300 + 240 + 4
+        # Segments cover the summarized turns contiguously, oldest at the top
+        segments = [s for level in reversed(state.levels) for s in level]
+        assert segments[0].first_turn == 0
+        assert all(a.last_turn + 1 == b.first_turn for a, b in zip(segments, segments[1:]))
+        assert segments[-1].last_turn + 1 == context.summarized_turns
+        # Roll-ups merged summaries, not raw turns
+        assert 2 in calls
+
+    async def test_summarizer_failure_falls_back_to_extractive(self):
+        async def failing(texts, max_tokens):
+            raise TimeoutError("llm timeout")
+
+        store = ConversationContextStore(window_tokens=200, summarizer=failing)
+        add_turns(store, 6)
+        await store.flush()
+        assert "Question 0 about regulatory pathway." in store.get_context(TENANT, "s1").summary
+        assert store.get_statistics()["summarizer_errors"] >= 1
+
+    def test_extractive_summary_respects_budget(self):
+        summary = extractive_summary(["First sentence. Second one.", "Another   point!  More."], 100)
+        assert summary == "First sentence. | Another point!"
+        assert len(extractive_summary(["x" * 1000], 10)) <= 40
+
+
+class TestHydration:
+    async def test_load_from_persisted_summary(self):
+        persisted = []
+
+        async def on_summary(tenant_id, session_id, payload):
+            persisted.append(payload)
+
+        original = ConversationContextStore(window_tokens=300, on_summary=on_summary)
+        add_turns(original, 12)
+        await original.flush()
+        payload = persisted[-1]
+        before = original.get_context(TENANT, "s1")
+
+        rows = [
+            {"user_message": m["content"], "assistant_message": n["content"], "agent_id": "a1"}
+            for m, n in zip(before.messages[::2], before.messages[1::2])
+        ]
+        restored = ConversationContextStore(window_tokens=300)
+        context = restored.load(TENANT, "s1", rows, summary=payload)
+        assert context.summary == before.summary
+        assert context.summary_version == before.summary_version
+        assert context.messages == before.messages
+        assert context.total_turns == 12
+
+        restored.append_turn(TENANT, "s1", turn_text(12), "Answer 12.")
+        assert restored.get_context(TENANT, "s1").total_turns == 13
+
+    def test_lru_bounds_conversations(self):
+        store = ConversationContextStore(max_conversations=2)
+        for session in ("a", "b", "c"):
+            store.append_turn(TENANT, session, "q", "a")
+        assert not store.is_loaded(TENANT, "a") and store.is_loaded(TENANT, "c")
+        store.drop(TENANT, "c")
+        assert store.get_context(TENANT, "c") is None
+
+
+# ============================================================================
+# EnhancedConversationManager integration
+# ============================================================================
+
+class UniqueViolation(Exception):
+    code = "23505"
+
+
+class FakeQuery:
+    """Sync supabase-py style query: ``execute()`` blocks"""
+
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.op = "select"
+        self.payload = None
+        self.filters = []
+        self.order_by = None
+        self.limit_n = None
+
+    def select(self, *args):
+        return self
+
+    def insert(self, payload):
+        self.op, self.payload = "insert", payload
+        return self
+
+    def delete(self):
+        self.op = "delete"
+        return self
+
+    def eq(self, key, value):
+        self.filters.append(lambda row: row.get(key) == value)
+        return self
+
+    def gt(self, key, value):
+        self.filters.append(lambda row: row.get(key) > value)
+        return self
+
+    def order(self, key, desc=False):
+        self.order_by = (key, desc)
+        return self
+
+    def limit(self, n):
+        self.limit_n = n
+        return self
+
+    def execute(self):
+        self.db.setdefault("_threads", set()).add(threading.get_ident())
+        rows = self.db.setdefault(self.table, [])
+        self.db.setdefault("_reads", []).append((self.table, self.op))
+        if self.op == "insert":
+            if self.table == "conversation_summaries" and any(
+                (row["session_id"], row["version"]) == (self.payload["session_id"], self.payload["version"])
+                for row in rows
+            ):
+                raise UniqueViolation("duplicate key value violates unique constraint")
+            rows.append(dict(self.payload))
+            return SimpleNamespace(data=[self.payload])
+        matched = [row for row in rows if all(f(row) for f in self.filters)]
+        if self.op == "delete":
+            self.db[self.table] = [row for row in rows if row not in matched]
+            return SimpleNamespace(data=matched)
+        if self.order_by:
+            matched.sort(key=lambda row: row[self.order_by[0]], reverse=self.order_by[1])
+        return SimpleNamespace(data=matched[: self.limit_n] if self.limit_n else matched)
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.db = {}
+        self.client = SimpleNamespace(table=lambda name: FakeQuery(self.db, name))
+
+    async def set_tenant_context(self, tenant_id):
+        pass
+
+
+class TestEnhancedConversationManager:
+    @pytest.fixture
+    def manager(self, monkeypatch):
+        from services.shared import enhanced_conversation_manager as module
+        from services.shared.enhanced_conversation_manager import EnhancedConversationManager, SemanticMemory
+
+        supabase = FakeSupabase()
+        manager = EnhancedConversationManager(supabase, openai_client=SimpleNamespace())
+        manager.context_store = ConversationContextStore(
+            window_tokens=300, on_summary=manager._persist_summary
+        )
+
+        async def no_memory(user_message, assistant_message):
+            return SemanticMemory(
+                summary="", key_entities={}, extracted_facts=[], user_preferences={}, topics_discussed=[]
+            )
+
+        monkeypatch.setattr(manager, "_extract_semantic_memory", no_memory)
+        return manager, supabase
+
+    async def test_save_and_load_context(self, manager):
+        manager, supabase = manager
+        for i in range(15):
+            assert await manager.save_turn(TENANT, "s1", turn_text(i), f"Answer {i}.", agent_id="agent_reg")
+        await manager.context_store.flush()
+
+        supabase.db["_reads"] = []
+        context = await manager.load_context(TENANT, "s1")
+        # Hot session: only the check for turns written by other replicas
+        assert supabase.db["_reads"] == [("conversations", "select")]
+        assert threading.get_ident() not in supabase.db["_threads"]
+        assert context.total_turns == 15 and context.summary_version > 0
+        versions = [row["version"] for row in supabase.db["conversation_summaries"]]
+        assert versions == sorted(versions) and versions[-1] == context.summary_version
+
+        # Cold replica: latest summary version + the turns after it
+        manager.context_store = ConversationContextStore(window_tokens=300)
+        cold = await manager.load_context(TENANT, "s1")
+        assert (cold.summary, cold.summary_version, cold.messages) == \
+            (context.summary, context.summary_version, context.messages)
+
+        assert await manager.delete_conversation(TENANT, "s1")
+        assert not manager.context_store.is_loaded(TENANT, "s1")
+        assert supabase.db["conversation_summaries"] == []
+        empty = await manager.load_context(TENANT, "s1")
+        assert empty.messages == () and empty.total_turns == 0
+
+        with pytest.raises(ValueError):
+            await manager.load_context("", "s1")
+
+    async def test_replicas_see_each_others_turns(self, manager):
+        from services.shared.enhanced_conversation_manager import EnhancedConversationManager
+
+        manager_a, supabase = manager
+        manager_b = EnhancedConversationManager(supabase, openai_client=SimpleNamespace())
+        manager_b.context_store = ConversationContextStore(
+            window_tokens=300, on_summary=manager_b._persist_summary
+        )
+        manager_b._extract_semantic_memory = manager_a._extract_semantic_memory
+
+        for i in range(8):
+            await manager_a.save_turn(TENANT, "s1", turn_text(i), f"Answer {i}.", agent_id="a")
+        await manager_a.context_store.flush()
+        assert (await manager_b.load_context(TENANT, "s1")).total_turns == 8
+
+        # The session moves between replicas turn by turn
+        for i in range(8, 16):
+            writer = manager_a if i % 2 else manager_b
+            await writer.save_turn(TENANT, "s1", turn_text(i), f"Answer {i}.", agent_id="a")
+            await writer.context_store.flush()
+
+        context_a = await manager_a.load_context(TENANT, "s1")
+        context_b = await manager_b.load_context(TENANT, "s1")
+        for context in (context_a, context_b):
+            assert context.total_turns == 16
+            assert context.messages[-1]["content"] == "Answer 15."
+        versions = [row["version"] for row in supabase.db["conversation_summaries"]]
+        assert len(versions) == len(set(versions))
+        assert context_b.summary_version == max(versions)
+
+    async def test_summary_version_taken_by_other_replica(self, manager):
+        manager, supabase = manager
+        await manager.save_turn(TENANT, "s1", turn_text(0), "Answer 0.", agent_id="a")
+        # Another replica commits version 1 while this one holds the session
+        supabase.db["conversation_summaries"] = [
+            {"tenant_id": TENANT, "session_id": "s1", "version": 1, "summarized_turns": 0,
+             "covered_until": None, "levels": []}
+        ]
+        for i in range(1, 10):
+            await manager.save_turn(TENANT, "s1", turn_text(i), f"Answer {i}.", agent_id="a")
+            await manager.context_store.flush()
+
+        # The conflicting commit was discarded and numbering resumed from storage
+        rows = supabase.db["conversation_summaries"]
+        assert rows[0]["levels"] == []
+        versions = [row["version"] for row in rows]
+        assert versions == list(range(1, len(versions) + 1)) and len(versions) > 1
+        assert (await manager.load_context(TENANT, "s1")).total_turns == 10
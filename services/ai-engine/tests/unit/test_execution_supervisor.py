@@ -0,0 +1,233 @@
+"""
+Unit Tests for the hierarchical sub-agent execution supervisor
+
+Tests cover:
+- Deep, wide delegation stays within the slot, breadth, depth and agent caps
+- Cancelling a mission cascades to grandchildren and fire-and-forget tasks
+- Token/cost budgets propagate down the tree and stop the exhausted subtree
+- Orphaned missions (expired lease, failed liveness) are reaped
+- Scopes wait for spawned tasks on success and cancel them on failure
+- SubAgentSpawner.execute_parallel runs under the supervisor's caps
+
+Run with: pytest tests/unit/test_execution_supervisor.py -v
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from services.agents import execution_supervisor
+from services.agents.execution_supervisor import (
+    BudgetExceeded,
+    ExecutionBudget,
+    ExecutionSupervisor,
+    current_execution_node,
+)
+
+
+@pytest.fixture
+def supervisor():
+    return ExecutionSupervisor(max_concurrent=3, reap_interval=0)
+
+
+class _Tracker:
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def leaf(self, node, seconds=0.01):
+        async with node.slot():
+            self.running += 1
+            self.calls += 1
+            self.peak = max(self.peak, self.running)
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                self.running -= 1
+
+
+class TestBoundedDelegation:
+    async def test_deep_fan_out_is_bounded(self, supervisor):
+        tracker = _Tracker()
+        breadth_peaks = []
+
+        async def delegate(level: int):
+            async with supervisor.delegation(f"L{level}") as node:
+                await tracker.leaf(node)
+                if level < 6:
+                    # Every agent fans out to four children: 4^n without caps
+                    await asyncio.gather(
+                        *(node.spawn(delegate(level + 1)) for _ in range(4)), return_exceptions=True
+                    )
+                    breadth_peaks.append(len(node.children))
+
+        budget = ExecutionBudget(max_depth=3, max_breadth=2, max_agents=15)
+        async with supervisor.mission("m1", budget) as root:
+            await delegate(1)
+
+        assert tracker.peak <= 3
+        assert root.peak_depth == 3
+        assert root.agents_spawned <= 15
+        assert tracker.calls == root.agents_spawned
+        assert max(breadth_peaks) <= 2
+        assert supervisor.stats()["budget_rejections"] > 0
+        assert supervisor.stats()["active_missions"] == 0
+
+    async def test_depth_limit_raises(self, supervisor):
+        async with supervisor.mission("m1", ExecutionBudget(max_depth=1)):
+            async with supervisor.delegation("L3"):
+                with pytest.raises(BudgetExceeded) as excinfo:
+                    async with supervisor.delegation("L4"):
+                        pass
+        assert excinfo.value.limit == "depth"
+
+    async def test_delegation_outside_mission_gets_adhoc_root(self, supervisor):
+        assert current_execution_node() is None
+        async with supervisor.delegation("L3") as node:
+            assert node.depth == 1
+            assert node.root.label.startswith("adhoc:")
+            assert supervisor.stats()["active_missions"] == 1
+        assert supervisor.stats()["active_missions"] == 0
+
+
+class TestCancellation:
+    async def test_cancel_cascades_through_the_tree(self, supervisor):
+        started = asyncio.Event()
+        cancelled = []
+
+        async def grandchild():
+            async with supervisor.delegation("L4") as node:
+                started.set()
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(node.label)
+                    raise
+
+        async def child():
+            async with supervisor.delegation("L3") as node:
+                node.spawn(grandchild())  # fire-and-forget
+                await asyncio.sleep(10)
+
+        async def run_mission():
+            async with supervisor.mission("m1") as root:
+                root.spawn(child())
+                await asyncio.sleep(10)
+
+        mission = asyncio.create_task(run_mission())
+        await asyncio.wait_for(started.wait(), 1)
+        assert supervisor.cancel("m1", reason="user_cancelled")
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(mission, 1)
+        assert cancelled == ["L4"]
+        assert supervisor.stats()["active_tasks"] == 0
+        assert not supervisor.cancel("m1")
+
+    async def test_failed_scope_cancels_spawned_tasks(self, supervisor):
+        sibling = None
+        with pytest.raises(RuntimeError):
+            async with supervisor.mission("m1") as root:
+                sibling = root.spawn(asyncio.sleep(10))
+                raise RuntimeError("step failed")
+        assert sibling.cancelled()
+
+    async def test_successful_scope_waits_for_spawned_tasks(self, supervisor):
+        async with supervisor.mission("m1") as root:
+            task = root.spawn(asyncio.sleep(0.01, result="done"))
+        assert task.result() == "done"
+
+
+class TestBudgets:
+    async def test_cost_budget_propagates_and_stops_subtree(self, supervisor):
+        async with supervisor.mission("m1", ExecutionBudget(max_cost_usd=1.0)) as root:
+            async with supervisor.delegation("L3", max_cost_usd=5.0) as specialist:
+                # A child never gets more than its mission has left
+                assert specialist.remaining_cost_usd() == 1.0
+                specialist.charge(tokens=100, cost_usd=0.6)
+
+                async with supervisor.delegation("L4") as worker:
+                    assert worker.remaining_cost_usd() == pytest.approx(0.4)
+                    straggler = worker.spawn(asyncio.sleep(10))
+                    with pytest.raises(BudgetExceeded) as excinfo:
+                        worker.charge(tokens=100, cost_usd=0.5)
+                    await asyncio.sleep(0)
+                    assert straggler.cancelled()
+
+                with pytest.raises(BudgetExceeded):
+                    async with supervisor.delegation("L4-next"):
+                        pass
+
+        assert excinfo.value.limit == "cost"
+        assert excinfo.value.node_id == root.node_id
+        assert root.tokens_used == 200
+
+    async def test_child_token_budget_only_stops_its_subtree(self, supervisor):
+        async with supervisor.mission("m1", ExecutionBudget(max_tokens=10_000)) as root:
+            async with supervisor.delegation("L3-a", max_tokens=100) as greedy:
+                with pytest.raises(BudgetExceeded):
+                    greedy.charge(tokens=150)
+            async with supervisor.delegation("L3-b") as other:
+                other.charge(tokens=150)
+        assert root.tokens_used == 300
+
+
+class TestOrphanReaping:
+    async def test_expired_lease_and_failed_liveness_are_reaped(self, supervisor):
+        alive = {"m2": True}
+
+        async def run(mission_id, **kwargs):
+            async with supervisor.mission(mission_id, **kwargs) as root:
+                root.spawn(asyncio.sleep(10))
+                await asyncio.sleep(10)
+
+        leased = asyncio.create_task(run("m1", lease_seconds=0.01))
+        checked = asyncio.create_task(run("m2", liveness=lambda: alive["m2"]))
+        await asyncio.sleep(0.05)
+
+        assert await supervisor.reap_orphans() == ["m1"]
+        alive["m2"] = False
+        assert await supervisor.reap_orphans() == ["m2"]
+
+        for task in (leased, checked):
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        assert supervisor.stats()["reaped_orphans"] == 2
+        assert supervisor.stats()["active_missions"] == 0
+
+
+class TestSubAgentSpawnerIntegration:
+    async def test_parallel_sub_agents_share_slots_and_budget(self, supervisor, monkeypatch):
+        from services.agents.sub_agent_spawner import SubAgentSpawner
+
+        tracker = _Tracker()
+
+        class FakeChat:
+            def __init__(self, **kwargs):
+                pass
+
+            async def ainvoke(self, messages):
+                tracker.running += 1
+                tracker.peak = max(tracker.peak, tracker.running)
+                await asyncio.sleep(0.01)
+                tracker.running -= 1
+                return SimpleNamespace(content="ok", response_metadata={"token_usage": {"total_tokens": 1000}})
+
+        monkeypatch.setattr("langchain_openai.ChatOpenAI", FakeChat)
+        monkeypatch.setattr(execution_supervisor, "_execution_supervisor", supervisor)
+
+        spawner = SubAgentSpawner()
+        ids = await spawner.spawn_workers("expert-1", [f"task {i}" for i in range(6)], context={})
+        async with supervisor.mission("m1", ExecutionBudget(max_tokens=4500)) as root:
+            results = await spawner.execute_parallel(ids)
+
+        assert tracker.peak <= 3
+        # The fifth completion goes over the mission's token budget: its paid-for
+        # result is kept and flagged, the sixth delegation is refused
+        assert sum(result.success for result in results) == 5
+        exhausted = [result for result in results if result.budget_exhausted]
+        assert len(exhausted) == 1
+        assert exhausted[0].tokens_used == 1000 and exhausted[0].cost > 0
+        assert root.tokens_used <= 5000
@@ -0,0 +1,85 @@
+"""
+Unit Tests for FaithfulnessScorer local verification
+
+Tests cover:
+- ContextIndex built once per response (words, shingles, chunk offsets)
+- Phrase matches found across punctuation and reported as maximal spans
+- Span offsets point into the original context chunks
+- Verdicts for supported, partial, unsupported and contradicted claims
+
+Run with: pytest tests/unit/test_faithfulness_scorer.py -v
+"""
+
+from services.shared.faithfulness_scorer import (
+    Claim,
+    ClaimVerdict,
+    ContextIndex,
+    FaithfulnessScorer,
+)
+
+CONTEXT = [
+    "Metformin is a first-line medication for type 2 diabetes. Common side effects include "
+    "gastrointestinal symptoms such as nausea, diarrhea, and stomach discomfort.",
+    "Metformin works by decreasing glucose production in the liver and improving insulin "
+    "sensitivity. It does not cause hypoglycemia when used alone.",
+    "Lactic acidosis is a rare but serious side effect, particularly in patients with kidney disease.",
+]
+
+
+def _verify(*texts):
+    scorer = FaithfulnessScorer()
+    return scorer._verify_claims_local([Claim(text=t) for t in texts], ContextIndex(CONTEXT))
+
+
+class TestContextIndex:
+    def test_index_tokens_and_chunk_offsets(self):
+        index = ContextIndex(CONTEXT)
+        assert "metformin" in index.content_words
+        assert "the" not in index.content_words
+        assert index.shingle_positions(["type", "2", "diabetes"]).tolist() == [index.tokens.index("type")]
+        assert len(index.shingle_positions(["type", "2", "unknown"])) == 0
+        assert index.chunk_starts == [0, len(CONTEXT[0]) + 2, len(CONTEXT[0]) + len(CONTEXT[1]) + 4]
+
+    def test_spans_are_maximal_and_map_to_chunks(self):
+        claim = "Doctors say it works by decreasing glucose production in the liver, mostly."
+        [result] = _verify(claim)
+
+        [span] = result.supporting_spans
+        assert span.chunk_index == 1
+        assert CONTEXT[1][span.start:span.end] == span.text == "works by decreasing glucose production in the liver"
+        assert claim[span.claim_start:span.claim_end] == "works by decreasing glucose production in the liver"
+
+    def test_phrase_match_ignores_punctuation(self):
+        [result] = _verify("Common effects: nausea diarrhea and stomach discomfort")
+        assert [s.text for s in result.supporting_spans] == ["nausea, diarrhea, and stomach discomfort"]
+
+    def test_multiple_disjoint_spans(self):
+        [result] = _verify("Lactic acidosis is a rare event and type 2 diabetes is common")
+        assert [(s.chunk_index, s.text) for s in result.supporting_spans] == [
+            (2, "Lactic acidosis is a rare"),
+            (0, "type 2 diabetes"),
+        ]
+
+
+class TestVerdicts:
+    def test_verdicts(self):
+        supported, partial, unsupported, contradicted = _verify(
+            "Metformin is a first-line medication for type 2 diabetes.",
+            "The medication can also cause weight loss in some patients.",
+            "The drug was first developed in 1922 by chemists.",
+            "Metformin is not used for type 2 diabetes.",
+        )
+        assert supported.verdict == ClaimVerdict.SUPPORTED
+        assert partial.verdict == ClaimVerdict.PARTIALLY_SUPPORTED
+        assert unsupported.verdict == ClaimVerdict.NOT_SUPPORTED
+        assert unsupported.supporting_spans == []
+        assert contradicted.verdict == ClaimVerdict.CONTRADICTED
+
+    async def test_score_attaches_spans(self):
+        result = await FaithfulnessScorer().score(
+            "Metformin works by decreasing glucose production in the liver. "
+            "Lactic acidosis is a rare but serious side effect.",
+            CONTEXT,
+        )
+        assert result.score == 1.0
+        assert [c.supporting_spans[0].chunk_index for c in result.claims] == [1, 2]
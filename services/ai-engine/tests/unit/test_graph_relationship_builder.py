@@ -0,0 +1,189 @@
+"""
+Unit Tests for GraphRelationshipBuilder set-based relationship builds
+
+Tests cover:
+- Single-pass keyword matching keeps ``kw in text`` semantics
+- Escalation / collaboration edges from packed bitsets match the all-pairs rules
+- Diffed writes: COPY + one merge on change, nothing on an unchanged rebuild
+
+Run with: pytest tests/unit/test_graph_relationship_builder.py -v
+"""
+
+import random
+from itertools import combinations
+
+from services.shared.graph_relationship_builder import (
+    DOMAIN_EDGES,
+    ESCALATION_EDGES,
+    GraphRelationshipBuilder,
+    KeywordMatcher,
+)
+
+
+class FakeConnection:
+    def __init__(self, pool):
+        self.pool = pool
+        self.staged = []
+
+    def transaction(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, sql, *args):
+        self.pool.statements.append(sql)
+        if "INSERT INTO" in sql:
+            table = self.pool.tables[self.pool.current]
+            for op, *row in self.staged:
+                key, values = tuple(row[:self.pool.key_width]), tuple(row[self.pool.key_width:self.pool.value_end])
+                if op == "delete":
+                    table.pop(key, None)
+                else:
+                    table[key] = values
+
+    async def copy_records_to_table(self, table, records, columns):
+        self.pool.copies.append(len(records))
+        self.staged = list(records)
+
+
+class FakePool:
+    """Holds relationship tables as dicts and applies staged merges"""
+
+    def __init__(self, spec):
+        self.tables = {spec.table: {}}
+        self.current = spec.table
+        self.key_width = len(spec.key_columns)
+        self.value_end = self.key_width + len(spec.value_columns)
+        self.statements, self.copies = [], []
+
+    async def fetch(self, sql, *args):
+        rows = []
+        for key, values in self.tables[self.current].items():
+            rows.append(dict(zip(range(self.value_end), key + values)))
+        return rows
+
+    def acquire(self):
+        return FakeConnection(self)
+
+
+def _builder(pool=None):
+    # Skip __init__: it constructs an OpenAI embeddings client
+    builder = GraphRelationshipBuilder.__new__(GraphRelationshipBuilder)
+    builder.db_pool = pool
+    builder.domain_keywords = {
+        "clinical": ["trial", "clinical research", "study", "protocol", "endpoint"],
+        "clinical.trial_design": ["trial design", "randomization", "blinding", "control"],
+        "regulatory": ["regulatory", "compliance", "fda", "ema", "submission"],
+        "regulatory.fda": ["fda", "510k", "pma", "ide", "premarket"],
+    }
+    builder.capability_keywords = {}
+    builder.domain_matcher = KeywordMatcher(builder.domain_keywords, 0.1, 0.3)
+    builder.capability_matcher = KeywordMatcher({"x": ["x"]}, 0.15, 0.35)
+    return builder
+
+
+def _legacy_scores(groups, text, bonus, max_bonus):
+    scores = {}
+    for name, keywords in groups.items():
+        count = sum(1 for kw in keywords if kw in text)
+        if count:
+            scores[name] = min(count / len(keywords) + min(count * bonus, max_bonus), 1.0)
+    return scores
+
+
+def _catalog(n=60, seed=1):
+    rng = random.Random(seed)
+    domains = [f"d{i}" for i in range(8)]
+    return [
+        {
+            "id": f"agent-{i}",
+            "agent_level": rng.choice([1, 2, 3]),
+            "domains": rng.sample(domains, rng.randint(0, 3)) or [None],
+            "domain_ids": rng.sample(domains, rng.randint(0, 3)),
+            "capability_ids": rng.sample(range(10), rng.randint(0, 4)),
+        }
+        for i in range(n)
+    ]
+
+
+class TestKeywordMatcher:
+    def test_matches_substring_semantics(self):
+        builder = _builder()
+        texts = [
+            "randomized trial design with blinding and an fda premarket submission",
+            "a systematic study of trial endpoints",  # 'ema' inside 'systematic'
+            "protocol protocol idea",  # 'ide' inside 'idea'
+            "nothing relevant here",
+        ]
+        for text in texts:
+            assert builder.domain_matcher.scores(text) == _legacy_scores(builder.domain_keywords, text, 0.1, 0.3)
+
+    def test_prefix_keywords_at_same_position(self):
+        matcher = KeywordMatcher({"a": ["trial"], "b": ["trial design"]}, 0.1, 0.3)
+        assert set(matcher.scores("trial design")) == {"a", "b"}
+
+
+class TestPairEdges:
+    def test_escalations_match_all_pairs_rule(self):
+        agents = _catalog()
+        expected = {}
+        for src in agents:
+            src_domains = set(src["domains"]) - {None}
+            for dst in agents:
+                shared = src_domains & (set(dst["domains"]) - {None})
+                if dst["agent_level"] < src["agent_level"] and shared:
+                    tier_diff = src["agent_level"] - dst["agent_level"]
+                    expected[(src["id"], dst["id"])] = (int(tier_diff * 3 + len(shared) / len(src_domains) * 5),)
+
+        assert _builder().compute_escalation_edges(agents) == expected
+
+    def test_collaborations_match_all_pairs_rule(self):
+        agents = _catalog()
+        expected = {}
+        for a, b in combinations(agents, 2):
+            d1, d2 = set(a["domain_ids"]), set(b["domain_ids"])
+            c1, c2 = set(a["capability_ids"]), set(b["capability_ids"])
+            shared, complementary = d1 & d2, (c1 - c2) | (c2 - c1)
+            if shared and complementary:
+                capability_factor = len(complementary) / len(c1 | c2)
+                strength = min(len(shared) / len(d1 | d2) * 0.4 + capability_factor * 0.6, 1.0)
+                if strength >= 0.40:
+                    kind = "complementary_expertise" if capability_factor > 0.6 else "multi_domain"
+                    expected[(a["id"], b["id"])] = (kind, strength, sorted(shared))
+
+        assert _builder().compute_collaboration_edges(agents) == expected
+
+
+class TestDiffedWrites:
+    async def test_only_changes_are_written(self):
+        pool = FakePool(DOMAIN_EDGES)
+        builder = _builder(pool)
+        edges = {("a1", "d1"): (0.5, 0.45), ("a1", "d2"): (0.7, 0.63), ("a2", "d1"): (0.4, 0.36)}
+
+        assert await builder._sync_edges(DOMAIN_EDGES, edges) == {"upserted": 3, "deleted": 0, "unchanged": 0}
+        assert pool.tables["agent_domains"] == edges
+        assert pool.copies == [3]
+
+        # Unchanged rebuild (within epsilon): no COPY, no merge
+        noisy = {key: (p + 0.001, c) for key, (p, c) in edges.items()}
+        assert await builder._sync_edges(DOMAIN_EDGES, noisy) == {"upserted": 0, "deleted": 0, "unchanged": 3}
+        assert pool.copies == [3]
+
+        changed = {("a1", "d1"): (0.9, 0.81), ("a1", "d2"): (0.7, 0.63)}
+        assert await builder._sync_edges(DOMAIN_EDGES, changed) == {"upserted": 1, "deleted": 1, "unchanged": 1}
+        assert pool.tables["agent_domains"] == changed
+        assert pool.copies == [3, 2]
+        assert sum("INSERT INTO" in sql for sql in pool.statements) == 2
+
+    async def test_merge_statement_shape(self):
+        pool = FakePool(ESCALATION_EDGES)
+        await _builder(pool)._sync_edges(ESCALATION_EDGES, {("a", "b"): (5,)})
+        create, merge = pool.statements
+        assert "CREATE TEMP TABLE _stage_agent_escalations ON COMMIT DROP" in create
+        assert "DELETE FROM agent_escalations t" in merge
+        assert "t.escalation_reason = s.escalation_reason" in merge
+        assert "ON CONFLICT (from_agent_id, to_agent_id, escalation_reason)" in merge
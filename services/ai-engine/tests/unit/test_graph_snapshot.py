@@ -0,0 +1,160 @@
+"""
+Unit Tests for the in-memory knowledge graph CSR snapshot
+
+Tests cover:
+- Precomputed node/edge/label/degree statistics
+- Keyset pagination, overall and per label, with cursors
+- BFS with hop, edge-type, label and size limits; shortest-path rebuild
+- Weighted k-hop scoring (best product of edge weights)
+- Manager: keyset export in batches, stale snapshots not served
+- Neo4jClient.traverse_graph served locally, APOC when a seed is unknown
+
+Run with: pytest tests/unit/test_graph_snapshot.py -v
+"""
+
+import time
+
+import pytest
+
+from graphrag.graph_snapshot import GraphSnapshot, GraphSnapshotManager
+
+# Function -> Department -> Role, plus two agents escalating to a third
+NODES = [
+    {"nid": 1, "labels": ["Function"], "props": {"id": "f-med", "name": "Medical Affairs"}},
+    {"nid": 2, "labels": ["Department"], "props": {"id": "d-msl", "name": "Field Medical"}},
+    {"nid": 3, "labels": ["Role"], "props": {"id": "r-msl", "name": "MSL"}},
+    {"nid": 4, "labels": ["Agent"], "props": {"id": "a-1", "name": "Agent 1"}},
+    {"nid": 5, "labels": ["Agent"], "props": {"id": "a-2", "name": "Agent 2"}},
+    {"nid": 6, "labels": ["Agent"], "props": {"id": "a-3", "name": "Agent 3", "tier": 1}},
+    {"nid": 7, "labels": ["Persona"], "props": {"name": "No id"}},
+]
+EDGES = [
+    {"src": 1, "dst": 2, "type": "HAS_DEPARTMENT", "props": {}},
+    {"src": 2, "dst": 3, "type": "HAS_ROLE", "props": {}},
+    {"src": 4, "dst": 3, "type": "ASSIGNED_TO", "props": {}},
+    {"src": 4, "dst": 6, "type": "ESCALATES_TO", "props": {"confidence": 0.5}},
+    {"src": 5, "dst": 6, "type": "ESCALATES_TO", "props": {"confidence": 0.9, "reason": "tier"}},
+    {"src": 4, "dst": 5, "type": "COLLABORATES_WITH", "props": {"weight": 0.8}},
+    {"src": 99, "dst": 1, "type": "HAS_DEPARTMENT", "props": {}},  # endpoint not exported
+]
+
+
+@pytest.fixture
+def snapshot():
+    return GraphSnapshot.build(NODES, EDGES, version=3)
+
+
+class TestSnapshotBuild:
+    def test_stats_are_precomputed(self, snapshot):
+        stats = snapshot.stats()
+        assert stats["total_nodes"] == 7
+        assert stats["total_edges"] == 6
+        assert stats["node_types"] == {"Function": 1, "Department": 1, "Role": 1, "Agent": 3, "Persona": 1}
+        assert stats["edge_types"]["ESCALATES_TO"] == 2
+        assert stats["degree"]["max"] == 3
+        assert stats["version"] == 3
+
+    def test_nodes_and_edges_keep_properties(self, snapshot):
+        a3 = snapshot.resolve("a-3")
+        assert snapshot.resolve(6) == a3  # Neo4j internal id
+        assert snapshot.node(a3) == {"id": "a-3", "name": "Agent 3", "tier": 1, "labels": ["Agent"]}
+        assert snapshot.node_keys[snapshot.resolve(7)] == "7"
+        escalation = snapshot.edge(4)
+        assert escalation == {"source": "a-2", "target": "a-3", "type": "ESCALATES_TO", "weight": pytest.approx(0.9), "reason": "tier"}
+
+
+class TestKeysetPagination:
+    def test_pages_follow_cursor(self, snapshot):
+        seen, cursor = [], None
+        while True:
+            page, cursor = snapshot.page_nodes(after=cursor, limit=3)
+            seen.extend(snapshot.node_keys[i] for i in page)
+            if cursor is None:
+                break
+        assert seen == sorted(snapshot.node_keys)
+
+    def test_label_filter(self, snapshot):
+        page, cursor = snapshot.page_nodes(labels=["Agent", "Role"], limit=2)
+        assert [snapshot.node_keys[i] for i in page] == ["a-1", "a-2"]
+        page, cursor = snapshot.page_nodes(labels=["Agent", "Role"], after=cursor, limit=2)
+        assert [snapshot.node_keys[i] for i in page] == ["a-3", "r-msl"]
+        assert cursor is None
+        assert snapshot.page_nodes(labels=["Missing"]) == ([], None)
+
+
+class TestTraversal:
+    def test_bfs_hops_and_filters(self, snapshot):
+        a1 = snapshot.resolve("a-1")
+        reached, tree = snapshot.bfs([a1], max_hops=1)
+        assert {snapshot.node_keys[i] for i in reached} == {"r-msl", "a-3", "a-2"}
+
+        reached, _ = snapshot.bfs([a1], max_hops=3, edge_types=["ASSIGNED_TO", "HAS_ROLE", "HAS_DEPARTMENT"])
+        assert [snapshot.node_keys[i] for i in reached] == ["r-msl", "d-msl", "f-med"]
+
+        reached, _ = snapshot.bfs([a1], max_hops=3, node_labels=["Agent"])
+        assert {snapshot.node_keys[i] for i in reached} == {"a-2", "a-3"}
+
+        reached, _ = snapshot.bfs([a1], max_hops=3, limit=2)
+        assert len(reached) == 2
+        assert snapshot.bfs([a1], edge_types=["UNKNOWN"]) == ([], {})
+
+    def test_paths_are_shortest_and_ordered(self, snapshot):
+        paths = snapshot.paths(["f-med"], max_hops=3)
+        assert [path["length"] for path in paths] == sorted(path["length"] for path in paths)
+        to_agent = next(path for path in paths if path["nodes"][-1]["id"] == "a-1")
+        assert [node["id"] for node in to_agent["nodes"]] == ["f-med", "d-msl", "r-msl", "a-1"]
+        assert [edge["type"] for edge in to_agent["edges"]] == ["HAS_DEPARTMENT", "HAS_ROLE", "ASSIGNED_TO"]
+        assert snapshot.paths(["f-med", "not-there"]) is None
+
+    def test_weighted_k_hop_keeps_best_path(self, snapshot):
+        ranked = snapshot.weighted_k_hop([snapshot.resolve("a-1")], max_hops=2, edge_types=["ESCALATES_TO", "COLLABORATES_WITH"])
+        scores = {snapshot.node_keys[i]: score for i, score in ranked}
+        # a-1 -> a-2 -> a-3 (0.8 * 0.9) beats the direct 0.5 escalation
+        assert scores == {"a-2": pytest.approx(0.8), "a-3": pytest.approx(0.72)}
+
+
+class TestSnapshotManager:
+    async def test_export_pages_by_id_and_staleness(self):
+        calls = []
+
+        async def fetch(query, params):
+            calls.append(params["after"])
+            records = NODES if "labels(n)" in query else [dict(e, rid=i) for i, e in enumerate(EDGES)]
+            key = "nid" if "labels(n)" in query else "rid"
+            return [r for r in records if r[key] > params["after"]][: params["batch"]]
+
+        manager = GraphSnapshotManager(fetch=fetch, refresh_seconds=60, batch_size=3, enabled=True)
+        snapshot = await manager.refresh()
+        assert len(snapshot) == 7 and len(snapshot.edge_src) == 6
+        # Nodes: after -1, 3, 6; edges: after -1, 2, 5
+        assert calls == [-1, 3, 6, -1, 2, 5]
+        assert manager.current() is snapshot
+
+        snapshot.built_at = time.time() - 1000
+        assert manager.current() is None
+        assert GraphSnapshotManager(fetch=fetch, enabled=False).current() is None
+
+    async def test_traverse_graph_uses_snapshot(self, monkeypatch):
+        from graphrag.clients import neo4j_client
+
+        manager = GraphSnapshotManager(refresh_seconds=60, enabled=True)
+        manager._snapshot = GraphSnapshot.build(NODES, EDGES)
+        manager._snapshot.built_at = time.time()
+        monkeypatch.setattr(neo4j_client, "get_graph_snapshot_manager", lambda: manager)
+
+        client = neo4j_client.Neo4jClient(uri="bolt://unused", username="neo4j", password="x")
+        queries = []
+
+        async def run_query(query, parameters=None, database=None):
+            queries.append(query)
+            return []
+
+        monkeypatch.setattr(client, "run_query", run_query)
+
+        paths = await client.traverse_graph(["4"], allowed_edges=["ESCALATES_TO"], max_hops=2)
+        assert queries == []
+        assert {path.nodes[-1]["id"] for path in paths} == {"a-3", "a-2"}
+        assert paths[0].path_score == pytest.approx(0.5)
+
+        await client.traverse_graph(["12345"], max_hops=1)
+        assert "apoc.path.expandConfig" in queries[0]
@@ -0,0 +1,229 @@
+"""
+Unit Tests for latency-aware hedged requests
+
+Tests cover:
+- Latency tracker EWMA / quantiles and the hedge budget
+- No hedge before enough samples; hedge after p95 without a first token
+- Loser cancelled; primary kept when it answers first; errors fall through
+- Streaming hedges race on the first chunk only
+- TTFT feeds provider health scores and fallback chain order; unmeasured
+  providers keep their configured position
+- ModelFactory wraps models with a cross-provider hedge
+
+Run with: pytest tests/unit/test_hedging.py -v
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from core.hedging import HedgeBudget, HedgedChatModel, LatencyRouter, LatencyTracker
+from core.model_factory import ModelFactory, ModelProvider, ProviderHealthRegistry
+
+
+class FakeModel:
+    """Answers after ``delays`` (one per call, last repeats); records cancellations"""
+
+    def __init__(self, provider, name, delays, chunks=("a", "b"), fail=False):
+        self.provider = provider
+        self.gateway_model = name
+        self.delays = list(delays)
+        self.chunks = chunks
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+
+    def _delay(self):
+        self.calls += 1
+        return self.delays.pop(0) if len(self.delays) > 1 else self.delays[0]
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        delay = self._delay()
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise ConnectionError(f"{self.gateway_model} down")
+        return SimpleNamespace(content=self.gateway_model)
+
+    async def astream(self, input, config=None, **kwargs):
+        delay = self._delay()
+        try:
+            await asyncio.sleep(delay)
+            for chunk in self.chunks:
+                yield f"{self.gateway_model}:{chunk}"
+                await asyncio.sleep(0.03)
+        except (asyncio.CancelledError, GeneratorExit):
+            self.cancelled += 1
+            raise
+
+    def bind_tools(self, tools):
+        return FakeModel(self.provider, f"{self.gateway_model}+tools", self.delays)
+
+
+def warmed_router(primary, latency_ms=10.0, samples=20, **kwargs):
+    router = LatencyRouter(min_samples=samples, min_delay_ms=1, **kwargs)
+    tracker = router.tracker(primary.provider, primary.gateway_model)
+    for _ in range(samples):
+        tracker.record(latency_ms=latency_ms, ttft_ms=latency_ms)
+    return router
+
+
+class TestLatencyTracking:
+    def test_tracker_quantiles_and_ewma(self):
+        tracker = LatencyTracker(window=100)
+        for value in range(1, 101):
+            tracker.record(latency_ms=float(value))
+        assert tracker.latency.quantile(0.95) == pytest.approx(95.05)
+        assert 80 < tracker.latency.ewma < 100
+        assert tracker.to_dict()["ttft"] == {"count": 0}
+
+    def test_budget_caps_hedge_rate(self):
+        budget = HedgeBudget(ratio=0.1, burst=2)
+        spent = 0
+        for _ in range(100):
+            budget.on_request()
+            spent += budget.try_spend()
+        assert spent <= 2 + 10
+        assert not HedgeBudget(ratio=0).try_spend()
+
+
+class TestHedgedInvoke:
+    async def test_no_hedge_without_samples(self):
+        primary = FakeModel("openai", "gpt", [0.05])
+        secondary = FakeModel("anthropic", "claude", [0.0])
+        router = LatencyRouter(min_samples=5)
+        result = await HedgedChatModel(primary, secondary, router).ainvoke("q")
+        assert result.content == "gpt"
+        assert secondary.calls == 0
+        assert router.tracker("openai", "gpt").latency.count == 1
+
+    async def test_slow_primary_hedged_and_cancelled(self):
+        primary = FakeModel("openai", "gpt", [1.0])
+        secondary = FakeModel("anthropic", "claude", [0.01])
+        router = warmed_router(primary)
+        health = ProviderHealthRegistry()
+
+        result = await HedgedChatModel(primary, secondary, router, health).ainvoke("q")
+        assert result.content == "claude"
+        assert primary.cancelled == 1
+        stats = router.get_statistics()
+        assert (stats["hedges"], stats["hedge_wins"], stats["cancelled"]) == (1, 1, 1)
+        assert stats["extra_cost_ratio"] == 1.0
+        # Cancelled primary recorded as a censored (lower-bound) sample
+        assert router.tracker("openai", "gpt").latency.count == 21
+        assert health.get_status()["anthropic"]["success_count"] == 1
+
+    async def test_fast_primary_not_hedged(self):
+        primary = FakeModel("openai", "gpt", [0.0])
+        secondary = FakeModel("anthropic", "claude", [0.0])
+        router = warmed_router(primary, latency_ms=200)
+        result = await HedgedChatModel(primary, secondary, router).ainvoke("q")
+        assert result.content == "gpt"
+        assert secondary.calls == 0
+
+    async def test_budget_exhausted_waits_for_primary(self):
+        primary = FakeModel("openai", "gpt", [0.05])
+        secondary = FakeModel("anthropic", "claude", [0.0])
+        router = warmed_router(primary, budget=HedgeBudget(ratio=0, burst=0))
+        result = await HedgedChatModel(primary, secondary, router).ainvoke("q")
+        assert result.content == "gpt"
+        assert router.stats.budget_denied == 1 and secondary.calls == 0
+
+    async def test_failed_hedge_falls_back_to_primary(self):
+        primary = FakeModel("openai", "gpt", [0.08])
+        secondary = FakeModel("anthropic", "claude", [0.0], fail=True)
+        router = warmed_router(primary)
+        health = ProviderHealthRegistry()
+        result = await HedgedChatModel(primary, secondary, router, health).ainvoke("q")
+        assert result.content == "gpt"
+        assert health.get_status()["anthropic"]["error_count"] == 1
+
+        both_down = HedgedChatModel(FakeModel("openai", "gpt", [0.0], fail=True), None, router)
+        with pytest.raises(ConnectionError):
+            await both_down.ainvoke("q")
+
+    async def test_bind_tools_keeps_hedge(self):
+        primary = FakeModel("openai", "gpt", [1.0])
+        secondary = FakeModel("anthropic", "claude", [0.0])
+        router = warmed_router(primary)
+        router.tracker("openai", "gpt+tools").record(latency_ms=10)
+        router.min_samples = 1
+        result = await HedgedChatModel(primary, secondary, router).bind_tools([]).ainvoke("q")
+        assert result.content == "claude+tools"
+
+
+class TestHedgedStream:
+    async def test_stream_hedges_on_first_token(self):
+        primary = FakeModel("openai", "gpt", [1.0])
+        secondary = FakeModel("anthropic", "claude", [0.01])
+        router = warmed_router(primary)
+        chunks = [chunk async for chunk in HedgedChatModel(primary, secondary, router).astream("q")]
+        assert chunks == ["claude:a", "claude:b"]
+        assert primary.cancelled == 1
+        ttft = router.tracker("anthropic", "claude").ttft
+        assert ttft.count == 1 and ttft.ewma < 200
+
+    async def test_slow_tail_after_first_token_is_not_hedged(self):
+        primary = FakeModel("openai", "gpt", [0.0], chunks=("a", "b", "c"))
+        secondary = FakeModel("anthropic", "claude", [0.0])
+        router = warmed_router(primary, latency_ms=5)
+        chunks = [chunk async for chunk in HedgedChatModel(primary, secondary, router).astream("q")]
+        assert chunks == ["gpt:a", "gpt:b", "gpt:c"]
+        assert secondary.calls == 0
+        latency = router.tracker("openai", "gpt").latency
+        assert latency.samples[-1] > 50  # whole stream, not the first token
+
+
+class TestAdaptiveFallback:
+    async def test_ttft_feeds_health_score_and_chain_order(self):
+        factory = ModelFactory()
+        factory._health = ProviderHealthRegistry()
+        default_chain = factory.get_fallback_chain("gpt-4o")
+        assert default_chain == ["gpt-4o", "claude-3.5-sonnet", "gemini-1.5-pro", "gpt-4o-mini"]
+
+        await factory._health.record_success(ModelProvider.ANTHROPIC, latency_ms=4000, ttft_ms=3000)
+        await factory._health.record_success(ModelProvider.GOOGLE, latency_ms=900, ttft_ms=300)
+        assert factory._health.get_health_score(ModelProvider.GOOGLE) > \
+            factory._health.get_health_score(ModelProvider.ANTHROPIC)
+        # Unmeasured OpenAI sits at the median instead of jumping to the front
+        assert factory.get_fallback_chain("gpt-4o") == ["gpt-4o", "gemini-1.5-pro", "gpt-4o-mini", "claude-3.5-sonnet"]
+
+    async def test_unsampled_providers_keep_configured_order(self):
+        factory = ModelFactory()
+        factory._health = ProviderHealthRegistry()
+        default_chain = factory.get_fallback_chain("gpt-4o")
+
+        await factory._health.record_success(ModelProvider.GOOGLE, latency_ms=2500, ttft_ms=2000)
+        assert factory.get_fallback_chain("gpt-4o") == default_chain
+
+        # Failures still count against a provider that has no latency sample
+        await factory._health.record_failure(ModelProvider.ANTHROPIC, "overloaded")
+        assert factory._health.get_health_score(ModelProvider.ANTHROPIC) < \
+            factory._health.get_health_score(ModelProvider.GOOGLE)
+        assert factory.get_fallback_chain("gpt-4o")[-1] == "claude-3.5-sonnet"
+
+    async def test_factory_wraps_with_cross_provider_hedge(self, monkeypatch):
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+        monkeypatch.setenv("GOOGLE_API_KEY", "g-test")
+        factory = ModelFactory()
+        factory._health = ProviderHealthRegistry()
+
+        async def create(model_id, **kwargs):
+            config = factory.get_config(model_id)
+            if model_id.startswith("claude"):
+                raise ValueError("Missing API key: ANTHROPIC_API_KEY")
+            return FakeModel(config.provider.value, model_id, [0.0]), config
+
+        monkeypatch.setattr(factory, "create_chat_model", create)
+        model, config, actual = await factory.create_chat_model_with_fallback("gpt-4o", hedge=True)
+        assert isinstance(model, HedgedChatModel)
+        assert actual == "gpt-4o"
+        assert model._secondary.gateway_model == "gemini-1.5-pro"
+
+        plain, _, _ = await factory.create_chat_model_with_fallback("gpt-4o", hedge=False)
+        assert isinstance(plain, FakeModel)
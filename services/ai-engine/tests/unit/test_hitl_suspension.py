@@ -0,0 +1,263 @@
+"""
+Unit Tests for durable HITL suspension
+
+Tests cover:
+- Interrupt on approval request, resume from the checkpointer on decision
+- Restart between request and approval (new service, same store/checkpointer)
+- Decision on one replica, resume on the replica serving the graph
+- First decision wins; resume claims prevent double resumes
+- Persistent timeouts enforced by the sweeper
+- Resume retried when the interrupt is not checkpointed yet
+- A decision only answers its own interrupt; long runs still complete
+- Mission graph nodes (handle_node_errors) suspend instead of failing
+
+Run with: pytest tests/unit/test_hitl_suspension.py -v
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, TypedDict
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, START, StateGraph
+
+from services.workflows.hitl_service import HITLCheckpoint, HITLSafetyLevel
+from services.workflows.hitl_suspension import (
+    HITLSuspensionCoordinator,
+    InMemoryApprovalStore,
+    ResumeNotReady,
+)
+from services.workflows.hitl_websocket_service import EnhancedHITLService
+
+TENANT = "00000000-0000-0000-0000-000000000001"
+GRAPH = "test_mission"
+
+
+class MissionState(TypedDict, total=False):
+    plan: str
+    decision: Optional[Dict[str, Any]]
+    result: str
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    def __call__(self):
+        return self.now
+
+
+def _service(store, checkpointer, clock=None, wrap_node=None, final_review=False):
+    """A fresh process: new service + compiled graph over shared durable state"""
+    service = EnhancedHITLService(safety_level=HITLSafetyLevel.CONSERVATIVE, timeout_seconds=600, store=store)
+    if clock is not None:
+        service.suspensions.clock = clock
+
+    def reviewer(checkpoint_id):
+        async def review(state: MissionState, config) -> Dict[str, Any]:
+            decision = await service.interrupt_for_approval(
+                checkpoint_type=HITLCheckpoint.PLAN_APPROVAL,
+                request_data={"plan": state["plan"]},
+                config=config,
+                tenant_id=TENANT,
+                graph=GRAPH,
+                checkpoint_id=checkpoint_id,
+            )
+            return {"decision": decision}
+
+        return wrap_node(review) if wrap_node is not None else review
+
+    async def execute(state: MissionState) -> Dict[str, Any]:
+        return {"result": "executed" if state["decision"]["approved"] else "aborted"}
+
+    builder = StateGraph(MissionState)
+    builder.add_node("review", reviewer("plan_review"))
+    builder.add_node("execute", execute)
+    builder.add_edge(START, "review")
+    if final_review:
+        builder.add_node("final_review", reviewer("final_review"))
+        builder.add_edge("review", "final_review")
+        builder.add_edge("final_review", "execute")
+    else:
+        builder.add_edge("review", "execute")
+    builder.add_edge("execute", END)
+    graph = builder.compile(checkpointer=checkpointer)
+    service.register_graph(GRAPH, graph)
+    return service, graph
+
+
+def _config(thread_id: str) -> Dict[str, Any]:
+    return {"configurable": {"thread_id": thread_id}}
+
+
+async def _start_mission(service, graph, thread_id: str):
+    result = await graph.ainvoke({"plan": "run study"}, _config(thread_id))
+    assert "__interrupt__" in result
+    pending = await service.suspensions.store.list_pending(TENANT)
+    return [a for a in pending if a.thread_id == thread_id][0]
+
+
+class TestDurableSuspension:
+    async def test_request_releases_execution_and_decision_resumes_thread(self):
+        store, checkpointer = InMemoryApprovalStore(), MemorySaver()
+        service, graph = _service(store, checkpointer)
+
+        approval = await _start_mission(service, graph, "t1")
+        assert (await graph.aget_state(_config("t1"))).next == ("review",)
+
+        assert await service.connection_manager.handle_approval_response(approval.approval_id, "approved")
+        await service.suspensions.join()
+
+        state = (await graph.aget_state(_config("t1"))).values
+        assert state["result"] == "executed"
+        assert (await store.get(approval.approval_id)).resumed_at is not None
+
+    async def test_restart_between_request_and_approval(self):
+        store, checkpointer = InMemoryApprovalStore(), MemorySaver()
+        old_service, old_graph = _service(store, checkpointer)
+        approval = await _start_mission(old_service, old_graph, "t2")
+        await old_service.cleanup()
+        del old_service, old_graph  # process gone; only store + checkpointer survive
+
+        service, graph = _service(store, checkpointer)
+        assert await service.connection_manager.handle_approval_response(
+            approval.approval_id, "rejected", user_feedback="not now",
+        )
+        await service.suspensions.join()
+
+        state = (await graph.aget_state(_config("t2"))).values
+        assert state["result"] == "aborted"
+        assert state["decision"]["feedback"] == "not now"
+
+    async def test_decision_while_down_is_recovered_by_startup_sweep(self):
+        store, checkpointer = InMemoryApprovalStore(), MemorySaver()
+        first, graph = _service(store, checkpointer)
+        approval = await _start_mission(first, graph, "t3")
+
+        # Decided on a replica that does not serve this graph
+        api_only = HITLSuspensionCoordinator(store)
+        await api_only.decide(approval.approval_id, "approved")
+        await api_only.join()
+        assert (await store.get(approval.approval_id)).resumed_at is None
+
+        restarted, graph = _service(store, checkpointer)
+        assert await restarted.suspensions.sweep() == {"expired": 0, "resumed": 1}
+        assert (await graph.aget_state(_config("t3"))).values["result"] == "executed"
+
+    async def test_first_decision_wins_and_resume_runs_once(self):
+        store, checkpointer = InMemoryApprovalStore(), MemorySaver()
+        a, graph = _service(store, checkpointer)
+        b, _ = _service(store, checkpointer)
+        approval = await _start_mission(a, graph, "t4")
+
+        assert await a.connection_manager.handle_approval_response(approval.approval_id, "approved")
+        assert not await b.connection_manager.handle_approval_response(approval.approval_id, "rejected")
+        # Pub/sub notification reaching the other replica
+        await b.connection_manager._handle_approval_response(approval.approval_id, {"status": "approved"})
+        await a.suspensions.join()
+        await b.suspensions.join()
+
+        resumed = a.suspensions.metrics["resumed"] + b.suspensions.metrics["resumed"]
+        assert resumed == 1
+        assert (await graph.aget_state(_config("t4"))).values["result"] == "executed"
+
+    async def test_timeout_is_enforced_by_persistent_sweeper(self):
+        store, checkpointer, clock = InMemoryApprovalStore(), MemorySaver(), FakeClock()
+        service, graph = _service(store, checkpointer, clock=clock)
+        approval = await _start_mission(service, graph, "t5")
+
+        assert await service.suspensions.sweep() == {"expired": 0, "resumed": 0}
+        clock.now += timedelta(seconds=601)
+        assert await service.suspensions.sweep() == {"expired": 1, "resumed": 1}
+
+        state = (await graph.aget_state(_config("t5"))).values
+        assert state["result"] == "aborted"
+        assert state["decision"]["status"] == "expired"
+        assert (await store.get(approval.approval_id)).to_response().user_feedback == "Approval timed out"
+
+
+    async def test_interrupt_passes_mission_node_error_handler(self):
+        from langgraph_workflows.modes34.resilience import handle_node_errors
+
+        store, checkpointer = InMemoryApprovalStore(), MemorySaver()
+        service, graph = _service(
+            store, checkpointer, wrap_node=handle_node_errors("checkpoint", recoverable=True),
+        )
+        approval = await _start_mission(service, graph, "t8")
+
+        assert await service.connection_manager.handle_approval_response(approval.approval_id, "approved")
+        await service.suspensions.join()
+        assert (await graph.aget_state(_config("t8"))).values["result"] == "executed"
+
+
+    async def test_stale_decision_never_answers_a_later_checkpoint(self):
+        store, checkpointer = InMemoryApprovalStore(), MemorySaver()
+        service, graph = _service(store, checkpointer, final_review=True)
+        first = await _start_mission(service, graph, "t9")
+        assert await service.connection_manager.handle_approval_response(first.approval_id, "rejected")
+        await service.suspensions.join()
+        assert (await graph.aget_state(_config("t9"))).next == ("final_review",)
+
+        # As if the resume had outlived its lease and never been marked done
+        stale = await store.get(first.approval_id)
+        stale.resumed_at = stale.resume_claimed_by = stale.resume_claimed_at = None
+
+        assert await service.suspensions.sweep() == {"expired": 0, "resumed": 0}
+        assert service.suspensions.metrics["resume_superseded"] == 1
+        assert (await store.get(first.approval_id)).resumed_at is not None
+        assert (await graph.aget_state(_config("t9"))).next == ("final_review",)
+
+        second = [a for a in await store.list_pending(TENANT) if a.thread_id == "t9"][0]
+        assert await service.connection_manager.handle_approval_response(second.approval_id, "approved")
+        await service.suspensions.join()
+        state = (await graph.aget_state(_config("t9"))).values
+        assert state["result"] == "executed"
+
+
+class TestCoordinator:
+    async def test_not_ready_resume_releases_claim_for_retry(self):
+        store = InMemoryApprovalStore()
+        coordinator = HITLSuspensionCoordinator(store)
+        attempts = []
+
+        async def resumer(approval):
+            attempts.append(approval.approval_id)
+            if len(attempts) == 1:
+                raise ResumeNotReady(approval.thread_id)
+
+        coordinator.register_graph(GRAPH, resumer)
+        approval = await coordinator.suspend("plan_approval", {}, "t6", TENANT, "cp", graph=GRAPH)
+        await coordinator.decide(approval.approval_id, "approved")
+        await coordinator.join()
+        assert coordinator.metrics["resume_not_ready"] == 1
+
+        assert await coordinator.sweep() == {"expired": 0, "resumed": 1}
+        assert len(attempts) == 2
+
+    async def test_run_outliving_its_lease_is_still_marked_resumed(self):
+        store, clock = InMemoryApprovalStore(), FakeClock()
+        owner = HITLSuspensionCoordinator(store, resume_lease_seconds=10, clock=clock)
+        other = HITLSuspensionCoordinator(store, resume_lease_seconds=10, clock=clock)
+
+        async def not_ready(approval):
+            raise ResumeNotReady(approval.thread_id)
+
+        async def long_run(approval):
+            clock.now += timedelta(seconds=60)
+            # The lease lapsed mid-run: another replica reclaims and releases it
+            assert not await other.resume(approval.approval_id)
+
+        owner.register_graph(GRAPH, long_run)
+        other.register_graph(GRAPH, not_ready)
+        approval = await owner.suspend("plan_approval", {}, "t10", TENANT, "cp", graph=GRAPH)
+        await store.decide(approval.approval_id, "approved", {}, None, clock())
+
+        assert await owner.resume(approval.approval_id)
+        assert (await store.get(approval.approval_id)).resumed_at is not None
+        assert await store.awaiting_resume(10) == []
+
+    async def test_suspend_is_idempotent_per_thread_checkpoint(self):
+        coordinator = HITLSuspensionCoordinator(InMemoryApprovalStore())
+        first = await coordinator.suspend("plan_approval", {}, "t7", TENANT, "cp")
+        again = await coordinator.suspend("plan_approval", {}, "t7", TENANT, "cp")
+        other = await coordinator.suspend("plan_approval", {}, "t7", TENANT, "cp2")
+        assert first.approval_id == again.approval_id != other.approval_id
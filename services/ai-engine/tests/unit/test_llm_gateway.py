@@ -0,0 +1,283 @@
+"""
+Unit Tests for LLMGateway
+
+Tests cover:
+- Token bucket refill / debt and AIMD increase / decrease
+- Priority admission (interactive ahead of background, background share)
+- Deadline shedding when budgets cannot admit in time
+- 429 handling: Retry-After pause, AIMD decrease, retry within the deadline
+- Transient 5xx / connection failures retried with bounded backoff
+- TPM reconciliation against reported usage
+- GatewayChatModel proxying (ainvoke, astream, bind_tools)
+- ModelFactory returning governed models
+
+Run with: pytest tests/unit/test_llm_gateway.py -v
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import core.llm_gateway as llm_gateway_module
+from core.llm_gateway import (
+    AIMDLimiter,
+    GatewayChatModel,
+    LaneBudget,
+    LLMGateway,
+    Priority,
+    TokenBucket,
+    is_rate_limit_error,
+    is_transient_error,
+    priority_scope,
+    retry_after_seconds,
+)
+from domain.exceptions import LLMTimeoutException
+
+
+class RateLimited(Exception):
+    """Provider-style 429 carrying a Retry-After header"""
+    status_code = 429
+
+    def __init__(self, retry_after: float = 0.01):
+        super().__init__("rate limited")
+        self.response = SimpleNamespace(status_code=429, headers={"retry-after": str(retry_after)})
+
+
+class ServerError(Exception):
+    """Provider-style 503"""
+    status_code = 503
+
+
+class FakeChatModel:
+    """Records calls; raises the queued errors first"""
+
+    def __init__(self, errors=None, total_tokens=None):
+        self.errors = list(errors or [])
+        self.total_tokens = total_tokens
+        self.calls = 0
+        self.model_name = "fake-model"
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        usage = {"total_tokens": self.total_tokens} if self.total_tokens else None
+        return SimpleNamespace(content=f"reply {self.calls}", usage_metadata=usage)
+
+    async def astream(self, input, config=None, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        for token in ("a", "b", "c"):
+            yield SimpleNamespace(content=token, usage_metadata=None)
+
+    def bind_tools(self, tools, **kwargs):
+        bound = FakeChatModel(self.errors, self.total_tokens)
+        bound.tools = tools
+        return bound
+
+
+def _gateway(**budget) -> LLMGateway:
+    defaults = {"rpm": 0, "tpm": 0, "max_concurrency": 4}
+    defaults.update(budget)
+    return LLMGateway(default_budget=LaneBudget(**defaults), max_throttle_retries=3)
+
+
+class TestPrimitives:
+    def test_token_bucket_waits_for_refill_and_allows_debt(self):
+        bucket = TokenBucket(per_minute=60, burst_seconds=2, now=0.0)  # 1/s, capacity 2
+        assert bucket.wait_time(2, 0.0) == 0
+        bucket.take(5, 0.0)  # oversized take goes into debt
+        assert bucket.wait_time(1, 0.0) == pytest.approx(4.0)
+        assert bucket.wait_time(1, 4.0) == 0
+
+    def test_token_bucket_credit_is_capped(self):
+        bucket = TokenBucket(per_minute=60, burst_seconds=2, now=0.0)
+        bucket.take(2, 0.0)
+        bucket.credit(10, 0.0)
+        assert bucket.level == 2
+
+    def test_aimd_increases_additively_and_halves_once_per_cooldown(self):
+        limiter = AIMDLimiter(initial=4, minimum=1, maximum=8, cooldown_seconds=1.0)
+        limiter.on_throttle(now=10.0)
+        assert limiter.limit == 2
+        assert limiter.on_throttle(now=10.5) is False
+        assert limiter.limit == 2
+        for _ in range(3):  # 2 -> 2.5 -> 2.9 -> 3.24
+            limiter.on_success()
+        assert limiter.limit == 3
+
+    def test_rate_limit_classification(self):
+        assert is_rate_limit_error(RateLimited())
+        assert not is_rate_limit_error(ValueError("boom"))
+        assert retry_after_seconds(RateLimited(2.5)) == 2.5
+
+
+class TestAdmission:
+    async def test_interactive_admitted_before_earlier_background(self):
+        gateway = _gateway(max_concurrency=1)
+        holder = await gateway.acquire("openai", "m")
+        order = []
+
+        async def waiter(priority):
+            lease = await gateway.acquire("openai", "m", priority=priority)
+            order.append(priority)
+            gateway.release(lease)
+
+        background = asyncio.create_task(waiter(Priority.BACKGROUND))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(waiter(Priority.INTERACTIVE))
+        await asyncio.sleep(0)
+
+        gateway.release(holder)
+        await asyncio.gather(background, interactive)
+        assert order == [Priority.INTERACTIVE, Priority.BACKGROUND]
+
+    async def test_background_limited_to_its_share(self):
+        gateway = _gateway(max_concurrency=4)
+        leases = [await gateway.acquire("openai", "m", priority=Priority.BACKGROUND) for _ in range(3)]
+
+        with pytest.raises(LLMTimeoutException):
+            await gateway.acquire("openai", "m", priority=Priority.BACKGROUND, timeout=0.02)
+        interactive = await gateway.acquire("openai", "m", priority=Priority.INTERACTIVE, timeout=0.02)
+
+        for lease in leases + [interactive]:
+            gateway.release(lease)
+
+    async def test_request_shed_when_budget_cannot_admit_before_deadline(self):
+        gateway = _gateway(rpm=6, burst_seconds=10)  # one request per 10s
+        gateway.release(await gateway.acquire("openai", "m"))
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        with pytest.raises(LLMTimeoutException):
+            await gateway.acquire("openai", "m", timeout=1.0)
+        assert loop.time() - start < 0.5  # shed immediately, not at the deadline
+        assert gateway.lane("openai", "m").metrics["deadline_exceeded"] == 1
+
+    async def test_priority_scope_sets_default_priority(self):
+        gateway = _gateway()
+        with priority_scope(Priority.BACKGROUND):
+            lease = await gateway.acquire("openai", "m")
+        assert lease.priority == Priority.BACKGROUND
+        gateway.release(lease)
+
+    async def test_tpm_reservation_reconciled_with_usage(self):
+        gateway = _gateway(tpm=6000, burst_seconds=10)  # capacity 1000 tokens
+        model = FakeChatModel(total_tokens=100)
+        llm = gateway.govern(model, "openai", "m", completion_tokens=800)
+
+        await llm.ainvoke("hello")
+        lane = gateway.lane("openai", "m")
+        assert lane.tokens.level > 850  # 800+ reserved, only 100 charged
+
+
+class TestThrottling:
+    async def test_429_is_retried_and_cuts_concurrency(self):
+        gateway = _gateway(max_concurrency=8)
+        model = FakeChatModel(errors=[RateLimited(0.01)])
+        llm = gateway.govern(model, "openai", "m")
+
+        result = await llm.ainvoke("hello")
+
+        lane = gateway.lane("openai", "m")
+        assert result.content == "reply 2"
+        assert lane.metrics["throttled"] == 1
+        assert lane.limiter.limit == 4
+        assert lane.in_flight == 0
+
+    async def test_429_retries_are_bounded(self):
+        gateway = _gateway()
+        model = FakeChatModel(errors=[RateLimited(0.0)] * 5)
+        with pytest.raises(RateLimited):
+            await gateway.govern(model, "openai", "m").ainvoke("hello")
+        assert model.calls == 4  # first attempt + max_throttle_retries
+
+    async def test_other_errors_propagate_without_retry(self):
+        gateway = _gateway()
+        model = FakeChatModel(errors=[ValueError("bad request")])
+        with pytest.raises(ValueError):
+            await gateway.govern(model, "openai", "m").ainvoke("hello")
+        assert model.calls == 1
+        assert gateway.lane("openai", "m").in_flight == 0
+
+    async def test_transient_errors_are_retried_with_backoff(self, monkeypatch):
+        monkeypatch.setattr(llm_gateway_module, "TRANSIENT_BACKOFF_SECONDS", 0.0)
+        gateway = _gateway(max_concurrency=8)
+        model = FakeChatModel(errors=[ServerError("bad gateway"), ConnectionResetError()])
+
+        result = await gateway.govern(model, "openai", "m").ainvoke("hello")
+
+        lane = gateway.lane("openai", "m")
+        assert result.content == "reply 3"
+        assert lane.metrics["transient_retries"] == 2
+        assert lane.metrics["throttled"] == 0
+        assert lane.limiter.limit == 8  # 5xx is not a throttle signal
+        assert lane.in_flight == 0
+
+    async def test_transient_retries_are_bounded(self, monkeypatch):
+        monkeypatch.setattr(llm_gateway_module, "TRANSIENT_BACKOFF_SECONDS", 0.0)
+        gateway = _gateway()
+        model = FakeChatModel(errors=[ServerError()] * 5)
+        with pytest.raises(ServerError):
+            await gateway.govern(model, "openai", "m").ainvoke("hello")
+        assert model.calls == 1 + gateway.max_transient_retries
+
+    def test_sync_invoke_retries_transient_errors(self, monkeypatch):
+        monkeypatch.setattr(llm_gateway_module, "TRANSIENT_BACKOFF_SECONDS", 0.0)
+        errors = [ServerError()]
+
+        def invoke(input, config=None, **kwargs):
+            if errors:
+                raise errors.pop(0)
+            return "ok"
+
+        llm = _gateway().govern(SimpleNamespace(invoke=invoke), "openai", "m")
+        assert llm.invoke("hello") == "ok"
+
+    def test_error_classification(self):
+        assert is_transient_error(ServerError())
+        assert is_transient_error(ConnectionResetError())
+        assert not is_transient_error(RateLimited())
+        assert not is_transient_error(ValueError("bad request"))
+
+
+class TestGatewayChatModel:
+    async def test_stream_holds_lease_until_exhausted(self):
+        gateway = _gateway()
+        llm = gateway.govern(FakeChatModel(errors=[RateLimited(0.0)]), "openai", "m")
+        lane = gateway.lane("openai", "m")
+
+        tokens = []
+        async for chunk in llm.astream("hi"):
+            assert lane.in_flight == 1
+            tokens.append(chunk.content)
+        assert tokens == ["a", "b", "c"]
+        assert lane.in_flight == 0
+
+    async def test_bind_tools_stays_governed_and_attributes_delegate(self):
+        gateway = _gateway()
+        llm = gateway.govern(FakeChatModel(), "openai", "m")
+        bound = llm.bind_tools(["search"])
+
+        assert isinstance(bound, GatewayChatModel)
+        assert bound.tools == ["search"]
+        assert llm.model_name == "fake-model"
+        await bound.ainvoke("hi")
+        assert gateway.lane("openai", "m").metrics["admitted"] == 1
+
+
+class TestModelFactoryIntegration:
+    async def test_factory_returns_governed_model(self, monkeypatch):
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+        from core import llm_gateway
+        from core.model_factory import ModelFactory
+
+        monkeypatch.setattr(llm_gateway, "_gateway", _gateway())
+        model, config = await ModelFactory().create_chat_model("gpt-4o-mini", priority=Priority.BACKGROUND)
+
+        assert isinstance(model, GatewayChatModel)
+        assert model.priority == Priority.BACKGROUND
+        assert model.gateway_model == config.model_id
+        assert model.max_retries == 0
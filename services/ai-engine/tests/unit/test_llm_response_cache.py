@@ -0,0 +1,219 @@
+"""
+Unit Tests for LLMResponseCache
+
+Tests cover:
+- Canonical request digest (stable, sensitive to what matters)
+- In-process LRU with TTL and the Redis tier
+- Single-flight coalescing, leader failure and leader cancellation
+- GatewayChatModel.with_cache for ainvoke and astream replay
+- Hit / saved-cost reporting to CostTracker
+
+Run with: pytest tests/unit/test_llm_response_cache.py -v
+"""
+
+import asyncio
+
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, SystemMessage
+
+from core.cost_tracking import CostTracker
+from core.llm_gateway import LaneBudget, LLMGateway
+from core.llm_response_cache import (
+    CachedResponse,
+    CachePolicy,
+    LLMResponseCache,
+    cached_llm,
+    request_digest,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """CacheManager-shaped dict store"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ttl=3600):
+        self.data[key] = value
+
+
+class FakeChatModel:
+    """Chat model with identifying params, counting upstream calls"""
+
+    def __init__(self, temperature=0.0, delay=0.0):
+        self.temperature = temperature
+        self.delay = delay
+        self.calls = 0
+
+    @property
+    def _identifying_params(self):
+        return {"model_name": "gpt-4o-mini", "temperature": self.temperature, "max_retries": 0}
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return AIMessage(
+            content=f"reply {self.calls}",
+            usage_metadata={"input_tokens": 100, "output_tokens": 50, "total_tokens": 150},
+        )
+
+    async def astream(self, input, config=None, **kwargs):
+        self.calls += 1
+        for token in ("Hello", " wor", "ld"):
+            await asyncio.sleep(self.delay)
+            yield AIMessageChunk(content=token)
+
+
+def _gateway(cache: LLMResponseCache) -> LLMGateway:
+    return LLMGateway(default_budget=LaneBudget(rpm=0, tpm=0, max_concurrency=4), response_cache=cache)
+
+
+def _cache(**kwargs) -> LLMResponseCache:
+    kwargs.setdefault("cost_tracker", CostTracker())
+    kwargs.setdefault("enabled", True)
+    return LLMResponseCache(**kwargs)
+
+
+POLICY = CachePolicy("test.call_site", ttl_seconds=60)
+MESSAGES = [SystemMessage(content="system"), HumanMessage(content="question")]
+
+
+class TestDigest:
+    def test_digest_stable_and_ignores_volatile_params(self):
+        a = request_digest("openai", "gpt-4o", MESSAGES, {"temperature": 0, "max_retries": 0})
+        b = request_digest("openai", "gpt-4o", list(MESSAGES), {"temperature": 0, "timeout": 30, "max_retries": 5})
+        assert a == b
+
+    def test_digest_changes_with_inputs(self):
+        base = request_digest("openai", "gpt-4o", MESSAGES, {"temperature": 0})
+        assert base != request_digest("openai", "gpt-4o", MESSAGES, {"temperature": 0.7})
+        assert base != request_digest("openai", "gpt-4o-mini", MESSAGES, {"temperature": 0})
+        assert base != request_digest("openai", "gpt-4o", MESSAGES, {"temperature": 0}, tools=[{"name": "search"}])
+        assert base != request_digest("openai", "gpt-4o", MESSAGES, {"temperature": 0}, scope="tenant-a")
+
+
+class TestTiers:
+    async def test_lru_evicts_and_ttl_expires(self):
+        clock = FakeClock()
+        cache = _cache(max_entries=2, clock=clock)
+        for key in ("a", "b", "c"):
+            await cache.set(key, CachedResponse(content=key), ttl_seconds=10)
+
+        assert await cache.get("a") is None
+        assert (await cache.get("c")).content == "c"
+        clock.now = 11
+        assert await cache.get("c") is None
+
+    async def test_redis_tier_shared_between_instances(self):
+        redis = FakeRedis()
+        writer, reader = _cache(redis_cache=redis), _cache(redis_cache=redis)
+        await writer.set("k", CachedResponse(content="shared", input_tokens=3), ttl_seconds=60)
+
+        response = await reader.get("k")
+        assert response.content == "shared"
+        assert reader.metrics["hits_redis"] == 1
+        assert (await reader.get("k")) is response  # promoted to memory
+        assert reader.metrics["hits_memory"] == 1
+
+
+class TestSingleFlight:
+    async def test_concurrent_identical_requests_share_one_call(self):
+        cache = _cache()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return CachedResponse(content="answer", model="gpt-4o-mini", input_tokens=1000, output_tokens=500)
+
+        results = await asyncio.gather(*(cache.get_or_compute("k", POLICY, compute) for _ in range(5)))
+
+        assert calls == 1
+        assert [hit for _, hit in results].count(False) == 1
+        assert cache.get_statistics()["coalesced"] == 4
+
+    async def test_leader_failure_propagates_and_is_not_cached(self):
+        cache = _cache()
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream")
+
+        results = await asyncio.gather(
+            *(cache.get_or_compute("k", POLICY, failing) for _ in range(3)), return_exceptions=True,
+        )
+        assert all(isinstance(r, ValueError) for r in results)
+        assert await cache.get("k") is None
+
+    async def test_follower_takes_over_when_leader_cancelled(self):
+        cache = _cache()
+
+        async def slow():
+            await asyncio.sleep(0.05)
+            return CachedResponse(content="late")
+
+        leader = asyncio.create_task(cache.get_or_compute("k", POLICY, slow))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(cache.get_or_compute("k", POLICY, slow))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        response, hit = await follower
+        assert response.content == "late"
+        assert hit is False
+
+
+class TestGatewayIntegration:
+    async def test_with_cache_serves_repeat_without_upstream_call(self):
+        tracker = CostTracker()
+        gateway = _gateway(_cache(cost_tracker=tracker))
+        model = FakeChatModel()
+        llm = gateway.govern(model, "openai", "gpt-4o-mini").with_cache("test.call_site")
+
+        first = await llm.ainvoke(MESSAGES)
+        second = await llm.ainvoke(MESSAGES)
+
+        assert model.calls == 1
+        assert second.content == first.content == "reply 1"
+        assert second.response_metadata["cache_hit"] is True
+        assert gateway.lane("openai", "gpt-4o-mini").metrics["admitted"] == 1
+
+        summary = tracker.get_summary()
+        assert summary.saved_tokens == 150
+        assert summary.saved_cost > 0
+
+    async def test_uncached_and_different_params_go_upstream(self):
+        gateway = _gateway(_cache())
+        cold, warm = FakeChatModel(temperature=0.0), FakeChatModel(temperature=0.7)
+        await gateway.govern(cold, "openai", "m").with_cache("site").ainvoke(MESSAGES)
+        await gateway.govern(warm, "openai", "m").with_cache("site").ainvoke(MESSAGES)
+        await gateway.govern(cold, "openai", "m").ainvoke(MESSAGES)
+        assert (cold.calls, warm.calls) == (2, 1)
+
+    async def test_stream_is_recorded_and_replayed(self):
+        gateway = _gateway(_cache())
+        model = FakeChatModel()
+        llm = gateway.govern(model, "openai", "m").with_cache("site")
+
+        live = [chunk.content async for chunk in llm.astream(MESSAGES)]
+        replayed = [chunk async for chunk in llm.astream(MESSAGES)]
+
+        assert live == ["Hello", " wor", "ld"]
+        assert [c.content for c in replayed] == live
+        assert replayed[0].response_metadata["cache_hit"] is True
+        assert model.calls == 1
+
+    def test_cached_llm_leaves_plain_clients_untouched(self):
+        plain = FakeChatModel()
+        assert cached_llm(plain, "site") is plain
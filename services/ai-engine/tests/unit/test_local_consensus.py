@@ -0,0 +1,146 @@
+"""
+Unit Tests for embedding-based panel consensus
+
+Tests cover:
+- One embedding batch per analysis (responses and claims together)
+- Claim clustering: shared claims agreed, opposite polarity flagged as conflict
+- Recommendation action types and evidence marker overlap
+- TF-IDF fallback when the embedder fails, with cooldown
+- AdvancedConsensusAnalyzer local mode: at most one LLM call, none per round
+
+Run with: pytest tests/unit/test_local_consensus.py -v
+"""
+
+import pytest
+
+from services.panel.consensus_analyzer import AdvancedConsensusAnalyzer
+from services.panel.local_consensus import (
+    LocalConsensusEngine,
+    classify_action,
+    split_claims,
+    tfidf_vectors,
+)
+
+AGREEING = [
+    {
+        "agent_name": "Regulatory",
+        "content": "**Assessment:** The phase 2 data support an accelerated approval pathway. "
+                   "Safety signals in the hepatic panel are manageable with monitoring.\n"
+                   "- We recommend you proceed with the FDA pre-IND meeting next quarter (NCT01234567).",
+    },
+    {
+        "agent_name": "Clinical",
+        "content": "Phase 2 data support an accelerated approval pathway for this indication. "
+                   "Hepatic safety signals are manageable with routine monitoring. "
+                   "I recommend we proceed with a pre-IND meeting with FDA, citing NCT01234567 and Smith et al. 2021.",
+    },
+]
+DISSENTING = {
+    "agent_name": "Commercial",
+    "content": "Payer access will be limited without head-to-head comparative data. "
+               "The hepatic safety signals are not manageable with monitoring alone. "
+               "You should not proceed until comparative effectiveness data are gathered.",
+}
+
+
+class FakeLLM:
+    def __init__(self):
+        self.prompts = []
+
+    async def generate(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return "FINAL RECOMMENDATION: Proceed with the pre-IND meeting."
+
+
+class TestClaimExtraction:
+    def test_markup_stripped_and_short_fragments_skipped(self):
+        claims = split_claims(AGREEING[0]["content"], response=0)
+        assert [c.text for c in claims] == [
+            "The phase 2 data support an accelerated approval pathway.",
+            "Safety signals in the hepatic panel are manageable with monitoring.",
+            "We recommend you proceed with the FDA pre-IND meeting next quarter (NCT01234567).",
+        ]
+        assert [c.recommendation for c in claims] == [False, False, True]
+
+    def test_action_classification(self):
+        assert classify_action("You should not proceed until data are gathered") == "stop"
+        assert classify_action("We recommend you proceed") == "proceed"
+        assert classify_action("Investigate the signal further") == "investigate"
+        assert classify_action("No clear direction") is None
+
+
+class TestLocalConsensusEngine:
+    async def test_single_embedding_batch(self):
+        batches = []
+
+        async def embed(texts):
+            batches.append(texts)
+            return tfidf_vectors(texts).tolist()
+
+        result = await LocalConsensusEngine(embed=embed, claim_threshold=0.45, similarity_floor=0.0).analyze(AGREEING)
+        assert len(batches) == 1
+        assert batches[0][:2] == [r["content"] for r in AGREEING]
+        assert result.metadata["embedding"] == "embedding"
+        assert result.metadata["texts_embedded"] == 2 + result.metadata["claims"]
+
+    async def test_agreement_and_conflict(self):
+        result = await LocalConsensusEngine(embed=None).analyze(AGREEING + [DISSENTING])
+
+        assert "The phase 2 data support an accelerated approval pathway." in result.agreement_points
+        assert any(
+            point.startswith("Regulatory: Safety signals") and "Commercial: The hepatic safety signals are not" in point
+            for point in result.divergent_points
+        )
+        assert result.action_types == {"proceed": 2, "stop": 1}
+        assert any(point.startswith("Recommended actions differ") for point in result.divergent_points)
+        assert result.metadata["evidence_source"] == "text_markers"
+
+        unanimous = await LocalConsensusEngine(embed=None).analyze(AGREEING)
+        assert unanimous.claim_overlap > result.claim_overlap
+        assert unanimous.recommendation_alignment > result.recommendation_alignment
+        assert unanimous.evidence_overlap == pytest.approx(0.5)  # {nct} vs {nct, smith et al. 2021}
+
+    async def test_deterministic(self):
+        engine = LocalConsensusEngine(embed=None)
+        first = await engine.analyze(AGREEING + [DISSENTING])
+        second = await engine.analyze(AGREEING + [DISSENTING])
+        first.metadata.pop("elapsed_ms")
+        second.metadata.pop("elapsed_ms")
+        assert first == second
+
+    async def test_embedder_failure_falls_back_with_cooldown(self):
+        calls = []
+
+        async def embed(texts):
+            calls.append(len(texts))
+            raise ConnectionError("embedding service down")
+
+        engine = LocalConsensusEngine(embed=embed, retry_embeddings_after=60)
+        first = await engine.analyze(AGREEING)
+        await engine.analyze(AGREEING)
+        assert first.metadata["embedding"] == "lexical"
+        assert len(calls) == 1
+
+
+class TestAnalyzerLocalMode:
+    async def test_one_llm_call_for_narrative_none_per_round(self):
+        llm = FakeLLM()
+        analyzer = AdvancedConsensusAnalyzer(llm, mode="local", local_engine=LocalConsensusEngine(embed=None))
+
+        result = await analyzer.analyze_consensus("Should we file?", AGREEING + [DISSENTING])
+        assert len(llm.prompts) == 1
+        assert result.recommendation == "Proceed with the pre-IND meeting."
+        assert result.analysis_metadata["method"] == "local"
+        assert result.analysis_metadata["llm_calls"] == 1
+        assert result.divergent_points and result.agreement_points
+
+        round_result = await analyzer.analyze_consensus("Should we file?", AGREEING, include_detailed_analysis=False)
+        assert len(llm.prompts) == 1
+        assert round_result.consensus_score > result.consensus_score
+        assert round_result.analysis_metadata["llm_calls"] == 0
+
+    async def test_llm_mode_kept(self):
+        llm = FakeLLM()
+        analyzer = AdvancedConsensusAnalyzer(llm, mode="llm")
+        await analyzer.analyze_consensus("Should we file?", AGREEING)
+        assert len(llm.prompts) > 1
@@ -0,0 +1,225 @@
+"""
+Unit Tests for the embedded local vector store
+
+Tests cover:
+- Pinecone-compatible upsert / query / fetch / delete / describe_index_stats
+- Exact search matches brute force; HNSW search recall, with and without filters
+- Metadata filters ($eq, $in, $ne, $nin, $exists, ranges, $and / $or, list values)
+- Upsert replacement, tombstones and compaction; namespaces
+- float16 segments; snapshot persistence (memory-mapped reload, copy on write)
+- VectorDBClient(provider="local")
+
+Run with: pytest tests/unit/test_local_vector_store.py -v
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from graphrag.clients import local_vector_store
+from graphrag.clients.local_vector_store import LocalVectorStore
+
+
+def random_vectors(n, dim=16, seed=0):
+    return np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+
+
+def brute_force(vectors, query, k):
+    normed = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = normed @ (query / np.linalg.norm(query))
+    return list(np.argsort(-scores, kind="stable")[:k])
+
+
+def fill(store, vectors, namespace=None, metadata=None):
+    store.upsert(
+        [
+            {"id": f"v{i}", "values": v.tolist(), "metadata": metadata(i) if metadata else {}}
+            for i, v in enumerate(vectors)
+        ],
+        namespace=namespace,
+    )
+
+
+class TestQuery:
+    def test_exact_search_matches_brute_force(self):
+        vectors = random_vectors(300)
+        store = LocalVectorStore()
+        fill(store, vectors, metadata=lambda i: {"text": f"chunk {i}"})
+
+        query = random_vectors(1, seed=1)[0]
+        response = store.query(vector=query.tolist(), top_k=10, include_metadata=True)
+        assert [m.id for m in response.matches] == [f"v{i}" for i in brute_force(vectors, query, 10)]
+        assert response.matches[0].score >= response.matches[-1].score
+        # Pinecone-style dict access used by VectorDBClient
+        assert response["matches"][0]["metadata"]["text"] == response.matches[0].metadata["text"]
+        assert store.query(vector=query.tolist(), top_k=3).matches[0].metadata is None
+        assert store.query(vector=query.tolist(), namespace="missing").matches == []
+
+    def test_hnsw_recall_with_and_without_filter(self):
+        pytest.importorskip("faiss")
+        vectors = random_vectors(3000, dim=32)
+        store = LocalVectorStore(exact_threshold=100, filtered_exact_ratio=0.01)
+        fill(store, vectors, metadata=lambda i: {"shard": i % 4})
+
+        hits = filtered_hits = 0
+        for seed in range(20):
+            query = random_vectors(1, dim=32, seed=100 + seed)[0]
+            expected = set(brute_force(vectors, query, 10))
+            hits += len(expected & {int(m.id[1:]) for m in store.query(vector=query, top_k=10).matches})
+
+            allowed = np.flatnonzero(np.arange(3000) % 4 == 1)
+            expected = set(allowed[brute_force(vectors[allowed], query, 10)])
+            matches = store.query(vector=query, top_k=10, filter={"shard": 1}).matches
+            assert all(int(m.id[1:]) % 4 == 1 for m in matches)
+            filtered_hits += len(expected & {int(m.id[1:]) for m in matches})
+
+        assert store.describe_index_stats()["namespaces"][""]["indexed"]
+        assert hits / 200 >= 0.9
+        assert filtered_hits / 200 >= 0.9
+
+    def test_float16_segments(self):
+        vectors = random_vectors(200)
+        store = LocalVectorStore(dtype="float16")
+        fill(store, vectors)
+        query = random_vectors(1, seed=3)[0]
+        ids = [m.id for m in store.query(vector=query, top_k=5).matches]
+        assert ids[:3] == [f"v{i}" for i in brute_force(vectors, query, 3)]
+        assert store._namespaces[""].vectors.dtype == np.float16
+
+    def test_query_by_id_and_dimension_check(self):
+        store = LocalVectorStore()
+        fill(store, random_vectors(20))
+        assert store.query(id="v7", top_k=1).matches[0].id == "v7"
+        with pytest.raises(ValueError, match="dimension"):
+            store.query(vector=[1.0, 2.0], top_k=1)
+
+
+class TestFilters:
+    @pytest.fixture
+    def store(self):
+        store = LocalVectorStore()
+        fill(store, random_vectors(12), metadata=lambda i: {
+            "domain_id": f"d{i % 3}",
+            "year": 2015 + i,
+            "tags": ["oncology"] if i % 2 else ["cardiology", "oncology"],
+            **({"reviewed": True} if i < 4 else {}),
+        })
+        return store
+
+    def ids(self, store, flt):
+        return sorted(int(m.id[1:]) for m in store.query(vector=random_vectors(1)[0], top_k=50, filter=flt).matches)
+
+    def test_operators(self, store):
+        assert self.ids(store, {"domain_id": "d1"}) == [1, 4, 7, 10]
+        assert self.ids(store, {"domain_id": {"$eq": "d1"}}) == [1, 4, 7, 10]
+        assert self.ids(store, {"domain_id": {"$in": ["d0", "d1"]}, "year": {"$gte": 2024}}) == [9, 10]
+        assert self.ids(store, {"domain_id": {"$nin": ["d0", "d1"]}}) == [2, 5, 8, 11]
+        assert self.ids(store, {"domain_id": {"$ne": "d0"}, "year": {"$lt": 2019}}) == [1, 2]
+        assert self.ids(store, {"reviewed": {"$exists": False}, "year": {"$lte": 2020}}) == [4, 5]
+        assert self.ids(store, {"reviewed": True}) == [0, 1, 2, 3]
+        assert self.ids(store, {"tags": "cardiology"}) == [0, 2, 4, 6, 8, 10]
+        assert self.ids(store, {"$or": [{"domain_id": "d2"}, {"year": 2015}]}) == [0, 2, 5, 8, 11]
+        with pytest.raises(ValueError, match="Unsupported"):
+            self.ids(store, {"year": {"$regex": "20.*"}})
+
+
+class TestWrites:
+    def test_upsert_replaces_and_delete_compacts(self):
+        store = LocalVectorStore(compact_ratio=0.5, compact_min_dead=4)
+        vectors = random_vectors(10)
+        fill(store, vectors, metadata=lambda i: {"version": 1})
+
+        store.upsert([{"id": "v3", "values": vectors[0].tolist(), "metadata": {"version": 2}}])
+        fetched = store.fetch(["v3", "missing"])["vectors"]
+        assert list(fetched) == ["v3"] and fetched["v3"]["metadata"] == {"version": 2}
+        assert self_match(store, vectors[0]) == {"v0", "v3"}
+        assert store.query(vector=vectors[3], top_k=10, filter={"version": 1}).matches[0].id != "v3"
+
+        assert store.delete(ids=["v0", "v1"])["deleted_count"] == 2
+        stats = store.describe_index_stats()
+        assert stats["total_vector_count"] == 8 and stats["namespaces"][""]["dead_count"] == 3
+        assert store.delete(filter={"version": 1, "$or": [{"version": 1}]})["deleted_count"] == 7
+        # 10 of 11 rows dead: compacted
+        assert store.describe_index_stats()["namespaces"][""] == {"vector_count": 1, "dead_count": 0, "indexed": False}
+        assert [m.id for m in store.query(vector=vectors[0], top_k=5).matches] == ["v3"]
+
+    def test_namespaces_are_isolated(self):
+        store = LocalVectorStore()
+        fill(store, random_vectors(5), namespace="KD-1")
+        fill(store, random_vectors(3, seed=2), namespace="KD-2")
+        assert store.describe_index_stats()["namespaces"]["KD-2"]["vector_count"] == 3
+        assert len(store.query(vector=random_vectors(1)[0], top_k=10, namespace="KD-1").matches) == 5
+        store.delete(delete_all=True, namespace="KD-1")
+        assert store.describe_index_stats()["total_vector_count"] == 3
+
+
+def self_match(store, vector):
+    return {m.id for m in store.query(vector=vector, top_k=2).matches}
+
+
+class TestSnapshot:
+    def test_snapshot_roundtrip_memmap_and_copy_on_write(self, tmp_path):
+        pytest.importorskip("faiss")
+        path = tmp_path / "vectors"
+        vectors = random_vectors(500)
+        store = LocalVectorStore(path=path, dtype="float16", exact_threshold=50)
+        fill(store, vectors, namespace="ont-agents", metadata=lambda i: {"name": f"agent {i}"})
+        store.delete(ids=["v0"], namespace="ont-agents")
+        query = random_vectors(1, seed=9)[0]
+        before = store.query(vector=query, top_k=5, namespace="ont-agents", include_metadata=True).matches
+        store.snapshot()
+
+        loaded = LocalVectorStore.open(path)
+        ns = loaded._namespaces["ont-agents"]
+        assert isinstance(ns.vectors, np.memmap) and ns.index is not None
+        assert (loaded.dimension, loaded.dtype_name) == (16, "float16")
+        after = loaded.query(vector=query, top_k=5, namespace="ont-agents", include_metadata=True).matches
+        assert [(m.id, m.metadata) for m in after] == [(m.id, m.metadata) for m in before]
+
+        loaded.upsert([{"id": "new", "values": query.tolist()}], namespace="ont-agents")
+        assert not isinstance(loaded._namespaces["ont-agents"].vectors, np.memmap)
+        assert loaded.query(vector=query, top_k=1, namespace="ont-agents").matches[0].id == "new"
+        # The snapshot on disk is unchanged until the next snapshot()
+        assert LocalVectorStore.open(path).describe_index_stats()["total_vector_count"] == 499
+
+        loaded.snapshot()
+        assert LocalVectorStore.open(path).describe_index_stats()["total_vector_count"] == 500
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["vectors"]
+
+
+class TestVectorDBClient:
+    async def test_local_provider(self, monkeypatch, tmp_path):
+        from graphrag.clients.vector_db_client import VectorDBClient
+
+        monkeypatch.setattr(local_vector_store, "_local_store", LocalVectorStore(path=tmp_path / "store"))
+        client = VectorDBClient(provider="local")
+        await client.connect()
+
+        vectors = random_vectors(4)
+        await client.upsert(
+            [{"id": f"c{i}", "values": v.tolist(), "metadata": {"text": f"chunk {i}", "domain": "onc"}} for i, v in enumerate(vectors)],
+            namespace="kd",
+        )
+        results = await client.search(vectors[2].tolist(), top_k=2, namespace="kd", filter_dict={"domain": "onc"})
+        assert results[0].id == "c2" and results[0].text == "chunk 2"
+        assert await client.health_check()
+
+        await client.delete(["c2"], namespace="kd")
+        results = await client.search(vectors[2].tolist(), top_k=4, namespace="kd", min_score=-1.0)
+        assert "c2" not in {r.id for r in results}
+
+        await client.disconnect()
+        assert LocalVectorStore.open(tmp_path / "store").describe_index_stats()["total_vector_count"] == 3
+
+    async def test_singleton_defaults_to_configured_provider(self, monkeypatch, tmp_path):
+        from graphrag.clients import vector_db_client
+
+        monkeypatch.setattr(local_vector_store, "_local_store", LocalVectorStore(path=tmp_path / "store"))
+        monkeypatch.setattr(vector_db_client, "get_settings", lambda: SimpleNamespace(vector_store_provider="local"))
+        monkeypatch.setattr(vector_db_client, "_vector_client", None)
+
+        client = await vector_db_client.get_vector_client()
+        assert client.provider == "local"
+        assert await vector_db_client.get_vector_client() is client
+        await client.disconnect()
@@ -0,0 +1,268 @@
+"""
+Unit Tests for batched memory access tracking and the recall path
+
+Tests cover:
+- Accesses aggregated per memory and flushed as one batched RPC with
+  salience decay parameters
+- Failed flushes merged back; no lost increments across a shutdown flush,
+  including accesses recorded while a flush is in flight
+- Sync Supabase clients executed off the event loop
+- SessionMemoryService.recall: stable cache keys, batched access tracking
+
+Run with: pytest tests/unit/test_memory_access_tracker.py -v
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from services.shared.memory_access_tracker import BATCH_RPC_NAME, MemoryAccessTracker
+from services.shared.supabase_utils import execute_query
+from services.shared.session_memory_service import SessionMemoryService
+
+SRC = Path(__file__).resolve().parents[2] / "src"
+
+
+class FakeRPC:
+    """Sync supabase-py style client: ``rpc(...).execute()`` blocks"""
+
+    def __init__(self, delay=0.0, fail=0, rows=None):
+        self.delay = delay
+        self.fail = fail
+        self.rows = rows or []
+        self.calls = []
+        self.threads = set()
+
+    def rpc(self, name, params):
+        def execute():
+            self.threads.add(threading.get_ident())
+            if self.delay:
+                time.sleep(self.delay)
+            if self.fail:
+                self.fail -= 1
+                raise ConnectionError("supabase unavailable")
+            self.calls.append((name, params))
+            return SimpleNamespace(data=self.rows if name != BATCH_RPC_NAME else len(params["p_updates"]))
+
+        return SimpleNamespace(execute=execute)
+
+    def flushed_hits(self):
+        hits = {}
+        for name, params in self.calls:
+            if name == BATCH_RPC_NAME:
+                for row in params["p_updates"]:
+                    hits[row["id"]] = hits.get(row["id"], 0) + row["hits"]
+        return hits
+
+
+class TestMemoryAccessTracker:
+    async def test_accesses_aggregated_into_one_batch(self):
+        client = FakeRPC()
+        tracker = MemoryAccessTracker(client, flush_interval_seconds=60, half_life_days=7, access_boost=0.1)
+        tracker.record(["m1", "m2"])
+        tracker.record(["m1"])
+        assert tracker.get_statistics()["pending_hits"] == 3
+
+        assert await tracker.flush() == 2
+        assert len(client.calls) == 1
+        name, params = client.calls[0]
+        assert name == BATCH_RPC_NAME
+        assert (params["p_half_life_days"], params["p_access_boost"]) == (7, 0.1)
+        assert {row["id"]: row["hits"] for row in params["p_updates"]} == {"m1": 2, "m2": 1}
+        assert tracker.pending == 0
+        # The sync client ran in a worker thread, not on the event loop
+        assert threading.get_ident() not in client.threads
+        await tracker.shutdown()
+
+    async def test_failed_flush_merges_back(self):
+        client = FakeRPC(fail=1)
+        tracker = MemoryAccessTracker(client, flush_interval_seconds=60)
+        tracker.record(["m1", "m1"])
+        assert await tracker.flush() == 0
+        tracker.record(["m1"])
+        assert await tracker.flush() == 1
+        assert client.flushed_hits() == {"m1": 3}
+        assert tracker.metrics["flush_failures"] == 1
+        await tracker.shutdown()
+
+    async def test_batch_size_triggers_early_flush(self):
+        client = FakeRPC()
+        tracker = MemoryAccessTracker(client, flush_interval_seconds=60, batch_size=3)
+        tracker.record(["a", "b", "c"])
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if client.calls:
+                break
+        assert client.flushed_hits() == {"a": 1, "b": 1, "c": 1}
+        await tracker.shutdown()
+
+    async def test_no_lost_increments_across_shutdown(self):
+        client = FakeRPC(delay=0.02, fail=2)
+        tracker = MemoryAccessTracker(client, flush_interval_seconds=0.01)
+        ids = [f"m{i}" for i in range(20)]
+
+        async def recaller(seed):
+            for step in range(30):
+                tracker.record(ids[(seed + step) % 20: (seed + step) % 20 + 3])
+                await asyncio.sleep(0.001)
+
+        await asyncio.gather(*(recaller(seed) for seed in range(8)))
+        recorded = tracker.metrics["recorded"]
+        await tracker.shutdown()
+
+        assert tracker.pending == 0
+        assert sum(client.flushed_hits().values()) == recorded
+        assert tracker.metrics["flushed_hits"] == recorded
+        assert tracker.metrics["flush_failures"] == 2
+
+        tracker.record(["late"])
+        assert tracker.metrics["dropped"] == 1
+
+    async def test_shutdown_timeout_keeps_in_flight_batch(self):
+        release = asyncio.Event()
+
+        class SlowAsyncClient:
+            calls = []
+
+            def rpc(self, name, params):
+                async def execute():
+                    await release.wait()
+                    self.calls.append(params)
+                return SimpleNamespace(execute=execute)
+
+        client = SlowAsyncClient()
+        tracker = MemoryAccessTracker(client, flush_interval_seconds=0.01)
+        tracker.record(["m1", "m2"])
+        await asyncio.sleep(0.05)  # The flush loop is now waiting inside the RPC
+        await tracker.shutdown(timeout=0.05)
+        # Cancelled mid-flush: the RPC may still commit, so its batch is
+        # neither lost nor merged back for a second write
+        stats = tracker.get_statistics()
+        assert (stats["pending_hits"], stats["in_flight_hits"]) == (0, 2)
+
+        release.set()
+        assert await tracker.flush() == 2
+        assert len(client.calls) == 1
+        assert tracker.metrics["flushed_hits"] == 2
+        assert tracker.get_statistics()["in_flight_hits"] == 0
+
+    async def test_cancelled_flush_of_failed_rpc_merges_back_once_settled(self):
+        release = asyncio.Event()
+
+        class FailingAsyncClient:
+            def rpc(self, name, params):
+                async def execute():
+                    await release.wait()
+                    raise ConnectionError("supabase unavailable")
+                return SimpleNamespace(execute=execute)
+
+        tracker = MemoryAccessTracker(FailingAsyncClient(), flush_interval_seconds=60)
+        tracker.record(["m1", "m1"])
+        flush = asyncio.create_task(tracker.flush())
+        await asyncio.sleep(0.01)
+        flush.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await flush
+
+        release.set()
+        tracker.supabase = FakeRPC()
+        assert await tracker.flush() == 1
+        assert tracker.supabase.flushed_hits() == {"m1": 2}
+        assert tracker.metrics["flush_failures"] == 1
+
+    async def test_execute_query_awaits_async_clients(self):
+        async def execute():
+            return "async"
+
+        assert await execute_query(SimpleNamespace(execute=execute)) == "async"
+        assert await execute_query(SimpleNamespace(execute=lambda: "sync")) == "sync"
+
+
+# ============================================================================
+# SessionMemoryService.recall
+# ============================================================================
+
+class DictCache:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ttl=None):
+        self.data[key] = value
+
+
+class FakeEmbeddings:
+    async def embed_text(self, text, cache_key_prefix=None):
+        return SimpleNamespace(embedding=[0.1, 0.2, 0.3])
+
+
+def memory_rows(n):
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "memory_type": "preference",
+            "content": f"memory {i}",
+            "importance": 0.5,
+            "similarity": 0.9 - i * 0.01,
+            "metadata": {},
+            "created_at": "2026-10-01T00:00:00+00:00",
+            "accessed_count": 0,
+        }
+        for i in range(n)
+    ]
+
+
+class TestRecall:
+    @pytest.fixture
+    def service(self):
+        client = FakeRPC(rows=memory_rows(4))
+        tracker = MemoryAccessTracker(client, flush_interval_seconds=60)
+        service = SessionMemoryService(
+            client, embedding_service=FakeEmbeddings(), cache_manager=DictCache(), access_tracker=tracker
+        )
+        return service, client, tracker
+
+    async def test_recall_tracks_access_in_one_batch(self, service):
+        service, client, tracker = service
+        tenant_id, user_id = uuid.uuid4(), uuid.uuid4()
+
+        first = await service.recall("preferred model", tenant_id, user_id)
+        second = await service.recall("preferred  model ", tenant_id, user_id)
+        assert [m.memory.content for m in first] == [m.memory.content for m in second]
+        # Whitespace-equivalent query: served from cache, still counted
+        assert [name for name, _ in client.calls] == ["search_memories_by_embedding"]
+        assert tracker.get_statistics()["pending_hits"] == 8
+
+        await tracker.shutdown()
+        assert [name for name, _ in client.calls][1:] == [BATCH_RPC_NAME]
+        assert set(client.flushed_hits().values()) == {2}
+
+        # Filters are part of the key
+        await service.recall("preferred model", tenant_id, user_id, memory_types=["fact"])
+        assert [name for name, _ in client.calls].count("search_memories_by_embedding") == 2
+
+    def test_cache_key_is_stable_across_processes(self):
+        args = ("what model does user prefer", "t1", "u1", ["fact", "preference"], None, 0.0, 5, 0.5)
+        key = SessionMemoryService._recall_cache_key(*args)
+        assert key == SessionMemoryService._recall_cache_key(*args[:3], ["preference", "fact"], *args[4:])
+        assert key != SessionMemoryService._recall_cache_key(*args[:6], 10, 0.5)
+
+        code = (
+            "from services.shared.session_memory_service import SessionMemoryService as S;"
+            f"print(S._recall_cache_key(*{args!r}))"
+        )
+        env = {**os.environ, "PYTHONHASHSEED": "12345", "PYTHONPATH": str(SRC)}
+        output = subprocess.run(
+            [sys.executable, "-c", code], env=env, capture_output=True, text=True, timeout=120
+        ).stdout
+        assert output.strip().splitlines()[-1] == key
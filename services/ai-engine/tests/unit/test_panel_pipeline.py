@@ -0,0 +1,207 @@
+"""
+Unit Tests for pipelined and speculative panel rounds
+
+Tests cover:
+- Sequential rounds start the next expert once the context prefix streamed in
+- Non-streaming responders still run strictly in turn
+- Consensus analysis overlaps a speculatively started next round
+- Speculation is cancelled, in-flight experts included, when the verdict flips
+- No speculation while the indicator is unstable or near the threshold
+- PanelOrchestrator runs its rounds through the pipeline
+
+Run with: pytest tests/unit/test_panel_pipeline.py -v
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from services.panel.panel_pipeline import PanelPipeline
+
+AGENTS = [{"id": f"a{i}", "name": f"Expert {i}"} for i in range(3)]
+
+
+class FakeLLM:
+    """Streams a 400-character answer in four chunks over `latency` seconds"""
+
+    def __init__(self, latency=0.2, confidence=0.4, stream=True):
+        self.latency = latency
+        self.confidence = confidence
+        self.stream = stream
+        self.calls = []
+        self.cancelled = []
+
+    def answer(self, agent, round_num):
+        return "".join(f"{agent['id']}-r{round_num}-{part}-".ljust(100, "x") for part in range(4))
+
+    async def respond(self, agent, round_num, previous, on_partial):
+        call = {"agent": agent["id"], "round": round_num, "context": previous, "start": time.perf_counter()}
+        self.calls.append(call)
+        text = self.answer(agent, round_num)
+        try:
+            for chunk in range(1, 5):
+                await asyncio.sleep(self.latency / 4)
+                if self.stream:
+                    on_partial(text[: chunk * 100])
+        except asyncio.CancelledError:
+            self.cancelled.append((agent["id"], round_num))
+            raise
+        call["end"] = time.perf_counter()
+        return {"agent_id": agent["id"], "agent_name": agent["name"], "answer": text, "confidence": self.confidence}
+
+
+def analyzer(levels, delay=0.0, log=None):
+    async def analyze(responses, round_num):
+        if log is not None:
+            log.append(("verdict_start", round_num, time.perf_counter()))
+        await asyncio.sleep(delay)
+        if log is not None:
+            log.append(("verdict_end", round_num, time.perf_counter()))
+        return {"consensus_level": levels[round_num - 1], "round": round_num}
+
+    return analyze
+
+
+class TestPipelinedRounds:
+    async def test_next_expert_starts_on_context_prefix(self):
+        llm = FakeLLM(latency=0.2)
+        pipeline = PanelPipeline(llm.respond, analyzer([0.9]), min_consensus=0.7, context_chars=200)
+
+        started = time.perf_counter()
+        result = await pipeline.run(AGENTS, max_rounds=1, sequential=True)
+        elapsed = time.perf_counter() - started
+
+        # 0.1 + 0.1 + 0.2 instead of 3 x 0.2
+        assert elapsed < 0.5
+        assert result.stats.early_starts == 2
+        third = llm.calls[2]
+        assert [c["agent_name"] for c in third["context"]] == ["Expert 0", "Expert 1"]
+        for context, agent in zip(third["context"], AGENTS):
+            full = llm.answer(agent, 1)
+            assert len(context["answer"]) >= 200 and full.startswith(context["answer"])
+        # Committed responses are the complete ones
+        assert [r["answer"] for r in result.responses] == [llm.answer(a, 1) for a in AGENTS]
+
+    async def test_non_streaming_responder_runs_in_turn(self):
+        llm = FakeLLM(latency=0.04, stream=False)
+        pipeline = PanelPipeline(llm.respond, analyzer([0.9]), min_consensus=0.7)
+        await pipeline.run(AGENTS, max_rounds=1, sequential=True)
+
+        for earlier, later in zip(llm.calls, llm.calls[1:]):
+            assert later["start"] >= earlier["end"]
+        assert llm.calls[2]["context"][1]["answer"] == llm.answer(AGENTS[1], 1)
+
+
+class TestSpeculativeRounds:
+    async def test_next_round_overlaps_consensus(self):
+        llm = FakeLLM(latency=0.04, confidence=0.4)
+        log = []
+        committed = []
+
+        async def on_round_committed(round_num, responses):
+            committed.append((round_num, len(responses)))
+
+        pipeline = PanelPipeline(
+            llm.respond, analyzer([0.3, 0.5, 0.9], delay=0.1, log=log),
+            min_consensus=0.7, on_round_committed=on_round_committed,
+        )
+        result = await pipeline.run(AGENTS, max_rounds=3)
+
+        verdict_end = {round_num: at for kind, round_num, at in log if kind == "verdict_end"}
+        round2_start = min(c["start"] for c in llm.calls if c["round"] == 2)
+        assert round2_start < verdict_end[1]
+        assert result.rounds == 3
+        assert result.stats.speculative_started == 2
+        assert result.stats.speculative_committed == 2
+        assert committed == [(1, 3), (2, 3), (3, 3)]
+        # Round 2 prompts saw every round-1 response
+        assert all(len(c["context"]) == 3 for c in llm.calls if c["round"] == 2)
+
+    async def test_flipped_verdict_cancels_speculation(self):
+        llm = FakeLLM(latency=0.2, confidence=0.4)
+        committed = []
+
+        async def on_round_committed(round_num, responses):
+            committed.append(round_num)
+
+        # Indicator says "continue" (confidence 0.4) but the analysis finds consensus
+        pipeline = PanelPipeline(
+            llm.respond, analyzer([0.85, 0.5], delay=0.05),
+            min_consensus=0.7, on_round_committed=on_round_committed,
+        )
+        result = await pipeline.run(AGENTS, max_rounds=2)
+
+        assert result.rounds == 1
+        assert result.consensus["consensus_level"] == 0.85
+        assert {r["answer"][:5] for r in result.responses} == {"a0-r1", "a1-r1", "a2-r1"}
+        assert committed == [1]
+        assert result.stats.speculative_started == 1
+        assert result.stats.speculative_cancelled == 1
+        assert sorted(llm.cancelled) == [("a0", 2), ("a1", 2), ("a2", 2)]
+        await asyncio.sleep(0.25)
+        assert all(c["round"] == 1 for c in llm.calls if "end" in c)
+
+    async def test_no_speculation_near_threshold(self):
+        llm = FakeLLM(latency=0.02, confidence=0.68)
+        log = []
+        pipeline = PanelPipeline(llm.respond, analyzer([0.6, 0.9], delay=0.05, log=log), min_consensus=0.7)
+        result = await pipeline.run(AGENTS, max_rounds=2)
+
+        verdict_end = {round_num: at for kind, round_num, at in log if kind == "verdict_end"}
+        assert min(c["start"] for c in llm.calls if c["round"] == 2) >= verdict_end[1]
+        assert result.stats.speculative_started == 0
+        assert result.rounds == 2
+
+    async def test_cancelling_the_run_cancels_speculation(self):
+        llm = FakeLLM(latency=0.2, confidence=0.4)
+        pipeline = PanelPipeline(llm.respond, analyzer([0.3, 0.3], delay=10), min_consensus=0.7)
+        task = asyncio.create_task(pipeline.run(AGENTS, max_rounds=2))
+        await asyncio.sleep(0.3)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert sorted(llm.cancelled) == [("a0", 2), ("a1", 2), ("a2", 2)]
+
+
+class TestOrchestratorIntegration:
+    async def test_sync_execution_uses_pipeline(self, monkeypatch):
+        from services.panel import panel_orchestrator
+
+        class Table:
+            def __getattr__(self, name):
+                return lambda *args, **kwargs: self
+
+            def execute(self):
+                return SimpleNamespace(data=[])
+
+        orchestrator = panel_orchestrator.PanelOrchestrator.__new__(panel_orchestrator.PanelOrchestrator)
+        orchestrator.supabase = SimpleNamespace(table=lambda name: Table())
+        orchestrator.min_consensus = 0.7
+        orchestrator.max_rounds = 3
+        orchestrator.rag_service = None
+
+        llm = FakeLLM(latency=0.02, confidence=0.9)
+        stored = []
+
+        async def get_expert_response(agent, query, round_num, rag_context, previous_responses, panel_type):
+            return await llm.respond(agent, round_num, previous_responses, lambda text: None)
+
+        async def store(panel_id, responses):
+            stored.append(len(responses))
+
+        monkeypatch.setattr(orchestrator, "_get_expert_response", get_expert_response)
+        monkeypatch.setattr(orchestrator, "_store_responses", store)
+
+        panel = {
+            "id": "p1", "name": "Launch", "mode": "sequential", "archetype": "SAB",
+            "agenda": [{"topic": "Launch in EU?", "max_rounds": 3}],
+            "members": [{"agents": agent} for agent in AGENTS],
+        }
+        result = await orchestrator._execute_panel_sync(panel)
+
+        assert result["rounds"] == 1
+        assert result["consensus"]["consensus_level"] == pytest.approx(0.9)
+        assert stored == [3]
+        assert llm.calls[1]["context"][0]["answer"] == llm.answer(AGENTS[0], 1)
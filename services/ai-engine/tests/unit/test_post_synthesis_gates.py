@@ -0,0 +1,153 @@
+"""
+Unit Tests for the concurrent post-synthesis stage
+
+Tests cover:
+- Gates run concurrently (wall time ~ slowest gate, not the sum)
+- Deterministic merge independent of completion order
+- Hard-fail verdict cancels gates still running
+- A raising gate cancels its siblings and propagates
+- pass / soft_fail verdicts
+- Master graph wiring behind the parallel_gates flag
+
+Run with: pytest tests/unit/test_post_synthesis_gates.py -v
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from langgraph_workflows.modes34.post_synthesis import (
+    GATE_ORDER,
+    run_post_synthesis_gates,
+)
+
+
+STATE = {"final_output": {"content": "draft", "citations": [{"id": 1}, {"id": 2}]}}
+
+
+def _gate(delay, update, started=None, cancelled=None, name=None):
+    async def gate(state):
+        if started is not None:
+            started.append(name)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            if cancelled is not None:
+                cancelled.append(name)
+            raise
+        return {**update, "status": "running"}
+    return gate
+
+
+def _passing_gates(delays=(0.0, 0.0, 0.0)):
+    return {
+        "verify_citations": _gate(delays[0], {"citation_verification_rate": 1.0, "shared": "citations"}),
+        "quality_gate": _gate(delays[1], {"overall_quality": 0.9, "quality_passed": True, "shared": "quality"}),
+        "reflection_gate": _gate(delays[2], {"reflection_score": 0.9, "shared": "reflection"}),
+    }
+
+
+class TestConcurrency:
+    async def test_gates_overlap(self):
+        start = time.perf_counter()
+        result = await run_post_synthesis_gates(STATE, _passing_gates((0.05, 0.05, 0.05)))
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.12
+        assert result["post_synthesis"]["verdict"] == "pass"
+
+
+class TestDeterministicMerge:
+    @pytest.mark.parametrize("delays", [(0.0, 0.01, 0.02), (0.02, 0.01, 0.0), (0.01, 0.0, 0.02)])
+    async def test_merge_follows_gate_order(self, delays):
+        result = await run_post_synthesis_gates(STATE, _passing_gates(delays))
+
+        # Later gates in GATE_ORDER win key collisions regardless of finish order
+        assert result["shared"] == "reflection"
+        assert list(result["post_synthesis"]["gates"]) == list(GATE_ORDER)
+        assert result["status"] == "completed"
+
+    async def test_soft_fail_keeps_all_updates(self):
+        gates = _passing_gates()
+        gates["reflection_gate"] = _gate(0.0, {"reflection_score": 0.1})
+        result = await run_post_synthesis_gates(STATE, gates)
+
+        assert result["post_synthesis"]["verdict"] == "soft_fail"
+        assert result["post_synthesis"]["gates"]["reflection_gate"]["state"] == "failed"
+        assert result["quality_passed"] is True
+
+
+class TestHardFail:
+    async def test_hard_fail_cancels_running_gates(self):
+        cancelled = []
+        gates = {
+            "verify_citations": _gate(0.0, {"citation_verification_rate": 0.0}),
+            "quality_gate": _gate(5, {"overall_quality": 0.9}, cancelled=cancelled, name="quality_gate"),
+            "reflection_gate": _gate(5, {"reflection_score": 0.9}, cancelled=cancelled, name="reflection_gate"),
+        }
+        start = time.perf_counter()
+        result = await run_post_synthesis_gates(STATE, gates)
+
+        assert time.perf_counter() - start < 1
+        assert sorted(cancelled) == ["quality_gate", "reflection_gate"]
+        stage = result["post_synthesis"]
+        assert stage["verdict"] == "hard_fail"
+        assert stage["hard_fail_gate"] == "verify_citations"
+        assert stage["cancelled_gates"] == ["quality_gate", "reflection_gate"]
+        assert result["quality_passed"] is False
+
+    async def test_low_rate_without_citations_is_not_hard_fail(self):
+        gates = _passing_gates()
+        gates["verify_citations"] = _gate(0.0, {"citation_verification_rate": 0.0})
+        result = await run_post_synthesis_gates({"final_output": {"citations": []}}, gates)
+        assert result["post_synthesis"]["verdict"] == "soft_fail"
+
+    async def test_simultaneous_hard_fails_pick_first_in_order(self):
+        gates = {
+            "verify_citations": _gate(0.0, {"citation_verification_rate": 0.0}),
+            "quality_gate": _gate(0.0, {"overall_quality": 0.0}),
+        }
+        result = await run_post_synthesis_gates(STATE, gates)
+        assert result["post_synthesis"]["hard_fail_gate"] == "verify_citations"
+
+
+class TestErrors:
+    async def test_exception_cancels_siblings_and_propagates(self):
+        cancelled = []
+
+        async def broken(state):
+            raise RuntimeError("citation service down")
+
+        gates = {
+            "verify_citations": broken,
+            "quality_gate": _gate(5, {}, cancelled=cancelled, name="quality_gate"),
+            "reflection_gate": _gate(5, {}, cancelled=cancelled, name="reflection_gate"),
+        }
+        with pytest.raises(RuntimeError, match="citation service down"):
+            await run_post_synthesis_gates(STATE, gates)
+        assert sorted(cancelled) == ["quality_gate", "reflection_gate"]
+
+    async def test_outer_cancellation_cancels_gates(self):
+        cancelled = []
+        gates = {name: _gate(5, {}, cancelled=cancelled, name=name) for name in GATE_ORDER}
+
+        task = asyncio.create_task(run_post_synthesis_gates(STATE, gates))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert sorted(cancelled) == sorted(GATE_ORDER)
+
+
+class TestGraphWiring:
+    def test_parallel_flag_controls_nodes(self):
+        from langgraph_workflows.modes34.unified_autonomous_workflow import build_master_graph
+
+        parallel = build_master_graph(parallel_gates=True).get_graph().nodes
+        serial = build_master_graph(parallel_gates=False).get_graph().nodes
+
+        assert "post_synthesis_gates" in parallel
+        assert "quality_gate" not in parallel
+        assert "post_synthesis_gates" not in serial
+        assert {"verify_citations", "quality_gate", "reflection_gate"} <= set(serial)
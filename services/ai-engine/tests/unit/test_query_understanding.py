@@ -0,0 +1,144 @@
+"""
+Unit Tests for the unified query understanding service
+
+Tests cover:
+- Single-pass QueryClassifier matches per-pattern searching
+- Memoization by normalized query and sharing through the request memo
+- Keyword tables computed once per query with substring semantics
+- Hashed n-gram intent model: training, calibrated fast path, save/load
+
+Run with: pytest tests/unit/test_query_understanding.py -v
+"""
+
+import os
+import random
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+from core.request_memo import request_memo_scope
+from services.consultation.query_classifier import PatternSet, QueryClassifier
+from services.consultation.query_understanding import (
+    HashedIntentModel,
+    QueryUnderstandingService,
+)
+
+SRC = Path(__file__).resolve().parents[2] / "src"
+
+
+def _legacy_counts(groups, query):
+    return {
+        name: sum(1 for p in patterns if re.search(p, query, re.IGNORECASE))
+        for name, patterns in groups.items()
+    }
+
+
+class TestPatternSet:
+    def test_counts_match_per_pattern_search(self):
+        classifier = QueryClassifier()
+        groups = {
+            "regulatory": classifier.REGULATORY_PATTERNS,
+            "clinical": classifier.CLINICAL_PATTERNS,
+            "research": classifier.RESEARCH_PATTERNS,
+            "complex": classifier.COMPLEX_INDICATORS,
+            "simple": classifier.SIMPLE_INDICATORS,
+        }
+        patterns = PatternSet(groups, re.IGNORECASE)
+        vocabulary = (
+            "what is the fda 510(k) pharmacokinetic pharmacodynamic half-life meta-analysis "
+            "compare versus and phase 2 trial patient side effects in vitro study why ?"
+        ).split()
+        rng = random.Random(3)
+        for _ in range(300):
+            query = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 12)))
+            words = re.findall(r"\w+", query.lower())
+            assert patterns.counts(query, words) == _legacy_counts(groups, query), query
+
+    def test_optional_last_literal_character(self):
+        patterns = PatternSet({"g": [r"\bdisc?over"]}, re.IGNORECASE)
+        assert patterns.counts("we disover it", ["we", "disover", "it"]) == {"g": 1}
+
+
+class TestQueryUnderstandingService:
+    def test_memoized_by_normalized_query(self):
+        service = QueryUnderstandingService()
+        first = service.understand("What is the  FDA approval pathway for 510(k)?")
+        second = service.understand("  What is the FDA approval pathway for 510(k)? ")
+
+        assert first is second
+        assert first.classification.recommended_strategy == "regulatory_precision"
+        assert service.stats["misses"] == 1
+        assert service.stats["cache_hits"] == 1
+
+    def test_shared_through_request_memo(self):
+        service = QueryUnderstandingService()
+        with request_memo_scope("test") as memo:
+            understanding = service.understand("Compare the efficacy of metformin vs sitagliptin")
+            assert service.understand("Compare the efficacy of metformin vs  sitagliptin") is understanding
+        assert memo.hits["query_understanding"] == 1
+        assert service.stats["misses"] == 1
+        assert service.stats["cache_hits"] == 0
+
+    def test_keyword_counts_once_per_table(self):
+        understanding = QueryUnderstandingService().understand("Latest FDA approval for the drug label")
+        table = {"regulatory": ["fda", "approv", "label"], "drug": ["drug", "dosage"]}
+        counts = understanding.keyword_counts("test", table)
+        assert counts == {"regulatory": 3, "drug": 1}
+        table["drug"].append("latest")
+        assert understanding.keyword_counts("test", table) is counts
+
+    def test_lru_is_bounded(self):
+        service = QueryUnderstandingService(cache_size=2)
+        for query in ("first query", "second query", "third query"):
+            service.understand(query)
+        assert list(service._cache) == ["second query", "third query"]
+
+
+class TestHashedIntentModel:
+    EXAMPLES = [
+        ("fda approval pathway for 510k submission", "regulatory"),
+        ("ema guidance on regulatory submission", "regulatory"),
+        ("fda clearance and compliance audit", "regulatory"),
+        ("side effects and dosage of metformin", "clinical"),
+        ("efficacy and safety in patient treatment", "clinical"),
+        ("adverse events and contraindications of this therapy", "clinical"),
+    ]
+
+    def test_fast_path_uses_confident_model(self, tmp_path):
+        model = HashedIntentModel.fit(self.EXAMPLES * 5, buckets=1 << 10, epochs=100)
+        path = str(tmp_path / "intent.npz")
+        model.save(path)
+        model = HashedIntentModel.load(path)
+
+        probabilities = model.predict(["fda", "submission", "compliance"])
+        assert max(probabilities, key=probabilities.get) == "regulatory"
+        assert abs(sum(probabilities.values()) - 1.0) < 1e-6
+
+        service = QueryUnderstandingService(intent_model=model, fast_path_threshold=0.6)
+        classification = service.understand("FDA submission compliance").classification
+        assert classification.primary_intent.value == "regulatory"
+        assert classification.confidence == probabilities["regulatory"]
+        assert service.stats["fast_path"] == 1
+
+    def test_unconfident_model_falls_back_to_rules(self):
+        model = HashedIntentModel.fit(self.EXAMPLES, buckets=1 << 10, epochs=5)
+        service = QueryUnderstandingService(intent_model=model, fast_path_threshold=0.99)
+        understanding = service.understand("What are the side effects of pembrolizumab?")
+        assert understanding.classification.primary_intent.value == "clinical"
+        assert understanding.intent_probabilities is not None
+        assert service.stats["fast_path"] == 0
+
+
+class TestPackageImport:
+    def test_query_understanding_does_not_load_consultation_services(self):
+        code = (
+            "import sys, services.consultation.query_understanding;"
+            "print(sorted(m for m in sys.modules if m.startswith(('services.consultation.mode1',"
+            " 'services.consultation.citation', 'services.agents'))))"
+        )
+        env = {**os.environ, "PYTHONPATH": str(SRC)}
+        output = subprocess.run(
+            [sys.executable, "-c", code], env=env, capture_output=True, text=True, timeout=120
+        ).stdout
+        assert output.strip().splitlines()[-1] == "[]"
@@ -0,0 +1,267 @@
+"""
+Unit Tests for the shared rank-fusion library
+
+Tests cover:
+- RRF, weighted RRF, CombSUM and CombMNZ scores and deterministic tie-breaking
+- Score normalization and explain output
+- Equivalence with the previous dict-based implementations (fusion_rrf,
+  HybridFusion, GraphRAGSelector._fuse_scores, ParallelToolExecutor._fuse_results_rrf)
+- Partial results: legs that miss the deadline are dropped, the rest fused
+- FusionEngine.retrieve keeps fast retrievers when one is slow
+
+Run with: pytest tests/unit/test_rank_fusion.py -v
+"""
+
+import asyncio
+import random
+import pytest
+
+from fusion.fusion_engine import FusionEngine
+from fusion.fusion_rrf import RankedItem, vital_reciprocal_rank_fusion, vital_weighted_rrf
+from fusion.rank_fusion import (
+    Leg,
+    fuse,
+    fuse_as_completed,
+    fuse_before_deadline,
+    gather_before_deadline,
+    normalize,
+)
+from graphrag.models import ContextChunk, FusionWeights, SearchSource
+from graphrag.search.fusion import HybridFusion
+
+SOURCES = ["vector", "graph", "relational"]
+
+
+def random_lists(seed, pool=40, length=15, sources=SOURCES):
+    rng = random.Random(seed)
+    ids = [f"doc-{i}" for i in range(pool)]
+    return {source: rng.sample(ids, length) for source in sources}
+
+
+# Reference copies of the loops the library replaced
+
+
+def legacy_rrf(lists, weights=None, k=60, start=1):
+    scores = {}
+    for source, ids in lists.items():
+        for rank, item_id in enumerate(ids, start=start):
+            scores.setdefault(item_id, 0.0)
+            scores[item_id] += (weights or {}).get(source, 1.0) * (1.0 / (k + rank))
+    return sorted(scores.items(), key=lambda x: x[1], reverse=True)
+
+
+def chunk(chunk_id, score, modality="vector"):
+    return ContextChunk(
+        chunk_id=chunk_id, text=chunk_id, score=score,
+        source=SearchSource(document_id=chunk_id), search_modality=modality,
+    )
+
+
+def ranked_lists(lists):
+    rng = random.Random(7)
+    return [
+        [RankedItem(id=i, rank=r, score=rng.random(), source=s, metadata={"from": s}) for r, i in enumerate(ids, 1)]
+        for s, ids in lists.items()
+    ]
+
+
+class TestFuse:
+    def test_rrf_matches_reference(self):
+        for seed in range(5):
+            lists = random_lists(seed)
+            fused = fuse([Leg(name, ids) for name, ids in lists.items()])
+            expected = legacy_rrf(lists)
+            assert [item.id for item in fused] == [item_id for item_id, _ in expected]
+            assert [item.score for item in fused] == [score for _, score in expected]
+
+    def test_weighted_rrf_and_explain(self):
+        lists = {"vector": ["a", "b", "c"], "graph": ["b", "d"]}
+        weights = {"vector": 0.6, "graph": 0.4}
+        fused = fuse([Leg(n, ids, weight=weights[n]) for n, ids in lists.items()], k=60)
+        assert [item.id for item in fused] == ["b", "a", "c", "d"]
+        assert fused[0].score == pytest.approx(0.6 / 62 + 0.4 / 61)
+
+        explained = fused[0].explain()
+        assert explained["rank"] == 1
+        assert [leg["leg"] for leg in explained["legs"]] == ["vector", "graph"]
+        assert explained["legs"][1]["rank"] == 1
+        assert sum(leg["share"] for leg in explained["legs"]) == pytest.approx(1.0)
+
+    def test_ties_break_by_first_appearance(self):
+        legs = [Leg("x", ["b", "a"]), Leg("y", ["a", "b"])]
+        assert [item.id for item in fuse(legs)] == ["b", "a"]
+        assert [item.id for item in fuse(legs[::-1])] == ["a", "b"]
+
+    def test_combsum_and_combmnz(self):
+        legs = [
+            Leg("x", ["a", "b", "c"], scores=[10.0, 5.0, 0.0]),
+            Leg("y", ["c", "b"], scores=[0.9, 0.7]),
+        ]
+        combsum = {item.id: item.score for item in fuse(legs, method="combsum", normalization="minmax")}
+        assert combsum == pytest.approx({"a": 1.0, "b": 0.5, "c": 1.0})
+        combmnz = fuse(legs, method="combmnz", normalization="minmax")
+        assert [(item.id, item.score) for item in combmnz] == [("c", 2.0), ("a", 1.0), ("b", 1.0)]
+        with pytest.raises(ValueError):
+            fuse([Leg("x", ["a"])], method="combsum")
+
+    def test_normalize(self):
+        assert normalize([2.0, 4.0, 6.0]).tolist() == [0.0, 0.5, 1.0]
+        assert normalize([3.0, 3.0]).tolist() == [1.0, 1.0]
+        assert normalize([1.0, 3.0], "sum").tolist() == [0.25, 0.75]
+        assert normalize([1.0, 3.0], "zscore").tolist() == [-1.0, 1.0]
+        assert normalize([1.0, 3.0], None).tolist() == [1.0, 3.0]
+
+    def test_top_k_and_empty(self):
+        assert fuse([]) == []
+        assert fuse([Leg("x", [])]) == []
+        assert len(fuse([Leg("x", list("abcdef"))], top_k=2)) == 2
+
+
+class TestEquivalence:
+    def test_vital_rrf(self):
+        lists = random_lists(1)
+        results = vital_reciprocal_rank_fusion(ranked_lists(lists))
+        expected = legacy_rrf(lists)
+        assert [(i, s) for i, s, _ in results] == expected
+        item_id, _, metadata = results[0]
+        assert set(metadata["source_contributions"]) <= set(SOURCES)
+        assert metadata["from"] in SOURCES
+
+    def test_vital_weighted_rrf(self):
+        lists = random_lists(2)
+        weights = {"vector": 0.4, "graph": 0.35, "relational": 0.25}
+        results = vital_weighted_rrf(ranked_lists(lists), weights=weights)
+        expected = legacy_rrf(lists, weights=weights)
+        assert [i for i, _, _ in results] == [i for i, _ in expected]
+        assert [s for _, s, _ in results] == pytest.approx([s for _, s in expected])
+        _, _, metadata = results[0]
+        assert metadata["source_count"] == len(metadata["sources_found"])
+        for source, detail in metadata["source_contributions"].items():
+            assert detail["rank"] == metadata[f"{source}_rank"]
+            assert detail["weight"] == pytest.approx(weights[source])
+
+    def test_hybrid_fusion(self):
+        lists = random_lists(3, sources=["vector", "keyword", "graph"])
+        weights = FusionWeights(vector=0.5, keyword=0.3, graph=0.2)
+
+        def chunks(ids):
+            return [chunk(i, 0.5) for i in ids]
+
+        fused = HybridFusion().fuse(chunks(lists["vector"]), chunks(lists["keyword"]), chunks(lists["graph"]), weights, top_k=10)
+        expected = legacy_rrf(lists, weights=weights.normalize().model_dump())[:10]
+        assert [c.chunk_id for c in fused] == [i for i, _ in expected]
+        assert [c.score for c in fused] == pytest.approx([s for _, s in expected])
+        assert all(c.metadata["original_score"] == 0.5 for c in fused)
+
+    def test_hybrid_weighted_scores_are_combsum(self):
+        vector = [chunk("a", 0.9), chunk("b", 0.4)]
+        keyword = [chunk("b", 0.8, "keyword")]
+        weights = FusionWeights(vector=0.5, keyword=0.5, graph=0.0)
+        fused = HybridFusion().fuse_with_original_scores(vector, keyword, [], weights)
+        assert [(c.chunk_id, c.score) for c in fused] == [("b", pytest.approx(0.6)), ("a", pytest.approx(0.45))]
+
+    def test_graphrag_selector_fuse_scores(self):
+        module = pytest.importorskip("ontology.o0_domain.rag_selector")
+        selector = module.GraphRAGSelector.__new__(module.GraphRAGSelector)
+        lists = random_lists(4, sources=["postgres", "pinecone", "neo4j"])
+        results = {
+            method: [{"agent_id": i, "agent_name": i.upper(), f"{method}_score": 0.1 * r} for r, i in enumerate(ids)]
+            for method, ids in lists.items()
+        }
+        fused = selector._fuse_scores(results["postgres"], results["pinecone"], results["neo4j"])
+        weights = {"postgres": 0.30, "pinecone": 0.50, "neo4j": 0.20}
+        expected = legacy_rrf(lists, weights=weights, start=0)
+        assert [a["agent_id"] for a in fused] == [i for i, _ in expected]
+        assert [a["fused_score"] for a in fused] == pytest.approx([s for _, s in expected])
+        top = fused[0]
+        assert top["agent_name"] == top["agent_id"].upper()
+        for method, rank in top["ranks"].items():
+            assert lists[method][rank] == top["agent_id"]
+
+    def test_parallel_tools_fuse_results(self):
+        module = pytest.importorskip("langgraph_workflows.ask_expert.shared.nodes.parallel_tools_executor")
+        executor = module.ParallelToolExecutor.__new__(module.ParallelToolExecutor)
+        executor.rrf_k = 60
+        lists = random_lists(5, sources=["pubmed", "fda", "web"])
+        tool_results = [
+            module.ToolExecutionResult(tool_key=tool, success=True, results=[{"id": i, "source": tool} for i in ids])
+            for tool, ids in lists.items()
+        ]
+        tool_results.append(module.ToolExecutionResult(tool_key="down", success=False))
+        fused = executor._fuse_results_rrf(tool_results)
+        expected = legacy_rrf(lists)
+        assert [d["id"] for d in fused] == [i for i, _ in expected]
+        assert [d["_rrf_score"] for d in fused] == [s for _, s in expected]
+        multi = [d for d in fused if d["_multi_source"]]
+        assert multi and all(len(d["_sources"]) > 1 for d in multi)
+
+
+async def leg_after(delay, ids, fail=False):
+    await asyncio.sleep(delay)
+    if fail:
+        raise RuntimeError("leg down")
+    return ids
+
+
+class TestPartialResults:
+    async def test_slow_leg_dropped_fast_legs_fused(self):
+        cancelled = []
+
+        async def slow():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append("slow")
+                raise
+
+        result = await fuse_before_deadline(
+            {"vector": leg_after(0.01, ["a", "b"]), "graph": slow(), "relational": leg_after(0.02, ["b"])},
+            timeout=0.1,
+        )
+        assert result.completed == ["vector", "relational"]
+        assert result.timed_out == ["graph"]
+        assert not result.complete
+        assert [item.id for item in result.items] == ["b", "a"]
+        assert cancelled == ["slow"]
+        assert result.elapsed_ms < 1000
+
+    async def test_failures_recorded(self):
+        outcome = await gather_before_deadline(
+            {"x": leg_after(0, ["a"]), "y": leg_after(0, [], fail=True)}, timeout=1,
+        )
+        assert outcome.results == {"x": ["a"]}
+        assert outcome.failed == {"y": "leg down"}
+        assert outcome.timed_out == []
+
+    async def test_streaming_yields_per_completed_leg(self):
+        snapshots = []
+        async for partial in fuse_as_completed(
+            {"slow": leg_after(0.05, ["b", "a"]), "fast": leg_after(0.0, [("a", 0.9), ("c", 0.1)])},
+            timeout=1,
+        ):
+            snapshots.append((partial.completed, [item.id for item in partial.items]))
+        assert snapshots == [(["fast"], ["a", "c"]), (["fast", "slow"], ["a", "b", "c"])]
+
+
+class SlowRetriever:
+    def __init__(self, delay, ids, source):
+        self.delay, self.ids, self.source = delay, ids, source
+
+    async def retrieve(self, query, tenant_id, top_k):
+        await asyncio.sleep(self.delay)
+        return [RankedItem(id=i, rank=r, score=1.0, source=self.source) for r, i in enumerate(self.ids, 1)]
+
+
+class TestFusionEngine:
+    async def test_slow_retriever_does_not_discard_others(self):
+        engine = FusionEngine(
+            vector_retriever=SlowRetriever(0.0, ["a", "b"], "vector"),
+            graph_retriever=SlowRetriever(5.0, ["z"], "graph"),
+            relational_retriever=SlowRetriever(0.01, ["b"], "relational"),
+            timeout_seconds=0.2,
+        )
+        result = await engine.retrieve("query", "tenant", top_k=5)
+        assert result.sources_used == ["vector", "relational"]
+        assert [item_id for item_id, _, _ in result.fused_rankings] == ["b", "a"]
+        assert any("graph" in error for error in result.errors)
+        assert result.retrieval_time_ms < 1000
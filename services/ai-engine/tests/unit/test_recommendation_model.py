@@ -0,0 +1,203 @@
+"""
+Unit Tests for the precomputed agent recommendation model
+
+Tests cover:
+- Incremental builds match a single full build
+- Cosine similarity over distinct users and top-K truncation
+- Trending from decayed growth and recent distinct users
+- Artifact / builder state round trips and hot reload
+- RecommendationEngine serving collaborative and trending from the model
+
+Run with: pytest tests/unit/test_recommendation_model.py -v
+"""
+
+import os
+import random
+
+import numpy as np
+
+from services.agents.recommendation_engine import RecommendationEngine
+from services.agents.recommendation_model import (
+    DAY_SECONDS,
+    RecommendationModel,
+    RecommendationModelBuilder,
+    RecommendationModelSource,
+    refresh_lock,
+)
+from services.session_manager import RecommendationType
+
+NOW = 1_800_000_000.0
+
+
+def _interactions(n=3000, users=120, agents=25, seed=3):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        user = rng.randrange(users)
+        # Users cluster on agents near (user % agents)
+        agent = (user % agents + int(rng.expovariate(0.5))) % agents
+        rows.append((f"u{user}", f"a{agent}", NOW - rng.uniform(0, 30) * DAY_SECONDS, rng.choice([None, 3, 4, 5])))
+    return rows
+
+
+def _apply(builder, rows):
+    users, agents, times, ratings = zip(*rows)
+    return builder.apply(users, agents, times, ratings)
+
+
+def _pairs_by_name(builder):
+    names = builder.agent_ids
+    return {
+        (names[k >> 32], names[k & 0xFFFFFFFF]) if names[k >> 32] < names[k & 0xFFFFFFFF]
+        else (names[k & 0xFFFFFFFF], names[k >> 32]): int(c)
+        for k, c in zip(builder.pair_keys.tolist(), builder.pair_counts.tolist())
+    }
+
+
+class TestBuilder:
+    def test_incremental_batches_match_full_build(self):
+        rows = _interactions()
+        full = RecommendationModelBuilder()
+        _apply(full, rows)
+
+        incremental = RecommendationModelBuilder()
+        for start in range(0, len(rows), 700):
+            _apply(incremental, rows[start:start + 700])
+
+        assert _pairs_by_name(incremental) == _pairs_by_name(full)
+        a, b = full.build(now=NOW), incremental.build(now=NOW)
+        for agent_id in full.agent_ids:
+            assert dict(a.neighbors_of(agent_id)) == dict(b.neighbors_of(agent_id))
+            assert a.agent(agent_id) == b.agent(agent_id)
+
+    def test_cosine_counts_distinct_users_and_truncates(self):
+        builder = RecommendationModelBuilder()
+        rows = [
+            ("u1", "x", NOW, None), ("u1", "x", NOW, None), ("u1", "y", NOW, None),
+            ("u2", "x", NOW, None), ("u2", "y", NOW, None), ("u2", "z", NOW, None),
+            ("u3", "x", NOW, None), ("u3", "z", NOW, None),
+            ("u4", "y", NOW, None),
+        ]
+        _apply(builder, rows)
+        model = builder.build(now=NOW, min_co_occurrence=1, neighbors_k=1)
+
+        # x: {u1,u2,u3}, y: {u1,u2,u4}, z: {u2,u3} -> cos(x,z)=2/sqrt(6), cos(x,y)=2/3
+        assert model.neighbors_of("x") == [("z", np.float32(2 / np.sqrt(6)).item())]
+        assert model.agent("x")["users"] == 3
+        assert model.agent("x")["interactions"] == 4
+
+    def test_similar_to_excludes_seeds_and_inactive_agents(self):
+        builder = RecommendationModelBuilder()
+        _apply(builder, _interactions())
+        meta = {a: {"name": a, "active": a != "a3"} for a in builder.agent_ids}
+        model = builder.build(agents_meta=meta, now=NOW, min_co_occurrence=1)
+
+        results = model.similar_to({"a1": 2.0, "a2": 1.0}, limit=10)
+        ids = [r.agent_id for r in results]
+        assert ids and not {"a1", "a2", "a3"} & set(ids)
+        assert [r.score for r in results] == sorted((r.score for r in results), reverse=True)
+        assert all(0 < r.score <= r.best_similarity <= 1 for r in results)
+
+    def test_trending_prefers_recent_growth(self):
+        builder = RecommendationModelBuilder()
+        rows = []
+        for day in range(90):  # one user a day for three months
+            rows.append((f"u{day}", "steady", NOW - (day + 0.5) * DAY_SECONDS, None))
+        rows += [(f"n{user}", "burst", NOW - 3600, None) for user in range(8)]
+        rows += [("u0", "quiet", NOW - 3600, None)]
+        _apply(builder, rows)
+        model = builder.build(now=NOW)
+
+        assert model.trending(limit=3) == ["burst", "steady"]  # quiet: < 5 recent users
+        assert model.agent("burst")["trend_growth"] > 1.0
+        assert abs(model.agent("steady")["trend_growth"]) < 0.2
+        assert model.trending(exclude={"burst"}, limit=3) == ["steady"]
+
+
+class TestPersistence:
+    def test_model_and_state_round_trip(self, tmp_path):
+        rows = _interactions()
+        builder = RecommendationModelBuilder()
+        _apply(builder, rows[:2000])
+        builder.save_state(str(tmp_path / "state.npz"))
+
+        resumed = RecommendationModelBuilder.load_state(str(tmp_path / "state.npz"))
+        _apply(resumed, rows[2000:])
+        _apply(builder, rows[2000:])
+        assert _pairs_by_name(resumed) == _pairs_by_name(builder)
+
+        meta = {a: {"name": a.upper(), "display_name": None, "domains": ["d"], "active": True} for a in builder.agent_ids}
+        model = builder.build(agents_meta=meta, now=NOW)
+        model.save(str(tmp_path / "model.npz"))
+        loaded = RecommendationModel.load(str(tmp_path / "model.npz"))
+
+        assert loaded.agent("a1") == model.agent("a1")
+        assert loaded.neighbors_of("a1") == model.neighbors_of("a1")
+        assert loaded.trending(limit=5) == model.trending(limit=5)
+
+    def test_source_reloads_replaced_artifact(self, tmp_path):
+        path = str(tmp_path / "model.npz")
+        source = RecommendationModelSource(path, check_interval=0)
+        assert source.get() is None
+
+        builder = RecommendationModelBuilder()
+        _apply(builder, [("u1", "a", NOW, None)])
+        builder.build(now=NOW).save(path)
+        assert source.get().n_agents == 1
+
+        _apply(builder, [("u1", "b", NOW, None)])
+        builder.build(now=NOW).save(path)
+        os.utime(path, (NOW, NOW))
+        assert source.get().n_agents == 2
+
+    def test_refresh_lock_excludes_concurrent_refresh(self, tmp_path):
+        state_path = str(tmp_path / "model.state.npz")
+        with refresh_lock(state_path) as first:
+            assert first
+            with refresh_lock(state_path) as second:
+                assert not second
+        with refresh_lock(state_path) as again:
+            assert again
+
+
+class StubSource:
+    def __init__(self, model):
+        self.model = model
+
+    def get(self):
+        return self.model
+
+
+class TestEngineIntegration:
+    def _engine(self, model):
+        # No db_pool: any SQL fallback would fail loudly
+        return RecommendationEngine(db_pool=None, session_manager=None, model_source=StubSource(model))
+
+    def _model(self):
+        builder = RecommendationModelBuilder()
+        _apply(builder, _interactions())
+        meta = {a: {"name": a, "display_name": a.upper(), "domains": [], "active": True} for a in builder.agent_ids}
+        return builder.build(agents_meta=meta, now=NOW, min_co_occurrence=1)
+
+    async def test_collaborative_served_from_model(self):
+        engine = self._engine(self._model())
+        top_agents = [{"agent_id": f"a{i}", "interaction_count": 5 - i} for i in range(4)]
+
+        recs = await engine._generate_collaborative_recommendations("u-new", top_agents)
+
+        assert 0 < len(recs) <= 5
+        assert all(r.recommendation_type == RecommendationType.COLLABORATIVE for r in recs)
+        assert not {r.agent_id for r in recs} & {"a0", "a1", "a2", "a3"}
+        assert recs[0].agent_display_name == recs[0].agent_id.upper()
+
+    async def test_trending_served_from_model_excludes_user_agents(self):
+        model = self._model()
+        engine = self._engine(model)
+        leader = model.trending(limit=1)[0]
+
+        recs = await engine._generate_trending_recommendations(
+            "u-new", None, top_agents=[{"agent_id": leader}]
+        )
+
+        assert recs and leader not in {r.agent_id for r in recs}
+        assert all(r.recommendation_type == RecommendationType.TRENDING for r in recs)
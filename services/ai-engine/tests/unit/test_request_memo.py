@@ -0,0 +1,158 @@
+"""
+Unit Tests for the request-scoped computation memo
+
+Tests cover:
+- Values computed once per (kind, key) within a request
+- Single-flight async computation shared by concurrent tasks
+- None results and failures are not memoized
+- Nested scopes reuse the outer memo; no memo outside a scope
+- Hit/miss counts per request and per request type
+
+Run with: pytest tests/unit/test_request_memo.py -v
+"""
+
+import asyncio
+
+import pytest
+
+from core.request_memo import (
+    amemoized,
+    current_request_memo,
+    get_request_memo_stats,
+    memoized,
+    request_memo_scope,
+    reset_request_memo_stats,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_stats():
+    reset_request_memo_stats()
+    yield
+    reset_request_memo_stats()
+
+
+class TestRequestMemo:
+    def test_computed_once_per_request(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return [0.1, 0.2]
+
+        with request_memo_scope("POST /ask") as memo:
+            first = memoized("embedding", ("model", "query"), compute)
+            second = memoized("embedding", ("model", "query"), compute)
+            memoized("embedding", ("other-model", "query"), compute)
+
+        assert first is second
+        assert len(calls) == 2
+        assert memo.hits == {"embedding": 1}
+        assert memo.misses == {"embedding": 2}
+
+        # A new request starts empty
+        with request_memo_scope("POST /ask"):
+            memoized("embedding", ("model", "query"), compute)
+        assert len(calls) == 3
+
+    def test_no_memo_outside_scope(self):
+        calls = []
+        assert current_request_memo() is None
+        memoized("agent", "a1", lambda: calls.append(1) or {"id": "a1"})
+        memoized("agent", "a1", lambda: calls.append(1) or {"id": "a1"})
+        assert len(calls) == 2
+
+    def test_none_and_failures_not_memoized(self):
+        calls = []
+
+        def missing():
+            calls.append(1)
+            return None
+
+        with request_memo_scope("GET /agents/{id}"):
+            assert memoized("agent", "gone", missing) is None
+            assert memoized("agent", "gone", missing) is None
+            with pytest.raises(RuntimeError):
+                memoized("agent", "broken", lambda: (_ for _ in ()).throw(RuntimeError("db down")))
+            assert memoized("agent", "broken", lambda: {"id": "broken"}) == {"id": "broken"}
+        assert len(calls) == 2
+
+    def test_nested_scope_reuses_outer_memo(self):
+        with request_memo_scope("POST /ask") as outer:
+            with request_memo_scope("graph") as inner:
+                assert inner is outer
+        assert get_request_memo_stats() == {"POST /ask": {"requests": 1, "hits": {}, "misses": {}}}
+
+
+class TestAsyncRequestMemo:
+    async def test_concurrent_tasks_share_one_computation(self):
+        calls = []
+
+        async def embed():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return [1.0, 2.0]
+
+        async def node():
+            # Tasks copy the context, so each node sees the request's memo
+            return await amemoized("embedding", ("model", "q"), embed)
+
+        with request_memo_scope("POST /ask") as memo:
+            results = await asyncio.gather(*(asyncio.create_task(node()) for _ in range(4)))
+
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        assert memo.hits["embedding"] == 3
+
+    async def test_failure_propagates_to_waiters_and_is_retried(self):
+        calls = []
+
+        async def flaky():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            if len(calls) == 1:
+                raise ConnectionError("timeout")
+            return ["entity"]
+
+        with request_memo_scope("POST /ask"):
+            results = await asyncio.gather(
+                amemoized("entities", "q", flaky),
+                amemoized("entities", "q", flaky),
+                return_exceptions=True,
+            )
+            assert all(isinstance(r, ConnectionError) for r in results)
+            assert await amemoized("entities", "q", flaky) == ["entity"]
+        assert len(calls) == 2
+
+    async def test_cancelled_computation_is_taken_over_by_waiter(self):
+        started = asyncio.Event()
+
+        async def slow():
+            started.set()
+            await asyncio.sleep(10)
+
+        async def fast():
+            return "row"
+
+        with request_memo_scope("POST /ask"):
+            owner = asyncio.create_task(amemoized("agent", "a1", slow))
+            await started.wait()
+            waiter = asyncio.create_task(amemoized("agent", "a1", fast))
+            await asyncio.sleep(0)
+            owner.cancel()
+            assert await waiter == "row"
+
+    async def test_stats_aggregate_per_request_type(self):
+        async def embed():
+            return [0.5]
+
+        for _ in range(2):
+            with request_memo_scope("POST /ask"):
+                await amemoized("embedding", "q", embed)
+                await amemoized("embedding", "q", embed)
+        with request_memo_scope("GET /health"):
+            pass
+
+        stats = get_request_memo_stats()
+        assert stats["POST /ask"] == {"requests": 2, "hits": {"embedding": 2}, "misses": {"embedding": 2}}
+        assert stats["GET /health"]["requests"] == 1
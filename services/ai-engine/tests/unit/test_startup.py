@@ -0,0 +1,235 @@
+"""
+Unit Tests for dependency-ordered parallel startup and lazy route groups
+
+Tests cover:
+- Independent components initialize concurrently, dependents wait
+- Failed, timed-out and disabled components; skipped dependents; soft `after`
+- Readiness probes and per-component report
+- Results published (on_ready) only for READY components, never late from
+  a timed-out threaded init
+- Synchronous init runs off the event loop
+- Dependency validation (unknown names, cycles)
+- Lazy route groups mount on first hit, prewarm mounts the rest
+- lifespan startup graph is valid; HITL service resumes the mission graph
+
+Run with: pytest tests/unit/test_startup.py -v
+"""
+
+import asyncio
+import sys
+import time
+import types
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from api.routes.lazy import (
+    LazyRouteGroup,
+    add_lazy_route_groups,
+    lazy_route_status,
+    prewarm_lazy_routes,
+)
+from core.startup import Component, ComponentDisabled, ComponentState, StartupOrchestrator
+
+
+def sleeper(delay, log, name, result=True):
+    async def init():
+        log.append((name, "start", time.perf_counter()))
+        await asyncio.sleep(delay)
+        log.append((name, "end", time.perf_counter()))
+        return result
+
+    return init
+
+
+def at(log, name, event):
+    return next(t for n, e, t in log if n == name and e == event)
+
+
+class TestStartupOrchestrator:
+    async def test_independent_components_run_concurrently(self):
+        log = []
+        orchestrator = StartupOrchestrator([
+            Component("db", sleeper(0.1, log, "db"), required=True),
+            Component("cache", sleeper(0.1, log, "cache")),
+            Component("checkpoints", sleeper(0.1, log, "checkpoints")),
+            Component("rag", sleeper(0.05, log, "rag"), depends_on=("db",), after=("cache",)),
+        ])
+        started = time.perf_counter()
+        await orchestrator.run()
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 0.25  # 0.1 + 0.05, not 0.35
+        assert at(log, "rag", "start") >= max(at(log, "db", "end"), at(log, "cache", "end"))
+        assert orchestrator.ready and orchestrator.complete
+        assert orchestrator.results["db"] is True
+        assert orchestrator.status["rag"].waited_ms >= 90
+
+    async def test_failures_timeouts_and_skips(self):
+        async def broken():
+            raise ConnectionError("refused")
+
+        def not_configured():
+            raise ComponentDisabled("REDIS_URL not set")
+
+        log = []
+        orchestrator = StartupOrchestrator([
+            Component("db", broken, required=True),
+            Component("cache", not_configured),
+            Component("slow", sleeper(5, log, "slow"), timeout=0.05),
+            Component("rag", sleeper(0, log, "rag"), depends_on=("db",)),
+            Component("uses_cache", sleeper(0, log, "uses_cache"), after=("cache", "slow")),
+        ])
+        await orchestrator.run()
+        states = {name: status.state for name, status in orchestrator.status.items()}
+
+        assert states == {
+            "db": ComponentState.FAILED,
+            "cache": ComponentState.DISABLED,
+            "slow": ComponentState.TIMED_OUT,
+            "rag": ComponentState.SKIPPED,
+            "uses_cache": ComponentState.READY,
+        }
+        assert not orchestrator.ready
+        report = orchestrator.report()
+        assert report["components"]["db"]["error"] == "refused"
+        assert report["components"]["rag"]["error"] == "dependency not ready: db"
+        assert report["components"]["slow"]["duration_ms"] < 1000
+        assert ("rag", "start") not in [(n, e) for n, e, _ in log]
+
+    async def test_probe_gates_readiness(self):
+        orchestrator = StartupOrchestrator([
+            Component("up", sleeper(0, [], "up", result="pong"), probe=lambda result: result == "pong"),
+            Component("down", sleeper(0, [], "down", result="timeout"), probe=lambda result: result == "pong"),
+        ])
+        await orchestrator.run()
+        assert orchestrator.status["up"].state == ComponentState.READY
+        assert orchestrator.status["down"].state == ComponentState.FAILED
+        assert orchestrator.status["down"].error == "readiness probe failed"
+
+    async def test_sync_init_does_not_block_loop(self):
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.02)
+
+        orchestrator = StartupOrchestrator([Component("heavy_import", lambda: time.sleep(0.15) or "loaded")])
+        await asyncio.gather(orchestrator.run(), ticker())
+        assert orchestrator.results["heavy_import"] == "loaded"
+        assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.1
+
+    async def test_timed_out_thread_result_is_not_published(self):
+        published = {}
+
+        def slow_constructor():
+            time.sleep(0.2)
+            return "late"
+
+        orchestrator = StartupOrchestrator(
+            [
+                Component("slow", slow_constructor, timeout=0.05),
+                Component("fast", lambda: "ok"),
+                Component("unreachable", lambda: "down", probe=lambda result: False),
+            ],
+            on_ready=published.__setitem__,
+        )
+        await orchestrator.run()
+        await asyncio.sleep(0.3)  # The worker thread has finished by now
+
+        assert orchestrator.status["slow"].state == ComponentState.TIMED_OUT
+        assert published == {"fast": "ok"}
+        assert "slow" not in orchestrator.results
+
+    def test_validation(self):
+        with pytest.raises(ValueError, match="unknown"):
+            StartupOrchestrator([Component("a", lambda: 1, depends_on=("missing",))]).order()
+        with pytest.raises(ValueError, match="cycle"):
+            StartupOrchestrator([
+                Component("a", lambda: 1, depends_on=("b",)),
+                Component("b", lambda: 1, after=("a",)),
+            ]).order()
+        with pytest.raises(ValueError, match="duplicate"):
+            StartupOrchestrator([Component("a", lambda: 1), Component("a", lambda: 2)])
+
+    def test_lifespan_startup_graph_is_valid(self):
+        from api import lifespan
+
+        orchestrator = StartupOrchestrator(lifespan._startup_components())
+        order = orchestrator.order()
+        assert order.index("supabase_client") < order.index("agent_orchestrator")
+        assert order.index("unified_rag_service") < order.index("agent_orchestrator")
+        assert order.index("supabase_client") < order.index("hitl_service")
+        assert set(orchestrator.components) - {"panel_template_service", "graphrag_selector", "neo4j_client", "monitoring"} \
+            <= set(lifespan._services)
+        for name in ("supabase_client", "cache_manager", "neo4j_client"):
+            assert orchestrator.components[name].probe is not None
+
+    async def test_hitl_service_registers_mission_graph(self, monkeypatch):
+        from api import lifespan
+        from services.workflows import hitl_websocket_service
+        from services.workflows.hitl_suspension import InMemoryApprovalStore
+
+        master_graph = object()
+        workflow = types.SimpleNamespace(
+            MASTER_GRAPH_NAME="unified_autonomous_workflow", build_master_graph=lambda: master_graph,
+        )
+        monkeypatch.setitem(sys.modules, "langgraph_workflows.modes34.unified_autonomous_workflow", workflow)
+        service = hitl_websocket_service.EnhancedHITLService(store=InMemoryApprovalStore())
+        monkeypatch.setattr(hitl_websocket_service, "_hitl_service", service)
+
+        assert await lifespan._init_hitl_service() is service
+        assert set(service.suspensions._resumers) == {"unified_autonomous_workflow"}
+
+
+def make_app(loads):
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"routes": lazy_route_status(app)}
+
+    def register(name, path):
+        def mount(target):
+            loads.append(name)
+            router = APIRouter(prefix=path)
+
+            @router.get("/ping")
+            async def ping():
+                return {"group": name}
+
+            target.include_router(router)
+
+        return mount
+
+    add_lazy_route_groups(app, [
+        LazyRouteGroup("panels", ("/api/v1/panels",), ("json",), register("panels", "/api/v1/panels")),
+        LazyRouteGroup("runners", ("/api/runners",), ("json",), register("runners", "/api/runners")),
+    ])
+    return app
+
+
+class TestLazyRoutes:
+    def test_group_mounts_on_first_hit_only(self):
+        loads = []
+        client = TestClient(make_app(loads))
+
+        assert client.get("/health").json()["routes"]["panels"]["loaded"] is False
+        assert client.get("/api/v1/panels/ping").json() == {"group": "panels"}
+        assert client.get("/api/v1/panels/ping").status_code == 200
+        assert loads == ["panels"]
+
+        routes = client.get("/health").json()["routes"]
+        assert routes["panels"]["loaded"] and routes["panels"]["trigger"] == "/api/v1/panels/ping"
+        assert routes["runners"]["loaded"] is False
+        # Prefix match is per path segment
+        assert client.get("/api/v1/panelsX/ping").status_code == 404
+
+    async def test_prewarm_mounts_remaining_groups(self):
+        loads = []
+        app = make_app(loads)
+        await asyncio.gather(prewarm_lazy_routes(app), prewarm_lazy_routes(app))
+        assert loads == ["panels", "runners"]
+        assert {group["trigger"] for group in lazy_route_status(app).values()} == {"prewarm"}
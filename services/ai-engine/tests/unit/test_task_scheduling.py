@@ -0,0 +1,230 @@
+"""
+Unit Tests for tenant-fair Celery task scheduling
+
+Tests cover:
+- Deficit round robin shares by cost and weight, skipping blocked flows
+- A bulk tenant cannot starve other tenants or the interactive lane
+- Per-task-type concurrency caps and work-conserving tenant shares
+- Cost-weighted admission per tenant and lane
+- Chunked batch jobs resume from the chunks that did not complete, and
+  complete only when every chunk succeeded
+- Slots of tasks that never report back are reaped; running slots survive
+  a dispatcher restart
+
+Run with: pytest tests/unit/test_task_scheduling.py -v
+"""
+
+from collections import Counter
+
+import pytest
+
+from workers import scheduling
+from workers.scheduling import (
+    REAP_MARGIN_SECONDS,
+    AdmissionRejected,
+    DeficitRoundRobin,
+    FairScheduler,
+    InMemoryBroker,
+    Lane,
+    SchedulerDispatcher,
+    submit_task,
+)
+
+
+def _drain(scheduler: FairScheduler, count: int):
+    """Dispatch ``count`` tasks, completing each immediately"""
+    order = []
+    for _ in range(count):
+        task = scheduler.next_task()
+        if task is None:
+            break
+        order.append(task)
+        scheduler.complete(task.task_id)
+    return order
+
+
+class TestDeficitRoundRobin:
+    def test_shares_follow_cost(self):
+        drr = DeficitRoundRobin(quantum=10.0)
+        drr.add("cheap")
+        drr.add("expensive")
+        costs = {"cheap": 1.0, "expensive": 10.0}
+        served = Counter(drr.pick(costs.get) for _ in range(110))
+        # Equal cost share: ten cheap items per expensive one
+        assert served == {"cheap": 100, "expensive": 10}
+
+    def test_weights_and_blocked_flows(self):
+        drr = DeficitRoundRobin(quantum=1.0)
+        drr.add("a", weight=3.0)
+        drr.add("b", weight=1.0)
+        served = Counter(drr.pick(lambda key: 1.0) for _ in range(400))
+        assert served == {"a": 300, "b": 100}
+        assert drr.pick(lambda key: 1.0 if key == "b" else None) == "b"
+        assert drr.pick(lambda key: None) is None
+
+
+class TestFairScheduler:
+    def test_bulk_tenant_does_not_starve_others(self):
+        broker = InMemoryBroker()
+        for i in range(200):
+            submit_task("process_document", "bulk", kwargs={"document_id": f"d{i}"}, broker=broker, now=0.0)
+        submit_task("process_document", "small", kwargs={"document_id": "x"}, broker=broker, now=1.0)
+        submit_task("update_personalization", "small", broker=broker, now=1.0)
+
+        order = _drain(FairScheduler(broker, capacity=4, clock=lambda: 2.0), 4)
+        assert {task.tenant_id for task in order} == {"bulk", "small"}
+        # The interactive lane goes first
+        assert order[0].name == "update_personalization"
+
+    def test_task_type_cap_and_work_conserving_tenant_share(self):
+        broker = InMemoryBroker()
+        for _ in range(5):
+            submit_task("calculate_synergies_task", "bulk", broker=broker, now=0.0)
+            submit_task("process_document", "bulk", broker=broker, now=0.0)
+        scheduler = FairScheduler(broker, capacity=4, clock=lambda: 0.0)
+
+        running = [scheduler.next_task() for _ in range(4)]
+        names = Counter(task.name for task in running)
+        # One synergy job at a time; the only tenant may use every slot
+        assert names == {"calculate_synergies_task": 1, "process_document": 3}
+        assert scheduler.next_task() is None
+
+        submit_task("process_document", "other", broker=broker, now=0.0)
+        scheduler.complete(running[1].task_id)
+        assert scheduler.next_task().tenant_id == "other"
+
+    def test_admission_rejects_backlog_over_lane_limit(self):
+        broker = InMemoryBroker()
+        for _ in range(200):
+            submit_task("update_personalization", "noisy", broker=broker)
+        with pytest.raises(AdmissionRejected) as excinfo:
+            submit_task("update_personalization", "noisy", broker=broker)
+        assert excinfo.value.lane is Lane.INTERACTIVE
+        # Other tenants are unaffected, and dispatching frees backlog
+        submit_task("update_personalization", "quiet", broker=broker)
+        _drain(FairScheduler(broker), 10)
+        submit_task("update_personalization", "noisy", broker=broker)
+
+    def test_chunked_job_resumes_unfinished_chunks(self):
+        broker = InMemoryBroker()
+        document_ids = [f"doc-{i}" for i in range(120)]
+        kwargs = {"job_id": "job-1", "tenant_id": "t1", "document_ids": document_ids}
+        task_ids = submit_task("reindex_knowledge_base", "t1", kwargs=kwargs, broker=broker)
+        assert len(task_ids) == 3
+
+        scheduler = FairScheduler(broker, capacity=4)
+        first = scheduler.next_task()
+        second = scheduler.next_task()
+        assert first.kwargs["chunk"] == {"job_id": "job-1", "index": 0, "count": 3}
+        assert first.kwargs["document_ids"] == document_ids[:50]
+        scheduler.complete(first.task_id, succeeded=True)
+        scheduler.complete(second.task_id, succeeded=False)
+        scheduler.next_task()  # third chunk lost with its worker
+
+        resumed = submit_task("reindex_knowledge_base", "t1", kwargs=kwargs, broker=broker)
+        assert len(resumed) == 2
+        assert [broker.pop(Lane.BATCH, "t1").chunk_index for _ in resumed] == [1, 2]
+
+    def test_dispatcher_applies_completions_and_requeues_failed_sends(self):
+        broker = InMemoryBroker()
+        submit_task("process_document", "t1", broker=broker)
+        submit_task("process_document", "t1", broker=broker)
+        sent = []
+
+        def send(task):
+            if not sent:
+                sent.append(task)
+                return
+            raise ConnectionError("broker down")
+
+        dispatcher = SchedulerDispatcher(FairScheduler(broker, capacity=4), send=send)
+        assert dispatcher.run_once() == 1
+        assert dispatcher.scheduler.running == 1
+        broker.push_done(sent[0].task_id, True)
+        dispatcher.send = sent.append
+        assert dispatcher.run_once() == 1
+        assert dispatcher.scheduler.running == 1
+
+    def test_lost_task_slot_is_reaped_after_its_time_limit(self):
+        broker, now = InMemoryBroker(), [0.0]
+        for _ in range(2):
+            submit_task("calculate_synergies_task", "t1", broker=broker, now=0.0)
+        dispatcher = SchedulerDispatcher(FairScheduler(broker, capacity=4, clock=lambda: now[0]), send=lambda task: None)
+
+        assert dispatcher.run_once() == 1
+        # The worker was SIGKILLed: no task_postrun, the type cap stays taken
+        now[0] = 600 + REAP_MARGIN_SECONDS - 1
+        assert dispatcher.run_once() == 0
+        now[0] += 2
+        assert dispatcher.run_once() == 1
+        assert dispatcher.scheduler.stats()["reaped"] == 1
+
+    def test_running_slots_survive_a_dispatcher_restart(self):
+        broker = InMemoryBroker()
+        for _ in range(4):
+            submit_task("process_document", "t1", broker=broker)
+        first = FairScheduler(broker, capacity=4)
+        running = [first.next_task() for _ in range(3)]  # the standard lane's share
+
+        restarted = FairScheduler(broker, capacity=4)
+        assert restarted.running == 3
+        assert restarted.next_task() is None
+        restarted.complete(running[0].task_id)
+        assert restarted.next_task() is not None
+        assert len(broker.load_running()) == 3
+
+
+class TestChunkedJobCompletion:
+    class FakeJobRepo:
+        events = []
+
+        def update_status(self, job_id, status, progress=None):
+            pass
+
+        def complete(self, job_id, result):
+            self.events.append(("complete", job_id))
+
+        def fail(self, job_id, error, is_retryable=False):
+            self.events.append(("fail", job_id))
+
+    def _run_chunk(self, index, count=3):
+        from workers.tasks.ingestion_tasks import reindex_knowledge_base
+
+        return reindex_knowledge_base(
+            job_id="job-1", tenant_id="t1", document_ids=["d"],
+            chunk={"job_id": "job-1", "index": index, "count": count},
+        )
+
+    @pytest.fixture
+    def events(self, monkeypatch):
+        from infrastructure.database.repositories import job_repo
+
+        self.FakeJobRepo.events = []
+        monkeypatch.setattr(job_repo, "JobRepository", self.FakeJobRepo)
+        monkeypatch.setattr(scheduling, "_scheduler_broker", InMemoryBroker())
+        return self.FakeJobRepo.events
+
+    def test_job_completes_when_the_last_chunk_finishes_not_the_last_index(self, events):
+        self._run_chunk(2)
+        self._run_chunk(0)
+        assert events == []
+        self._run_chunk(1)
+        assert events == [("complete", "job-1")]
+
+    def test_failed_chunk_blocks_completion_until_it_succeeds(self, events, monkeypatch):
+        from infrastructure.database.repositories import job_repo
+
+        class BrokenRepo(self.FakeJobRepo):
+            def update_status(self, job_id, status, progress=None):
+                raise ConnectionError("db down")
+
+        monkeypatch.setattr(job_repo, "JobRepository", BrokenRepo)
+        with pytest.raises(ConnectionError):
+            self._run_chunk(0)
+        monkeypatch.setattr(job_repo, "JobRepository", self.FakeJobRepo)
+        self._run_chunk(1)
+        self._run_chunk(2)
+        assert events == [("fail", "job-1")]
+
+        self._run_chunk(0)  # resubmitted
+        assert events == [("fail", "job-1"), ("complete", "job-1")]
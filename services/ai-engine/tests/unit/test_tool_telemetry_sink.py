@@ -0,0 +1,230 @@
+"""
+Unit Tests for ToolTelemetrySink
+
+Tests cover:
+- Non-blocking enqueue and batched flushing
+- Drop counting under backpressure (ring buffer overwrite)
+- Oversized payload compaction (truncated preview + SHA-256 address)
+- Failed flush requeue and retry limit; cancelled flush restore on overflow
+- Blocking (sync) clients executed off the event loop
+- Shutdown drain (no queued record is lost)
+- ToolRegistryService routing through the sink
+
+Run with: pytest tests/unit/test_tool_telemetry_sink.py -v
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from services.shared.tool_telemetry_sink import (
+    BATCH_RPC_NAME,
+    MAX_FLUSH_ATTEMPTS,
+    ToolExecutionRecord,
+    ToolTelemetrySink,
+    compact_payload,
+)
+from services.shared.tool_registry_service import ToolRegistryService
+
+
+class FakeSupabase:
+    """
+    Sync supabase-py style client: ``rpc(...).execute()`` blocks.
+
+    Records batch RPCs; optionally fails the first N calls.
+    """
+
+    def __init__(self, latency: float = 0.0, fail_times: int = 0):
+        self.latency = latency
+        self.fail_times = fail_times
+        self.calls = []
+        self.threads = set()
+
+    def rpc(self, name, params):
+        outer = self
+
+        class _Query:
+            def execute(self):
+                outer.threads.add(threading.get_ident())
+                time.sleep(outer.latency)
+                if outer.fail_times > 0:
+                    outer.fail_times -= 1
+                    raise RuntimeError("db unavailable")
+                outer.calls.append((name, params))
+                return MagicMock(data=len(params.get("p_records", [])))
+
+        return _Query()
+
+    @property
+    def rows(self):
+        return [row for _, params in self.calls for row in params["p_records"]]
+
+
+def _record(i: int, **kwargs) -> ToolExecutionRecord:
+    return ToolExecutionRecord(
+        tool_code=f"TOOL-{i}", agent_id="agent-1", tenant_id="tenant-1",
+        input_params={"query": f"q{i}"}, **kwargs,
+    )
+
+
+class TestEnqueueAndFlush:
+    async def test_flush_writes_one_batch(self):
+        db = FakeSupabase()
+        sink = ToolTelemetrySink(db, batch_size=3)
+        for i in range(5):
+            assert sink.enqueue(_record(i))
+
+        assert await sink.flush() == 3
+        assert await sink.flush() == 2
+        assert [name for name, _ in db.calls] == [BATCH_RPC_NAME, BATCH_RPC_NAME]
+        assert [row["p_tool_code"] for row in db.rows] == [f"TOOL-{i}" for i in range(5)]
+        assert sink.pending == 0
+        # The blocking client ran in a worker thread, not on the event loop
+        assert threading.get_ident() not in db.threads
+
+    async def test_background_loop_flushes_on_interval(self):
+        db = FakeSupabase()
+        sink = ToolTelemetrySink(db, batch_size=100, flush_interval_seconds=0.01)
+        await sink.start()
+        sink.enqueue(_record(1))
+        await asyncio.sleep(0.05)
+        assert len(db.rows) == 1
+        await sink.shutdown()
+
+    async def test_full_batch_wakes_loop_early(self):
+        db = FakeSupabase()
+        sink = ToolTelemetrySink(db, batch_size=2, flush_interval_seconds=60)
+        await sink.start()
+        sink.enqueue(_record(1))
+        sink.enqueue(_record(2))
+        await asyncio.sleep(0.01)
+        assert len(db.rows) == 2
+        await sink.shutdown()
+
+
+class TestBackpressure:
+    def test_overflow_drops_oldest_and_counts(self):
+        sink = ToolTelemetrySink(FakeSupabase(), capacity=3, batch_size=10)
+        results = [sink.enqueue(_record(i)) for i in range(5)]
+
+        assert results == [True, True, True, False, False]
+        assert sink.metrics["dropped"] == 2
+        assert sink.pending == 3
+
+    async def test_enqueue_after_shutdown_is_dropped(self):
+        sink = ToolTelemetrySink(FakeSupabase())
+        await sink.shutdown()
+        assert sink.enqueue(_record(1)) is False
+        assert sink.metrics["dropped"] == 1
+
+
+class TestPayloadCompaction:
+    def test_small_payload_unchanged(self):
+        payload = {"query": "short"}
+        assert compact_payload(payload, 1024) is payload
+
+    def test_oversized_payload_is_content_addressed(self):
+        payload = {"documents": ["x" * 1000] * 10}
+        compacted = compact_payload(payload, 1024)
+
+        assert compacted["_truncated"] is True
+        assert len(compacted["_sha256"]) == 64
+        assert compacted["_bytes"] > 1024
+        assert compacted == compact_payload(payload, 1024)
+
+    async def test_rows_carry_compacted_payloads(self):
+        db = FakeSupabase()
+        sink = ToolTelemetrySink(db, max_payload_bytes=64)
+        sink.enqueue(_record(1, output_result={"text": "y" * 500}))
+        await sink.flush()
+        assert db.rows[0]["p_output_result"]["_truncated"] is True
+        assert db.rows[0]["p_input_params"] == {"query": "q1"}
+
+
+class TestFailureHandling:
+    async def test_failed_batch_is_requeued_in_order(self):
+        db = FakeSupabase(fail_times=1)
+        sink = ToolTelemetrySink(db, batch_size=10)
+        for i in range(3):
+            sink.enqueue(_record(i))
+
+        assert await sink.flush() == 0
+        assert sink.pending == 3
+        assert await sink.flush() == 3
+        assert [row["p_tool_code"] for row in db.rows] == ["TOOL-0", "TOOL-1", "TOOL-2"]
+
+    async def test_records_dropped_after_max_attempts(self):
+        db = FakeSupabase(fail_times=MAX_FLUSH_ATTEMPTS)
+        sink = ToolTelemetrySink(db)
+        sink.enqueue(_record(1))
+
+        for _ in range(MAX_FLUSH_ATTEMPTS):
+            await sink.flush()
+        assert sink.pending == 0
+        assert sink.metrics["dropped"] == 1
+
+
+    async def test_cancelled_flush_keeps_newest_on_overflow(self):
+        release = asyncio.Event()
+
+        class SlowAsyncClient:
+            def rpc(self, name, params):
+                async def execute():
+                    await release.wait()
+                return MagicMock(execute=execute)
+
+        sink = ToolTelemetrySink(SlowAsyncClient(), capacity=4, batch_size=3)
+        for i in range(3):
+            sink.enqueue(_record(i))
+        flush = asyncio.create_task(sink.flush())
+        await asyncio.sleep(0.01)  # Batch 0..2 is in flight
+        for i in range(3, 6):
+            sink.enqueue(_record(i))
+
+        flush.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await flush
+
+        # Room for one of the interrupted records: the oldest two are dropped
+        assert [r.tool_code for r in sink._buffer] == ["TOOL-2", "TOOL-3", "TOOL-4", "TOOL-5"]
+        assert sink.metrics["dropped"] == 2
+
+
+class TestShutdown:
+    async def test_shutdown_flushes_everything_queued(self):
+        db = FakeSupabase(latency=0.001)
+        sink = ToolTelemetrySink(db, batch_size=7, flush_interval_seconds=60)
+        await sink.start()
+        for i in range(50):
+            sink.enqueue(_record(i))
+
+        await sink.shutdown()
+
+        assert len(db.rows) == 50
+        assert len({row["p_execution_id"] for row in db.rows}) == 50
+        assert sink.get_statistics()["pending"] == 0
+
+
+class TestToolRegistryIntegration:
+    async def test_log_tool_execution_enqueues_without_rpc(self):
+        supabase = MagicMock()
+        db = FakeSupabase()
+        sink = ToolTelemetrySink(db)
+        registry = ToolRegistryService(supabase, telemetry_sink=sink)
+
+        execution_id = await registry.log_tool_execution(
+            tool_code="TOOL-AI-WEB_SEARCH",
+            agent_id="agent-1",
+            tenant_id="tenant-1",
+            input_params={"query": "x"},
+            execution_time_ms=12,
+        )
+
+        supabase.rpc.assert_not_called()
+        assert sink.pending == 1
+        await sink.flush()
+        assert db.rows[0]["p_execution_id"] == execution_id
+        assert db.rows[0]["p_execution_time_ms"] == 12